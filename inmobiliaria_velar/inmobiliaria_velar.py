@@ -114,6 +114,18 @@ class SecurityHeadersMiddleware:
 # Registrar el middleware en la app subyacente de Starlette/FastAPI
 app._api.add_middleware(SecurityHeadersMiddleware)
 
+# Instrumentación de consultas SQL por evento (INSTRUMENTACION_CONSULTAS=true)
+from src.infraestructura.persistencia.instrumentacion_consultas import instrumentacion_consultas
+if instrumentacion_consultas.activa:
+    from src.presentacion_reflex.utils.instrumentacion import MiddlewareInstrumentacionConsultas
+    app.add_middleware(MiddlewareInstrumentacionConsultas())
+
+# Leer lo propio con réplica de lectura: escrituras y lecturas por cliente, no por hilo
+from src.infraestructura.persistencia.database import db_manager
+if db_manager.enrutador.replica is not None:
+    from src.presentacion_reflex.utils.sesion_lecturas import MiddlewareSesionLecturas
+    app.add_middleware(MiddlewareSesionLecturas())
+
 # Registrar API routes para descargas de PDF con nombres correctos
 from src.presentacion_reflex.api.pdf_download_api import register_pdf_routes
 register_pdf_routes(app)
@@ -122,6 +134,26 @@ register_pdf_routes(app)
 from src.presentacion_reflex.api.document_download_api import register_document_routes
 register_document_routes(app)
 
+# Verificación única del esquema propio de los repositorios (antes que las tareas que lo usan)
+from src.infraestructura.persistencia.esquema import verificar_esquema_al_iniciar
+app.register_lifespan_task(verificar_esquema_al_iniciar)
+
+# Despachador del outbox de notificaciones (correos/WhatsApp en segundo plano)
+from src.infraestructura.notificaciones.despachador_outbox import despachador_en_segundo_plano
+app.register_lifespan_task(despachador_en_segundo_plano)
+
+# Causación diaria del libro de cartera en mora
+from src.aplicacion.servicios.servicio_cartera_mora import causacion_mora_en_segundo_plano
+app.register_lifespan_task(causacion_mora_en_segundo_plano)
+
+# Escritor de auditoría por lotes (operaciones masivas en SQLite)
+from src.infraestructura.persistencia.escritor_auditoria import escritor_auditoria_en_segundo_plano
+app.register_lifespan_task(escritor_auditoria_en_segundo_plano)
+
+# Rotación mensual y retención de la auditoría
+from src.infraestructura.persistencia.particiones_auditoria import rotacion_auditoria_en_segundo_plano
+app.register_lifespan_task(rotacion_auditoria_en_segundo_plano)
+
 # 1. Login (Pública)
 app.add_page(login.login_page, route="/login", title="Login - Inmobiliaria Velar")
 
@@ -0,0 +1,16 @@
+-- Migration: Add Audit Search Indexes
+-- Description: Supports the filtered keyset search of the audit screen
+-- (RepositorioAuditoriaSQLite.buscar): ORDER BY ID_AUDITORIA DESC with
+-- WHERE ID_AUDITORIA < last seen, optionally per table, record or user.
+-- SQLite creates the same indexes on first use.
+
+-- 1. Historia de un registro acotada por fecha
+CREATE INDEX IF NOT EXISTS idx_auditoria_tabla_registro_fecha ON AUDITORIA_CAMBIOS(TABLA, ID_REGISTRO, FECHA_CAMBIO);
+
+-- 2. Keyset por tabla
+CREATE INDEX IF NOT EXISTS idx_auditoria_tabla_id ON AUDITORIA_CAMBIOS(TABLA, ID_AUDITORIA);
+
+-- 3. Keyset por usuario
+CREATE INDEX IF NOT EXISTS idx_auditoria_usuario_id ON AUDITORIA_CAMBIOS(USUARIO, ID_AUDITORIA);
+
+ANALYZE AUDITORIA_CAMBIOS;
@@ -0,0 +1,29 @@
+-- Migration: Add Trigram Search Indexes
+-- Description: Replaces unindexable LIKE '%term%' searches with pg_trgm GIN indexes over
+-- accent-insensitive expressions. Expressions must match expresion_trigram() in
+-- src/infraestructura/persistencia/repositorio_busqueda_sqlite.py exactly.
+-- SQLite uses FTS5 tables (PERSONAS_FTS, PROPIEDADES_FTS) and their sync triggers, created
+-- at schema setup (startup schema check, or the first RepositorioBusquedaSQLite built).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+-- unaccent() is STABLE (depends on search_path); an IMMUTABLE wrapper with an explicit
+-- dictionary is required to use it in index expressions.
+CREATE OR REPLACE FUNCTION f_unaccent(text)
+RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS
+$func$
+SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+$func$;
+
+-- 1. Personas: nombre + documento
+CREATE INDEX IF NOT EXISTS idx_personas_busqueda_trgm ON PERSONAS
+USING gin (f_unaccent(lower(coalesce(NOMBRE_COMPLETO, '') || ' ' || coalesce(NUMERO_DOCUMENTO, ''))) gin_trgm_ops);
+
+-- 2. Propiedades: dirección + matrícula
+CREATE INDEX IF NOT EXISTS idx_propiedades_busqueda_trgm ON PROPIEDADES
+USING gin (f_unaccent(lower(coalesce(DIRECCION_PROPIEDAD, '') || ' ' || coalesce(MATRICULA_INMOBILIARIA, ''))) gin_trgm_ops);
+
+ANALYZE PERSONAS;
+ANALYZE PROPIEDADES;
@@ -0,0 +1,6 @@
+-- Migration: Add Unified Contracts Listing Indexes
+-- Description: Supports the global order (FECHA_INICIO DESC, ID DESC) of each branch of the
+-- contracts UNION ALL read model (repositorio_contratos_unificado_sqlite.py).
+
+CREATE INDEX IF NOT EXISTS idx_contratos_mandatos_inicio ON CONTRATOS_MANDATOS(FECHA_INICIO_CONTRATO_M, ID_CONTRATO_M);
+CREATE INDEX IF NOT EXISTS idx_contratos_arrendamientos_inicio ON CONTRATOS_ARRENDAMIENTOS(FECHA_INICIO_CONTRATO_A, ID_CONTRATO_A);
@@ -0,0 +1,9 @@
+-- Migration: Add DOCUMENTOS.THUMBNAIL
+-- Description: Stores the thumbnail generated in background after an upload is acknowledged,
+-- and indexes the versioning lookup used by batch uploads.
+-- (SQLite: RepositorioDocumentoSQLite adds THUMBNAIL BLOB through the startup schema check)
+
+ALTER TABLE DOCUMENTOS ADD COLUMN IF NOT EXISTS THUMBNAIL BYTEA;
+
+-- Batch versioning: MAX(VERSION) / UPDATE ES_VIGENTE by entity + file name
+CREATE INDEX IF NOT EXISTS idx_documentos_entidad_nombre ON DOCUMENTOS(ENTIDAD_TIPO, ENTIDAD_ID, NOMBRE_ARCHIVO);
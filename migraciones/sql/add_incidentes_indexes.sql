@@ -0,0 +1,11 @@
+-- Migration: Add Incident Listing Indexes
+-- Description: Supports the filtered/paginated incident listing and the per-state Kanban
+-- counts (RepositorioIncidentesSQLite.listar_con_filtros / contar_por_estado).
+
+-- 1. Filtro por estado y prioridad, ordenado por fecha
+CREATE INDEX IF NOT EXISTS idx_incidentes_estado_prioridad_fecha ON INCIDENTES(ESTADO, PRIORIDAD, FECHA_INCIDENTE);
+
+-- 2. Listado sin filtros (ORDER BY FECHA_INCIDENTE DESC)
+CREATE INDEX IF NOT EXISTS idx_incidentes_fecha_incidente ON INCIDENTES(FECHA_INCIDENTE);
+
+ANALYZE INCIDENTES;
@@ -0,0 +1,7 @@
+-- Migration: Add Utility Receipt Expiry Index
+-- Description: Supports the set-based expiry job (RepositorioReciboPublicoSQLite.marcar_vencidos):
+-- UPDATE RECIBOS_PUBLICOS SET ESTADO = 'Vencido' WHERE ESTADO = 'Pendiente' AND FECHA_VENCIMIENTO < ?
+-- Valid for both PostgreSQL and SQLite.
+
+CREATE INDEX IF NOT EXISTS idx_recibos_publicos_estado_vencimiento
+ON RECIBOS_PUBLICOS (ESTADO, FECHA_VENCIMIENTO);
@@ -0,0 +1,30 @@
+-- Migration: Create Monthly Charges Register
+-- Description: One row per (contract, period, concept) generated by the mass monthly charge run
+-- (RepositorioRecaudoSQLite.generar_cargos_mensuales). The primary key makes the run idempotent:
+-- repeating it for the same period only creates the missing charges. Deleting a generated
+-- recaudo removes its row so it can be generated again.
+-- SQLite creates the same table on first use and loads it the same way.
+
+CREATE TABLE IF NOT EXISTS CARGOS_MENSUALES (
+    ID_CONTRATO_A INTEGER NOT NULL,
+    PERIODO TEXT NOT NULL,
+    TIPO_CONCEPTO TEXT NOT NULL,
+    ID_RECAUDO INTEGER,
+    CREATED_AT TEXT NOT NULL,
+    CREATED_BY TEXT,
+    PRIMARY KEY (ID_CONTRATO_A, PERIODO, TIPO_CONCEPTO)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cargos_mensuales_recaudo ON CARGOS_MENSUALES (ID_RECAUDO);
+
+-- Mass charges generated before this table existed
+INSERT INTO CARGOS_MENSUALES (
+    ID_CONTRATO_A, PERIODO, TIPO_CONCEPTO, ID_RECAUDO, CREATED_AT, CREATED_BY
+)
+SELECT r.ID_CONTRATO_A, rc.PERIODO, rc.TIPO_CONCEPTO, MIN(r.ID_RECAUDO),
+       CAST(MIN(r.CREATED_AT) AS TEXT), MIN(r.CREATED_BY)
+FROM RECAUDOS r
+JOIN RECAUDO_CONCEPTOS rc ON rc.ID_RECAUDO = r.ID_RECAUDO
+WHERE r.OBSERVACIONES LIKE 'Pago masivo generado - %'
+GROUP BY r.ID_CONTRATO_A, rc.PERIODO, rc.TIPO_CONCEPTO
+ON CONFLICT (ID_CONTRATO_A, PERIODO, TIPO_CONCEPTO) DO NOTHING;
@@ -0,0 +1,25 @@
+-- Migration: Create Arrears Ledger
+-- Description: Per contract and period balance of rent owed (CARTERA_MORA). Recaudos update
+-- it incrementally when they are registered, reversed or deleted; ServicioCarteraMora
+-- (src/aplicacion/servicios/servicio_cartera_mora.py) accrues charges, days and interest
+-- once a day. Dashboard and alerts read balances from here instead of VW_ALERTA_MORA_DIARIA.
+-- SQLite creates the same table on first use. The first accrual on an empty ledger loads
+-- the existing history of active contracts; ServicioCarteraMora.reconstruir() rebuilds it
+-- from scratch on demand.
+
+CREATE TABLE IF NOT EXISTS CARTERA_MORA (
+    ID_CONTRATO_A INTEGER NOT NULL,
+    PERIODO TEXT NOT NULL,
+    FECHA_VENCIMIENTO TEXT NOT NULL,
+    VALOR_CANON BIGINT NOT NULL,
+    VALOR_PAGADO BIGINT NOT NULL DEFAULT 0,
+    SALDO BIGINT NOT NULL,
+    DIAS_MORA INTEGER NOT NULL DEFAULT 0,
+    INTERES_MORA BIGINT NOT NULL DEFAULT 0,
+    FECHA_CORTE TEXT,
+    CAUSADO INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (ID_CONTRATO_A, PERIODO)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cartera_mora_en_mora
+ON CARTERA_MORA (DIAS_MORA, SALDO) WHERE DIAS_MORA > 0;
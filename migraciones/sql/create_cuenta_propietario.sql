@@ -0,0 +1,45 @@
+-- Migration: Create Owner Account Ledger
+-- Description: Owner current account (MOVIMIENTOS_CUENTA_PROPIETARIO). Every liquidation,
+-- payment and saldo a favor event appends a movement carrying the owner's running balance,
+-- and liquidation credits keep the per-property breakdown used by the period statement.
+-- Statements and account histories become index range scans. SQLite creates (and backfills)
+-- the same table on first use; on PostgreSQL run this script and then
+-- RepositorioCuentaPropietarioSQLite(db_manager).reconstruir() once to load existing data.
+
+CREATE TABLE IF NOT EXISTS MOVIMIENTOS_CUENTA_PROPIETARIO (
+    ID_MOVIMIENTO SERIAL PRIMARY KEY,
+    ID_PROPIETARIO INTEGER NOT NULL,
+    PERIODO TEXT NOT NULL,
+    FECHA_MOVIMIENTO TEXT NOT NULL,
+    TIPO_MOVIMIENTO TEXT NOT NULL,
+    REFERENCIA TEXT NOT NULL,
+    DESCRIPCION TEXT,
+    ID_PROPIEDAD INTEGER,
+    DIRECCION_PROPIEDAD TEXT,
+    PORCENTAJE_SEGURO INTEGER NOT NULL DEFAULT 0,
+    CANON_BRUTO BIGINT NOT NULL DEFAULT 0,
+    OTROS_INGRESOS BIGINT NOT NULL DEFAULT 0,
+    TOTAL_INGRESOS BIGINT NOT NULL DEFAULT 0,
+    COMISION_MONTO BIGINT NOT NULL DEFAULT 0,
+    IVA_COMISION BIGINT NOT NULL DEFAULT 0,
+    IMPUESTO_4X1000 BIGINT NOT NULL DEFAULT 0,
+    GASTOS_ADMINISTRACION BIGINT NOT NULL DEFAULT 0,
+    GASTOS_SERVICIOS BIGINT NOT NULL DEFAULT 0,
+    GASTOS_REPARACIONES BIGINT NOT NULL DEFAULT 0,
+    OTROS_EGRESOS BIGINT NOT NULL DEFAULT 0,
+    TOTAL_EGRESOS BIGINT NOT NULL DEFAULT 0,
+    CREDITO BIGINT NOT NULL DEFAULT 0,
+    DEBITO BIGINT NOT NULL DEFAULT 0,
+    SALDO BIGINT NOT NULL,
+    ANULADO INTEGER NOT NULL DEFAULT 0,
+    CREATED_BY TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_mov_propietario_periodo
+ON MOVIMIENTOS_CUENTA_PROPIETARIO (ID_PROPIETARIO, PERIODO, TIPO_MOVIMIENTO);
+
+CREATE INDEX IF NOT EXISTS idx_mov_propietario_fecha
+ON MOVIMIENTOS_CUENTA_PROPIETARIO (ID_PROPIETARIO, FECHA_MOVIMIENTO);
+
+CREATE INDEX IF NOT EXISTS idx_mov_referencia
+ON MOVIMIENTOS_CUENTA_PROPIETARIO (REFERENCIA);
@@ -0,0 +1,31 @@
+-- Migration: Create Notifications Outbox
+-- Description: Persistent queue for email/WhatsApp notifications. Use cases insert rows;
+-- DespachadorNotificaciones (src/infraestructura/notificaciones/despachador_outbox.py)
+-- claims them in batches, reuses one SMTP session per batch and retries failures with
+-- exponential backoff. SQLite creates the same table on first use.
+
+CREATE TABLE IF NOT EXISTS NOTIFICACIONES_OUTBOX (
+    ID_NOTIFICACION SERIAL PRIMARY KEY,
+    CANAL TEXT NOT NULL CHECK (CANAL IN ('email', 'whatsapp')),
+    DESTINATARIO TEXT NOT NULL,
+    ASUNTO TEXT,
+    CUERPO TEXT NOT NULL,
+    ADJUNTO_PATH TEXT,
+    REFERENCIA TEXT,
+    ESTADO TEXT NOT NULL DEFAULT 'Pendiente'
+        CHECK (ESTADO IN ('Pendiente', 'Enviando', 'Enviada', 'Fallida')),
+    INTENTOS INTEGER NOT NULL DEFAULT 0,
+    MAX_INTENTOS INTEGER NOT NULL DEFAULT 5,
+    PROXIMO_INTENTO TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    ULTIMO_ERROR TEXT,
+    CREATED_AT TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    ENVIADO_AT TIMESTAMP
+);
+
+-- Dispatcher claim: only rows still to be sent are indexed
+CREATE INDEX IF NOT EXISTS idx_notificaciones_outbox_despacho
+ON NOTIFICACIONES_OUTBOX (CANAL, PROXIMO_INTENTO)
+WHERE ESTADO IN ('Pendiente', 'Enviando');
+
+CREATE INDEX IF NOT EXISTS idx_notificaciones_outbox_referencia
+ON NOTIFICACIONES_OUTBOX (REFERENCIA);
@@ -0,0 +1,91 @@
+-- Migration: Partition Audit Log by Month
+-- Description: Turns AUDITORIA_CAMBIOS into a table partitioned by month (RANGE on FECHA_CAMBIO)
+-- so inserts and date-bounded lookups only touch the current partitions, and old months can be
+-- detached and archived without rewriting the table. GestorParticionesAuditoria
+-- (src/infraestructura/persistencia/particiones_auditoria.py) creates the upcoming partitions
+-- every day and archives those older than AUDITORIA_MESES_RETENCION to compressed CSV files,
+-- recording each one in AUDITORIA_PARTICIONES.
+-- FECHA_CAMBIO stays TEXT (the triggers write NOW()::VARCHAR); COLLATE "C" keeps the ISO date
+-- bounds in byte order. The primary key must include the partition key.
+-- SQLite keeps AUDITORIA_CAMBIOS as the active table and moves old months to
+-- AUDITORIA_CAMBIOS_AAAAMM tables; it creates its catalog on first use.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS AUDITORIA_PARTICIONES (
+    PERIODO TEXT PRIMARY KEY,
+    TABLA TEXT NOT NULL,
+    ID_MIN BIGINT,
+    ID_MAX BIGINT,
+    FILAS BIGINT NOT NULL DEFAULT 0,
+    FILAS_ARCHIVADAS BIGINT NOT NULL DEFAULT 0,
+    ARCHIVO TEXT,
+    ACTUALIZADO_EN TEXT
+);
+
+ALTER TABLE AUDITORIA_CAMBIOS RENAME TO AUDITORIA_CAMBIOS_ANTERIOR;
+ALTER TABLE AUDITORIA_CAMBIOS_ANTERIOR RENAME CONSTRAINT auditoria_cambios_pkey TO auditoria_cambios_anterior_pkey;
+
+CREATE TABLE AUDITORIA_CAMBIOS (
+    ID_AUDITORIA BIGINT NOT NULL DEFAULT nextval('auditoria_cambios_id_auditoria_seq'),
+    TABLA TEXT NOT NULL,
+    ID_REGISTRO INTEGER NOT NULL,
+    TIPO_OPERACION TEXT NOT NULL CHECK(TIPO_OPERACION IN ('INSERT', 'UPDATE', 'DELETE', 'ESTADO_CHANGE')),
+    CAMPO_MODIFICADO TEXT,
+    VALOR_ANTERIOR TEXT,
+    VALOR_NUEVO TEXT,
+    USUARIO TEXT NOT NULL,
+    FECHA_CAMBIO TEXT COLLATE "C" NOT NULL DEFAULT (NOW()::VARCHAR),
+    MOTIVO_CAMBIO TEXT,
+    IP_ORIGEN TEXT,
+    PRIMARY KEY (ID_AUDITORIA, FECHA_CAMBIO)
+) PARTITION BY RANGE (FECHA_CAMBIO);
+
+ALTER SEQUENCE auditoria_cambios_id_auditoria_seq OWNED BY AUDITORIA_CAMBIOS.ID_AUDITORIA;
+
+-- Rows outside every monthly partition (should stay empty)
+CREATE TABLE AUDITORIA_CAMBIOS_DEFAULT PARTITION OF AUDITORIA_CAMBIOS DEFAULT;
+
+-- One partition per month from the oldest row to two months ahead
+DO $$
+DECLARE
+    v_mes DATE;
+    v_fin DATE := date_trunc('month', CURRENT_DATE) + INTERVAL '2 months';
+BEGIN
+    SELECT COALESCE(date_trunc('month', MIN(FECHA_CAMBIO)::TIMESTAMP), date_trunc('month', CURRENT_DATE))
+    INTO v_mes FROM AUDITORIA_CAMBIOS_ANTERIOR;
+    WHILE v_mes <= v_fin LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF AUDITORIA_CAMBIOS FOR VALUES FROM (%L) TO (%L)',
+            'auditoria_cambios_' || to_char(v_mes, 'YYYYMM'),
+            to_char(v_mes, 'YYYY-MM-DD'),
+            to_char(v_mes + INTERVAL '1 month', 'YYYY-MM-DD')
+        );
+        INSERT INTO AUDITORIA_PARTICIONES (PERIODO, TABLA, ACTUALIZADO_EN)
+        VALUES (to_char(v_mes, 'YYYY-MM'), 'auditoria_cambios_' || to_char(v_mes, 'YYYYMM'), NOW()::VARCHAR)
+        ON CONFLICT (PERIODO) DO NOTHING;
+        v_mes := v_mes + INTERVAL '1 month';
+    END LOOP;
+END $$;
+
+INSERT INTO AUDITORIA_CAMBIOS (
+    ID_AUDITORIA, TABLA, ID_REGISTRO, TIPO_OPERACION, CAMPO_MODIFICADO, VALOR_ANTERIOR,
+    VALOR_NUEVO, USUARIO, FECHA_CAMBIO, MOTIVO_CAMBIO, IP_ORIGEN
+)
+SELECT ID_AUDITORIA, TABLA, ID_REGISTRO, TIPO_OPERACION, CAMPO_MODIFICADO, VALOR_ANTERIOR,
+       VALOR_NUEVO, USUARIO, COALESCE(FECHA_CAMBIO::TEXT, NOW()::VARCHAR), MOTIVO_CAMBIO, IP_ORIGEN
+FROM AUDITORIA_CAMBIOS_ANTERIOR;
+
+-- Frees the old index names
+DROP TABLE AUDITORIA_CAMBIOS_ANTERIOR;
+
+-- Search indexes (add_auditoria_busqueda_indexes.sql), created on every partition
+CREATE INDEX idx_auditoria_fecha ON AUDITORIA_CAMBIOS (FECHA_CAMBIO);
+CREATE INDEX idx_auditoria_tabla ON AUDITORIA_CAMBIOS (TABLA, ID_REGISTRO);
+CREATE INDEX idx_auditoria_tabla_registro_fecha ON AUDITORIA_CAMBIOS (TABLA, ID_REGISTRO, FECHA_CAMBIO);
+CREATE INDEX idx_auditoria_tabla_id ON AUDITORIA_CAMBIOS (TABLA, ID_AUDITORIA);
+CREATE INDEX idx_auditoria_usuario_id ON AUDITORIA_CAMBIOS (USUARIO, ID_AUDITORIA);
+
+COMMIT;
+
+ANALYZE AUDITORIA_CAMBIOS;
@@ -0,0 +1,135 @@
+"""
+Benchmark: Búsqueda Global (LIKE vs FTS5)
+Genera una BD SQLite temporal con 100.000 personas y 20.000 propiedades
+y compara el LIKE '%termino%' original contra el índice FTS5.
+
+Uso:
+    python scripts/benchmark_busqueda_global.py [--personas 100000]
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar el directorio raiz al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.infraestructura.persistencia.repositorio_busqueda_sqlite import RepositorioBusquedaSQLite
+
+NOMBRES = ["José", "María", "Ángela", "Andrés", "Sofía", "Camilo", "Lucía", "Martín", "Inés", "Julián"]
+APELLIDOS = ["Pérez", "Gómez", "Rodríguez", "Núñez", "Martínez", "Sánchez", "Ramírez", "Castaño", "Ríos", "Zuluaga"]
+VIAS = ["Calle", "Carrera", "Avenida", "Transversal", "Diagonal"]
+TERMINOS = ["perez", "Núñez", "sofia castano", "1000123", "carrera 45"]
+
+
+class _BenchmarkDB:
+    """DatabaseManager mínimo sobre un archivo SQLite."""
+
+    def __init__(self, path: Path):
+        self.database_path = path
+        self.use_postgresql = False
+        self._conn = sqlite3.connect(str(path))
+        self._conn.row_factory = sqlite3.Row
+
+    def obtener_conexion(self):
+        return self._conn
+
+    def get_placeholder(self) -> str:
+        return "?"
+
+
+def poblar(conn: sqlite3.Connection, n_personas: int, n_propiedades: int) -> None:
+    rnd = random.Random(42)
+    conn.executescript(
+        """
+        CREATE TABLE PERSONAS (ID_PERSONA INTEGER PRIMARY KEY, NUMERO_DOCUMENTO TEXT, NOMBRE_COMPLETO TEXT);
+        CREATE TABLE PROPIEDADES (ID_PROPIEDAD INTEGER PRIMARY KEY, MATRICULA_INMOBILIARIA TEXT, DIRECCION_PROPIEDAD TEXT);
+        CREATE TABLE ARRENDATARIOS (ID_ARRENDATARIO INTEGER PRIMARY KEY, ID_PERSONA INTEGER);
+        CREATE TABLE PROPIETARIOS (ID_PROPIETARIO INTEGER PRIMARY KEY, ID_PERSONA INTEGER);
+        CREATE TABLE CONTRATOS_ARRENDAMIENTOS (ID_CONTRATO_A INTEGER PRIMARY KEY, ID_PROPIEDAD INTEGER, ID_ARRENDATARIO INTEGER);
+        CREATE TABLE CONTRATOS_MANDATOS (ID_CONTRATO_M INTEGER PRIMARY KEY, ID_PROPIEDAD INTEGER, ID_PROPIETARIO INTEGER);
+        """
+    )
+    conn.executemany(
+        "INSERT INTO PERSONAS VALUES (?, ?, ?)",
+        (
+            (
+                i,
+                str(1000000 + i),
+                f"{rnd.choice(NOMBRES)} {rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}",
+            )
+            for i in range(1, n_personas + 1)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO PROPIEDADES VALUES (?, ?, ?)",
+        (
+            (i, f"MAT-{i:06d}", f"{rnd.choice(VIAS)} {rnd.randint(1, 150)} # {rnd.randint(1, 99)}-{rnd.randint(1, 99)}")
+            for i in range(1, n_propiedades + 1)
+        ),
+    )
+    conn.commit()
+
+
+def medir(fn, repeticiones: int = 20) -> float:
+    """Mediana en milisegundos."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--personas", type=int, default=100_000)
+    parser.add_argument("--propiedades", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _BenchmarkDB(Path(tmp) / "benchmark_busqueda.db")
+        print(f"Poblando {args.personas} personas y {args.propiedades} propiedades...")
+        poblar(db.obtener_conexion(), args.personas, args.propiedades)
+
+        repo = RepositorioBusquedaSQLite(db)
+        inicio = time.perf_counter()
+        repo.asegurar_indice()
+        print(f"Índice FTS5 construido en {(time.perf_counter() - inicio):.2f}s\n")
+
+        conn = db.obtener_conexion()
+        # Los listados paginados ejecutan COUNT(*) sobre el filtro: es la
+        # consulta que más sufre con LIKE (recorre toda la tabla).
+        print(f"{'termino':<16}{'LIKE (ms)':>12}{'FTS5 (ms)':>12}{'global (ms)':>13}{'coinciden':>11}")
+        for termino in TERMINOS:
+            like = f"%{termino}%"
+            condicion, params = repo.condicion("PERSONA", "p.ID_PERSONA", termino)
+
+            def con_like():
+                return conn.execute(
+                    "SELECT COUNT(*) FROM PERSONAS p WHERE p.NOMBRE_COMPLETO LIKE ? OR p.NUMERO_DOCUMENTO LIKE ?",
+                    (like, like),
+                ).fetchone()[0]
+
+            def con_fts():
+                return conn.execute(
+                    f"SELECT COUNT(*) FROM PERSONAS p WHERE {condicion}", params
+                ).fetchone()[0]
+
+            def global_():
+                return repo.buscar_global(termino, limite=20)
+
+            print(
+                f"{termino:<16}{medir(con_like):>12.2f}{medir(con_fts):>12.2f}"
+                f"{medir(global_):>13.2f}{con_fts():>11}"
+            )
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
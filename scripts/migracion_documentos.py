@@ -24,6 +24,7 @@ def crear_tabla_documentos():
             MIME_TYPE TEXT,
             DESCRIPCION TEXT,
             CONTENIDO BLOB,
+            THUMBNAIL BLOB,
             VERSION INTEGER DEFAULT 1,
             ES_VIGENTE BOOLEAN DEFAULT 1,
             CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -6,7 +6,8 @@ from dotenv import load_dotenv
 # Agregar raíz del proyecto al path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.aplicacion.servicios.servicio_notificaciones import ServicioNotificaciones
+from src.aplicacion.contenedor import obtener_contenedor
+from src.infraestructura.notificaciones.despachador_outbox import DespachadorNotificaciones
 from src.dominio.entidades.liquidacion_asesor import LiquidacionAsesor
 
 # Configurar Logging
@@ -16,7 +17,8 @@ logger = logging.getLogger(__name__)
 def test_email():
     load_dotenv()
     
-    servicio = ServicioNotificaciones()
+    contenedor = obtener_contenedor()
+    servicio = contenedor.servicio_notificaciones
     destinatario = os.getenv("SMTP_USER") # Autenvío para probar
     
     if not destinatario or "your-email" in destinatario:
@@ -36,10 +38,16 @@ def test_email():
         nombre_asesor="Administrador (Test)"
     )
     
-    if resultado:
+    if not resultado:
+        logger.error("❌ FALLO: No se pudo encolar el correo. Revisa los logs.")
+        return
+
+    # El correo queda en el outbox: se despacha un lote aquí mismo
+    resumen = DespachadorNotificaciones(contenedor.repo_notificaciones_outbox).procesar_lote()
+    if resumen["enviadas"]:
         logger.info("✅ ÉXITO: Correo enviado correctamente. Revisa tu bandeja de entrada.")
     else:
-        logger.error("❌ FALLO: El correo no se pudo enviar. Revisa los logs.")
+        logger.error(f"❌ FALLO: El correo no se pudo enviar ({resumen}). Revisa los logs.")
 
 if __name__ == "__main__":
     test_email()
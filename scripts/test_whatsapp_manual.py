@@ -6,7 +6,8 @@ from dotenv import load_dotenv
 # Agregar raíz del proyecto al path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.aplicacion.servicios.servicio_notificaciones import ServicioNotificaciones
+from src.aplicacion.contenedor import obtener_contenedor
+from src.infraestructura.notificaciones.despachador_outbox import DespachadorNotificaciones
 
 # Configurar Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -15,7 +16,8 @@ logger = logging.getLogger(__name__)
 def test_whatsapp():
     load_dotenv()
     
-    servicio = ServicioNotificaciones()
+    contenedor = obtener_contenedor()
+    servicio = contenedor.servicio_notificaciones
     
     # Mock de Recibo
     class MockRecibo:
@@ -41,10 +43,16 @@ def test_whatsapp():
             nombre_inquilino="Usuario de Prueba"
         )
         
-        if resultado:
+        if not resultado:
+            logger.error("❌ FALLO: No se pudo encolar el mensaje.")
+            return
+
+        # El mensaje queda en el outbox: se despacha un lote aquí mismo
+        resumen = DespachadorNotificaciones(contenedor.repo_notificaciones_outbox).procesar_lote()
+        if resumen["enviadas"]:
             logger.info("✅ Comando de envío ejecutado. Verifica si se envió el mensaje en WhatsApp.")
         else:
-            logger.error("❌ FALLO: El comando no se ejecutó correctamente.")
+            logger.error(f"❌ FALLO: El comando no se ejecutó correctamente ({resumen}).")
             
     except Exception as e:
         logger.error(f"❌ Error crítico: {e}")
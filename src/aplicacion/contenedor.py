@@ -0,0 +1,196 @@
+"""
+Contenedor de la aplicación: repositorios y servicios compartidos.
+
+Los handlers de Reflex construían en cada evento la misma cadena de
+repositorios y servicios (ServicioFinanciero con cinco repositorios y el
+servicio PDF, ServicioAlertas con ocho repositorios y tres servicios). El
+contenedor los arma una vez por proceso y los entrega ya cableados.
+
+Ciclos de vida:
+- Proceso (propiedades del contenedor): repositorios y servicios sin estado
+  por petición. Solo guardan el db_manager, cuya conexión es por hilo, y
+  otros colaboradores, así que se comparten entre sesiones y tareas. Se
+  construyen la primera vez que se piden.
+- Evento: lo que guarda estado de una petición (formularios, lotes) se
+  sigue construyendo en el handler.
+
+La verificación de esquema no depende del contenedor: corre una vez en el
+arranque (ver persistencia.esquema).
+"""
+
+from functools import cached_property
+from typing import Any, Optional
+
+from src.aplicacion.servicios.servicio_alertas import ServicioAlertas
+from src.aplicacion.servicios.servicio_autocompletado import ServicioAutocompletado
+from src.aplicacion.servicios.servicio_configuracion import ServicioConfiguracion
+from src.aplicacion.servicios.servicio_contratos import ServicioContratos
+from src.aplicacion.servicios.servicio_financiero import ServicioFinanciero
+from src.aplicacion.servicios.servicio_notificaciones import ServicioNotificaciones
+from src.aplicacion.servicios.servicio_recibos_publicos import ServicioRecibosPublicos
+from src.infraestructura.persistencia.repositorio_arrendatario_sqlite import (
+    RepositorioArrendatarioSQLite,
+)
+from src.infraestructura.persistencia.repositorio_codeudor_sqlite import RepositorioCodeudorSQLite
+from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
+    RepositorioContratoArrendamientoSQLite,
+)
+from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
+    RepositorioContratoMandatoSQLite,
+)
+from src.infraestructura.persistencia.repositorio_ipc_sqlite import RepositorioIPCSQLite
+from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
+    RepositorioLiquidacionSQLite,
+)
+from src.infraestructura.persistencia.repositorio_notificaciones_outbox_sqlite import (
+    RepositorioNotificacionesOutboxSQLite,
+)
+from src.infraestructura.persistencia.repositorio_propiedad_sqlite import RepositorioPropiedadSQLite
+from src.infraestructura.persistencia.repositorio_recaudo_sqlite import RepositorioRecaudoSQLite
+from src.infraestructura.persistencia.repositorio_renovacion_sqlite import (
+    RepositorioRenovacionSQLite,
+)
+from src.infraestructura.repositorios.repositorio_recibo_publico_sqlite import (
+    RepositorioReciboPublicoSQLite,
+)
+from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
+
+
+class ContenedorAplicacion:
+    """
+    Repositorios y servicios de vida de proceso sobre un db_manager.
+
+    Dos eventos concurrentes pueden construir a la vez la misma dependencia
+    la primera vez; queda una de las dos y ninguna guarda estado, así que
+    no hace falta bloquear.
+    """
+
+    def __init__(self, db_manager: Any):
+        self.db = db_manager
+
+    def reiniciar(self) -> None:
+        """Descarta las instancias construidas (p.ej. tras cambiar de base en tests)."""
+        for nombre, valor in list(vars(type(self)).items()):
+            if isinstance(valor, cached_property):
+                self.__dict__.pop(nombre, None)
+
+    # ------------------------------------------------------------------
+    # Repositorios
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def repo_recaudo(self) -> RepositorioRecaudoSQLite:
+        return RepositorioRecaudoSQLite(self.db)
+
+    @cached_property
+    def repo_liquidacion(self) -> RepositorioLiquidacionSQLite:
+        return RepositorioLiquidacionSQLite(self.db)
+
+    @cached_property
+    def repo_propiedad(self) -> RepositorioPropiedadSQLite:
+        return RepositorioPropiedadSQLite(self.db)
+
+    @cached_property
+    def repo_arriendo(self) -> RepositorioContratoArrendamientoSQLite:
+        return RepositorioContratoArrendamientoSQLite(self.db)
+
+    @cached_property
+    def repo_mandato(self) -> RepositorioContratoMandatoSQLite:
+        return RepositorioContratoMandatoSQLite(self.db)
+
+    @cached_property
+    def repo_renovacion(self) -> RepositorioRenovacionSQLite:
+        return RepositorioRenovacionSQLite(self.db)
+
+    @cached_property
+    def repo_ipc(self) -> RepositorioIPCSQLite:
+        return RepositorioIPCSQLite(self.db)
+
+    @cached_property
+    def repo_arrendatario(self) -> RepositorioArrendatarioSQLite:
+        return RepositorioArrendatarioSQLite(self.db)
+
+    @cached_property
+    def repo_codeudor(self) -> RepositorioCodeudorSQLite:
+        return RepositorioCodeudorSQLite(self.db)
+
+    @cached_property
+    def repo_recibo_publico(self) -> RepositorioReciboPublicoSQLite:
+        return RepositorioReciboPublicoSQLite(self.db)
+
+    @cached_property
+    def repo_notificaciones_outbox(self) -> RepositorioNotificacionesOutboxSQLite:
+        return RepositorioNotificacionesOutboxSQLite(self.db)
+
+    # ------------------------------------------------------------------
+    # Servicios
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def servicio_documentos_pdf(self) -> ServicioDocumentosPDF:
+        return ServicioDocumentosPDF()
+
+    @cached_property
+    def servicio_configuracion(self) -> ServicioConfiguracion:
+        return ServicioConfiguracion(self.db)
+
+    @cached_property
+    def servicio_autocompletado(self) -> ServicioAutocompletado:
+        return ServicioAutocompletado(self.db)
+
+    @cached_property
+    def servicio_financiero(self) -> ServicioFinanciero:
+        return ServicioFinanciero(
+            repo_recaudo=self.repo_recaudo,
+            repo_liquidacion=self.repo_liquidacion,
+            repo_propiedad=self.repo_propiedad,
+            repo_arriendo=self.repo_arriendo,
+            repo_mandato=self.repo_mandato,
+            pdf_service=self.servicio_documentos_pdf,
+        )
+
+    @cached_property
+    def servicio_contratos(self) -> ServicioContratos:
+        return ServicioContratos(
+            self.db,
+            repo_mandato=self.repo_mandato,
+            repo_arriendo=self.repo_arriendo,
+            repo_propiedad=self.repo_propiedad,
+            repo_renovacion=self.repo_renovacion,
+            repo_ipc=self.repo_ipc,
+            repo_arrendatario=self.repo_arrendatario,
+            repo_codeudor=self.repo_codeudor,
+        )
+
+    @cached_property
+    def servicio_recibos_publicos(self) -> ServicioRecibosPublicos:
+        return ServicioRecibosPublicos(self.repo_recibo_publico, self.repo_propiedad)
+
+    @cached_property
+    def servicio_notificaciones(self) -> ServicioNotificaciones:
+        """Encola en el outbox; los envía el despachador en segundo plano."""
+        return ServicioNotificaciones(outbox=self.repo_notificaciones_outbox)
+
+    @cached_property
+    def servicio_alertas(self) -> ServicioAlertas:
+        return ServicioAlertas(
+            self.db,
+            servicio_config=self.servicio_configuracion,
+            servicio_contratos=self.servicio_contratos,
+            servicio_recibos=self.servicio_recibos_publicos,
+            repo_cartera_mora=self.repo_recaudo.cartera_mora,
+        )
+
+
+# Instancia global (patrón de get_pdf_service / obtener_configuracion)
+_contenedor: Optional[ContenedorAplicacion] = None
+
+
+def obtener_contenedor() -> ContenedorAplicacion:
+    """Contenedor del proceso sobre el db_manager global."""
+    global _contenedor
+    if _contenedor is None:
+        from src.infraestructura.persistencia.database import db_manager
+
+        _contenedor = ContenedorAplicacion(db_manager)
+    return _contenedor
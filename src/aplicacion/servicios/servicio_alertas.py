@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from src.aplicacion.servicios.servicio_contratos import ServicioContratos
 from src.aplicacion.servicios.servicio_recibos_publicos import ServicioRecibosPublicos
@@ -12,6 +12,9 @@ from src.infraestructura.persistencia.repositorio_renovacion_sqlite import Repos
 from src.infraestructura.persistencia.repositorio_ipc_sqlite import RepositorioIPCSQLite
 from src.infraestructura.persistencia.repositorio_arrendatario_sqlite import RepositorioArrendatarioSQLite
 from src.infraestructura.persistencia.repositorio_codeudor_sqlite import RepositorioCodeudorSQLite
+from src.infraestructura.persistencia.repositorio_cartera_mora_sqlite import (
+    RepositorioCarteraMoraSQLite,
+)
 from src.infraestructura.repositorios.repositorio_recibo_publico_sqlite import (
     RepositorioReciboPublicoSQLite,
 )
@@ -23,35 +26,43 @@ class ServicioAlertas:
     Centraliza notificaciones de vencimientos y eventos críticos.
     """
 
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        servicio_config: Optional[ServicioConfiguracion] = None,
+        servicio_contratos: Optional[ServicioContratos] = None,
+        servicio_recibos: Optional[ServicioRecibosPublicos] = None,
+        repo_cartera_mora: Optional[RepositorioCarteraMoraSQLite] = None,
+    ):
+        """
+        Recibe los servicios ya cableados (ver ContenedorAplicacion); los que
+        falten se construyen aquí.
+        """
         self.db = db_manager
-        
-        # Instanciar Repositorios
-        repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-        repo_mandato = RepositorioContratoMandatoSQLite(db_manager)
-        repo_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-        repo_renovacion = RepositorioRenovacionSQLite(db_manager)
-        repo_ipc = RepositorioIPCSQLite(db_manager)
-        repo_arrendatario = RepositorioArrendatarioSQLite(db_manager)
-        repo_codeudor = RepositorioCodeudorSQLite(db_manager)
-        repo_recibos = RepositorioReciboPublicoSQLite(db_manager)
 
         # Servicio de Configuración para parámetros globales
-        self.servicio_config = ServicioConfiguracion(db_manager)
-
-        # Inicializar Servicios con dependencias
-        self.servicio_contratos = ServicioContratos(
-            db_manager,
-            repo_mandato=repo_mandato,
-            repo_arriendo=repo_arriendo,
-            repo_propiedad=repo_propiedad,
-            repo_renovacion=repo_renovacion,
-            repo_ipc=repo_ipc,
-            repo_arrendatario=repo_arrendatario,
-            repo_codeudor=repo_codeudor
-        )
-
-        self.servicio_recibos = ServicioRecibosPublicos(repo_recibos, repo_propiedad)
+        self.servicio_config = servicio_config or ServicioConfiguracion(db_manager)
+
+        if servicio_contratos is None or servicio_recibos is None:
+            repo_propiedad = RepositorioPropiedadSQLite(db_manager)
+        if servicio_contratos is None:
+            servicio_contratos = ServicioContratos(
+                db_manager,
+                repo_mandato=RepositorioContratoMandatoSQLite(db_manager),
+                repo_arriendo=RepositorioContratoArrendamientoSQLite(db_manager),
+                repo_propiedad=repo_propiedad,
+                repo_renovacion=RepositorioRenovacionSQLite(db_manager),
+                repo_ipc=RepositorioIPCSQLite(db_manager),
+                repo_arrendatario=RepositorioArrendatarioSQLite(db_manager),
+                repo_codeudor=RepositorioCodeudorSQLite(db_manager),
+            )
+        if servicio_recibos is None:
+            servicio_recibos = ServicioRecibosPublicos(
+                RepositorioReciboPublicoSQLite(db_manager), repo_propiedad
+            )
+        self.servicio_contratos = servicio_contratos
+        self.servicio_recibos = servicio_recibos
+        self.repo_cartera_mora = repo_cartera_mora or RepositorioCarteraMoraSQLite(db_manager)
 
     def obtener_alertas(self) -> List[Dict[str, Any]]:
         """
@@ -161,4 +172,18 @@ class ServicioAlertas:
                 }
             )
 
+        # 4. Arriendos en mora (libro CARTERA_MORA, causado a diario)
+        for c in self.repo_cartera_mora.listar_contratos_en_mora(limite=50):
+            alertas.append(
+                {
+                    "id": f"mora_{c['id_contrato']}",
+                    "tipo": "Contrato",
+                    "mensaje": f"Arriendo en MORA ({c['dias_retraso']} días): {c['direccion']} "
+                    f"- ${c['monto']:,.0f}",
+                    "fecha": c["fecha_vencimiento"],
+                    "nivel": "danger" if c["dias_retraso"] > 30 else "warning",
+                    "link": "/recaudos",
+                }
+            )
+
         return alertas
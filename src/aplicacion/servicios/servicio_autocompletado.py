@@ -0,0 +1,250 @@
+"""
+Servicio de Aplicación: Autocompletado de entidades para pickers.
+
+Reemplaza las listas completas de opciones que los estados Reflex cargaban
+en cada visita (propiedades, propietarios, asesores, arrendatarios...). Cada
+catálogo se indexa en memoria una sola vez por proceso y el picker solo
+recibe los K mejores resultados de cada búsqueda.
+
+Los índices se descartan cuando el CacheManager invalida alguno de los
+namespaces de los que dependen (personas, propiedades, mandatos, arriendos)
+y, como respaldo, al vencer su TTL.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.dominio.servicios.indice_autocompletado import (
+    IndiceAutocompletado,
+    OpcionAutocompletado,
+)
+from src.infraestructura.cache.cache_manager import cache_manager
+from src.infraestructura.persistencia.database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Catalogo:
+    """Consulta que alimenta un índice (columnas ID, TEXTO, DETALLE, EXTRA)."""
+
+    sql: str
+    dependencias: Tuple[str, ...]
+
+
+CATALOGOS: Dict[str, Catalogo] = {
+    "propiedades": Catalogo(
+        sql="""
+            SELECT P.ID_PROPIEDAD AS ID, P.DIRECCION_PROPIEDAD AS TEXTO,
+                   P.MATRICULA_INMOBILIARIA AS DETALLE, P.CANON_ARRENDAMIENTO_ESTIMADO AS EXTRA
+            FROM PROPIEDADES P
+            WHERE P.ESTADO_REGISTRO = TRUE
+            ORDER BY P.DIRECCION_PROPIEDAD
+        """,
+        dependencias=("propiedades",),
+    ),
+    # Nuevo mandato: propiedades sin mandato activo
+    "propiedades_sin_mandato": Catalogo(
+        sql="""
+            SELECT P.ID_PROPIEDAD AS ID, P.DIRECCION_PROPIEDAD AS TEXTO,
+                   P.MATRICULA_INMOBILIARIA AS DETALLE, P.CANON_ARRENDAMIENTO_ESTIMADO AS EXTRA
+            FROM PROPIEDADES P
+            WHERE P.ESTADO_REGISTRO = TRUE
+            AND NOT EXISTS (
+                SELECT 1 FROM CONTRATOS_MANDATOS CM
+                WHERE CM.ID_PROPIEDAD = P.ID_PROPIEDAD
+                AND CM.ESTADO_CONTRATO_M = 'Activo'
+            )
+            ORDER BY P.DIRECCION_PROPIEDAD
+        """,
+        dependencias=("propiedades", "mandatos"),
+    ),
+    # Nuevo arrendamiento: mandato activo y sin arrendamiento activo
+    "propiedades_para_arriendo": Catalogo(
+        sql="""
+            SELECT P.ID_PROPIEDAD AS ID, P.DIRECCION_PROPIEDAD AS TEXTO,
+                   P.MATRICULA_INMOBILIARIA AS DETALLE, P.CANON_ARRENDAMIENTO_ESTIMADO AS EXTRA
+            FROM PROPIEDADES P
+            WHERE P.ESTADO_REGISTRO = TRUE
+            AND EXISTS (
+                SELECT 1 FROM CONTRATOS_MANDATOS CM
+                WHERE CM.ID_PROPIEDAD = P.ID_PROPIEDAD
+                AND CM.ESTADO_CONTRATO_M = 'Activo'
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM CONTRATOS_ARRENDAMIENTOS CA
+                WHERE CA.ID_PROPIEDAD = P.ID_PROPIEDAD
+                AND CA.ESTADO_CONTRATO_A = 'Activo'
+            )
+            ORDER BY P.DIRECCION_PROPIEDAD
+        """,
+        dependencias=("propiedades", "mandatos", "arriendos"),
+    ),
+    # Liquidaciones: propiedades con mandato activo
+    "propiedades_con_mandato": Catalogo(
+        sql="""
+            SELECT P.ID_PROPIEDAD AS ID, P.DIRECCION_PROPIEDAD AS TEXTO,
+                   P.MATRICULA_INMOBILIARIA AS DETALLE, NULL AS EXTRA
+            FROM PROPIEDADES P
+            WHERE EXISTS (
+                SELECT 1 FROM CONTRATOS_MANDATOS CM
+                WHERE CM.ID_PROPIEDAD = P.ID_PROPIEDAD
+                AND CM.ESTADO_CONTRATO_M = 'Activo'
+            )
+            ORDER BY P.DIRECCION_PROPIEDAD
+        """,
+        dependencias=("propiedades", "mandatos"),
+    ),
+    "propietarios": Catalogo(
+        sql="""
+            SELECT PR.ID_PROPIETARIO AS ID, P.NOMBRE_COMPLETO AS TEXTO,
+                   P.NUMERO_DOCUMENTO AS DETALLE, NULL AS EXTRA
+            FROM PERSONAS P
+            INNER JOIN PROPIETARIOS PR ON P.ID_PERSONA = PR.ID_PERSONA
+            WHERE P.ESTADO_REGISTRO = TRUE AND PR.ESTADO_PROPIETARIO = TRUE
+            ORDER BY P.NOMBRE_COMPLETO
+        """,
+        dependencias=("personas",),
+    ),
+    # Liquidaciones: propietarios con mandato activo
+    "propietarios_con_mandato": Catalogo(
+        sql="""
+            SELECT PR.ID_PROPIETARIO AS ID, P.NOMBRE_COMPLETO AS TEXTO,
+                   P.NUMERO_DOCUMENTO AS DETALLE, NULL AS EXTRA
+            FROM PERSONAS P
+            INNER JOIN PROPIETARIOS PR ON P.ID_PERSONA = PR.ID_PERSONA
+            WHERE EXISTS (
+                SELECT 1 FROM CONTRATOS_MANDATOS CM
+                WHERE CM.ID_PROPIETARIO = PR.ID_PROPIETARIO
+                AND CM.ESTADO_CONTRATO_M = 'Activo'
+            )
+            ORDER BY P.NOMBRE_COMPLETO
+        """,
+        dependencias=("personas", "mandatos"),
+    ),
+    "asesores": Catalogo(
+        sql="""
+            SELECT A.ID_ASESOR AS ID, P.NOMBRE_COMPLETO AS TEXTO,
+                   P.NUMERO_DOCUMENTO AS DETALLE, NULL AS EXTRA
+            FROM PERSONAS P
+            INNER JOIN ASESORES A ON P.ID_PERSONA = A.ID_PERSONA
+            WHERE P.ESTADO_REGISTRO = TRUE AND A.ESTADO = TRUE
+            ORDER BY P.NOMBRE_COMPLETO
+        """,
+        dependencias=("personas",),
+    ),
+    "arrendatarios": Catalogo(
+        sql="""
+            SELECT A.ID_ARRENDATARIO AS ID, P.NOMBRE_COMPLETO AS TEXTO,
+                   P.NUMERO_DOCUMENTO AS DETALLE, NULL AS EXTRA
+            FROM PERSONAS P
+            INNER JOIN ARRENDATARIOS A ON P.ID_PERSONA = A.ID_PERSONA
+            WHERE P.ESTADO_REGISTRO = TRUE AND A.ESTADO_ARRENDATARIO = TRUE
+            ORDER BY P.NOMBRE_COMPLETO
+        """,
+        dependencias=("personas",),
+    ),
+    "codeudores": Catalogo(
+        sql="""
+            SELECT C.ID_CODEUDOR AS ID, P.NOMBRE_COMPLETO AS TEXTO,
+                   P.NUMERO_DOCUMENTO AS DETALLE, NULL AS EXTRA
+            FROM PERSONAS P
+            INNER JOIN CODEUDORES C ON P.ID_PERSONA = C.ID_PERSONA
+            WHERE P.ESTADO_REGISTRO = TRUE AND C.ESTADO_REGISTRO = TRUE
+            ORDER BY P.NOMBRE_COMPLETO
+        """,
+        dependencias=("personas",),
+    ),
+}
+
+# Índices compartidos por todas las sesiones: (origen BD, catálogo) -> (construido_en, índice)
+_indices: Dict[Tuple[str, str], Tuple[float, IndiceAutocompletado]] = {}
+_lock = threading.Lock()
+
+
+def _al_invalidar_cache(namespace: str) -> None:
+    """Descarta los índices que dependen del namespace invalidado (ej. 'mandatos:list')."""
+    base = namespace.split(":", 1)[0]
+    with _lock:
+        for clave in [c for c in _indices if base in CATALOGOS[c[1]].dependencias]:
+            del _indices[clave]
+
+
+cache_manager.add_invalidation_listener(_al_invalidar_cache)
+
+
+class ServicioAutocompletado:
+    """Búsqueda top-K sobre catálogos de entidades indexados en memoria."""
+
+    def __init__(self, db_manager: DatabaseManager, ttl_segundos: int = 300):
+        self.db = db_manager
+        self.ttl_segundos = ttl_segundos
+
+    def _origen(self) -> str:
+        if getattr(self.db, "use_postgresql", False):
+            return "postgresql"
+        return str(getattr(self.db, "database_path", ""))
+
+    def _construir(self, catalogo: str) -> IndiceAutocompletado:
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(CATALOGOS[catalogo].sql)
+        opciones = [
+            OpcionAutocompletado(
+                id=str(row["ID"]),
+                texto=str(row["TEXTO"] or ""),
+                detalle=str(row["DETALLE"] or ""),
+                extra=row["EXTRA"],
+            )
+            for row in cursor.fetchall()
+        ]
+        return IndiceAutocompletado(opciones)
+
+    def indice(self, catalogo: str) -> IndiceAutocompletado:
+        """Índice vigente del catálogo (lo construye si no existe o venció)."""
+        if catalogo not in CATALOGOS:
+            raise ValueError(f"Catálogo de autocompletado desconocido: {catalogo}")
+
+        clave = (self._origen(), catalogo)
+        entrada = _indices.get(clave)
+        if entrada and time.time() - entrada[0] <= self.ttl_segundos:
+            return entrada[1]
+
+        inicio = time.perf_counter()
+        indice = self._construir(catalogo)
+        with _lock:
+            _indices[clave] = (time.time(), indice)
+        logger.debug(
+            f"Índice '{catalogo}' construido: {len(indice)} opciones "
+            f"en {(time.perf_counter() - inicio) * 1000:.1f} ms"
+        )
+        return indice
+
+    def buscar(self, catalogo: str, termino: str = "", limite: int = 10) -> List[Dict[str, Any]]:
+        """
+        Top-K del catálogo para el término (prefijo + trigramas, sin tildes).
+
+        Returns:
+            Lista de dicts {id, texto, detalle, extra}
+        """
+        return [o.to_dict() for o in self.indice(catalogo).buscar(termino, limite)]
+
+    def obtener(self, catalogo: str, id_opcion: Any) -> Optional[Dict[str, Any]]:
+        """Opción por ID (etiqueta del valor ya seleccionado, datos auxiliares)."""
+        opcion = self.indice(catalogo).obtener(id_opcion)
+        return opcion.to_dict() if opcion else None
+
+    def listar(self, catalogo: str) -> List[Dict[str, Any]]:
+        """Catálogo completo, solo para selects de catálogos pequeños (ej. asesores)."""
+        return [o.to_dict() for o in self.indice(catalogo).opciones]
+
+    def invalidar(self, catalogo: Optional[str] = None) -> None:
+        """Descarta el índice de un catálogo (o todos) para esta base de datos."""
+        origen = self._origen()
+        with _lock:
+            for clave in [c for c in _indices if c[0] == origen]:
+                if catalogo is None or clave[1] == catalogo:
+                    del _indices[clave]
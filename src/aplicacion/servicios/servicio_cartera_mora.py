@@ -0,0 +1,105 @@
+"""
+Servicio de Aplicación: Cartera en Mora
+Causación diaria del libro CARTERA_MORA y verificación contra la vista de mora.
+"""
+
+import logging
+import threading
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Any, Dict, Optional
+
+from src.infraestructura.cache.cache_manager import cache_manager
+from src.infraestructura.persistencia.repositorio_cartera_mora_sqlite import (
+    RepositorioCarteraMoraSQLite,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ServicioCarteraMora:
+    """Causa la mora diaria y expone los saldos del libro."""
+
+    def __init__(self, repo_cartera_mora: RepositorioCarteraMoraSQLite):
+        self.repo = repo_cartera_mora
+
+    @cache_manager.invalidates("dashboard:cartera_mora")
+    def causar(self, fecha_corte: Optional[str] = None) -> Dict[str, int]:
+        """Crea los cargos vencidos del día y recalcula días e interés de mora."""
+        resultado = self.repo.causar(fecha_corte)
+        logger.info(
+            f"Causación de mora: {resultado['cargos_creados']} cargos, "
+            f"{resultado['filas_actualizadas']} filas recalculadas"
+        )
+        return resultado
+
+    @cache_manager.invalidates("dashboard:cartera_mora")
+    def reconstruir(
+        self, fecha_corte: Optional[str] = None, desde_periodo: Optional[str] = None
+    ) -> int:
+        """Reconstruye el libro completo (carga inicial o corrección)."""
+        return self.repo.reconstruir(fecha_corte, desde_periodo)
+
+    def verificar_consistencia(self) -> Dict[str, Any]:
+        """Compara el libro con VW_ALERTA_MORA_DIARIA y registra las diferencias."""
+        resultado = self.repo.verificar_consistencia()
+        if not resultado["consistente"]:
+            logger.warning(
+                f"Cartera en mora: {len(resultado['diferencias'])} contrato(s) difieren de "
+                "VW_ALERTA_MORA_DIARIA"
+            )
+        return resultado
+
+
+class CausacionDiariaMora:
+    """Hilo que ejecuta la causación una vez por día mientras la app está arriba."""
+
+    def __init__(self, servicio: ServicioCarteraMora, intervalo_segundos: float = 3600):
+        self.servicio = servicio
+        self.intervalo_segundos = intervalo_segundos
+        self.ultima_fecha: Optional[date] = None
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def ejecutar_si_corresponde(self) -> bool:
+        """Causa si aún no se ha causado hoy."""
+        hoy = date.today()
+        if self.ultima_fecha == hoy:
+            return False
+        self.servicio.causar(hoy.isoformat())
+        self.ultima_fecha = hoy
+        return True
+
+    def _bucle(self) -> None:
+        while not self._detener.is_set():
+            try:
+                self.ejecutar_si_corresponde()
+            except Exception as e:
+                logger.error(f"Error en la causación de mora: {e}")
+            self._detener.wait(self.intervalo_segundos)
+
+    def iniciar(self) -> None:
+        if self._hilo and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, daemon=True, name="CausacionMora")
+        self._hilo.start()
+
+    def detener(self, timeout: float = 10.0) -> None:
+        self._detener.set()
+        if self._hilo:
+            self._hilo.join(timeout=timeout)
+            self._hilo = None
+
+
+@asynccontextmanager
+async def causacion_mora_en_segundo_plano():
+    """Lifespan task de Reflex: causa la cartera en mora una vez al día."""
+    from src.infraestructura.persistencia.database import db_manager
+
+    causacion = CausacionDiariaMora(ServicioCarteraMora(RepositorioCarteraMoraSQLite(db_manager)))
+    causacion.iniciar()
+    try:
+        yield
+    finally:
+        causacion.detener()
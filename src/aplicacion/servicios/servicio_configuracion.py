@@ -5,7 +5,7 @@ Gestiona usuarios, IPC y parámetros del sistema.
 
 import hashlib
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from src.dominio.entidades.auditoria_cambio import AuditoriaCambio
 from src.dominio.entidades.ipc import IPC
@@ -422,3 +422,28 @@ class ServicioConfiguracion:
     def buscar_auditoria_por_tabla(self, tabla: str, limit: int = 100) -> List[AuditoriaCambio]:
         """Busca auditoría filtrando por tabla."""
         return self.repo_auditoria.buscar_por_tabla(tabla, limit)
+
+    def buscar_auditoria(
+        self,
+        tablas: Optional[Sequence[str]] = None,
+        usuario: Optional[str] = None,
+        accion: Optional[str] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        texto: Optional[str] = None,
+        id_registro: Optional[int] = None,
+        limit: int = 50,
+        despues_de: Optional[int] = None,
+    ) -> List[AuditoriaCambio]:
+        """Busca auditoría con filtros en SQL y paginación keyset (ver RepositorioAuditoriaSQLite.buscar)."""
+        return self.repo_auditoria.buscar(
+            tablas=tablas,
+            id_registro=id_registro,
+            usuario=usuario,
+            accion=accion,
+            fecha_desde=fecha_desde,
+            fecha_hasta=fecha_hasta,
+            texto=texto,
+            limit=limit,
+            despues_de=despues_de,
+        )
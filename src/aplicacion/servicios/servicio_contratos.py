@@ -15,6 +15,7 @@ from src.aplicacion.servicios.servicio_contrato_arrendamiento import (
     ServicioContratoArrendamiento,
 )
 from src.aplicacion.servicios.servicio_contrato_mandato import ServicioContratoMandato
+from src.aplicacion.servicios.servicio_ipc import ServicioIPC
 from src.infraestructura.cache.cache_manager import cache_manager
 from src.infraestructura.persistencia.database import DatabaseManager
 from src.infraestructura.persistencia.repositorio_arrendatario_sqlite import (
@@ -27,6 +28,9 @@ from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite
 from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
     RepositorioContratoMandatoSQLite,
 )
+from src.infraestructura.persistencia.repositorio_contratos_unificado_sqlite import (
+    RepositorioContratosUnificadoSQLite,
+)
 from src.infraestructura.persistencia.repositorio_ipc_sqlite import RepositorioIPCSQLite
 from src.infraestructura.persistencia.repositorio_propiedad_sqlite import RepositorioPropiedadSQLite
 from src.infraestructura.persistencia.repositorio_renovacion_sqlite import (
@@ -65,6 +69,9 @@ class ServicioContratos:
         self.repo_arrendatario = repo_arrendatario
         self.repo_codeudor = repo_codeudor
 
+        # Read model unificado (listado "Todos" y exportación)
+        self.repo_contratos = RepositorioContratosUnificadoSQLite(db_manager)
+
     # =========================================================================
     # DROPDOWN HELPERS
     # =========================================================================
@@ -221,6 +228,10 @@ class ServicioContratos:
     def listar_mandatos_paginado(self, **kwargs) -> Any:
         return self.servicio_mandato.listar_mandatos_paginado(**kwargs)
 
+    def listar_contratos_paginado(self, **kwargs) -> Any:
+        """Mandatos y arrendamientos en un solo listado (orden global, un conteo)."""
+        return self.repo_contratos.listar_paginado(**kwargs)
+
     def listar_mandatos_activos(self) -> List[Dict[str, Any]]:
         """
         Retorna lista de mandatos ACTIVOS para dropdowns.
@@ -472,57 +483,13 @@ class ServicioContratos:
         import csv
         import io
 
-        # Helper para obtener valor seguro de diccionario (case insensitive fallback)
-        def get_val(row: dict, keys: list) -> Any:
-            for k in keys:
-                if k in row:
-                    return row[k]
-                if k.lower() in row:
-                    return row[k.lower()]
-                if k.upper() in row:
-                    return row[k.upper()]
-            return ""
-
-        # 1. Obtener datos (sin paginación)
-        items = []
-
-        # Mandatos
-        if filtro_tipo in ["Todos", "Mandato"]:
-            resultado_mandatos = self._listar_todos_mandatos(estado, busqueda)
-            for m in resultado_mandatos:
-                items.append(
-                    {
-                        "id": get_val(m, ["ID_CONTRATO_M", "id"]),
-                        "tipo": "Mandato",
-                        "estado": get_val(m, ["ESTADO_CONTRATO_M", "estado"]),
-                        "propiedad": get_val(m, ["DIRECCION_PROPIEDAD", "propiedad"]),
-                        "persona": get_val(
-                            m, ["PROPIETARIO", "nombre_propietario", "nombre_completo"]
-                        ),
-                        "documento": get_val(m, ["NUMERO_DOCUMENTO", "documento_propietario"]),
-                        "canon": get_val(m, ["CANON_MANDATO", "canon"]),
-                        "fecha_inicio": get_val(m, ["FECHA_INICIO_CONTRATO_M", "fecha_inicio"]),
-                        "fecha_fin": get_val(m, ["FECHA_FIN_CONTRATO_M", "fecha_fin"]),
-                    }
-                )
-
-        # Arrendamientos
-        if filtro_tipo in ["Todos", "Arrendamiento"]:
-            resultado_arriendos = self._listar_todos_arrendamientos(estado, busqueda)
-            for a in resultado_arriendos:
-                items.append(
-                    {
-                        "id": get_val(a, ["ID_CONTRATO_A", "id"]),
-                        "tipo": "Arrendamiento",
-                        "estado": get_val(a, ["ESTADO_CONTRATO_A", "estado"]),
-                        "propiedad": get_val(a, ["DIRECCION_PROPIEDAD", "propiedad"]),
-                        "persona": get_val(a, ["ARRENDATARIO", "nombre_b", "nombre_completo"]),
-                        "documento": get_val(a, ["NUMERO_DOCUMENTO", "documento"]),
-                        "canon": get_val(a, ["CANON_ARRENDAMIENTO", "canon"]),
-                        "fecha_inicio": get_val(a, ["FECHA_INICIO_CONTRATO_A", "fecha_inicio"]),
-                        "fecha_fin": get_val(a, ["FECHA_FIN_CONTRATO_A", "fecha_fin"]),
-                    }
-                )
+        # 1. Obtener datos (sin paginación, mismos filtros que el listado)
+        items = self.repo_contratos.listar_todos(tipo=filtro_tipo, estado=estado, busqueda=busqueda)
+        for item in items:
+            item["persona"] = item.get("propietario", item.get("arrendatario", ""))
+            item["documento"] = item.get(
+                "documento_propietario", item.get("documento_arrendatario", "")
+            )
 
         # 2. Generar CSV
         output = io.StringIO()
@@ -561,121 +528,6 @@ class ServicioContratos:
 
         return output.getvalue()
 
-    def _listar_todos_mandatos(self, estado, busqueda):
-        """Helper para exportación: Trae mandatos sin paginación."""
-        with self.db.obtener_conexion() as conn:
-            cursor = self.db.get_dict_cursor(conn)
-            placeholder = self.db.get_placeholder()
-
-            base_query = """
-                SELECT 
-                    cm.ID_CONTRATO_M as id,
-                    cm.ESTADO_CONTRATO_M as estado,
-                    cm.CANON_MANDATO as canon,
-                    cm.FECHA_INICIO_CONTRATO_M as fecha_inicio,
-                    cm.FECHA_FIN_CONTRATO_M as fecha_fin,
-                    p.DIRECCION_PROPIEDAD as propiedad,
-                    per.NOMBRE_COMPLETO as propietario,
-                    per.NUMERO_DOCUMENTO as documento_propietario
-                FROM CONTRATOS_MANDATOS cm
-                JOIN PROPIEDADES p ON cm.ID_PROPIEDAD = p.ID_PROPIEDAD
-                JOIN PROPIETARIOS prop ON cm.ID_PROPIEDAD = prop.ID_PROPIEDAD -- Correction: ID_PROPIETARIO usually linked via mandate or prop? Mandato structure: cm.ID_PROPIETARIO
-                JOIN PROPIETARIOS prop_correct ON cm.ID_PROPIETARIO = prop_correct.ID_PROPIETARIO
-                JOIN PERSONAS per ON prop_correct.ID_PERSONA = per.ID_PERSONA
-            """
-            # Correction on JOIN: The previous listar_mandatos had:
-            # JOIN PROPIETARIOS prop ON cm.ID_PROPIETARIO = prop.ID_PROPIETARIO
-
-            base_query = """
-                SELECT 
-                    cm.ID_CONTRATO_M as id,
-                    cm.ESTADO_CONTRATO_M as estado,
-                    cm.CANON_MANDATO as canon,
-                    cm.FECHA_INICIO_CONTRATO_M as fecha_inicio,
-                    cm.FECHA_FIN_CONTRATO_M as fecha_fin,
-                    p.DIRECCION_PROPIEDAD as propiedad,
-                    per.NOMBRE_COMPLETO as propietario,
-                    per.NUMERO_DOCUMENTO as documento_propietario
-                FROM CONTRATOS_MANDATOS cm
-                JOIN PROPIEDADES p ON cm.ID_PROPIEDAD = p.ID_PROPIEDAD
-                JOIN PROPIETARIOS prop ON cm.ID_PROPIETARIO = prop.ID_PROPIETARIO
-                JOIN PERSONAS per ON prop.ID_PERSONA = per.ID_PERSONA
-            """
-
-            conditions = []
-            params = []
-
-            if estado and estado != "Todos":
-                if estado == "Activo":
-                    conditions.append("cm.ESTADO_CONTRATO_M = 'Activo'")
-                elif estado == "Cancelado":
-                    conditions.append("cm.ESTADO_CONTRATO_M != 'Activo'")
-                else:
-                    conditions.append(f"cm.ESTADO_CONTRATO_M = {placeholder}")
-                    params.append(estado)
-
-            if busqueda:
-                conditions.append(
-                    f"(p.DIRECCION_PROPIEDAD LIKE {placeholder} OR per.NOMBRE_COMPLETO LIKE {placeholder})"
-                )
-                params.extend([f"%{busqueda}%", f"%{busqueda}%"])
-
-            if conditions:
-                base_query += " WHERE " + " AND ".join(conditions)
-
-            base_query += " ORDER BY cm.ID_CONTRATO_M DESC"
-
-            cursor.execute(base_query, params)
-            return cursor.fetchall()
-
-    def _listar_todos_arrendamientos(self, estado, busqueda):
-        """Helper para exportación: Trae arriendos sin paginación."""
-        with self.db.obtener_conexion() as conn:
-            cursor = self.db.get_dict_cursor(conn)
-            placeholder = self.db.get_placeholder()
-
-            base_query = """
-                SELECT 
-                    ca.ID_CONTRATO_A as id,
-                    ca.ESTADO_CONTRATO_A as estado,
-                    ca.CANON_ARRENDAMIENTO as canon,
-                    ca.FECHA_INICIO_CONTRATO_A as fecha_inicio,
-                    ca.FECHA_FIN_CONTRATO_A as fecha_fin,
-                    p.DIRECCION_PROPIEDAD as propiedad,
-                    per.NOMBRE_COMPLETO as arrendatario,
-                    per.NUMERO_DOCUMENTO as documento_arrendatario
-                FROM CONTRATOS_ARRENDAMIENTOS ca
-                JOIN PROPIEDADES p ON ca.ID_PROPIEDAD = p.ID_PROPIEDAD
-                JOIN ARRENDATARIOS arr ON ca.ID_ARRENDATARIO = arr.ID_ARRENDATARIO
-                JOIN PERSONAS per ON arr.ID_PERSONA = per.ID_PERSONA
-            """
-
-            conditions = []
-            params = []
-
-            if estado and estado != "Todos":
-                if estado == "Activo":
-                    conditions.append("ca.ESTADO_CONTRATO_A = 'Activo'")
-                elif estado == "Cancelado":
-                    conditions.append("ca.ESTADO_CONTRATO_A != 'Activo'")
-                else:
-                    conditions.append(f"ca.ESTADO_CONTRATO_A = {placeholder}")
-                    params.append(estado)
-
-            if busqueda:
-                conditions.append(
-                    f"(p.DIRECCION_PROPIEDAD LIKE {placeholder} OR per.NOMBRE_COMPLETO LIKE {placeholder})"
-                )
-                params.extend([f"%{busqueda}%", f"%{busqueda}%"])
-
-            if conditions:
-                base_query += " WHERE " + " AND ".join(conditions)
-
-            base_query += " ORDER BY ca.ID_CONTRATO_A DESC"
-
-            cursor.execute(base_query, params)
-            return cursor.fetchall()
-
     def obtener_detalle_contrato_ui(self, id_contrato: int, tipo: str) -> Optional[Dict[str, Any]]:
         """
         Obtiene detalles completos de un contrato para mostrar en la UI.
@@ -1000,6 +852,9 @@ class ServicioContratos:
         """
         Verifica contratos por vencer y genera alertas (90, 60, 30, 0 días).
         Se recomienda ejecutar este método diariamente (Job).
+
+        SQL estilo SQLite (date/strftime, '?'): en PostgreSQL lo traduce el
+        compilador SQL del cursor. Las filas se leen por nombre de columna.
         """
         dias_alerta = [90, 60, 30, 0]
 
@@ -1023,8 +878,8 @@ class ServicioContratos:
                     self._crear_alerta(
                         conn,
                         tipo="Vencimiento Contrato Mandato",
-                        descripcion=f"El contrato de mandato {m[0]} vence en {dias} días (Fecha: {m[1]}).",
-                        id_entidad=m[0],
+                        descripcion=f"El contrato de mandato {m['ID_CONTRATO_M']} vence en {dias} días (Fecha: {m['FECHA_FIN_CONTRATO_M']}).",
+                        id_entidad=m["ID_CONTRATO_M"],
                         tipo_entidad="CONTRATO_MANDATO",
                         usuario=usuario_sistema,
                     )
@@ -1044,8 +899,8 @@ class ServicioContratos:
                     self._crear_alerta(
                         conn,
                         tipo="Vencimiento Contrato Arrendamiento",
-                        descripcion=f"El contrato de arrendamiento {a[0]} vence en {dias} días (Fecha: {a[1]}).",
-                        id_entidad=a[0],
+                        descripcion=f"El contrato de arrendamiento {a['ID_CONTRATO_A']} vence en {dias} días (Fecha: {a['FECHA_FIN_CONTRATO_A']}).",
+                        id_entidad=a["ID_CONTRATO_A"],
                         tipo_entidad="CONTRATO_ARRENDAMIENTO",
                         usuario=usuario_sistema,
                     )
@@ -1065,7 +920,7 @@ class ServicioContratos:
 
             for a in arriendos_ipc:
                 # Calcular qué aniversario es
-                datetime.strptime(a[1], "%Y-%m-%d")
+                datetime.strptime(a["FECHA_INICIO_CONTRATO_A"], "%Y-%m-%d")
                 datetime.now()  # Aprox, para el mensaje
                 # Aniversario numero?
                 # Si hoy es 2024, inicia 2023 -> 1er aniversario.
@@ -1073,8 +928,8 @@ class ServicioContratos:
                 self._crear_alerta(
                     conn,
                     tipo="Incremento IPC Anual",
-                    descripcion=f"Próximo aniversario de contrato {a[0]} en 60 días. Preparar incremento de IPC.",
-                    id_entidad=a[0],
+                    descripcion=f"Próximo aniversario de contrato {a['ID_CONTRATO_A']} en 60 días. Preparar incremento de IPC.",
+                    id_entidad=a["ID_CONTRATO_A"],
                     tipo_entidad="CONTRATO_ARRENDAMIENTO",
                     usuario=usuario_sistema,
                 )
@@ -1224,6 +1079,8 @@ class ServicioContratos:
         """
         Aplica incremento IPC a contrato de arrendamiento activo.
         También actualiza en cascada la Propiedad y el Contrato de Mandato.
+        El contrato, la propiedad, el mandato y el historial se actualizan en
+        una sola transacción (ver ServicioIPC.aplicar_incremento_contrato).
 
         Args:
             id_contrato: ID del contrato de arrendamiento
@@ -1236,210 +1093,22 @@ class ServicioContratos:
             Dict con resultado de la operación
         """
         try:
-            # FIX "NUCLEAR": AUTOCOMMIT = TRUE con ROLLBACK MANUAL
-            # La única forma verificada de persistir cambios en este entorno es con autocommit=True.
-            # Para mantener la atomicidad, implementamos "Undo" manual en caso de error.
-            conn = self.db.obtener_conexion()
-            real_conn = conn
-            if hasattr(conn, "_conn"):
-                real_conn = conn._conn
-
-            real_conn.autocommit = True
-            cursor = real_conn.cursor()
-
-            try:
-                placeholder = "%s"
-
-                # 1. Validar contrato existe y está activo
-                cursor.execute(
-                    """
-                    SELECT ID_CONTRATO_A, CANON_ARRENDAMIENTO, ESTADO_CONTRATO_A,
-                           FECHA_ULTIMO_INCREMENTO_IPC, ID_PROPIEDAD
-                    FROM CONTRATOS_ARRENDAMIENTOS
-                    WHERE ID_CONTRATO_A = %s
-                """,
-                    (id_contrato,),
-                )
-
-                row = cursor.fetchone()
-                if not row:
-                    return {"success": False, "message": f"Contrato {id_contrato} no encontrado"}
-
-                estado = row[2]
-                if estado != "Activo":
-                    return {
-                        "success": False,
-                        "message": "Solo se puede aplicar IPC a contratos activos",
-                    }
-
-                id_propiedad = row[4]
-                ultimo_incremento = row[3]
-                canon_actual = row[1]
-
-                # 2. Validar no hay incremento reciente
-                if ultimo_incremento:
-                    from datetime import datetime
-
-                    try:
-                        ultima_fecha = (
-                            ultimo_incremento
-                            if isinstance(ultimo_incremento, (datetime, list))
-                            else datetime.strptime(str(ultimo_incremento), "%Y-%m-%d")
-                        )
-                        if isinstance(ultima_fecha, str):
-                            ultima_fecha = datetime.strptime(ultima_fecha, "%Y-%m-%d")
-
-                        nueva_fecha = datetime.strptime(fecha_aplicacion, "%Y-%m-%d")
-
-                        if (
-                            ultima_fecha.year == nueva_fecha.year
-                            and ultima_fecha.month == nueva_fecha.month
-                        ):
-                            return {
-                                "success": False,
-                                "message": f"Ya se aplicó incremento en {ultima_fecha.strftime('%Y-%m')}",
-                            }
-                    except Exception:
-                        pass
-
-                # 3. Porcentaje check
-                if porcentaje_ipc <= 0 or porcentaje_ipc > 20:
-                    return {"success": False, "message": "Porcentaje invalido"}
-
-                # 4. Calculo
-                canon_anterior = int(canon_actual) if canon_actual else 0
-                incremento = canon_anterior * (porcentaje_ipc / 100)
-                canon_nuevo = round(canon_anterior + incremento)
-
-                # 5. EXECUTE UPDATES
-                # (No hay bloque de transacción, operaciones inmediatas por autocommit=True)
-
-                # 5a. Contrato
-                cursor.execute(
-                    """
-                    UPDATE CONTRATOS_ARRENDAMIENTOS
-                    SET CANON_ARRENDAMIENTO = %s,
-                        FECHA_ULTIMO_INCREMENTO_IPC = %s,
-                        ALERTA_IPC = FALSE,
-                        UPDATED_AT = CURRENT_TIMESTAMP,
-                        UPDATED_BY = %s
-                    WHERE ID_CONTRATO_A = %s
-                """,
-                    (canon_nuevo, fecha_aplicacion, usuario, id_contrato),
-                )
-
-                # 5b. Propiedad
-                cursor.execute(
-                    """
-                    UPDATE PROPIEDADES
-                    SET CANON_ARRENDAMIENTO_ESTIMADO = %s,
-                        UPDATED_AT = CURRENT_TIMESTAMP,
-                        UPDATED_BY = %s
-                    WHERE ID_PROPIEDAD = %s
-                """,
-                    (canon_nuevo, usuario, id_propiedad),
-                )
-
-                # 5c. Mandato
-                cursor.execute(
-                    """
-                    UPDATE CONTRATOS_MANDATOS
-                    SET CANON_MANDATO = %s,
-                        UPDATED_AT = CURRENT_TIMESTAMP,
-                        UPDATED_BY = %s
-                    WHERE ID_PROPIEDAD = %s
-                    AND ESTADO_CONTRATO_M = 'Activo'
-                """,
-                    (canon_nuevo, usuario, id_propiedad),
-                )
-
-                # 6. Registar Historial
-                try:
-                    cursor.execute(
-                        """
-                        INSERT INTO IPC_INCREMENT_HISTORY (
-                            ID_CONTRATO_A, FECHA_APLICACION, PORCENTAJE_IPC,
-                            CANON_ANTERIOR, CANON_NUEVO, OBSERVACIONES, CREATED_BY
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """,
-                        (
-                            id_contrato,
-                            fecha_aplicacion,
-                            porcentaje_ipc,
-                            canon_anterior,
-                            canon_nuevo,
-                            observaciones,
-                            usuario,
-                        ),
-                    )
-                except Exception:
-                    pass
-
-                cursor.close()
-                # Confirmación implicita por autocommit=True
-
-                return {
-                    "success": True,
-                    "message": f"IPC aplicado correctamente. Canon: ${canon_anterior:,} → ${canon_nuevo:,}",
-                    "canon_anterior": canon_anterior,
-                    "canon_nuevo": canon_nuevo,
-                    "porcentaje_aplicado": porcentaje_ipc,
-                }
-
-            except Exception as e:
-                # MANUAL ROLLBACK (Compensating Transaction)
-                # Restaurar valores anteriores si falla algo a mitad de camino para mantener consistencia
-                try:
-                    pass  # print(f"ERROR IPC: {str(e)} - Iniciando rollback manual...") [OpSec Removed]
-                    # Restaurar Contrato
-                    cursor.execute(
-                        """
-                        UPDATE CONTRATOS_ARRENDAMIENTOS 
-                        SET CANON_ARRENDAMIENTO=%s, FECHA_ULTIMO_INCREMENTO_IPC=%s 
-                        WHERE ID_CONTRATO_A=%s
-                    """,
-                        (canon_anterior, ultimo_incremento, id_contrato),
-                    )
-
-                    # Restaurar Propiedad
-                    cursor.execute(
-                        """
-                        UPDATE PROPIEDADES SET CANON_ARRENDAMIENTO_ESTIMADO=%s WHERE ID_PROPIEDAD=%s
-                    """,
-                        (canon_anterior, id_propiedad),
-                    )
-
-                    # Restaurar Mandato
-                    cursor.execute(
-                        """
-                        UPDATE CONTRATOS_MANDATOS SET CANON_MANDATO=%s 
-                        WHERE ID_PROPIEDAD=%s AND ESTADO_CONTRATO_M='Activo'
-                    """,
-                        (canon_anterior, id_propiedad),
-                    )
-                    pass  # print("Rollback manual completado.") [OpSec Removed]
-                except Exception:
-                    pass  # print(f"FALLO FATAL ROLLBACK: {str(e_roll)}") [OpSec Removed]
-
-                raise e
-            finally:
-                # CRITICO: Restaurar autocommit a False para no afectar otras operaciones
-                # Y NO cerrar la conexión porque es compartida (Singleton/Pool)
-                if "real_conn" in locals() and real_conn:
-                    real_conn.autocommit = False
-
-                # if 'conn' in locals():
-                #     conn.close()  <-- NO CERRAR, es gestionada por DatabaseManager
-                pass
-
+            resultado = ServicioIPC(self.db).aplicar_incremento_contrato(
+                id_contrato, porcentaje_ipc, fecha_aplicacion, observaciones, usuario
+            )
+        except ValueError as e:
+            return {"success": False, "message": str(e)}
         except Exception as e:
             import traceback
 
             traceback.print_exc()
             return {"success": False, "message": f"Error al aplicar IPC: {str(e)}"}
 
-        except Exception as e:
-            import traceback
-
-            traceback.print_exc()
-            return {"success": False, "message": f"Error al aplicar IPC: {str(e)}"}
+        canon_anterior, canon_nuevo = resultado["canon_anterior"], resultado["canon_nuevo"]
+        return {
+            "success": True,
+            "message": f"IPC aplicado correctamente. Canon: ${canon_anterior:,} → ${canon_nuevo:,}",
+            "canon_anterior": canon_anterior,
+            "canon_nuevo": canon_nuevo,
+            "porcentaje_aplicado": porcentaje_ipc,
+        }
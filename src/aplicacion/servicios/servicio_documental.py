@@ -1,5 +1,8 @@
+import hashlib
 import io
+import logging
 import mimetypes
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
 import reflex as rx
@@ -10,12 +13,30 @@ from src.infraestructura.repositorios.repositorio_documento_sqlite import Reposi
 
 # Tenta importar PIL, manejo de error si no está instaldo
 try:
-    from PIL import Image
+    from PIL import Image, ImageOps
 
     HAS_PIL = True
 except ImportError:
     HAS_PIL = False
 
+logger = logging.getLogger(__name__)
+
+# Tamaño de bloque para lectura de uploads (evita cargar archivos completos antes de validar)
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# Executor compartido para optimización de imágenes post-upload (CPU-bound, fuera del event loop)
+_optimizacion_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="DocOptimizer")
+
+
+def _registrar_error_optimizacion(futuro, id_documento: int) -> None:
+    """El executor guarda la excepción en el Future: se registra con su traceback."""
+    error = futuro.exception()
+    if error is not None:
+        logger.error(
+            f"Error optimizando documento {id_documento}",
+            exc_info=(type(error), error, error.__traceback__),
+        )
+
 
 class ServicioDocumental:
     def __init__(self, repositorio: RepositorioDocumentoSQLite = None):
@@ -153,68 +174,154 @@ class ServicioDocumentalElite(ServicioDocumental):
         # Placeholder para implementación futura con Tesseract
         return ""
 
-    def comprimir_imagen(self, imagen_bytes: bytes, calidad: int = 85) -> bytes:
-        """Comprime imagen manteniendo calidad aceptable."""
+    def comprimir_imagen(
+        self, imagen_bytes: bytes, calidad: int = 85, eliminar_exif: bool = False
+    ) -> bytes:
+        """
+        Comprime imagen manteniendo calidad aceptable.
+        Con eliminar_exif=True aplica la orientación EXIF y descarta los metadatos
+        (GPS, cámara) antes de guardar.
+        """
         if not HAS_PIL:
             return imagen_bytes
 
         try:
             img = Image.open(io.BytesIO(imagen_bytes))
-            out_io = io.BytesIO()
-
             # Preservar formato original si es posible, idealmente convertir a WebP o JPEG optimizado
             fmt = img.format if img.format else "JPEG"
+
+            if eliminar_exif:
+                # exif_transpose rota según la etiqueta Orientation; al guardar sin exif= se descarta
+                img = ImageOps.exif_transpose(img)
+                if fmt == "JPEG" and img.mode in ("RGBA", "P"):
+                    img = img.convert("RGB")
+
+            out_io = io.BytesIO()
             img.save(out_io, format=fmt, quality=calidad, optimize=True)
 
             compressed = out_io.getvalue()
-            # Retornar comprimido solo si es menor
+            # Sin EXIF siempre se retorna la versión limpia; si no, solo si es menor
+            if eliminar_exif:
+                return compressed
             return compressed if len(compressed) < len(imagen_bytes) else imagen_bytes
         except Exception:
             pass  # print(f"Error comprimiendo imagen: {e}") [OpSec Removed]
             return imagen_bytes
 
+    def optimizar_documento(self, documento: Documento) -> None:
+        """
+        Comprime, elimina EXIF y genera thumbnail de un documento ya persistido.
+        Pensado para ejecutarse en el executor de fondo tras confirmar el upload.
+        """
+        if not documento.contenido or "image" not in (documento.mime_type or ""):
+            return
+
+        optimizado = self.comprimir_imagen(documento.contenido, eliminar_exif=True)
+        thumbnail = self.generar_thumbnail(optimizado, documento.mime_type)
+        self.repositorio.actualizar_contenido_optimizado(documento.id, optimizado, thumbnail)
+
+    def programar_optimizacion(self, documentos: List[Documento]) -> int:
+        """
+        Encola en segundo plano la optimización de las imágenes del lote.
+        Retorna el número de documentos encolados.
+        """
+        encolados = 0
+        for doc in documentos:
+            if doc.id and "image" in (doc.mime_type or ""):
+                futuro = _optimizacion_executor.submit(self.optimizar_documento, doc)
+                futuro.add_done_callback(
+                    lambda f, id_documento=doc.id: _registrar_error_optimizacion(f, id_documento)
+                )
+                encolados += 1
+        return encolados
+
+    async def _leer_en_bloques(self, file: rx.UploadFile, max_bytes: int) -> Tuple[bytes, str]:
+        """
+        Lee un upload por bloques calculando SHA-256 en streaming.
+        Lanza ValueError apenas se supera max_bytes, sin leer el resto del archivo.
+        """
+        hasher = hashlib.sha256()
+        buffer = bytearray()
+
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            buffer.extend(chunk)
+            if len(buffer) > max_bytes:
+                limit_mb = max_bytes / (1024 * 1024)
+                raise ValueError(f"El archivo excede el tamaño máximo permitido de {limit_mb:.1f}MB")
+            hasher.update(chunk)
+
+        return bytes(buffer), hasher.hexdigest()
+
     async def procesar_upload_multiple(
         self, files: List[rx.UploadFile], entidad_tipo: str, entidad_id: str, usuario: str
     ) -> List[Documento]:
         """
         Procesa múltiples archivos con validación y optimizaciones.
+
+        - Lectura por bloques con rechazo temprano por tamaño y hash SHA-256 en streaming.
+        - Archivos idénticos (mismo nombre y hash) dentro del lote se suben una sola vez.
+        - Versionamiento e inserción del lote en una sola transacción.
+        - Compresión, EXIF y thumbnails se procesan en segundo plano tras confirmar.
         """
         from src.dominio.servicios.validador_documentos import ValidadorDocumentos
 
-        documentos_procesados = []
         errores = []
 
         # 1. Fase de Lectura y Validación
         files_content = []
+        vistos = set()
         for file in files:
-            content = await file.read()
             filename = file.filename
 
-            # Validar reglas de negocio
+            # Validar extensión antes de leer (tamaño 0)
             resultado = ValidadorDocumentos.validar_archivo_generico(
-                entidad_tipo=entidad_tipo, nombre_archivo=filename, tamano_bytes=len(content)
+                entidad_tipo=entidad_tipo, nombre_archivo=filename, tamano_bytes=0
             )
-
             if not resultado["valido"]:
                 errores.append(f"{filename}: {resultado['mensaje']}")
                 continue
 
-            files_content.append({"filename": filename, "content": content})
+            max_bytes = ValidadorDocumentos.obtener_tamano_maximo(entidad_tipo, filename)
+            try:
+                content, sha256 = await self._leer_en_bloques(file, max_bytes)
+            except ValueError as ve:
+                errores.append(f"{filename}: {ve}")
+                continue
+
+            if (filename, sha256) in vistos:
+                continue
+            vistos.add((filename, sha256))
+
+            files_content.append({"filename": filename, "content": content, "sha256": sha256})
 
         if errores:
             # Si hay errores, no subimos NADA (Atomicidad de lote por UI)
             # O podríamos subir los válidos. Para mejor UX, lanzamos excepción con resumen.
             raise ValueError("Errores de validación:\n" + "\n".join(errores))
 
-        # 2. Fase de Procesamiento
+        # 2. Fase de Persistencia (una transacción por lote)
+        nuevos = []
         for file_data in files_content:
-            doc = self.subir_documento(
-                entidad_tipo=entidad_tipo,
-                entidad_id=entidad_id,
-                nombre_archivo=file_data["filename"],
-                contenido_bytes=file_data["content"],
-                usuario=usuario,
+            nombre = file_data["filename"]
+            mime_type, _ = mimetypes.guess_type(nombre)
+            nuevos.append(
+                Documento(
+                    entidad_tipo=entidad_tipo,
+                    entidad_id=str(entidad_id),
+                    nombre_archivo=nombre,
+                    extension=nombre.split(".")[-1].lower() if "." in nombre else "",
+                    mime_type=mime_type or "application/octet-stream",
+                    contenido=file_data["content"],
+                    created_by=usuario,
+                )
             )
-            documentos_procesados.append(doc)
+
+        documentos_procesados = self.repositorio.crear_lote(nuevos)
+
+        # 3. Optimización de imágenes en segundo plano (no bloquea el event loop)
+        self.programar_optimizacion(documentos_procesados)
 
         return documentos_procesados
@@ -3,13 +3,15 @@ Servicio de Aplicación: Gestión Financiera
 Coordina la lógica de negocio para recaudos y liquidaciones.
 """
 
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from dateutil.relativedelta import relativedelta
 
 from src.dominio.entidades.liquidacion import Liquidacion
 from src.dominio.entidades.recaudo import Recaudo
 from src.dominio.entidades.recaudo_concepto import RecaudoConcepto
+from src.dominio.servicios.calculadora_mora import interes_mora
 
 from src.aplicacion.servicios.servicio_configuracion import ServicioConfiguracion
 from src.dominio.interfaces.repositorio_recaudo import IRepositorioRecaudo
@@ -19,8 +21,14 @@ from src.dominio.interfaces.repositorio_propiedad import IRepositorioPropiedad
 # Pero para ser estrictos con Fase 3, el servicio financiero debería recibir interfaces.
 
 from src.infraestructura.cache.cache_manager import cache_manager
+from src.infraestructura.persistencia.repositorio_recaudo_sqlite import PREFIJO_CARGO_MASIVO
 from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
 
+MESES = [
+    "enero", "febrero", "marzo", "abril", "mayo", "junio",
+    "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre",
+]
+
 
 class ServicioFinanciero:
     """Servicio para gestión de recaudos y liquidaciones"""
@@ -65,16 +73,46 @@ class ServicioFinanciero:
 
         return self.repo_recaudo.crear(recaudo, conceptos, usuario_sistema)
 
+    def generar_cargos_mensuales(
+        self,
+        usuario_sistema: str,
+        periodo: Optional[str] = None,
+        progreso: Optional[Callable[[int, str], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Genera el recaudo de canon del período para todos los contratos activos.
+
+        Fecha de pago hoy, valor del canon, método Efectivo y estado Pendiente.
+        Repetirlo para el mismo período no duplica cargos.
+
+        Args:
+            periodo: 'YYYY-MM'; por defecto el mes actual
+            progreso: Callback (porcentaje, etapa)
+
+        Returns:
+            Dict con activos, creados, omitidos, invalidos y segundos
+        """
+        hoy = datetime.now()
+        periodo = periodo or hoy.strftime("%Y-%m")
+        anio, mes = periodo.split("-")
+        inicio = time.perf_counter()
+        resultado = self.repo_recaudo.generar_cargos_mensuales(
+            periodo,
+            hoy.date().isoformat(),
+            f"{PREFIJO_CARGO_MASIVO}{MESES[int(mes) - 1]} de {anio}",
+            usuario_sistema,
+            progreso,
+        )
+        resultado["segundos"] = round(time.perf_counter() - inicio, 2)
+        return resultado
+
     def calcular_mora(
         self, id_contrato_a: int, fecha_limite: str, fecha_pago: str, valor_canon: int
     ) -> int:
         """Calcula el valor de mora."""
         fecha_lim = datetime.fromisoformat(fecha_limite)
         fecha_pag = datetime.fromisoformat(fecha_pago)
-        dias_mora = (fecha_pag - fecha_lim).days
-        if dias_mora <= 0: return 0
-        tasa_diaria = 0.06 / 365
-        return int(valor_canon * tasa_diaria * dias_mora)
+        return interes_mora(valor_canon, (fecha_pag - fecha_lim).days)
 
     def aplicar_pago_anticipado(
         self, id_contrato_a: int, meses_adelantados: int, valor_canon_mensual: int,
@@ -162,6 +200,17 @@ class ServicioFinanciero:
     ) -> None:
         self.repo_liquidacion.marcar_como_pagada(id_liquidacion, fecha_pago, metodo_pago, referencia_pago, usuario_sistema)
 
+    def aprobar_liquidacion_propietario(self, id_propietario: int, periodo: str, usuario_sistema: str) -> int:
+        return self.repo_liquidacion.aprobar_por_propietario_y_periodo(id_propietario, periodo, usuario_sistema)
+
+    def marcar_liquidacion_propietario_pagada(
+        self, id_propietario: int, periodo: str, fecha_pago: str, metodo_pago: str, referencia_pago: str,
+        usuario_sistema: str
+    ) -> int:
+        return self.repo_liquidacion.marcar_como_pagadas_por_propietario(
+            id_propietario, periodo, fecha_pago, metodo_pago, referencia_pago, usuario_sistema
+        )
+
     def cancelar_liquidacion(self, id_liquidacion: int, motivo: str, usuario_sistema: str) -> None:
         self.repo_liquidacion.cancelar(id_liquidacion, motivo, usuario_sistema)
 
@@ -177,20 +226,28 @@ class ServicioFinanciero:
         return [self.repo_liquidacion._row_to_entity(r) for r in all_aps if r.get('estado') == 'Aprobada']
 
     def listar_recaudos_paginado(self, page: int = 1, page_size: int = 25, estado: Optional[str] = None,
-                                fecha_desde: Optional[str] = None, fecha_hasta: Optional[str] = None, busqueda: Optional[str] = None):
+                                fecha_desde: Optional[str] = None, fecha_hasta: Optional[str] = None, busqueda: Optional[str] = None,
+                                cursor: Optional[str] = None, count_strategy: str = "exact"):
+        """Lista recaudos por página o por cursor keyset (ver PaginationParams)."""
         from src.dominio.modelos.pagination import PaginatedResult, PaginationParams
-        params = PaginationParams(page=page, page_size=page_size)
-        total = self.repo_recaudo.contar_con_filtros(estado, fecha_desde, fecha_hasta, busqueda)
-        items = self.repo_recaudo.listar_paginado(params.page_size, params.offset, estado, fecha_desde, fecha_hasta, busqueda)
-        return PaginatedResult(items=items, total=total, page=params.page, page_size=params.page_size)
+        params = PaginationParams(page=page, page_size=page_size, cursor=cursor, count_strategy=count_strategy)
+        total = self.repo_recaudo.contar_con_filtros(estado, fecha_desde, fecha_hasta, busqueda,
+                                                     estrategia=params.count_strategy, ttl=params.count_ttl)
+        items = self.repo_recaudo.listar_paginado(params.page_size + 1, params.offset, estado, fecha_desde, fecha_hasta,
+                                                  busqueda, despues_de=params.cursor_values)
+        return PaginatedResult.from_lookahead(items, total, params, lambda r: [r["fecha"], r["id"]])
 
     def listar_liquidaciones_paginado(self, page: int = 1, page_size: int = 25, estado: Optional[str] = None,
-                                     periodo: Optional[str] = None, busqueda: Optional[str] = None):
+                                     periodo: Optional[str] = None, busqueda: Optional[str] = None,
+                                     cursor: Optional[str] = None, count_strategy: str = "exact"):
+        """Lista liquidaciones por página o por cursor keyset (ver PaginationParams)."""
         from src.dominio.modelos.pagination import PaginatedResult, PaginationParams
-        params = PaginationParams(page=page, page_size=page_size)
-        total = self.repo_liquidacion.contar_con_filtros(estado, periodo, busqueda)
-        items = self.repo_liquidacion.listar_paginado(params.page_size, params.offset, estado, periodo, busqueda)
-        return PaginatedResult(items=items, total=total, page=params.page, page_size=params.page_size)
+        params = PaginationParams(page=page, page_size=page_size, cursor=cursor, count_strategy=count_strategy)
+        total = self.repo_liquidacion.contar_con_filtros(estado, periodo, busqueda,
+                                                         estrategia=params.count_strategy, ttl=params.count_ttl)
+        items = self.repo_liquidacion.listar_paginado(params.page_size + 1, params.offset, estado, periodo, busqueda,
+                                                      despues_de=params.cursor_values)
+        return PaginatedResult.from_lookahead(items, total, params, lambda l: [l["periodo"], l["id"]])
 
     def obtener_detalle_recaudo_ui(self, id_recaudo: int) -> Optional[Dict[str, Any]]:
         recaudo = self.repo_recaudo.obtener_por_id(id_recaudo)
@@ -254,6 +311,25 @@ class ServicioFinanciero:
         """
         return self.repo_liquidacion.obtener_consolidado_propietario(id_propietario, periodo)
 
+    def obtener_historial_cuenta_propietario(
+        self, id_propietario: int, fecha_desde: str, fecha_hasta: str
+    ) -> Dict[str, Any]:
+        """
+        Movimientos de la cuenta corriente del propietario entre dos fechas,
+        con saldo inicial, saldo acumulado por movimiento y saldo final.
+        """
+        return self.repo_liquidacion.cuenta_propietario.listar_movimientos(
+            id_propietario, fecha_desde, fecha_hasta
+        )
+
+    def obtener_resumen_periodos_propietario(
+        self, id_propietario: int, periodo_desde: str, periodo_hasta: str
+    ) -> List[Dict[str, Any]]:
+        """Totales liquidados al propietario por período (ej: estado de cuenta anual)."""
+        return self.repo_liquidacion.cuenta_propietario.resumir_periodos(
+            id_propietario, periodo_desde, periodo_hasta
+        )
+
     def actualizar_liquidacion(
         self, id_liquidacion: int, datos_actualizados: Dict[str, Any], usuario_sistema: str
     ) -> None:
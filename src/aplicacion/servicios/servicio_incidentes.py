@@ -60,55 +60,50 @@ class ServicioIncidentes:
         dias_min: Optional[int] = None,
         page: Optional[int] = None,
         page_size: Optional[int] = None,
+        estado: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Lista incidentes aplicando múltiples filtros."""
-        incidentes = self.repo_incidentes.listar()
-
-        # Filtro por búsqueda (ID o descripción)
-        if busqueda:
-            incidentes = [
-                i
-                for i in incidentes
-                if busqueda.lower() in i.descripcion_incidente.lower()
-                or str(i.id_incidente) == busqueda
-            ]
-
-        # Filtro por propiedad
-        if id_propiedad:
-            incidentes = [i for i in incidentes if i.id_propiedad == id_propiedad]
-
-        # Filtro por prioridad
-        if prioridad:
-            incidentes = [i for i in incidentes if i.prioridad == prioridad]
-
-        # Filtro por proveedor asignado
-        if id_proveedor:
-            incidentes = [i for i in incidentes if i.id_proveedor_asignado == id_proveedor]
-
-        # Filtro por días sin resolver
-        if dias_min is not None:
-            incidentes = [i for i in incidentes if i.dias_sin_resolver >= dias_min]
-
-        # Filtro por rango de fechas
-        if fecha_desde:
-            fecha_desde_dt = datetime.fromisoformat(fecha_desde)
-            incidentes = [i for i in incidentes if i.fecha_incidente >= fecha_desde_dt]
-
-        if fecha_hasta:
-            fecha_hasta_dt = datetime.fromisoformat(fecha_hasta)
-            incidentes = [i for i in incidentes if i.fecha_incidente <= fecha_hasta_dt]
-
-        # Calcular total antes de paginar
-        total_items = len(incidentes)
+        """
+        Lista incidentes aplicando múltiples filtros.
+
+        Filtros, días sin resolver y paginación se resuelven en SQL; solo la
+        página solicitada viaja a memoria.
+        """
+        filtros = {
+            "busqueda": busqueda,
+            "id_propiedad": id_propiedad,
+            "estado": estado,
+            "prioridad": prioridad,
+            "fecha_desde": fecha_desde,
+            "fecha_hasta": fecha_hasta,
+            "id_proveedor": id_proveedor,
+            "dias_min": dias_min,
+        }
+
+        total_items = self.repo_incidentes.contar_con_filtros(**filtros)
 
         # Paginación (si se solicita)
+        limit, offset = None, 0
         if page is not None and page_size is not None:
-            start_idx = (page - 1) * page_size
-            end_idx = start_idx + page_size
-            incidentes = incidentes[start_idx:end_idx]
+            limit, offset = page_size, (page - 1) * page_size
 
+        incidentes = self.repo_incidentes.listar_con_filtros(**filtros, limit=limit, offset=offset)
         return {"items": incidentes, "total": total_items}
 
+    def contar_por_estado(
+        self,
+        busqueda: Optional[str] = None,
+        id_propiedad: Optional[int] = None,
+        prioridad: Optional[str] = None,
+        id_proveedor: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """Totales por estado para los encabezados del tablero Kanban."""
+        return self.repo_incidentes.contar_por_estado(
+            busqueda=busqueda,
+            id_propiedad=id_propiedad,
+            prioridad=prioridad,
+            id_proveedor=id_proveedor,
+        )
+
     def obtener_detalle(self, id_incidente: int) -> Optional[Dict[str, Any]]:
         incidente = self.repo_incidentes.obtener_por_id(id_incidente)
         if not incidente:
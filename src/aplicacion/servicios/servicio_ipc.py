@@ -1,8 +1,21 @@
+import time
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from src.dominio.entidades.ipc import IPC
+from src.dominio.servicios.calculadora_incremento_ipc import (
+    IncrementoIPC,
+    calcular_canon_incrementado,
+    construir_incrementos,
+    fecha_corte_elegibilidad,
+    incrementado_en_mes,
+    validar_porcentaje_ipc,
+)
+from src.infraestructura.cache.cache_manager import cache_manager
 from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.repositorio_incremento_ipc_sqlite import (
+    RepositorioIncrementoIPCSQLite,
+)
 from src.infraestructura.persistencia.repositorio_ipc_sqlite import RepositorioIPCSQLite
 
 
@@ -10,6 +23,7 @@ class ServicioIPC:
 
     def __init__(self, db_manager: DatabaseManager):
         self.repo = RepositorioIPCSQLite(db_manager)
+        self.repo_incrementos = RepositorioIncrementoIPCSQLite(db_manager)
 
     def listar_todos(self) -> List[IPC]:
         """Retorna todos los registros de IPC ordenados por año."""
@@ -56,3 +70,140 @@ class ServicioIPC:
 
         self.repo.actualizar(ipc, usuario)
         return ipc
+
+    # =========================================================================
+    # CORRIDA DE INCREMENTO IPC
+    # =========================================================================
+
+    def porcentaje_para_fecha(self, fecha_aplicacion: str) -> Optional[float]:
+        """IPC del año anterior a la fecha de aplicación (el que indexa los cánones)."""
+        ipc = self.repo.obtener_por_anio(int(fecha_aplicacion[:4]) - 1)
+        return float(ipc.valor_ipc) if ipc else None
+
+    def previsualizar_incremento_masivo(
+        self, fecha_aplicacion: str, porcentaje_ipc: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Diff de la corrida: contratos activos que cumplen aniversario a más
+        tardar en el mes de aplicación, con su canon actual y el propuesto.
+
+        Args:
+            fecha_aplicacion: Fecha 'YYYY-MM-DD'
+            porcentaje_ipc: Porcentaje a aplicar (por defecto el IPC del año anterior)
+        """
+        if porcentaje_ipc is None:
+            porcentaje_ipc = self.porcentaje_para_fecha(fecha_aplicacion)
+            if porcentaje_ipc is None:
+                raise ValueError(
+                    f"No hay IPC registrado para {int(fecha_aplicacion[:4]) - 1}"
+                )
+
+        candidatos = self.repo_incrementos.obtener_candidatos(
+            fecha_corte=fecha_corte_elegibilidad(fecha_aplicacion)
+        )
+        incrementos = construir_incrementos(candidatos, porcentaje_ipc)
+        total_anterior = sum(i.canon_anterior for i in incrementos)
+        total_nuevo = sum(i.canon_nuevo for i in incrementos)
+        return {
+            "fecha_aplicacion": fecha_aplicacion,
+            "porcentaje_ipc": porcentaje_ipc,
+            "contratos": [i.to_dict() for i in incrementos],
+            "total_anterior": total_anterior,
+            "total_nuevo": total_nuevo,
+            "diferencia_total": total_nuevo - total_anterior,
+        }
+
+    def aplicar_incremento_masivo(
+        self,
+        fecha_aplicacion: str,
+        porcentaje_ipc: float,
+        contratos: Sequence[Tuple[int, int, int]],
+        observaciones: str = "",
+        usuario: str = "admin",
+    ) -> Dict[str, Any]:
+        """
+        Aplica el IPC a los contratos seleccionados del diff, todo o nada.
+
+        Se aplica exactamente lo previsualizado: si el canon de algún contrato
+        ya no es su canon_anterior la transacción se revierte completa
+        (PrevisualizacionDesactualizada).
+
+        Args:
+            contratos: (id_contrato, canon_anterior, canon_nuevo) de cada fila del diff
+
+        Returns:
+            Dict con aplicados, segundos y contratos_por_segundo
+        """
+        inicio = time.perf_counter()
+        validar_porcentaje_ipc(porcentaje_ipc)
+        ids_contrato = [id_contrato for id_contrato, _, _ in contratos]
+        candidatos = self.repo_incrementos.obtener_candidatos(
+            fecha_corte=fecha_corte_elegibilidad(fecha_aplicacion), ids_contrato=ids_contrato
+        )
+        if len(candidatos) != len(set(ids_contrato)):
+            raise ValueError(
+                "Algunos contratos seleccionados ya no son elegibles. Genere el diff de nuevo."
+            )
+
+        propiedades = {c["id_contrato"]: c["id_propiedad"] for c in candidatos}
+        incrementos = []
+        for id_contrato, canon_anterior, canon_nuevo in contratos:
+            if canon_nuevo != calcular_canon_incrementado(canon_anterior, porcentaje_ipc):
+                raise ValueError(
+                    f"El canon propuesto del contrato {id_contrato} no corresponde al "
+                    f"{porcentaje_ipc}%. Genere el diff de nuevo."
+                )
+            incrementos.append(
+                IncrementoIPC(
+                    id_contrato=id_contrato,
+                    id_propiedad=propiedades[id_contrato],
+                    canon_anterior=canon_anterior,
+                    canon_nuevo=canon_nuevo,
+                )
+            )
+        aplicados = self.repo_incrementos.aplicar_lote(
+            incrementos, fecha_aplicacion, porcentaje_ipc, observaciones, usuario
+        )
+        self._invalidar_caches()
+
+        segundos = time.perf_counter() - inicio
+        return {
+            "aplicados": aplicados,
+            "segundos": round(segundos, 3),
+            "contratos_por_segundo": round(aplicados / segundos, 1) if segundos > 0 else 0.0,
+            "diferencia_total": sum(i.diferencia for i in incrementos),
+        }
+
+    def aplicar_incremento_contrato(
+        self,
+        id_contrato: int,
+        porcentaje_ipc: float,
+        fecha_aplicacion: str,
+        observaciones: str = "",
+        usuario: str = "admin",
+    ) -> Dict[str, Any]:
+        """
+        Aplica el IPC a un solo contrato (sin exigir el mes de aniversario).
+
+        Returns:
+            Dict con canon_anterior y canon_nuevo
+        """
+        candidatos = self.repo_incrementos.obtener_candidatos(ids_contrato=[id_contrato])
+        if not candidatos:
+            raise ValueError(
+                f"Contrato {id_contrato} no encontrado o inactivo: "
+                "solo se puede aplicar IPC a contratos activos"
+            )
+        if incrementado_en_mes(candidatos[0]["ultimo_incremento"], fecha_aplicacion):
+            raise ValueError(f"Ya se aplicó incremento en {fecha_aplicacion[:7]}")
+
+        (incremento,) = construir_incrementos(candidatos, porcentaje_ipc)
+        self.repo_incrementos.aplicar_lote(
+            [incremento], fecha_aplicacion, porcentaje_ipc, observaciones, usuario
+        )
+        self._invalidar_caches()
+        return {"canon_anterior": incremento.canon_anterior, "canon_nuevo": incremento.canon_nuevo}
+
+    def _invalidar_caches(self) -> None:
+        for namespace in ("arriendos:list_paginated", "mandatos:list_paginated", "propiedades"):
+            cache_manager.invalidate(namespace)
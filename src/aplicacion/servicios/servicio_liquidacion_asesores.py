@@ -10,6 +10,7 @@ from src.dominio.entidades.descuento_asesor import DescuentoAsesor
 from src.dominio.entidades.liquidacion_asesor import LiquidacionAsesor
 from src.dominio.entidades.pago_asesor import PagoAsesor
 from src.infraestructura.cache.cache_manager import cache_manager, invalidate_cache
+from src.infraestructura.persistencia.repositorio_busqueda_sqlite import RepositorioBusquedaSQLite
 from src.infraestructura.repositorios.repositorio_bonificacion_asesor_sqlite import (
     RepositorioBonificacionAsesorSQLite,
 )
@@ -748,6 +749,21 @@ class ServicioLiquidacionAsesores:
 
         return [self._liquidacion_to_dict(liq) for liq in liquidaciones]
 
+    @staticmethod
+    def _condicion_busqueda(db_manager, busqueda: str, placeholder: str):
+        """
+        Condición de búsqueda por asesor (nombre/documento indexado) o ID exacto.
+        Reemplaza el `CAST(ID AS TEXT) LIKE`, que no puede usar índices.
+        """
+        cond_persona, params = RepositorioBusquedaSQLite(db_manager).condicion(
+            "PERSONA", "per.ID_PERSONA", busqueda
+        )
+        alternativas = [cond_persona]
+        if busqueda.strip().isdigit():
+            alternativas.append(f"l.ID_LIQUIDACION_ASESOR = {placeholder}")
+            params.append(int(busqueda.strip()))
+        return "(" + " OR ".join(alternativas) + ")", params
+
     # Integración Fase 4: Paginación
     @cache_manager.cached("liq_asesores:list_paginated", level=1, ttl=300)
     def listar_liq_asesores_paginado(
@@ -799,15 +815,11 @@ class ServicioLiquidacionAsesores:
                 query_params.append(id_asesor)
 
             if busqueda:
-                conditions.append(
-                    f"""(
-                    per.NOMBRE_COMPLETO LIKE {placeholder} OR
-                    per.NUMERO_DOCUMENTO LIKE {placeholder} OR
-                    CAST(l.ID_LIQUIDACION_ASESOR AS TEXT) LIKE {placeholder}
-                )"""
+                condicion, busqueda_params = self._condicion_busqueda(
+                    db_manager, busqueda, placeholder
                 )
-                term = f"%{busqueda}%"
-                query_params.extend([term, term, term])
+                conditions.append(condicion)
+                query_params.extend(busqueda_params)
 
             where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
 
@@ -924,15 +936,11 @@ class ServicioLiquidacionAsesores:
                 query_params.append(id_asesor)
 
             if busqueda:
-                conditions.append(
-                    f"""(
-                    per.NOMBRE_COMPLETO LIKE {placeholder} OR
-                    per.NUMERO_DOCUMENTO LIKE {placeholder} OR
-                    CAST(l.ID_LIQUIDACION_ASESOR AS TEXT) LIKE {placeholder}
-                )"""
+                condicion, busqueda_params = self._condicion_busqueda(
+                    db_manager, busqueda, placeholder
                 )
-                term = f"%{busqueda}%"
-                query_params.extend([term, term, term])
+                conditions.append(condicion)
+                query_params.extend(busqueda_params)
 
             where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
 
@@ -2,8 +2,12 @@ import logging
 from pathlib import Path
 from typing import Optional
 
+from src.dominio.entidades.notificacion_outbox import NotificacionOutbox
 from src.infraestructura.notificaciones.cliente_email_office365 import ClienteEmailOffice365
 from src.infraestructura.notificaciones.cliente_whatsapp_desktop import ClienteWhatsAppDesktop
+from src.infraestructura.persistencia.repositorio_notificaciones_outbox_sqlite import (
+    RepositorioNotificacionesOutboxSQLite,
+)
 
 # Importar entidades para type hinting (ajustar paths según estructura real)
 # from src.dominio.entidades.liquidacion_asesor import LiquidacionAsesor
@@ -14,9 +18,14 @@ class ServicioNotificaciones:
     """
     Servicio de dominio para la gestión de notificaciones.
     Orquesta el uso de clientes de Email y WhatsApp.
+
+    Con `outbox`, las notificaciones se encolan en NOTIFICACIONES_OUTBOX y las
+    envía el DespachadorNotificaciones en segundo plano (retornan True al
+    quedar encoladas). Sin outbox se envían de inmediato (modo legado).
     """
 
-    def __init__(self):
+    def __init__(self, outbox: Optional[RepositorioNotificacionesOutboxSQLite] = None):
+        self.outbox = outbox
         self.email_client = ClienteEmailOffice365()
         self.whatsapp_client = ClienteWhatsAppDesktop()
         self.logger = logging.getLogger(__name__)
@@ -51,6 +60,19 @@ class ServicioNotificaciones:
             self.logger.error(f"Error cargando template: {e}")
             return mensaje_cuerpo
 
+    def _encolar(self, **datos) -> bool:
+        """Encola la notificación en el outbox."""
+        try:
+            self.outbox.encolar(NotificacionOutbox(**datos))
+            return True
+        except Exception as e:
+            self.logger.error(f"Error encolando notificación: {e}")
+            return False
+
+    @staticmethod
+    def _referencia_liquidacion(liquidacion) -> str:
+        return f"LIQUIDACION_ASESOR:{getattr(liquidacion, 'id_liquidacion_asesor', '')}"
+
     def notificar_liquidacion_asesor(
         self, liquidacion, email_asesor: str, nombre_asesor: str, pdf_path: Optional[str] = None
     ) -> bool:
@@ -75,6 +97,16 @@ class ServicioNotificaciones:
 
         html_content = self._cargar_template(nombre_asesor, cuerpo_msg)
 
+        if self.outbox:
+            return self._encolar(
+                canal="email",
+                destinatario=email_asesor,
+                asunto=asunto,
+                cuerpo=html_content,
+                adjunto_path=pdf_path,
+                referencia=self._referencia_liquidacion(liquidacion),
+            )
+
         return self.email_client.enviar_correo(
             destinatario=email_asesor, asunto=asunto, cuerpo=html_content, adjunto_path=pdf_path
         )
@@ -101,6 +133,14 @@ class ServicioNotificaciones:
             f"Por favor gestionar el pago y enviar el comprobante. Gracias."
         )
 
+        if self.outbox:
+            return self._encolar(
+                canal="whatsapp",
+                destinatario=telefono_inquilino,
+                cuerpo=mensaje,
+                referencia=f"RECIBO_PUBLICO:{getattr(recibo, 'id_recibo_publico', '')}",
+            )
+
         return self.whatsapp_client.enviar_mensaje(telefono_inquilino, mensaje)
 
     def notificar_liquidacion_asesor_whatsapp(
@@ -128,4 +168,12 @@ class ServicioNotificaciones:
             f"Por favor comuníquese con la administración para coordinar el pago. Gracias."
         )
 
+        if self.outbox:
+            return self._encolar(
+                canal="whatsapp",
+                destinatario=telefono_asesor,
+                cuerpo=mensaje,
+                referencia=self._referencia_liquidacion(liquidacion),
+            )
+
         return self.whatsapp_client.enviar_mensaje(telefono_asesor, mensaje)
@@ -170,7 +170,8 @@ class ServicioPersonas:
             solo_activos=solo_activos,
             busqueda=busqueda,
             fecha_inicio=fecha_inicio,
-            fecha_fin=fecha_fin
+            fecha_fin=fecha_fin,
+            solo_lectura=True,
         )
 
         output = io.StringIO()
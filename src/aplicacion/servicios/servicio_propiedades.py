@@ -245,7 +245,8 @@ class ServicioPropiedades:
             filtro_disponibilidad=filtro_disponibilidad,
             filtro_municipio=filtro_municipio,
             solo_activas=solo_activas,
-            busqueda=busqueda
+            busqueda=busqueda,
+            solo_lectura=True,
         )
 
         output = io.StringIO()
@@ -7,6 +7,7 @@ from datetime import date
 from typing import Dict, List, Optional
 
 from src.dominio.entidades.recibo_publico import ReciboPublico
+from src.infraestructura.cache.cache_manager import cache_manager
 from src.infraestructura.persistencia.repositorio_propiedad_sqlite import RepositorioPropiedadSQLite
 from src.infraestructura.repositorios.repositorio_recibo_publico_sqlite import (
     RepositorioReciboPublicoSQLite,
@@ -323,15 +324,23 @@ class ServicioRecibosPublicos:
         Returns:
             Cantidad de recibos actualizados
         """
-        recibos_vencidos = self.repo_recibo.listar_vencidos()
-        actualizados = 0
+        return len(self.vencer_recibos_pendientes(usuario))
 
-        for recibo in recibos_vencidos:
-            if recibo.actualizar_estado_vencimiento():
-                self.repo_recibo.actualizar(recibo, usuario)
-                actualizados += 1
+    def vencer_recibos_pendientes(self, usuario: str) -> List[int]:
+        """
+        Marca como vencidos los recibos pendientes con fecha de vencimiento
+        anterior a hoy (un solo UPDATE, sin cargar las entidades).
+
+        Args:
+            usuario: Usuario del sistema que ejecuta el job
 
-        return actualizados
+        Returns:
+            IDs de los recibos que pasaron a 'Vencido' (para alertas)
+        """
+        ids = self.repo_recibo.marcar_vencidos(usuario, date.today().isoformat())
+        if ids:
+            cache_manager.invalidate("recibos_publicos")
+        return ids
 
     def obtener_recibos_vencidos(self) -> List[ReciboPublico]:
         """
@@ -174,14 +174,15 @@ class ServicioSaldosFavor:
             id_propietario: ID del propietario
 
         Returns:
-            Diccionario con total pendiente y lista de saldos
+            Diccionario con total pendiente, saldo de la cuenta corriente y
+            lista de saldos
         """
         saldos = self.repositorio.listar_por_propietario(id_propietario)
-        total_pendiente = self.repositorio.obtener_total_pendiente_propietario(id_propietario)
 
         return {
             "id_propietario": id_propietario,
-            "total_pendiente": total_pendiente,
+            "total_pendiente": sum(s.valor_saldo for s in saldos if s.estado == "Pendiente"),
+            "saldo_cuenta": self.repositorio.cuenta_propietario.obtener_saldo(id_propietario),
             "cantidad_saldos": len(saldos),
             "saldos": saldos,
         }
@@ -290,4 +291,4 @@ class ServicioSaldosFavor:
         if saldo.esta_resuelto:
             raise ValueError(f"No se puede eliminar un saldo que ya fue {saldo.estado.lower()}")
 
-        return self.repositorio.eliminar(id_saldo)
+        return self.repositorio.eliminar(id_saldo, usuario)
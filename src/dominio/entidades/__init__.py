@@ -14,6 +14,7 @@ from .liquidacion import Liquidacion
 from .liquidacion_asesor import LiquidacionAsesor
 from .liquidacion_propietario import LiquidacionPropietario
 from .municipio import Municipio
+from .notificacion_outbox import NotificacionOutbox
 from .pago_asesor import PagoAsesor
 from .parametro_sistema import ParametroSistema
 from .persona import Persona
@@ -23,6 +24,13 @@ from .proveedor import Proveedor
 from .recaudo import Recaudo
 from .recaudo_concepto import RecaudoConcepto
 from .recibo_publico import ReciboPublico
+from .registros import (
+    LiquidacionRegistro,
+    PersonaRegistro,
+    PropiedadRegistro,
+    RecaudoRegistro,
+    registro_solo_lectura,
+)
 from .saldo_favor import SaldoFavor
 from .seguro import Seguro
 from .sesion_usuario import SesionUsuario
@@ -40,6 +48,7 @@ __all__ = [
     "Usuario",
     "SesionUsuario",
     "Municipio",
+    "NotificacionOutbox",
     "IPC",
     "ParametroSistema",
     "AuditoriaCambio",
@@ -56,4 +65,9 @@ __all__ = [
     "DescuentoAsesor",
     "PagoAsesor",
     "SaldoFavor",
+    "LiquidacionRegistro",
+    "RecaudoRegistro",
+    "PropiedadRegistro",
+    "PersonaRegistro",
+    "registro_solo_lectura",
 ]
@@ -0,0 +1,80 @@
+"""
+Entidad de Dominio: NotificacionOutbox
+Representa una notificación (correo o WhatsApp) pendiente de despacho.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+FORMATO_FECHA_HORA = "%Y-%m-%d %H:%M:%S"
+
+
+@dataclass
+class NotificacionOutbox:
+    """
+    Notificación persistida en NOTIFICACIONES_OUTBOX.
+
+    Business Rules:
+    - canal debe estar en: email, whatsapp
+    - estado debe estar en: Pendiente, Enviando, Enviada, Fallida
+    - Cada fallo reprograma el envío con espera exponencial hasta agotar
+      max_intentos; entonces la notificación queda Fallida.
+    """
+
+    # Identificación
+    id_notificacion: Optional[int] = None
+
+    # Contenido
+    canal: str = "email"
+    destinatario: str = ""
+    asunto: Optional[str] = None
+    cuerpo: str = ""
+    adjunto_path: Optional[str] = None
+    referencia: Optional[str] = None  # Origen, ej. 'LIQUIDACION_ASESOR:15'
+
+    # Despacho
+    estado: str = "Pendiente"
+    intentos: int = 0
+    max_intentos: int = 5
+    proximo_intento: Optional[str] = None  # Formato: 'YYYY-MM-DD HH:MM:SS'
+    ultimo_error: Optional[str] = None
+
+    # Auditoría
+    created_at: Optional[str] = None
+    enviado_at: Optional[str] = None
+
+    CANALES = ["email", "whatsapp"]
+    ESTADOS = ["Pendiente", "Enviando", "Enviada", "Fallida"]
+
+    def __post_init__(self):
+        """Validaciones de reglas de negocio"""
+        if self.canal not in self.CANALES:
+            raise ValueError(
+                f"Canal inválido: {self.canal}. Debe ser uno de: {', '.join(self.CANALES)}"
+            )
+
+        if self.estado not in self.ESTADOS:
+            raise ValueError(
+                f"Estado inválido: {self.estado}. Debe ser uno de: {', '.join(self.ESTADOS)}"
+            )
+
+        if not self.destinatario:
+            raise ValueError("La notificación requiere un destinatario")
+
+    @property
+    def agoto_intentos(self) -> bool:
+        """Verifica si ya no quedan reintentos"""
+        return self.intentos >= self.max_intentos
+
+    def siguiente_intento(self, ahora: datetime, backoff_segundos: int) -> Optional[str]:
+        """
+        Fecha del próximo reintento tras un fallo (espera base * 2^(intentos-1)).
+
+        Returns:
+            Fecha en FORMATO_FECHA_HORA, o None si se agotaron los intentos
+        """
+        if self.agoto_intentos:
+            return None
+        espera = backoff_segundos * (2 ** max(self.intentos - 1, 0))
+        return (ahora + timedelta(seconds=espera)).strftime(FORMATO_FECHA_HORA)
@@ -0,0 +1,71 @@
+"""
+Registros de solo lectura de las entidades del dominio.
+
+Para rutas masivas que solo leen (cierres de período, exportaciones, lotes de
+PDF): un registro es una tupla con nombre y los mismos campos y propiedades
+de la entidad, sin `__dict__` por instancia. Sin contar los valores, ocupa
+~6 veces menos memoria que el dataclass y se construye en una sola
+asignación (ver tests/benchmarks/entidades_memoria.py).
+
+Los registros son inmutables y no ejecutan `__post_init__` (los datos ya
+vienen validados de la base). Solo se copian las propiedades de la entidad:
+los métodos que la modifican (p.ej. Liquidacion.calcular_totales) no tienen
+sentido sobre un registro. `a_entidad()` devuelve la entidad mutable para
+los formularios.
+"""
+
+import dataclasses
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any
+
+from .liquidacion import Liquidacion
+from .persona import Persona
+from .propiedad import Propiedad
+from .recaudo import Recaudo
+
+
+def _a_entidad(self) -> Any:
+    """Entidad mutable con los mismos valores (ejecuta sus validaciones)."""
+    return self._entidad(**{campo: getattr(self, campo) for campo in self._campos_init})
+
+
+@lru_cache(maxsize=None)
+def registro_solo_lectura(entidad: type) -> type:
+    """
+    Tipo registro (tupla con nombre) con los campos y propiedades del dataclass.
+
+    Los valores por defecto se conservan; los `default_factory` (created_at)
+    quedan en None. `isinstance(registro, entidad)` es falso: las rutas que
+    lo reciben solo leen atributos.
+    """
+    campos = dataclasses.fields(entidad)
+    defectos = []
+    for campo in campos:
+        if campo.default is not dataclasses.MISSING:
+            defectos.append(campo.default)
+        elif campo.default_factory is not dataclasses.MISSING:
+            defectos.append(None)
+        elif defectos:
+            raise TypeError(f"{entidad.__name__}.{campo.name} sin valor por defecto tras campos con defecto")
+
+    nombre = f"{entidad.__name__}Registro"
+    base = namedtuple(nombre, [campo.name for campo in campos], defaults=defectos)
+    espacio = {
+        "__slots__": (),
+        "__doc__": f"Registro de solo lectura de {entidad.__name__}.",
+        "__module__": __name__,
+        "_entidad": entidad,
+        "_campos_init": tuple(campo.name for campo in campos if campo.init),
+        "a_entidad": _a_entidad,
+    }
+    for atributo, valor in vars(entidad).items():
+        if isinstance(valor, property):
+            espacio[atributo] = valor
+    return type(nombre, (base,), espacio)
+
+
+LiquidacionRegistro = registro_solo_lectura(Liquidacion)
+RecaudoRegistro = registro_solo_lectura(Recaudo)
+PropiedadRegistro = registro_solo_lectura(Propiedad)
+PersonaRegistro = registro_solo_lectura(Persona)
@@ -1,4 +1,4 @@
-from typing import List, Optional, Protocol
+from typing import Dict, List, Optional, Protocol
 
 from ..entidades.cotizacion import Cotizacion
 from ..entidades.incidente import Incidente
@@ -11,6 +11,43 @@ class RepositorioIncidentes(Protocol):
         self, id_propiedad: Optional[int] = None, estado: Optional[str] = None
     ) -> List[Incidente]: ...
 
+    def listar_con_filtros(
+        self,
+        busqueda: Optional[str] = None,
+        id_propiedad: Optional[int] = None,
+        estado: Optional[str] = None,
+        prioridad: Optional[str] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        id_proveedor: Optional[int] = None,
+        dias_min: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Incidente]: ...
+
+    def contar_con_filtros(
+        self,
+        busqueda: Optional[str] = None,
+        id_propiedad: Optional[int] = None,
+        estado: Optional[str] = None,
+        prioridad: Optional[str] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        id_proveedor: Optional[int] = None,
+        dias_min: Optional[int] = None,
+    ) -> int: ...
+
+    def contar_por_estado(
+        self,
+        busqueda: Optional[str] = None,
+        id_propiedad: Optional[int] = None,
+        prioridad: Optional[str] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        id_proveedor: Optional[int] = None,
+        dias_min: Optional[int] = None,
+    ) -> Dict[str, int]: ...
+
     def guardar(self, incidente: Incidente) -> int: ...
 
     def actualizar(self, incidente: Incidente) -> None: ...
@@ -30,7 +30,8 @@ class IRepositorioPersona(Protocol):
         fecha_inicio: Optional[str] = None,
         fecha_fin: Optional[str] = None,
         limit: Optional[int] = None,
-        offset: int = 0
+        offset: int = 0,
+        solo_lectura: bool = False
     ) -> List[Persona]:
         """Obtiene personas con filtros y paginación."""
         ...
@@ -20,7 +20,8 @@ class IRepositorioPropiedad(Protocol):
         solo_activas: bool = True,
         busqueda: Optional[str] = None,
         limit: Optional[int] = None,
-        offset: int = 0
+        offset: int = 0,
+        solo_lectura: bool = False
     ) -> List[Propiedad]:
         ...
         
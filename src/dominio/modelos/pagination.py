@@ -3,16 +3,62 @@ Modelos de dominio para paginación.
 
 Define estructuras de datos para resultados paginados y parámetros de paginación.
 
+Soporta dos modos:
+- Offset (LIMIT/OFFSET): navegación por número de página.
+- Keyset (seek): un cursor opaco con los valores de la clave de orden de la
+  última fila; el costo de una página no crece con la profundidad.
+
+El total puede calcularse con distintas estrategias (ver COUNT_STRATEGIES).
+
 Autor: InmoVelar Dev Team
 Fecha: 2025-12-29
 """
 
+import base64
+import json
 import math
 from dataclasses import dataclass
-from typing import Generic, List, Optional, TypeVar
+from typing import Any, Callable, Generic, List, Optional, Sequence, TypeVar
 
 T = TypeVar("T")
 
+# Estrategias de conteo del total:
+# - exact: COUNT(*) en cada página
+# - cached: COUNT(*) reutilizado durante `count_ttl` segundos
+# - estimate: estimación del planificador (PostgreSQL) o de sqlite_stat1
+COUNT_STRATEGIES = ("exact", "cached", "estimate")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Codifica los valores de la clave de orden como cursor opaco.
+
+    Args:
+        values: Valores de la clave de orden de la última fila entregada
+
+    Returns:
+        Cursor URL-safe
+    """
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decodifica un cursor generado por encode_cursor.
+
+    Raises:
+        ValueError: Si el cursor es inválido
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"cursor inválido: {cursor!r}") from e
+    if not isinstance(values, list):
+        raise ValueError(f"cursor inválido: {cursor!r}")
+    return values
+
 
 @dataclass
 class PaginationParams:
@@ -24,12 +70,18 @@ class PaginationParams:
         page_size: Items por página
         sort_by: Campo para ordenar (opcional)
         sort_desc: Ordenar descendente (default: False)
+        cursor: Cursor keyset de la página anterior (activa el modo keyset)
+        count_strategy: Estrategia de conteo del total (ver COUNT_STRATEGIES)
+        count_ttl: Segundos de validez del conteo con estrategia 'cached'
     """
 
     page: int = 1
     page_size: int = 25
     sort_by: Optional[str] = None
     sort_desc: bool = False
+    cursor: Optional[str] = None
+    count_strategy: str = "exact"
+    count_ttl: int = 60
 
     def __post_init__(self):
         """Validaciones."""
@@ -39,10 +91,26 @@ class PaginationParams:
             raise ValueError("page_size debe ser >= 1")
         if self.page_size > 100:
             raise ValueError("page_size debe ser <= 100")
+        if self.count_strategy not in COUNT_STRATEGIES:
+            raise ValueError(f"count_strategy debe ser uno de {COUNT_STRATEGIES}")
+        if self.cursor is not None:
+            decode_cursor(self.cursor)
+
+    @property
+    def uses_cursor(self) -> bool:
+        """Indica si la página se obtiene por keyset en lugar de OFFSET."""
+        return self.cursor is not None
+
+    @property
+    def cursor_values(self) -> Optional[List[Any]]:
+        """Valores de la clave de orden contenidos en el cursor."""
+        return decode_cursor(self.cursor) if self.cursor is not None else None
 
     @property
     def offset(self) -> int:
-        """Calcula offset para SQL LIMIT/OFFSET."""
+        """Calcula offset para SQL LIMIT/OFFSET (0 en modo keyset)."""
+        if self.uses_cursor:
+            return 0
         return (self.page - 1) * self.page_size
 
     @property
@@ -57,6 +125,8 @@ class PaginationParams:
             "page_size": self.page_size,
             "sort_by": self.sort_by,
             "sort_desc": self.sort_desc,
+            "cursor": self.cursor,
+            "count_strategy": self.count_strategy,
         }
 
 
@@ -71,12 +141,50 @@ class PaginatedResult(Generic[T]):
         page: Página actual
         page_size: Tamaño de página
         total_pages: Total de páginas calculado
+        next_cursor: Cursor para la página siguiente (modo keyset)
+        keyset: Resultado obtenido por keyset (has_next depende de next_cursor)
+        total_is_estimate: El total proviene de la estrategia 'estimate'
     """
 
     items: List[T]
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+    keyset: bool = False
+    total_is_estimate: bool = False
+
+    @classmethod
+    def from_lookahead(
+        cls,
+        items: List[T],
+        total: int,
+        params: PaginationParams,
+        cursor_key: Callable[[T], Sequence[Any]],
+    ) -> "PaginatedResult[T]":
+        """
+        Construye el resultado a partir de una consulta con LIMIT page_size + 1.
+
+        La fila extra solo indica que existe una página siguiente; no se
+        entrega y el cursor se arma con la clave de orden de la última fila.
+
+        Args:
+            items: Filas obtenidas (hasta page_size + 1)
+            total: Total según la estrategia de conteo
+            params: Parámetros de la consulta
+            cursor_key: Función que extrae la clave de orden de un item
+        """
+        has_more = len(items) > params.page_size
+        items = items[: params.page_size]
+        return cls(
+            items=items,
+            total=total,
+            page=params.page,
+            page_size=params.page_size,
+            next_cursor=encode_cursor(cursor_key(items[-1])) if has_more else None,
+            keyset=params.uses_cursor,
+            total_is_estimate=params.count_strategy == "estimate",
+        )
 
     @property
     def total_pages(self) -> int:
@@ -93,6 +201,8 @@ class PaginatedResult(Generic[T]):
     @property
     def has_next(self) -> bool:
         """Indica si hay página siguiente."""
+        if self.keyset:
+            return self.next_cursor is not None
         return self.page < self.total_pages
 
     @property
@@ -139,6 +249,8 @@ class PaginatedResult(Generic[T]):
             "has_next": self.has_next,
             "start_index": self.start_index,
             "end_index": self.end_index,
+            "next_cursor": self.next_cursor,
+            "total_is_estimate": self.total_is_estimate,
         }
 
     def __repr__(self) -> str:
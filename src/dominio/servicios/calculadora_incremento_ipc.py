@@ -0,0 +1,107 @@
+"""
+Cálculo del incremento anual de cánones por IPC.
+
+Reglas puras (sin base de datos) compartidas por el incremento de un contrato
+y por la corrida masiva:
+- El nuevo canon es canon * (1 + IPC/100), redondeado al peso.
+- El porcentaje debe estar en (0, 20].
+- Un contrato es elegible en el mes en que cumple su aniversario: su último
+  incremento (o su inicio, si nunca se ha incrementado) es del mismo mes del
+  año anterior o más antiguo.
+"""
+
+import calendar
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+PORCENTAJE_MAXIMO_IPC = 20
+
+
+@dataclass(frozen=True)
+class IncrementoIPC:
+    """Fila del diff de la corrida: canon actual y canon propuesto de un contrato."""
+
+    id_contrato: int
+    id_propiedad: int
+    canon_anterior: int
+    canon_nuevo: int
+    direccion: str = ""
+    inquilino: str = ""
+    tiene_mandato: bool = False
+
+    @property
+    def diferencia(self) -> int:
+        return self.canon_nuevo - self.canon_anterior
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id_contrato": self.id_contrato,
+            "id_propiedad": self.id_propiedad,
+            "direccion": self.direccion,
+            "inquilino": self.inquilino,
+            "canon_anterior": self.canon_anterior,
+            "canon_nuevo": self.canon_nuevo,
+            "diferencia": self.diferencia,
+            "tiene_mandato": self.tiene_mandato,
+        }
+
+
+def validar_porcentaje_ipc(porcentaje_ipc: float) -> None:
+    """Lanza ValueError si el porcentaje está fuera de (0, 20]."""
+    if porcentaje_ipc is None or porcentaje_ipc <= 0 or porcentaje_ipc > PORCENTAJE_MAXIMO_IPC:
+        raise ValueError(
+            f"Porcentaje IPC inválido: debe ser mayor a 0 y máximo {PORCENTAJE_MAXIMO_IPC}%"
+        )
+
+
+def calcular_canon_incrementado(canon: int, porcentaje_ipc: float) -> int:
+    """Canon tras aplicar el IPC (redondeado al peso)."""
+    canon = int(canon) if canon else 0
+    return round(canon + canon * (porcentaje_ipc / 100))
+
+
+def fecha_corte_elegibilidad(fecha_aplicacion: str) -> str:
+    """
+    Último día del mismo mes del año anterior ('YYYY-MM-DD').
+
+    Los contratos cuya fecha de referencia (último incremento o inicio) es
+    menor o igual a esta fecha cumplen aniversario a más tardar en el mes de
+    aplicación.
+    """
+    fecha = datetime.strptime(fecha_aplicacion, "%Y-%m-%d").date()
+    anio = fecha.year - 1
+    return date(anio, fecha.month, calendar.monthrange(anio, fecha.month)[1]).isoformat()
+
+
+def incrementado_en_mes(ultimo_incremento: Optional[Any], fecha_aplicacion: str) -> bool:
+    """Verifica si el último incremento cae en el mismo mes de la aplicación."""
+    if not ultimo_incremento:
+        return False
+    return str(ultimo_incremento)[:7] == fecha_aplicacion[:7]
+
+
+def construir_incrementos(
+    contratos: Iterable[Dict[str, Any]], porcentaje_ipc: float
+) -> List[IncrementoIPC]:
+    """
+    Calcula el diff de la corrida.
+
+    Args:
+        contratos: Dicts con id_contrato, id_propiedad, canon y opcionalmente
+            direccion, inquilino y tiene_mandato
+        porcentaje_ipc: Porcentaje a aplicar (ej: 5.2 para 5.2%)
+    """
+    validar_porcentaje_ipc(porcentaje_ipc)
+    return [
+        IncrementoIPC(
+            id_contrato=c["id_contrato"],
+            id_propiedad=c["id_propiedad"],
+            canon_anterior=int(c["canon"] or 0),
+            canon_nuevo=calcular_canon_incrementado(c["canon"], porcentaje_ipc),
+            direccion=c.get("direccion") or "",
+            inquilino=c.get("inquilino") or "",
+            tiene_mandato=bool(c.get("tiene_mandato")),
+        )
+        for c in contratos
+    ]
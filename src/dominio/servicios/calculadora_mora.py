@@ -0,0 +1,55 @@
+"""
+Reglas de mora de arrendamientos.
+
+- Cada período (YYYY-MM) de un contrato activo genera un cargo por el canon,
+  que vence el mismo día del mes en que inició el contrato (o el último día
+  del mes si este es más corto).
+- El saldo en mora causa interés simple diario sobre la tasa anual
+  TASA_MORA_ANUAL, truncado al peso.
+"""
+
+import calendar
+from datetime import date, datetime
+from typing import List, Union
+
+TASA_MORA_ANUAL = 0.06
+TASA_MORA_DIARIA = TASA_MORA_ANUAL / 365
+
+Fecha = Union[str, date]
+
+
+def _como_fecha(valor: Fecha) -> date:
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return datetime.strptime(str(valor)[:10], "%Y-%m-%d").date()
+
+
+def interes_mora(saldo: int, dias_mora: int) -> int:
+    """Interés de mora de un saldo tras `dias_mora` días (0 si no hay mora)."""
+    if dias_mora <= 0 or saldo <= 0:
+        return 0
+    return int(saldo * TASA_MORA_DIARIA * dias_mora)
+
+
+def periodo_de(fecha: Fecha) -> str:
+    """Período 'YYYY-MM' de una fecha."""
+    return _como_fecha(fecha).strftime("%Y-%m")
+
+
+def fecha_vencimiento_periodo(fecha_inicio: Fecha, periodo: str) -> str:
+    """Fecha 'YYYY-MM-DD' en que vence el canon del período."""
+    anio, mes = (int(p) for p in periodo.split("-"))
+    dia = min(_como_fecha(fecha_inicio).day, calendar.monthrange(anio, mes)[1])
+    return date(anio, mes, dia).isoformat()
+
+
+def periodos_entre(desde: str, hasta: str) -> List[str]:
+    """Períodos 'YYYY-MM' de `desde` a `hasta`, ambos incluidos."""
+    anio, mes = (int(p) for p in desde.split("-"))
+    periodos = []
+    while f"{anio:04d}-{mes:02d}" <= hasta:
+        periodos.append(f"{anio:04d}-{mes:02d}")
+        anio, mes = (anio + 1, 1) if mes == 12 else (anio, mes + 1)
+    return periodos
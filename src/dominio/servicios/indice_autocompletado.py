@@ -0,0 +1,133 @@
+"""
+Índice en memoria para autocompletado (typeahead).
+
+Combina dos estrategias sobre el texto normalizado (ver normalizador_texto):
+- Prefijo por palabra: "ped" encuentra "José Pérez" (búsqueda binaria sobre
+  los tokens ordenados).
+- Trigramas (estilo pg_trgm): tolera errores de digitación ("perz" ->
+  "Pérez") a partir de 3 caracteres.
+
+Solo se retornan los K mejores resultados: el picker nunca recibe la lista
+completa.
+"""
+
+import bisect
+import heapq
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from src.dominio.servicios.normalizador_texto import normalizar_texto, tokenizar_busqueda
+
+# Similitud mínima (mismo umbral por defecto de pg_trgm)
+UMBRAL_TRIGRAMA = 0.3
+
+
+@dataclass(frozen=True)
+class OpcionAutocompletado:
+    """Entrada del índice: valor, texto visible y datos auxiliares para la UI."""
+
+    id: str
+    texto: str
+    detalle: str = ""
+    extra: Optional[Any] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "texto": self.texto, "detalle": self.detalle, "extra": self.extra}
+
+
+def trigramas(texto: str) -> Set[str]:
+    """Trigramas de cada palabra, con el relleno de pg_trgm (2 espacios antes, 1 después)."""
+    resultado: Set[str] = set()
+    for token in tokenizar_busqueda(texto):
+        relleno = f"  {token} "
+        resultado.update(relleno[i : i + 3] for i in range(len(relleno) - 2))
+    return resultado
+
+
+class IndiceAutocompletado:
+    """
+    Índice inmutable de opciones. Se reconstruye completo cuando cambian los
+    datos (construirlo para decenas de miles de opciones toma milisegundos).
+    """
+
+    def __init__(self, opciones: Iterable[OpcionAutocompletado]):
+        self.opciones: List[OpcionAutocompletado] = list(opciones)
+        self._por_id: Dict[str, OpcionAutocompletado] = {o.id: o for o in self.opciones}
+        self._normalizados: List[str] = []
+        self._tokens: List[tuple] = []  # (token, posición) ordenados para bisect
+        self._trigramas: Dict[str, List[int]] = {}
+        self._total_trigramas: List[int] = []
+
+        for pos, opcion in enumerate(self.opciones):
+            normalizado = normalizar_texto(f"{opcion.texto} {opcion.detalle}")
+            self._normalizados.append(normalizado)
+            for token in set(tokenizar_busqueda(normalizado)):
+                self._tokens.append((token, pos))
+            tri = trigramas(normalizado)
+            self._total_trigramas.append(len(tri))
+            for t in tri:
+                self._trigramas.setdefault(t, []).append(pos)
+
+        self._tokens.sort()
+        self._claves_tokens = [token for token, _ in self._tokens]
+
+    def __len__(self) -> int:
+        return len(self.opciones)
+
+    def obtener(self, id_opcion: Any) -> Optional[OpcionAutocompletado]:
+        """Opción por valor (para mostrar la etiqueta de un ID ya seleccionado)."""
+        return self._por_id.get(str(id_opcion))
+
+    def _coincidencias_prefijo(self, tokens: List[str]) -> Set[int]:
+        """Posiciones donde cada token buscado es prefijo de alguna palabra."""
+        resultado: Optional[Set[int]] = None
+        for token in tokens:
+            inicio = bisect.bisect_left(self._claves_tokens, token)
+            fin = bisect.bisect_left(self._claves_tokens, token + "\uffff")
+            posiciones = {pos for _, pos in self._tokens[inicio:fin]}
+            resultado = posiciones if resultado is None else resultado & posiciones
+            if not resultado:
+                return set()
+        return resultado or set()
+
+    def _coincidencias_trigrama(self, termino: str) -> Dict[int, float]:
+        """Similitud de trigramas (|A∩B| / |A∪B|) por encima del umbral."""
+        buscados = trigramas(termino)
+        if not buscados:
+            return {}
+        compartidos: Counter = Counter()
+        for t in buscados:
+            compartidos.update(self._trigramas.get(t, ()))
+
+        resultado = {}
+        for pos, comunes in compartidos.items():
+            similitud = comunes / (len(buscados) + self._total_trigramas[pos] - comunes)
+            if similitud >= UMBRAL_TRIGRAMA:
+                resultado[pos] = similitud
+        return resultado
+
+    def buscar(self, termino: str, limite: int = 10) -> List[OpcionAutocompletado]:
+        """
+        Retorna las `limite` mejores opciones para el término.
+
+        Orden: prefijo del texto completo > prefijo de palabras > similitud de
+        trigramas; a igual puntaje, orden alfabético.
+        """
+        normalizado = normalizar_texto(termino)
+        if not normalizado:
+            return self.opciones[:limite]
+
+        puntajes: Dict[int, float] = {}
+        tokens = tokenizar_busqueda(normalizado)
+        for pos in self._coincidencias_prefijo(tokens):
+            puntajes[pos] = 3.0 if self._normalizados[pos].startswith(normalizado) else 2.0
+
+        if len(normalizado) >= 3:
+            for pos, similitud in self._coincidencias_trigrama(normalizado).items():
+                puntajes[pos] = max(puntajes.get(pos, 0.0), similitud)
+
+        mejores = heapq.nsmallest(
+            limite, puntajes.items(), key=lambda item: (-item[1], self._normalizados[item[0]])
+        )
+        return [self.opciones[pos] for pos, _ in mejores]
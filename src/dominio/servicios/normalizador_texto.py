@@ -0,0 +1,37 @@
+"""
+Normalización de texto para búsquedas.
+
+Nombres y direcciones en español se escriben con y sin tildes ("Pérez" /
+"Perez", "Cra. 5 # 10-20" / "cra 5 10 20"). La búsqueda compara siempre la
+forma normalizada: sin diacríticos, en minúsculas y con espacios colapsados.
+Es la misma transformación que aplican `unaccent(lower(...))` en PostgreSQL y
+el tokenizador `unicode61 remove_diacritics 2` de SQLite FTS5.
+"""
+
+import re
+import unicodedata
+from typing import List
+
+_ESPACIOS = re.compile(r"\s+")
+_TOKEN = re.compile(r"\w+")
+
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Normaliza un texto para búsqueda insensible a tildes y mayúsculas.
+
+    Example:
+        >>> normalizar_texto("  José  PÉREZ Ñuñez ")
+        'jose perez nunez'
+    """
+    if not texto:
+        return ""
+
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return _ESPACIOS.sub(" ", sin_tildes.lower()).strip()
+
+
+def tokenizar_busqueda(texto: str) -> List[str]:
+    """Retorna los términos alfanuméricos (normalizados) de una búsqueda."""
+    return _TOKEN.findall(normalizar_texto(texto))
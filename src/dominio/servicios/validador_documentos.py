@@ -13,6 +13,22 @@ class ValidadorDocumentos:
         """Obtiene la configuración de tipos para un módulo."""
         return TIPOS_DOCUMENTO_MODULO.get(entidad_tipo)
 
+    @staticmethod
+    def obtener_tamano_maximo(entidad_tipo: str, nombre_archivo: str) -> int:
+        """
+        Retorna el tamaño máximo (bytes) admitido para un archivo según su extensión.
+        Permite rechazar uploads mientras se leen, sin esperar al archivo completo.
+        Retorna 0 si la extensión no está permitida en el módulo.
+        """
+        reglas_modulo = ValidadorDocumentos.obtener_reglas_modulo(entidad_tipo) or {}
+        extension = "." + nombre_archivo.split(".")[-1].lower() if "." in nombre_archivo else ""
+
+        max_size = 0
+        for reglas in reglas_modulo.values():
+            if extension in reglas.get("tipos", []):
+                max_size = max(max_size, reglas.get("max_size", 0))
+        return max_size
+
     @staticmethod
     def validar_archivo_generico(
         entidad_tipo: str, nombre_archivo: str, tamano_bytes: int
@@ -15,7 +15,7 @@ import threading
 import time
 from collections import OrderedDict
 from functools import wraps
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -170,6 +170,9 @@ class CacheManager:
         self.misses = 0
         self._metrics_lock = threading.Lock()
 
+        # Callbacks notificados en cada invalidación (ej. índices en memoria)
+        self._invalidation_listeners: List[Callable[[str], None]] = []
+
         # Background cleanup cada 5 minutos
         self._start_cleanup_thread()
 
@@ -332,8 +335,24 @@ class CacheManager:
             f"(level={'all' if level is None else level}, {total} items)"
         )
 
+        for listener in list(self._invalidation_listeners):
+            try:
+                listener(namespace)
+            except Exception as e:
+                logger.error(f"Error en listener de invalidación ({namespace}): {e}")
+
         return total
 
+    def add_invalidation_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Registra un callback que recibe el namespace de cada invalidación.
+
+        Permite que cachés fuera del CacheManager (ej. índices de
+        autocompletado) se refresquen con los mismos eventos de cambio.
+        """
+        if listener not in self._invalidation_listeners:
+            self._invalidation_listeners.append(listener)
+
     def clear_all(self) -> int:
         """
         Limpia todo el cache.
@@ -55,6 +55,87 @@ class Settings(BaseSettings):
 
     log_file: Optional[str] = Field(default="logs/app.log", description="Archivo de log")
 
+    # === Instrumentación de consultas ===
+    instrumentacion_consultas: bool = Field(
+        default=False, description="Registrar consultas SQL por evento (resumen, lentas y N+1)"
+    )
+
+    consulta_lenta_ms: float = Field(
+        default=200.0, description="Duración a partir de la cual una consulta se registra como lenta"
+    )
+
+    umbral_n_mas_uno: int = Field(
+        default=10, description="Repeticiones de una misma consulta en un evento que se señalan como N+1"
+    )
+
+    # === Compilación SQL ===
+    sql_cache_sentencias: int = Field(
+        default=2048, description="Sentencias SQL compiladas en caché (y cached_statements de SQLite)"
+    )
+
+    sql_umbral_preparar: int = Field(
+        default=25, description="Ejecuciones tras las cuales una sentencia se prepara en PostgreSQL (0 desactiva)"
+    )
+
+    # === SQLite (perfil de producción) ===
+    sqlite_produccion: bool = Field(
+        default=False, description="WAL, pragmas de producción, pool de lecturas y cola de escritura en SQLite"
+    )
+
+    sqlite_busy_timeout_ms: int = Field(
+        default=5000, description="Espera ante una base bloqueada antes de fallar"
+    )
+
+    sqlite_cache_kib: int = Field(
+        default=16384, description="Caché de páginas por conexión (KiB)"
+    )
+
+    sqlite_mmap_mb: int = Field(
+        default=256, description="Tamaño del mapeo en memoria del archivo (0 lo desactiva)"
+    )
+
+    sqlite_lectores: int = Field(
+        default=8, description="Conexiones de solo lectura del pool"
+    )
+
+    sqlite_espera_lector_segundos: float = Field(
+        default=10.0, description="Espera por una conexión de lectura libre"
+    )
+
+    sqlite_espera_escritura_segundos: float = Field(
+        default=30.0,
+        description="Espera por el turno de escritura (transaccion() y escrituras directas en la conexión del hilo)",
+    )
+
+    sqlite_verificacion_inicio: str = Field(
+        default="quick", description="Verificación de integridad al iniciar: quick, completa o ninguna"
+    )
+
+    # === Réplica de lectura ===
+    replica_database_path: Optional[str] = Field(
+        default=None, description="Archivo SQLite de la réplica para lecturas con tolerancia"
+    )
+
+    replica_database_url: Optional[str] = Field(
+        default=None, description="URL postgresql:// de la réplica para lecturas con tolerancia"
+    )
+
+    replica_conexiones: int = Field(
+        default=4, description="Conexiones abiertas a la réplica"
+    )
+
+    replica_intervalo_retraso_segundos: float = Field(
+        default=1.0, description="Cada cuánto se vuelve a medir el retraso de la réplica"
+    )
+
+    replica_pausa_error_segundos: float = Field(
+        default=30.0, description="Tiempo sin usar la réplica tras un error"
+    )
+
+    lectura_tolerancia_reportes_segundos: float = Field(
+        default=60.0, description="Retraso aceptado en dashboard, reportes, exportaciones y datos de PDF"
+    )
+
     # === Seguridad ===
     secret_key: str = Field(
         default="CHANGE_ME_IN_PRODUCTION", description="Clave secreta para encriptación"
@@ -76,11 +157,66 @@ class Settings(BaseSettings):
 
     smtp_password: Optional[str] = Field(default=None, description="Contraseña SMTP (App Password)")
 
+    smtp_use_tls: bool = Field(
+        default=True, description="Usar STARTTLS (desactivar solo para un SMTP local de pruebas)"
+    )
+
     # === Notificaciones (WhatsApp) ===
     wa_autosend_delay: float = Field(
         default=3.5, description="Tiempo de espera para envío automático WhatsApp"
     )
 
+    # === Notificaciones (Outbox) ===
+    notificaciones_lote: int = Field(
+        default=20, description="Notificaciones reclamadas por canal en cada ciclo del despachador"
+    )
+
+    notificaciones_email_por_minuto: int = Field(
+        default=30, description="Límite de correos por minuto (Office 365 admite 30)"
+    )
+
+    notificaciones_whatsapp_por_minuto: int = Field(
+        default=6, description="Límite de mensajes de WhatsApp por minuto"
+    )
+
+    notificaciones_max_intentos: int = Field(
+        default=5, description="Intentos antes de marcar una notificación como Fallida"
+    )
+
+    notificaciones_backoff_segundos: int = Field(
+        default=30, description="Espera base entre reintentos (se duplica en cada intento)"
+    )
+
+    notificaciones_intervalo_segundos: float = Field(
+        default=5.0, description="Pausa del despachador cuando el outbox está vacío"
+    )
+
+    # === Auditoría (escritor con buffer) ===
+    auditoria_lote: int = Field(
+        default=500, description="Filas de auditoría insertadas por transacción"
+    )
+
+    auditoria_max_pendientes: int = Field(
+        default=10000, description="Filas en memoria antes de escribir en el hilo que registra"
+    )
+
+    auditoria_intervalo_segundos: float = Field(
+        default=1.0, description="Máximo de segundos que una fila de auditoría espera en memoria"
+    )
+
+    # === Auditoría (particiones y retención) ===
+    auditoria_meses_activos: int = Field(
+        default=3, description="Meses de auditoría en la tabla activa (SQLite); los anteriores van a su tabla mensual"
+    )
+
+    auditoria_meses_retencion: int = Field(
+        default=24, description="Meses de auditoría consultables antes de pasar a archivo comprimido"
+    )
+
+    auditoria_directorio_archivo: str = Field(
+        default="archivos/auditoria", description="Directorio de los archivos CSV comprimidos de auditoría"
+    )
+
     class Config:
         """Configuración de Pydantic."""
 
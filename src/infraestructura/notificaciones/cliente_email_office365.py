@@ -1,9 +1,11 @@
 import logging
 import os
 import smtplib
+from contextlib import contextmanager
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from typing import Iterator, Optional
 
 from src.infraestructura.configuracion.settings import obtener_configuracion
 
@@ -12,12 +14,21 @@ class ClienteEmailOffice365:
     """
     Cliente para envío de correos usando el servidor SMTP de Office 365.
     Usa la configuración centralizada (Settings).
+
+    `enviar_correo` abre una conexión por correo; para lotes use `sesion()` y
+    `enviar_en_sesion()`, que reutilizan una sola conexión autenticada.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        smtp_server: Optional[str] = None,
+        smtp_port: Optional[int] = None,
+        usar_tls: Optional[bool] = None,
+    ):
         config = obtener_configuracion()
-        self.smtp_server = config.smtp_server
-        self.smtp_port = config.smtp_port
+        self.smtp_server = smtp_server or config.smtp_server
+        self.smtp_port = smtp_port or config.smtp_port
+        self.usar_tls = config.smtp_use_tls if usar_tls is None else usar_tls
         self.email = config.smtp_user
         self.password = config.smtp_password
         self.logger = logging.getLogger(__name__)
@@ -25,6 +36,69 @@ class ClienteEmailOffice365:
         if not self.email or not self.password:
             self.logger.warning("Credenciales SMTP no configuradas (configuracion settings)")
 
+    @property
+    def configurado(self) -> bool:
+        return bool(self.email and self.password)
+
+    def _construir_mensaje(
+        self, destinatario: str, asunto: str, cuerpo: str, adjunto_path: str = None
+    ) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg["From"] = self.email
+        msg["To"] = destinatario
+        msg["Subject"] = asunto
+
+        # Agregar cuerpo del mensaje
+        msg.attach(MIMEText(cuerpo, "html"))  # Asumimos HTML por defecto para formatting
+
+        # Agregar adjunto si existe
+        if adjunto_path:
+            if os.path.exists(adjunto_path):
+                filename = os.path.basename(adjunto_path)
+                try:
+                    with open(adjunto_path, "rb") as f:
+                        part = MIMEApplication(f.read(), Name=filename)
+
+                    part["Content-Disposition"] = f'attachment; filename="{filename}"'
+                    msg.attach(part)
+                except Exception as e:
+                    self.logger.error(f"Error leyendo adjunto {adjunto_path}: {e}")
+            else:
+                self.logger.warning(f"Archivo adjunto no encontrado: {adjunto_path}")
+
+        return msg
+
+    @contextmanager
+    def sesion(self) -> Iterator[smtplib.SMTP]:
+        """
+        Conexión SMTP autenticada (STARTTLS + login una sola vez).
+
+        Raises:
+            smtplib.SMTPException / OSError si no se puede conectar o autenticar
+        """
+        with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30) as server:
+            if self.usar_tls:
+                server.starttls()  # Importante para Office 365
+            server.login(self.email, self.password)
+            yield server
+
+    def enviar_en_sesion(
+        self,
+        server: smtplib.SMTP,
+        destinatario: str,
+        asunto: str,
+        cuerpo: str,
+        adjunto_path: str = None,
+    ) -> None:
+        """
+        Envía un correo por una sesión abierta con `sesion()`.
+
+        Raises:
+            smtplib.SMTPException si el servidor rechaza el mensaje
+        """
+        server.send_message(self._construir_mensaje(destinatario, asunto, cuerpo, adjunto_path))
+        self.logger.info(f"Correo enviado exitosamente a {destinatario}")
+
     def enviar_correo(
         self, destinatario: str, asunto: str, cuerpo: str, adjunto_path: str = None
     ) -> bool:
@@ -40,42 +114,13 @@ class ClienteEmailOffice365:
         Returns:
             True si el envío fue exitoso, False en caso contrario.
         """
-        if not self.email or not self.password:
+        if not self.configurado:
             self.logger.error("No se puede enviar correo: Credenciales faltantes.")
             return False
 
         try:
-            # Configurar mensaje
-            msg = MIMEMultipart()
-            msg["From"] = self.email
-            msg["To"] = destinatario
-            msg["Subject"] = asunto
-
-            # Agregar cuerpo del mensaje
-            msg.attach(MIMEText(cuerpo, "html"))  # Asumimos HTML por defecto para formatting
-
-            # Agregar adjunto si existe
-            if adjunto_path:
-                if os.path.exists(adjunto_path):
-                    filename = os.path.basename(adjunto_path)
-                    try:
-                        with open(adjunto_path, "rb") as f:
-                            part = MIMEApplication(f.read(), Name=filename)
-
-                        part["Content-Disposition"] = f'attachment; filename="{filename}"'
-                        msg.attach(part)
-                    except Exception as e:
-                        self.logger.error(f"Error leyendo adjunto {adjunto_path}: {e}")
-                else:
-                    self.logger.warning(f"Archivo adjunto no encontrado: {adjunto_path}")
-
-            # Conectar al servidor SMTP
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()  # Importante para Office 365
-                server.login(self.email, self.password)
-                server.send_message(msg)
-
-            self.logger.info(f"Correo enviado exitosamente a {destinatario}")
+            with self.sesion() as server:
+                self.enviar_en_sesion(server, destinatario, asunto, cuerpo, adjunto_path)
             return True
 
         except smtplib.SMTPAuthenticationError as e:
@@ -0,0 +1,268 @@
+"""
+Despachador del Outbox de Notificaciones.
+
+Envía en segundo plano las notificaciones encoladas en NOTIFICACIONES_OUTBOX:
+- Correo: un lote por ciclo sobre una sola sesión SMTP (STARTTLS + login una
+  vez), en lugar de una conexión por correo.
+- WhatsApp: secuencial (automatiza la app de escritorio), fuera del hilo de
+  la petición del usuario.
+
+Cada canal tiene su límite de envíos por minuto y cada fallo se reprograma
+con espera exponencial hasta agotar los intentos (estado 'Fallida').
+"""
+
+import logging
+import smtplib
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from src.dominio.entidades.notificacion_outbox import FORMATO_FECHA_HORA, NotificacionOutbox
+from src.infraestructura.configuracion.settings import obtener_configuracion
+from src.infraestructura.persistencia.repositorio_notificaciones_outbox_sqlite import (
+    RepositorioNotificacionesOutboxSQLite,
+)
+
+logger = logging.getLogger(__name__)
+
+# Errores que invalidan la sesión SMTP completa (el resto del lote se reintenta)
+_ERRORES_SESION = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class LimitadorTasa:
+    """Token bucket: hasta `por_minuto` envíos por minuto, con ráfagas del mismo tamaño."""
+
+    def __init__(self, por_minuto: int, reloj: Callable[[], float] = time.monotonic):
+        self.capacidad = max(int(por_minuto), 1)
+        self.por_segundo = self.capacidad / 60.0
+        self._reloj = reloj
+        self._tokens = float(self.capacidad)
+        self._ultimo = reloj()
+
+    def _recargar(self) -> None:
+        ahora = self._reloj()
+        self._tokens = min(self.capacidad, self._tokens + (ahora - self._ultimo) * self.por_segundo)
+        self._ultimo = ahora
+
+    def cupo(self) -> int:
+        """Envíos permitidos ahora mismo."""
+        self._recargar()
+        return int(self._tokens)
+
+    def consumir(self) -> bool:
+        self._recargar()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class DespachadorNotificaciones:
+    """Procesa el outbox por lotes; `iniciar()` lo ejecuta en un hilo daemon."""
+
+    def __init__(
+        self,
+        repositorio: RepositorioNotificacionesOutboxSQLite,
+        email_client=None,
+        whatsapp_client=None,
+        lote: Optional[int] = None,
+        email_por_minuto: Optional[int] = None,
+        whatsapp_por_minuto: Optional[int] = None,
+        backoff_segundos: Optional[int] = None,
+        intervalo_segundos: Optional[float] = None,
+    ):
+        config = obtener_configuracion()
+        self.repositorio = repositorio
+        self._email_client = email_client
+        self._whatsapp_client = whatsapp_client
+        self.lote = lote or config.notificaciones_lote
+        self.backoff_segundos = (
+            config.notificaciones_backoff_segundos if backoff_segundos is None else backoff_segundos
+        )
+        self.intervalo_segundos = intervalo_segundos or config.notificaciones_intervalo_segundos
+        self.limitadores: Dict[str, LimitadorTasa] = {
+            "email": LimitadorTasa(email_por_minuto or config.notificaciones_email_por_minuto),
+            "whatsapp": LimitadorTasa(
+                whatsapp_por_minuto or config.notificaciones_whatsapp_por_minuto
+            ),
+        }
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    # Los clientes se crean al primer uso (WhatsApp importa pyautogui)
+    @property
+    def email_client(self):
+        if self._email_client is None:
+            from src.infraestructura.notificaciones.cliente_email_office365 import (
+                ClienteEmailOffice365,
+            )
+
+            self._email_client = ClienteEmailOffice365()
+        return self._email_client
+
+    @property
+    def whatsapp_client(self):
+        if self._whatsapp_client is None:
+            from src.infraestructura.notificaciones.cliente_whatsapp_desktop import (
+                ClienteWhatsAppDesktop,
+            )
+
+            self._whatsapp_client = ClienteWhatsAppDesktop()
+        return self._whatsapp_client
+
+    # ------------------------------------------------------------------
+    # Registro de resultados
+    # ------------------------------------------------------------------
+
+    def _fallo(self, notificacion: NotificacionOutbox, error: Exception | str) -> None:
+        notificacion.intentos += 1
+        proximo = notificacion.siguiente_intento(datetime.now(), self.backoff_segundos)
+        self.repositorio.registrar_fallo(notificacion.id_notificacion, str(error), proximo)
+        if proximo:
+            logger.info(
+                f"Notificación {notificacion.id_notificacion} falló "
+                f"(intento {notificacion.intentos}), reintento {proximo}: {error}"
+            )
+        else:
+            logger.warning(f"Notificación {notificacion.id_notificacion} fallida: {error}")
+
+    def _liberar(self, notificaciones: List[NotificacionOutbox]) -> None:
+        """Devuelve al outbox lo que el límite de tasa no dejó enviar en este ciclo."""
+        ahora = datetime.now().strftime(FORMATO_FECHA_HORA)
+        for notificacion in notificaciones:
+            self.repositorio.liberar(notificacion.id_notificacion, ahora)
+
+    # ------------------------------------------------------------------
+    # Canales
+    # ------------------------------------------------------------------
+
+    def _enviar_emails(self, notificaciones: List[NotificacionOutbox]) -> Dict[str, int]:
+        resumen = {"enviadas": 0, "fallidas": 0}
+        if not self.email_client.configurado:
+            for notificacion in notificaciones:
+                self._fallo(notificacion, "Credenciales SMTP no configuradas")
+            resumen["fallidas"] = len(notificaciones)
+            return resumen
+
+        pendientes = list(notificaciones)
+        try:
+            with self.email_client.sesion() as server:
+                while pendientes:
+                    if not self.limitadores["email"].consumir():
+                        break
+                    notificacion = pendientes[0]
+                    try:
+                        self.email_client.enviar_en_sesion(
+                            server,
+                            notificacion.destinatario,
+                            notificacion.asunto or "",
+                            notificacion.cuerpo,
+                            notificacion.adjunto_path,
+                        )
+                    except _ERRORES_SESION:
+                        raise
+                    except Exception as e:
+                        # Rechazo de este mensaje (destinatario, tamaño...): la sesión sigue
+                        pendientes.pop(0)
+                        self._fallo(notificacion, e)
+                        resumen["fallidas"] += 1
+                        continue
+                    pendientes.pop(0)
+                    self.repositorio.marcar_enviada(notificacion.id_notificacion)
+                    resumen["enviadas"] += 1
+        except Exception as e:
+            # Conexión/autenticación: el resto del lote cuenta un intento fallido
+            for notificacion in pendientes:
+                self._fallo(notificacion, e)
+            resumen["fallidas"] += len(pendientes)
+            return resumen
+
+        self._liberar(pendientes)
+        return resumen
+
+    def _enviar_whatsapp(self, notificaciones: List[NotificacionOutbox]) -> Dict[str, int]:
+        resumen = {"enviadas": 0, "fallidas": 0}
+        for pos, notificacion in enumerate(notificaciones):
+            if self._detener.is_set() or not self.limitadores["whatsapp"].consumir():
+                self._liberar(notificaciones[pos:])
+                break
+            try:
+                ok = self.whatsapp_client.enviar_mensaje(
+                    notificacion.destinatario, notificacion.cuerpo
+                )
+            except Exception as e:
+                ok, error = False, e
+            else:
+                error = "No se pudo automatizar WhatsApp Desktop"
+            if ok:
+                self.repositorio.marcar_enviada(notificacion.id_notificacion)
+                resumen["enviadas"] += 1
+            else:
+                self._fallo(notificacion, error)
+                resumen["fallidas"] += 1
+        return resumen
+
+    # ------------------------------------------------------------------
+    # Ciclo
+    # ------------------------------------------------------------------
+
+    def procesar_lote(self) -> Dict[str, int]:
+        """
+        Un ciclo de despacho: reclama y envía un lote por canal.
+
+        Returns:
+            Dict con 'enviadas' y 'fallidas' del ciclo
+        """
+        resumen = {"enviadas": 0, "fallidas": 0}
+        for canal, enviar in (("email", self._enviar_emails), ("whatsapp", self._enviar_whatsapp)):
+            cupo = min(self.lote, self.limitadores[canal].cupo())
+            if cupo <= 0:
+                continue
+            notificaciones = self.repositorio.reclamar_lote(canal, cupo)
+            if not notificaciones:
+                continue
+            for clave, valor in enviar(notificaciones).items():
+                resumen[clave] += valor
+        return resumen
+
+    def _bucle(self) -> None:
+        while not self._detener.is_set():
+            try:
+                resumen = self.procesar_lote()
+            except Exception as e:
+                logger.error(f"Error en el despachador de notificaciones: {e}")
+                resumen = {"enviadas": 0, "fallidas": 0}
+            # Outbox vacío (o límite alcanzado): esperar antes del siguiente ciclo
+            if not any(resumen.values()):
+                self._detener.wait(self.intervalo_segundos)
+
+    def iniciar(self) -> None:
+        if self._hilo and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(
+            target=self._bucle, daemon=True, name="NotificacionesOutbox"
+        )
+        self._hilo.start()
+        logger.info("Despachador de notificaciones iniciado")
+
+    def detener(self, timeout: float = 10.0) -> None:
+        self._detener.set()
+        if self._hilo:
+            self._hilo.join(timeout=timeout)
+            self._hilo = None
+
+
+@asynccontextmanager
+async def despachador_en_segundo_plano():
+    """Lifespan task de Reflex: despacha el outbox mientras la app está arriba."""
+    from src.aplicacion.contenedor import obtener_contenedor
+
+    despachador = DespachadorNotificaciones(obtener_contenedor().repo_notificaciones_outbox)
+    despachador.iniciar()
+    try:
+        yield
+    finally:
+        despachador.detener()
@@ -0,0 +1,425 @@
+"""
+Compilación de SQL por dialecto con caché de sentencias.
+
+Los repositorios escriben SQL al estilo SQLite (placeholders `?`, `date('now',
+'+N days')`, `strftime`, `ifnull`). En PostgreSQL el UpperCaseCursorWrapper
+pasa cada sentencia por `CompiladorSQL`, que la traduce una sola vez por texto
+y guarda el resultado:
+
+- `?` fuera de literales pasa a `%s`; un `?` dentro de un literal o
+  comentario no se toca (el `replace("?", "%s")` anterior lo rompía). Con
+  parámetros, los `%` sueltos se duplican para psycopg2.
+- Funciones de fecha de SQLite a PostgreSQL, con tipo DATE/TIMESTAMP:
+  `date('now')` -> CURRENT_DATE, `date('now', '+N days')` -> CURRENT_DATE
+  + INTERVAL, `date(col)` -> CAST(col AS DATE), `strftime('%Y-%m', x)` ->
+  TO_CHAR(...), `datetime(...)`, `ifnull` -> COALESCE. Las columnas de texto
+  se comparan envueltas en date()/datetime() para que ambos lados sean fecha.
+- Las sentencias más usadas (más de `umbral_preparar` ejecuciones) pasan a
+  sentencias preparadas en el servidor (PREPARE/EXECUTE) por conexión, sin
+  volver a analizar ni planificar en cada ejecución.
+
+`estadisticas()` informa la tasa de aciertos de la caché, el tiempo de
+compilación ahorrado y el ahorro medido de las sentencias preparadas
+(diferencia de la duración media antes y después de preparar).
+
+En SQLite el texto no se traduce; la caché de sentencias es la propia del
+módulo sqlite3 (`cached_statements`, ver DatabaseManager).
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Sentencias más largas (p.ej. execute_values con miles de filas) no se guardan
+LONGITUD_MAXIMA_CACHE = 8192
+
+# duplicate_prepared_statement: el nombre ya está preparado en la sesión
+SQLSTATE_PREPARADA_DUPLICADA = "42P05"
+
+_RE_TOKEN = re.compile(
+    r"""
+      (?P<cadena>'(?:[^']|'')*'?)
+    | (?P<identificador>"(?:[^"]|"")*"?)
+    | (?P<comentario>--[^\n]*|/\*.*?(?:\*/|\Z))
+    | (?P<dolar>\$(?P<etiqueta>[A-Za-z_]*)\$.*?(?:\$(?P=etiqueta)\$|\Z))
+    | (?P<palabra>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<espacio>\s+)
+    | (?P<otro>%s|%\(|%%|.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_RE_MODIFICADOR = re.compile(
+    r"^\s*([+-]?\d+(?:\.\d+)?)\s+(day|month|year|hour|minute|second)s?\s*$", re.IGNORECASE
+)
+_RE_ESTRELLA = re.compile(r"(?:\bSELECT|,|\.)\s*\*", re.IGNORECASE)
+_FORMATOS_FECHA = {"%Y": "YYYY", "%m": "MM", "%d": "DD", "%j": "DDD", "%W": "WW"}
+_FORMATOS_HORA = {"%H": "HH24", "%M": "MI", "%S": "SS"}
+_PREPARABLES = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+Token = Tuple[str, str]
+
+
+def _tokenizar(sql: str) -> List[Token]:
+    return [(m.lastgroup, m.group()) for m in _RE_TOKEN.finditer(sql)]
+
+
+def _valor_cadena(token: Token) -> Optional[str]:
+    if token[0] != "cadena" or len(token[1]) < 2:
+        return None
+    return token[1][1:-1].replace("''", "'")
+
+
+def _cadena(valor: str) -> str:
+    return "'" + valor.replace("'", "''") + "'"
+
+
+def _argumentos(tokens: List[Token], inicio: int) -> Tuple[Optional[List[List[Token]]], int]:
+    """Argumentos de la llamada cuyo '(' está en `inicio` y posición tras su ')'."""
+    argumentos: List[List[Token]] = [[]]
+    nivel = 0
+    for i in range(inicio + 1, len(tokens)):
+        tipo, texto = tokens[i]
+        if tipo == "otro" and texto == "(":
+            nivel += 1
+        elif tipo == "otro" and texto == ")":
+            if nivel == 0:
+                return argumentos, i + 1
+            nivel -= 1
+        elif tipo == "otro" and texto == "," and nivel == 0:
+            argumentos.append([])
+            continue
+        argumentos[-1].append(tokens[i])
+    return None, len(tokens)
+
+
+def _literal(argumento: List[Token]) -> Optional[str]:
+    """Valor del argumento si es un único literal de texto."""
+    tokens = [t for t in argumento if t[0] not in ("espacio", "comentario")]
+    return _valor_cadena(tokens[0]) if len(tokens) == 1 else None
+
+
+class _TraductorPostgreSQL:
+    """Traduce una lista de tokens de SQL estilo SQLite a PostgreSQL."""
+
+    def traducir(self, tokens: List[Token]) -> str:
+        partes: List[str] = []
+        i = 0
+        while i < len(tokens):
+            tipo, texto = tokens[i]
+            siguiente = i + 1
+            while siguiente < len(tokens) and tokens[siguiente][0] == "espacio":
+                siguiente += 1
+            if (
+                tipo == "palabra"
+                and siguiente < len(tokens)
+                and tokens[siguiente] == ("otro", "(")
+                and not (partes and partes[-1] == ".")
+            ):
+                argumentos, fin = _argumentos(tokens, siguiente)
+                traduccion = self._funcion(texto.lower(), argumentos) if argumentos is not None else None
+                if traduccion is not None:
+                    partes.append(traduccion)
+                    i = fin
+                    continue
+            partes.append(texto)
+            i += 1
+        return "".join(partes)
+
+    def _funcion(self, nombre: str, argumentos: List[List[Token]]) -> Optional[str]:
+        if nombre == "ifnull" and len(argumentos) == 2:
+            return f"COALESCE({self.traducir(argumentos[0]).strip()}, {self.traducir(argumentos[1]).strip()})"
+        if nombre in ("date", "datetime"):
+            return self._fecha(argumentos, "DATE" if nombre == "date" else "TIMESTAMP")
+        if nombre == "strftime" and len(argumentos) >= 2:
+            formato = _literal(argumentos[0])
+            if formato is None:
+                return None
+            tipo = "TIMESTAMP" if any(f in formato for f in _FORMATOS_HORA) else "DATE"
+            valor = self._fecha(argumentos[1:], tipo)
+            if valor is None:
+                return None
+            for sqlite, postgresql in {**_FORMATOS_FECHA, **_FORMATOS_HORA}.items():
+                formato = formato.replace(sqlite, postgresql)
+            if "%" in formato:
+                return None
+            return f"TO_CHAR({valor}, {_cadena(formato)})"
+        return None
+
+    def _fecha(self, argumentos: List[List[Token]], tipo: str) -> Optional[str]:
+        """date()/datetime() con sus modificadores, como expresión DATE o TIMESTAMP."""
+        if not argumentos or all(t[0] in ("espacio", "comentario") for t in argumentos[0]):
+            return None
+        base = [t for t in argumentos[0] if t[0] not in ("espacio", "comentario")]
+        if (_literal(argumentos[0]) or "").lower() == "now":
+            valor = "CURRENT_DATE" if tipo == "DATE" else "LOCALTIMESTAMP(0)"
+        elif base[0][0] == "palabra" and base[0][1].lower() == ("date" if tipo == "DATE" else "datetime"):
+            # date(date('now', ...)): la expresión interna ya es del tipo
+            valor = self.traducir(argumentos[0]).strip()
+        else:
+            valor = f"CAST({self.traducir(argumentos[0]).strip()} AS {tipo})"
+        for modificador in argumentos[1:]:
+            texto = _literal(modificador)
+            if texto is None:
+                return None
+            texto = texto.strip().lower()
+            if texto in ("localtime", "utc"):
+                continue
+            if texto in ("start of month", "start of year", "start of day"):
+                unidad = texto.rsplit(" ", 1)[1]
+                valor = f"CAST(DATE_TRUNC('{unidad}', {valor}) AS {tipo})"
+                continue
+            if not _RE_MODIFICADOR.match(texto):
+                return None
+            valor = f"CAST({valor} + INTERVAL {_cadena(texto)} AS {tipo})"
+        return valor
+
+
+_RE_PORCENTAJE = re.compile(r"%%|%")
+
+
+def _escapar_porcentajes(texto: str) -> str:
+    """% sueltos -> %% para psycopg2 (los %%, %s y %( ya escritos se conservan)."""
+    partes = []
+    for tipo, token in _tokenizar(texto):
+        if token not in ("%s", "%(", "%%") and "%" in token:
+            token = _RE_PORCENTAJE.sub("%%", token)
+        partes.append(token)
+    return "".join(partes)
+
+
+def traducir(sql: str, dialecto: str, con_parametros: bool = True) -> Tuple[str, int]:
+    """
+    SQL para el dialecto y número de placeholders posicionales.
+
+    En SQLite devuelve el texto tal cual.
+    """
+    tokens = _tokenizar(sql)
+    n_parametros = sum(1 for t in tokens if t in (("otro", "?"), ("otro", "%s")))
+    if dialecto != "postgresql":
+        return sql, n_parametros
+    tokens = [("otro", "%s") if t == ("otro", "?") else t for t in tokens]
+    texto = _TraductorPostgreSQL().traducir(tokens)
+    if con_parametros:
+        texto = _escapar_porcentajes(texto)
+    return texto, n_parametros
+
+
+def _preparable(texto: str) -> bool:
+    """Una sola sentencia DML/SELECT, sin parámetros con nombre ni `SELECT *`."""
+    tokens = _tokenizar(texto)
+    codigo = "".join(t for tipo, t in tokens if tipo not in ("cadena", "comentario", "dolar"))
+    return (
+        codigo.lstrip().upper().startswith(_PREPARABLES)
+        and ";" not in codigo.rstrip().rstrip(";")
+        and "%(" not in codigo
+        and not _RE_ESTRELLA.search(codigo)
+    )
+
+
+def _numerar_parametros(texto: str) -> str:
+    """%s fuera de literales -> $1..$n, y %% -> % (para PREPARE)."""
+    partes = []
+    n = 0
+    for tipo, token in _tokenizar(texto):
+        if tipo == "otro" and token == "%s":
+            n += 1
+            token = f"${n}"
+        elif "%%" in token:
+            token = token.replace("%%", "%")
+        partes.append(token)
+    return "".join(partes)
+
+
+class SentenciaCompilada:
+    """Resultado de compilar un texto SQL y sus contadores de ejecución."""
+
+    __slots__ = (
+        "original", "texto", "n_parametros", "nombre", "texto_preparado", "compilacion_s",
+        "ejecuciones", "directas", "tiempo_directas_s", "preparadas", "tiempo_preparadas_s",
+    )
+
+    def __init__(self, original: str, texto: str, n_parametros: int, preparable: bool, compilacion_s: float):
+        self.original = original
+        self.texto = texto
+        self.n_parametros = n_parametros
+        self.nombre = "sq_" + hashlib.blake2b(texto.encode("utf-8"), digest_size=8).hexdigest()
+        self.texto_preparado = _numerar_parametros(texto) if preparable else None
+        self.compilacion_s = compilacion_s
+        self.ejecuciones = 0
+        self.directas = 0
+        self.tiempo_directas_s = 0.0
+        self.preparadas = 0
+        self.tiempo_preparadas_s = 0.0
+
+    def ahorro_preparada_s(self) -> float:
+        """Duración media directa menos preparada, por cada ejecución preparada."""
+        if not self.directas or not self.preparadas:
+            return 0.0
+        diferencia = self.tiempo_directas_s / self.directas - self.tiempo_preparadas_s / self.preparadas
+        return max(0.0, diferencia) * self.preparadas
+
+
+class SentenciasPreparadas:
+    """
+    Sentencias preparadas de una conexión de PostgreSQL.
+
+    Un PREPARE dura toda la sesión (un ROLLBACK no lo deshace): cada sentencia
+    conserva su nombre mientras la conexión viva y se prepara una sola vez.
+    """
+
+    def __init__(self):
+        self.nombres: set = set()
+
+    def nombre(self, sentencia: SentenciaCompilada) -> str:
+        return sentencia.nombre
+
+
+class CompiladorSQL:
+    """
+    Caché LRU de sentencias compiladas para un dialecto.
+
+    Args:
+        dialecto: 'postgresql' o 'sqlite'
+        capacidad: Sentencias distintas en caché
+        umbral_preparar: Ejecuciones tras las cuales una sentencia se prepara
+            en el servidor (0 desactiva las sentencias preparadas)
+    """
+
+    def __init__(self, dialecto: str, capacidad: int = 2048, umbral_preparar: int = 25):
+        self.dialecto = dialecto
+        self.capacidad = capacidad
+        self.umbral_preparar = umbral_preparar
+        self._cache: "OrderedDict[Tuple[str, bool], SentenciaCompilada]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.reiniciar_estadisticas()
+
+    def reiniciar_estadisticas(self) -> None:
+        self.aciertos = 0
+        self.fallos = 0
+        self.compilacion_s = 0.0
+        self.compilacion_ahorrada_s = 0.0
+        self.preparaciones = 0
+        self.preparaciones_fallidas = 0
+
+    def compilar(self, sql: str, con_parametros: bool = True) -> SentenciaCompilada:
+        clave = (sql, con_parametros)
+        with self._lock:
+            sentencia = self._cache.get(clave)
+            if sentencia is not None:
+                self._cache.move_to_end(clave)
+                self.aciertos += 1
+                self.compilacion_ahorrada_s += sentencia.compilacion_s
+                return sentencia
+
+        inicio = time.perf_counter()
+        texto, n_parametros = traducir(sql, self.dialecto, con_parametros)
+        preparable = self.dialecto == "postgresql" and _preparable(texto)
+        sentencia = SentenciaCompilada(sql, texto, n_parametros, preparable, time.perf_counter() - inicio)
+
+        with self._lock:
+            self.fallos += 1
+            self.compilacion_s += sentencia.compilacion_s
+            if len(sql) <= LONGITUD_MAXIMA_CACHE:
+                self._cache[clave] = sentencia
+                if len(self._cache) > self.capacidad:
+                    self._cache.popitem(last=False)
+        return sentencia
+
+    def ejecutar(
+        self,
+        cursor: Any,
+        sql: str,
+        parametros: Optional[Sequence[Any]] = None,
+        preparadas: Optional[SentenciasPreparadas] = None,
+    ) -> None:
+        """
+        Ejecuta `sql` en el cursor de psycopg2 compilado para el dialecto.
+
+        Con `preparadas` (el registro de la conexión), una sentencia que supera
+        el umbral se prepara una vez por conexión y se ejecuta con EXECUTE.
+        """
+        sentencia = self.compilar(sql, parametros is not None)
+        if preparadas is not None and self._usar_preparada(sentencia, parametros):
+            nombre = preparadas.nombre(sentencia)
+            if nombre in preparadas.nombres or self._preparar(cursor, sentencia, nombre):
+                preparadas.nombres.add(nombre)
+                argumentos = ", ".join(["%s"] * sentencia.n_parametros)
+                inicio = time.perf_counter()
+                if sentencia.n_parametros:
+                    cursor.execute(f"EXECUTE {nombre} ({argumentos})", parametros)
+                else:
+                    cursor.execute(f"EXECUTE {nombre}")
+                sentencia.preparadas += 1
+                sentencia.tiempo_preparadas_s += time.perf_counter() - inicio
+                return
+
+        inicio = time.perf_counter()
+        cursor.execute(sentencia.texto, parametros)
+        if sentencia.texto_preparado is not None:
+            sentencia.directas += 1
+            sentencia.tiempo_directas_s += time.perf_counter() - inicio
+
+    def _usar_preparada(self, sentencia: SentenciaCompilada, parametros: Optional[Sequence[Any]]) -> bool:
+        if not self.umbral_preparar or sentencia.texto_preparado is None:
+            return False
+        if parametros is None:
+            parametros = ()
+        if not isinstance(parametros, (tuple, list)) or len(parametros) != sentencia.n_parametros:
+            return False
+        # Listas/tuplas se adaptan como (a, b, ...) para IN %s: no caben en EXECUTE
+        if any(isinstance(p, (tuple, list, dict)) for p in parametros):
+            return False
+        sentencia.ejecuciones += 1
+        return sentencia.ejecuciones > self.umbral_preparar
+
+    def _preparar(self, cursor: Any, sentencia: SentenciaCompilada, nombre: str) -> bool:
+        """
+        PREPARE dentro de un savepoint: si falla, la transacción sigue viva.
+
+        Si la sesión ya tiene una sentencia con ese nombre (el nombre sale del
+        texto, así que es la misma) se usa esa.
+        """
+        conexion = getattr(cursor, "connection", None)
+        en_transaccion = not getattr(conexion, "autocommit", False)
+        try:
+            if en_transaccion:
+                cursor.execute("SAVEPOINT compilador_sql")
+            cursor.execute(f"PREPARE {nombre} AS {sentencia.texto_preparado}")
+            if en_transaccion:
+                cursor.execute("RELEASE SAVEPOINT compilador_sql")
+        except Exception as e:
+            if en_transaccion:
+                cursor.execute("ROLLBACK TO SAVEPOINT compilador_sql")
+                cursor.execute("RELEASE SAVEPOINT compilador_sql")
+            if getattr(e, "pgcode", None) == SQLSTATE_PREPARADA_DUPLICADA:
+                return True
+            # No se vuelve a intentar (p.ej. tipo de parámetro indeterminado)
+            sentencia.texto_preparado = None
+            with self._lock:
+                self.preparaciones_fallidas += 1
+            return False
+        with self._lock:
+            self.preparaciones += 1
+        return True
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Aciertos de la caché, compilación ahorrada y ahorro de las sentencias preparadas."""
+        with self._lock:
+            sentencias = list(self._cache.values())
+            consultas = self.aciertos + self.fallos
+            return {
+                "dialecto": self.dialecto,
+                "sentencias": len(sentencias),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0,
+                "compilacion_ms": round(self.compilacion_s * 1000, 3),
+                "compilacion_ahorrada_ms": round(self.compilacion_ahorrada_s * 1000, 3),
+                "preparaciones": self.preparaciones,
+                "preparaciones_fallidas": self.preparaciones_fallidas,
+                "ejecuciones_preparadas": sum(s.preparadas for s in sentencias),
+                "planificacion_ahorrada_ms": round(sum(s.ahorro_preparada_s() for s in sentencias) * 1000, 3),
+            }
@@ -8,7 +8,8 @@ Detecta automáticamente el modo desde .env (DB_MODE).
 import os
 import sqlite3
 import threading
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager, nullcontext
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Any, Optional
 
@@ -41,55 +42,107 @@ if DB_MODE == "postgresql":
 
     import psycopg2.extensions
 
+    from src.infraestructura.persistencia.compilador_sql import SentenciasPreparadas
+    from src.infraestructura.persistencia.filas import claves_mayusculas
+
     class UpperCaseCursorWrapper:
-        def __init__(self, cursor):
+        """
+        Cursor cuyas filas son dicts con las columnas en mayúsculas.
+
+        Con el cursor de tuplas por defecto, las claves se calculan una vez por
+        resultado (cursor.description) y cada fila es un solo dict(zip(...)).
+        Si quien llama pidió su propio cursor_factory, sus filas dict-like se
+        copian con las claves en mayúsculas como antes.
+
+        Con un CompiladorSQL, cada sentencia se traduce desde el estilo SQLite
+        (una vez por texto) y las más usadas se ejecutan preparadas.
+        """
+
+        def __init__(self, cursor, tuplas=False, compilador=None, preparadas=None):
             self._cursor = cursor
+            self._tuplas = tuplas
+            self._claves = None
+            self._compilador = compilador
+            self._preparadas = preparadas
+
+        def execute(self, query, vars=None):
+            self._claves = None
+            if self._compilador is None:
+                return self._cursor.execute(query, vars)
+            return self._compilador.ejecutar(self._cursor, query, vars, self._preparadas)
+
+        def executemany(self, query, vars_list):
+            self._claves = None
+            if self._compilador is not None:
+                query = self._compilador.compilar(query).texto
+            return self._cursor.executemany(query, vars_list)
+
+        def _claves_resultado(self):
+            if self._claves is None:
+                self._claves = claves_mayusculas(self._cursor.description)
+            return self._claves
 
         def _make_dict(self, row):
             if row is None:
                 return None
+            if self._tuplas:
+                return dict(zip(self._claves_resultado(), row))
             # If row is dict-like (RealDictRow)
             if hasattr(row, "keys"):
                 return {k.upper(): v for k, v in row.items()}
             # If row is tuple (should not happen if RealDictCursor used, but fallback)
             return row
 
+        def _make_dicts(self, rows):
+            if not rows:
+                return []
+            if self._tuplas:
+                claves = self._claves_resultado()
+                return [dict(zip(claves, row)) for row in rows]
+            return [self._make_dict(row) for row in rows]
+
         def fetchone(self):
             row = self._cursor.fetchone()
             return self._make_dict(row)
 
         def fetchall(self):
-            rows = self._cursor.fetchall()
-            if not rows:
-                return []
-            return [self._make_dict(row) for row in rows]
+            return self._make_dicts(self._cursor.fetchall())
 
         def fetchmany(self, size=None):
-            rows = self._cursor.fetchmany(size)
-            if not rows:
-                return []
-            return [self._make_dict(row) for row in rows]
+            return self._make_dicts(self._cursor.fetchmany(size))
+
+        def fetchall_tuplas(self):
+            """Filas sin convertir, para filas.Fila y filas.MapeadorEntidad."""
+            return self._cursor.fetchall()
 
         def __iter__(self):
             for row in self._cursor:
                 yield self._make_dict(row)
 
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc_val, exc_tb):
+            self._cursor.close()
+            return False
+
         def __getattr__(self, name):
             return getattr(self._cursor, name)
 
     class UpperCaseConnectionWrapper:
-        def __init__(self, conn):
+        def __init__(self, conn, compilador=None):
             self._conn = conn
+            self._compilador = compilador
+            self.preparadas = SentenciasPreparadas()
 
         def cursor(self, *args, **kwargs):
-            # Always force RealDictCursor if not specified to ensure dict access
-            if "cursor_factory" not in kwargs:
-                from psycopg2.extras import RealDictCursor
-
-                kwargs["cursor_factory"] = RealDictCursor
-
+            # Cursor de tuplas: el wrapper arma los dicts con claves calculadas
+            # una vez por resultado (sin el dict intermedio de RealDictCursor)
+            tuplas = "cursor_factory" not in kwargs
             cursor = self._conn.cursor(*args, **kwargs)
-            return UpperCaseCursorWrapper(cursor)
+            return UpperCaseCursorWrapper(
+                cursor, tuplas=tuplas, compilador=self._compilador, preparadas=self.preparadas
+            )
 
         def __getattr__(self, name):
             return getattr(self._conn, name)
@@ -107,6 +160,28 @@ else:
 
 
 from src.infraestructura.configuracion.settings import obtener_configuracion
+from src.infraestructura.persistencia.compilador_sql import CompiladorSQL
+from src.infraestructura.persistencia.enrutador_lecturas import (
+    ConexionPrimaria,
+    EnrutadorLecturas,
+    ReplicaLectura,
+    retraso_postgresql,
+    retraso_sqlite,
+)
+from src.infraestructura.persistencia.instrumentacion_consultas import (
+    ConexionInstrumentada,
+    instrumentacion_consultas,
+)
+from src.infraestructura.persistencia.sqlite_produccion import (
+    ColaEscritura,
+    ConexionEscritura,
+    PerfilSQLite,
+    PoolLecturas,
+)
+
+# Conexión elegida por DatabaseManager.lectura() para el bloque en curso
+# (por hilo y por tarea asyncio)
+_conexion_lectura: ContextVar[Optional[Any]] = ContextVar("conexion_lectura", default=None)
 
 
 class DatabaseManager:
@@ -119,6 +194,8 @@ class DatabaseManager:
     - Context manager para transacciones
     - Soporte automático para SQLite y PostgreSQL
     - Detección automática desde .env
+    - Perfil de producción de SQLite (WAL, pool de lecturas, cola de escritura)
+    - Réplica opcional para lecturas con tolerancia de retraso
     """
 
     _instance: Optional["DatabaseManager"] = None
@@ -140,6 +217,13 @@ class DatabaseManager:
 
         self.db_mode = DB_MODE
         self.use_postgresql = USE_POSTGRESQL
+        config = obtener_configuracion()
+        # Traducción de SQL estilo SQLite y sentencias preparadas (PostgreSQL)
+        self.compilador = CompiladorSQL(
+            "postgresql" if self.use_postgresql else "sqlite",
+            capacidad=config.sql_cache_sentencias,
+            umbral_preparar=config.sql_umbral_preparar,
+        )
 
         if self.use_postgresql:
             # Configuración PostgreSQL
@@ -169,12 +253,81 @@ class DatabaseManager:
                 }
         else:
             # Configuración SQLite
-            config = obtener_configuracion()
             self.database_path = Path(config.database_path)
 
+        self._cached_statements = config.sql_cache_sentencias
         self._connection_pool: dict[int, Any] = {}
+        self.perfil_sqlite: Optional[PerfilSQLite] = None
+        self.pool_lecturas: Optional[PoolLecturas] = None
+        self.cola_escritura: Optional[ColaEscritura] = None
+        self.verificacion_sqlite: Optional[dict] = None
+        if not self.use_postgresql and config.sqlite_produccion:
+            self._activar_sqlite_produccion(config)
+        self.tolerancia_reportes_segundos = config.lectura_tolerancia_reportes_segundos
+        self._sesion = threading.local()
+        self.enrutador = EnrutadorLecturas(self._crear_replica(config))
         self._initialized = True
 
+    def _activar_sqlite_produccion(self, config) -> None:
+        """WAL y pragmas en cada conexión, lecturas en pool y un escritor a la vez."""
+        self.perfil_sqlite = PerfilSQLite(
+            self.database_path,
+            busy_timeout_ms=config.sqlite_busy_timeout_ms,
+            cache_kib=config.sqlite_cache_kib,
+            mmap_mb=config.sqlite_mmap_mb,
+            cached_statements=self._cached_statements,
+        )
+        self.pool_lecturas = PoolLecturas(
+            lambda: self._instrumentar(self.perfil_sqlite.conectar(solo_lectura=True)),
+            tamano=config.sqlite_lectores,
+            espera_segundos=config.sqlite_espera_lector_segundos,
+        )
+        self.cola_escritura = ColaEscritura(config.sqlite_espera_escritura_segundos)
+        # Una base nueva se crea con el esquema; se verifica en el siguiente inicio
+        if self.database_path.exists():
+            self.verificacion_sqlite = self.perfil_sqlite.preparar(config.sqlite_verificacion_inicio)
+
+    def _crear_replica(self, config) -> Optional[ReplicaLectura]:
+        """Réplica de lectura del mismo motor que la primaria, si está configurada."""
+        if self.use_postgresql and config.replica_database_url:
+            dsn = config.replica_database_url
+            opciones = {
+                "connect_timeout": self.pg_config["connect_timeout"],
+                "application_name": f"{self.pg_config['application_name']}-lecturas",
+            }
+
+            def abrir():
+                real_conn = psycopg2.connect(dsn, **opciones)
+                real_conn.set_session(readonly=True, autocommit=True)
+                return self._instrumentar(UpperCaseConnectionWrapper(real_conn, self.compilador))
+
+            medir = retraso_postgresql
+        elif not self.use_postgresql and config.replica_database_path:
+            ruta_replica = Path(config.replica_database_path)
+            perfil = PerfilSQLite(
+                ruta_replica,
+                busy_timeout_ms=config.sqlite_busy_timeout_ms,
+                cache_kib=config.sqlite_cache_kib,
+                mmap_mb=config.sqlite_mmap_mb,
+                cached_statements=self._cached_statements,
+            )
+
+            def abrir():
+                return self._instrumentar(perfil.conectar(solo_lectura=True))
+
+            def medir(_conexion):
+                return retraso_sqlite(self.database_path, ruta_replica)
+        else:
+            return None
+
+        return ReplicaLectura(
+            abrir,
+            medir,
+            tamano=config.replica_conexiones,
+            intervalo_medicion=config.replica_intervalo_retraso_segundos,
+            pausa_error_segundos=config.replica_pausa_error_segundos,
+        )
+
     def _obtener_connection_thread_local(self) -> Any:
         """
         Obtiene una conexión para el thread actual.
@@ -189,14 +342,21 @@ class DatabaseManager:
                 real_conn = psycopg2.connect(**self.pg_config)
                 real_conn.autocommit = False
                 # Wrap it to ensure cursors return uppercase dicts
-                conexion = UpperCaseConnectionWrapper(real_conn)
+                conexion = UpperCaseConnectionWrapper(real_conn, self.compilador)
+            elif self.perfil_sqlite is not None:
+                # Sus escrituras hacen cola también fuera de transaccion()
+                conexion = ConexionEscritura(self.perfil_sqlite.conectar(), self.cola_escritura)
             else:
-                # Conexión SQLite
-                conexion = sqlite3.connect(str(self.database_path), check_same_thread=False)
+                # Conexión SQLite (su caché de sentencias preparadas es cached_statements)
+                conexion = sqlite3.connect(
+                    str(self.database_path),
+                    check_same_thread=False,
+                    cached_statements=self._cached_statements,
+                )
                 conexion.row_factory = sqlite3.Row
                 conexion.execute("PRAGMA foreign_keys = ON")
 
-            self._connection_pool[thread_id] = conexion
+            self._connection_pool[thread_id] = self._instrumentar(self._registrar_escrituras(conexion))
 
         # Validar conexión antes de retornarla (Solo PostgreSQL)
         if self.use_postgresql:
@@ -211,10 +371,24 @@ class DatabaseManager:
                 
                 real_conn = psycopg2.connect(**self.pg_config)
                 real_conn.autocommit = False
-                self._connection_pool[thread_id] = UpperCaseConnectionWrapper(real_conn)
+                self._connection_pool[thread_id] = self._instrumentar(
+                    self._registrar_escrituras(UpperCaseConnectionWrapper(real_conn, self.compilador))
+                )
 
         return self._connection_pool[thread_id]
 
+    def _instrumentar(self, conexion) -> Any:
+        """Envuelve la conexión para medir consultas si la instrumentación está activa."""
+        if instrumentacion_consultas.activa:
+            return ConexionInstrumentada(conexion, instrumentacion_consultas)
+        return conexion
+
+    def _registrar_escrituras(self, conexion) -> Any:
+        """Con réplica, los commits de la conexión del hilo marcan la escritura reciente de la sesión."""
+        if self.enrutador.replica is not None:
+            return ConexionPrimaria(conexion, self.enrutador)
+        return conexion
+
     def _validar_conexion(self, conn) -> bool:
         """
         Verifica si la conexión sigue viva.
@@ -238,11 +412,89 @@ class DatabaseManager:
         """
         Obtiene una conexión thread-safe.
 
+        Dentro de un bloque `lectura()` es la conexión de lectura elegida.
+
         Returns:
             Conexión a la base de datos (SQLite o PostgreSQL según configuración)
         """
+        conexion = _conexion_lectura.get()
+        if conexion is not None:
+            return conexion
         return self._obtener_connection_thread_local()
 
+    @contextmanager
+    def lectura(self, tolerancia_segundos: float = 0.0):
+        """
+        Intención de lectura: el bloque solo consulta.
+
+        Dentro del bloque, obtener_conexion() (y por lo tanto los repositorios)
+        usa la conexión elegida:
+
+        - con `tolerancia_segundos` > 0 y una réplica al día dentro de esa
+          tolerancia, una conexión de solo lectura a la réplica;
+        - si no, la primaria: el pool de lecturas del perfil de producción de
+          SQLite o la conexión del hilo.
+
+        Para leer lo propio, un hilo con una transacción abierta lee de su
+        propia conexión, y una sesión (el token del cliente de Reflex, o el
+        hilo fuera de un evento) que confirmó escrituras hace menos que el
+        retraso de la réplica, de la primaria.
+
+        Ejemplo de uso:
+            >>> with db_manager.lectura(db_manager.tolerancia_reportes_segundos) as conn:
+            ...     filas = conn.execute("SELECT ...").fetchall()
+        """
+        actual = _conexion_lectura.get()
+        if actual is not None:
+            yield actual
+            return
+
+        if self._en_transaccion():
+            with self.enrutador.medir("transaccion"):
+                yield self._obtener_connection_thread_local()
+            return
+
+        destino = self.enrutador.destino(tolerancia_segundos, self.enrutador.desde_escritura())
+
+        with ExitStack() as pila:
+            conexion = None
+            if destino == "replica":
+                try:
+                    conexion = pila.enter_context(self.enrutador.replica.conexion())
+                except Exception as e:
+                    self.enrutador.replica.marcar_error(e)
+                    destino = "replica_caida"
+            if conexion is None:
+                if self.pool_lecturas is not None:
+                    conexion = pila.enter_context(self.pool_lecturas.conexion())
+                else:
+                    conexion = self._obtener_connection_thread_local()
+
+            token = _conexion_lectura.set(conexion)
+            try:
+                with self.enrutador.medir(destino):
+                    yield conexion
+            except (sqlite3.Error, psycopg2.Error) as e:
+                # El bloque ya corrió: no se reintenta, pero las siguientes van a la primaria
+                if destino == "replica":
+                    self.enrutador.replica.marcar_error(e)
+                raise
+            finally:
+                _conexion_lectura.reset(token)
+
+    def _en_transaccion(self) -> bool:
+        """El hilo está dentro de transaccion() o tiene escrituras sin confirmar."""
+        if getattr(self._sesion, "profundidad", 0):
+            return True
+        if self.use_postgresql:
+            return False
+        conexion = self._connection_pool.get(threading.get_ident())
+        return conexion is not None and conexion.in_transaction
+
+    def estadisticas_lecturas(self) -> dict:
+        """Lecturas y tiempo fuera de la primaria, y motivos de las que se quedaron."""
+        return self.enrutador.estadisticas()
+
     def get_dict_cursor(self, conexion=None):
         """
         Obtiene un cursor que retorna resultados como diccionarios.
@@ -276,19 +528,15 @@ class DatabaseManager:
     def execute_write(self, query: str, params: tuple = ()) -> int:
         """
         Ejecuta una consulta de escritura (INSERT, UPDATE, DELETE).
-        Maneja automáticamente el placeholder.
 
         Args:
-            query: Consulta SQL con placeholders '?' (serán reemplazados si es PG)
+            query: Consulta SQL con placeholders '?' (en PostgreSQL el
+                compilador SQL del cursor los traduce)
             params: Parámetros para la consulta
 
         Returns:
             Número de filas afectadas
         """
-        placeholder = self.get_placeholder()
-        if placeholder != "?":
-            query = query.replace("?", placeholder)
-
         with self.transaccion() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
@@ -305,15 +553,19 @@ class DatabaseManager:
         Returns:
             Diccionario con los datos o None
         """
-        placeholder = self.get_placeholder()
-        if placeholder != "?":
-            query = query.replace("?", placeholder)
-
         conn = self.obtener_conexion()
         cursor = self.get_dict_cursor(conn)
         cursor.execute(query, params)
         return cursor.fetchone()
 
+    def compilar(self, query: str, con_parametros: bool = True) -> str:
+        """SQL estilo SQLite traducido al dialecto activo (en caché por texto)."""
+        return self.compilador.compilar(query, con_parametros).texto
+
+    def estadisticas_sql(self) -> dict:
+        """Aciertos de la caché de sentencias y tiempo de compilación/planificación ahorrado."""
+        return self.compilador.estadisticas()
+
     def get_last_insert_id(self, cursor, table_name: str = None, id_column: str = None) -> int:
         """
         Obtiene el último ID insertado de manera compatible.
@@ -358,14 +610,24 @@ class DatabaseManager:
             ...     cursor.execute("INSERT ...")
             ...     # commit automático al salir del context
         """
-        conexion = self.obtener_conexion()
-
-        try:
-            yield conexion
-            conexion.commit()
-        except Exception as e:
-            conexion.rollback()
-            raise e
+        # Perfil de producción de SQLite: una transacción a la vez, en orden de llegada
+        turno = self.cola_escritura.turno() if self.cola_escritura is not None else nullcontext()
+        with turno:
+            # Las escrituras van siempre a la conexión del hilo en la primaria,
+            # también dentro de un bloque lectura()
+            conexion = self._obtener_connection_thread_local()
+            token = _conexion_lectura.set(None)
+            self._sesion.profundidad = getattr(self._sesion, "profundidad", 0) + 1
+
+            try:
+                yield conexion
+                conexion.commit()
+            except Exception as e:
+                conexion.rollback()
+                raise e
+            finally:
+                self._sesion.profundidad -= 1
+                _conexion_lectura.reset(token)
 
     def ejecutar_script(self, script_sql: str) -> None:
         """
@@ -395,6 +657,10 @@ class DatabaseManager:
         for conexion in self._connection_pool.values():
             conexion.close()
         self._connection_pool.clear()
+        if self.pool_lecturas is not None:
+            self.pool_lecturas.cerrar()
+        if self.enrutador.replica is not None:
+            self.enrutador.replica.cerrar()
 
     def inicializar_base_datos(self, ruta_schema: Optional[Path] = None) -> None:
         """
@@ -431,6 +697,12 @@ class DatabaseManager:
             )
         else:
             info["path"] = str(self.database_path)
+            info["produccion"] = self.perfil_sqlite is not None
+            if self.perfil_sqlite is not None:
+                info["verificacion"] = self.verificacion_sqlite
+                info["lecturas"] = self.pool_lecturas.estadisticas()
+                info["escritura"] = self.cola_escritura.estadisticas()
+        info["enrutamiento_lecturas"] = self.enrutador.estadisticas()
 
         return info
 
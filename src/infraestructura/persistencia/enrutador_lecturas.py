@@ -0,0 +1,351 @@
+"""
+Enrutamiento de lecturas a una réplica.
+
+Las lecturas pesadas (dashboard, reportes, exportaciones CSV, datos de PDF)
+declaran su intención con `DatabaseManager.lectura(tolerancia_segundos)`:
+si hay una réplica configurada y su retraso no supera la tolerancia, la
+consulta va a la réplica y descarga a la primaria. Se quedan en la primaria:
+
+- las lecturas sin tolerancia (0: necesitan lo último),
+- las del hilo con una transacción abierta, o las de una sesión que
+  confirmó escrituras hace menos que el retraso de la réplica (leer lo
+  propio),
+- las que encuentran la réplica atrasada o caída (tras un error se pausa
+  `pausa_error_segundos` antes de volver a intentarla).
+
+Retraso medido:
+
+- PostgreSQL: now() - pg_last_xact_replay_timestamp() en una réplica en
+  streaming. En una base que no está en recuperación (una segunda base
+  local mantenida a mano) el retraso es 0. Con la primaria sin escrituras
+  el valor crece aunque la réplica esté al día: se desvía a la primaria,
+  nunca se lee de más.
+- SQLite: la réplica es otro archivo (sincronizar_replica_sqlite o una
+  herramienta de replicación). Si la primaria se modificó después de la
+  última sincronización, el retraso es el tiempo desde esa sincronización.
+
+La sesión es el token del cliente de Reflex (fijar_sesion, desde el
+middleware de la app); fuera de un evento, el hilo. ConexionPrimaria envuelve
+la conexión de escritura de cada hilo y anota en el enrutador el momento de
+cada commit con escrituras, pase o no por DatabaseManager.transaccion().
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.infraestructura.persistencia.sqlite_produccion import PoolLecturas, es_lectura
+
+logger = logging.getLogger(__name__)
+
+SQL_RETRASO_POSTGRESQL = """
+    SELECT CASE WHEN pg_is_in_recovery()
+                THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                ELSE 0 END AS RETRASO
+"""
+
+# Escrituras más viejas que esto se olvidan al limpiar el registro por sesión
+RETENCION_ESCRITURAS_S = 3600.0
+_LIMPIAR_DESDE = 1024
+
+# Sesión a la que se atribuyen las escrituras y lecturas del contexto actual
+_sesion: ContextVar[Optional[str]] = ContextVar("sesion_lecturas", default=None)
+
+
+def fijar_sesion(clave: Optional[str]) -> None:
+    """Atribuye lo que sigue en el contexto actual a `clave` (el token del cliente)."""
+    _sesion.set(clave or None)
+
+
+def sesion_actual() -> str:
+    """Token del cliente fijado para el evento en curso o, si no hay, el hilo."""
+    return _sesion.get() or f"hilo:{threading.get_ident()}"
+
+
+def _ultima_modificacion(ruta: Path) -> float:
+    """mtime del archivo o de su -wal, el más reciente."""
+    marcas = [r.stat().st_mtime for r in (ruta, ruta.with_name(ruta.name + "-wal")) if r.exists()]
+    return max(marcas) if marcas else 0.0
+
+
+def retraso_sqlite(primaria: Path, replica: Path) -> float:
+    """Segundos que la réplica puede estar atrasada respecto de la primaria."""
+    sincronizada = _ultima_modificacion(Path(replica))
+    if _ultima_modificacion(Path(primaria)) <= sincronizada:
+        return 0.0
+    return max(time.time() - sincronizada, 0.0)
+
+
+def retraso_postgresql(conexion: Any) -> float:
+    cursor = conexion.cursor()
+    try:
+        cursor.execute(SQL_RETRASO_POSTGRESQL)
+        fila = cursor.fetchone()
+    finally:
+        cursor.close()
+    valor = fila["RETRASO"] if hasattr(fila, "keys") else fila[0]
+    return float(valor or 0)
+
+
+def sincronizar_replica_sqlite(origen: Path, destino: Path) -> None:
+    """Copia consistente de la primaria en la réplica (API de backup de SQLite)."""
+    fuente = sqlite3.connect(str(origen))
+    copia = sqlite3.connect(str(destino))
+    try:
+        fuente.backup(copia)
+    finally:
+        copia.close()
+        fuente.close()
+
+
+class ReplicaLectura:
+    """
+    Conexiones de solo lectura a la réplica y su retraso, medido cada tanto.
+
+    Args:
+        abrir: Crea una conexión de solo lectura a la réplica
+        medir_retraso: Recibe una conexión de la réplica y devuelve el retraso en segundos
+        tamano: Máximo de conexiones abiertas a la réplica
+        espera_segundos: Espera por una conexión libre
+        intervalo_medicion: Segundos durante los que se reutiliza el último retraso
+        pausa_error_segundos: Tiempo sin usar la réplica tras un error
+    """
+
+    def __init__(
+        self,
+        abrir: Callable[[], Any],
+        medir_retraso: Callable[[Any], float],
+        tamano: int = 4,
+        espera_segundos: float = 2.0,
+        intervalo_medicion: float = 1.0,
+        pausa_error_segundos: float = 30.0,
+    ):
+        self.pool = PoolLecturas(abrir, tamano=tamano, espera_segundos=espera_segundos)
+        self._medir_retraso = medir_retraso
+        self.intervalo_medicion = intervalo_medicion
+        self.pausa_error_segundos = pausa_error_segundos
+        self._lock = threading.Lock()
+        self._retraso: Optional[float] = None
+        self._medido_en = 0.0
+        self._caida_hasta = 0.0
+        self.errores = 0
+
+    @property
+    def ultimo_retraso(self) -> Optional[float]:
+        return self._retraso
+
+    def disponible(self) -> bool:
+        return time.monotonic() >= self._caida_hasta
+
+    def marcar_error(self, error: BaseException) -> None:
+        logger.warning("Réplica de lectura no disponible por %ss: %s", self.pausa_error_segundos, error)
+        with self._lock:
+            self.errores += 1
+            self._retraso = None
+            self._caida_hasta = time.monotonic() + self.pausa_error_segundos
+
+    def retraso(self) -> Optional[float]:
+        """Último retraso medido (None si la réplica no responde)."""
+        ahora = time.monotonic()
+        with self._lock:
+            if self._retraso is not None and ahora - self._medido_en < self.intervalo_medicion:
+                return self._retraso
+        try:
+            with self.pool.conexion() as conexion:
+                retraso = self._medir_retraso(conexion)
+        except Exception as e:
+            self.marcar_error(e)
+            return None
+        with self._lock:
+            self._retraso = retraso
+            self._medido_en = ahora
+        return retraso
+
+    def conexion(self):
+        return self.pool.conexion()
+
+    def cerrar(self) -> None:
+        self.pool.cerrar()
+
+
+class EnrutadorLecturas:
+    """Decide el destino de cada lectura y cuenta cuánta carga sale de la primaria."""
+
+    def __init__(self, replica: Optional[ReplicaLectura] = None):
+        self.replica = replica
+        self._lock = threading.Lock()
+        self._lecturas = {"replica": 0, "primaria": 0}
+        self._ms = {"replica": 0.0, "primaria": 0.0}
+        self._motivos: Dict[str, int] = {}
+        self._escrituras: Dict[str, float] = {}
+
+    def registrar_escritura(self) -> None:
+        """Anota que la sesión actual acaba de confirmar escrituras en la primaria."""
+        ahora = time.monotonic()
+        with self._lock:
+            self._escrituras[sesion_actual()] = ahora
+            if len(self._escrituras) > _LIMPIAR_DESDE:
+                self._escrituras = {
+                    sesion: marca
+                    for sesion, marca in self._escrituras.items()
+                    if ahora - marca < RETENCION_ESCRITURAS_S
+                }
+
+    def desde_escritura(self) -> Optional[float]:
+        """Segundos desde la última escritura confirmada por la sesión actual."""
+        with self._lock:
+            marca = self._escrituras.get(sesion_actual())
+        return None if marca is None else time.monotonic() - marca
+
+    def destino(self, tolerancia_segundos: float, desde_escritura_s: Optional[float]) -> str:
+        """'replica', o el motivo por el que la lectura se queda en la primaria."""
+        if self.replica is None:
+            return "sin_replica"
+        if tolerancia_segundos <= 0:
+            return "sin_tolerancia"
+        if not self.replica.disponible():
+            return "replica_caida"
+        retraso = self.replica.retraso()
+        if retraso is None:
+            return "replica_caida"
+        if retraso > tolerancia_segundos:
+            return "retraso"
+        if desde_escritura_s is not None and desde_escritura_s <= retraso:
+            return "escritura_reciente"
+        return "replica"
+
+    @contextmanager
+    def medir(self, destino: str) -> Iterator[None]:
+        """Cuenta la lectura y el tiempo que se usa la conexión elegida."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - inicio) * 1000
+            origen = "replica" if destino == "replica" else "primaria"
+            with self._lock:
+                self._lecturas[origen] += 1
+                self._ms[origen] += ms
+                if origen == "primaria":
+                    self._motivos[destino] = self._motivos.get(destino, 0) + 1
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            lecturas = dict(self._lecturas)
+            ms = {origen: round(valor, 3) for origen, valor in self._ms.items()}
+            motivos = dict(self._motivos)
+        total = lecturas["replica"] + lecturas["primaria"]
+        total_ms = ms["replica"] + ms["primaria"]
+        estadisticas: Dict[str, Any] = {
+            "replica_configurada": self.replica is not None,
+            "lecturas": lecturas,
+            "ms": ms,
+            "en_primaria_por_motivo": motivos,
+            "fraccion_lecturas_fuera": round(lecturas["replica"] / total, 4) if total else 0.0,
+            "fraccion_tiempo_fuera": round(ms["replica"] / total_ms, 4) if total_ms else 0.0,
+        }
+        if self.replica is not None:
+            estadisticas["replica"] = {
+                "retraso_s": self.replica.ultimo_retraso,
+                "errores": self.replica.errores,
+                "disponible": self.replica.disponible(),
+                "conexiones": self.replica.pool.estadisticas(),
+            }
+        return estadisticas
+
+
+class CursorPrimaria:
+    """Cursor de ConexionPrimaria: marca la conexión cuando ejecuta una escritura."""
+
+    def __init__(self, cursor: Any, conexion: "ConexionPrimaria"):
+        self._cursor = cursor
+        self._conexion = conexion
+
+    def _marcar(self, sql: str) -> None:
+        if not es_lectura(sql):
+            object.__setattr__(self._conexion, "_escribio", True)
+
+    def execute(self, sql: str, *args):
+        self._marcar(sql)
+        self._cursor.execute(sql, *args)
+        return self
+
+    def executemany(self, sql: str, *args):
+        self._marcar(sql)
+        self._cursor.executemany(sql, *args)
+        return self
+
+    def executescript(self, script: str):
+        self._marcar(script)
+        self._cursor.executescript(script)
+        return self
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._cursor.__exit__(exc_type, exc_val, exc_tb)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class ConexionPrimaria:
+    """Conexión de escritura que avisa al enrutador de cada commit con escrituras."""
+
+    def __init__(self, conexion: Any, enrutador: EnrutadorLecturas):
+        object.__setattr__(self, "_conexion", conexion)
+        object.__setattr__(self, "_enrutador", enrutador)
+        object.__setattr__(self, "_escribio", False)
+
+    def _confirmada(self) -> None:
+        if self._escribio:
+            object.__setattr__(self, "_escribio", False)
+            self._enrutador.registrar_escritura()
+
+    def cursor(self, *args, **kwargs) -> CursorPrimaria:
+        return CursorPrimaria(self._conexion.cursor(*args, **kwargs), self)
+
+    def execute(self, sql: str, *args):
+        return self.cursor().execute(sql, *args)
+
+    def executemany(self, sql: str, *args):
+        return self.cursor().executemany(sql, *args)
+
+    def executescript(self, script: str):
+        return self.cursor().executescript(script)
+
+    def commit(self) -> None:
+        self._conexion.commit()
+        self._confirmada()
+
+    def rollback(self) -> None:
+        object.__setattr__(self, "_escribio", False)
+        self._conexion.rollback()
+
+    def __enter__(self):
+        self._conexion.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        resultado = self._conexion.__exit__(exc_type, exc_val, exc_tb)
+        if exc_type is None:
+            self._confirmada()
+        else:
+            object.__setattr__(self, "_escribio", False)
+        return resultado
+
+    def __getattr__(self, name):
+        return getattr(self._conexion, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conexion, name, value)
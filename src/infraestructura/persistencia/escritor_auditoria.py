@@ -0,0 +1,294 @@
+"""
+Escritor de Auditoría con buffer.
+
+Captura de auditoría a nivel de aplicación para las operaciones masivas
+(aprobación o pago de liquidaciones por propietario): la operación solo
+encola las filas en memoria y un hilo las inserta por lotes en
+AUDITORIA_CAMBIOS, fuera de la transacción y de la petición del usuario.
+
+Cada cambio de registro es una sola fila: CAMPO_MODIFICADO lista los campos
+y, si son varios, VALOR_ANTERIOR / VALOR_NUEVO llevan un objeto JSON con
+solo lo que cambió (el mismo formato que los triggers de PostgreSQL, ver
+triggers_auditoria).
+
+Pérdida acotada: lo único que puede perderse es lo pendiente si el proceso
+muere sin cerrar (a lo sumo `max_pendientes` filas o `intervalo_segundos` de
+actividad). Un buffer lleno se vacía en el hilo que registra (contrapresión)
+y solo se descartan filas, contadas en las estadísticas, si la base no
+acepta escrituras. El cierre ordenado (detener / atexit) vacía el buffer.
+
+En PostgreSQL la captura la hacen los triggers y este escritor no registra.
+"""
+
+import atexit
+import json
+import logging
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from src.infraestructura.configuracion.settings import obtener_configuracion
+
+logger = logging.getLogger(__name__)
+
+COLUMNAS = (
+    "TABLA",
+    "ID_REGISTRO",
+    "TIPO_OPERACION",
+    "CAMPO_MODIFICADO",
+    "VALOR_ANTERIOR",
+    "VALOR_NUEVO",
+    "USUARIO",
+    "FECHA_CAMBIO",
+    "MOTIVO_CAMBIO",
+)
+
+
+def _texto(valor: Any) -> Optional[str]:
+    return None if valor is None else str(valor)
+
+
+def _valores(
+    cambios: Mapping[str, Tuple[Any, Any]],
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """(campo, anterior, nuevo) de una fila: valores simples o diff JSON si son varios campos."""
+    if not cambios:
+        return None, None, None
+    campos = sorted(cambios)
+    if len(campos) == 1:
+        anterior, nuevo = cambios[campos[0]]
+        return campos[0], _texto(anterior), _texto(nuevo)
+    return (
+        ", ".join(campos),
+        json.dumps({c: cambios[c][0] for c in campos}, ensure_ascii=False, default=str),
+        json.dumps({c: cambios[c][1] for c in campos}, ensure_ascii=False, default=str),
+    )
+
+
+class EscritorAuditoria:
+    """Buffer de filas de auditoría; `iniciar()` lo vacía en un hilo daemon."""
+
+    def __init__(
+        self,
+        db_manager: Any,
+        lote: Optional[int] = None,
+        max_pendientes: Optional[int] = None,
+        intervalo_segundos: Optional[float] = None,
+    ):
+        config = obtener_configuracion()
+        self.db = db_manager
+        self.lote = lote or config.auditoria_lote
+        self.max_pendientes = max(max_pendientes or config.auditoria_max_pendientes, self.lote)
+        self.intervalo_segundos = intervalo_segundos or config.auditoria_intervalo_segundos
+        self._pendientes: deque = deque()
+        self._lock = threading.Lock()
+        self._lock_escritura = threading.Lock()
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._estadisticas = {
+            "encoladas": 0,
+            "escritas": 0,
+            "lotes": 0,
+            "descartadas": 0,
+            "ms_en_operacion": 0.0,
+            "ms_escritura": 0.0,
+        }
+
+    @property
+    def activo(self) -> bool:
+        """En PostgreSQL los triggers capturan los cambios."""
+        return not self.db.use_postgresql
+
+    # ------------------------------------------------------------------
+    # Registro (camino de la petición)
+    # ------------------------------------------------------------------
+
+    def registrar(
+        self,
+        tabla: str,
+        id_registro: int,
+        accion: str,
+        usuario: str,
+        cambios: Optional[Mapping[str, Tuple[Any, Any]]] = None,
+        motivo: Optional[str] = None,
+    ) -> None:
+        """Encola el cambio de un registro. `cambios` es {campo: (anterior, nuevo)}."""
+        self.registrar_lote(tabla, [id_registro], accion, usuario, cambios, motivo)
+
+    def registrar_lote(
+        self,
+        tabla: str,
+        ids_registro: Iterable[int],
+        accion: str,
+        usuario: str,
+        cambios: Optional[Mapping[str, Tuple[Any, Any]]] = None,
+        motivo: Optional[str] = None,
+    ) -> int:
+        """
+        Encola el mismo cambio para varios registros (una operación masiva).
+
+        Returns:
+            Filas encoladas
+        """
+        if not self.activo:
+            return 0
+        inicio = time.perf_counter()
+        campo, anterior, nuevo = _valores(cambios or {})
+        fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        filas = [
+            (tabla, id_registro, accion, campo, anterior, nuevo, usuario, fecha, motivo)
+            for id_registro in ids_registro
+        ]
+        with self._lock:
+            self._pendientes.extend(filas)
+            lleno = len(self._pendientes) >= self.max_pendientes
+        if lleno:
+            # Contrapresión: el buffer no crece más allá de max_pendientes
+            self.vaciar()
+        elif len(self._pendientes) >= self.lote:
+            self._despertar.set()
+        with self._lock:
+            self._estadisticas["encoladas"] += len(filas)
+            self._estadisticas["ms_en_operacion"] += (time.perf_counter() - inicio) * 1000
+        return len(filas)
+
+    # ------------------------------------------------------------------
+    # Escritura (fuera de la petición)
+    # ------------------------------------------------------------------
+
+    def _insertar(self, filas: List[tuple]) -> None:
+        placeholder = self.db.get_placeholder()
+        with self.db.transaccion() as conn:
+            conn.cursor().executemany(
+                f"INSERT INTO AUDITORIA_CAMBIOS ({', '.join(COLUMNAS)}) "
+                f"VALUES ({', '.join([placeholder] * len(COLUMNAS))})",
+                filas,
+            )
+
+    def vaciar(self) -> int:
+        """
+        Inserta todo lo pendiente en lotes de `lote` filas.
+
+        Si un lote falla vuelve al buffer y se reintenta en el siguiente ciclo.
+
+        Returns:
+            Filas escritas
+        """
+        escritas = 0
+        with self._lock_escritura:
+            while True:
+                with self._lock:
+                    filas = [
+                        self._pendientes.popleft()
+                        for _ in range(min(self.lote, len(self._pendientes)))
+                    ]
+                if not filas:
+                    return escritas
+                inicio = time.perf_counter()
+                try:
+                    self._insertar(filas)
+                except Exception as e:
+                    self._devolver(filas)
+                    logger.error(f"No se pudo escribir la auditoría ({len(filas)} filas): {e}")
+                    return escritas
+                escritas += len(filas)
+                with self._lock:
+                    self._estadisticas["escritas"] += len(filas)
+                    self._estadisticas["lotes"] += 1
+                    self._estadisticas["ms_escritura"] += (time.perf_counter() - inicio) * 1000
+
+    def _devolver(self, filas: List[tuple]) -> None:
+        """Devuelve un lote fallido al frente del buffer, sin pasar de max_pendientes."""
+        with self._lock:
+            self._pendientes.extendleft(reversed(filas))
+            sobrantes = len(self._pendientes) - self.max_pendientes
+            for _ in range(max(sobrantes, 0)):
+                self._pendientes.pop()
+            if sobrantes > 0:
+                self._estadisticas["descartadas"] += sobrantes
+                logger.warning(f"Auditoría: {sobrantes} filas descartadas con el buffer lleno")
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Sobrecarga acumulada de la auditoría.
+
+        ms_en_operacion es lo que pagaron las operaciones al registrar;
+        ms_escritura lo que costó insertar, fuera de ellas.
+        """
+        with self._lock:
+            resumen = dict(self._estadisticas, pendientes=len(self._pendientes))
+        lotes = resumen["lotes"]
+        resumen["filas_por_lote"] = round(resumen["escritas"] / lotes, 1) if lotes else 0
+        return resumen
+
+    # ------------------------------------------------------------------
+    # Ciclo
+    # ------------------------------------------------------------------
+
+    def _bucle(self) -> None:
+        while not self._detener.is_set():
+            self._despertar.wait(self.intervalo_segundos)
+            self._despertar.clear()
+            try:
+                self.vaciar()
+            except Exception as e:
+                logger.error(f"Error en el escritor de auditoría: {e}")
+
+    def iniciar(self) -> None:
+        if self._hilo and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, daemon=True, name="EscritorAuditoria")
+        self._hilo.start()
+        logger.info("Escritor de auditoría iniciado")
+
+    def detener(self, timeout: float = 10.0) -> None:
+        """Detiene el hilo y vacía lo pendiente."""
+        self._detener.set()
+        self._despertar.set()
+        if self._hilo:
+            self._hilo.join(timeout=timeout)
+            self._hilo = None
+        self.vaciar()
+
+
+# Un escritor por DatabaseManager (patrón de persistencia.esquema)
+_escritores: "weakref.WeakKeyDictionary[Any, EscritorAuditoria]" = weakref.WeakKeyDictionary()
+_lock_escritores = threading.Lock()
+
+
+def obtener_escritor_auditoria(db_manager: Any) -> EscritorAuditoria:
+    """Escritor compartido por los repositorios de esta base."""
+    with _lock_escritores:
+        escritor = _escritores.get(db_manager)
+        if escritor is None:
+            escritor = _escritores[db_manager] = EscritorAuditoria(db_manager)
+        return escritor
+
+
+@atexit.register
+def _vaciar_al_salir() -> None:
+    """Scripts y tests sin lifespan: lo pendiente se escribe al terminar el proceso."""
+    for escritor in list(_escritores.values()):
+        try:
+            escritor.vaciar()
+        except Exception as e:
+            logger.error(f"Auditoría pendiente sin escribir al salir: {e}")
+
+
+@asynccontextmanager
+async def escritor_auditoria_en_segundo_plano():
+    """Lifespan task de Reflex: vacía la auditoría mientras la app está arriba."""
+    from src.infraestructura.persistencia.database import db_manager
+
+    escritor = obtener_escritor_auditoria(db_manager)
+    escritor.iniciar()
+    try:
+        yield
+    finally:
+        escritor.detener()
@@ -0,0 +1,103 @@
+"""
+Verificación del esquema propio de los repositorios.
+
+Varios repositorios crean en SQLite las tablas que no trae el esquema base
+(RECAUDOS, LIQUIDACIONES, DESOCUPACIONES, POLIZAS, CARTERA_MORA, ...). Cada
+DDL corre una sola vez por base de datos y proceso: en el arranque de la app
+(verificar_esquema, registrado como lifespan task) o, en scripts y tests que
+no pasan por el arranque, la primera vez que se construye el repositorio.
+En PostgreSQL esas tablas las crean las migraciones y los repositorios no
+ejecutan DDL.
+"""
+
+import importlib
+import logging
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, Callable, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Repositorios cuyo constructor asegura tablas propias (módulo, clase)
+REPOSITORIOS_CON_ESQUEMA: List[Tuple[str, str]] = [
+    ("src.infraestructura.persistencia.repositorio_recaudo_sqlite", "RepositorioRecaudoSQLite"),
+    ("src.infraestructura.persistencia.repositorio_liquidacion_sqlite", "RepositorioLiquidacionSQLite"),
+    ("src.infraestructura.persistencia.repositorio_desocupacion_sqlite", "RepositorioDesocupacionSQLite"),
+    ("src.infraestructura.persistencia.repositorio_poliza_sqlite", "RepositorioPolizaSQLite"),
+    (
+        "src.infraestructura.persistencia.repositorio_notificaciones_outbox_sqlite",
+        "RepositorioNotificacionesOutboxSQLite",
+    ),
+    (
+        "src.infraestructura.persistencia.repositorio_incremento_ipc_sqlite",
+        "RepositorioIncrementoIPCSQLite",
+    ),
+    ("src.infraestructura.persistencia.repositorio_auditoria_sqlite", "RepositorioAuditoriaSQLite"),
+    ("src.infraestructura.repositorios.repositorio_documento_sqlite", "RepositorioDocumentoSQLite"),
+    ("src.infraestructura.persistencia.repositorio_busqueda_sqlite", "RepositorioBusquedaSQLite"),
+]
+
+# Por cada DatabaseManager: (destino, clave) ya verificados
+_verificados: "weakref.WeakKeyDictionary[Any, Set[Tuple[str, str]]]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _destino(db_manager: Any) -> str:
+    """Base a la que apunta el manager (los tests cambian database_path del singleton)."""
+    if db_manager.use_postgresql:
+        return "postgresql"
+    return str(getattr(db_manager, "database_path", ""))
+
+
+def asegurar_esquema(db_manager: Any, clave: str, crear: Callable[[], None]) -> None:
+    """
+    Ejecuta `crear` solo la primera vez que se pide `clave` para esta base.
+
+    Si `crear` falla no se marca como verificado y se reintenta en la
+    siguiente construcción, como antes.
+    """
+    marca = (_destino(db_manager), clave)
+    with _lock:
+        verificados = _verificados.setdefault(db_manager, set())
+        if marca in verificados:
+            return
+    crear()
+    with _lock:
+        verificados.add(marca)
+
+
+def olvidar_esquema(db_manager: Any) -> None:
+    """Descarta lo verificado para este manager (p.ej. tras recrear la base)."""
+    with _lock:
+        _verificados.pop(db_manager, None)
+
+
+def verificar_esquema(db_manager: Any) -> List[str]:
+    """
+    Paso de migración del arranque: asegura todas las tablas propias.
+
+    Construye una vez cada repositorio registrado; las instancias
+    posteriores ya no ejecutan DDL. Retorna las claves verificadas.
+    """
+    inicio = time.perf_counter()
+    for modulo, clase in REPOSITORIOS_CON_ESQUEMA:
+        getattr(importlib.import_module(modulo), clase)(db_manager)
+    destino = _destino(db_manager)
+    with _lock:
+        claves = sorted(c for d, c in _verificados.get(db_manager, ()) if d == destino)
+    logger.info(
+        f"Esquema verificado ({len(claves)} grupos de tablas) en "
+        f"{(time.perf_counter() - inicio) * 1000:.1f} ms"
+    )
+    return claves
+
+
+@asynccontextmanager
+async def verificar_esquema_al_iniciar():
+    """Lifespan task de Reflex: verifica el esquema antes de atender eventos."""
+    from src.infraestructura.persistencia.database import db_manager
+
+    verificar_esquema(db_manager)
+    yield
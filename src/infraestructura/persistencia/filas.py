@@ -0,0 +1,184 @@
+"""
+Fábrica de filas: mapeo de columnas calculado una vez por descripción de cursor.
+
+El nombre en mayúsculas de cada columna y su posición se calculan una sola
+vez por `cursor.description` y todas las filas de ese resultado los comparten:
+
+- `Fila`: tupla con acceso por nombre (`fila["COLUMNA"]`, `get`, `keys`,
+  `items`) sobre un índice compartido; no construye un dict por fila.
+- `MapeadorEntidad`: construye la entidad directamente desde la tupla con
+  una función generada por descripción (una llamada por fila, sin dicts
+  intermedios). Para listados y exportaciones grandes; con un registro de
+  solo lectura (src.dominio.entidades.registros) construye la tupla directa.
+
+El UpperCaseCursorWrapper de PostgreSQL usa `claves_mayusculas` para sus
+dicts por fila y entrega las tuplas de psycopg2 a esta capa; en SQLite
+sqlite3.Row ya se indexa por posición.
+"""
+
+import dataclasses
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+
+def claves_mayusculas(descripcion: Optional[Sequence[Sequence[Any]]]) -> Tuple[str, ...]:
+    """Nombres de columna en mayúsculas, en el orden del resultado."""
+    if not descripcion:
+        return ()
+    return tuple(columna[0].upper() for columna in descripcion)
+
+
+def indice_columnas(claves: Sequence[str]) -> Dict[str, int]:
+    """{columna: posición}; con nombres repetidos gana la última, como en un dict."""
+    return {clave: i for i, clave in enumerate(claves)}
+
+
+class Fila(tuple):
+    """
+    Tupla con acceso por nombre de columna (insensible a mayúsculas).
+
+    Se lee como sqlite3.Row (índice o nombre) y expone la parte de lectura de
+    un dict: get, keys, values, items. `in` y la iteración son de tupla.
+    """
+
+    __slots__ = ()
+    _claves: Tuple[str, ...] = ()
+    _indice: Dict[str, int] = {}
+
+    def __getitem__(self, clave):
+        if isinstance(clave, str):
+            try:
+                posicion = self._indice[clave]
+            except KeyError:
+                posicion = self._indice[clave.upper()]
+            return tuple.__getitem__(self, posicion)
+        return tuple.__getitem__(self, clave)
+
+    def get(self, clave: str, defecto: Any = None) -> Any:
+        posicion = self._indice.get(clave)
+        if posicion is None:
+            posicion = self._indice.get(clave.upper())
+            if posicion is None:
+                return defecto
+        return tuple.__getitem__(self, posicion)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._claves
+
+    def values(self) -> Tuple[Any, ...]:
+        return tuple(self)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self._claves, self)
+
+    def __repr__(self) -> str:
+        return f"Fila({dict(self.items())!r})"
+
+
+@lru_cache(maxsize=512)
+def clase_fila(claves: Tuple[str, ...]) -> type:
+    """Subclase de Fila con el índice de un resultado (una por lista de columnas)."""
+    return type("Fila", (Fila,), {"__slots__": (), "_claves": claves, "_indice": indice_columnas(claves)})
+
+
+def tuplas(cursor: Any) -> List[Sequence[Any]]:
+    """
+    Filas restantes del cursor sin convertir a dict.
+
+    Tuplas de psycopg2 (UpperCaseCursorWrapper.fetchall_tuplas) o filas de
+    SQLite, que ya se indexan por posición.
+    """
+    fetchall_tuplas = getattr(cursor, "fetchall_tuplas", None)
+    if fetchall_tuplas is not None:
+        return fetchall_tuplas()
+    return cursor.fetchall()
+
+
+def filas(cursor: Any) -> List[Fila]:
+    """Filas restantes como `Fila` con índice compartido."""
+    clase = clase_fila(claves_mayusculas(cursor.description))
+    return list(map(clase, tuplas(cursor)))
+
+
+class MapeadorEntidad:
+    """
+    Construye entidades directamente desde filas-tupla.
+
+    Por cada descripción de cursor genera (y guarda) una función
+    `construir(fila)` que llama al constructor con `campo=fila[i]`.
+
+    Args:
+        entidad: Dataclass, registro (tupla con nombre) o cualquier callable
+            con argumentos por nombre
+        columnas: {campo: COLUMNA}; por defecto cada campo del dataclass o
+            registro con su nombre en mayúsculas
+        conversores: {campo: función} aplicada al valor de la columna
+        vacios_como_none: Valores falsos pasan como None (el `get(...) or
+            get(...)` de los mapeadores por dict)
+
+    Un campo cuya columna no viene en el resultado recibe None, como
+    `dict.get`.
+    """
+
+    def __init__(
+        self,
+        entidad: Callable[..., Any],
+        columnas: Optional[Mapping[str, str]] = None,
+        conversores: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+        vacios_como_none: bool = False,
+    ):
+        es_registro = (
+            isinstance(entidad, type) and issubclass(entidad, tuple) and hasattr(entidad, "_fields")
+        )
+        if columnas is None:
+            if es_registro:
+                columnas = {campo: campo.upper() for campo in entidad._fields}
+            else:
+                columnas = {f.name: f.name.upper() for f in dataclasses.fields(entidad) if f.init}
+        for campo in columnas:
+            if not campo.isidentifier() or (es_registro and campo not in entidad._fields):
+                raise ValueError(f"Campo inválido para el mapeador: {campo!r}")
+        self.entidad = entidad
+        self.columnas = {campo: columna.upper() for campo, columna in columnas.items()}
+        self.conversores = dict(conversores or {})
+        self.vacios_como_none = vacios_como_none
+        self.es_registro = es_registro
+        self._compilados: Dict[Tuple[str, ...], Callable[[Sequence[Any]], Any]] = {}
+
+    def _compilar(self, claves: Tuple[str, ...]) -> Callable[[Sequence[Any]], Any]:
+        indice = indice_columnas(claves)
+        espacio: Dict[str, Any] = {"_entidad": self.entidad, "_nueva_tupla": tuple.__new__}
+        valores: Dict[str, str] = {}
+        for campo, columna in self.columnas.items():
+            posicion = indice.get(columna)
+            if posicion is None:
+                valores[campo] = "None"
+                continue
+            valor = f"r[{posicion}]"
+            if self.vacios_como_none:
+                valor = f"({valor} or None)"
+            if campo in self.conversores:
+                espacio[f"_c_{campo}"] = self.conversores[campo]
+                valor = f"_c_{campo}({valor})"
+            valores[campo] = valor
+        if self.es_registro:
+            # Registro: la tupla en el orden de sus campos, sin pasar por __new__
+            tupla = ", ".join(valores.get(campo, "None") for campo in self.entidad._fields)
+            codigo = f"def construir(r):\n    return _nueva_tupla(_entidad, ({tupla},))\n"
+        else:
+            argumentos = ", ".join(f"{campo}={valor}" for campo, valor in valores.items())
+            codigo = f"def construir(r):\n    return _entidad({argumentos})\n"
+        exec(codigo, espacio)
+        return espacio["construir"]
+
+    def constructor(self, descripcion: Sequence[Sequence[Any]]) -> Callable[[Sequence[Any]], Any]:
+        """Función fila -> entidad para un resultado con esta descripción."""
+        claves = claves_mayusculas(descripcion)
+        construir = self._compilados.get(claves)
+        if construir is None:
+            construir = self._compilados[claves] = self._compilar(claves)
+        return construir
+
+    def mapear(self, cursor: Any) -> List[Any]:
+        """Entidades de las filas restantes del cursor (ya ejecutado)."""
+        return list(map(self.constructor(cursor.description), tuplas(cursor)))
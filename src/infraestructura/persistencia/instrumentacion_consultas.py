@@ -0,0 +1,316 @@
+"""
+Instrumentación de consultas SQL por evento.
+
+Envuelve la conexión de DatabaseManager para registrar, por cada evento
+(evento de Reflex, ruta de API o tarea en segundo plano), la huella de cada
+sentencia, su duración y las filas devueltas o afectadas. Al cerrar el evento
+se escribe un resumen en el log, se señalan las huellas repetidas (patrón N+1)
+y las consultas que superan el umbral de lentitud.
+
+Se activa con INSTRUMENTACION_CONSULTAS=true. Desactivada, la conexión no se
+envuelve y el costo es nulo; activada, el costo por consulta es un
+perf_counter y una búsqueda en dict (la huella se memoriza por texto SQL).
+"""
+
+import asyncio
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_RE_CADENA = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_PLACEHOLDER = re.compile(r"%s|\?")
+_RE_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_RE_ESPACIOS = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def huella_sql(sql: str) -> str:
+    """
+    Normaliza una sentencia para agrupar ejecuciones equivalentes.
+
+    Reemplaza literales y placeholders por '?', colapsa listas IN (?, ?, ...)
+    y espacios, de modo que la misma consulta con distintos parámetros
+    produzca la misma huella.
+    """
+    huella = _RE_CADENA.sub("?", sql)
+    huella = _RE_NUMERO.sub("?", huella)
+    huella = _RE_PLACEHOLDER.sub("?", huella)
+    huella = _RE_ESPACIOS.sub(" ", huella).strip()
+    return _RE_LISTA.sub("(?...)", huella)
+
+
+class EstadisticaConsulta:
+    """Acumulado de las ejecuciones de una huella dentro de un evento."""
+
+    __slots__ = ("ejecuciones", "duracion_ms", "filas")
+
+    def __init__(self):
+        self.ejecuciones = 0
+        self.duracion_ms = 0.0
+        self.filas = 0
+
+
+class ResumenEvento:
+    """Consultas ejecutadas durante un evento, agrupadas por huella."""
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self.inicio = time.perf_counter()
+        self.consultas: Dict[str, EstadisticaConsulta] = {}
+        self.lentas: List[Dict[str, Any]] = []
+        self.fin: Optional[float] = None
+
+    def registrar(self, sql: str, duracion_ms: float, filas: int) -> EstadisticaConsulta:
+        huella = huella_sql(sql)
+        estadistica = self.consultas.get(huella)
+        if estadistica is None:
+            estadistica = self.consultas[huella] = EstadisticaConsulta()
+        estadistica.ejecuciones += 1
+        estadistica.duracion_ms += duracion_ms
+        estadistica.filas += filas
+        return estadistica
+
+    @property
+    def total_consultas(self) -> int:
+        return sum(e.ejecuciones for e in self.consultas.values())
+
+    @property
+    def total_filas(self) -> int:
+        return sum(e.filas for e in self.consultas.values())
+
+    @property
+    def duracion_sql_ms(self) -> float:
+        return sum(e.duracion_ms for e in self.consultas.values())
+
+    @property
+    def duracion_ms(self) -> float:
+        return ((self.fin or time.perf_counter()) - self.inicio) * 1000
+
+    def sospechas_n_mas_uno(self, umbral: int) -> List[Dict[str, Any]]:
+        """Huellas ejecutadas al menos `umbral` veces, de más a menos repetida."""
+        sospechas = [
+            {"huella": huella, "ejecuciones": e.ejecuciones, "duracion_ms": e.duracion_ms}
+            for huella, e in self.consultas.items()
+            if e.ejecuciones >= umbral
+        ]
+        return sorted(sospechas, key=lambda s: s["ejecuciones"], reverse=True)
+
+    def como_dict(self, umbral_n_mas_uno: int) -> Dict[str, Any]:
+        return {
+            "evento": self.nombre,
+            "consultas": self.total_consultas,
+            "huellas": len(self.consultas),
+            "filas": self.total_filas,
+            "duracion_ms": round(self.duracion_ms, 1),
+            "duracion_sql_ms": round(self.duracion_sql_ms, 1),
+            "lentas": self.lentas,
+            "n_mas_uno": self.sospechas_n_mas_uno(umbral_n_mas_uno),
+        }
+
+
+class InstrumentacionConsultas:
+    """Umbrales y estado global de la instrumentación."""
+
+    def __init__(
+        self,
+        activa: bool = False,
+        umbral_lenta_ms: float = 200.0,
+        umbral_n_mas_uno: int = 10,
+    ):
+        self.activa = activa
+        self.umbral_lenta_ms = umbral_lenta_ms
+        self.umbral_n_mas_uno = umbral_n_mas_uno
+        self._evento: ContextVar[Optional[ResumenEvento]] = ContextVar(
+            "evento_consultas", default=None
+        )
+
+    def evento_actual(self) -> Optional[ResumenEvento]:
+        return self._evento.get()
+
+    def iniciar_evento(self, nombre: str) -> ResumenEvento:
+        """Abre un resumen en el contexto actual (y en las tareas que herede)."""
+        resumen = ResumenEvento(nombre)
+        self._evento.set(resumen)
+        return resumen
+
+    def finalizar_evento(self, resumen: ResumenEvento) -> Dict[str, Any]:
+        """Cierra el resumen y lo escribe en el log."""
+        resumen.fin = time.perf_counter()
+        datos = resumen.como_dict(self.umbral_n_mas_uno)
+        if datos["consultas"]:
+            logger.info(
+                f"SQL evento={datos['evento']} consultas={datos['consultas']} "
+                f"huellas={datos['huellas']} filas={datos['filas']} "
+                f"sql_ms={datos['duracion_sql_ms']} total_ms={datos['duracion_ms']}"
+            )
+        for sospecha in datos["n_mas_uno"]:
+            logger.warning(
+                f"Posible N+1 en {datos['evento']}: {sospecha['ejecuciones']} ejecuciones "
+                f"({sospecha['duracion_ms']:.1f} ms) de {sospecha['huella'][:300]}"
+            )
+        return datos
+
+    @contextmanager
+    def medir(self, nombre: str) -> Iterator[ResumenEvento]:
+        """
+        Delimita un evento fuera de Reflex (rutas de API, tareas programadas).
+
+        Ejemplo:
+            >>> with instrumentacion.medir("api:descargar_pdf"):
+            ...     servicio.generar(...)
+        """
+        resumen = ResumenEvento(nombre)
+        token = self._evento.set(resumen)
+        try:
+            yield resumen
+        finally:
+            self._evento.reset(token)
+            self.finalizar_evento(resumen)
+
+    def medir_tarea_actual(self, nombre: str) -> Optional[ResumenEvento]:
+        """
+        Abre un resumen que se cierra cuando termina la tarea asyncio actual.
+
+        Reflex procesa cada evento en su propia tarea, así que basta con
+        llamarlo desde el preprocess de un middleware.
+        """
+        try:
+            tarea = asyncio.current_task()
+        except RuntimeError:
+            tarea = None
+        if tarea is None:
+            return None
+        resumen = self.iniciar_evento(nombre)
+        tarea.add_done_callback(lambda _t: self.finalizar_evento(resumen))
+        return resumen
+
+    def registrar(self, sql: str, duracion_ms: float, filas: int) -> Optional[EstadisticaConsulta]:
+        resumen = self._evento.get()
+        if duracion_ms >= self.umbral_lenta_ms:
+            evento = resumen.nombre if resumen else "-"
+            logger.warning(f"Consulta lenta ({duracion_ms:.1f} ms) evento={evento}: {sql[:500]}")
+            if resumen is not None:
+                resumen.lentas.append({"sql": huella_sql(sql), "duracion_ms": round(duracion_ms, 1)})
+        if resumen is None:
+            return None
+        return resumen.registrar(sql, duracion_ms, filas)
+
+
+class CursorInstrumentado:
+    """Cursor que mide cada execute y cuenta las filas que se leen."""
+
+    def __init__(self, cursor: Any, instrumentacion: InstrumentacionConsultas):
+        self._cursor = cursor
+        self._instrumentacion = instrumentacion
+        self._estadistica: Optional[EstadisticaConsulta] = None
+
+    def _medir(self, metodo, sql: str, *args):
+        inicio = time.perf_counter()
+        try:
+            return metodo(sql, *args)
+        finally:
+            duracion_ms = (time.perf_counter() - inicio) * 1000
+            filas = getattr(self._cursor, "rowcount", -1)
+            self._estadistica = self._instrumentacion.registrar(
+                sql, duracion_ms, filas if filas and filas > 0 else 0
+            )
+
+    def execute(self, sql: str, *args):
+        self._medir(self._cursor.execute, sql, *args)
+        return self
+
+    def executemany(self, sql: str, *args):
+        self._medir(self._cursor.executemany, sql, *args)
+        return self
+
+    def _contar(self, filas: int) -> None:
+        if self._estadistica is not None:
+            self._estadistica.filas += filas
+
+    def fetchone(self):
+        fila = self._cursor.fetchone()
+        if fila is not None:
+            self._contar(1)
+        return fila
+
+    def fetchall(self):
+        filas = self._cursor.fetchall()
+        self._contar(len(filas))
+        return filas
+
+    def fetchmany(self, *args):
+        filas = self._cursor.fetchmany(*args)
+        self._contar(len(filas))
+        return filas
+
+    def fetchall_tuplas(self):
+        filas = getattr(self._cursor, "fetchall_tuplas", self._cursor.fetchall)()
+        self._contar(len(filas))
+        return filas
+
+    def __iter__(self):
+        for fila in self._cursor:
+            self._contar(1)
+            yield fila
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._cursor.close()
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class ConexionInstrumentada:
+    """Conexión cuyos cursores (y execute directos) pasan por la instrumentación."""
+
+    def __init__(self, conexion: Any, instrumentacion: InstrumentacionConsultas):
+        object.__setattr__(self, "_conexion", conexion)
+        object.__setattr__(self, "_instrumentacion", instrumentacion)
+
+    def cursor(self, *args, **kwargs) -> CursorInstrumentado:
+        return CursorInstrumentado(self._conexion.cursor(*args, **kwargs), self._instrumentacion)
+
+    def execute(self, sql: str, *args):
+        return self.cursor().execute(sql, *args)
+
+    def executemany(self, sql: str, *args):
+        return self.cursor().executemany(sql, *args)
+
+    def __enter__(self):
+        self._conexion.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._conexion.__exit__(exc_type, exc_val, exc_tb)
+
+    def __getattr__(self, name):
+        return getattr(self._conexion, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conexion, name, value)
+
+
+def _crear_instrumentacion() -> InstrumentacionConsultas:
+    from src.infraestructura.configuracion.settings import obtener_configuracion
+
+    config = obtener_configuracion()
+    return InstrumentacionConsultas(
+        activa=config.instrumentacion_consultas,
+        umbral_lenta_ms=config.consulta_lenta_ms,
+        umbral_n_mas_uno=config.umbral_n_mas_uno,
+    )
+
+
+# Instancia global
+instrumentacion_consultas = _crear_instrumentacion()
@@ -0,0 +1,164 @@
+"""
+Utilidades SQL de Paginación.
+
+- condicion_keyset: predicado "seek" para paginar por cursor sin OFFSET.
+- contar_total: total de un listado según la estrategia de conteo
+  (exact / cached / estimate) definida en PaginationParams.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+
+from src.infraestructura.cache.cache_manager import CacheLevel
+
+logger = logging.getLogger(__name__)
+
+# Conteos cacheados: (timestamp, total). El TTL efectivo lo decide cada
+# llamada (count_ttl), el del nivel solo acota la vida máxima de la entrada.
+_conteos_cache = CacheLevel(max_size=500, ttl_seconds=3600, name="Conteos-Paginacion")
+
+
+def condicion_keyset(
+    columnas: Sequence[str],
+    valores: Sequence[Any],
+    placeholder: str,
+    descendente: bool = True,
+) -> Tuple[str, List[Any]]:
+    """
+    Construye el predicado keyset `(c1, c2) < (v1, v2)`.
+
+    Las columnas deben ser las del ORDER BY (todas en la misma dirección) y
+    terminar en una columna única (normalmente la PK) para que el orden sea
+    estable.
+
+    Args:
+        columnas: Columnas del ORDER BY, con alias (ej. ['r.FECHA_PAGO', 'r.ID_RECAUDO'])
+        valores: Valores decodificados del cursor
+        placeholder: Placeholder del motor ('?' o '%s')
+        descendente: Dirección del ORDER BY
+
+    Returns:
+        Tupla (fragmento SQL, parámetros)
+    """
+    if len(columnas) != len(valores):
+        raise ValueError("El cursor no corresponde a la clave de orden del listado")
+
+    operador = "<" if descendente else ">"
+    if len(columnas) == 1:
+        return f"{columnas[0]} {operador} {placeholder}", list(valores)
+
+    izquierda = ", ".join(columnas)
+    derecha = ", ".join([placeholder] * len(valores))
+    return f"({izquierda}) {operador} ({derecha})", list(valores)
+
+
+def _primer_valor(row) -> Any:
+    if row is None:
+        return None
+    if isinstance(row, dict):
+        return next(iter(row.values()), None)
+    return row[0]
+
+
+def _clave_conteo(db, sql: str, params: Sequence[Any]) -> str:
+    origen = "postgresql" if getattr(db, "use_postgresql", False) else str(
+        getattr(db, "database_path", "")
+    )
+    data = json.dumps([origen, sql, list(params)], default=str)
+    return hashlib.md5(data.encode()).hexdigest()
+
+
+def _conteo_exacto(cursor, from_where: str, params: Sequence[Any]) -> int:
+    cursor.execute(f"SELECT COUNT(*) AS TOTAL {from_where}", list(params))
+    return int(_primer_valor(cursor.fetchone()) or 0)
+
+
+def _estimar_postgresql(cursor, from_where: str, params: Sequence[Any]) -> Optional[int]:
+    """
+    Filas estimadas por el planificador para el FROM/WHERE del listado.
+
+    Corre en un savepoint: si EXPLAIN falla, la transacción de la conexión
+    del hilo sigue viva con lo que el llamador tenga sin confirmar.
+    """
+    cursor.execute("SAVEPOINT estimar_conteo")
+    try:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) SELECT 1 {from_where}", list(params))
+        plan = _primer_valor(cursor.fetchone())
+    except Exception:
+        cursor.execute("ROLLBACK TO SAVEPOINT estimar_conteo")
+        raise
+    finally:
+        cursor.execute("RELEASE SAVEPOINT estimar_conteo")
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _estimar_sqlite(cursor, tabla_base: Optional[str]) -> Optional[int]:
+    """Filas de la tabla base según sqlite_stat1 (requiere ANALYZE)."""
+    if not tabla_base:
+        return None
+    cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1", (tabla_base,))
+    stat = _primer_valor(cursor.fetchone())
+    return int(str(stat).split()[0]) if stat else None
+
+
+def contar_total(
+    db,
+    from_where: str,
+    params: Sequence[Any],
+    estrategia: str = "exact",
+    ttl: int = 60,
+    tabla_base: Optional[str] = None,
+) -> Tuple[int, bool]:
+    """
+    Calcula el total de un listado paginado.
+
+    Args:
+        db: DatabaseManager
+        from_where: Fragmento `FROM ... JOIN ... WHERE ...` del listado
+        params: Parámetros del WHERE
+        estrategia: 'exact', 'cached' o 'estimate'
+        ttl: Segundos de validez para 'cached'
+        tabla_base: Tabla principal (para la estimación con sqlite_stat1)
+
+    Returns:
+        Tupla (total, es_estimado)
+    """
+    conn = db.obtener_conexion()
+    cursor = db.get_dict_cursor(conn) if hasattr(db, "get_dict_cursor") else conn.cursor()
+
+    if estrategia == "estimate":
+        try:
+            if getattr(db, "use_postgresql", False):
+                estimado = _estimar_postgresql(cursor, from_where, params)
+            elif "WHERE" not in from_where.upper():
+                # sqlite_stat1 solo conoce tamaños de tabla: sirve sin filtros
+                estimado = _estimar_sqlite(cursor, tabla_base)
+            else:
+                estimado = None
+            if estimado is not None:
+                return estimado, True
+        except Exception as e:
+            logger.debug(f"Estimación de conteo no disponible: {e}")
+        # Sin estimación confiable: conteo exacto reutilizado unos segundos
+        estrategia = "cached"
+
+    if estrategia == "cached":
+        clave = _clave_conteo(db, from_where, params)
+        entrada = _conteos_cache.get(clave)
+        if entrada is not None and time.time() - entrada[0] <= ttl:
+            return entrada[1], False
+        total = _conteo_exacto(cursor, from_where, params)
+        _conteos_cache.set(clave, (time.time(), total))
+        return total, False
+
+    return _conteo_exacto(cursor, from_where, params), False
+
+
+def invalidar_conteos() -> int:
+    """Descarta todos los conteos cacheados (ej. tras una carga masiva)."""
+    return _conteos_cache.invalidate()
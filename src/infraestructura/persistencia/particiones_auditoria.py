@@ -0,0 +1,422 @@
+"""
+Particiones mensuales de AUDITORIA_CAMBIOS con retención y archivo.
+
+- PostgreSQL: la tabla está particionada por rango mensual de FECHA_CAMBIO
+  (migraciones/sql/partition_auditoria_cambios.sql). `rotar` crea las
+  particiones de los meses siguientes y el planificador descarta las que no
+  cruzan el filtro de fechas de la consulta.
+- SQLite: AUDITORIA_CAMBIOS conserva solo los meses recientes (donde insertan
+  triggers y escritor); `rotar` mueve cada mes anterior a su tabla
+  AUDITORIA_CAMBIOS_AAAAMM. El catálogo AUDITORIA_PARTICIONES guarda el rango
+  de ID_AUDITORIA de cada tabla para que RepositorioAuditoriaSQLite lea solo
+  las que pueden tener filas.
+
+Retención: los meses anteriores a `auditoria_meses_retencion` se exportan a
+auditoria_AAAAMM.csv.gz en `auditoria_directorio_archivo` y su tabla o
+partición se elimina. El catálogo conserva la ruta y las filas archivadas.
+Filas tardías de un mes ya archivado vuelven a pasar por su tabla y se
+agregan al mismo archivo (un miembro gzip más).
+"""
+
+import csv
+import gzip
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from src.infraestructura.configuracion.settings import obtener_configuracion
+from src.infraestructura.persistencia.esquema import asegurar_esquema
+
+logger = logging.getLogger(__name__)
+
+TABLA_AUDITORIA = "AUDITORIA_CAMBIOS"
+
+COLUMNAS = (
+    "ID_AUDITORIA",
+    "TABLA",
+    "ID_REGISTRO",
+    "TIPO_OPERACION",
+    "CAMPO_MODIFICADO",
+    "VALOR_ANTERIOR",
+    "VALOR_NUEVO",
+    "USUARIO",
+    "FECHA_CAMBIO",
+    "MOTIVO_CAMBIO",
+    "IP_ORIGEN",
+)
+
+# Particiones de PostgreSQL creadas por delante del mes actual
+MESES_ADELANTE = 2
+
+# Una rotación a la vez por proceso (hilo diario y scripts)
+_lock_rotacion = threading.Lock()
+
+
+def sumar_meses(periodo: str, meses: int) -> str:
+    """'AAAA-MM' desplazado `meses` (negativo hacia atrás)."""
+    anio, mes = int(periodo[:4]), int(periodo[5:7])
+    total = anio * 12 + (mes - 1) + meses
+    return f"{total // 12:04d}-{total % 12 + 1:02d}"
+
+
+def tabla_periodo(periodo: str) -> str:
+    """Tabla (SQLite) o partición (PostgreSQL) de un período 'AAAA-MM'."""
+    return f"{TABLA_AUDITORIA}_{periodo.replace('-', '')}"
+
+
+class GestorParticionesAuditoria:
+    """Rotación mensual, retención y catálogo de particiones de auditoría."""
+
+    def __init__(
+        self,
+        db_manager: Any,
+        meses_activos: Optional[int] = None,
+        meses_retencion: Optional[int] = None,
+        directorio: Optional[str] = None,
+    ):
+        config = obtener_configuracion()
+        self.db = db_manager
+        self.meses_activos = max(meses_activos or config.auditoria_meses_activos, 1)
+        self.meses_retencion = max(meses_retencion or config.auditoria_meses_retencion, 1)
+        self.directorio = directorio or config.auditoria_directorio_archivo
+        asegurar_esquema(db_manager, "AUDITORIA_PARTICIONES", self._crear_catalogo)
+
+    def _crear_catalogo(self):
+        """Catálogo de particiones (en PostgreSQL lo crea la migración)."""
+        if self.db.use_postgresql:
+            return
+        with self.db.transaccion() as conn:
+            conn.cursor().execute(
+                """
+                CREATE TABLE IF NOT EXISTS AUDITORIA_PARTICIONES (
+                    PERIODO TEXT PRIMARY KEY,
+                    TABLA TEXT NOT NULL,
+                    ID_MIN INTEGER,
+                    ID_MAX INTEGER,
+                    FILAS INTEGER NOT NULL DEFAULT 0,
+                    FILAS_ARCHIVADAS INTEGER NOT NULL DEFAULT 0,
+                    ARCHIVO TEXT,
+                    ACTUALIZADO_EN TEXT
+                )
+            """
+            )
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def particiones(
+        self,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        antes_de_id: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Tablas de meses anteriores que pueden tener filas para la consulta.
+
+        Solo en SQLite: en PostgreSQL la poda la hace el planificador sobre la
+        tabla particionada. Ordenadas por ID_MAX descendente.
+        """
+        if self.db.use_postgresql:
+            return []
+        placeholder = self.db.get_placeholder()
+        condiciones = ["FILAS > 0"]
+        params: List[Any] = []
+        if fecha_desde:
+            condiciones.append(f"PERIODO >= {placeholder}")
+            params.append(fecha_desde[:7])
+        if fecha_hasta:
+            condiciones.append(f"PERIODO <= {placeholder}")
+            params.append(fecha_hasta[:7])
+        if antes_de_id is not None:
+            condiciones.append(f"ID_MIN < {placeholder}")
+            params.append(antes_de_id)
+
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(
+            f"""
+            SELECT PERIODO, TABLA, ID_MIN, ID_MAX FROM AUDITORIA_PARTICIONES
+            WHERE {' AND '.join(condiciones)}
+            ORDER BY ID_MAX DESC
+            """,
+            params,
+        )
+        return [
+            {"periodo": f["PERIODO"], "tabla": f["TABLA"], "id_min": f["ID_MIN"], "id_max": f["ID_MAX"]}
+            for f in cursor.fetchall()
+        ]
+
+    # ------------------------------------------------------------------
+    # Rotación
+    # ------------------------------------------------------------------
+
+    def rotar(self, hoy: Optional[date] = None) -> Dict[str, int]:
+        """
+        Aplica la política: particiona los meses fuera del rango activo y
+        archiva los que superan la retención.
+
+        Returns:
+            {"meses_movidos", "filas_movidas", "particiones_creadas", "meses_archivados", "filas_archivadas"}
+        """
+        periodo_actual = (hoy or date.today()).isoformat()[:7]
+        resultado = {
+            "meses_movidos": 0,
+            "filas_movidas": 0,
+            "particiones_creadas": 0,
+            "meses_archivados": 0,
+            "filas_archivadas": 0,
+        }
+        corte_retencion = sumar_meses(periodo_actual, -self.meses_retencion)
+        with _lock_rotacion:
+            if self.db.use_postgresql:
+                resultado["particiones_creadas"] = self._crear_particiones_postgresql(periodo_actual)
+                vencidas = self._particiones_postgresql_antes_de(corte_retencion)
+            else:
+                corte_activo = sumar_meses(periodo_actual, -(self.meses_activos - 1))
+                while True:
+                    periodo = self._mes_mas_antiguo_antes_de(corte_activo)
+                    if periodo is None:
+                        break
+                    filas = self._mover_mes(periodo)
+                    if filas == 0:
+                        # FECHA_CAMBIO fuera del formato ISO: no se puede ubicar el mes
+                        logger.warning(f"Auditoría: fechas no reconocidas antes de {corte_activo}")
+                        break
+                    resultado["filas_movidas"] += filas
+                    resultado["meses_movidos"] += 1
+                vencidas = [
+                    p["periodo"]
+                    for p in self.particiones(fecha_hasta=sumar_meses(corte_retencion, -1))
+                ]
+            for periodo in sorted(vencidas):
+                resultado["filas_archivadas"] += self._archivar(periodo)
+                resultado["meses_archivados"] += 1
+
+        if any(resultado.values()):
+            logger.info(f"Rotación de auditoría: {resultado}")
+        return resultado
+
+    def _mes_mas_antiguo_antes_de(self, periodo: str) -> Optional[str]:
+        """Mes más antiguo en la tabla activa (MIN sobre idx_auditoria_fecha)."""
+        conn = self.db.obtener_conexion()
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT MIN(FECHA_CAMBIO) FROM {TABLA_AUDITORIA} "
+            f"WHERE FECHA_CAMBIO < {self.db.get_placeholder()}",
+            (f"{periodo}-01",),
+        )
+        fila = cursor.fetchone()
+        return fila[0][:7] if fila and fila[0] else None
+
+    def _mover_mes(self, periodo: str) -> int:
+        """SQLite: mueve un mes de AUDITORIA_CAMBIOS a su tabla, en una transacción."""
+        tabla = tabla_periodo(periodo)
+        columnas = ", ".join(COLUMNAS)
+        rango = (f"{periodo}-01", f"{sumar_meses(periodo, 1)}-01")
+        with self.db.transaccion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {tabla} (
+                    ID_AUDITORIA INTEGER PRIMARY KEY,
+                    TABLA TEXT NOT NULL,
+                    ID_REGISTRO INTEGER NOT NULL,
+                    TIPO_OPERACION TEXT NOT NULL,
+                    CAMPO_MODIFICADO TEXT,
+                    VALOR_ANTERIOR TEXT,
+                    VALOR_NUEVO TEXT,
+                    USUARIO TEXT NOT NULL,
+                    FECHA_CAMBIO TEXT,
+                    MOTIVO_CAMBIO TEXT,
+                    IP_ORIGEN TEXT
+                )
+            """
+            )
+            cursor.execute(
+                f"INSERT INTO {tabla} ({columnas}) SELECT {columnas} FROM {TABLA_AUDITORIA} "
+                "WHERE FECHA_CAMBIO >= ? AND FECHA_CAMBIO < ?",
+                rango,
+            )
+            filas = cursor.rowcount
+            cursor.execute(
+                f"DELETE FROM {TABLA_AUDITORIA} WHERE FECHA_CAMBIO >= ? AND FECHA_CAMBIO < ?",
+                rango,
+            )
+            # Los mismos índices de búsqueda que la tabla activa
+            for sufijo, columnas_indice in (
+                ("tabla", "TABLA, ID_REGISTRO"),
+                ("tabla_id", "TABLA, ID_AUDITORIA"),
+                ("usuario_id", "USUARIO, ID_AUDITORIA"),
+            ):
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{tabla.lower()}_{sufijo} "
+                    f"ON {tabla} ({columnas_indice})"
+                )
+            cursor.execute(f"SELECT MIN(ID_AUDITORIA), MAX(ID_AUDITORIA), COUNT(*) FROM {tabla}")
+            id_min, id_max, total = cursor.fetchone()
+            cursor.execute(
+                """
+                INSERT INTO AUDITORIA_PARTICIONES (PERIODO, TABLA, ID_MIN, ID_MAX, FILAS, ACTUALIZADO_EN)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (PERIODO) DO UPDATE SET
+                    TABLA = excluded.TABLA, ID_MIN = excluded.ID_MIN, ID_MAX = excluded.ID_MAX,
+                    FILAS = excluded.FILAS, ACTUALIZADO_EN = excluded.ACTUALIZADO_EN
+                """,
+                (periodo, tabla, id_min, id_max, total, datetime.now().isoformat()),
+            )
+        return filas
+
+    def _crear_particiones_postgresql(self, periodo_actual: str) -> int:
+        """Particiones del mes actual y los siguientes; idempotente."""
+        creadas = 0
+        with self.db.transaccion() as conn:
+            cursor = conn.cursor()
+            for i in range(MESES_ADELANTE + 1):
+                periodo = sumar_meses(periodo_actual, i)
+                tabla = tabla_periodo(periodo).lower()
+                cursor.execute("SELECT to_regclass(%s) AS PARTICION", (tabla,))
+                if cursor.fetchone()["PARTICION"] is not None:
+                    continue
+                cursor.execute(
+                    f"CREATE TABLE {tabla} PARTITION OF auditoria_cambios "
+                    f"FOR VALUES FROM ('{periodo}-01') TO ('{sumar_meses(periodo, 1)}-01')"
+                )
+                cursor.execute(
+                    """
+                    INSERT INTO auditoria_particiones (periodo, tabla, actualizado_en)
+                    VALUES (%s, %s, %s) ON CONFLICT (periodo) DO NOTHING
+                    """,
+                    (periodo, tabla, datetime.now().isoformat()),
+                )
+                creadas += 1
+        return creadas
+
+    def _particiones_postgresql_antes_de(self, periodo: str) -> List[str]:
+        """Períodos con partición adjunta anteriores a `periodo`."""
+        conn = self.db.obtener_conexion()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT c.relname AS RELNAME FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'auditoria_cambios'::regclass
+            AND c.relname ~ '^auditoria_cambios_[0-9]{6}$'
+            """
+        )
+        nombres = [f["RELNAME"] for f in cursor.fetchall()]
+        periodos = [f"{n[-6:-2]}-{n[-2:]}" for n in nombres]
+        return [p for p in periodos if p < periodo]
+
+    # ------------------------------------------------------------------
+    # Retención
+    # ------------------------------------------------------------------
+
+    def ruta_archivo(self, periodo: str) -> str:
+        return os.path.join(self.directorio, f"auditoria_{periodo.replace('-', '')}.csv.gz")
+
+    def _archivar(self, periodo: str) -> int:
+        """Exporta la tabla/partición del mes a CSV comprimido y la elimina."""
+        tabla = tabla_periodo(periodo)
+        ruta = self.ruta_archivo(periodo)
+        os.makedirs(self.directorio, exist_ok=True)
+        nuevo = not os.path.exists(ruta)
+        placeholder = self.db.get_placeholder()
+
+        with self.db.transaccion() as conn:
+            cursor = conn.cursor()
+            # El archivo se escribe antes de borrar: si falla, la tabla sigue ahí
+            with gzip.open(ruta, "at", encoding="utf-8", newline="") as archivo:
+                if self.db.use_postgresql:
+                    tabla = tabla.lower()
+                    cursor.execute(f"ALTER TABLE auditoria_cambios DETACH PARTITION {tabla}")
+                    cursor.execute(f"SELECT COUNT(*) AS FILAS FROM {tabla}")
+                    filas = cursor.fetchone()["FILAS"]
+                    cursor.copy_expert(
+                        f"COPY (SELECT {', '.join(COLUMNAS)} FROM {tabla} ORDER BY id_auditoria) "
+                        f"TO STDOUT WITH (FORMAT csv{', HEADER' if nuevo else ''})",
+                        archivo,
+                    )
+                else:
+                    escritor = csv.writer(archivo)
+                    if nuevo:
+                        escritor.writerow(COLUMNAS)
+                    cursor.execute(
+                        f"SELECT {', '.join(COLUMNAS)} FROM {tabla} ORDER BY ID_AUDITORIA"
+                    )
+                    filas = 0
+                    for fila in cursor:
+                        escritor.writerow(fila)
+                        filas += 1
+            cursor.execute(f"DROP TABLE {tabla}")
+            cursor.execute(
+                f"""
+                INSERT INTO AUDITORIA_PARTICIONES (
+                    PERIODO, TABLA, FILAS, FILAS_ARCHIVADAS, ARCHIVO, ACTUALIZADO_EN
+                ) VALUES ({placeholder}, {placeholder}, 0, {placeholder}, {placeholder}, {placeholder})
+                ON CONFLICT (PERIODO) DO UPDATE SET
+                    FILAS = 0, ID_MIN = NULL, ID_MAX = NULL,
+                    FILAS_ARCHIVADAS = AUDITORIA_PARTICIONES.FILAS_ARCHIVADAS + excluded.FILAS_ARCHIVADAS,
+                    ARCHIVO = excluded.ARCHIVO, ACTUALIZADO_EN = excluded.ACTUALIZADO_EN
+                """,
+                (periodo, tabla, filas, ruta, datetime.now().isoformat()),
+            )
+        logger.info(f"Auditoría {periodo} archivada en {ruta} ({filas} filas)")
+        return filas
+
+
+class RotacionDiariaAuditoria:
+    """Hilo que aplica la rotación y la retención una vez por día."""
+
+    def __init__(self, gestor: GestorParticionesAuditoria, intervalo_segundos: float = 3600):
+        self.gestor = gestor
+        self.intervalo_segundos = intervalo_segundos
+        self.ultima_fecha: Optional[date] = None
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def ejecutar_si_corresponde(self) -> bool:
+        """Rota si aún no se ha rotado hoy."""
+        hoy = date.today()
+        if self.ultima_fecha == hoy:
+            return False
+        self.gestor.rotar(hoy)
+        self.ultima_fecha = hoy
+        return True
+
+    def _bucle(self) -> None:
+        while not self._detener.is_set():
+            try:
+                self.ejecutar_si_corresponde()
+            except Exception as e:
+                logger.error(f"Error en la rotación de auditoría: {e}")
+            self._detener.wait(self.intervalo_segundos)
+
+    def iniciar(self) -> None:
+        if self._hilo and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, daemon=True, name="RotacionAuditoria")
+        self._hilo.start()
+
+    def detener(self, timeout: float = 10.0) -> None:
+        self._detener.set()
+        if self._hilo:
+            self._hilo.join(timeout=timeout)
+            self._hilo = None
+
+
+@asynccontextmanager
+async def rotacion_auditoria_en_segundo_plano():
+    """Lifespan task de Reflex: rota y archiva la auditoría una vez al día."""
+    from src.infraestructura.persistencia.database import db_manager
+
+    rotacion = RotacionDiariaAuditoria(GestorParticionesAuditoria(db_manager))
+    rotacion.iniciar()
+    try:
+        yield
+    finally:
+        rotacion.detener()
@@ -1,13 +1,51 @@
 """
 Repositorio SQLite para Auditoría de Cambios.
 Implementa mapeo con tabla AUDITORIA_CAMBIOS.
+
+La búsqueda (buscar) filtra en SQL y pagina por keyset sobre ID_AUDITORIA,
+que crece con el tiempo: cada página cuesta lo mismo sin importar cuánta
+historia haya detrás.
+
+En SQLite los meses anteriores viven en tablas AUDITORIA_CAMBIOS_AAAAMM (ver
+particiones_auditoria): las consultas recorren la tabla activa y luego solo
+las tablas mensuales que cruzan las fechas y el cursor, de la más reciente a
+la más antigua, y se detienen en cuanto ninguna otra puede aportar filas.
 """
 
 import sqlite3
-from typing import List
+from datetime import date, timedelta
+from typing import Any, Callable, List, Optional, Sequence, Tuple
 
 from src.dominio.entidades.auditoria_cambio import AuditoriaCambio
 from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.esquema import asegurar_esquema
+from src.infraestructura.persistencia.filas import MapeadorEntidad
+from src.infraestructura.persistencia.paginacion_sql import condicion_keyset
+from src.infraestructura.persistencia.particiones_auditoria import (
+    TABLA_AUDITORIA,
+    GestorParticionesAuditoria,
+)
+
+# Columnas en las que busca el texto libre
+COLUMNAS_TEXTO = ("USUARIO", "CAMPO_MODIFICADO", "MOTIVO_CAMBIO", "VALOR_ANTERIOR", "VALOR_NUEVO")
+
+# Listados: entidades directas desde las tuplas (mismo resultado que _row_to_entity)
+MAPEADOR_AUDITORIA = MapeadorEntidad(
+    AuditoriaCambio,
+    {
+        "id_auditoria": "ID_AUDITORIA",
+        "tabla": "TABLA",
+        "id_registro": "ID_REGISTRO",
+        "accion": "TIPO_OPERACION",
+        "campo": "CAMPO_MODIFICADO",
+        "valor_anterior": "VALOR_ANTERIOR",
+        "valor_nuevo": "VALOR_NUEVO",
+        "usuario": "USUARIO",
+        "fecha_cambio": "FECHA_CAMBIO",
+        "motivo_cambio": "MOTIVO_CAMBIO",
+        "ip_origen": "IP_ORIGEN",
+    },
+)
 
 
 class RepositorioAuditoriaSQLite:
@@ -15,6 +53,49 @@ class RepositorioAuditoriaSQLite:
 
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        asegurar_esquema(db_manager, "AUDITORIA_CAMBIOS", self._ensure_indexes)
+        self.particiones = GestorParticionesAuditoria(db_manager)
+
+    def _ensure_indexes(self):
+        """Índices de la búsqueda en SQLite (en PostgreSQL los crea la migración)."""
+        if self.db.use_postgresql:
+            return
+        with self.db.transaccion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'AUDITORIA_CAMBIOS'"
+            )
+            if cursor.fetchone() is None:
+                return
+            # Historia de un registro acotada por fecha. La historia completa usa
+            # idx_auditoria_tabla (TABLA, ID_REGISTRO), que en SQLite ya queda
+            # ordenado por ID_AUDITORIA (rowid).
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_auditoria_tabla_registro_fecha
+                ON AUDITORIA_CAMBIOS (TABLA, ID_REGISTRO, FECHA_CAMBIO)
+            """
+            )
+            # Keyset por tabla y por usuario (ORDER BY ID_AUDITORIA DESC)
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_auditoria_tabla_id
+                ON AUDITORIA_CAMBIOS (TABLA, ID_AUDITORIA)
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_auditoria_usuario_id
+                ON AUDITORIA_CAMBIOS (USUARIO, ID_AUDITORIA)
+            """
+            )
+            # Rotación mensual (mes más antiguo de la tabla activa)
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_auditoria_fecha
+                ON AUDITORIA_CAMBIOS (FECHA_CAMBIO)
+            """
+            )
 
     def _row_to_entity(self, row: sqlite3.Row) -> AuditoriaCambio:
         """Convierte una fila SQL a entidad AuditoriaCambio."""
@@ -49,40 +130,192 @@ class RepositorioAuditoriaSQLite:
             ip_origen=(row_dict.get("ip_origen") or row_dict.get("IP_ORIGEN")),
         )
 
+    def _consultar(
+        self,
+        construir: Callable[[str], Tuple[str, List[Any]]],
+        limit: int,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        despues_de: Optional[int] = None,
+    ) -> List[AuditoriaCambio]:
+        """
+        Primeros `limit` cambios por ID_AUDITORIA descendente entre la tabla
+        activa y las tablas mensuales que pueden tener filas.
+
+        `construir(tabla)` devuelve la consulta (ya ordenada y limitada) y sus
+        parámetros para una tabla física.
+        """
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+
+        query, params = construir(TABLA_AUDITORIA)
+        cursor.execute(query, params)
+        cambios = MAPEADOR_AUDITORIA.mapear(cursor)
+
+        # Solo SQLite tiene tablas mensuales (PostgreSQL poda sus particiones)
+        for particion in self.particiones.particiones(fecha_desde, fecha_hasta, despues_de):
+            # Van por ID_MAX descendente: si la fila `limit` ya es mayor que
+            # todo lo de esta tabla, tampoco entra nada de las siguientes
+            if len(cambios) >= limit and cambios[limit - 1].id_auditoria > particion["id_max"]:
+                break
+            query, params = construir(particion["tabla"])
+            cursor.execute(query, params)
+            cambios.extend(MAPEADOR_AUDITORIA.mapear(cursor))
+            cambios.sort(key=lambda cambio: cambio.id_auditoria, reverse=True)
+            del cambios[limit:]
+        return cambios
+
     def listar_todos(self, limit: int = 100, offset: int = 0) -> List[AuditoriaCambio]:
         """
         Lista los registros de auditoría paginados.
         Ordenados por fecha descendente (lo más reciente primero).
         """
-        conn = self.db.obtener_conexion()
-        cursor = self.db.get_dict_cursor(conn)
         placeholder = self.db.get_placeholder()
-
-        cursor.execute(
-            f"""
-            SELECT * FROM AUDITORIA_CAMBIOS
-            ORDER BY ID_AUDITORIA DESC
-            LIMIT {placeholder} OFFSET {placeholder}
-            """,
-            (limit, offset),
+        cambios = self._consultar(
+            lambda tabla: (
+                f"SELECT * FROM {tabla} ORDER BY ID_AUDITORIA DESC LIMIT {placeholder}",
+                [limit + offset],
+            ),
+            limit + offset,
         )
-
-        return [self._row_to_entity(row) for row in cursor.fetchall()]
+        return cambios[offset:]
 
     def buscar_por_tabla(self, tabla: str, limit: int = 100) -> List[AuditoriaCambio]:
         """Busca auditoría por tabla."""
-        conn = self.db.obtener_conexion()
-        cursor = self.db.get_dict_cursor(conn)
         placeholder = self.db.get_placeholder()
+        return self._consultar(
+            lambda fuente: (
+                f"SELECT * FROM {fuente} WHERE TABLA LIKE {placeholder} "
+                f"ORDER BY ID_AUDITORIA DESC LIMIT {placeholder}",
+                [f"%{tabla}%", limit],
+            ),
+            limit,
+        )
 
-        cursor.execute(
-            f"""
-            SELECT * FROM AUDITORIA_CAMBIOS
-            WHERE TABLA LIKE {placeholder}
-            ORDER BY ID_AUDITORIA DESC
-            LIMIT {placeholder}
-            """,
-            (f"%{tabla}%", limit),
+    def _variantes_tabla(self, tablas: Sequence[str]) -> List[str]:
+        """Nombres de tabla tal como los escriben los triggers de cada motor."""
+        variantes = []
+        for tabla in tablas:
+            # TG_TABLE_NAME de PostgreSQL llega en minúsculas
+            candidatos = [tabla.upper(), tabla.lower()] if self.db.use_postgresql else [tabla.upper()]
+            variantes.extend(c for c in candidatos if c not in variantes)
+        return variantes
+
+    def _filtros_busqueda(
+        self,
+        id_registro: Optional[int],
+        usuario: Optional[str],
+        accion: Optional[str],
+        fecha_desde: Optional[str],
+        fecha_hasta: Optional[str],
+        texto: Optional[str],
+        despues_de: Optional[int],
+    ) -> Tuple[List[str], List[Any]]:
+        """Condiciones de buscar, salvo la tabla."""
+        placeholder = self.db.get_placeholder()
+        conditions: List[str] = []
+        query_params: List[Any] = []
+
+        if id_registro is not None:
+            conditions.append(f"ID_REGISTRO = {placeholder}")
+            query_params.append(id_registro)
+
+        if usuario:
+            conditions.append(f"USUARIO = {placeholder}")
+            query_params.append(usuario)
+
+        if accion:
+            conditions.append(f"TIPO_OPERACION = {placeholder}")
+            query_params.append(accion)
+
+        if fecha_desde:
+            conditions.append(f"FECHA_CAMBIO >= {placeholder}")
+            query_params.append(fecha_desde)
+
+        if fecha_hasta:
+            # Fecha inclusiva: todo lo anterior al día siguiente
+            siguiente = date.fromisoformat(fecha_hasta[:10]) + timedelta(days=1)
+            conditions.append(f"FECHA_CAMBIO < {placeholder}")
+            query_params.append(siguiente.isoformat())
+
+        if texto:
+            term = f"%{texto.lower()}%"
+            conditions.append(
+                "("
+                + " OR ".join(f"LOWER({col}) LIKE {placeholder}" for col in COLUMNAS_TEXTO)
+                + ")"
+            )
+            query_params.extend([term] * len(COLUMNAS_TEXTO))
+
+        if despues_de is not None:
+            seek, seek_params = condicion_keyset(["ID_AUDITORIA"], [despues_de], placeholder)
+            conditions.append(seek)
+            query_params.extend(seek_params)
+
+        return conditions, query_params
+
+    def buscar(
+        self,
+        tablas: Optional[Sequence[str]] = None,
+        id_registro: Optional[int] = None,
+        usuario: Optional[str] = None,
+        accion: Optional[str] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        texto: Optional[str] = None,
+        limit: int = 50,
+        despues_de: Optional[int] = None,
+    ) -> List[AuditoriaCambio]:
+        """
+        Busca en la auditoría con todos los filtros resueltos en SQL.
+
+        Ordena por ID_AUDITORIA descendente (lo más reciente primero). Para la
+        página siguiente se pasa en `despues_de` el ID_AUDITORIA de la última
+        fila entregada; pedir `limit + 1` filas indica si hay más.
+
+        Args:
+            tablas: Tablas auditadas (nombre exacto); None para todas
+            id_registro: ID del registro dentro de la tabla
+            usuario: Usuario exacto que hizo el cambio
+            accion: TIPO_OPERACION (INSERT, UPDATE, DELETE, ...)
+            fecha_desde: 'YYYY-MM-DD' inclusiva
+            fecha_hasta: 'YYYY-MM-DD' inclusiva
+            texto: Texto libre en usuario, campo, motivo y valores
+            limit: Máximo de filas
+            despues_de: Cursor keyset (ID_AUDITORIA de la última fila)
+        """
+        placeholder = self.db.get_placeholder()
+
+        conditions, query_params = self._filtros_busqueda(
+            id_registro, usuario, accion, fecha_desde, fecha_hasta, texto, despues_de
         )
+        variantes = self._variantes_tabla(tablas) if tablas else [None]
+
+        def construir(fuente: str) -> Tuple[str, List[Any]]:
+            # Una subconsulta por tabla auditada: cada una recorre su rango del
+            # índice (TABLA, ID_AUDITORIA) en orden y se detiene en `limit` filas.
+            subconsultas, params = [], []
+            for tabla in variantes:
+                condiciones_tabla = list(conditions)
+                params_tabla = list(query_params)
+                if tabla is not None:
+                    condiciones_tabla.insert(0, f"TABLA = {placeholder}")
+                    params_tabla.insert(0, tabla)
+                where = " WHERE " + " AND ".join(condiciones_tabla) if condiciones_tabla else ""
+                subconsultas.append(
+                    f"SELECT * FROM {fuente}{where} "
+                    f"ORDER BY ID_AUDITORIA DESC LIMIT {placeholder}"
+                )
+                params.extend(params_tabla + [limit])
+
+            if len(subconsultas) == 1:
+                return subconsultas[0], params
+            query = (
+                " UNION ALL ".join(
+                    f"SELECT * FROM ({sub}) AS t{i}" for i, sub in enumerate(subconsultas)
+                )
+                + f" ORDER BY ID_AUDITORIA DESC LIMIT {placeholder}"
+            )
+            return query, params + [limit]
 
-        return [self._row_to_entity(row) for row in cursor.fetchall()]
+        return self._consultar(construir, limit, fecha_desde, fecha_hasta, despues_de)
@@ -0,0 +1,370 @@
+"""
+Repositorio de Búsqueda Global.
+
+Reemplaza los `LIKE '%termino%'` (no indexables) por búsquedas indexadas:
+
+- PostgreSQL: índices GIN `pg_trgm` sobre `f_unaccent(lower(...))`
+  (ver migraciones/sql/add_busqueda_trigram.sql). Al ser índices de
+  expresión, se mantienen sincronizados por el propio motor.
+- SQLite: tablas FTS5 de contenido externo (`PERSONAS_FTS`,
+  `PROPIEDADES_FTS`) con tokenizador `unicode61 remove_diacritics 2`,
+  sincronizadas por triggers AFTER INSERT/UPDATE/DELETE.
+
+Si el índice no está disponible (extensiones no instaladas, SQLite sin FTS5
+o tabla inexistente) se degrada al LIKE original.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.dominio.servicios.normalizador_texto import normalizar_texto, tokenizar_busqueda
+from src.infraestructura.persistencia.esquema import asegurar_esquema
+
+logger = logging.getLogger(__name__)
+
+# Entidades indexadas: tabla, PK y columnas de texto buscables
+ENTIDADES_BUSQUEDA: Dict[str, Dict[str, Any]] = {
+    "PERSONA": {
+        "tabla": "PERSONAS",
+        "id": "ID_PERSONA",
+        "columnas": ("NOMBRE_COMPLETO", "NUMERO_DOCUMENTO"),
+    },
+    "PROPIEDAD": {
+        "tabla": "PROPIEDADES",
+        "id": "ID_PROPIEDAD",
+        "columnas": ("DIRECCION_PROPIEDAD", "MATRICULA_INMOBILIARIA"),
+    },
+}
+
+# Estado del índice por base de datos (None = no verificado)
+_indices_disponibles: Dict[str, Dict[str, bool]] = {}
+_indices_lock = threading.Lock()
+
+
+def expresion_trigram(entidad_tipo: str, alias: Optional[str] = None) -> str:
+    """
+    Expresión normalizada usada por los índices GIN de PostgreSQL.
+
+    Debe coincidir exactamente con la expresión de la migración para que el
+    planificador use el índice.
+    """
+    prefijo = f"{alias}." if alias else ""
+    columnas = ENTIDADES_BUSQUEDA[entidad_tipo]["columnas"]
+    concatenado = " || ' ' || ".join(f"coalesce({prefijo}{c}, '')" for c in columnas)
+    return f"f_unaccent(lower({concatenado}))"
+
+
+class RepositorioBusquedaSQLite:
+    """
+    Búsqueda indexada e insensible a tildes sobre personas, propiedades y contratos.
+    """
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+        if not self._es_postgresql:
+            # Las tablas FTS5 se crean con el esquema, no en la primera búsqueda
+            asegurar_esquema(db_manager, "BUSQUEDA_FTS", self.asegurar_indice)
+
+    # ========================================================================
+    # ÍNDICES
+    # ========================================================================
+
+    @property
+    def _es_postgresql(self) -> bool:
+        return bool(getattr(self.db, "use_postgresql", False))
+
+    def _placeholder(self) -> str:
+        return self.db.get_placeholder() if hasattr(self.db, "get_placeholder") else "?"
+
+    def _clave_bd(self) -> str:
+        if self._es_postgresql:
+            return "postgresql"
+        return str(getattr(self.db, "database_path", id(self.db)))
+
+    def asegurar_indice(self) -> Dict[str, bool]:
+        """
+        Verifica (y en SQLite crea) el índice de búsqueda de cada entidad.
+
+        Se ejecuta una sola vez por base de datos; el resultado queda en memoria.
+
+        Returns:
+            Diccionario {entidad_tipo: índice disponible}
+        """
+        clave = self._clave_bd()
+        disponibles = _indices_disponibles.get(clave)
+        if disponibles is not None:
+            return disponibles
+
+        with _indices_lock:
+            disponibles = _indices_disponibles.get(clave)
+            if disponibles is None:
+                if self._es_postgresql:
+                    disponibles = self._verificar_trigram()
+                else:
+                    disponibles = self._crear_fts()
+                _indices_disponibles[clave] = disponibles
+        return disponibles
+
+    def invalidar_estado_indice(self) -> None:
+        """Fuerza a re-verificar el índice en la próxima búsqueda."""
+        with _indices_lock:
+            _indices_disponibles.pop(self._clave_bd(), None)
+
+    def _verificar_trigram(self) -> Dict[str, bool]:
+        """Comprueba que la migración de pg_trgm/unaccent esté aplicada."""
+        conn = self.db.obtener_conexion()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT (to_regprocedure('f_unaccent(text)') IS NOT NULL
+                        AND EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'))
+                       AS DISPONIBLE
+                """
+            )
+            row = cursor.fetchone()
+            disponible = bool(row["DISPONIBLE"] if hasattr(row, "keys") else row[0])
+        except Exception as e:
+            conn.rollback()
+            logger.warning(f"Búsqueda trigram no disponible, se usará LIKE: {e}")
+            disponible = False
+
+        if not disponible:
+            logger.warning(
+                "Índices de búsqueda no instalados (migraciones/sql/add_busqueda_trigram.sql)"
+            )
+        return {entidad: disponible for entidad in ENTIDADES_BUSQUEDA}
+
+    def _crear_fts(self) -> Dict[str, bool]:
+        """
+        Crea las tablas FTS5 y sus triggers de sincronización (idempotente).
+
+        Cada sentencia va por separado dentro de `transaccion()`: executescript
+        haría COMMIT de cualquier transacción abierta en la conexión del hilo.
+        """
+        disponibles = {}
+
+        for entidad, spec in ENTIDADES_BUSQUEDA.items():
+            tabla, pk, columnas = spec["tabla"], spec["id"], spec["columnas"]
+            fts = f"{tabla}_FTS"
+            cols = ", ".join(columnas)
+            nuevos = ", ".join(f"new.{c}" for c in columnas)
+            viejos = ", ".join(f"old.{c}" for c in columnas)
+            try:
+                with self.db.transaccion() as conn:
+                    existentes = {
+                        row[0]
+                        for row in conn.execute(
+                            "SELECT name FROM sqlite_master WHERE name IN (?, ?)", (tabla, fts)
+                        ).fetchall()
+                    }
+                    if tabla not in existentes:
+                        disponibles[entidad] = False
+                        continue
+
+                    conn.execute(
+                        f"""
+                        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                            {cols},
+                            content='{tabla}',
+                            content_rowid='{pk}',
+                            tokenize='unicode61 remove_diacritics 2',
+                            prefix='2 3'
+                        )
+                        """
+                    )
+                    conn.execute(
+                        f"""
+                        CREATE TRIGGER IF NOT EXISTS TRG_{fts}_AI AFTER INSERT ON {tabla} BEGIN
+                            INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {nuevos});
+                        END
+                        """
+                    )
+                    conn.execute(
+                        f"""
+                        CREATE TRIGGER IF NOT EXISTS TRG_{fts}_AD AFTER DELETE ON {tabla} BEGIN
+                            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {viejos});
+                        END
+                        """
+                    )
+                    conn.execute(
+                        f"""
+                        CREATE TRIGGER IF NOT EXISTS TRG_{fts}_AU AFTER UPDATE OF {cols} ON {tabla} BEGIN
+                            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {viejos});
+                            INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {nuevos});
+                        END
+                        """
+                    )
+
+                    if fts not in existentes:
+                        # Índice recién creado: poblar con los registros existentes
+                        conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                        logger.info(f"Índice de búsqueda {fts} creado")
+
+                disponibles[entidad] = True
+            except Exception as e:
+                logger.warning(f"FTS5 no disponible para {tabla}, se usará LIKE: {e}")
+                disponibles[entidad] = False
+
+        return disponibles
+
+    def reconstruir_indice(self) -> None:
+        """Reconstruye los índices FTS5 desde las tablas base (solo SQLite)."""
+        if self._es_postgresql:
+            return
+        disponibles = self.asegurar_indice()
+        conn = self.db.obtener_conexion()
+        for entidad, spec in ENTIDADES_BUSQUEDA.items():
+            if disponibles.get(entidad):
+                fts = f"{spec['tabla']}_FTS"
+                conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        conn.commit()
+
+    # ========================================================================
+    # CONSULTAS
+    # ========================================================================
+
+    def _subconsulta_coincidencias(
+        self, entidad_tipo: str, termino: str
+    ) -> Tuple[str, List[Any]]:
+        """
+        Subconsulta `SELECT ID, RANGO` de las filas que coinciden con el término.
+
+        RANGO es menor cuanto más relevante la coincidencia (bm25 en SQLite,
+        -similarity en PostgreSQL, 0 en el modo LIKE).
+        """
+        spec = ENTIDADES_BUSQUEDA[entidad_tipo]
+        tabla, pk, columnas = spec["tabla"], spec["id"], spec["columnas"]
+        ph = self._placeholder()
+        indexado = self.asegurar_indice().get(entidad_tipo, False)
+
+        if indexado and self._es_postgresql:
+            normalizado = normalizar_texto(termino)
+            if normalizado:
+                expr = expresion_trigram(entidad_tipo)
+                return (
+                    f"SELECT {pk} AS ID, -similarity({expr}, {ph}) AS RANGO "
+                    f"FROM {tabla} WHERE {expr} LIKE {ph}",
+                    [normalizado, f"%{normalizado}%"],
+                )
+
+        tokens = tokenizar_busqueda(termino)
+        if indexado and not self._es_postgresql and tokens:
+            fts = f"{tabla}_FTS"
+            consulta_fts = " ".join(f'"{t}"*' for t in tokens)
+            return (
+                f"SELECT rowid AS ID, bm25({fts}) AS RANGO FROM {fts} WHERE {fts} MATCH {ph}",
+                [consulta_fts],
+            )
+
+        # Degradación: LIKE sin índice
+        like = " OR ".join(f"{c} LIKE {ph}" for c in columnas)
+        return (
+            f"SELECT {pk} AS ID, 0 AS RANGO FROM {tabla} WHERE ({like})",
+            [f"%{termino}%"] * len(columnas),
+        )
+
+    def condicion(self, entidad_tipo: str, columna_id: str, termino: str) -> Tuple[str, List[Any]]:
+        """
+        Condición WHERE para filtrar una consulta por búsqueda de texto.
+
+        Args:
+            entidad_tipo: 'PERSONA' o 'PROPIEDAD'
+            columna_id: Columna (con alias) que referencia la entidad, ej. 'p.ID_PERSONA'
+            termino: Texto ingresado por el usuario
+
+        Returns:
+            Tupla (fragmento SQL, parámetros)
+
+        Example:
+            >>> sql, params = repo_busqueda.condicion("PERSONA", "per.ID_PERSONA", "perez")
+            >>> conditions.append(sql); query_params.extend(params)
+        """
+        subconsulta, params = self._subconsulta_coincidencias(entidad_tipo, termino)
+        return f"{columna_id} IN (SELECT ID FROM ({subconsulta}) coincidencias)", params
+
+    def buscar_global(self, termino: str, limite: int = 20) -> List[Dict[str, Any]]:
+        """
+        Busca en personas, propiedades y contratos en una sola consulta.
+
+        Los contratos coinciden a través de su propiedad o de su
+        arrendatario/propietario, y se ordenan junto con las demás entidades
+        por relevancia.
+
+        Args:
+            termino: Texto a buscar (insensible a tildes y mayúsculas)
+            limite: Máximo de resultados
+
+        Returns:
+            Lista de dicts {tipo, id, titulo, detalle, rango} ordenada por relevancia
+        """
+        if not termino or not termino.strip():
+            return []
+
+        ph = self._placeholder()
+        sub_per, params_per = self._subconsulta_coincidencias("PERSONA", termino)
+        sub_pro, params_pro = self._subconsulta_coincidencias("PROPIEDAD", termino)
+
+        # Los contratos heredan la mejor relevancia entre propiedad y persona,
+        # levemente penalizada para que la entidad directa aparezca primero.
+        rango_contrato = (
+            "CASE WHEN hpe.RANGO IS NULL THEN hpr.RANGO "
+            "WHEN hpr.RANGO IS NULL THEN hpe.RANGO "
+            "WHEN hpe.RANGO < hpr.RANGO THEN hpe.RANGO ELSE hpr.RANGO END * 0.9"
+        )
+
+        query = f"""
+            WITH hits_persona AS ({sub_per}),
+                 hits_propiedad AS ({sub_pro})
+            SELECT 'PERSONA' AS TIPO, per.ID_PERSONA AS ID,
+                   per.NOMBRE_COMPLETO AS TITULO, per.NUMERO_DOCUMENTO AS DETALLE,
+                   h.RANGO AS RANGO
+            FROM hits_persona h
+            JOIN PERSONAS per ON per.ID_PERSONA = h.ID
+            UNION ALL
+            SELECT 'PROPIEDAD', p.ID_PROPIEDAD,
+                   p.DIRECCION_PROPIEDAD, p.MATRICULA_INMOBILIARIA,
+                   h.RANGO
+            FROM hits_propiedad h
+            JOIN PROPIEDADES p ON p.ID_PROPIEDAD = h.ID
+            UNION ALL
+            SELECT 'CONTRATO_ARRENDAMIENTO', ca.ID_CONTRATO_A,
+                   p.DIRECCION_PROPIEDAD, per.NOMBRE_COMPLETO,
+                   {rango_contrato}
+            FROM CONTRATOS_ARRENDAMIENTOS ca
+            JOIN PROPIEDADES p ON ca.ID_PROPIEDAD = p.ID_PROPIEDAD
+            JOIN ARRENDATARIOS arr ON ca.ID_ARRENDATARIO = arr.ID_ARRENDATARIO
+            JOIN PERSONAS per ON arr.ID_PERSONA = per.ID_PERSONA
+            LEFT JOIN hits_propiedad hpr ON hpr.ID = p.ID_PROPIEDAD
+            LEFT JOIN hits_persona hpe ON hpe.ID = per.ID_PERSONA
+            WHERE hpr.ID IS NOT NULL OR hpe.ID IS NOT NULL
+            UNION ALL
+            SELECT 'CONTRATO_MANDATO', cm.ID_CONTRATO_M,
+                   p.DIRECCION_PROPIEDAD, per.NOMBRE_COMPLETO,
+                   {rango_contrato}
+            FROM CONTRATOS_MANDATOS cm
+            JOIN PROPIEDADES p ON cm.ID_PROPIEDAD = p.ID_PROPIEDAD
+            JOIN PROPIETARIOS prop ON cm.ID_PROPIETARIO = prop.ID_PROPIETARIO
+            JOIN PERSONAS per ON prop.ID_PERSONA = per.ID_PERSONA
+            LEFT JOIN hits_propiedad hpr ON hpr.ID = p.ID_PROPIEDAD
+            LEFT JOIN hits_persona hpe ON hpe.ID = per.ID_PERSONA
+            WHERE hpr.ID IS NOT NULL OR hpe.ID IS NOT NULL
+            ORDER BY RANGO, TIPO, ID
+            LIMIT {ph}
+        """
+
+        conn = self.db.obtener_conexion()
+        cursor = conn.cursor()
+        cursor.execute(query, params_per + params_pro + [limite])
+
+        return [
+            {
+                "tipo": row["TIPO"],
+                "id": row["ID"],
+                "titulo": row["TITULO"],
+                "detalle": row["DETALLE"],
+                "rango": float(row["RANGO"] or 0),
+            }
+            for row in cursor.fetchall()
+        ]
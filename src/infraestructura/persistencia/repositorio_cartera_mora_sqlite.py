@@ -0,0 +1,586 @@
+"""
+Repositorio de Persistencia: Cartera en Mora
+Libro de saldos por contrato de arrendamiento y período (CARTERA_MORA).
+
+Cada fila es el canon de un período con lo pagado y el saldo pendiente:
+- Los recaudos actualizan la fila de su período al registrarse, reversarse o
+  eliminarse (RepositorioRecaudoSQLite llama a `aplicar_pagos` dentro de su
+  propia transacción).
+- La causación diaria (`causar`) crea los cargos de los períodos nuevos y
+  recalcula días e interés de mora de todo el libro con una sola sentencia.
+  Si el libro aún no tiene cargos, la primera causación carga la historia
+  de los contratos activos.
+
+El dashboard y las alertas leen el libro en lugar de recalcular la vista
+VW_ALERTA_MORA_DIARIA; `verificar_consistencia` compara ambos.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.dominio.servicios.calculadora_mora import (
+    TASA_MORA_DIARIA,
+    fecha_vencimiento_periodo,
+    periodo_de,
+    periodos_entre,
+)
+from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.esquema import asegurar_esquema
+
+
+class RepositorioCarteraMoraSQLite:
+    """Repositorio del libro de cartera en mora (SQLite y PostgreSQL)."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        asegurar_esquema(db_manager, "CARTERA_MORA", self._ensure_tables)
+
+    def _ensure_tables(self):
+        """Crea el libro en SQLite (en PostgreSQL lo crea la migración)."""
+        if self.db.use_postgresql:
+            return
+        with self.db.transaccion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS CARTERA_MORA (
+                    ID_CONTRATO_A INTEGER NOT NULL,
+                    PERIODO TEXT NOT NULL,
+                    FECHA_VENCIMIENTO TEXT NOT NULL,
+                    VALOR_CANON INTEGER NOT NULL,
+                    VALOR_PAGADO INTEGER NOT NULL DEFAULT 0,
+                    SALDO INTEGER NOT NULL,
+                    DIAS_MORA INTEGER NOT NULL DEFAULT 0,
+                    INTERES_MORA INTEGER NOT NULL DEFAULT 0,
+                    FECHA_CORTE TEXT,
+                    CAUSADO INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (ID_CONTRATO_A, PERIODO)
+                )
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_cartera_mora_en_mora
+                ON CARTERA_MORA (DIAS_MORA, SALDO) WHERE DIAS_MORA > 0
+            """
+            )
+
+    # ------------------------------------------------------------------
+    # SQL según motor
+    # ------------------------------------------------------------------
+
+    def _dias_desde_vencimiento(self, corte: str) -> str:
+        """Expresión: días entre FECHA_VENCIMIENTO y `corte` (parámetro o columna)."""
+        if self.db.use_postgresql:
+            return f"(CAST({corte} AS DATE) - CAST(FECHA_VENCIMIENTO AS DATE))"
+        return f"CAST(julianday({corte}) - julianday(FECHA_VENCIMIENTO) AS INTEGER)"
+
+    def _truncar(self, expresion: str) -> str:
+        """CAST a entero truncando (PostgreSQL redondea en el CAST)."""
+        if self.db.use_postgresql:
+            return f"CAST(FLOOR({expresion}) AS BIGINT)"
+        return f"CAST({expresion} AS INTEGER)"
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    def _pagado_en_fuente(
+        self, cursor, id_contrato: int, periodos: Sequence[str]
+    ) -> Dict[str, int]:
+        """Canon pagado por período según RECAUDO_CONCEPTOS (recaudos no reversados)."""
+        placeholder = self.db.get_placeholder()
+        cursor.execute(
+            f"""
+            SELECT rc.PERIODO, SUM(rc.VALOR) AS PAGADO
+            FROM RECAUDO_CONCEPTOS rc
+            JOIN RECAUDOS r ON r.ID_RECAUDO = rc.ID_RECAUDO
+            WHERE r.ID_CONTRATO_A = {placeholder}
+            AND r.ESTADO_RECAUDO != 'Reversado'
+            AND rc.TIPO_CONCEPTO = 'Canon'
+            AND rc.PERIODO IN ({", ".join([placeholder] * len(periodos))})
+            GROUP BY rc.PERIODO
+            """,
+            (id_contrato, *periodos),
+        )
+        return {row["PERIODO"]: int(row["PAGADO"] or 0) for row in cursor.fetchall()}
+
+    def aplicar_pagos(
+        self, conn, id_contrato: int, pagos: Iterable[Tuple[str, int]], signo: int = 1
+    ) -> None:
+        """
+        Suma (signo=1) o resta (signo=-1) pagos de canon a las filas del libro.
+
+        Se ejecuta en la conexión del llamador, dentro de su transacción. Un
+        pago de un período sin fila (anticipado o anterior al libro) crea la
+        fila con todo lo pagado en RECAUDO_CONCEPTOS para ese período.
+
+        Args:
+            pagos: Pares (periodo 'YYYY-MM', valor)
+        """
+        por_periodo: Dict[str, int] = {}
+        for periodo, valor in pagos:
+            por_periodo[periodo] = por_periodo.get(periodo, 0) + int(valor)
+        if not por_periodo:
+            return
+        placeholder = self.db.get_placeholder()
+        periodos = sorted(por_periodo)
+        cursor = self.db.get_dict_cursor(conn)
+
+        cursor.execute(
+            f"""
+            SELECT PERIODO FROM CARTERA_MORA
+            WHERE ID_CONTRATO_A = {placeholder}
+            AND PERIODO IN ({", ".join([placeholder] * len(periodos))})
+            """,
+            (id_contrato, *periodos),
+        )
+        existentes = {row["PERIODO"] for row in cursor.fetchall()}
+
+        # Filas existentes: ajuste incremental
+        cursor.executemany(
+            f"""
+            UPDATE CARTERA_MORA SET
+                VALOR_PAGADO = VALOR_PAGADO + {placeholder},
+                SALDO = VALOR_CANON - (VALOR_PAGADO + {placeholder})
+            WHERE ID_CONTRATO_A = {placeholder} AND PERIODO = {placeholder}
+            """,
+            [
+                (signo * por_periodo[p], signo * por_periodo[p], id_contrato, p)
+                for p in periodos
+                if p in existentes
+            ],
+        )
+
+        # Filas nuevas: solo al registrar (una reversa sin fila no tiene nada que deshacer)
+        nuevos = [p for p in periodos if p not in existentes]
+        if nuevos and signo > 0:
+            cursor.execute(
+                f"""
+                SELECT CANON_ARRENDAMIENTO, FECHA_INICIO_CONTRATO_A
+                FROM CONTRATOS_ARRENDAMIENTOS WHERE ID_CONTRATO_A = {placeholder}
+                """,
+                (id_contrato,),
+            )
+            contrato = cursor.fetchone()
+            if contrato:
+                canon = int(contrato["CANON_ARRENDAMIENTO"] or 0)
+                inicio = contrato["FECHA_INICIO_CONTRATO_A"]
+                pagado = self._pagado_en_fuente(cursor, id_contrato, nuevos)
+                cursor.executemany(
+                    f"""
+                    INSERT INTO CARTERA_MORA (
+                        ID_CONTRATO_A, PERIODO, FECHA_VENCIMIENTO, VALOR_CANON, VALOR_PAGADO,
+                        SALDO
+                    ) VALUES ({", ".join([placeholder] * 6)})
+                    """,
+                    [
+                        (
+                            id_contrato,
+                            p,
+                            fecha_vencimiento_periodo(inicio, p),
+                            canon,
+                            pagado.get(p, 0),
+                            canon - pagado.get(p, 0),
+                        )
+                        for p in nuevos
+                    ],
+                )
+
+        # Días e interés a la fecha de la última causación (un pago los anula;
+        # una reversa puede devolver a mora un período ya causado)
+        self._recalcular_mora(cursor, None, id_contrato)
+
+    def aplicar_pagos_lote(self, conn, pagos: Iterable[Tuple[int, str, int]]) -> None:
+        """
+        aplicar_pagos de muchos contratos a la vez (generación masiva de cargos).
+
+        Deja el libro igual que llamarlo contrato por contrato, pero con un
+        número fijo de sentencias: UPDATE en lote de las filas existentes,
+        INSERT de las nuevas y un solo recálculo de mora de los períodos.
+
+        Args:
+            pagos: Triplas (id_contrato, periodo 'YYYY-MM', valor)
+        """
+        por_clave: Dict[Tuple[int, str], int] = {}
+        for id_contrato, periodo, valor in pagos:
+            por_clave[(id_contrato, periodo)] = por_clave.get((id_contrato, periodo), 0) + int(valor)
+        if not por_clave:
+            return
+        placeholder = self.db.get_placeholder()
+        periodos = sorted({periodo for _, periodo in por_clave})
+        en_periodos = f"IN ({', '.join([placeholder] * len(periodos))})"
+        cursor = self.db.get_dict_cursor(conn)
+
+        cursor.execute(
+            f"SELECT ID_CONTRATO_A, PERIODO FROM CARTERA_MORA WHERE PERIODO {en_periodos}",
+            periodos,
+        )
+        existentes = {(row["ID_CONTRATO_A"], row["PERIODO"]) for row in cursor.fetchall()}
+
+        cursor.executemany(
+            f"""
+            UPDATE CARTERA_MORA SET
+                VALOR_PAGADO = VALOR_PAGADO + {placeholder},
+                SALDO = VALOR_CANON - (VALOR_PAGADO + {placeholder})
+            WHERE ID_CONTRATO_A = {placeholder} AND PERIODO = {placeholder}
+            """,
+            [(v, v, c, p) for (c, p), v in por_clave.items() if (c, p) in existentes],
+        )
+
+        nuevos = [clave for clave in por_clave if clave not in existentes]
+        if nuevos:
+            contratos: Dict[int, Any] = {}
+            ids = sorted({c for c, _ in nuevos})
+            for i in range(0, len(ids), 500):
+                bloque = ids[i : i + 500]
+                cursor.execute(
+                    f"""
+                    SELECT ID_CONTRATO_A, CANON_ARRENDAMIENTO, FECHA_INICIO_CONTRATO_A
+                    FROM CONTRATOS_ARRENDAMIENTOS
+                    WHERE ID_CONTRATO_A IN ({", ".join([placeholder] * len(bloque))})
+                    """,
+                    bloque,
+                )
+                contratos.update({row["ID_CONTRATO_A"]: row for row in cursor.fetchall()})
+            cursor.execute(
+                f"""
+                SELECT r.ID_CONTRATO_A, rc.PERIODO, SUM(rc.VALOR) AS PAGADO
+                FROM RECAUDO_CONCEPTOS rc
+                JOIN RECAUDOS r ON r.ID_RECAUDO = rc.ID_RECAUDO
+                WHERE r.ESTADO_RECAUDO != 'Reversado'
+                AND rc.TIPO_CONCEPTO = 'Canon'
+                AND rc.PERIODO {en_periodos}
+                GROUP BY r.ID_CONTRATO_A, rc.PERIODO
+                """,
+                periodos,
+            )
+            pagado = {
+                (row["ID_CONTRATO_A"], row["PERIODO"]): int(row["PAGADO"] or 0)
+                for row in cursor.fetchall()
+            }
+            filas = []
+            for id_contrato, periodo in nuevos:
+                contrato = contratos.get(id_contrato)
+                if not contrato:
+                    continue
+                canon = int(contrato["CANON_ARRENDAMIENTO"] or 0)
+                valor = pagado.get((id_contrato, periodo), 0)
+                filas.append(
+                    (
+                        id_contrato,
+                        periodo,
+                        fecha_vencimiento_periodo(contrato["FECHA_INICIO_CONTRATO_A"], periodo),
+                        canon,
+                        valor,
+                        canon - valor,
+                    )
+                )
+            cursor.executemany(
+                f"""
+                INSERT INTO CARTERA_MORA (
+                    ID_CONTRATO_A, PERIODO, FECHA_VENCIMIENTO, VALOR_CANON, VALOR_PAGADO, SALDO
+                ) VALUES ({", ".join([placeholder] * 6)})
+                """,
+                filas,
+            )
+
+        self._recalcular_mora(cursor, None, periodos=periodos)
+
+    def _crear_cargos(self, cursor, fecha_corte: str, inicio_libro: Optional[str] = None) -> int:
+        """
+        Crea los cargos de los períodos vencidos hasta `fecha_corte` que faltan.
+
+        Por contrato, parte del período siguiente al último ya causado (o del
+        inicio del libro, si el contrato aún no tiene cargos) para no generar
+        historia anterior a la puesta en marcha del libro. Con el libro sin
+        cargos (primera causación tras el despliegue) se carga la historia de
+        cada contrato desde su inicio, como en `reconstruir`. Las filas creadas
+        antes por un pago se marcan como causadas sin tocar lo pagado.
+        """
+        placeholder = self.db.get_placeholder()
+        periodo_corte = periodo_de(fecha_corte)
+
+        if inicio_libro is None:
+            cursor.execute("SELECT MIN(PERIODO) AS INICIO FROM CARTERA_MORA WHERE CAUSADO = 1")
+            inicio_libro = cursor.fetchone()["INICIO"] or ""
+
+        cursor.execute(
+            f"""
+            SELECT ca.ID_CONTRATO_A, ca.CANON_ARRENDAMIENTO, ca.FECHA_INICIO_CONTRATO_A,
+                   ca.FECHA_FIN_CONTRATO_A, MAX(cm.PERIODO) AS ULTIMO_PERIODO
+            FROM CONTRATOS_ARRENDAMIENTOS ca
+            LEFT JOIN CARTERA_MORA cm
+                ON cm.ID_CONTRATO_A = ca.ID_CONTRATO_A AND cm.CAUSADO = 1
+            WHERE ca.ESTADO_CONTRATO_A = 'Activo'
+            AND ca.FECHA_INICIO_CONTRATO_A <= {placeholder}
+            GROUP BY ca.ID_CONTRATO_A, ca.CANON_ARRENDAMIENTO, ca.FECHA_INICIO_CONTRATO_A,
+                     ca.FECHA_FIN_CONTRATO_A
+            """,
+            (fecha_corte,),
+        )
+
+        cargos: List[Tuple] = []
+        for row in cursor.fetchall():
+            inicio = str(row["FECHA_INICIO_CONTRATO_A"])[:10]
+            ultimo = row["ULTIMO_PERIODO"]
+            desde = max(periodo_de(inicio), inicio_libro, ultimo or "")
+            hasta = periodo_corte
+            if row["FECHA_FIN_CONTRATO_A"]:
+                hasta = min(hasta, periodo_de(row["FECHA_FIN_CONTRATO_A"]))
+            canon = int(row["CANON_ARRENDAMIENTO"] or 0)
+            for periodo in periodos_entre(desde, hasta):
+                if periodo == ultimo:
+                    continue
+                vencimiento = fecha_vencimiento_periodo(inicio, periodo)
+                if vencimiento <= fecha_corte:
+                    cargos.append((row["ID_CONTRATO_A"], periodo, vencimiento, canon))
+
+        if not cargos:
+            return 0
+
+        # Lo ya pagado de esos períodos (pagos anticipados registrados antes del cargo)
+        pagados: Dict[Tuple[int, str], int] = {}
+        desde_periodo = min(c[1] for c in cargos)
+        cursor.execute(
+            f"""
+            SELECT r.ID_CONTRATO_A, rc.PERIODO, SUM(rc.VALOR) AS PAGADO
+            FROM RECAUDO_CONCEPTOS rc
+            JOIN RECAUDOS r ON r.ID_RECAUDO = rc.ID_RECAUDO
+            WHERE r.ESTADO_RECAUDO != 'Reversado' AND rc.TIPO_CONCEPTO = 'Canon'
+            AND rc.PERIODO >= {placeholder}
+            GROUP BY r.ID_CONTRATO_A, rc.PERIODO
+            """,
+            (desde_periodo,),
+        )
+        for row in cursor.fetchall():
+            pagados[(row["ID_CONTRATO_A"], row["PERIODO"])] = int(row["PAGADO"] or 0)
+
+        cursor.executemany(
+            f"""
+            INSERT INTO CARTERA_MORA (
+                ID_CONTRATO_A, PERIODO, FECHA_VENCIMIENTO, VALOR_CANON, VALOR_PAGADO, SALDO,
+                CAUSADO
+            ) VALUES ({", ".join([placeholder] * 6)}, 1)
+            ON CONFLICT (ID_CONTRATO_A, PERIODO) DO UPDATE SET CAUSADO = 1
+            """,
+            [
+                (
+                    id_contrato,
+                    periodo,
+                    vencimiento,
+                    canon,
+                    pagados.get((id_contrato, periodo), 0),
+                    canon - pagados.get((id_contrato, periodo), 0),
+                )
+                for id_contrato, periodo, vencimiento, canon in cargos
+            ],
+        )
+        return len(cargos)
+
+    def _recalcular_mora(
+        self,
+        cursor,
+        fecha_corte: Optional[str],
+        id_contrato: Optional[int] = None,
+        periodos: Optional[Sequence[str]] = None,
+    ) -> int:
+        """
+        Días e interés de mora de todo el libro (o de un contrato o unos períodos)
+        en una sentencia.
+
+        Sin `fecha_corte`, cada fila se recalcula a su propia FECHA_CORTE (la
+        de la última causación), como tras un pago o una reversa.
+        """
+        placeholder = self.db.get_placeholder()
+        corte, params = "FECHA_CORTE", []
+        if fecha_corte is not None:
+            corte, params = placeholder, [fecha_corte] * 5
+        filtro = ""
+        if id_contrato is not None:
+            filtro = f"AND ID_CONTRATO_A = {placeholder}"
+            params.append(id_contrato)
+        if periodos:
+            filtro += f" AND PERIODO IN ({', '.join([placeholder] * len(periodos))})"
+            params.extend(periodos)
+        dias = self._dias_desde_vencimiento(corte)
+        en_mora = f"SALDO > 0 AND FECHA_VENCIMIENTO < {corte}"
+        interes = self._truncar(f"SALDO * {TASA_MORA_DIARIA!r} * {dias}")
+        cursor.execute(
+            f"""
+            UPDATE CARTERA_MORA SET
+                DIAS_MORA = CASE WHEN {en_mora} THEN {dias} ELSE 0 END,
+                INTERES_MORA = CASE WHEN {en_mora} THEN {interes} ELSE 0 END,
+                FECHA_CORTE = {corte}
+            WHERE (SALDO > 0 OR DIAS_MORA > 0) {filtro}
+            """,
+            params,
+        )
+        return cursor.rowcount
+
+    def causar(self, fecha_corte: Optional[str] = None) -> Dict[str, int]:
+        """
+        Causación diaria: cargos de períodos nuevos y mora de todo el libro.
+
+        Returns:
+            Dict con cargos_creados y filas_actualizadas
+        """
+        fecha_corte = fecha_corte or date.today().isoformat()
+        with self.db.transaccion() as conn:
+            cursor = self.db.get_dict_cursor(conn)
+            cargos = self._crear_cargos(cursor, fecha_corte)
+            filas = self._recalcular_mora(cursor, fecha_corte)
+        return {"cargos_creados": cargos, "filas_actualizadas": filas}
+
+    def reconstruir(
+        self, fecha_corte: Optional[str] = None, desde_periodo: Optional[str] = None
+    ) -> int:
+        """
+        Reconstruye el libro desde cero a partir de contratos y recaudos.
+
+        Args:
+            desde_periodo: Primer período del libro (por defecto el de inicio
+                de cada contrato)
+
+        Returns:
+            Cargos creados
+        """
+        fecha_corte = fecha_corte or date.today().isoformat()
+        with self.db.transaccion() as conn:
+            cursor = self.db.get_dict_cursor(conn)
+            cursor.execute("DELETE FROM CARTERA_MORA")
+            creadas = self._crear_cargos(cursor, fecha_corte, inicio_libro=desde_periodo or "")
+            self._recalcular_mora(cursor, fecha_corte)
+        return creadas
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    def obtener_resumen(self) -> Dict[str, int]:
+        """Saldo total en mora y número de contratos con saldo vencido."""
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(
+            """
+            SELECT COUNT(DISTINCT ID_CONTRATO_A) AS CANTIDAD, SUM(SALDO) AS MONTO_TOTAL,
+                   SUM(INTERES_MORA) AS INTERES_TOTAL
+            FROM CARTERA_MORA WHERE DIAS_MORA > 0
+            """
+        )
+        row = cursor.fetchone()
+        return {
+            "monto_total": row["MONTO_TOTAL"] or 0,
+            "cantidad_contratos": row["CANTIDAD"] or 0,
+            "interes_total": row["INTERES_TOTAL"] or 0,
+        }
+
+    def listar_contratos_en_mora(self, limite: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Contratos con saldo vencido, de mayor a menor antigüedad de la deuda."""
+        placeholder = self.db.get_placeholder()
+        limit_sql, params = "", []
+        if limite:
+            limit_sql, params = f"LIMIT {placeholder}", [limite]
+
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(
+            f"""
+            SELECT cm.ID_CONTRATO_A, per.NOMBRE_COMPLETO AS ARRENDATARIO,
+                   p.DIRECCION_PROPIEDAD, MAX(cm.DIAS_MORA) AS DIAS_MORA,
+                   SUM(cm.SALDO) AS SALDO, SUM(cm.INTERES_MORA) AS INTERES_MORA,
+                   MIN(cm.FECHA_VENCIMIENTO) AS FECHA_VENCIMIENTO
+            FROM CARTERA_MORA cm
+            JOIN CONTRATOS_ARRENDAMIENTOS ca ON cm.ID_CONTRATO_A = ca.ID_CONTRATO_A
+            JOIN PROPIEDADES p ON ca.ID_PROPIEDAD = p.ID_PROPIEDAD
+            LEFT JOIN ARRENDATARIOS arr ON ca.ID_ARRENDATARIO = arr.ID_ARRENDATARIO
+            LEFT JOIN PERSONAS per ON arr.ID_PERSONA = per.ID_PERSONA
+            WHERE cm.DIAS_MORA > 0
+            GROUP BY cm.ID_CONTRATO_A, per.NOMBRE_COMPLETO, p.DIRECCION_PROPIEDAD
+            ORDER BY DIAS_MORA DESC, SALDO DESC
+            {limit_sql}
+            """,
+            params,
+        )
+        return [
+            {
+                "id_contrato": row["ID_CONTRATO_A"],
+                "nombre": row["ARRENDATARIO"],
+                "direccion": row["DIRECCION_PROPIEDAD"],
+                "dias_retraso": row["DIAS_MORA"],
+                "monto": row["SALDO"],
+                "interes": row["INTERES_MORA"],
+                "fecha_vencimiento": row["FECHA_VENCIMIENTO"],
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def obtener_morosidad_por_zona(self, limite: int = 10) -> List[Dict[str, Any]]:
+        """Saldo en mora por municipio."""
+        placeholder = self.db.get_placeholder()
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(
+            f"""
+            SELECT m.NOMBRE_MUNICIPIO, COUNT(DISTINCT cm.ID_CONTRATO_A) AS CONTRATOS_MORA,
+                   SUM(cm.SALDO) AS MONTO_TOTAL
+            FROM CARTERA_MORA cm
+            JOIN CONTRATOS_ARRENDAMIENTOS ca ON cm.ID_CONTRATO_A = ca.ID_CONTRATO_A
+            JOIN PROPIEDADES p ON ca.ID_PROPIEDAD = p.ID_PROPIEDAD
+            JOIN MUNICIPIOS m ON p.ID_MUNICIPIO = m.ID_MUNICIPIO
+            WHERE cm.DIAS_MORA > 0
+            GROUP BY m.NOMBRE_MUNICIPIO
+            ORDER BY MONTO_TOTAL DESC
+            LIMIT {placeholder}
+            """,
+            (limite,),
+        )
+        return [
+            {
+                "zona": row["NOMBRE_MUNICIPIO"],
+                "contratos": row["CONTRATOS_MORA"],
+                "monto": row["MONTO_TOTAL"],
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def verificar_consistencia(self) -> Dict[str, Any]:
+        """
+        Compara el saldo vencido por contrato del libro con VW_ALERTA_MORA_DIARIA.
+
+        Returns:
+            Dict con consistente (bool), contratos revisados y la lista de
+            diferencias {id_contrato, saldo_vista, saldo_libro}
+        """
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(
+            """
+            SELECT ID_CONTRATO_A, SUM(VALOR_RECAUDO) AS SALDO
+            FROM VW_ALERTA_MORA_DIARIA GROUP BY ID_CONTRATO_A
+            """
+        )
+        vista = {row["ID_CONTRATO_A"]: int(row["SALDO"] or 0) for row in cursor.fetchall()}
+        cursor.execute(
+            """
+            SELECT ID_CONTRATO_A, SUM(SALDO) AS SALDO
+            FROM CARTERA_MORA WHERE DIAS_MORA > 0 GROUP BY ID_CONTRATO_A
+            """
+        )
+        libro = {row["ID_CONTRATO_A"]: int(row["SALDO"] or 0) for row in cursor.fetchall()}
+
+        diferencias = [
+            {
+                "id_contrato": id_contrato,
+                "saldo_vista": vista.get(id_contrato, 0),
+                "saldo_libro": libro.get(id_contrato, 0),
+            }
+            for id_contrato in sorted(set(vista) | set(libro))
+            if vista.get(id_contrato, 0) != libro.get(id_contrato, 0)
+        ]
+        return {
+            "consistente": not diferencias,
+            "contratos_revisados": len(set(vista) | set(libro)),
+            "diferencias": diferencias,
+            "verificado_en": datetime.now().isoformat(timespec="seconds"),
+        }
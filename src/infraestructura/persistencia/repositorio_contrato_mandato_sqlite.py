@@ -8,11 +8,14 @@ from typing import Any, Dict, List, Optional
 from src.dominio.entidades.contrato_mandato import ContratoMandato
 from src.dominio.modelos.pagination import PaginatedResult, PaginationParams
 from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.paginacion_sql import condicion_keyset, contar_total
+from src.infraestructura.persistencia.repositorio_busqueda_sqlite import RepositorioBusquedaSQLite
 
 
 class RepositorioContratoMandatoSQLite:
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        self.busqueda = RepositorioBusquedaSQLite(db_manager)
 
     def crear(self, contrato: ContratoMandato, usuario: str) -> ContratoMandato:
         conn = self.db.obtener_conexion()
@@ -96,12 +99,16 @@ class RepositorioContratoMandatoSQLite:
         estado: Optional[str] = None,
         busqueda: Optional[str] = None,
         id_asesor: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count_strategy: str = "exact",
     ) -> PaginatedResult:
         """Lista contratos de mandato con paginación y filtros."""
-        params = PaginationParams(page=page, page_size=page_size)
+        params = PaginationParams(
+            page=page, page_size=page_size, cursor=cursor, count_strategy=count_strategy
+        )
 
         with self.db.obtener_conexion() as conn:
-            cursor = self.db.get_dict_cursor(conn)
+            db_cursor = self.db.get_dict_cursor(conn)
             placeholder = self.db.get_placeholder()
 
             base_from = """
@@ -124,13 +131,18 @@ class RepositorioContratoMandatoSQLite:
                     query_params.append(estado)
 
             if busqueda:
-                conditions.append(
-                    f"(p.DIRECCION_PROPIEDAD LIKE {placeholder} OR "
-                    f"per.NOMBRE_COMPLETO LIKE {placeholder} OR "
-                    f"per.NUMERO_DOCUMENTO LIKE {placeholder})"
+                cond_propiedad, params_propiedad = self.busqueda.condicion(
+                    "PROPIEDAD", "p.ID_PROPIEDAD", busqueda
+                )
+                cond_persona, params_persona = self.busqueda.condicion(
+                    "PERSONA", "per.ID_PERSONA", busqueda
                 )
-                term = f"%{busqueda}%"
-                query_params.extend([term, term, term])
+                alternativas = [cond_propiedad, cond_persona]
+                query_params.extend(params_propiedad + params_persona)
+                if busqueda.strip().isdigit():
+                    alternativas.append(f"cm.ID_CONTRATO_M = {placeholder}")
+                    query_params.append(int(busqueda.strip()))
+                conditions.append("(" + " OR ".join(alternativas) + ")")
 
             if id_asesor:
                 conditions.append(f"cm.ID_ASESOR = {placeholder}")
@@ -138,10 +150,24 @@ class RepositorioContratoMandatoSQLite:
 
             where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
 
-            # 1. Count
-            count_query = f"SELECT COUNT(*) as TOTAL {base_from} {where_clause}"
-            cursor.execute(count_query, query_params)
-            total = cursor.fetchone()["TOTAL"]
+            # 1. Count (según estrategia: exacto, cacheado o estimado)
+            total, _ = contar_total(
+                self.db,
+                f"{base_from} {where_clause}",
+                query_params,
+                params.count_strategy,
+                params.count_ttl,
+                tabla_base="CONTRATOS_MANDATOS",
+            )
+
+            # Keyset: continuar después del último ID entregado
+            if params.uses_cursor:
+                seek, seek_params = condicion_keyset(
+                    ["cm.ID_CONTRATO_M"], params.cursor_values, placeholder
+                )
+                conditions.append(seek)
+                query_params = query_params + seek_params
+                where_clause = " WHERE " + " AND ".join(conditions)
 
             # 2. Data
             data_query = f"""
@@ -161,7 +187,7 @@ class RepositorioContratoMandatoSQLite:
                 LIMIT {placeholder} OFFSET {placeholder}
             """
 
-            cursor.execute(data_query, query_params + [params.page_size, params.offset])
+            db_cursor.execute(data_query, query_params + [params.page_size + 1, params.offset])
 
             items = [
                 {
@@ -175,12 +201,10 @@ class RepositorioContratoMandatoSQLite:
                     "propietario": row["PROPIETARIO"],
                     "documento_propietario": row["NUMERO_DOCUMENTO"],
                 }
-                for row in cursor.fetchall()
+                for row in db_cursor.fetchall()
             ]
 
-            return PaginatedResult(
-                items=items, total=total, page=params.page, page_size=params.page_size
-            )
+            return PaginatedResult.from_lookahead(items, total, params, lambda c: [c["id"]])
 
     def actualizar(self, contrato: ContratoMandato, usuario: str) -> None:
         conn = self.db.obtener_conexion()
@@ -0,0 +1,233 @@
+"""
+Repositorio de lectura: Contratos unificados (Mandatos + Arrendamientos).
+
+Un solo `UNION ALL` con columnas normalizadas para listar ambos tipos con los
+mismos filtros, un orden global, paginación keyset y un único conteo. Lo usan
+la vista "Todos" de contratos y la exportación CSV.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.dominio.modelos.pagination import PaginatedResult, PaginationParams
+from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.paginacion_sql import condicion_keyset, contar_total
+from src.infraestructura.persistencia.repositorio_busqueda_sqlite import RepositorioBusquedaSQLite
+
+TIPOS_CONTRATO = ("Mandato", "Arrendamiento")
+
+# Orden global: más recientes primero; TIPO e ID desempatan (los IDs se repiten entre tipos)
+COLUMNAS_ORDEN = ["c.FECHA_INICIO", "c.TIPO", "c.ID"]
+
+_RAMAS = {
+    "Mandato": {
+        "alias": "cm",
+        "id": "cm.ID_CONTRATO_M",
+        "estado": "cm.ESTADO_CONTRATO_M",
+        "asesor": "cm.ID_ASESOR = {placeholder}",
+        "select": """
+            SELECT
+                'Mandato' AS TIPO,
+                cm.ID_CONTRATO_M AS ID,
+                cm.ESTADO_CONTRATO_M AS ESTADO,
+                cm.CANON_MANDATO AS CANON,
+                cm.FECHA_INICIO_CONTRATO_M AS FECHA_INICIO,
+                cm.FECHA_FIN_CONTRATO_M AS FECHA_FIN,
+                p.DIRECCION_PROPIEDAD AS PROPIEDAD,
+                p.TIPO_PROPIEDAD AS TIPO_PROPIEDAD,
+                per.NOMBRE_COMPLETO AS PERSONA,
+                per.NUMERO_DOCUMENTO AS DOCUMENTO
+            FROM CONTRATOS_MANDATOS cm
+            JOIN PROPIEDADES p ON cm.ID_PROPIEDAD = p.ID_PROPIEDAD
+            JOIN PROPIETARIOS prop ON cm.ID_PROPIETARIO = prop.ID_PROPIETARIO
+            JOIN PERSONAS per ON prop.ID_PERSONA = per.ID_PERSONA
+        """,
+    },
+    "Arrendamiento": {
+        "alias": "ca",
+        "id": "ca.ID_CONTRATO_A",
+        "estado": "ca.ESTADO_CONTRATO_A",
+        # El arrendamiento no tiene asesor: es el del mandato de la propiedad
+        "asesor": (
+            "EXISTS (SELECT 1 FROM CONTRATOS_MANDATOS cm "
+            "WHERE cm.ID_PROPIEDAD = ca.ID_PROPIEDAD AND cm.ID_ASESOR = {placeholder})"
+        ),
+        "select": """
+            SELECT
+                'Arrendamiento' AS TIPO,
+                ca.ID_CONTRATO_A AS ID,
+                ca.ESTADO_CONTRATO_A AS ESTADO,
+                ca.CANON_ARRENDAMIENTO AS CANON,
+                ca.FECHA_INICIO_CONTRATO_A AS FECHA_INICIO,
+                ca.FECHA_FIN_CONTRATO_A AS FECHA_FIN,
+                p.DIRECCION_PROPIEDAD AS PROPIEDAD,
+                p.TIPO_PROPIEDAD AS TIPO_PROPIEDAD,
+                per.NOMBRE_COMPLETO AS PERSONA,
+                per.NUMERO_DOCUMENTO AS DOCUMENTO
+            FROM CONTRATOS_ARRENDAMIENTOS ca
+            JOIN PROPIEDADES p ON ca.ID_PROPIEDAD = p.ID_PROPIEDAD
+            JOIN ARRENDATARIOS arr ON ca.ID_ARRENDATARIO = arr.ID_ARRENDATARIO
+            JOIN PERSONAS per ON arr.ID_PERSONA = per.ID_PERSONA
+        """,
+    },
+}
+
+
+class RepositorioContratosUnificadoSQLite:
+    """Read model de contratos sobre ambas tablas."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        self.busqueda = RepositorioBusquedaSQLite(db_manager)
+
+    def _rama(
+        self,
+        tipo: str,
+        estado: Optional[str],
+        busqueda: Optional[str],
+        id_asesor: Optional[str],
+        placeholder: str,
+    ) -> Tuple[str, List[Any]]:
+        """SELECT de un tipo con los filtros aplicados dentro de la rama (usa sus índices)."""
+        rama = _RAMAS[tipo]
+        conditions = []
+        params: List[Any] = []
+
+        if estado and estado != "Todos":
+            if estado == "Activo":
+                conditions.append(f"{rama['estado']} = 'Activo'")
+            elif estado == "Cancelado":
+                conditions.append(f"{rama['estado']} != 'Activo'")
+            else:
+                conditions.append(f"{rama['estado']} = {placeholder}")
+                params.append(estado)
+
+        if busqueda:
+            cond_propiedad, params_propiedad = self.busqueda.condicion(
+                "PROPIEDAD", "p.ID_PROPIEDAD", busqueda
+            )
+            cond_persona, params_persona = self.busqueda.condicion(
+                "PERSONA", "per.ID_PERSONA", busqueda
+            )
+            alternativas = [cond_propiedad, cond_persona]
+            params.extend(params_propiedad + params_persona)
+            if busqueda.strip().isdigit():
+                alternativas.append(f"{rama['id']} = {placeholder}")
+                params.append(int(busqueda.strip()))
+            conditions.append("(" + " OR ".join(alternativas) + ")")
+
+        if id_asesor:
+            conditions.append(rama["asesor"].format(placeholder=placeholder))
+            params.append(int(id_asesor))
+
+        where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return f"{rama['select']} {where_clause}", params
+
+    def _union(
+        self,
+        tipo: str = "Todos",
+        estado: Optional[str] = None,
+        busqueda: Optional[str] = None,
+        id_asesor: Optional[str] = None,
+    ) -> Tuple[str, List[Any]]:
+        """`FROM (<rama> UNION ALL <rama>) c` para los tipos solicitados."""
+        placeholder = self.db.get_placeholder()
+        tipos = [tipo] if tipo in TIPOS_CONTRATO else list(TIPOS_CONTRATO)
+
+        ramas, params = [], []
+        for t in tipos:
+            sql, rama_params = self._rama(t, estado, busqueda, id_asesor, placeholder)
+            ramas.append(sql)
+            params.extend(rama_params)
+
+        return f"FROM ({' UNION ALL '.join(ramas)}) c", params
+
+    @staticmethod
+    def _mapear(row) -> Dict[str, Any]:
+        """Fila normalizada -> item de UI (mismas claves que los listados por tipo)."""
+        item = {
+            "tipo": row["TIPO"],
+            "id": row["ID"],
+            "estado": row["ESTADO"],
+            "canon": row["CANON"],
+            "fecha_inicio": row["FECHA_INICIO"],
+            "fecha_fin": row["FECHA_FIN"],
+            "propiedad": row["PROPIEDAD"],
+            "tipo_propiedad": row["TIPO_PROPIEDAD"],
+        }
+        if row["TIPO"] == "Mandato":
+            item["propietario"] = row["PERSONA"]
+            item["documento_propietario"] = row["DOCUMENTO"]
+        else:
+            item["arrendatario"] = row["PERSONA"]
+            item["documento_arrendatario"] = row["DOCUMENTO"]
+        return item
+
+    def listar_paginado(
+        self,
+        page: int = 1,
+        page_size: int = 25,
+        tipo: str = "Todos",
+        estado: Optional[str] = None,
+        busqueda: Optional[str] = None,
+        id_asesor: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count_strategy: str = "exact",
+    ) -> PaginatedResult:
+        """
+        Lista contratos de ambos tipos en un solo orden global.
+
+        Args:
+            tipo: 'Todos', 'Mandato' o 'Arrendamiento'
+            cursor: Cursor keyset de la página anterior (evita OFFSET profundo)
+            count_strategy: Estrategia de conteo ('exact', 'cached', 'estimate')
+        """
+        params = PaginationParams(
+            page=page, page_size=page_size, cursor=cursor, count_strategy=count_strategy
+        )
+        placeholder = self.db.get_placeholder()
+        from_union, query_params = self._union(tipo, estado, busqueda, id_asesor)
+
+        # 1. Un solo conteo sobre la unión
+        total, _ = contar_total(
+            self.db, from_union, query_params, params.count_strategy, params.count_ttl
+        )
+
+        where_clause = ""
+        if params.uses_cursor:
+            seek, seek_params = condicion_keyset(COLUMNAS_ORDEN, params.cursor_values, placeholder)
+            where_clause = f"WHERE {seek}"
+            query_params = query_params + seek_params
+
+        # 2. Página (page_size + 1 para saber si hay siguiente)
+        data_query = f"""
+            SELECT c.* {from_union}
+            {where_clause}
+            ORDER BY {", ".join(f"{col} DESC" for col in COLUMNAS_ORDEN)}
+            LIMIT {placeholder} OFFSET {placeholder}
+        """
+        with self.db.obtener_conexion() as conn:
+            db_cursor = self.db.get_dict_cursor(conn)
+            db_cursor.execute(data_query, query_params + [params.page_size + 1, params.offset])
+            items = [self._mapear(row) for row in db_cursor.fetchall()]
+
+        return PaginatedResult.from_lookahead(
+            items, total, params, lambda c: [c["fecha_inicio"], c["tipo"], c["id"]]
+        )
+
+    def listar_todos(
+        self,
+        tipo: str = "Todos",
+        estado: Optional[str] = None,
+        busqueda: Optional[str] = None,
+        id_asesor: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Mismo listado sin paginar (exportación)."""
+        from_union, query_params = self._union(tipo, estado, busqueda, id_asesor)
+        query = f"""
+            SELECT c.* {from_union}
+            ORDER BY {", ".join(f"{col} DESC" for col in COLUMNAS_ORDEN)}
+        """
+        with self.db.obtener_conexion() as conn:
+            db_cursor = self.db.get_dict_cursor(conn)
+            db_cursor.execute(query, query_params)
+            return [self._mapear(row) for row in db_cursor.fetchall()]
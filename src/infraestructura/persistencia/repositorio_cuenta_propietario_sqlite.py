@@ -0,0 +1,661 @@
+"""
+Repositorio de Persistencia: Cuenta Corriente del Propietario
+Libro de movimientos con saldo acumulado (MOVIMIENTOS_CUENTA_PROPIETARIO).
+
+El saldo es lo que la inmobiliaria le debe al propietario:
+- Liquidación generada: crédito por el neto a pagar, con el desglose por
+  inmueble (el estado de cuenta del período se lee de estas filas).
+- Liquidación modificada o cancelada: la fila original se marca ANULADO y se
+  registra el débito que la compensa.
+- Liquidación pagada: débito por el neto.
+- Saldo a favor registrado: crédito; aplicado, devuelto o eliminado: débito.
+
+Cada movimiento guarda el saldo acumulado del propietario tras aplicarse, así
+que un período o un historial de varios meses es un recorrido de rango por
+índice. Los movimientos se registran con la conexión del llamador, dentro de
+la misma transacción que el evento que los origina.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.esquema import asegurar_esquema
+
+# Desglose de la liquidación copiado al movimiento (mismos nombres que LIQUIDACIONES)
+COLUMNAS_DESGLOSE = (
+    "CANON_BRUTO",
+    "OTROS_INGRESOS",
+    "TOTAL_INGRESOS",
+    "COMISION_MONTO",
+    "IVA_COMISION",
+    "IMPUESTO_4X1000",
+    "GASTOS_ADMINISTRACION",
+    "GASTOS_SERVICIOS",
+    "GASTOS_REPARACIONES",
+    "OTROS_EGRESOS",
+    "TOTAL_EGRESOS",
+)
+
+COLUMNAS_MOVIMIENTO = (
+    "ID_PROPIETARIO",
+    "PERIODO",
+    "FECHA_MOVIMIENTO",
+    "TIPO_MOVIMIENTO",
+    "REFERENCIA",
+    "DESCRIPCION",
+    "ID_PROPIEDAD",
+    "DIRECCION_PROPIEDAD",
+    "PORCENTAJE_SEGURO",
+    *COLUMNAS_DESGLOSE,
+    "CREDITO",
+    "DEBITO",
+    "SALDO",
+    "CREATED_BY",
+)
+
+TIPOS_SALDO_FAVOR = {
+    "Pendiente": "SaldoFavor",
+    "Aplicado": "SaldoAplicado",
+    "Devuelto": "SaldoDevuelto",
+    "Eliminado": "SaldoEliminado",
+}
+
+
+def referencia_liquidacion(id_liquidacion: int) -> str:
+    return f"LIQUIDACION:{id_liquidacion}"
+
+
+def referencia_saldo_favor(id_saldo: int) -> str:
+    return f"SALDO_FAVOR:{id_saldo}"
+
+
+class RepositorioCuentaPropietarioSQLite:
+    """Repositorio de la cuenta corriente de propietarios (SQLite y PostgreSQL)."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        asegurar_esquema(db_manager, "MOVIMIENTOS_CUENTA_PROPIETARIO", self._ensure_tables)
+
+    def _ensure_tables(self):
+        """Crea el libro en SQLite y lo carga desde las liquidaciones existentes."""
+        if self.db.use_postgresql:
+            return
+        with self.db.transaccion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                "AND name = 'MOVIMIENTOS_CUENTA_PROPIETARIO'"
+            )
+            if cursor.fetchone():
+                return
+            desglose = ",\n".join(f"{c} INTEGER NOT NULL DEFAULT 0" for c in COLUMNAS_DESGLOSE)
+            cursor.execute(
+                f"""
+                CREATE TABLE MOVIMIENTOS_CUENTA_PROPIETARIO (
+                    ID_MOVIMIENTO INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ID_PROPIETARIO INTEGER NOT NULL,
+                    PERIODO TEXT NOT NULL,
+                    FECHA_MOVIMIENTO TEXT NOT NULL,
+                    TIPO_MOVIMIENTO TEXT NOT NULL,
+                    REFERENCIA TEXT NOT NULL,
+                    DESCRIPCION TEXT,
+                    ID_PROPIEDAD INTEGER,
+                    DIRECCION_PROPIEDAD TEXT,
+                    PORCENTAJE_SEGURO INTEGER NOT NULL DEFAULT 0,
+                    {desglose},
+                    CREDITO INTEGER NOT NULL DEFAULT 0,
+                    DEBITO INTEGER NOT NULL DEFAULT 0,
+                    SALDO INTEGER NOT NULL,
+                    ANULADO INTEGER NOT NULL DEFAULT 0,
+                    CREATED_BY TEXT
+                )
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX idx_mov_propietario_periodo
+                ON MOVIMIENTOS_CUENTA_PROPIETARIO (ID_PROPIETARIO, PERIODO, TIPO_MOVIMIENTO)
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX idx_mov_propietario_fecha
+                ON MOVIMIENTOS_CUENTA_PROPIETARIO (ID_PROPIETARIO, FECHA_MOVIMIENTO)
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX idx_mov_referencia
+                ON MOVIMIENTOS_CUENTA_PROPIETARIO (REFERENCIA)
+            """
+            )
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'LIQUIDACIONES'"
+            )
+            hay_liquidaciones = cursor.fetchone() is not None
+        if hay_liquidaciones:
+            try:
+                self.reconstruir()
+            except Exception:
+                # Sin carga inicial no hay libro: se reintenta en la próxima instancia
+                with self.db.transaccion() as conn:
+                    conn.cursor().execute("DROP TABLE MOVIMIENTOS_CUENTA_PROPIETARIO")
+                raise
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    def _bloquear_propietarios(self, cursor, propietarios: Sequence[int]) -> None:
+        """
+        Serializa hasta el fin de la transacción los movimientos de cada propietario.
+
+        PostgreSQL: un advisory lock por propietario (en orden, sin interbloqueos),
+        que existe aunque el propietario aún no tenga movimientos. SQLite: el
+        lock de escritura de la base, tomado antes de leer el saldo.
+        """
+        if self.db.use_postgresql:
+            for id_propietario in propietarios:
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(hashtext('MOVIMIENTOS_CUENTA_PROPIETARIO'), %s)",
+                    (id_propietario,),
+                )
+        else:
+            cursor.execute("UPDATE MOVIMIENTOS_CUENTA_PROPIETARIO SET ANULADO = ANULADO WHERE 0")
+
+    def _registrar(self, cursor, movimientos: List[Dict[str, Any]], usuario: str) -> int:
+        """
+        Inserta movimientos calculando el saldo acumulado de cada propietario.
+
+        Los movimientos se aplican en el orden recibido. El saldo previo se lee
+        con los propietarios bloqueados: dos transacciones concurrentes no
+        parten del mismo saldo.
+        """
+        if not movimientos:
+            return 0
+        placeholder = self.db.get_placeholder()
+        propietarios = sorted({m["ID_PROPIETARIO"] for m in movimientos})
+        self._bloquear_propietarios(cursor, propietarios)
+        marcadores = ", ".join([placeholder] * len(propietarios))
+        cursor.execute(
+            f"""
+            SELECT ID_PROPIETARIO, SALDO FROM MOVIMIENTOS_CUENTA_PROPIETARIO
+            WHERE ID_MOVIMIENTO IN (
+                SELECT MAX(ID_MOVIMIENTO) FROM MOVIMIENTOS_CUENTA_PROPIETARIO
+                WHERE ID_PROPIETARIO IN ({marcadores})
+                GROUP BY ID_PROPIETARIO
+            )
+            """,
+            propietarios,
+        )
+        saldos = {row["ID_PROPIETARIO"]: row["SALDO"] for row in cursor.fetchall()}
+
+        ahora = datetime.now().isoformat(timespec="seconds")
+        filas = []
+        for m in movimientos:
+            saldo = saldos.get(m["ID_PROPIETARIO"], 0) + m.get("CREDITO", 0) - m.get("DEBITO", 0)
+            saldos[m["ID_PROPIETARIO"]] = saldo
+            fila = {c: m.get(c, 0) for c in COLUMNAS_DESGLOSE}
+            fila.update(
+                ID_PROPIETARIO=m["ID_PROPIETARIO"],
+                PERIODO=m["PERIODO"],
+                FECHA_MOVIMIENTO=m.get("FECHA_MOVIMIENTO") or ahora,
+                TIPO_MOVIMIENTO=m["TIPO_MOVIMIENTO"],
+                REFERENCIA=m["REFERENCIA"],
+                DESCRIPCION=m.get("DESCRIPCION"),
+                ID_PROPIEDAD=m.get("ID_PROPIEDAD"),
+                DIRECCION_PROPIEDAD=m.get("DIRECCION_PROPIEDAD"),
+                PORCENTAJE_SEGURO=m.get("PORCENTAJE_SEGURO") or 0,
+                CREDITO=m.get("CREDITO", 0),
+                DEBITO=m.get("DEBITO", 0),
+                SALDO=saldo,
+                CREATED_BY=usuario,
+            )
+            filas.append(tuple(fila[c] for c in COLUMNAS_MOVIMIENTO))
+
+        cursor.executemany(
+            f"""
+            INSERT INTO MOVIMIENTOS_CUENTA_PROPIETARIO ({", ".join(COLUMNAS_MOVIMIENTO)})
+            VALUES ({", ".join([placeholder] * len(COLUMNAS_MOVIMIENTO))})
+            """,
+            filas,
+        )
+        return len(filas)
+
+    def _liquidaciones_para_movimiento(self, cursor, ids_liquidacion: Sequence[int]) -> List[Dict]:
+        """Liquidaciones con propietario, inmueble y porcentaje de seguro vigente."""
+        placeholder = self.db.get_placeholder()
+        cursor.execute(
+            f"""
+            SELECT
+                l.ID_LIQUIDACION, l.PERIODO, l.FECHA_GENERACION, l.NETO_A_PAGAR,
+                {", ".join(f"l.{c}" for c in COLUMNAS_DESGLOSE)},
+                cm.ID_PROPIETARIO, p.ID_PROPIEDAD, p.DIRECCION_PROPIEDAD,
+                COALESCE(seg.PORCENTAJE_SEGURO, seg_arr.PORCENTAJE_SEGURO, 0) AS PORCENTAJE_SEGURO
+            FROM LIQUIDACIONES l
+            JOIN CONTRATOS_MANDATOS cm ON l.ID_CONTRATO_M = cm.ID_CONTRATO_M
+            JOIN PROPIEDADES p ON cm.ID_PROPIEDAD = p.ID_PROPIEDAD
+            LEFT JOIN CONTRATOS_ARRENDAMIENTOS ca
+                ON p.ID_PROPIEDAD = ca.ID_PROPIEDAD AND ca.ESTADO_CONTRATO_A = 'Activo'
+            LEFT JOIN ARRENDATARIOS arr ON ca.ID_ARRENDATARIO = arr.ID_ARRENDATARIO
+            LEFT JOIN POLIZAS pol ON ca.ID_CONTRATO_A = pol.ID_CONTRATO AND pol.ESTADO = 'Activa'
+            LEFT JOIN SEGUROS seg ON pol.ID_SEGURO = seg.ID_SEGURO
+            LEFT JOIN SEGUROS seg_arr ON arr.ID_SEGURO = seg_arr.ID_SEGURO
+            WHERE l.ID_LIQUIDACION IN ({", ".join([placeholder] * len(ids_liquidacion))})
+            ORDER BY l.ID_LIQUIDACION
+            """,
+            list(ids_liquidacion),
+        )
+        # Un inmueble con varias pólizas activas repite la fila; vale la primera
+        liquidaciones: Dict[int, Dict] = {}
+        for row in cursor.fetchall():
+            liquidaciones.setdefault(row["ID_LIQUIDACION"], dict(row))
+        return list(liquidaciones.values())
+
+    def _movimiento_liquidacion(self, liq: Dict[str, Any]) -> Dict[str, Any]:
+        movimiento = {c: liq[c] or 0 for c in COLUMNAS_DESGLOSE}
+        movimiento.update(
+            ID_PROPIETARIO=liq["ID_PROPIETARIO"],
+            PERIODO=liq["PERIODO"],
+            TIPO_MOVIMIENTO="Liquidacion",
+            REFERENCIA=referencia_liquidacion(liq["ID_LIQUIDACION"]),
+            DESCRIPCION=f"Liquidación {liq['PERIODO']} - {liq['DIRECCION_PROPIEDAD']}",
+            ID_PROPIEDAD=liq["ID_PROPIEDAD"],
+            DIRECCION_PROPIEDAD=liq["DIRECCION_PROPIEDAD"],
+            PORCENTAJE_SEGURO=liq["PORCENTAJE_SEGURO"],
+            CREDITO=liq["NETO_A_PAGAR"] or 0,
+        )
+        return movimiento
+
+    def registrar_liquidaciones(
+        self, conn, ids_liquidacion: Sequence[int], usuario: str
+    ) -> int:
+        """Acredita al propietario el neto de cada liquidación."""
+        if not ids_liquidacion:
+            return 0
+        cursor = self.db.get_dict_cursor(conn)
+        liquidaciones = self._liquidaciones_para_movimiento(cursor, ids_liquidacion)
+        return self._registrar(
+            cursor, [self._movimiento_liquidacion(l) for l in liquidaciones], usuario
+        )
+
+    def _movimientos_vigentes(self, cursor, referencias: Sequence[str]) -> List[Dict]:
+        placeholder = self.db.get_placeholder()
+        cursor.execute(
+            f"""
+            SELECT ID_MOVIMIENTO, ID_PROPIETARIO, PERIODO, REFERENCIA, DESCRIPCION, CREDITO
+            FROM MOVIMIENTOS_CUENTA_PROPIETARIO
+            WHERE REFERENCIA IN ({", ".join([placeholder] * len(referencias))})
+            AND TIPO_MOVIMIENTO = 'Liquidacion' AND ANULADO = 0
+            ORDER BY ID_MOVIMIENTO
+            """,
+            list(referencias),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def anular_liquidaciones(self, conn, ids_liquidacion: Sequence[int], usuario: str) -> int:
+        """Compensa con un débito el crédito vigente de cada liquidación."""
+        if not ids_liquidacion:
+            return 0
+        placeholder = self.db.get_placeholder()
+        cursor = self.db.get_dict_cursor(conn)
+        vigentes = self._movimientos_vigentes(
+            cursor, [referencia_liquidacion(i) for i in ids_liquidacion]
+        )
+        if not vigentes:
+            return 0
+        cursor.execute(
+            f"""
+            UPDATE MOVIMIENTOS_CUENTA_PROPIETARIO SET ANULADO = 1
+            WHERE ID_MOVIMIENTO IN ({", ".join([placeholder] * len(vigentes))})
+            """,
+            [m["ID_MOVIMIENTO"] for m in vigentes],
+        )
+        return self._registrar(
+            cursor,
+            [
+                {
+                    "ID_PROPIETARIO": m["ID_PROPIETARIO"],
+                    "PERIODO": m["PERIODO"],
+                    "TIPO_MOVIMIENTO": "Anulacion",
+                    "REFERENCIA": m["REFERENCIA"],
+                    "DESCRIPCION": f"Anulación: {m['DESCRIPCION']}",
+                    "DEBITO": m["CREDITO"],
+                }
+                for m in vigentes
+            ],
+            usuario,
+        )
+
+    def reemplazar_liquidacion(self, conn, id_liquidacion: int, usuario: str) -> int:
+        """Anula el crédito vigente y lo vuelve a registrar con los valores actuales."""
+        self.anular_liquidaciones(conn, [id_liquidacion], usuario)
+        return self.registrar_liquidaciones(conn, [id_liquidacion], usuario)
+
+    def registrar_pagos_liquidaciones(
+        self, conn, ids_liquidacion: Sequence[int], fecha_pago: str, usuario: str
+    ) -> int:
+        """Debita el neto pagado de cada liquidación."""
+        if not ids_liquidacion:
+            return 0
+        cursor = self.db.get_dict_cursor(conn)
+        vigentes = self._movimientos_vigentes(
+            cursor, [referencia_liquidacion(i) for i in ids_liquidacion]
+        )
+        return self._registrar(
+            cursor,
+            [
+                {
+                    "ID_PROPIETARIO": m["ID_PROPIETARIO"],
+                    "PERIODO": m["PERIODO"],
+                    "TIPO_MOVIMIENTO": "Pago",
+                    "REFERENCIA": m["REFERENCIA"],
+                    "DESCRIPCION": f"Pago {fecha_pago}: {m['DESCRIPCION']}",
+                    "DEBITO": m["CREDITO"],
+                }
+                for m in vigentes
+            ],
+            usuario,
+        )
+
+    def registrar_saldo_favor(
+        self,
+        conn,
+        id_propietario: int,
+        id_saldo: int,
+        valor: int,
+        estado: str,
+        motivo: str,
+        usuario: str,
+    ) -> int:
+        """
+        Registra un evento de saldo a favor del propietario.
+
+        Args:
+            estado: 'Pendiente' (crédito) o 'Aplicado', 'Devuelto', 'Eliminado' (débito)
+        """
+        credito = estado == "Pendiente"
+        cursor = self.db.get_dict_cursor(conn)
+        return self._registrar(
+            cursor,
+            [
+                {
+                    "ID_PROPIETARIO": id_propietario,
+                    "PERIODO": date.today().strftime("%Y-%m"),
+                    "TIPO_MOVIMIENTO": TIPOS_SALDO_FAVOR[estado],
+                    "REFERENCIA": referencia_saldo_favor(id_saldo),
+                    "DESCRIPCION": f"Saldo a favor ({estado.lower()}): {motivo}",
+                    "CREDITO": valor if credito else 0,
+                    "DEBITO": 0 if credito else valor,
+                }
+            ],
+            usuario,
+        )
+
+    def _existe_tabla(self, cursor, tabla: str) -> bool:
+        if self.db.use_postgresql:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL AS EXISTE", (tabla.lower(),))
+            return bool(cursor.fetchone()["EXISTE"])
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabla,))
+        return cursor.fetchone() is not None
+
+    def reconstruir(self, usuario: str = "sistema") -> int:
+        """
+        Reconstruye el libro desde LIQUIDACIONES y SALDOS_FAVOR.
+
+        Los eventos se ordenan por fecha (generación, pago, resolución del
+        saldo) y se registran en ese orden para que el saldo acumulado sea el
+        de la historia real.
+
+        Returns:
+            Movimientos registrados
+        """
+        with self.db.transaccion() as conn:
+            cursor = self.db.get_dict_cursor(conn)
+            cursor.execute("DELETE FROM MOVIMIENTOS_CUENTA_PROPIETARIO")
+
+            cursor.execute(
+                "SELECT ID_LIQUIDACION FROM LIQUIDACIONES "
+                "WHERE ESTADO_LIQUIDACION != 'Cancelada'"
+            )
+            ids = [row["ID_LIQUIDACION"] for row in cursor.fetchall()]
+            eventos = []
+            pagadas = {}
+            if ids:
+                placeholder = self.db.get_placeholder()
+                cursor.execute(
+                    f"""
+                    SELECT ID_LIQUIDACION, FECHA_PAGO FROM LIQUIDACIONES
+                    WHERE ESTADO_LIQUIDACION = 'Pagada'
+                    AND ID_LIQUIDACION IN ({", ".join([placeholder] * len(ids))})
+                    """,
+                    ids,
+                )
+                pagadas = {row["ID_LIQUIDACION"]: row["FECHA_PAGO"] for row in cursor.fetchall()}
+                for liq in self._liquidaciones_para_movimiento(cursor, ids):
+                    movimiento = self._movimiento_liquidacion(liq)
+                    fecha = str(liq["FECHA_GENERACION"] or "")[:10]
+                    movimiento["FECHA_MOVIMIENTO"] = fecha
+                    eventos.append((fecha, 0, movimiento))
+                    fecha_pago = pagadas.get(liq["ID_LIQUIDACION"])
+                    if fecha_pago:
+                        eventos.append(
+                            (
+                                str(fecha_pago)[:10],
+                                1,
+                                {
+                                    **{c: movimiento[c] for c in ("ID_PROPIETARIO", "PERIODO")},
+                                    "FECHA_MOVIMIENTO": str(fecha_pago)[:10],
+                                    "TIPO_MOVIMIENTO": "Pago",
+                                    "REFERENCIA": movimiento["REFERENCIA"],
+                                    "DESCRIPCION": f"Pago {str(fecha_pago)[:10]}: "
+                                    f"{movimiento['DESCRIPCION']}",
+                                    "DEBITO": movimiento["CREDITO"],
+                                },
+                            )
+                        )
+
+            if self._existe_tabla(cursor, "SALDOS_FAVOR"):
+                cursor.execute(
+                    """
+                    SELECT ID_SALDO_FAVOR, ID_PROPIETARIO, VALOR_SALDO, MOTIVO, ESTADO,
+                           FECHA_GENERACION, FECHA_RESOLUCION
+                    FROM SALDOS_FAVOR
+                    WHERE TIPO_BENEFICIARIO = 'Propietario' AND ID_PROPIETARIO IS NOT NULL
+                    """
+                )
+                for row in cursor.fetchall():
+                    base = {
+                        "ID_PROPIETARIO": row["ID_PROPIETARIO"],
+                        "REFERENCIA": referencia_saldo_favor(row["ID_SALDO_FAVOR"]),
+                    }
+                    fecha = str(row["FECHA_GENERACION"] or "")[:10]
+                    eventos.append(
+                        (
+                            fecha,
+                            0,
+                            {
+                                **base,
+                                "PERIODO": fecha[:7],
+                                "FECHA_MOVIMIENTO": fecha,
+                                "TIPO_MOVIMIENTO": "SaldoFavor",
+                                "DESCRIPCION": f"Saldo a favor (pendiente): {row['MOTIVO']}",
+                                "CREDITO": row["VALOR_SALDO"],
+                            },
+                        )
+                    )
+                    if row["ESTADO"] in ("Aplicado", "Devuelto"):
+                        resuelto = str(row["FECHA_RESOLUCION"] or fecha)[:10]
+                        eventos.append(
+                            (
+                                resuelto,
+                                1,
+                                {
+                                    **base,
+                                    "PERIODO": resuelto[:7],
+                                    "FECHA_MOVIMIENTO": resuelto,
+                                    "TIPO_MOVIMIENTO": TIPOS_SALDO_FAVOR[row["ESTADO"]],
+                                    "DESCRIPCION": f"Saldo a favor ({row['ESTADO'].lower()}): "
+                                    f"{row['MOTIVO']}",
+                                    "DEBITO": row["VALOR_SALDO"],
+                                },
+                            )
+                        )
+
+            eventos.sort(key=lambda e: (e[0], e[1]))
+            return self._registrar(cursor, [e[2] for e in eventos], usuario)
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    def obtener_liquidaciones_periodo(
+        self, id_propietario: int, periodo: str
+    ) -> List[Dict[str, Any]]:
+        """Créditos vigentes de liquidación del período (una fila por inmueble)."""
+        placeholder = self.db.get_placeholder()
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(
+            f"""
+            SELECT REFERENCIA, FECHA_MOVIMIENTO, ID_PROPIEDAD, DIRECCION_PROPIEDAD,
+                   PORCENTAJE_SEGURO, {", ".join(COLUMNAS_DESGLOSE)}, CREDITO
+            FROM MOVIMIENTOS_CUENTA_PROPIETARIO
+            WHERE ID_PROPIETARIO = {placeholder} AND PERIODO = {placeholder}
+            AND TIPO_MOVIMIENTO = 'Liquidacion' AND ANULADO = 0
+            ORDER BY ID_MOVIMIENTO
+            """,
+            (id_propietario, periodo),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def resumir_periodos(
+        self, id_propietario: int, periodo_desde: str, periodo_hasta: str
+    ) -> List[Dict[str, Any]]:
+        """Totales de liquidación por período en un rango (estado de cuenta multi-período)."""
+        placeholder = self.db.get_placeholder()
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(
+            f"""
+            SELECT PERIODO, COUNT(*) AS INMUEBLES,
+                   {", ".join(f"SUM({c}) AS {c}" for c in COLUMNAS_DESGLOSE)},
+                   SUM(CREDITO) AS NETO
+            FROM MOVIMIENTOS_CUENTA_PROPIETARIO
+            WHERE ID_PROPIETARIO = {placeholder}
+            AND PERIODO >= {placeholder} AND PERIODO <= {placeholder}
+            AND TIPO_MOVIMIENTO = 'Liquidacion' AND ANULADO = 0
+            GROUP BY PERIODO
+            ORDER BY PERIODO
+            """,
+            (id_propietario, periodo_desde, periodo_hasta),
+        )
+        return [
+            {
+                "periodo": row["PERIODO"],
+                "inmuebles": row["INMUEBLES"],
+                "total_ingresos": row["TOTAL_INGRESOS"],
+                "total_egresos": row["TOTAL_EGRESOS"],
+                "comision_monto": row["COMISION_MONTO"],
+                "neto_pagar": row["NETO"],
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def obtener_saldo(self, id_propietario: int, hasta_fecha: Optional[str] = None) -> int:
+        """Saldo del propietario tras su último movimiento (hasta una fecha, incluida)."""
+        placeholder = self.db.get_placeholder()
+        condicion, params = "", [id_propietario]
+        if hasta_fecha:
+            condicion = f"AND FECHA_MOVIMIENTO < {placeholder}"
+            params.append(self._dia_siguiente(hasta_fecha))
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(
+            f"""
+            SELECT SALDO FROM MOVIMIENTOS_CUENTA_PROPIETARIO
+            WHERE ID_PROPIETARIO = {placeholder} {condicion}
+            ORDER BY FECHA_MOVIMIENTO DESC, ID_MOVIMIENTO DESC
+            LIMIT 1
+            """,
+            params,
+        )
+        row = cursor.fetchone()
+        return row["SALDO"] if row else 0
+
+    @staticmethod
+    def _dia_siguiente(fecha: str) -> str:
+        return (datetime.strptime(fecha[:10], "%Y-%m-%d") + timedelta(days=1)).date().isoformat()
+
+    def listar_movimientos(
+        self, id_propietario: int, fecha_desde: str, fecha_hasta: str
+    ) -> Dict[str, Any]:
+        """
+        Historial de la cuenta entre dos fechas (ambas incluidas).
+
+        Returns:
+            Dict con saldo_inicial, movimientos (con su saldo acumulado) y saldo_final
+        """
+        placeholder = self.db.get_placeholder()
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(
+            f"""
+            SELECT ID_MOVIMIENTO, PERIODO, FECHA_MOVIMIENTO, TIPO_MOVIMIENTO, REFERENCIA,
+                   DESCRIPCION, CREDITO, DEBITO, SALDO, ANULADO
+            FROM MOVIMIENTOS_CUENTA_PROPIETARIO
+            WHERE ID_PROPIETARIO = {placeholder}
+            AND FECHA_MOVIMIENTO >= {placeholder} AND FECHA_MOVIMIENTO < {placeholder}
+            ORDER BY FECHA_MOVIMIENTO, ID_MOVIMIENTO
+            """,
+            (id_propietario, fecha_desde[:10], self._dia_siguiente(fecha_hasta)),
+        )
+        movimientos = [
+            {
+                "id": row["ID_MOVIMIENTO"],
+                "periodo": row["PERIODO"],
+                "fecha": str(row["FECHA_MOVIMIENTO"])[:10],
+                "tipo": row["TIPO_MOVIMIENTO"],
+                "referencia": row["REFERENCIA"],
+                "descripcion": row["DESCRIPCION"],
+                "credito": row["CREDITO"],
+                "debito": row["DEBITO"],
+                "saldo": row["SALDO"],
+                "anulado": bool(row["ANULADO"]),
+            }
+            for row in cursor.fetchall()
+        ]
+        if movimientos:
+            primero = movimientos[0]
+            saldo_inicial = primero["saldo"] - primero["credito"] + primero["debito"]
+            saldo_final = movimientos[-1]["saldo"]
+        else:
+            saldo_inicial = saldo_final = self.obtener_saldo(id_propietario, fecha_hasta)
+        return {
+            "saldo_inicial": saldo_inicial,
+            "movimientos": movimientos,
+            "saldo_final": saldo_final,
+        }
+
+    def obtener_saldos(self, ids_propietario: Iterable[int]) -> Dict[int, int]:
+        """Saldo actual de varios propietarios en una consulta."""
+        ids = sorted(set(ids_propietario))
+        if not ids:
+            return {}
+        placeholder = self.db.get_placeholder()
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(
+            f"""
+            SELECT ID_PROPIETARIO, SALDO FROM MOVIMIENTOS_CUENTA_PROPIETARIO
+            WHERE ID_MOVIMIENTO IN (
+                SELECT MAX(ID_MOVIMIENTO) FROM MOVIMIENTOS_CUENTA_PROPIETARIO
+                WHERE ID_PROPIETARIO IN ({", ".join([placeholder] * len(ids))})
+                GROUP BY ID_PROPIETARIO
+            )
+            """,
+            ids,
+        )
+        saldos = {row["ID_PROPIETARIO"]: row["SALDO"] for row in cursor.fetchall()}
+        return {i: saldos.get(i, 0) for i in ids}
@@ -2,30 +2,37 @@
 Repositorio SQLite para Dashboard.
 Implementa consultas agregadas para métricas.
 """
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional, Dict, Any
 from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.repositorio_cartera_mora_sqlite import RepositorioCarteraMoraSQLite
 from src.dominio.interfaces.repositorio_dashboard import IRepositorioDashboard
 
 class RepositorioDashboardSQLite(IRepositorioDashboard):
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        # Los indicadores de mora leen el libro CARTERA_MORA, no VW_ALERTA_MORA_DIARIA
+        self.cartera_mora = RepositorioCarteraMoraSQLite(db_manager)
+
+    def _lectura(self):
+        """Métricas agregadas: aceptan el retraso de reportes (pueden ir a la réplica)."""
+        return self.db.lectura(self.db.tolerancia_reportes_segundos)
 
     def obtener_resumen_mora(self) -> Dict:
-        with self.db.obtener_conexion() as conn:
-            cursor = self.db.get_dict_cursor(conn)
-            cursor.execute("SELECT COUNT(*) AS CANTIDAD, SUM(VALOR_RECAUDO) AS MONTO_TOTAL FROM VW_ALERTA_MORA_DIARIA")
-            resumen = cursor.fetchone()
-            return {"monto_total": resumen["MONTO_TOTAL"] or 0, "cantidad_contratos": resumen["CANTIDAD"] or 0}
+        with self._lectura():
+            resumen = self.cartera_mora.obtener_resumen()
+        return {"monto_total": resumen["monto_total"], "cantidad_contratos": resumen["cantidad_contratos"]}
 
     def obtener_top_morosos(self, limit: int = 5) -> List[Dict]:
-        with self.db.obtener_conexion() as conn:
-            cursor = self.db.get_dict_cursor(conn)
-            cursor.execute(f"SELECT ARRENDATARIO, DIAS_RETRASO, VALOR_RECAUDO FROM VW_ALERTA_MORA_DIARIA ORDER BY DIAS_RETRASO DESC, VALOR_RECAUDO DESC LIMIT {limit}")
-            return [{"nombre": row["ARRENDATARIO"], "dias_retraso": row["DIAS_RETRASO"], "monto": row["VALOR_RECAUDO"]} for row in cursor.fetchall()]
+        with self._lectura():
+            contratos = self.cartera_mora.listar_contratos_en_mora(limite=limit)
+        return [
+            {"nombre": c["nombre"], "dias_retraso": c["dias_retraso"], "monto": c["monto"]}
+            for c in contratos
+        ]
 
     def obtener_total_recaudado(self, mes: str, anio: str, id_asesor: Optional[int] = None) -> float:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
             placeholder = self.db.get_placeholder()
             params = [mes, anio]
@@ -51,7 +58,7 @@ class RepositorioDashboardSQLite(IRepositorioDashboard):
             return res["TOTAL_RECAUDO"] if res and res["TOTAL_RECAUDO"] else 0
 
     def obtener_total_esperado(self, id_asesor: Optional[int] = None) -> float:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
             placeholder = self.db.get_placeholder()
             query = "SELECT SUM(ca.CANON_ARRENDAMIENTO) AS TOTAL_ESPERADO FROM CONTRATOS_ARRENDAMIENTOS ca"
@@ -66,7 +73,7 @@ class RepositorioDashboardSQLite(IRepositorioDashboard):
             return res["TOTAL_ESPERADO"] if res and res["TOTAL_ESPERADO"] else 0
 
     def obtener_conteo_vencimientos_rangos(self) -> Dict:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
             cursor.execute("""
                 SELECT 
@@ -79,14 +86,14 @@ class RepositorioDashboardSQLite(IRepositorioDashboard):
             return {"vence_30_dias": r["VENCE_30"] or 0, "vence_60_dias": r["VENCE_60"] or 0, "vence_90_dias": r["VENCE_90"] or 0}
 
     def obtener_lista_vencimientos(self, dias: int) -> List[Dict]:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
             placeholder = self.db.get_placeholder()
             cursor.execute(f"SELECT TIPO_CONTRATO, ID_PROPIEDAD, DIRECCION, INQUILINO_PROPIETARIO, FECHA_FIN, DIAS_RESTANTES FROM VW_ALERTA_VENCIMIENTO_CONTRATOS WHERE DIAS_RESTANTES <= {placeholder} ORDER BY DIAS_RESTANTES ASC", (dias,))
             return [{"tipo_contrato": r["TIPO_CONTRATO"], "id_propiedad": r["ID_PROPIEDAD"], "direccion": r["DIRECCION"], "parte_contratante": r["INQUILINO_PROPIETARIO"], "fecha_fin": r["FECHA_FIN"], "dias_restantes": r["DIAS_RESTANTES"]} for r in cursor.fetchall()]
 
     def obtener_contratos_elegibles_ipc(self, dias: int) -> List[Dict]:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
             placeholder = self.db.get_placeholder()
             # SQL simplificado del servicio
@@ -117,7 +124,7 @@ class RepositorioDashboardSQLite(IRepositorioDashboard):
             } for r in cursor.fetchall()]
 
     def obtener_comisiones_pendientes(self, id_asesor: Optional[int] = None) -> Dict:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
             placeholder = self.db.get_placeholder()
             query = "SELECT COUNT(*) AS CANTIDAD, SUM(VALOR_NETO_ASESOR) AS MONTO_TOTAL FROM LIQUIDACIONES_ASESORES WHERE ESTADO_LIQUIDACION = 'Pendiente'"
@@ -130,7 +137,7 @@ class RepositorioDashboardSQLite(IRepositorioDashboard):
             return {"monto_total": r["MONTO_TOTAL"] or 0, "cantidad_liquidaciones": r["CANTIDAD"] or 0}
 
     def obtener_metricas_ocupacion(self, id_asesor: Optional[int] = None) -> Dict:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
             placeholder = self.db.get_placeholder()
             if id_asesor:
@@ -145,7 +152,7 @@ class RepositorioDashboardSQLite(IRepositorioDashboard):
             return {"ocupadas": ocup, "disponibles": disp, "total": total, "porcentaje_ocupacion": round((ocup/total*100),1) if total > 0 else 0}
 
     def obtener_propiedades_por_tipo(self, id_asesor: Optional[int] = None) -> Dict[str, int]:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
             placeholder = self.db.get_placeholder()
             if id_asesor:
@@ -157,7 +164,7 @@ class RepositorioDashboardSQLite(IRepositorioDashboard):
             return {row["TIPO_PROPIEDAD"]: row["CONTAR"] for row in cursor.fetchall()}
 
     def obtener_metricas_expertas(self, id_asesor: Optional[int] = None) -> Dict[str, float]:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
             placeholder = self.db.get_placeholder()
             q_potencial = "SELECT SUM(CANON_ARRENDAMIENTO_ESTIMADO) as TOTAL FROM PROPIEDADES WHERE ESTADO_REGISTRO IS TRUE"
@@ -174,12 +181,9 @@ class RepositorioDashboardSQLite(IRepositorioDashboard):
                 cursor.execute(q_real)
                 real = cursor.fetchone()["TOTAL"] or 0
             
-            # Eficiencia Recaudo Mes
-            if not self.db.use_postgresql:
-                q_rec = "SELECT SUM(VALOR_TOTAL) as TOTAL FROM RECAUDOS WHERE strftime('%Y-%m', FECHA_PAGO) = strftime('%Y-%m', 'now') AND ESTADO_RECAUDO = 'Aplicado'"
-            else:
-                q_rec = "SELECT SUM(VALOR_TOTAL) as TOTAL FROM RECAUDOS WHERE DATE_TRUNC('month', TO_DATE(FECHA_PAGO, 'YYYY-MM-DD')) = DATE_TRUNC('month', CURRENT_DATE) AND ESTADO_RECAUDO = 'Aplicado'"
-            
+            # Eficiencia Recaudo Mes (strftime se traduce a TO_CHAR en PostgreSQL)
+            q_rec = "SELECT SUM(VALOR_TOTAL) as TOTAL FROM RECAUDOS WHERE strftime('%Y-%m', FECHA_PAGO) = strftime('%Y-%m', 'now') AND ESTADO_RECAUDO = 'Aplicado'"
+
             if id_asesor:
                 q_rec += f" AND ID_CONTRATO_A IN (SELECT ID_CONTRATO_A FROM CONTRATOS_ARRENDAMIENTOS ca JOIN CONTRATOS_MANDATOS cm ON ca.ID_PROPIEDAD = cm.ID_PROPIEDAD WHERE cm.ID_ASESOR = {placeholder})"
                 cursor.execute(q_rec, (id_asesor,))
@@ -194,31 +198,28 @@ class RepositorioDashboardSQLite(IRepositorioDashboard):
             }
 
     def obtener_top_asesores_revenue(self) -> List[Dict]:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
             query = "SELECT p.NOMBRE_COMPLETO as nombre, COUNT(cm.ID_CONTRATO_M) as contratos, SUM(cm.CANON_MANDATO * (cm.COMISION_PORCENTAJE_CONTRATO_M / 10000.0)) as revenue FROM CONTRATOS_MANDATOS cm JOIN ASESORES a ON cm.ID_ASESOR = a.ID_ASESOR JOIN PERSONAS p ON a.ID_PERSONA = p.ID_PERSONA WHERE cm.ESTADO_CONTRATO_M = 'Activo' GROUP BY p.NOMBRE_COMPLETO ORDER BY revenue DESC LIMIT 5"
             cursor.execute(query)
             return [{"nombre": r["NOMBRE"], "contratos": int(r["CONTRATOS"]), "revenue": float(r["REVENUE"])} for r in cursor.fetchall()]
 
     def obtener_tunel_vencimientos(self) -> List[Dict]:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
-            if self.db.use_postgresql:
-                query = "SELECT TO_CHAR(TO_DATE(FECHA_FIN_CONTRATO_A, 'YYYY-MM-DD'), 'YYYY-MM') as mes, SUM(CANON_ARRENDAMIENTO) as valor_riesgo FROM CONTRATOS_ARRENDAMIENTOS WHERE ESTADO_CONTRATO_A = 'Activo' AND TO_DATE(FECHA_FIN_CONTRATO_A, 'YYYY-MM-DD') BETWEEN CURRENT_DATE AND (CURRENT_DATE + INTERVAL '12 months') GROUP BY mes ORDER BY mes"
-            else:
-                query = "SELECT strftime('%Y-%m', FECHA_FIN_CONTRATO_A) as mes, SUM(CANON_ARRENDAMIENTO) as valor_riesgo FROM CONTRATOS_ARRENDAMIENTOS WHERE ESTADO_CONTRATO_A = 'Activo' AND FECHA_FIN_CONTRATO_A BETWEEN date('now') AND date('now', '+12 months') GROUP BY mes ORDER BY mes"
+            query = "SELECT strftime('%Y-%m', FECHA_FIN_CONTRATO_A) as mes, SUM(CANON_ARRENDAMIENTO) as valor_riesgo FROM CONTRATOS_ARRENDAMIENTOS WHERE ESTADO_CONTRATO_A = 'Activo' AND date(FECHA_FIN_CONTRATO_A) BETWEEN date('now') AND date('now', '+12 months') GROUP BY mes ORDER BY mes"
             cursor.execute(query)
             return [{"mes": r["MES"], "valor_riesgo": float(r["VALOR_RIESGO"])} for r in cursor.fetchall()]
 
     def obtener_metricas_incidentes(self) -> Dict:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
             cursor.execute("SELECT ESTADO, COUNT(*) AS COUNT FROM INCIDENTES GROUP BY ESTADO")
             res = {row["ESTADO"]: row["COUNT"] for row in cursor.fetchall()}
             return {"total": sum(res.values()), "por_estado": res}
 
     def obtener_total_contratos_activos(self, id_asesor: Optional[int] = None) -> int:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
             placeholder = self.db.get_placeholder()
             if id_asesor:
@@ -231,19 +232,12 @@ class RepositorioDashboardSQLite(IRepositorioDashboard):
             return r["COUNT"] if r else 0
 
     def obtener_morosidad_por_zona(self) -> Dict:
-        with self.db.obtener_conexion() as conn:
-            cursor = self.db.get_dict_cursor(conn)
-            cursor.execute("""
-                SELECT m.NOMBRE_MUNICIPIO, COUNT(DISTINCT vm.ID_CONTRATO_A) AS CONTRATOS_MORA, SUM(vm.VALOR_RECAUDO) AS MONTO_TOTAL
-                FROM VW_ALERTA_MORA_DIARIA vm JOIN CONTRATOS_ARRENDAMIENTOS ca ON vm.ID_CONTRATO_A = ca.ID_CONTRATO_A
-                JOIN PROPIEDADES p ON ca.ID_PROPIEDAD = p.ID_PROPIEDAD JOIN MUNICIPIOS m ON p.ID_MUNICIPIO = m.ID_MUNICIPIO
-                GROUP BY m.NOMBRE_MUNICIPIO ORDER BY MONTO_TOTAL DESC LIMIT 10
-            """)
-            res = cursor.fetchall()
-            return {"zonas": [r["NOMBRE_MUNICIPIO"] for r in res], "contratos": [r["CONTRATOS_MORA"] for r in res], "montos": [r["MONTO_TOTAL"] for r in res]}
+        with self._lectura():
+            res = self.cartera_mora.obtener_morosidad_por_zona(limite=10)
+        return {"zonas": [r["zona"] for r in res], "contratos": [r["contratos"] for r in res], "montos": [r["monto"] for r in res]}
 
     def obtener_desempeno_asesores(self) -> Dict:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
             placeholder = self.db.get_placeholder()
             cursor.execute("SELECT p.NOMBRE_COMPLETO, COUNT(ca.ID_CONTRATO_A) AS CONTRATOS_ACTIVOS, SUM(ca.CANON_ARRENDAMIENTO) AS VALOR_CARTERA FROM CONTRATOS_ARRENDAMIENTOS ca JOIN ASESORES a ON ca.ID_ASESOR = a.ID_ASESOR JOIN PERSONAS p ON a.ID_PERSONA = p.ID_PERSONA WHERE ca.ESTADO_CONTRATO_A = 'Activo' GROUP BY p.NOMBRE_COMPLETO ORDER BY CONTRATOS_ACTIVOS DESC LIMIT 5")
@@ -255,24 +249,18 @@ class RepositorioDashboardSQLite(IRepositorioDashboard):
             return {"top_contratos": top_contratos, "top_comisiones": top_com}
 
     def obtener_recibos_vencidos_resumen(self) -> Dict:
-        with self.db.obtener_conexion() as conn:
+        with self._lectura() as conn:
             cursor = self.db.get_dict_cursor(conn)
-            
-            # Query compatible con SQLite y PostgreSQL para vencimientos
-            if self.db.use_postgresql:
-                query = """
-                    SELECT COUNT(*) AS CANTIDAD, SUM(VALOR_RECIBO) AS MONTO_TOTAL 
-                    FROM RECIBOS_PUBLICOS 
-                    WHERE ESTADO != 'Pagado' AND CAST(FECHA_VENCIMIENTO AS DATE) < CURRENT_DATE
-                """
-            else:
-                query = """
-                    SELECT COUNT(*) AS CANTIDAD, SUM(VALOR_RECIBO) AS MONTO_TOTAL 
-                    FROM RECIBOS_PUBLICOS 
-                    WHERE ESTADO != 'Pagado' AND FECHA_VENCIMIENTO < date('now')
-                """
-                
-            cursor.execute(query)
+            placeholder = self.db.get_placeholder()
+
+            # Fechas 'YYYY-MM-DD': comparación de texto, igual en SQLite y PostgreSQL
+            query = f"""
+                SELECT COUNT(*) AS CANTIDAD, SUM(VALOR_RECIBO) AS MONTO_TOTAL 
+                FROM RECIBOS_PUBLICOS 
+                WHERE ESTADO != 'Pagado' AND FECHA_VENCIMIENTO < {placeholder}
+            """
+
+            cursor.execute(query, (date.today().isoformat(),))
             res = cursor.fetchone()
             return {
                 "monto_total": res["MONTO_TOTAL"] or 0, 
@@ -8,6 +8,7 @@ from typing import List, Optional
 
 from src.dominio.entidades.desocupacion import Desocupacion, TareaDesocupacion
 from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.esquema import asegurar_esquema
 
 # Tareas predefinidas del checklist
 TAREAS_PREDEFINIDAS = [
@@ -27,7 +28,7 @@ class RepositorioDesocupacionSQLite:
 
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
-        self._ensure_tables()
+        asegurar_esquema(db_manager, "DESOCUPACIONES", self._ensure_tables)
 
     def _ensure_tables(self):
         if self.db_manager.use_postgresql:
@@ -1,5 +1,5 @@
 import sqlite3
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from src.dominio.entidades.cotizacion import Cotizacion
 from src.dominio.entidades.historial_incidente import HistorialIncidente
@@ -31,7 +31,9 @@ class RepositorioIncidentesSQLite(RepositorioIncidentes):
             aprobado_por=row["APROBADO_POR"],
             fecha_arreglo=row["FECHA_ARREGLO"],
             estado=row["ESTADO"],
-            dias_sin_resolver=row["DIAS_SIN_RESOLVER"],
+            dias_sin_resolver=(
+                row["DIAS_CALCULADOS"] if "DIAS_CALCULADOS" in row.keys() else row["DIAS_SIN_RESOLVER"]
+            ),
             motivo_cancelacion=row["MOTIVO_CANCELACION"],
             created_at=row["CREATED_AT"],
             created_by=row["CREATED_BY"],
@@ -123,9 +125,31 @@ class RepositorioIncidentesSQLite(RepositorioIncidentes):
             cursor.execute(query, params)
             conn.commit()
 
+    def _expresion_dias_sin_resolver(self) -> str:
+        """
+        Días entre el reporte y el cierre (o hoy, si sigue abierto).
+
+        Los cancelados sin FECHA_ARREGLO se cierran en su última actualización.
+        """
+        cerrado = "ESTADO IN ('Finalizado', 'Cancelado')"
+        if getattr(self.db, "use_postgresql", False):
+            return (
+                "(COALESCE(CAST(FECHA_ARREGLO AS DATE), "
+                f"CASE WHEN {cerrado} THEN CAST(UPDATED_AT AS DATE) END, CURRENT_DATE) "
+                "- CAST(FECHA_INCIDENTE AS DATE))"
+            )
+        return (
+            "CAST(julianday(COALESCE(date(FECHA_ARREGLO), "
+            f"CASE WHEN {cerrado} THEN date(UPDATED_AT) END, date('now', 'localtime'))) "
+            "- julianday(date(FECHA_INCIDENTE)) AS INTEGER)"
+        )
+
+    def _select_incidentes(self) -> str:
+        return f"SELECT *, {self._expresion_dias_sin_resolver()} AS DIAS_CALCULADOS FROM INCIDENTES"
+
     def obtener_por_id(self, id_incidente: int) -> Optional[Incidente]:
         placeholder = self.db.get_placeholder()
-        query = f"SELECT * FROM INCIDENTES WHERE ID_INCIDENTE = {placeholder}"
+        query = f"{self._select_incidentes()} WHERE ID_INCIDENTE = {placeholder}"
         conn = self.db.obtener_conexion()
         cursor = self.db.get_dict_cursor(conn)
         cursor.execute(query, (id_incidente,))
@@ -136,7 +160,7 @@ class RepositorioIncidentesSQLite(RepositorioIncidentes):
         self, id_propiedad: Optional[int] = None, estado: Optional[str] = None
     ) -> List[Incidente]:
         placeholder = self.db.get_placeholder()
-        query = "SELECT * FROM INCIDENTES WHERE 1=1"
+        query = f"{self._select_incidentes()} WHERE 1=1"
         params = []
         if id_propiedad:
             query += f" AND ID_PROPIEDAD = {placeholder}"
@@ -151,6 +175,140 @@ class RepositorioIncidentesSQLite(RepositorioIncidentes):
         cursor.execute(query, tuple(params))
         return [self._mapear_incidente(row) for row in cursor.fetchall()]
 
+    def _filtros_listado(
+        self,
+        busqueda: Optional[str] = None,
+        id_propiedad: Optional[int] = None,
+        estado: Optional[str] = None,
+        prioridad: Optional[str] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        id_proveedor: Optional[int] = None,
+        dias_min: Optional[int] = None,
+    ) -> Tuple[str, List[Any]]:
+        """Construye el WHERE compartido por listado, conteo y conteo por estado."""
+        placeholder = self.db.get_placeholder()
+        condiciones = ["1=1"]
+        params: List[Any] = []
+
+        if busqueda:
+            termino = busqueda.strip()
+            if termino.isdigit():
+                condiciones.append(
+                    f"(LOWER(DESCRIPCION_INCIDENTE) LIKE {placeholder} OR ID_INCIDENTE = {placeholder})"
+                )
+                params.extend([f"%{termino.lower()}%", int(termino)])
+            else:
+                condiciones.append(f"LOWER(DESCRIPCION_INCIDENTE) LIKE {placeholder}")
+                params.append(f"%{termino.lower()}%")
+
+        if id_propiedad:
+            condiciones.append(f"ID_PROPIEDAD = {placeholder}")
+            params.append(id_propiedad)
+
+        if estado:
+            condiciones.append(f"ESTADO = {placeholder}")
+            params.append(estado)
+
+        if prioridad:
+            condiciones.append(f"PRIORIDAD = {placeholder}")
+            params.append(prioridad)
+
+        if id_proveedor:
+            condiciones.append(f"ID_PROVEEDOR_ASIGNADO = {placeholder}")
+            params.append(id_proveedor)
+
+        if fecha_desde:
+            condiciones.append(f"FECHA_INCIDENTE >= {placeholder}")
+            params.append(fecha_desde)
+
+        if fecha_hasta:
+            condiciones.append(f"FECHA_INCIDENTE <= {placeholder}")
+            params.append(fecha_hasta)
+
+        if dias_min is not None:
+            condiciones.append(f"{self._expresion_dias_sin_resolver()} >= {placeholder}")
+            params.append(dias_min)
+
+        return " AND ".join(condiciones), params
+
+    def listar_con_filtros(
+        self,
+        busqueda: Optional[str] = None,
+        id_propiedad: Optional[int] = None,
+        estado: Optional[str] = None,
+        prioridad: Optional[str] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        id_proveedor: Optional[int] = None,
+        dias_min: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Incidente]:
+        """Lista incidentes filtrados y paginados en SQL (más recientes primero)."""
+        placeholder = self.db.get_placeholder()
+        where, params = self._filtros_listado(
+            busqueda, id_propiedad, estado, prioridad, fecha_desde, fecha_hasta,
+            id_proveedor, dias_min,
+        )
+        query = (
+            f"{self._select_incidentes()} WHERE {where} "
+            "ORDER BY FECHA_INCIDENTE DESC, ID_INCIDENTE DESC"
+        )
+        if limit is not None:
+            query += f" LIMIT {placeholder} OFFSET {placeholder}"
+            params.extend([limit, offset])
+
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(query, tuple(params))
+        return [self._mapear_incidente(row) for row in cursor.fetchall()]
+
+    def contar_con_filtros(
+        self,
+        busqueda: Optional[str] = None,
+        id_propiedad: Optional[int] = None,
+        estado: Optional[str] = None,
+        prioridad: Optional[str] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        id_proveedor: Optional[int] = None,
+        dias_min: Optional[int] = None,
+    ) -> int:
+        """Cuenta los incidentes que cumplen los filtros de listar_con_filtros."""
+        where, params = self._filtros_listado(
+            busqueda, id_propiedad, estado, prioridad, fecha_desde, fecha_hasta,
+            id_proveedor, dias_min,
+        )
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(f"SELECT COUNT(*) AS TOTAL FROM INCIDENTES WHERE {where}", tuple(params))
+        row = cursor.fetchone()
+        return int(row["TOTAL"]) if row else 0
+
+    def contar_por_estado(
+        self,
+        busqueda: Optional[str] = None,
+        id_propiedad: Optional[int] = None,
+        prioridad: Optional[str] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        id_proveedor: Optional[int] = None,
+        dias_min: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """Conteo de incidentes por ESTADO (encabezados del tablero Kanban)."""
+        where, params = self._filtros_listado(
+            busqueda, id_propiedad, None, prioridad, fecha_desde, fecha_hasta,
+            id_proveedor, dias_min,
+        )
+        query = (
+            f"SELECT ESTADO, COUNT(*) AS TOTAL FROM INCIDENTES WHERE {where} GROUP BY ESTADO"
+        )
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(query, tuple(params))
+        return {row["ESTADO"]: int(row["TOTAL"]) for row in cursor.fetchall()}
+
     def eliminar(self, id_incidente: int) -> None:
         placeholder = self.db.get_placeholder()
         query = f"UPDATE INCIDENTES SET ESTADO = 'Cancelado' WHERE ID_INCIDENTE = {placeholder}"
@@ -0,0 +1,239 @@
+"""
+Repositorio de Persistencia: Corrida de Incremento IPC
+Lectura de contratos candidatos y aplicación masiva del incremento.
+
+La aplicación es set-based y atómica: el diff se carga en una tabla temporal
+(TMP_INCREMENTO_IPC) y, dentro de una sola transacción, cuatro sentencias
+actualizan contratos, propiedades y mandatos e insertan el historial. Si algún
+contrato cambió de canon desde la previsualización, la corrida completa se
+revierte.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.dominio.servicios.calculadora_incremento_ipc import IncrementoIPC
+from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.esquema import asegurar_esquema
+
+
+class PrevisualizacionDesactualizada(ValueError):
+    """Algún contrato de la corrida cambió de canon o de estado desde el diff."""
+
+
+class RepositorioIncrementoIPCSQLite:
+    """Repositorio de la corrida de incremento IPC (SQLite y PostgreSQL)."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        asegurar_esquema(db_manager, "IPC_INCREMENT_HISTORY", self._ensure_tables)
+
+    def _ensure_tables(self):
+        """Crea el historial en SQLite (en PostgreSQL lo crea create_ipc_table.sql)."""
+        if self.db.use_postgresql:
+            return
+        with self.db.transaccion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS IPC_INCREMENT_HISTORY (
+                    ID_INCREMENTO_IPC INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ID_CONTRATO_A INTEGER NOT NULL,
+                    FECHA_APLICACION TEXT NOT NULL,
+                    PORCENTAJE_IPC REAL NOT NULL,
+                    CANON_ANTERIOR INTEGER NOT NULL,
+                    CANON_NUEVO INTEGER NOT NULL,
+                    OBSERVACIONES TEXT,
+                    CREATED_AT TEXT DEFAULT CURRENT_TIMESTAMP,
+                    CREATED_BY TEXT
+                )
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_ipc_history_contrato
+                ON IPC_INCREMENT_HISTORY(ID_CONTRATO_A)
+            """
+            )
+
+    def obtener_candidatos(
+        self,
+        fecha_corte: Optional[str] = None,
+        ids_contrato: Optional[Sequence[int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Contratos de arrendamiento activos con su propiedad, inquilino y mandato.
+
+        Args:
+            fecha_corte: Si se indica, solo contratos cuyo último incremento
+                (o inicio) es menor o igual a esta fecha 'YYYY-MM-DD'
+            ids_contrato: Restringe a estos contratos
+        """
+        placeholder = self.db.get_placeholder()
+        condiciones, params = ["ca.ESTADO_CONTRATO_A = 'Activo'"], []
+        if fecha_corte:
+            condiciones.append(
+                "COALESCE(ca.FECHA_ULTIMO_INCREMENTO_IPC, ca.FECHA_INICIO_CONTRATO_A) "
+                f"<= {placeholder}"
+            )
+            params.append(fecha_corte)
+        if ids_contrato is not None:
+            if not ids_contrato:
+                return []
+            condiciones.append(
+                f"ca.ID_CONTRATO_A IN ({', '.join([placeholder] * len(ids_contrato))})"
+            )
+            params.extend(ids_contrato)
+
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        cursor.execute(
+            f"""
+            SELECT
+                ca.ID_CONTRATO_A, ca.ID_PROPIEDAD, ca.CANON_ARRENDAMIENTO,
+                ca.FECHA_ULTIMO_INCREMENTO_IPC, p.DIRECCION_PROPIEDAD,
+                per.NOMBRE_COMPLETO AS INQUILINO,
+                EXISTS (
+                    SELECT 1 FROM CONTRATOS_MANDATOS cm
+                    WHERE cm.ID_PROPIEDAD = ca.ID_PROPIEDAD AND cm.ESTADO_CONTRATO_M = 'Activo'
+                ) AS TIENE_MANDATO
+            FROM CONTRATOS_ARRENDAMIENTOS ca
+            JOIN PROPIEDADES p ON ca.ID_PROPIEDAD = p.ID_PROPIEDAD
+            LEFT JOIN ARRENDATARIOS arr ON ca.ID_ARRENDATARIO = arr.ID_ARRENDATARIO
+            LEFT JOIN PERSONAS per ON arr.ID_PERSONA = per.ID_PERSONA
+            WHERE {" AND ".join(condiciones)}
+            ORDER BY ca.ID_CONTRATO_A
+            """,
+            params,
+        )
+        return [
+            {
+                "id_contrato": row["ID_CONTRATO_A"],
+                "id_propiedad": row["ID_PROPIEDAD"],
+                "canon": row["CANON_ARRENDAMIENTO"],
+                "ultimo_incremento": row["FECHA_ULTIMO_INCREMENTO_IPC"],
+                "direccion": row["DIRECCION_PROPIEDAD"],
+                "inquilino": row["INQUILINO"],
+                "tiene_mandato": bool(row["TIENE_MANDATO"]),
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def aplicar_lote(
+        self,
+        incrementos: List[IncrementoIPC],
+        fecha_aplicacion: str,
+        porcentaje_ipc: float,
+        observaciones: str,
+        usuario: str,
+    ) -> int:
+        """
+        Aplica el diff completo en una transacción.
+
+        Raises:
+            PrevisualizacionDesactualizada: si algún contrato ya no está activo
+                o su canon no coincide con canon_anterior (nada se aplica)
+
+        Returns:
+            Número de contratos incrementados
+        """
+        if not incrementos:
+            return 0
+        placeholder = self.db.get_placeholder()
+
+        with self.db.transaccion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS TMP_INCREMENTO_IPC (
+                    ID_CONTRATO_A INTEGER PRIMARY KEY,
+                    ID_PROPIEDAD INTEGER NOT NULL,
+                    CANON_ANTERIOR BIGINT NOT NULL,
+                    CANON_NUEVO BIGINT NOT NULL
+                )
+            """
+            )
+            cursor.execute("DELETE FROM TMP_INCREMENTO_IPC")
+            cursor.executemany(
+                f"INSERT INTO TMP_INCREMENTO_IPC VALUES ({', '.join([placeholder] * 4)})",
+                [
+                    (i.id_contrato, i.id_propiedad, i.canon_anterior, i.canon_nuevo)
+                    for i in incrementos
+                ],
+            )
+
+            # 1. Contratos (solo si siguen activos y con el canon del diff)
+            cursor.execute(
+                f"""
+                UPDATE CONTRATOS_ARRENDAMIENTOS
+                SET CANON_ARRENDAMIENTO = (
+                        SELECT t.CANON_NUEVO FROM TMP_INCREMENTO_IPC t
+                        WHERE t.ID_CONTRATO_A = CONTRATOS_ARRENDAMIENTOS.ID_CONTRATO_A
+                    ),
+                    FECHA_ULTIMO_INCREMENTO_IPC = {placeholder},
+                    ALERTA_IPC = FALSE,
+                    UPDATED_AT = CURRENT_TIMESTAMP,
+                    UPDATED_BY = {placeholder}
+                WHERE ESTADO_CONTRATO_A = 'Activo'
+                AND EXISTS (
+                    SELECT 1 FROM TMP_INCREMENTO_IPC t
+                    WHERE t.ID_CONTRATO_A = CONTRATOS_ARRENDAMIENTOS.ID_CONTRATO_A
+                    AND t.CANON_ANTERIOR = CONTRATOS_ARRENDAMIENTOS.CANON_ARRENDAMIENTO
+                )
+                """,
+                (fecha_aplicacion, usuario),
+            )
+            if cursor.rowcount != len(incrementos):
+                raise PrevisualizacionDesactualizada(
+                    f"{len(incrementos) - cursor.rowcount} contrato(s) cambiaron desde la "
+                    "previsualización. Genere el diff de nuevo; no se aplicó ningún incremento."
+                )
+
+            # 2. Propiedades
+            cursor.execute(
+                f"""
+                UPDATE PROPIEDADES
+                SET CANON_ARRENDAMIENTO_ESTIMADO = (
+                        SELECT t.CANON_NUEVO FROM TMP_INCREMENTO_IPC t
+                        WHERE t.ID_PROPIEDAD = PROPIEDADES.ID_PROPIEDAD
+                    ),
+                    UPDATED_AT = CURRENT_TIMESTAMP,
+                    UPDATED_BY = {placeholder}
+                WHERE ID_PROPIEDAD IN (SELECT ID_PROPIEDAD FROM TMP_INCREMENTO_IPC)
+                """,
+                (usuario,),
+            )
+
+            # 3. Mandatos activos de esas propiedades
+            cursor.execute(
+                f"""
+                UPDATE CONTRATOS_MANDATOS
+                SET CANON_MANDATO = (
+                        SELECT t.CANON_NUEVO FROM TMP_INCREMENTO_IPC t
+                        WHERE t.ID_PROPIEDAD = CONTRATOS_MANDATOS.ID_PROPIEDAD
+                    ),
+                    UPDATED_AT = CURRENT_TIMESTAMP,
+                    UPDATED_BY = {placeholder}
+                WHERE ESTADO_CONTRATO_M = 'Activo'
+                AND ID_PROPIEDAD IN (SELECT ID_PROPIEDAD FROM TMP_INCREMENTO_IPC)
+                """,
+                (usuario,),
+            )
+
+            # 4. Historial
+            cursor.execute(
+                f"""
+                INSERT INTO IPC_INCREMENT_HISTORY (
+                    ID_CONTRATO_A, FECHA_APLICACION, PORCENTAJE_IPC,
+                    CANON_ANTERIOR, CANON_NUEVO, OBSERVACIONES, CREATED_BY
+                )
+                SELECT ID_CONTRATO_A, {placeholder}, {placeholder},
+                       CANON_ANTERIOR, CANON_NUEVO, {placeholder}, {placeholder}
+                FROM TMP_INCREMENTO_IPC
+                ORDER BY ID_CONTRATO_A
+                """,
+                (fecha_aplicacion, porcentaje_ipc, observaciones, usuario),
+            )
+
+            cursor.execute("DELETE FROM TMP_INCREMENTO_IPC")
+
+        return len(incrementos)
@@ -4,10 +4,22 @@ Implementa persistencia para estados de cuenta del propietario.
 """
 
 from datetime import datetime
-from typing import List, Optional, Any, Dict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from src.dominio.entidades.liquidacion import Liquidacion
+from src.dominio.entidades.registros import LiquidacionRegistro
 from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.escritor_auditoria import obtener_escritor_auditoria
+from src.infraestructura.persistencia.esquema import asegurar_esquema
+from src.infraestructura.persistencia.filas import MapeadorEntidad
+from src.infraestructura.persistencia.repositorio_cuenta_propietario_sqlite import (
+    COLUMNAS_DESGLOSE,
+    RepositorioCuentaPropietarioSQLite,
+)
+from src.infraestructura.persistencia.paginacion_sql import condicion_keyset, contar_total
+
+# Cierres de período y lotes de PDF: registros de solo lectura directos desde las tuplas
+MAPEADOR_LIQUIDACION_REGISTRO = MapeadorEntidad(LiquidacionRegistro)
 
 
 class RepositorioLiquidacionSQLite:
@@ -15,7 +27,9 @@ class RepositorioLiquidacionSQLite:
 
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
-        self._crear_tabla_si_no_existe()
+        asegurar_esquema(db_manager, "LIQUIDACIONES", self._crear_tabla_si_no_existe)
+        self.cuenta_propietario = RepositorioCuentaPropietarioSQLite(db_manager)
+        self.auditoria = obtener_escritor_auditoria(db_manager)
 
     def _crear_tabla_si_no_existe(self):
         if self.db.use_postgresql:
@@ -188,6 +202,9 @@ class RepositorioLiquidacionSQLite:
         liquidacion.id_liquidacion = self.db.get_last_insert_id(
             cursor, "LIQUIDACIONES", "ID_LIQUIDACION"
         )
+        self.cuenta_propietario.registrar_liquidaciones(
+            conn, [liquidacion.id_liquidacion], usuario_sistema
+        )
         conn.commit()
 
         return liquidacion
@@ -390,6 +407,9 @@ class RepositorioLiquidacionSQLite:
             ),
         )
 
+        self.cuenta_propietario.reemplazar_liquidacion(
+            conn, liquidacion.id_liquidacion, usuario_sistema
+        )
         conn.commit()
 
     def aprobar(self, id_liquidacion: int, usuario_sistema: str) -> None:
@@ -463,6 +483,9 @@ class RepositorioLiquidacionSQLite:
         if cursor.rowcount == 0:
             raise ValueError("La liquidación no existe o no está en estado 'Aprobada'")
 
+        self.cuenta_propietario.registrar_pagos_liquidaciones(
+            conn, [id_liquidacion], fecha_pago, usuario_sistema
+        )
         conn.commit()
 
     def cancelar(self, id_liquidacion: int, motivo: str, usuario_sistema: str) -> None:
@@ -483,6 +506,7 @@ class RepositorioLiquidacionSQLite:
             (motivo, datetime.now().isoformat(), usuario_sistema, id_liquidacion),
         )
 
+        self.cuenta_propietario.anular_liquidaciones(conn, [id_liquidacion], usuario_sistema)
         conn.commit()
 
     def reversar(self, id_liquidacion: int, usuario_sistema: str) -> None:
@@ -577,14 +601,16 @@ class RepositorioLiquidacionSQLite:
             )
             AND PERIODO = {placeholder}
             AND ESTADO_LIQUIDACION IN ('En Proceso', 'Aprobada')
+            RETURNING ID_LIQUIDACION
         """,
             (motivo, datetime.now().isoformat(), usuario_sistema, id_propietario, periodo),
         )
 
-        affected = cursor.rowcount
+        ids = [row["ID_LIQUIDACION"] for row in cursor.fetchall()]
+        self.cuenta_propietario.anular_liquidaciones(conn, ids, usuario_sistema)
         conn.commit()
 
-        return affected
+        return len(ids)
 
     def reversar_por_propietario_y_periodo(
         self, id_propietario: int, periodo: str, usuario_sistema: str
@@ -625,9 +651,13 @@ class RepositorioLiquidacionSQLite:
         return affected
 
     def listar_por_propietario_y_periodo(
-        self, id_propietario: int, periodo: str
+        self, id_propietario: int, periodo: str, solo_lectura: bool = False
     ) -> List[Liquidacion]:
-        """Lista todas las liquidaciones de un propietario para un período específico"""
+        """
+        Lista todas las liquidaciones de un propietario para un período específico.
+
+        Con solo_lectura=True devuelve LiquidacionRegistro.
+        """
         conn = self.db.obtener_conexion()
         cursor = self.db.get_dict_cursor(conn)
         placeholder = self.db.get_placeholder()
@@ -642,6 +672,8 @@ class RepositorioLiquidacionSQLite:
             (id_propietario, periodo),
         )
 
+        if solo_lectura:
+            return MAPEADOR_LIQUIDACION_REGISTRO.mapear(cursor)
         return [self._row_to_entity(row) for row in cursor.fetchall()]
 
     def listar_agrupadas_por_propietario_paginado(
@@ -821,11 +853,19 @@ class RepositorioLiquidacionSQLite:
             )
             AND PERIODO = {placeholder}
             AND ESTADO_LIQUIDACION = 'En Proceso'
+            RETURNING ID_LIQUIDACION
         """, (usuario_sistema, datetime.now().isoformat(), datetime.now().isoformat(), usuario_sistema, id_propietario, periodo))
         
-        affected = cursor.rowcount
+        ids = [row["ID_LIQUIDACION"] for row in cursor.fetchall()]
         conn.commit()
-        return affected
+        self.auditoria.registrar_lote(
+            "LIQUIDACIONES",
+            ids,
+            "UPDATE",
+            usuario_sistema,
+            {"ESTADO_LIQUIDACION": ("En Proceso", "Aprobada")},
+        )
+        return len(ids)
 
     def obtener_datos_para_pdf(self, id_liquidacion: int) -> Optional[Dict[str, Any]]:
         """
@@ -978,69 +1018,38 @@ class RepositorioLiquidacionSQLite:
             
         propietario = dict(propietario)
         
-        # 2. Obtener liquidaciones
-        query_liqs = f"""
-        SELECT 
-            l.*,
-            p.ID_PROPIEDAD,
-            p.DIRECCION_PROPIEDAD,
-            COALESCE(seg.PORCENTAJE_SEGURO, seg_arr.PORCENTAJE_SEGURO, 0) as PORCENTAJE_SEGURO
-        FROM LIQUIDACIONES l
-        JOIN CONTRATOS_MANDATOS cm ON l.ID_CONTRATO_M = cm.ID_CONTRATO_M
-        JOIN PROPIEDADES p ON cm.ID_PROPIEDAD = p.ID_PROPIEDAD
-        
-        -- Left Join para obtener Arrendatario y Seguro
-        LEFT JOIN CONTRATOS_ARRENDAMIENTOS ca ON p.ID_PROPIEDAD = ca.ID_PROPIEDAD AND ca.ESTADO_CONTRATO_A = 'Activo'
-        LEFT JOIN ARRENDATARIOS arr ON ca.ID_ARRENDATARIO = arr.ID_ARRENDATARIO
-        
-        -- Join 1: A través de Póliza (tabla POLIZAS)
-        LEFT JOIN POLIZAS pol ON ca.ID_CONTRATO_A = pol.ID_CONTRATO AND pol.ESTADO = 'Activa'
-        LEFT JOIN SEGUROS seg ON pol.ID_SEGURO = seg.ID_SEGURO
-        
-        -- Join 2: Directo desde Arrendatario (tabla ARRENDATARIOS)
-        LEFT JOIN SEGUROS seg_arr ON arr.ID_SEGURO = seg_arr.ID_SEGURO
+        # 2. Liquidaciones vigentes del período: recorrido del libro del propietario
+        liquidaciones = self.cuenta_propietario.obtener_liquidaciones_periodo(
+            id_propietario, periodo
+        )
 
-        WHERE cm.ID_PROPIETARIO = {placeholder} AND l.PERIODO = {placeholder}
-        """
-        cursor.execute(query_liqs, (id_propietario, periodo))
-        liquidaciones = [dict(r) for r in cursor.fetchall()]
-        
         if not liquidaciones:
             return None
-            
-        # 3. Calcular totales consolidados
-        total_ingresos = sum(l.get("TOTAL_INGRESOS", 0) for l in liquidaciones)
-        total_egresos = sum(l.get("TOTAL_EGRESOS", 0) for l in liquidaciones)
-        neto_pagar = sum(l.get("NETO_A_PAGAR", 0) for l in liquidaciones)
-        
-        comision_total = sum(l.get("COMISION_MONTO", 0) for l in liquidaciones)
-        iva_total = sum(l.get("IVA_COMISION", 0) for l in liquidaciones)
-        impuesto_total = sum(l.get("IMPUESTO_4X1000", 0) for l in liquidaciones)
-        
-        gastos_admin = sum(l.get("GASTOS_ADMINISTRACION", 0) for l in liquidaciones)
-        gastos_serv = sum(l.get("GASTOS_SERVICIOS", 0) for l in liquidaciones)
-        gastos_rep = sum(l.get("GASTOS_REPARACIONES", 0) for l in liquidaciones)
-        otros_egr = sum(l.get("OTROS_EGRESOS", 0) for l in liquidaciones)
-        
+
+        # 3. Totales consolidados
+        totales = {c: sum(l[c] for l in liquidaciones) for c in COLUMNAS_DESGLOSE}
+        neto_pagar = sum(l["CREDITO"] for l in liquidaciones)
+
         # 4. Formatear lista de propiedades
-        propiedades_formateadas = []
-        for l in liquidaciones:
-            propiedades_formateadas.append({
-                "id": l.get("ID_PROPIEDAD"),
-                "direccion": l.get("DIRECCION_PROPIEDAD"),
-                "canon": l.get("CANON_BRUTO"),
-                "otros_ingresos": l.get("OTROS_INGRESOS"),
-                "comision_monto": l.get("COMISION_MONTO"),
-                "iva_comision": l.get("IVA_COMISION"),
-                "impuesto_4x1000": l.get("IMPUESTO_4X1000"),
-                "gastos_admin": l.get("GASTOS_ADMINISTRACION"),
-                "gastos_serv": l.get("GASTOS_SERVICIOS"),
-                "gastos_rep": l.get("GASTOS_REPARACIONES"),
-                "otros_egr": l.get("OTROS_EGRESOS"),
-                "neto": l.get("NETO_A_PAGAR"),
-                "porcentaje_seguro": l.get("PORCENTAJE_SEGURO", 0)
-            })
-            
+        propiedades_formateadas = [
+            {
+                "id": l["ID_PROPIEDAD"],
+                "direccion": l["DIRECCION_PROPIEDAD"],
+                "canon": l["CANON_BRUTO"],
+                "otros_ingresos": l["OTROS_INGRESOS"],
+                "comision_monto": l["COMISION_MONTO"],
+                "iva_comision": l["IVA_COMISION"],
+                "impuesto_4x1000": l["IMPUESTO_4X1000"],
+                "gastos_admin": l["GASTOS_ADMINISTRACION"],
+                "gastos_serv": l["GASTOS_SERVICIOS"],
+                "gastos_rep": l["GASTOS_REPARACIONES"],
+                "otros_egr": l["OTROS_EGRESOS"],
+                "neto": l["CREDITO"],
+                "porcentaje_seguro": l["PORCENTAJE_SEGURO"],
+            }
+            for l in liquidaciones
+        ]
+
         return {
             "propietario": propietario["NOMBRE_COMPLETO"],
             "documento": propietario["NUMERO_DOCUMENTO"],
@@ -1052,21 +1061,22 @@ class RepositorioLiquidacionSQLite:
             
             "periodo": periodo,
             "cantidad_propiedades": len(liquidaciones),
-            "fecha_generacion": liquidaciones[0].get("FECHA_GENERACION"), # Usamos la primera
+            "fecha_generacion": str(liquidaciones[0]["FECHA_MOVIMIENTO"])[:10],
             
             "propiedades": propiedades_formateadas,
             
-            "total_ingresos": total_ingresos,
-            "total_egresos": total_egresos,
+            "total_ingresos": totales["TOTAL_INGRESOS"],
+            "total_egresos": totales["TOTAL_EGRESOS"],
             "neto_pagar": neto_pagar,
+            "saldo_cuenta": self.cuenta_propietario.obtener_saldo(id_propietario),
             
-            "comision_monto": comision_total,
-            "iva_comision": iva_total,
-            "impuesto_4x1000": impuesto_total,
-            "gastos_admin": gastos_admin,
-            "gastos_serv": gastos_serv,
-            "gastos_rep": gastos_rep,
-            "otros_egr": otros_egr,
+            "comision_monto": totales["COMISION_MONTO"],
+            "iva_comision": totales["IVA_COMISION"],
+            "impuesto_4x1000": totales["IMPUESTO_4X1000"],
+            "gastos_admin": totales["GASTOS_ADMINISTRACION"],
+            "gastos_serv": totales["GASTOS_SERVICIOS"],
+            "gastos_rep": totales["GASTOS_REPARACIONES"],
+            "otros_egr": totales["OTROS_EGRESOS"],
             
             "observaciones": f"Estado de cuenta consolidado para {len(liquidaciones)} inmuebles."
         }
@@ -1109,6 +1119,7 @@ class RepositorioLiquidacionSQLite:
             )
             AND PERIODO = {placeholder}
             AND ESTADO_LIQUIDACION = 'Aprobada'
+            RETURNING ID_LIQUIDACION
         """,
             (
                 fecha_pago,
@@ -1123,21 +1134,28 @@ class RepositorioLiquidacionSQLite:
             ),
         )
 
-        affected = cursor.rowcount
+        ids = [row["ID_LIQUIDACION"] for row in cursor.fetchall()]
+        self.cuenta_propietario.registrar_pagos_liquidaciones(
+            conn, ids, fecha_pago, usuario_sistema
+        )
         conn.commit()
-        return affected
+        self.auditoria.registrar_lote(
+            "LIQUIDACIONES",
+            ids,
+            "UPDATE",
+            usuario_sistema,
+            {"ESTADO_LIQUIDACION": ("Aprobada", "Pagada")},
+            motivo=f"Pago {metodo_pago} {referencia_pago}".strip(),
+        )
+        return len(ids)
 
-    def listar_paginado(
+    def _filtros_listado(
         self,
-        limit: int,
-        offset: int,
-        estado: Optional[str] = None,
-        periodo: Optional[str] = None,
-        busqueda: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
-        """Lista liquidaciones con paginación y filtros complejos."""
-        conn = self.db.obtener_conexion()
-        cursor = self.db.get_dict_cursor(conn)
+        estado: Optional[str],
+        periodo: Optional[str],
+        busqueda: Optional[str],
+    ) -> Tuple[str, List[Any]]:
+        """FROM/WHERE compartido por listar_paginado y contar_con_filtros."""
         placeholder = self.db.get_placeholder()
 
         base_from = """
@@ -1167,6 +1185,37 @@ class RepositorioLiquidacionSQLite:
             query_params.extend([term, term, term, term])
 
         where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return f"{base_from} {where_clause}", query_params
+
+    def listar_paginado(
+        self,
+        limit: int,
+        offset: int,
+        estado: Optional[str] = None,
+        periodo: Optional[str] = None,
+        busqueda: Optional[str] = None,
+        despues_de: Optional[Sequence[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Lista liquidaciones con paginación y filtros complejos.
+
+        Si se indica `despues_de` (valores [periodo, id] de la última fila de
+        la página anterior) se pagina por keyset y se ignora `offset`.
+        """
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        placeholder = self.db.get_placeholder()
+
+        from_where, query_params = self._filtros_listado(estado, periodo, busqueda)
+
+        if despues_de is not None:
+            seek, seek_params = condicion_keyset(
+                ["l.PERIODO", "l.ID_LIQUIDACION"], despues_de, placeholder
+            )
+            conector = " AND " if "WHERE" in from_where else " WHERE "
+            from_where += conector + seek
+            query_params = query_params + seek_params
+            offset = 0
 
         query = f"""
             SELECT 
@@ -1174,7 +1223,7 @@ class RepositorioLiquidacionSQLite:
                 l.OTROS_INGRESOS, l.COMISION_MONTO, l.IVA_COMISION, l.IMPUESTO_4X1000,
                 l.GASTOS_ADMINISTRACION, l.GASTOS_SERVICIOS, l.GASTOS_REPARACIONES, l.OTROS_EGRESOS,
                 p.DIRECCION_PROPIEDAD
-            {base_from} {where_clause}
+            {from_where}
             ORDER BY l.PERIODO DESC, l.ID_LIQUIDACION DESC
             LIMIT {placeholder} OFFSET {placeholder}
         """
@@ -1210,59 +1259,12 @@ class RepositorioLiquidacionSQLite:
         estado: Optional[str] = None,
         periodo: Optional[str] = None,
         busqueda: Optional[str] = None,
+        estrategia: str = "exact",
+        ttl: int = 60,
     ) -> int:
-        """Cuenta total de liquidaciones filtradas."""
-        conn = self.db.obtener_conexion()
-        cursor = self.db.get_dict_cursor(conn)
-        placeholder = self.db.get_placeholder()
-
-        base_from = """
-            FROM LIQUIDACIONES l
-            JOIN CONTRATOS_MANDATOS cm ON l.ID_CONTRATO_M = cm.ID_CONTRATO_M
-            JOIN PROPIEDADES p ON cm.ID_PROPIEDAD = p.ID_PROPIEDAD
-            JOIN PROPIETARIOS prop ON cm.ID_PROPIETARIO = prop.ID_PROPIETARIO
-            JOIN PERSONAS per ON prop.ID_PERSONA = per.ID_PERSONA
-        """
-
-        conditions = []
-        query_params = []
-
-        if estado and estado != "Todos":
-            conditions.append(f"l.ESTADO_LIQUIDACION = {placeholder}")
-            query_params.append(estado)
-
-        if periodo:
-            conditions.append(f"l.PERIODO LIKE {placeholder}")
-            query_params.append(f"%{periodo}%")
-
-        if busqueda:
-            conditions.append(
-                f"(p.DIRECCION_PROPIEDAD LIKE {placeholder} OR per.NOMBRE_COMPLETO LIKE {placeholder} OR per.NUMERO_DOCUMENTO LIKE {placeholder} OR CAST(l.ID_CONTRATO_M AS TEXT) LIKE {placeholder})"
-            )
-            term = f"%{busqueda}%"
-            query_params.extend([term, term, term, term])
-
-        where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
-        query = f"SELECT COUNT(*) as TOTAL {base_from} {where_clause}"
-
-        cursor.execute(query, query_params)
-        row = cursor.fetchone()
-        if row:
-            # Soporte robusto para sqlite3.Row (acceso key/index) y dict (Postgres wrapper/Uppercase)
-            try:
-                # Intento 1: Alias explícito (Uppercase común en Postgres wrapper)
-                return row["TOTAL"]
-            except (KeyError, TypeError):
-                try:
-                    # Intento 2: Lowercase (SQLite dict factory a veces)
-                    return row["total"]
-                except (KeyError, TypeError):
-                    # Intento 3: Index access (sqlite3.Row o Tuple)
-                    try:
-                        return row[0]
-                    except (IndexError, TypeError):
-                        pass
-                    # Intento 4: Primer valor de dict (si las keys son raras)
-                    if isinstance(row, dict):
-                        return list(row.values())[0] if row else 0
-        return 0
+        """Cuenta total de liquidaciones filtradas (ver paginacion_sql.contar_total)."""
+        from_where, query_params = self._filtros_listado(estado, periodo, busqueda)
+        total, _ = contar_total(
+            self.db, from_where, query_params, estrategia, ttl, tabla_base="LIQUIDACIONES"
+        )
+        return total
@@ -0,0 +1,261 @@
+"""
+Repositorio de Persistencia: Outbox de Notificaciones
+Cola persistente de correos y mensajes de WhatsApp (NOTIFICACIONES_OUTBOX).
+
+Los casos de uso solo insertan filas; el DespachadorNotificaciones las reclama
+por lotes y registra el resultado de cada envío. Reclamar una fila la marca
+'Enviando' y la bloquea durante `bloqueo_segundos`: si el proceso muere a mitad
+del lote, la fila vuelve a ser reclamable cuando vence el bloqueo.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from src.dominio.entidades.notificacion_outbox import FORMATO_FECHA_HORA, NotificacionOutbox
+from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.esquema import asegurar_esquema
+
+
+class RepositorioNotificacionesOutboxSQLite:
+    """Repositorio del outbox de notificaciones (SQLite y PostgreSQL)."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        asegurar_esquema(db_manager, "NOTIFICACIONES_OUTBOX", self._ensure_tables)
+
+    def _ensure_tables(self):
+        """Crea la tabla en SQLite (en PostgreSQL la crea la migración)."""
+        if self.db_manager.use_postgresql:
+            return
+        with self.db_manager.transaccion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS NOTIFICACIONES_OUTBOX (
+                    ID_NOTIFICACION INTEGER PRIMARY KEY AUTOINCREMENT,
+                    CANAL TEXT NOT NULL CHECK(CANAL IN ('email', 'whatsapp')),
+                    DESTINATARIO TEXT NOT NULL,
+                    ASUNTO TEXT,
+                    CUERPO TEXT NOT NULL,
+                    ADJUNTO_PATH TEXT,
+                    REFERENCIA TEXT,
+                    ESTADO TEXT NOT NULL DEFAULT 'Pendiente'
+                        CHECK(ESTADO IN ('Pendiente', 'Enviando', 'Enviada', 'Fallida')),
+                    INTENTOS INTEGER NOT NULL DEFAULT 0,
+                    MAX_INTENTOS INTEGER NOT NULL DEFAULT 5,
+                    PROXIMO_INTENTO TEXT NOT NULL,
+                    ULTIMO_ERROR TEXT,
+                    CREATED_AT TEXT NOT NULL,
+                    ENVIADO_AT TEXT
+                )
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_notificaciones_outbox_despacho
+                ON NOTIFICACIONES_OUTBOX (CANAL, PROXIMO_INTENTO)
+                WHERE ESTADO IN ('Pendiente', 'Enviando')
+            """
+            )
+
+    def _row_to_entity(self, row) -> NotificacionOutbox:
+        return NotificacionOutbox(
+            id_notificacion=row["ID_NOTIFICACION"],
+            canal=row["CANAL"],
+            destinatario=row["DESTINATARIO"],
+            asunto=row["ASUNTO"],
+            cuerpo=row["CUERPO"],
+            adjunto_path=row["ADJUNTO_PATH"],
+            referencia=row["REFERENCIA"],
+            estado=row["ESTADO"],
+            intentos=row["INTENTOS"],
+            max_intentos=row["MAX_INTENTOS"],
+            proximo_intento=str(row["PROXIMO_INTENTO"]) if row["PROXIMO_INTENTO"] else None,
+            ultimo_error=row["ULTIMO_ERROR"],
+            created_at=str(row["CREATED_AT"]) if row["CREATED_AT"] else None,
+            enviado_at=str(row["ENVIADO_AT"]) if row["ENVIADO_AT"] else None,
+        )
+
+    def encolar(self, notificacion: NotificacionOutbox) -> int:
+        """
+        Inserta una notificación pendiente.
+
+        Returns:
+            ID asignado
+        """
+        placeholder = self.db_manager.get_placeholder()
+        ahora = datetime.now().strftime(FORMATO_FECHA_HORA)
+        with self.db_manager.transaccion() as conn:
+            cursor = self.db_manager.get_dict_cursor(conn)
+            cursor.execute(
+                f"""
+                INSERT INTO NOTIFICACIONES_OUTBOX (
+                    CANAL, DESTINATARIO, ASUNTO, CUERPO, ADJUNTO_PATH, REFERENCIA,
+                    ESTADO, INTENTOS, MAX_INTENTOS, PROXIMO_INTENTO, CREATED_AT
+                ) VALUES ({", ".join([placeholder] * 11)})
+                RETURNING ID_NOTIFICACION
+                """,
+                (
+                    notificacion.canal,
+                    notificacion.destinatario,
+                    notificacion.asunto,
+                    notificacion.cuerpo,
+                    notificacion.adjunto_path,
+                    notificacion.referencia,
+                    "Pendiente",
+                    0,
+                    notificacion.max_intentos,
+                    notificacion.proximo_intento or ahora,
+                    ahora,
+                ),
+            )
+            notificacion.id_notificacion = cursor.fetchone()["ID_NOTIFICACION"]
+        return notificacion.id_notificacion
+
+    def reclamar_lote(
+        self,
+        canal: str,
+        limite: int,
+        ahora: Optional[datetime] = None,
+        bloqueo_segundos: int = 300,
+    ) -> List[NotificacionOutbox]:
+        """
+        Reclama hasta `limite` notificaciones listas para enviar (más antiguas primero).
+
+        Incluye las 'Enviando' cuyo bloqueo venció (despachador caído a mitad de lote).
+        """
+        placeholder = self.db_manager.get_placeholder()
+        ahora = ahora or datetime.now()
+        bloqueo = (ahora + timedelta(seconds=bloqueo_segundos)).strftime(FORMATO_FECHA_HORA)
+        # PostgreSQL: varios despachadores no reclaman la misma fila
+        skip_locked = " FOR UPDATE SKIP LOCKED" if self.db_manager.use_postgresql else ""
+
+        with self.db_manager.transaccion() as conn:
+            cursor = self.db_manager.get_dict_cursor(conn)
+            cursor.execute(
+                f"""
+                UPDATE NOTIFICACIONES_OUTBOX
+                SET ESTADO = 'Enviando', PROXIMO_INTENTO = {placeholder}
+                WHERE ID_NOTIFICACION IN (
+                    SELECT ID_NOTIFICACION FROM NOTIFICACIONES_OUTBOX
+                    WHERE CANAL = {placeholder}
+                    AND ESTADO IN ('Pendiente', 'Enviando')
+                    AND PROXIMO_INTENTO <= {placeholder}
+                    ORDER BY PROXIMO_INTENTO, ID_NOTIFICACION
+                    LIMIT {placeholder}{skip_locked}
+                )
+                RETURNING *
+                """,
+                (bloqueo, canal, ahora.strftime(FORMATO_FECHA_HORA), limite),
+            )
+            reclamadas = [self._row_to_entity(row) for row in cursor.fetchall()]
+
+        return sorted(reclamadas, key=lambda n: n.id_notificacion)
+
+    def marcar_enviada(self, id_notificacion: int) -> None:
+        """Registra la entrega exitosa."""
+        placeholder = self.db_manager.get_placeholder()
+        with self.db_manager.transaccion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                UPDATE NOTIFICACIONES_OUTBOX
+                SET ESTADO = 'Enviada', INTENTOS = INTENTOS + 1, ULTIMO_ERROR = NULL,
+                    ENVIADO_AT = {placeholder}
+                WHERE ID_NOTIFICACION = {placeholder}
+                """,
+                (datetime.now().strftime(FORMATO_FECHA_HORA), id_notificacion),
+            )
+
+    def registrar_fallo(
+        self, id_notificacion: int, error: str, proximo_intento: Optional[str]
+    ) -> None:
+        """
+        Registra un intento fallido.
+
+        Args:
+            proximo_intento: Fecha del reintento, o None para marcarla Fallida
+        """
+        placeholder = self.db_manager.get_placeholder()
+        with self.db_manager.transaccion() as conn:
+            cursor = conn.cursor()
+            if proximo_intento:
+                cursor.execute(
+                    f"""
+                    UPDATE NOTIFICACIONES_OUTBOX
+                    SET ESTADO = 'Pendiente', INTENTOS = INTENTOS + 1,
+                        ULTIMO_ERROR = {placeholder}, PROXIMO_INTENTO = {placeholder}
+                    WHERE ID_NOTIFICACION = {placeholder}
+                    """,
+                    (error[:1000], proximo_intento, id_notificacion),
+                )
+            else:
+                cursor.execute(
+                    f"""
+                    UPDATE NOTIFICACIONES_OUTBOX
+                    SET ESTADO = 'Fallida', INTENTOS = INTENTOS + 1, ULTIMO_ERROR = {placeholder}
+                    WHERE ID_NOTIFICACION = {placeholder}
+                    """,
+                    (error[:1000], id_notificacion),
+                )
+
+    def liberar(self, id_notificacion: int, proximo_intento: str) -> None:
+        """Devuelve una notificación reclamada sin contar intento (ej. límite de tasa)."""
+        placeholder = self.db_manager.get_placeholder()
+        with self.db_manager.transaccion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                UPDATE NOTIFICACIONES_OUTBOX
+                SET ESTADO = 'Pendiente', PROXIMO_INTENTO = {placeholder}
+                WHERE ID_NOTIFICACION = {placeholder}
+                """,
+                (proximo_intento, id_notificacion),
+            )
+
+    def reintentar(self, id_notificacion: int) -> None:
+        """Reprograma una notificación Fallida para envío inmediato (acción manual)."""
+        placeholder = self.db_manager.get_placeholder()
+        with self.db_manager.transaccion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                UPDATE NOTIFICACIONES_OUTBOX
+                SET ESTADO = 'Pendiente', INTENTOS = 0, PROXIMO_INTENTO = {placeholder}
+                WHERE ID_NOTIFICACION = {placeholder} AND ESTADO = 'Fallida'
+                """,
+                (datetime.now().strftime(FORMATO_FECHA_HORA), id_notificacion),
+            )
+
+    def obtener_por_id(self, id_notificacion: int) -> Optional[NotificacionOutbox]:
+        placeholder = self.db_manager.get_placeholder()
+        conn = self.db_manager.obtener_conexion()
+        cursor = self.db_manager.get_dict_cursor(conn)
+        cursor.execute(
+            f"SELECT * FROM NOTIFICACIONES_OUTBOX WHERE ID_NOTIFICACION = {placeholder}",
+            (id_notificacion,),
+        )
+        row = cursor.fetchone()
+        return self._row_to_entity(row) if row else None
+
+    def contar_por_estado(self, canal: Optional[str] = None) -> Dict[str, int]:
+        """Totales por estado de entrega (todos los estados, con cero si no hay filas)."""
+        placeholder = self.db_manager.get_placeholder()
+        where, params = "", []
+        if canal:
+            where, params = f"WHERE CANAL = {placeholder}", [canal]
+
+        conn = self.db_manager.obtener_conexion()
+        cursor = self.db_manager.get_dict_cursor(conn)
+        cursor.execute(
+            f"""
+            SELECT ESTADO, COUNT(*) AS TOTAL FROM NOTIFICACIONES_OUTBOX
+            {where}
+            GROUP BY ESTADO
+            """,
+            params,
+        )
+        conteos = {estado: 0 for estado in NotificacionOutbox.ESTADOS}
+        for row in cursor.fetchall():
+            conteos[row["ESTADO"]] = row["TOTAL"]
+        return conteos
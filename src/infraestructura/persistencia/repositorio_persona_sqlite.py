@@ -7,7 +7,13 @@ from datetime import datetime
 from typing import List, Optional
 
 from src.dominio.entidades.persona import Persona
+from src.dominio.entidades.registros import PersonaRegistro
 from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.filas import MapeadorEntidad
+from src.infraestructura.persistencia.repositorio_busqueda_sqlite import RepositorioBusquedaSQLite
+
+# Exportaciones: registros de solo lectura directos desde las tuplas
+MAPEADOR_PERSONA_REGISTRO = MapeadorEntidad(PersonaRegistro)
 
 
 class RepositorioPersonaSQLite:
@@ -18,6 +24,7 @@ class RepositorioPersonaSQLite:
 
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        self.busqueda = RepositorioBusquedaSQLite(db_manager)
 
     def _row_to_entity(self, row) -> Persona:
         """Convierte una fila SQL a entidad Persona."""
@@ -88,8 +95,13 @@ class RepositorioPersonaSQLite:
         fecha_fin: Optional[str] = None,
         limit: Optional[int] = None,
         offset: int = 0,
+        solo_lectura: bool = False,
     ) -> List[Persona]:
-        """Obtiene personas con filtros y paginación."""
+        """
+        Obtiene personas con filtros y paginación.
+
+        Con solo_lectura=True devuelve PersonaRegistro (exportaciones).
+        """
         conn = self.db.obtener_conexion()
         cursor = self.db.get_dict_cursor(conn)
         placeholder = self.db.get_placeholder()
@@ -116,11 +128,11 @@ class RepositorioPersonaSQLite:
             conditions.append("p.ESTADO_REGISTRO = TRUE")
 
         if busqueda:
-            conditions.append(
-                f"(p.NOMBRE_COMPLETO LIKE {placeholder} OR p.NUMERO_DOCUMENTO LIKE {placeholder})"
+            condicion, busqueda_params = self.busqueda.condicion(
+                "PERSONA", "p.ID_PERSONA", busqueda
             )
-            busqueda_param = f"%{busqueda}%"
-            params.extend([busqueda_param, busqueda_param])
+            conditions.append(condicion)
+            params.extend(busqueda_params)
 
         if fecha_inicio:
             conditions.append(f"DATE(p.CREATED_AT) >= {placeholder}")
@@ -140,6 +152,8 @@ class RepositorioPersonaSQLite:
             params.extend([limit, offset])
 
         cursor.execute(query, params)
+        if solo_lectura:
+            return MAPEADOR_PERSONA_REGISTRO.mapear(cursor)
         return [self._row_to_entity(row) for row in cursor.fetchall()]
 
     def contar_todos(
@@ -178,11 +192,11 @@ class RepositorioPersonaSQLite:
             conditions.append("p.ESTADO_REGISTRO = TRUE")
 
         if busqueda:
-            conditions.append(
-                f"(p.NOMBRE_COMPLETO LIKE {placeholder} OR p.NUMERO_DOCUMENTO LIKE {placeholder})"
+            condicion, busqueda_params = self.busqueda.condicion(
+                "PERSONA", "p.ID_PERSONA", busqueda
             )
-            busqueda_param = f"%{busqueda}%"
-            params.extend([busqueda_param, busqueda_param])
+            conditions.append(condicion)
+            params.extend(busqueda_params)
 
         if fecha_inicio:
             conditions.append(f"DATE(p.CREATED_AT) >= {placeholder}")
@@ -7,12 +7,13 @@ from typing import List
 
 from src.dominio.entidades.poliza import PolizaSeguro
 from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.esquema import asegurar_esquema
 
 
 class RepositorioPolizaSQLite:
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
-        self._ensure_table()
+        asegurar_esquema(db_manager, "POLIZAS", self._ensure_table)
 
     def _ensure_table(self):
         if self.db.use_postgresql:
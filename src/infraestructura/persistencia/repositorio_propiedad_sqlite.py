@@ -7,7 +7,14 @@ from datetime import datetime
 from typing import List, Optional
 
 from src.dominio.entidades.propiedad import Propiedad
+from src.dominio.entidades.registros import PropiedadRegistro
 from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.repositorio_busqueda_sqlite import RepositorioBusquedaSQLite
+from src.infraestructura.persistencia.filas import MapeadorEntidad
+
+# Mismo resultado que _row_to_entity (get_val: vacíos como None) más IMAGEN_PRINCIPAL_ID
+MAPEADOR_PROPIEDAD = MapeadorEntidad(Propiedad, vacios_como_none=True)
+MAPEADOR_PROPIEDAD_REGISTRO = MapeadorEntidad(PropiedadRegistro, vacios_como_none=True)
 
 
 class RepositorioPropiedadSQLite:
@@ -18,6 +25,7 @@ class RepositorioPropiedadSQLite:
 
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        self.busqueda = RepositorioBusquedaSQLite(db_manager)
 
     def _row_to_entity(self, row) -> Propiedad:
         """Convierte una fila SQL a entidad Propiedad."""
@@ -107,9 +115,14 @@ class RepositorioPropiedadSQLite:
         solo_activas: bool = True,
         busqueda: Optional[str] = None,
         limit: Optional[int] = None,
-        offset: int = 0
+        offset: int = 0,
+        solo_lectura: bool = False,
     ) -> List[Propiedad]:
-        """Lista propiedades con filtros aplicados."""
+        """
+        Lista propiedades con filtros aplicados.
+
+        Con solo_lectura=True devuelve PropiedadRegistro (exportaciones y reportes).
+        """
         conn = self.db.obtener_conexion()
         cursor = self.db.get_dict_cursor(conn)
         placeholder = self.db.get_placeholder()
@@ -145,11 +158,11 @@ class RepositorioPropiedadSQLite:
             params.append(True)
 
         if busqueda:
-            conditions.append(
-                f"(p.MATRICULA_INMOBILIARIA LIKE {placeholder} OR p.DIRECCION_PROPIEDAD LIKE {placeholder})"
+            condicion, busqueda_params = self.busqueda.condicion(
+                "PROPIEDAD", "p.ID_PROPIEDAD", busqueda
             )
-            busqueda_param = f"%{busqueda}%"
-            params.extend([busqueda_param, busqueda_param])
+            conditions.append(condicion)
+            params.extend(busqueda_params)
 
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
@@ -161,17 +174,10 @@ class RepositorioPropiedadSQLite:
             params.extend([limit, offset])
 
         cursor.execute(query, params)
-        rows = cursor.fetchall()
-
-        propiedades = []
-        for row in rows:
-            p = self._row_to_entity(row)
-            img_id = row.get("IMAGEN_PRINCIPAL_ID") or row.get("imagen_principal_id")
-            if img_id:
-                p.imagen_principal_id = img_id
-            propiedades.append(p)
-
-        return propiedades
+        # Listado y exportación: entidades directas desde las tuplas
+        if solo_lectura:
+            return MAPEADOR_PROPIEDAD_REGISTRO.mapear(cursor)
+        return MAPEADOR_PROPIEDAD.mapear(cursor)
 
     def contar_con_filtros(
         self,
@@ -207,11 +213,11 @@ class RepositorioPropiedadSQLite:
             params.append(True)
 
         if busqueda:
-            conditions.append(
-                f"(p.MATRICULA_INMOBILIARIA LIKE {placeholder} OR p.DIRECCION_PROPIEDAD LIKE {placeholder})"
+            condicion, busqueda_params = self.busqueda.condicion(
+                "PROPIEDAD", "p.ID_PROPIEDAD", busqueda
             )
-            busqueda_param = f"%{busqueda}%"
-            params.extend([busqueda_param, busqueda_param])
+            conditions.append(condicion)
+            params.extend(busqueda_params)
 
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
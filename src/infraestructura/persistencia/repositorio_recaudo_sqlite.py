@@ -4,11 +4,24 @@ Implementa persistencia para pagos recibidos de inquilinos.
 """
 
 from datetime import datetime
-from typing import List, Optional, Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from src.dominio.entidades.recaudo import Recaudo
 from src.dominio.entidades.recaudo_concepto import RecaudoConcepto
+from src.dominio.entidades.registros import RecaudoRegistro
 from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.esquema import asegurar_esquema
+from src.infraestructura.persistencia.filas import MapeadorEntidad
+from src.infraestructura.persistencia.repositorio_cartera_mora_sqlite import (
+    RepositorioCarteraMoraSQLite,
+)
+from src.infraestructura.persistencia.paginacion_sql import condicion_keyset, contar_total
+
+# Observaciones de los recaudos de canon generados masivamente
+PREFIJO_CARGO_MASIVO = "Pago masivo generado - "
+
+# Historiales y reportes: registros de solo lectura directos desde las tuplas
+MAPEADOR_RECAUDO_REGISTRO = MapeadorEntidad(RecaudoRegistro)
 
 
 class RepositorioRecaudoSQLite:
@@ -16,7 +29,8 @@ class RepositorioRecaudoSQLite:
 
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
-        self._crear_tablas_si_no_existen()
+        asegurar_esquema(db_manager, "RECAUDOS", self._crear_tablas_si_no_existen)
+        self.cartera_mora = RepositorioCarteraMoraSQLite(db_manager)
 
     def _crear_tablas_si_no_existen(self):
         if self.db.use_postgresql:
@@ -62,6 +76,42 @@ class RepositorioRecaudoSQLite:
         """
         )
 
+        # Registro de cargos generados masivamente: uno por (contrato, período, concepto)
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'CARGOS_MENSUALES'"
+        )
+        if not cursor.fetchone():
+            cursor.execute(
+                """
+            CREATE TABLE CARGOS_MENSUALES (
+                ID_CONTRATO_A INTEGER NOT NULL,
+                PERIODO TEXT NOT NULL,
+                TIPO_CONCEPTO TEXT NOT NULL,
+                ID_RECAUDO INTEGER,
+                CREATED_AT TEXT NOT NULL,
+                CREATED_BY TEXT,
+                PRIMARY KEY (ID_CONTRATO_A, PERIODO, TIPO_CONCEPTO)
+            )
+            """
+            )
+            cursor.execute(
+                "CREATE INDEX idx_cargos_mensuales_recaudo ON CARGOS_MENSUALES (ID_RECAUDO)"
+            )
+            # Los pagos masivos generados antes del registro también cuentan
+            cursor.execute(
+                f"""
+            INSERT INTO CARGOS_MENSUALES (
+                ID_CONTRATO_A, PERIODO, TIPO_CONCEPTO, ID_RECAUDO, CREATED_AT, CREATED_BY
+            )
+            SELECT r.ID_CONTRATO_A, rc.PERIODO, rc.TIPO_CONCEPTO, MIN(r.ID_RECAUDO),
+                   MIN(r.CREATED_AT), MIN(r.CREATED_BY)
+            FROM RECAUDOS r
+            JOIN RECAUDO_CONCEPTOS rc ON rc.ID_RECAUDO = r.ID_RECAUDO
+            WHERE r.OBSERVACIONES LIKE '{PREFIJO_CARGO_MASIVO}%'
+            GROUP BY r.ID_CONTRATO_A, rc.PERIODO, rc.TIPO_CONCEPTO
+            """
+            )
+
         conn.commit()
 
     def _get_row_dict(self, row):
@@ -111,6 +161,28 @@ class RepositorioRecaudoSQLite:
             created_at=(row_dict.get("created_at") or row_dict.get("CREATED_AT")),
         )
 
+    def _pagos_canon(self, cursor, id_recaudo: int) -> Tuple[Optional[int], Optional[str], list]:
+        """Contrato, estado y pagos de canon (periodo, valor) de un recaudo."""
+        placeholder = self.db.get_placeholder()
+        cursor.execute(
+            f"""
+            SELECT r.ID_CONTRATO_A, r.ESTADO_RECAUDO, rc.PERIODO, rc.VALOR
+            FROM RECAUDOS r
+            LEFT JOIN RECAUDO_CONCEPTOS rc
+                ON rc.ID_RECAUDO = r.ID_RECAUDO AND rc.TIPO_CONCEPTO = 'Canon'
+            WHERE r.ID_RECAUDO = {placeholder}
+        """,
+            (id_recaudo,),
+        )
+        filas = cursor.fetchall()
+        if not filas:
+            return None, None, []
+        return (
+            filas[0]["ID_CONTRATO_A"],
+            filas[0]["ESTADO_RECAUDO"],
+            [(f["PERIODO"], f["VALOR"]) for f in filas if f["PERIODO"] is not None],
+        )
+
     def crear(
         self, recaudo: Recaudo, conceptos: List[RecaudoConcepto], usuario_sistema: str
     ) -> Recaudo:
@@ -171,9 +243,149 @@ class RepositorioRecaudoSQLite:
                 ),
             )
 
+        if recaudo.estado_recaudo != "Reversado":
+            self.cartera_mora.aplicar_pagos(
+                conn,
+                recaudo.id_contrato_a,
+                [(c.periodo, c.valor) for c in conceptos if c.tipo_concepto == "Canon"],
+            )
+
         conn.commit()
         return recaudo
 
+    def generar_cargos_mensuales(
+        self,
+        periodo: str,
+        fecha_pago: str,
+        observaciones: str,
+        usuario_sistema: str,
+        progreso: Optional[Callable[[int, str], None]] = None,
+    ) -> Dict[str, int]:
+        """
+        Genera el recaudo de canon del período para todos los contratos activos.
+
+        Idempotente: CARGOS_MENSUALES admite un cargo por (contrato, período,
+        concepto), así que repetir la generación (doble clic, dos sesiones)
+        solo crea los que faltan. Corre en una transacción con un número fijo
+        de sentencias INSERT ... SELECT, sin importar cuántos contratos haya.
+
+        Args:
+            periodo: 'YYYY-MM' del canon que se cobra
+            progreso: Callback (porcentaje, etapa) para mostrar el avance
+
+        Returns:
+            Dict con activos, creados, omitidos (ya generados) e invalidos (sin canon)
+        """
+        avisar = progreso or (lambda _porcentaje, _etapa: None)
+        placeholder = self.db.get_placeholder()
+        marca = datetime.now().isoformat()
+        del_lote = (
+            f"g.CREATED_AT = {placeholder} AND g.PERIODO = {placeholder} "
+            "AND g.TIPO_CONCEPTO = 'Canon'"
+        )
+
+        with self.db.transaccion() as conn:
+            cursor = self.db.get_dict_cursor(conn)
+
+            avisar(10, "Reservando cargos del período")
+            cursor.execute(
+                """
+                SELECT COUNT(*) AS ACTIVOS,
+                       SUM(CASE WHEN CANON_ARRENDAMIENTO > 0 THEN 0 ELSE 1 END) AS INVALIDOS
+                FROM CONTRATOS_ARRENDAMIENTOS WHERE ESTADO_CONTRATO_A = 'Activo'
+                """
+            )
+            fila = cursor.fetchone()
+            activos, invalidos = int(fila["ACTIVOS"] or 0), int(fila["INVALIDOS"] or 0)
+            cursor.execute(
+                f"""
+                INSERT INTO CARGOS_MENSUALES (
+                    ID_CONTRATO_A, PERIODO, TIPO_CONCEPTO, CREATED_AT, CREATED_BY
+                )
+                SELECT ID_CONTRATO_A, {placeholder}, 'Canon', {placeholder}, {placeholder}
+                FROM CONTRATOS_ARRENDAMIENTOS
+                WHERE ESTADO_CONTRATO_A = 'Activo' AND CANON_ARRENDAMIENTO > 0
+                ON CONFLICT (ID_CONTRATO_A, PERIODO, TIPO_CONCEPTO) DO NOTHING
+                """,
+                (periodo, marca, usuario_sistema),
+            )
+            creados = max(cursor.rowcount, 0)
+            resultado = {
+                "activos": activos,
+                "creados": creados,
+                "omitidos": activos - invalidos - creados,
+                "invalidos": invalidos,
+            }
+            if not creados:
+                avisar(100, "Sin cargos nuevos")
+                return resultado
+
+            avisar(30, f"Creando {creados} recaudos")
+            cursor.execute("SELECT COALESCE(MAX(ID_RECAUDO), 0) AS ULTIMO FROM RECAUDOS")
+            ultimo_id = cursor.fetchone()["ULTIMO"]
+            cursor.execute(
+                f"""
+                INSERT INTO RECAUDOS (
+                    ID_CONTRATO_A, FECHA_PAGO, VALOR_TOTAL, METODO_PAGO,
+                    REFERENCIA_BANCARIA, ESTADO_RECAUDO, OBSERVACIONES,
+                    CREATED_AT, CREATED_BY
+                )
+                SELECT g.ID_CONTRATO_A, {placeholder}, ca.CANON_ARRENDAMIENTO, 'Efectivo',
+                       NULL, 'Pendiente', {placeholder}, {placeholder}, {placeholder}
+                FROM CARGOS_MENSUALES g
+                JOIN CONTRATOS_ARRENDAMIENTOS ca ON ca.ID_CONTRATO_A = g.ID_CONTRATO_A
+                WHERE {del_lote}
+                ORDER BY g.ID_CONTRATO_A
+                """,
+                (fecha_pago, observaciones, marca, usuario_sistema, marca, periodo),
+            )
+
+            avisar(55, "Enlazando cargos y recaudos")
+            cursor.execute(
+                f"""
+                UPDATE CARGOS_MENSUALES SET ID_RECAUDO = r.ID_RECAUDO
+                FROM RECAUDOS r
+                WHERE r.ID_RECAUDO > {placeholder} AND r.CREATED_AT = {placeholder}
+                AND r.ID_CONTRATO_A = CARGOS_MENSUALES.ID_CONTRATO_A
+                AND CARGOS_MENSUALES.CREATED_AT = {placeholder}
+                AND CARGOS_MENSUALES.PERIODO = {placeholder}
+                AND CARGOS_MENSUALES.TIPO_CONCEPTO = 'Canon'
+                """,
+                (ultimo_id, marca, marca, periodo),
+            )
+
+            avisar(70, "Creando conceptos de canon")
+            cursor.execute(
+                f"""
+                INSERT INTO RECAUDO_CONCEPTOS (
+                    ID_RECAUDO, TIPO_CONCEPTO, PERIODO, VALOR, CREATED_AT
+                )
+                SELECT r.ID_RECAUDO, 'Canon', g.PERIODO, r.VALOR_TOTAL, {placeholder}
+                FROM CARGOS_MENSUALES g
+                JOIN RECAUDOS r ON r.ID_RECAUDO = g.ID_RECAUDO
+                WHERE {del_lote}
+                """,
+                (marca, marca, periodo),
+            )
+
+            avisar(85, "Actualizando cartera en mora")
+            cursor.execute(
+                f"""
+                SELECT g.ID_CONTRATO_A, r.VALOR_TOTAL
+                FROM CARGOS_MENSUALES g
+                JOIN RECAUDOS r ON r.ID_RECAUDO = g.ID_RECAUDO
+                WHERE {del_lote}
+                """,
+                (marca, periodo),
+            )
+            self.cartera_mora.aplicar_pagos_lote(
+                conn,
+                [(row["ID_CONTRATO_A"], periodo, row["VALOR_TOTAL"]) for row in cursor.fetchall()],
+            )
+
+        avisar(100, f"{creados} cargos generados")
+        return resultado
+
     def obtener_por_id(self, id_recaudo: int) -> Optional[Recaudo]:
         """Obtiene un recaudo por su ID"""
         conn = self.db.obtener_conexion()
@@ -198,8 +410,8 @@ class RepositorioRecaudoSQLite:
 
         return [self._concepto_row_to_entity(row) for row in cursor.fetchall()]
 
-    def listar_por_contrato(self, id_contrato_a: int) -> List[Recaudo]:
-        """Lista todos los recaudos de un contrato"""
+    def listar_por_contrato(self, id_contrato_a: int, solo_lectura: bool = False) -> List[Recaudo]:
+        """Lista todos los recaudos de un contrato (RecaudoRegistro con solo_lectura=True)"""
         conn = self.db.obtener_conexion()
         cursor = self.db.get_dict_cursor(conn)
         placeholder = self.db.get_placeholder()
@@ -209,6 +421,8 @@ class RepositorioRecaudoSQLite:
             (id_contrato_a,),
         )
 
+        if solo_lectura:
+            return MAPEADOR_RECAUDO_REGISTRO.mapear(cursor)
         return [self._row_to_entity(row) for row in cursor.fetchall()]
 
     def listar_todos(self) -> List[Recaudo]:
@@ -257,6 +471,7 @@ class RepositorioRecaudoSQLite:
         conn = self.db.obtener_conexion()
         cursor = conn.cursor()
         placeholder = self.db.get_placeholder()
+        id_contrato, estado_anterior, pagos = self._pagos_canon(cursor, id_recaudo)
 
         cursor.execute(
             f"""
@@ -269,6 +484,11 @@ class RepositorioRecaudoSQLite:
             (nuevo_estado, datetime.now().isoformat(), usuario_sistema, id_recaudo),
         )
 
+        # Reversar descuenta el pago de la cartera; deshacer la reversa lo devuelve
+        if pagos and (estado_anterior == "Reversado") != (nuevo_estado == "Reversado"):
+            signo = -1 if nuevo_estado == "Reversado" else 1
+            self.cartera_mora.aplicar_pagos(conn, id_contrato, pagos, signo)
+
         conn.commit()
 
     def eliminar(self, id_recaudo: int, usuario_sistema: str) -> None:
@@ -276,6 +496,7 @@ class RepositorioRecaudoSQLite:
         conn = self.db.obtener_conexion()
         cursor = conn.cursor()
         placeholder = self.db.get_placeholder()
+        id_contrato, estado, pagos = self._pagos_canon(cursor, id_recaudo)
 
         # Primero eliminar conceptos asociados
         cursor.execute(
@@ -293,6 +514,14 @@ class RepositorioRecaudoSQLite:
             (id_recaudo,),
         )
 
+        # Un cargo masivo eliminado se puede volver a generar
+        cursor.execute(
+            f"DELETE FROM CARGOS_MENSUALES WHERE ID_RECAUDO = {placeholder}", (id_recaudo,)
+        )
+
+        if pagos and estado != "Reversado":
+            self.cartera_mora.aplicar_pagos(conn, id_contrato, pagos, -1)
+
         conn.commit()
 
     def actualizar(self, recaudo: Recaudo, usuario_sistema: str) -> None:
@@ -327,18 +556,14 @@ class RepositorioRecaudoSQLite:
 
         conn.commit()
 
-    def listar_paginado(
+    def _filtros_listado(
         self,
-        limit: int,
-        offset: int,
-        estado: Optional[str] = None,
-        fecha_desde: Optional[str] = None,
-        fecha_hasta: Optional[str] = None,
-        busqueda: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """Lista recaudos con paginación y filtros complejos."""
-        conn = self.db.obtener_conexion()
-        cursor = self.db.get_dict_cursor(conn)
+        estado: Optional[str],
+        fecha_desde: Optional[str],
+        fecha_hasta: Optional[str],
+        busqueda: Optional[str],
+    ) -> Tuple[str, List[Any]]:
+        """FROM/WHERE compartido por listar_paginado y contar_con_filtros."""
         placeholder = self.db.get_placeholder()
 
         base_from = """
@@ -370,12 +595,46 @@ class RepositorioRecaudoSQLite:
             query_params.extend([term, term, term])
 
         where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return f"{base_from} {where_clause}", query_params
+
+    def listar_paginado(
+        self,
+        limit: int,
+        offset: int,
+        estado: Optional[str] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        busqueda: Optional[str] = None,
+        despues_de: Optional[Sequence[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Lista recaudos con paginación y filtros complejos.
+
+        Si se indica `despues_de` (valores [fecha, id] de la última fila de la
+        página anterior) se pagina por keyset y se ignora `offset`.
+        """
+        conn = self.db.obtener_conexion()
+        cursor = self.db.get_dict_cursor(conn)
+        placeholder = self.db.get_placeholder()
+
+        from_where, query_params = self._filtros_listado(
+            estado, fecha_desde, fecha_hasta, busqueda
+        )
+
+        if despues_de is not None:
+            seek, seek_params = condicion_keyset(
+                ["r.FECHA_PAGO", "r.ID_RECAUDO"], despues_de, placeholder
+            )
+            conector = " AND " if "WHERE" in from_where else " WHERE "
+            from_where += conector + seek
+            query_params = query_params + seek_params
+            offset = 0
 
         query = f"""
             SELECT 
                 r.ID_RECAUDO, r.FECHA_PAGO, r.ESTADO_RECAUDO, r.VALOR_TOTAL, r.METODO_PAGO,
                 p.DIRECCION_PROPIEDAD
-            {base_from} {where_clause}
+            {from_where}
             ORDER BY r.FECHA_PAGO DESC, r.ID_RECAUDO DESC
             LIMIT {placeholder} OFFSET {placeholder}
         """
@@ -398,48 +657,15 @@ class RepositorioRecaudoSQLite:
         estado: Optional[str] = None,
         fecha_desde: Optional[str] = None,
         fecha_hasta: Optional[str] = None,
-        busqueda: Optional[str] = None
+        busqueda: Optional[str] = None,
+        estrategia: str = "exact",
+        ttl: int = 60,
     ) -> int:
-        """Cuenta total de recaudos filtrados."""
-        conn = self.db.obtener_conexion()
-        cursor = self.db.get_dict_cursor(conn)
-        placeholder = self.db.get_placeholder()
-
-        base_from = """
-            FROM RECAUDOS r
-            JOIN CONTRATOS_ARRENDAMIENTOS ca ON r.ID_CONTRATO_A = ca.ID_CONTRATO_A
-            JOIN PROPIEDADES p ON ca.ID_PROPIEDAD = p.ID_PROPIEDAD
-        """
-
-        conditions = []
-        query_params = []
-
-        if estado and estado != "Todos":
-            conditions.append(f"r.ESTADO_RECAUDO = {placeholder}")
-            query_params.append(estado)
-
-        if fecha_desde:
-            conditions.append(f"r.FECHA_PAGO >= {placeholder}")
-            query_params.append(fecha_desde)
-
-        if fecha_hasta:
-            conditions.append(f"r.FECHA_PAGO <= {placeholder}")
-            query_params.append(fecha_hasta)
-
-        if busqueda:
-            conditions.append(
-                f"(r.REFERENCIA_BANCARIA LIKE {placeholder} OR p.DIRECCION_PROPIEDAD LIKE {placeholder} OR CAST(r.ID_RECAUDO AS TEXT) LIKE {placeholder})"
-            )
-            term = f"%{busqueda}%"
-            query_params.extend([term, term, term])
-
-        where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
-        query = f"SELECT COUNT(*) AS total {base_from} {where_clause}"
-
-        cursor.execute(query, query_params)
-        row = cursor.fetchone()
-        if row:
-            if hasattr(row, "keys"):
-                return row["total"]
-            return row[0]
-        return 0
+        """Cuenta total de recaudos filtrados (ver paginacion_sql.contar_total)."""
+        from_where, query_params = self._filtros_listado(
+            estado, fecha_desde, fecha_hasta, busqueda
+        )
+        total, _ = contar_total(
+            self.db, from_where, query_params, estrategia, ttl, tabla_base="RECAUDOS"
+        )
+        return total
@@ -0,0 +1,409 @@
+"""
+Perfil de producción de SQLite.
+
+Para despliegues de un solo nodo con varios usuarios concurrentes (eventos
+en segundo plano de Reflex):
+
+- PerfilSQLite: journal WAL (los lectores no bloquean al escritor ni al
+  revés), synchronous=NORMAL, busy_timeout, cache_size, mmap_size y
+  temp_store en memoria en cada conexión.
+- PoolLecturas: conexiones de solo lectura (mode=ro, query_only) acotadas;
+  quien no encuentra una libre espera su turno en vez de abrir otra.
+- ColaEscritura: turnos de escritura FIFO por proceso. Las transacciones
+  siguen en la conexión del hilo (abarcan código de los repositorios), pero
+  solo una escribe a la vez y las demás esperan en orden de llegada, en vez
+  de competir por el lock de SQLite hasta "database is locked".
+- ConexionEscritura: la conexión del hilo toma el turno en su primera
+  sentencia de escritura y lo suelta al confirmar o deshacer, así que las
+  escrituras con obtener_conexion() + commit() también hacen cola, no solo
+  las de DatabaseManager.transaccion().
+- PerfilSQLite.preparar(): activa WAL, verifica la integridad y ejecuta
+  PRAGMA optimize al iniciar.
+
+Ver tests/benchmarks/sqlite_concurrencia.py para la comparación con las
+conexiones por hilo sin perfil.
+"""
+
+import logging
+import queue
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+VERIFICACIONES = {"quick": "PRAGMA quick_check", "completa": "PRAGMA integrity_check", "ninguna": None}
+
+_LECTURAS = ("SELECT", "PRAGMA", "EXPLAIN", "VALUES")
+_RE_INICIO = re.compile(r"(?:\s+|--[^\n]*\n?|/\*.*?\*/|\()*", re.DOTALL)
+
+
+def es_lectura(sql: str) -> bool:
+    """La sentencia empieza por SELECT/PRAGMA/EXPLAIN/VALUES (sin contar comentarios)."""
+    inicio = _RE_INICIO.match(sql).end()
+    return sql[inicio : inicio + 7].upper().startswith(_LECTURAS)
+
+
+class PerfilSQLite:
+    """
+    Apertura de conexiones con los pragmas de producción.
+
+    Args:
+        ruta: Archivo de la base
+        busy_timeout_ms: Espera ante un lock antes de fallar
+        cache_kib: Caché de páginas por conexión
+        mmap_mb: Tamaño del mapeo en memoria del archivo (0 lo desactiva)
+        cached_statements: Sentencias preparadas en caché por conexión
+    """
+
+    def __init__(
+        self,
+        ruta: Path,
+        busy_timeout_ms: int = 5000,
+        cache_kib: int = 16384,
+        mmap_mb: int = 256,
+        cached_statements: int = 2048,
+    ):
+        self.ruta = Path(ruta)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_kib = cache_kib
+        self.mmap_mb = mmap_mb
+        self.cached_statements = cached_statements
+
+    def conectar(self, solo_lectura: bool = False) -> sqlite3.Connection:
+        """
+        Conexión con filas sqlite3.Row y los pragmas del perfil.
+
+        Las de escritura abren sus transacciones con BEGIN IMMEDIATE: toman el
+        lock de escritura al empezar, donde busy_timeout todavía puede esperar.
+        """
+        if solo_lectura:
+            conexion = sqlite3.connect(
+                f"{self.ruta.resolve().as_uri()}?mode=ro",
+                uri=True,
+                timeout=self.busy_timeout_ms / 1000,
+                check_same_thread=False,
+                cached_statements=self.cached_statements,
+            )
+        else:
+            conexion = sqlite3.connect(
+                str(self.ruta),
+                timeout=self.busy_timeout_ms / 1000,
+                check_same_thread=False,
+                cached_statements=self.cached_statements,
+                isolation_level="IMMEDIATE",
+            )
+        conexion.row_factory = sqlite3.Row
+        conexion.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conexion.execute("PRAGMA synchronous = NORMAL")
+        conexion.execute(f"PRAGMA cache_size = -{int(self.cache_kib)}")
+        conexion.execute(f"PRAGMA mmap_size = {int(self.mmap_mb) * 1024 * 1024}")
+        conexion.execute("PRAGMA temp_store = MEMORY")
+        if solo_lectura:
+            conexion.execute("PRAGMA query_only = ON")
+        else:
+            conexion.execute("PRAGMA foreign_keys = ON")
+        return conexion
+
+    def preparar(self, verificacion: str = "quick") -> Dict[str, Any]:
+        """
+        Activa WAL (persiste en el archivo), verifica la integridad y optimiza.
+
+        Una base dañada no impide iniciar: se registra el error y el detalle
+        queda en el resultado (DatabaseManager.get_db_info).
+        """
+        if verificacion not in VERIFICACIONES:
+            raise ValueError(f"Verificación desconocida: {verificacion} (use {', '.join(VERIFICACIONES)})")
+
+        resultado: Dict[str, Any] = {"verificacion": verificacion}
+        conexion = sqlite3.connect(str(self.ruta), timeout=self.busy_timeout_ms / 1000)
+        try:
+            modo = conexion.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+            resultado["journal_mode"] = modo
+            if modo.lower() != "wal":
+                logger.warning("SQLite no aceptó journal_mode=WAL (quedó en %s): %s", modo, self.ruta)
+
+            pragma = VERIFICACIONES[verificacion]
+            if pragma:
+                inicio = time.perf_counter()
+                errores: List[str] = [fila[0] for fila in conexion.execute(pragma).fetchall()]
+                resultado["integridad_ms"] = round((time.perf_counter() - inicio) * 1000, 1)
+                resultado["integridad"] = "ok" if errores == ["ok"] else errores[:20]
+                if errores != ["ok"]:
+                    logger.error("Verificación de integridad de %s falló: %s", self.ruta, "; ".join(errores[:5]))
+
+            inicio = time.perf_counter()
+            conexion.execute("PRAGMA optimize")
+            resultado["optimize_ms"] = round((time.perf_counter() - inicio) * 1000, 1)
+        finally:
+            conexion.close()
+        return resultado
+
+
+class PoolLecturas:
+    """
+    Conexiones de solo lectura acotadas a `tamano`, abiertas a demanda.
+
+    Args:
+        abrir: Crea una conexión nueva (PerfilSQLite.conectar(solo_lectura=True))
+        tamano: Máximo de conexiones abiertas
+        espera_segundos: Espera por una conexión libre antes de TimeoutError
+    """
+
+    def __init__(self, abrir: Callable[[], Any], tamano: int = 8, espera_segundos: float = 10.0):
+        self._abrir = abrir
+        self.tamano = tamano
+        self.espera_segundos = espera_segundos
+        self._libres: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._cupos = threading.BoundedSemaphore(tamano)
+        self._lock = threading.Lock()
+        self._abiertas: List[Any] = []
+        self._en_uso = 0
+        self._estadisticas = {"prestamos": 0, "esperas": 0, "espera_ms": 0.0, "max_en_uso": 0}
+
+    @contextmanager
+    def conexion(self) -> Iterator[Any]:
+        """Presta una conexión; al devolverla se cierra cualquier lectura abierta."""
+        inicio = time.perf_counter()
+        if not self._cupos.acquire(timeout=self.espera_segundos):
+            raise TimeoutError(
+                f"Sin conexiones de lectura libres tras {self.espera_segundos}s (pool de {self.tamano})"
+            )
+        try:
+            try:
+                conexion = self._libres.get_nowait()
+            except queue.Empty:
+                conexion = self._abrir()
+                with self._lock:
+                    self._abiertas.append(conexion)
+            espera_ms = (time.perf_counter() - inicio) * 1000
+            with self._lock:
+                self._en_uso += 1
+                self._estadisticas["prestamos"] += 1
+                self._estadisticas["espera_ms"] += espera_ms
+                if espera_ms >= 1:
+                    self._estadisticas["esperas"] += 1
+                self._estadisticas["max_en_uso"] = max(self._estadisticas["max_en_uso"], self._en_uso)
+            try:
+                yield conexion
+            finally:
+                with self._lock:
+                    self._en_uso -= 1
+                    vigente = any(c is conexion for c in self._abiertas)
+                if not vigente:
+                    conexion.close()
+                else:
+                    if getattr(conexion, "in_transaction", False):
+                        conexion.rollback()
+                    self._libres.put(conexion)
+        finally:
+            self._cupos.release()
+
+    def cerrar(self) -> None:
+        """Cierra las conexiones libres; las prestadas se cierran al devolverse."""
+        with self._lock:
+            self._abiertas = []
+        while True:
+            try:
+                self._libres.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            estadisticas = dict(self._estadisticas)
+            estadisticas["abiertas"] = len(self._abiertas)
+            estadisticas["en_uso"] = self._en_uso
+        estadisticas["tamano"] = self.tamano
+        estadisticas["espera_ms"] = round(estadisticas["espera_ms"], 3)
+        return estadisticas
+
+
+class ColaEscritura:
+    """
+    Turnos de escritura FIFO y reentrantes: un solo escritor a la vez.
+
+    Cada `turno()` toma un número y espera a que le toque; el mismo hilo
+    puede anidar turnos (transacciones anidadas) sin esperar. Quien espera
+    más de `espera_segundos` recibe TimeoutError y cede su número.
+    """
+
+    def __init__(self, espera_segundos: float = 30.0):
+        self.espera_segundos = espera_segundos
+        self._condicion = threading.Condition()
+        self._siguiente = 0
+        self._atendiendo = 0
+        self._abandonados: set = set()
+        self._duenio: Optional[int] = None
+        self._profundidad = 0
+        self._estadisticas = {"turnos": 0, "espera_ms": 0.0, "espera_max_ms": 0.0, "max_en_cola": 0, "vencidos": 0}
+
+    @contextmanager
+    def turno(self) -> Iterator[None]:
+        self.tomar()
+        try:
+            yield
+        finally:
+            self.soltar()
+
+    def tomar(self) -> None:
+        """Espera el turno (o lo anida si el hilo ya lo tiene)."""
+        hilo = threading.get_ident()
+        with self._condicion:
+            if self._duenio == hilo:
+                self._profundidad += 1
+            else:
+                self._esperar_turno(hilo)
+
+    def soltar(self) -> None:
+        """Devuelve un nivel del turno; el último deja pasar al siguiente."""
+        with self._condicion:
+            self._profundidad -= 1
+            if self._profundidad == 0:
+                self._duenio = None
+                self._avanzar()
+
+    def _esperar_turno(self, hilo: int) -> None:
+        numero = self._siguiente
+        self._siguiente += 1
+        self._estadisticas["max_en_cola"] = max(self._estadisticas["max_en_cola"], numero - self._atendiendo)
+        inicio = time.perf_counter()
+        limite = time.monotonic() + self.espera_segundos
+        while numero != self._atendiendo:
+            restante = limite - time.monotonic()
+            if restante <= 0 or not self._condicion.wait(restante):
+                if numero == self._atendiendo:
+                    break
+                self._abandonados.add(numero)
+                self._estadisticas["vencidos"] += 1
+                raise TimeoutError(f"Turno de escritura no disponible tras {self.espera_segundos}s")
+        espera_ms = (time.perf_counter() - inicio) * 1000
+        self._duenio = hilo
+        self._profundidad = 1
+        self._estadisticas["turnos"] += 1
+        self._estadisticas["espera_ms"] += espera_ms
+        self._estadisticas["espera_max_ms"] = max(self._estadisticas["espera_max_ms"], espera_ms)
+
+    def _avanzar(self) -> None:
+        self._atendiendo += 1
+        while self._atendiendo in self._abandonados:
+            self._abandonados.discard(self._atendiendo)
+            self._atendiendo += 1
+        self._condicion.notify_all()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._condicion:
+            estadisticas = dict(self._estadisticas)
+            en_turno = 1 if self._duenio is not None else 0
+            estadisticas["en_cola"] = self._siguiente - self._atendiendo - len(self._abandonados) - en_turno
+        estadisticas["espera_ms"] = round(estadisticas["espera_ms"], 3)
+        estadisticas["espera_max_ms"] = round(estadisticas["espera_max_ms"], 3)
+        return estadisticas
+
+
+class CursorEscritura:
+    """Cursor de ConexionEscritura: sus escrituras pasan por la cola."""
+
+    def __init__(self, cursor: Any, conexion: "ConexionEscritura"):
+        self._cursor = cursor
+        self._conexion = conexion
+
+    def execute(self, sql: str, *args):
+        self._conexion._ejecutar(self._cursor.execute, sql, *args)
+        return self
+
+    def executemany(self, sql: str, *args):
+        self._conexion._ejecutar(self._cursor.executemany, sql, *args)
+        return self
+
+    def executescript(self, script: str):
+        self._conexion._ejecutar(self._cursor.executescript, script)
+        return self
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class ConexionEscritura:
+    """
+    Conexión de escritura del hilo que toma el turno de la cola por su cuenta.
+
+    La primera sentencia que no es de lectura espera el turno (el BEGIN
+    IMMEDIATE implícito de sqlite3 va detrás) y el turno se suelta con
+    commit(), rollback() o close(), o enseguida si la sentencia no dejó una
+    transacción abierta (DDL). Dentro de transaccion() el turno ya es del
+    hilo y solo se anida.
+    """
+
+    def __init__(self, conexion: sqlite3.Connection, cola: ColaEscritura):
+        object.__setattr__(self, "_conexion", conexion)
+        object.__setattr__(self, "_cola", cola)
+        object.__setattr__(self, "_con_turno", False)
+
+    def _ejecutar(self, metodo, sql: str, *args):
+        if not self._con_turno and not es_lectura(sql):
+            self._cola.tomar()
+            object.__setattr__(self, "_con_turno", True)
+        try:
+            return metodo(sql, *args)
+        finally:
+            if self._con_turno and not self._conexion.in_transaction:
+                self._soltar()
+
+    def _soltar(self) -> None:
+        if self._con_turno:
+            object.__setattr__(self, "_con_turno", False)
+            self._cola.soltar()
+
+    def cursor(self, *args, **kwargs) -> CursorEscritura:
+        return CursorEscritura(self._conexion.cursor(*args, **kwargs), self)
+
+    def execute(self, sql: str, *args):
+        return self.cursor().execute(sql, *args)
+
+    def executemany(self, sql: str, *args):
+        return self.cursor().executemany(sql, *args)
+
+    def executescript(self, script: str):
+        return self.cursor().executescript(script)
+
+    def commit(self) -> None:
+        try:
+            self._conexion.commit()
+        finally:
+            self._soltar()
+
+    def rollback(self) -> None:
+        try:
+            self._conexion.rollback()
+        finally:
+            self._soltar()
+
+    def close(self) -> None:
+        try:
+            self._conexion.close()
+        finally:
+            self._soltar()
+
+    def __enter__(self):
+        self._conexion.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            return self._conexion.__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._soltar()
+
+    def __getattr__(self, name):
+        return getattr(self._conexion, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conexion, name, value)
@@ -2,6 +2,12 @@
 Scripts SQL para creacion de Triggers de Auditoria.
 Implementa auditoria automatica a nivel de base de datos.
 
+- SQLite: triggers por fila con una fila de auditoría por columna cambiada.
+- PostgreSQL: triggers por sentencia con tablas de transición. Cada
+  sentencia hace un solo INSERT ... SELECT con una fila por fila modificada
+  y el diff JSONB de las columnas que cambiaron (en lugar de un INSERT por
+  columna y por fila desde un trigger FOR EACH ROW).
+
 ESQUEMA REAL DE AUDITORIA_CAMBIOS:
 - ID_AUDITORIA (PK)
 - TABLA
@@ -94,6 +100,153 @@ TODOS_LOS_TRIGGERS = [
 ]
 
 
+# === PostgreSQL ===
+
+# Tablas auditadas (las de fix_audit_postgres_full.sql)
+TABLAS_AUDITADAS_POSTGRESQL = [
+    "usuarios",
+    "personas",
+    "propiedades",
+    "contratos_arrendamientos",
+    "contratos_mandatos",
+    "recaudos",
+    "liquidaciones",
+    "liquidaciones_asesores",
+    "liquidaciones_propietarios",
+    "descuentos_asesores",
+    "bonificaciones_asesores",
+    "saldos_favor",
+    "recibos_publicos",
+    "incidentes",
+    "historial_incidentes",
+    "ordenes_trabajo",
+    "desocupaciones",
+    "polizas",
+    "ipc",
+    "parametros_sistema",
+    "alertas",
+    "municipios",
+    "departamentos",
+]
+
+# Columnas de control que no cuentan como cambio
+COLUMNAS_NO_AUDITADAS = ("updated_at", "updated_by", "ultimo_acceso", "fecha_modificacion")
+
+# TG_ARGV[0] es la PK de la tabla (resuelta al crear el trigger, no en cada fila)
+FUNCION_AUDITORIA_POSTGRESQL = """
+CREATE OR REPLACE FUNCTION func_auditoria_filas()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_pk TEXT := TG_ARGV[0];
+    v_tabla TEXT := upper(TG_TABLE_NAME);
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        EXECUTE format($sql$
+            INSERT INTO auditoria_cambios (
+                tabla, id_registro, tipo_operacion, campo_modificado,
+                valor_anterior, valor_nuevo, usuario, fecha_cambio
+            )
+            SELECT %L, (n.fila->>%L)::BIGINT, 'UPDATE',
+                   string_agg(c.key, ', ' ORDER BY c.key),
+                   jsonb_object_agg(c.key, o.fila->c.key)::TEXT,
+                   jsonb_object_agg(c.key, c.value)::TEXT,
+                   COALESCE(n.fila->>'updated_by', n.fila->>'created_by', 'SISTEMA_DB'),
+                   NOW()::VARCHAR
+            FROM (SELECT to_jsonb(t) AS fila FROM nuevas t) n
+            JOIN (SELECT to_jsonb(t) AS fila FROM anteriores t) o ON o.fila->%L = n.fila->%L
+            CROSS JOIN LATERAL jsonb_each(n.fila) c
+            WHERE c.value IS DISTINCT FROM o.fila->c.key
+            AND c.key <> ALL (ARRAY[%s, %L])
+            GROUP BY n.fila->>%L, n.fila->>'updated_by', n.fila->>'created_by'
+        $sql$, v_tabla, v_pk, v_pk, v_pk, '{excluidas}', v_pk, v_pk);
+    ELSIF TG_OP = 'INSERT' THEN
+        EXECUTE format($sql$
+            INSERT INTO auditoria_cambios (
+                tabla, id_registro, tipo_operacion, campo_modificado,
+                valor_anterior, valor_nuevo, usuario, fecha_cambio
+            )
+            SELECT %L, (to_jsonb(t)->>%L)::BIGINT, 'INSERT', 'ALL', NULL, '(Registro Creado)',
+                   COALESCE(to_jsonb(t)->>'created_by', 'SISTEMA_DB'), NOW()::VARCHAR
+            FROM nuevas t
+        $sql$, v_tabla, v_pk);
+    ELSE
+        EXECUTE format($sql$
+            INSERT INTO auditoria_cambios (
+                tabla, id_registro, tipo_operacion, campo_modificado,
+                valor_anterior, valor_nuevo, usuario, fecha_cambio
+            )
+            SELECT %L, (to_jsonb(t)->>%L)::BIGINT, 'DELETE', 'ALL', to_jsonb(t)::TEXT, NULL,
+                   COALESCE(to_jsonb(t)->>'updated_by', to_jsonb(t)->>'created_by', 'SISTEMA_DB'),
+                   NOW()::VARCHAR
+            FROM anteriores t
+        $sql$, v_tabla, v_pk);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""".replace(
+    "{excluidas}", ", ".join(f"''{c}''" for c in COLUMNAS_NO_AUDITADAS)
+)
+
+
+def sql_triggers_postgresql(tabla: str, pk: str) -> list:
+    """
+    DDL de los triggers por sentencia de una tabla.
+
+    Una tabla de transición solo se admite en triggers de un único evento,
+    por eso hay un trigger por operación. Reemplaza el trigger por fila de
+    fix_audit_postgres_full.sql (trg_audit_<tabla>).
+    """
+    sentencias = [f"DROP TRIGGER IF EXISTS trg_audit_{tabla} ON {tabla}"]
+    for sufijo, evento, transicion in (
+        ("upd", "UPDATE", "OLD TABLE AS anteriores NEW TABLE AS nuevas"),
+        ("ins", "INSERT", "NEW TABLE AS nuevas"),
+        ("del", "DELETE", "OLD TABLE AS anteriores"),
+    ):
+        sentencias.append(f"DROP TRIGGER IF EXISTS trg_audit_{tabla}_{sufijo} ON {tabla}")
+        sentencias.append(
+            f"CREATE TRIGGER trg_audit_{tabla}_{sufijo} AFTER {evento} ON {tabla} "
+            f"REFERENCING {transicion} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION func_auditoria_filas('{pk}')"
+        )
+    return sentencias
+
+
+def ejecutar_triggers_postgresql(db_manager, tablas=None) -> int:
+    """
+    Instala la función y los triggers por sentencia en PostgreSQL.
+
+    La PK de cada tabla se lee del catálogo una sola vez; las tablas que no
+    existen o no tienen PK simple se omiten.
+
+    Returns:
+        Tablas auditadas
+    """
+    tablas = tablas or TABLAS_AUDITADAS_POSTGRESQL
+    with db_manager.transaccion() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT c.relname AS RELNAME, MIN(a.attname) AS PK
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = ANY (i.indkey)
+            WHERE i.indisprimary AND n.nspname = current_schema() AND c.relname = ANY (%s)
+            GROUP BY c.relname
+            HAVING COUNT(*) = 1
+            """,
+            (list(tablas),),
+        )
+        pks = {fila["RELNAME"]: fila["PK"] for fila in cursor.fetchall()}
+        cursor.execute(FUNCION_AUDITORIA_POSTGRESQL)
+        for tabla in tablas:
+            if tabla in pks:
+                for sentencia in sql_triggers_postgresql(tabla, pks[tabla]):
+                    cursor.execute(sentencia)
+    return len(pks)
+
+
 def ejecutar_todos_los_triggers(db_manager):
     """
     Ejecuta todos los triggers de auditoria en la base de datos.
@@ -101,6 +254,10 @@ def ejecutar_todos_los_triggers(db_manager):
     Args:
         db_manager: Instancia de DatabaseManager
     """
+    if db_manager.use_postgresql:
+        ejecutar_triggers_postgresql(db_manager)
+        return
+
     with db_manager.obtener_conexion() as conn:
         cursor = conn.cursor()
 
@@ -1,13 +1,36 @@
 import sqlite3
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from src.dominio.entidades.documento import Documento
 from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.esquema import asegurar_esquema
 
 
 class RepositorioDocumentoSQLite:
     def __init__(self, db_manager: DatabaseManager = None):
         self.db = db_manager or DatabaseManager()
+        asegurar_esquema(self.db, "DOCUMENTOS_THUMBNAIL", self._asegurar_thumbnail)
+
+    def _asegurar_thumbnail(self):
+        """
+        Columna THUMBNAIL e índice de versionamiento en SQLite.
+
+        En PostgreSQL los crea migraciones/sql/add_documentos_thumbnail.sql.
+        """
+        if self.db.use_postgresql:
+            return
+        with self.db.transaccion() as conn:
+            cursor = conn.cursor()
+            cursor.execute("PRAGMA table_info(DOCUMENTOS)")
+            columnas = {fila[1] for fila in cursor.fetchall()}
+            if not columnas:
+                return  # Sin tabla DOCUMENTOS (la crea scripts/migracion_documentos.py)
+            if "THUMBNAIL" not in columnas:
+                cursor.execute("ALTER TABLE DOCUMENTOS ADD COLUMN THUMBNAIL BLOB")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_documentos_entidad_nombre "
+                "ON DOCUMENTOS(ENTIDAD_TIPO, ENTIDAD_ID, NOMBRE_ARCHIVO)"
+            )
 
     def _row_to_entity(self, row, include_content=False) -> Documento:
         """Conversión de fila SQL a entidad Documento."""
@@ -22,8 +45,8 @@ class RepositorioDocumentoSQLite:
 
         # Helper to get value securely
         def get_val(key, idx):
-            if hasattr(row, "keys"):  # Dict-like (Postgres)
-                return row.get(key)
+            if hasattr(row, "keys"):  # Dict-like (Postgres) or sqlite3.Row
+                return row[key] if key in row.keys() else None
             return row[idx]  # Tuple-like or sqlite3.Row (SQLite)
 
         doc = Documento(
@@ -48,7 +71,8 @@ class RepositorioDocumentoSQLite:
         if include_content:
             # Check for content in keys or index 11
             if hasattr(row, "keys"):
-                doc.contenido = bytes(row.get("CONTENIDO")) if row.get("CONTENIDO") else None
+                contenido = row["CONTENIDO"] if "CONTENIDO" in row.keys() else None
+                doc.contenido = bytes(contenido) if contenido else None
             elif len(row) > 11:
                 doc.contenido = bytes(row[11]) if row[11] else None
 
@@ -87,6 +111,127 @@ class RepositorioDocumentoSQLite:
             pass  # print(f"Error al crear documento: {e}") [OpSec Removed]
             raise
 
+    def crear_lote(self, documentos: List[Documento]) -> List[Documento]:
+        """
+        Guarda un lote de documentos de una misma entidad en una sola transacción.
+
+        El versionamiento se resuelve por lote: una consulta para las últimas versiones,
+        un UPDATE para anular las vigentes y un INSERT multi-fila con RETURNING.
+        Si un nombre se repite dentro del lote, solo la última ocurrencia queda vigente.
+        """
+        if not documentos:
+            return []
+
+        entidad_tipo = documentos[0].entidad_tipo
+        entidad_id = str(documentos[0].entidad_id)
+        if any(d.entidad_tipo != entidad_tipo or str(d.entidad_id) != entidad_id for d in documentos):
+            raise ValueError("Todos los documentos del lote deben pertenecer a la misma entidad")
+
+        ph = self.db.get_placeholder()
+        nombres = list(dict.fromkeys(d.nombre_archivo for d in documentos))
+        in_clause = ", ".join([ph] * len(nombres))
+
+        conn = self.db.obtener_conexion()
+        try:
+            cursor = conn.cursor()
+
+            # 1. Últimas versiones de todos los nombres del lote
+            cursor.execute(
+                f"""
+                SELECT NOMBRE_ARCHIVO, MAX(VERSION) AS ULTIMA_VERSION
+                FROM DOCUMENTOS
+                WHERE ENTIDAD_TIPO = {ph} AND CAST(ENTIDAD_ID AS VARCHAR) = {ph}
+                  AND NOMBRE_ARCHIVO IN ({in_clause})
+                GROUP BY NOMBRE_ARCHIVO
+                """,
+                (entidad_tipo, entidad_id, *nombres),
+            )
+            versiones: Dict[str, int] = {}
+            for row in cursor.fetchall():
+                if hasattr(row, "keys"):
+                    versiones[row["NOMBRE_ARCHIVO"]] = row["ULTIMA_VERSION"] or 0
+                else:
+                    versiones[row[0]] = row[1] or 0
+
+            # 2. Anular versiones vigentes de esos nombres
+            if versiones:
+                anular = list(versiones.keys())
+                cursor.execute(
+                    f"""
+                    UPDATE DOCUMENTOS
+                    SET ES_VIGENTE = {ph}
+                    WHERE ENTIDAD_TIPO = {ph} AND CAST(ENTIDAD_ID AS VARCHAR) = {ph}
+                      AND ES_VIGENTE = {ph} AND NOMBRE_ARCHIVO IN ({", ".join([ph] * len(anular))})
+                    """,
+                    ("0", entidad_tipo, entidad_id, "1", *anular),
+                )
+
+            # 3. Asignar versiones (la última ocurrencia de cada nombre queda vigente)
+            ultima_posicion = {d.nombre_archivo: i for i, d in enumerate(documentos)}
+            params: list = []
+            for i, doc in enumerate(documentos):
+                versiones[doc.nombre_archivo] = versiones.get(doc.nombre_archivo, 0) + 1
+                doc.version = versiones[doc.nombre_archivo]
+                doc.es_vigente = ultima_posicion[doc.nombre_archivo] == i
+                params.extend(
+                    (
+                        doc.entidad_tipo,
+                        str(doc.entidad_id),
+                        doc.nombre_archivo,
+                        doc.extension,
+                        doc.mime_type,
+                        doc.descripcion,
+                        doc.contenido,
+                        doc.version,
+                        "1" if doc.es_vigente else "0",
+                        doc.created_by,
+                    )
+                )
+
+            values = ", ".join([f"({', '.join([ph] * 10)})"] * len(documentos))
+            cursor.execute(
+                f"""
+                INSERT INTO DOCUMENTOS (
+                    ENTIDAD_TIPO, ENTIDAD_ID, NOMBRE_ARCHIVO, EXTENSION, MIME_TYPE,
+                    DESCRIPCION, CONTENIDO, VERSION, ES_VIGENTE, CREATED_BY
+                ) VALUES {values}
+                RETURNING ID, NOMBRE_ARCHIVO, VERSION
+                """,
+                tuple(params),
+            )
+            ids = {}
+            for row in cursor.fetchall():
+                if hasattr(row, "keys"):
+                    ids[(row["NOMBRE_ARCHIVO"], row["VERSION"])] = row["ID"]
+                else:
+                    ids[(row[1], row[2])] = row[0]
+            for doc in documentos:
+                doc.id = ids.get((doc.nombre_archivo, doc.version))
+
+            conn.commit()
+            return documentos
+        except Exception:
+            conn.rollback()
+            raise
+
+    def actualizar_contenido_optimizado(
+        self, id_documento: int, contenido: bytes, thumbnail: Optional[bytes] = None
+    ):
+        """
+        Reemplaza el BLOB de un documento por su versión optimizada (comprimida, sin EXIF)
+        y guarda el thumbnail. Usado por el procesamiento en segundo plano.
+        """
+        ph = self.db.get_placeholder()
+        sql = f"UPDATE DOCUMENTOS SET CONTENIDO = {ph}, THUMBNAIL = {ph} WHERE ID = {ph}"
+        conn = self.db.obtener_conexion()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql, (contenido, thumbnail, id_documento))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
     def listar_por_entidad(self, entidad_tipo: str, entidad_id: str) -> List[Documento]:
         """
         Retorna la metadata de los documentos vigentes de una entidad.
@@ -4,7 +4,7 @@ Implementa operaciones CRUD y consultas especializadas.
 """
 
 import sqlite3
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import List, Optional
 
 from src.dominio.entidades.recibo_publico import ReciboPublico
@@ -197,53 +197,96 @@ class RepositorioReciboPublicoSQLite:
     def listar_vencidos(self) -> List[ReciboPublico]:
         """
         Lista recibos vencidos.
+
+        Las fechas se guardan como 'YYYY-MM-DD': se comparan como texto con la
+        fecha de hoy, igual en SQLite y PostgreSQL.
+        """
+        query = f"""
+            SELECT * FROM RECIBOS_PUBLICOS
+            WHERE FECHA_VENCIMIENTO < {self.placeholder}
+              AND ESTADO != 'Pagado'
+            ORDER BY FECHA_VENCIMIENTO ASC
         """
-        if self.db_manager.use_postgresql:
-            query = """
-                SELECT * FROM RECIBOS_PUBLICOS
-                WHERE CAST(FECHA_VENCIMIENTO AS DATE) < CURRENT_DATE
-                  AND ESTADO != 'Pagado'
-                ORDER BY FECHA_VENCIMIENTO ASC
-            """
-        else:
-            query = """
-                SELECT * FROM RECIBOS_PUBLICOS
-                WHERE FECHA_VENCIMIENTO < date('now')
-                  AND ESTADO != 'Pagado'
-                ORDER BY FECHA_VENCIMIENTO ASC
-            """
 
         with self.db_manager.obtener_conexion() as conn:
             cursor = self.db_manager.get_dict_cursor(conn)
-            cursor.execute(query)
+            cursor.execute(query, (date.today().isoformat(),))
             rows = cursor.fetchall()
             return [self._row_to_entity(row) for row in rows]
 
+    def marcar_vencidos(self, usuario: str, fecha_corte: Optional[str] = None) -> List[int]:
+        """
+        Marca como 'Vencido', en una sola sentencia, los recibos 'Pendiente'
+        cuya fecha de vencimiento es anterior a `fecha_corte`.
+
+        Usa el índice (ESTADO, FECHA_VENCIMIENTO): las fechas se guardan como
+        'YYYY-MM-DD', así que se comparan sin CAST.
+
+        Args:
+            usuario: Usuario que ejecuta el job (UPDATED_BY)
+            fecha_corte: Fecha 'YYYY-MM-DD' (hoy por defecto)
+
+        Returns:
+            IDs de los recibos actualizados
+        """
+        fecha_corte = fecha_corte or date.today().isoformat()
+        timestamp = datetime.now().isoformat()
+        where = f"""
+            WHERE ESTADO = 'Pendiente'
+              AND FECHA_VENCIMIENTO IS NOT NULL AND FECHA_VENCIMIENTO != ''
+              AND FECHA_VENCIMIENTO < {self.placeholder}
+        """
+
+        with self.db_manager.obtener_conexion() as conn:
+            cursor = self.db_manager.get_dict_cursor(conn)
+
+            if self.db_manager.use_postgresql or sqlite3.sqlite_version_info >= (3, 35, 0):
+                cursor.execute(
+                    f"""
+                    UPDATE RECIBOS_PUBLICOS
+                    SET ESTADO = 'Vencido', UPDATED_AT = {self.placeholder},
+                        UPDATED_BY = {self.placeholder}
+                    {where}
+                    RETURNING ID_RECIBO_PUBLICO
+                    """,
+                    (timestamp, usuario, fecha_corte),
+                )
+                return sorted(row["ID_RECIBO_PUBLICO"] for row in cursor.fetchall())
+
+            # SQLite < 3.35 (sin RETURNING): mismo criterio dentro de la transacción
+            cursor.execute(
+                f"SELECT ID_RECIBO_PUBLICO FROM RECIBOS_PUBLICOS {where}", (fecha_corte,)
+            )
+            ids = sorted(row["ID_RECIBO_PUBLICO"] for row in cursor.fetchall())
+            if ids:
+                cursor.execute(
+                    f"""
+                    UPDATE RECIBOS_PUBLICOS
+                    SET ESTADO = 'Vencido', UPDATED_AT = {self.placeholder},
+                        UPDATED_BY = {self.placeholder}
+                    {where}
+                    """,
+                    (timestamp, usuario, fecha_corte),
+                )
+            return ids
+
     def listar_proximos_vencer(self, dias: int = 5) -> List[ReciboPublico]:
         """
         Lista recibos pendientes que vencen en los próximos N días.
         No incluye recibos ya vencidos ni pagados.
         """
-        if self.db_manager.use_postgresql:
-            query = f"""
-                SELECT * FROM RECIBOS_PUBLICOS
-                WHERE CAST(FECHA_VENCIMIENTO AS DATE) > CURRENT_DATE
-                  AND CAST(FECHA_VENCIMIENTO AS DATE) <= CURRENT_DATE + INTERVAL '{dias} day'
-                  AND ESTADO != 'Pagado'
-                ORDER BY FECHA_VENCIMIENTO ASC
-            """
-        else:
-            query = f"""
-                SELECT * FROM RECIBOS_PUBLICOS
-                WHERE FECHA_VENCIMIENTO > date('now')
-                  AND FECHA_VENCIMIENTO <= date('now', '+{dias} days')
-                  AND ESTADO != 'Pagado'
-                ORDER BY FECHA_VENCIMIENTO ASC
-            """
+        hoy = date.today()
+        query = f"""
+            SELECT * FROM RECIBOS_PUBLICOS
+            WHERE FECHA_VENCIMIENTO > {self.placeholder}
+              AND FECHA_VENCIMIENTO <= {self.placeholder}
+              AND ESTADO != 'Pagado'
+            ORDER BY FECHA_VENCIMIENTO ASC
+        """
 
         with self.db_manager.obtener_conexion() as conn:
             cursor = self.db_manager.get_dict_cursor(conn)
-            cursor.execute(query)
+            cursor.execute(query, (hoy.isoformat(), (hoy + timedelta(days=dias)).isoformat()))
             rows = cursor.fetchall()
             return [self._row_to_entity(row) for row in rows]
 
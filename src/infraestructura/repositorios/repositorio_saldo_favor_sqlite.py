@@ -9,6 +9,9 @@ from typing import Any, Dict, List, Optional
 
 from src.dominio.entidades.saldo_favor import SaldoFavor
 from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.repositorio_cuenta_propietario_sqlite import (
+    RepositorioCuentaPropietarioSQLite,
+)
 
 
 class RepositorioSaldoFavorSQLite:
@@ -16,6 +19,21 @@ class RepositorioSaldoFavorSQLite:
 
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
+        self.cuenta_propietario = RepositorioCuentaPropietarioSQLite(db_manager)
+
+    def _registrar_en_cuenta(self, conn, saldo: SaldoFavor, estado: str, usuario: str) -> None:
+        """Refleja el evento en la cuenta corriente si el beneficiario es un propietario."""
+        if saldo.tipo_beneficiario != "Propietario" or not saldo.id_propietario:
+            return
+        self.cuenta_propietario.registrar_saldo_favor(
+            conn,
+            saldo.id_propietario,
+            saldo.id_saldo_favor,
+            saldo.valor_saldo,
+            estado,
+            saldo.motivo,
+            usuario,
+        )
 
     def crear(self, saldo: SaldoFavor, usuario: str) -> SaldoFavor:
         """
@@ -56,6 +74,8 @@ class RepositorioSaldoFavorSQLite:
             cursor = conn.cursor()
             cursor.execute(query, params)
             saldo.id_saldo_favor = cursor.lastrowid
+            if saldo.estado == "Pendiente":
+                self._registrar_en_cuenta(conn, saldo, "Pendiente", usuario)
             return saldo
 
     def actualizar(self, saldo: SaldoFavor, usuario: str) -> SaldoFavor:
@@ -104,9 +124,18 @@ class RepositorioSaldoFavorSQLite:
             saldo.id_saldo_favor,
         )
 
-        affected = self.db_manager.execute_write(query, params)
-        if affected == 0:
-            raise ValueError(f"No se encontró el saldo con ID {saldo.id_saldo_favor}")
+        with self.db_manager.transaccion() as conn:
+            cursor = self.db_manager.get_dict_cursor(conn)
+            cursor.execute(
+                f"SELECT ESTADO FROM SALDOS_FAVOR WHERE ID_SALDO_FAVOR = {placeholder}",
+                (saldo.id_saldo_favor,),
+            )
+            anterior = cursor.fetchone()
+            cursor.execute(query, params)
+            if cursor.rowcount == 0:
+                raise ValueError(f"No se encontró el saldo con ID {saldo.id_saldo_favor}")
+            if anterior["ESTADO"] == "Pendiente" and saldo.estado in ("Aplicado", "Devuelto"):
+                self._registrar_en_cuenta(conn, saldo, saldo.estado, usuario)
 
         saldo.updated_by = usuario
         saldo.updated_at = datetime.now().isoformat()
@@ -370,19 +399,27 @@ class RepositorioSaldoFavorSQLite:
 
             return resumen
 
-    def eliminar(self, id_saldo: int) -> bool:
+    def eliminar(self, id_saldo: int, usuario: str = "sistema") -> bool:
         """
         Elimina (físicamente) un saldo a favor.
 
         Args:
             id_saldo: ID del saldo a eliminar
+            usuario: Usuario que elimina el registro
 
         Returns:
             True si se eliminó, False si no existía
         """
+        saldo = self.obtener_por_id(id_saldo)
         placeholder = self.db_manager.get_placeholder()
         query = f"DELETE FROM SALDOS_FAVOR WHERE ID_SALDO_FAVOR = {placeholder}"
-        return self.db_manager.execute_write(query, (id_saldo,)) > 0
+        with self.db_manager.transaccion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, (id_saldo,))
+            eliminado = cursor.rowcount > 0
+            if eliminado and saldo.estado == "Pendiente":
+                self._registrar_en_cuenta(conn, saldo, "Eliminado", usuario)
+        return eliminado
 
     def _row_to_entity(self, row: sqlite3.Row) -> SaldoFavor:
         """
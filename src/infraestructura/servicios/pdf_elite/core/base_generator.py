@@ -9,6 +9,7 @@ Fecha: 2026-01-18
 """
 
 import logging
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
@@ -155,7 +156,8 @@ class BasePDFGenerator(ABC):
         Genera el PDF de forma segura, capturando excepciones
 
         Este método envuelve generate() con manejo de errores completo,
-        ejecutando los hooks before/after/on_error apropiados.
+        ejecutando los hooks before/after/on_error apropiados y reportando
+        duración, páginas y bytes a la telemetría PDF.
 
         Args:
             data: Datos para generar el PDF
@@ -163,6 +165,7 @@ class BasePDFGenerator(ABC):
         Returns:
             Path del archivo generado, o None si hubo error
         """
+        started = time.perf_counter()
         try:
             # Validar datos primero
             if not self.validate_data(data):
@@ -178,12 +181,53 @@ class BasePDFGenerator(ABC):
             # Hook post-generación
             self.after_generate(output_path, data)
 
+            self._report_telemetry(started, output_path=output_path)
             return output_path
 
         except Exception as e:
             self.on_error(e, data)
+            self._report_telemetry(started, error=e)
             return None
 
+    def get_page_count(self) -> Optional[int]:
+        """
+        Retorna el número de páginas del último documento generado
+
+        Las subclases que conocen su motor de render lo sobrescriben.
+        """
+        return None
+
+    def _report_telemetry(
+        self,
+        started: float,
+        output_path: Optional[Path] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Reporta duración, páginas y bytes a la telemetría PDF (nunca interrumpe)"""
+        if not getattr(self.config, "telemetry_enabled", True):
+            return
+
+        try:
+            from ..utils.analytics import get_pdf_analytics
+
+            size_bytes = None
+            if output_path is not None:
+                try:
+                    size_bytes = Path(output_path).stat().st_size
+                except OSError:
+                    pass
+
+            get_pdf_analytics().track_generation(
+                self.__class__.__name__,
+                time.perf_counter() - started,
+                success=error is None,
+                pages=self.get_page_count() if error is None else None,
+                size_bytes=size_bytes,
+                error_message=str(error) if error is not None else None,
+            )
+        except Exception as e:
+            logger.debug(f"Telemetría PDF no disponible: {e}")
+
     def add_metadata(self, key: str, value: Any) -> None:
         """
         Agrega o actualiza metadata del documento
@@ -256,13 +300,18 @@ class BasePDFGenerator(ABC):
         """
         Retorna el path completo del archivo de salida
 
+        Usa el layout particionado `output_dir/<shard>/<filename>` del almacén
+        de documentos generados.
+
         Args:
             filename: Nombre del archivo
 
         Returns:
             Path completo del archivo
         """
-        return self.output_dir / filename
+        from ..utils.output_store import sharded_path
+
+        return sharded_path(self.output_dir, filename)
 
     def _require_fields(self, data: Dict[str, Any], *fields: str) -> None:
         """
@@ -57,6 +57,15 @@ class PDFConfig(BaseModel):
     # === Performance ===
     cache_enabled: bool = Field(default=True, description="Habilitar cache de templates")
     max_cache_size_mb: int = Field(default=100, description="Tamaño máximo de cache en MB")
+    telemetry_enabled: bool = Field(
+        default=True, description="Registrar duración/páginas/bytes de cada generación"
+    )
+
+    # === Retención de documentos generados ===
+    output_retention_days: int = Field(
+        default=30, description="Días que se conservan los PDFs en output_dir"
+    )
+    output_quota_mb: int = Field(default=1024, description="Cuota de disco de output_dir en MB")
 
     @property
     def margins(self) -> Tuple[int, int, int, int]:
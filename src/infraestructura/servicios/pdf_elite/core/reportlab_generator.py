@@ -429,6 +429,10 @@ class ReportLabGenerator(BasePDFGenerator):
 
         return output_path
 
+    def get_page_count(self) -> Optional[int]:
+        """Número de páginas del último documento construido"""
+        return getattr(self.doc, "page", None) if self.doc else None
+
     def _default_header_footer(self, canvas_obj: pdf_canvas.Canvas, doc: SimpleDocTemplate) -> None:
         """
         Header y footer por defecto
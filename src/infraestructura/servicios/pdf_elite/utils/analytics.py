@@ -3,15 +3,107 @@ Sistema de Analytics para PDFs
 ===============================
 Tracking y métricas de generación de documentos PDF.
 
+Almacenamiento append-only en SQLite (`analytics/pdf_telemetry.sqlite`):
+
+- PDF_EVENTS: un registro por generación (se inserta, nunca se reescribe).
+- PDF_ROLLUPS: agregados diarios por plantilla (conteo, éxito, duración,
+  páginas, bytes), actualizados con UPSERT en la misma transacción.
+- PDF_DURATION_HIST: histograma logarítmico diario de duraciones por
+  plantilla, para estimar p50/p95/p99 sin recorrer los eventos.
+
+Cada evento se persiste al registrarse (WAL + synchronous=NORMAL), por lo que
+no se pierden eventos entre guardados, y las estadísticas leen solo los
+agregados del período (días × plantillas), sin importar el historial.
+
 Autor: Sistema de Gestión Inmobiliaria
 Fecha: 2026-01-18
 """
 
 import json
+import logging
+import math
+import sqlite3
+import threading
 from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Resolución del histograma: cada bucket cubre un 10% más que el anterior
+_HIST_BASE = 1.1
+_HIST_MIN_MS = 0.1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS PDF_EVENTS (
+    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    TS TEXT NOT NULL,
+    DOC_TYPE TEXT NOT NULL,
+    DURATION_MS REAL NOT NULL,
+    SUCCESS INTEGER NOT NULL,
+    PAGES INTEGER,
+    BYTES INTEGER,
+    DOC_ID INTEGER,
+    USER_ID INTEGER,
+    ERROR_MESSAGE TEXT,
+    METADATA TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pdf_events_ts ON PDF_EVENTS(TS);
+
+CREATE TABLE IF NOT EXISTS PDF_ROLLUPS (
+    DIA TEXT NOT NULL,
+    DOC_TYPE TEXT NOT NULL,
+    COUNT INTEGER NOT NULL DEFAULT 0,
+    SUCCESS_COUNT INTEGER NOT NULL DEFAULT 0,
+    ERROR_COUNT INTEGER NOT NULL DEFAULT 0,
+    SUM_DURATION_MS REAL NOT NULL DEFAULT 0,
+    MIN_DURATION_MS REAL,
+    MAX_DURATION_MS REAL,
+    SUM_PAGES INTEGER NOT NULL DEFAULT 0,
+    SUM_BYTES INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (DIA, DOC_TYPE)
+);
+
+CREATE TABLE IF NOT EXISTS PDF_DURATION_HIST (
+    DIA TEXT NOT NULL,
+    DOC_TYPE TEXT NOT NULL,
+    BUCKET INTEGER NOT NULL,
+    COUNT INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (DIA, DOC_TYPE, BUCKET)
+);
+"""
+
+
+def _bucket_for(duration_ms: float) -> int:
+    """Bucket logarítmico para una duración en ms"""
+    return int(math.floor(math.log(max(duration_ms, _HIST_MIN_MS) / _HIST_MIN_MS, _HIST_BASE)))
+
+
+def _bucket_upper_ms(bucket: int) -> float:
+    """Límite superior (ms) de un bucket"""
+    return _HIST_MIN_MS * _HIST_BASE ** (bucket + 1)
+
+
+def _percentiles(histogram: Dict[int, int], quantiles=(0.5, 0.95, 0.99)) -> List[float]:
+    """Estima percentiles (ms) a partir de un histograma {bucket: count}"""
+    total = sum(histogram.values())
+    if total == 0:
+        return [0.0 for _ in quantiles]
+
+    results = []
+    ordered = sorted(histogram.items())
+    for q in quantiles:
+        target = q * total
+        acc = 0
+        value = _bucket_upper_ms(ordered[-1][0])
+        for bucket, count in ordered:
+            acc += count
+            if acc >= target:
+                value = _bucket_upper_ms(bucket)
+                break
+        results.append(round(value, 1))
+    return results
 
 
 class PDFAnalytics:
@@ -20,14 +112,14 @@ class PDFAnalytics:
 
     Registra y analiza:
     - Documentos generados
-    - Tiempos de generación
+    - Tiempos de generación (p50/p95/p99 por plantilla)
+    - Páginas y bytes generados
     - Errores y fallos
     - Documentos más generados
-    - Performance por tipo
 
     Example:
         >>> analytics = PDFAnalytics()
-        >>> analytics.track_generation('contrato', 1.5, success=True)
+        >>> analytics.track_generation('contrato', 1.5, success=True, pages=4, size_bytes=52000)
         >>> stats = analytics.get_statistics()
     """
 
@@ -36,32 +128,22 @@ class PDFAnalytics:
         Inicializa el sistema de analytics
 
         Args:
-            storage_path: Path para almacenar datos de analytics
+            storage_path: Path de la base SQLite de telemetría
         """
-        self.storage_path = storage_path or Path("analytics/pdf_analytics.json")
+        self.storage_path = Path(storage_path or Path("analytics/pdf_telemetry.sqlite"))
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Cargar datos existentes
-        self._load_data()
-
-    def _load_data(self) -> None:
-        """Carga datos de analytics desde disco"""
-        if self.storage_path.exists():
-            with open(self.storage_path, "r") as f:
-                self.data = json.load(f)
-        else:
-            self.data = {
-                "generations": [],
-                "errors": [],
-                "total_count": 0,
-                "success_count": 0,
-                "error_count": 0,
-            }
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.storage_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
 
-    def _save_data(self) -> None:
-        """Guarda datos a disco"""
-        with open(self.storage_path, "w") as f:
-            json.dump(self.data, f, indent=2, default=str)
+    # ========================================================================
+    # REGISTRO
+    # ========================================================================
 
     def track_generation(
         self,
@@ -71,45 +153,102 @@ class PDFAnalytics:
         doc_id: int = None,
         user_id: int = None,
         metadata: Dict[str, Any] = None,
+        pages: Optional[int] = None,
+        size_bytes: Optional[int] = None,
+        error_message: Optional[str] = None,
     ) -> None:
         """
         Registra una generación de PDF
 
         Args:
-            doc_type: Tipo de documento
+            doc_type: Tipo de documento (plantilla)
             duration_seconds: Tiempo que tomó generar
             success: Si fue exitosa
             doc_id: ID del documento generado
             user_id: ID del usuario que generó
             metadata: Metadata adicional
+            pages: Número de páginas generadas
+            size_bytes: Tamaño del archivo generado
+            error_message: Mensaje de error (si falló)
         """
-        event = {
-            "timestamp": datetime.now().isoformat(),
-            "doc_type": doc_type,
-            "duration": duration_seconds,
-            "success": success,
-            "doc_id": doc_id,
-            "user_id": user_id,
-            "metadata": metadata or {},
-        }
-
-        self.data["generations"].append(event)
-        self.data["total_count"] += 1
-
-        if success:
-            self.data["success_count"] += 1
-        else:
-            self.data["error_count"] += 1
-
-        # Guardar cada 10 eventos para no sobrecargar I/O
-        if self.data["total_count"] % 10 == 0:
-            self._save_data()
+        now = datetime.now()
+        dia = now.strftime("%Y-%m-%d")
+        duration_ms = max(duration_seconds, 0) * 1000
+        ok = 1 if success else 0
+        pages_ok = (pages or 0) if success else 0
+        bytes_ok = (size_bytes or 0) if success else 0
+
+        with self._lock:
+            try:
+                self._conn.execute(
+                    """
+                    INSERT INTO PDF_EVENTS (
+                        TS, DOC_TYPE, DURATION_MS, SUCCESS, PAGES, BYTES,
+                        DOC_ID, USER_ID, ERROR_MESSAGE, METADATA
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        now.isoformat(),
+                        doc_type,
+                        duration_ms,
+                        ok,
+                        pages,
+                        size_bytes,
+                        doc_id,
+                        user_id,
+                        error_message,
+                        json.dumps(metadata, default=str) if metadata else None,
+                    ),
+                )
+                self._conn.execute(
+                    """
+                    INSERT INTO PDF_ROLLUPS (
+                        DIA, DOC_TYPE, COUNT, SUCCESS_COUNT, ERROR_COUNT, SUM_DURATION_MS,
+                        MIN_DURATION_MS, MAX_DURATION_MS, SUM_PAGES, SUM_BYTES
+                    ) VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (DIA, DOC_TYPE) DO UPDATE SET
+                        COUNT = COUNT + 1,
+                        SUCCESS_COUNT = SUCCESS_COUNT + excluded.SUCCESS_COUNT,
+                        ERROR_COUNT = ERROR_COUNT + excluded.ERROR_COUNT,
+                        SUM_DURATION_MS = SUM_DURATION_MS + excluded.SUM_DURATION_MS,
+                        MIN_DURATION_MS = MIN(COALESCE(MIN_DURATION_MS, excluded.MIN_DURATION_MS),
+                                              COALESCE(excluded.MIN_DURATION_MS, MIN_DURATION_MS)),
+                        MAX_DURATION_MS = MAX(COALESCE(MAX_DURATION_MS, excluded.MAX_DURATION_MS),
+                                              COALESCE(excluded.MAX_DURATION_MS, MAX_DURATION_MS)),
+                        SUM_PAGES = SUM_PAGES + excluded.SUM_PAGES,
+                        SUM_BYTES = SUM_BYTES + excluded.SUM_BYTES
+                    """,
+                    (
+                        dia,
+                        doc_type,
+                        ok,
+                        1 - ok,
+                        duration_ms if success else 0,
+                        duration_ms if success else None,
+                        duration_ms if success else None,
+                        pages_ok,
+                        bytes_ok,
+                    ),
+                )
+                if success:
+                    self._conn.execute(
+                        """
+                        INSERT INTO PDF_DURATION_HIST (DIA, DOC_TYPE, BUCKET, COUNT)
+                        VALUES (?, ?, ?, 1)
+                        ON CONFLICT (DIA, DOC_TYPE, BUCKET) DO UPDATE SET COUNT = COUNT + 1
+                        """,
+                        (dia, doc_type, _bucket_for(duration_ms)),
+                    )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.warning(f"No se pudo registrar telemetría PDF: {e}")
 
     def track_error(
         self, doc_type: str, error_message: str, doc_id: int = None, user_id: int = None
     ) -> None:
         """
-        Registra un error en la generación
+        Registra un error en la generación (cuenta como generación fallida)
 
         Args:
             doc_type: Tipo de documento
@@ -117,16 +256,91 @@ class PDFAnalytics:
             doc_id: ID del documento
             user_id: ID del usuario
         """
-        error_event = {
-            "timestamp": datetime.now().isoformat(),
-            "doc_type": doc_type,
-            "error_message": error_message,
-            "doc_id": doc_id,
-            "user_id": user_id,
-        }
+        self.track_generation(
+            doc_type,
+            0.0,
+            success=False,
+            doc_id=doc_id,
+            user_id=user_id,
+            error_message=error_message,
+        )
+
+    # ========================================================================
+    # CONSULTAS (sobre agregados)
+    # ========================================================================
+
+    def get_template_rollups(self, days: int = 30, doc_type: str = None) -> List[Dict[str, Any]]:
+        """
+        Obtiene los agregados por plantilla del período
+
+        Args:
+            days: Últimos N días a analizar
+            doc_type: Filtrar por tipo de documento
 
-        self.data["errors"].append(error_event)
-        self._save_data()
+        Returns:
+            Lista de diccionarios por plantilla, ordenada por conteo descendente
+        """
+        desde = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        filtro_tipo = " AND DOC_TYPE = ?" if doc_type else ""
+        params = (desde, doc_type) if doc_type else (desde,)
+
+        with self._lock:
+            rollups = self._conn.execute(
+                f"""
+                SELECT DOC_TYPE, SUM(COUNT) AS COUNT, SUM(SUCCESS_COUNT) AS SUCCESS_COUNT,
+                       SUM(ERROR_COUNT) AS ERROR_COUNT, SUM(SUM_DURATION_MS) AS SUM_DURATION_MS,
+                       MIN(MIN_DURATION_MS) AS MIN_DURATION_MS,
+                       MAX(MAX_DURATION_MS) AS MAX_DURATION_MS,
+                       SUM(SUM_PAGES) AS SUM_PAGES, SUM(SUM_BYTES) AS SUM_BYTES
+                FROM PDF_ROLLUPS
+                WHERE DIA >= ?{filtro_tipo}
+                GROUP BY DOC_TYPE
+                ORDER BY SUM(COUNT) DESC
+                """,
+                params,
+            ).fetchall()
+            hist_rows = self._conn.execute(
+                f"""
+                SELECT DOC_TYPE, BUCKET, SUM(COUNT) AS COUNT
+                FROM PDF_DURATION_HIST
+                WHERE DIA >= ?{filtro_tipo}
+                GROUP BY DOC_TYPE, BUCKET
+                """,
+                params,
+            ).fetchall()
+
+        histograms: Dict[str, Dict[int, int]] = defaultdict(dict)
+        for row in hist_rows:
+            histograms[row["DOC_TYPE"]][row["BUCKET"]] = row["COUNT"]
+
+        resultado = []
+        for row in rollups:
+            success_count = row["SUCCESS_COUNT"] or 0
+            p50, p95, p99 = _percentiles(histograms.get(row["DOC_TYPE"], {}))
+            resultado.append(
+                {
+                    "doc_type": row["DOC_TYPE"],
+                    "count": row["COUNT"],
+                    "success_count": success_count,
+                    "error_count": row["ERROR_COUNT"],
+                    "avg_duration_ms": (
+                        round(row["SUM_DURATION_MS"] / success_count, 1) if success_count else 0
+                    ),
+                    "min_duration_ms": round(row["MIN_DURATION_MS"] or 0, 1),
+                    "max_duration_ms": round(row["MAX_DURATION_MS"] or 0, 1),
+                    "p50_ms": p50,
+                    "p95_ms": p95,
+                    "p99_ms": p99,
+                    "avg_pages": (
+                        round(row["SUM_PAGES"] / success_count, 1) if success_count else 0
+                    ),
+                    "total_bytes": row["SUM_BYTES"],
+                    "avg_kb": (
+                        round(row["SUM_BYTES"] / success_count / 1024, 1) if success_count else 0
+                    ),
+                }
+            )
+        return resultado
 
     def get_statistics(self, days: int = 30, doc_type: str = None) -> Dict[str, Any]:
         """
@@ -139,17 +353,10 @@ class PDFAnalytics:
         Returns:
             Diccionario con estadísticas
         """
-        cutoff_date = datetime.now() - timedelta(days=days)
-
-        # Filtrar eventos
-        recent_gens = [
-            g
-            for g in self.data["generations"]
-            if datetime.fromisoformat(g["timestamp"]) > cutoff_date
-            and (doc_type is None or g["doc_type"] == doc_type)
-        ]
+        rollups = self.get_template_rollups(days, doc_type)
+        total = sum(r["count"] for r in rollups)
 
-        if not recent_gens:
+        if total == 0:
             return {
                 "period_days": days,
                 "total_generations": 0,
@@ -157,48 +364,33 @@ class PDFAnalytics:
                 "avg_duration": 0,
             }
 
-        # Calcular métricas
-        successful = [g for g in recent_gens if g["success"]]
-        durations = [g["duration"] for g in successful]
-
-        # Por tipo de documento
-        by_type = defaultdict(lambda: {"count": 0, "avg_duration": 0, "durations": []})
-        for gen in successful:
-            dtype = gen["doc_type"]
-            by_type[dtype]["count"] += 1
-            by_type[dtype]["durations"].append(gen["duration"])
-
-        # Calcular promedios
-        for dtype in by_type:
-            durations_list = by_type[dtype]["durations"]
-            by_type[dtype]["avg_duration"] = sum(durations_list) / len(durations_list)
-            del by_type[dtype]["durations"]  # No necesitamos la lista completa
-
-        # Documentos más generados
-        type_counts = defaultdict(int)
-        for gen in recent_gens:
-            type_counts[gen["doc_type"]] += 1
-
-        top_documents = sorted(type_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        successful = sum(r["success_count"] for r in rollups)
+        sum_duration_ms = sum(r["avg_duration_ms"] * r["success_count"] for r in rollups)
+        con_exito = [r for r in rollups if r["success_count"]]
 
         return {
             "period_days": days,
-            "total_generations": len(recent_gens),
-            "successful_generations": len(successful),
-            "failed_generations": len(recent_gens) - len(successful),
-            "success_rate": (len(successful) / len(recent_gens)) * 100,
-            "avg_duration": sum(durations) / len(durations) if durations else 0,
-            "min_duration": min(durations) if durations else 0,
-            "max_duration": max(durations) if durations else 0,
-            "by_type": dict(by_type),
-            "top_documents": top_documents,
-            "total_errors": len(
-                [
-                    e
-                    for e in self.data["errors"]
-                    if datetime.fromisoformat(e["timestamp"]) > cutoff_date
-                ]
-            ),
+            "total_generations": total,
+            "successful_generations": successful,
+            "failed_generations": total - successful,
+            "success_rate": (successful / total) * 100,
+            "avg_duration": (sum_duration_ms / successful / 1000) if successful else 0,
+            "min_duration": min((r["min_duration_ms"] for r in con_exito), default=0) / 1000,
+            "max_duration": max((r["max_duration_ms"] for r in con_exito), default=0) / 1000,
+            "by_type": {
+                r["doc_type"]: {
+                    "count": r["success_count"],
+                    "avg_duration": r["avg_duration_ms"] / 1000,
+                    "p50_ms": r["p50_ms"],
+                    "p95_ms": r["p95_ms"],
+                    "p99_ms": r["p99_ms"],
+                    "avg_pages": r["avg_pages"],
+                    "total_bytes": r["total_bytes"],
+                }
+                for r in rollups
+            },
+            "top_documents": [(r["doc_type"], r["count"]) for r in rollups[:5]],
+            "total_errors": total - successful,
         }
 
     def get_recent_errors(self, limit: int = 10) -> List[Dict[str, Any]]:
@@ -211,7 +403,44 @@ class PDFAnalytics:
         Returns:
             Lista de errores recientes
         """
-        return sorted(self.data["errors"], key=lambda x: x["timestamp"], reverse=True)[:limit]
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT TS, DOC_TYPE, ERROR_MESSAGE, DOC_ID, USER_ID
+                FROM PDF_EVENTS
+                WHERE SUCCESS = 0
+                ORDER BY ID DESC
+                LIMIT ?
+                """,
+                (limit,),
+            ).fetchall()
+
+        return [
+            {
+                "timestamp": row["TS"],
+                "doc_type": row["DOC_TYPE"],
+                "error_message": row["ERROR_MESSAGE"],
+                "doc_id": row["DOC_ID"],
+                "user_id": row["USER_ID"],
+            }
+            for row in rows
+        ]
+
+    def purge_events(self, older_than_days: int = 90) -> int:
+        """
+        Elimina eventos crudos antiguos (los agregados se conservan)
+
+        Args:
+            older_than_days: Antigüedad mínima de los eventos a eliminar
+
+        Returns:
+            Número de eventos eliminados
+        """
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM PDF_EVENTS WHERE TS < ?", (cutoff,))
+            self._conn.commit()
+            return cursor.rowcount
 
     def export_report(self, days: int = 30) -> str:
         """
@@ -224,6 +453,8 @@ class PDFAnalytics:
             String con el reporte
         """
         stats = self.get_statistics(days)
+        if stats["total_generations"] == 0:
+            return f"\n=== REPORTE DE ANALYTICS PDF ({days} días) ===\n\nSin generaciones.\n"
 
         report = f"""
 === REPORTE DE ANALYTICS PDF ({days} días) ===
@@ -242,12 +473,22 @@ class PDFAnalytics:
 📄 Documentos Más Generados:
 """
         for doc_type, count in stats["top_documents"]:
-            report += f"  - {doc_type}: {count} documentos\n"
+            tipo = stats["by_type"][doc_type]
+            report += (
+                f"  - {doc_type}: {count} documentos "
+                f"(p50 {tipo['p50_ms']:.0f}ms, p95 {tipo['p95_ms']:.0f}ms, "
+                f"p99 {tipo['p99_ms']:.0f}ms)\n"
+            )
 
         report += f"\n💥 Total errores: {stats['total_errors']}\n"
 
         return report
 
+    def close(self) -> None:
+        """Cierra la conexión a la base de telemetría"""
+        with self._lock:
+            self._conn.close()
+
 
 # Instancia global singleton
 _analytics_instance: Optional[PDFAnalytics] = None
@@ -0,0 +1,373 @@
+"""
+Almacén de Documentos Generados
+===============================
+Gestiona el ciclo de vida de los archivos en `documentos_generados/`:
+
+- Layout particionado (shards): `documentos_generados/<ab>/<archivo>.pdf`,
+  donde `<ab>` son los 2 primeros hex del SHA-1 del nombre. Evita directorios
+  con decenas de miles de entradas.
+- Metadata cacheada en memoria (tamaño, mtime, ETag fuerte) para que la API de
+  descarga no vuelva a leer el archivo completo en cada request. Cada
+  resolución hace un `stat()` y solo reutiliza la entrada si coinciden
+  `st_mtime_ns` y `st_size`: el nombre incluye un timestamp de un segundo,
+  así que un documento regenerado dentro de ese segundo reemplaza al
+  anterior y se vuelve a calcular su ETag.
+- Reaper de retención: elimina archivos más antiguos que N días y aplica una
+  cuota de disco (borrando los más antiguos primero), reportando métricas.
+
+Autor: Sistema de Gestión Inmobiliaria
+Fecha: 2026-10-19
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Extensiones que gestiona el almacén
+MANAGED_SUFFIXES = (".pdf", ".zip")
+
+
+def shard_for(filename: str) -> str:
+    """Retorna el shard (2 caracteres hex) de un nombre de archivo"""
+    return hashlib.sha1(Path(filename).name.encode("utf-8")).hexdigest()[:2]
+
+
+def sharded_path(base_dir: Path, filename: str) -> Path:
+    """
+    Retorna la ruta particionada de un archivo, creando el shard si no existe
+
+    Args:
+        base_dir: Directorio raíz de documentos generados
+        filename: Nombre del archivo (sin directorios)
+
+    Returns:
+        Path `base_dir/<shard>/<filename>`
+    """
+    name = Path(filename).name
+    shard_dir = Path(base_dir) / shard_for(name)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    return shard_dir / name
+
+
+@dataclass(frozen=True)
+class GeneratedFileInfo:
+    """Metadata inmutable de un documento generado"""
+
+    path: Path
+    size: int
+    mtime: float
+    etag: str
+    stat_result: os.stat_result
+
+
+class GeneratedFileStore:
+    """
+    Almacén de documentos generados con metadata cacheada y retención
+
+    Example:
+        >>> store = get_output_store()
+        >>> info = store.resolve("recibo_10_20260101120000.pdf")
+        >>> if info and store.matches_etag(info, request.headers.get("if-none-match")):
+        ...     return Response(status_code=304)
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        retention_days: int = 30,
+        quota_mb: int = 1024,
+        max_cached_entries: int = 5000,
+    ):
+        """
+        Inicializa el almacén
+
+        Args:
+            base_dir: Directorio raíz (ej: documentos_generados)
+            retention_days: Días que se conserva un archivo generado
+            quota_mb: Cuota máxima de disco del directorio
+            max_cached_entries: Entradas de metadata mantenidas en memoria (LRU)
+        """
+        self.base_dir = Path(base_dir)
+        self.retention_days = retention_days
+        self.quota_bytes = quota_mb * 1024 * 1024
+        self.max_cached_entries = max_cached_entries
+
+        self._cache: "OrderedDict[str, GeneratedFileInfo]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        # Métricas
+        self._lookups = 0
+        self._cache_hits = 0
+        self._not_modified = 0
+        self._last_reap: Dict[str, Any] = {}
+
+        self._reaper_thread: Optional[threading.Thread] = None
+
+    # ========================================================================
+    # RESOLUCIÓN Y METADATA
+    # ========================================================================
+
+    def path_for(self, filename: str) -> Path:
+        """Ruta particionada donde debe escribirse un archivo nuevo"""
+        return sharded_path(self.base_dir, filename)
+
+    def resolve(self, filename: str) -> Optional[GeneratedFileInfo]:
+        """
+        Resuelve un nombre de archivo a su metadata
+
+        Busca primero la ruta cacheada, luego el shard y por último el layout
+        plano heredado (`base_dir/<archivo>`). La metadata cacheada solo se
+        reutiliza si el archivo conserva su `st_mtime_ns` y `st_size`.
+
+        Args:
+            filename: Nombre del archivo (se descarta cualquier directorio)
+
+        Returns:
+            GeneratedFileInfo o None si no existe
+        """
+        name = Path(filename).name
+
+        with self._lock:
+            self._lookups += 1
+            cached = self._cache.get(name)
+
+        candidates = [self.base_dir / shard_for(name) / name, self.base_dir / name]
+        if cached is not None:
+            candidates.insert(0, cached.path)
+
+        for candidate in candidates:
+            try:
+                st = candidate.stat()
+            except OSError:
+                continue
+
+            if (
+                cached is not None
+                and candidate == cached.path
+                and (st.st_mtime_ns, st.st_size)
+                == (cached.stat_result.st_mtime_ns, cached.stat_result.st_size)
+            ):
+                with self._lock:
+                    if name in self._cache:
+                        self._cache.move_to_end(name)
+                    self._cache_hits += 1
+                return cached
+
+            info = GeneratedFileInfo(
+                path=candidate,
+                size=st.st_size,
+                mtime=st.st_mtime,
+                etag=f'"{self._content_hash(candidate)}"',
+                stat_result=st,
+            )
+            with self._lock:
+                self._cache[name] = info
+                if len(self._cache) > self.max_cached_entries:
+                    self._cache.popitem(last=False)
+            return info
+
+        self.forget(name)
+        return None
+
+    def matches_etag(self, info: GeneratedFileInfo, if_none_match: Optional[str]) -> bool:
+        """
+        Evalúa un header If-None-Match contra el ETag del archivo
+
+        Registra el acierto para las métricas de hit rate.
+        """
+        if not if_none_match:
+            return False
+
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        matched = "*" in candidates or info.etag in candidates
+        if matched:
+            with self._lock:
+                self._not_modified += 1
+        return matched
+
+    def forget(self, filename: str) -> None:
+        """Elimina la metadata cacheada de un archivo"""
+        with self._lock:
+            self._cache.pop(Path(filename).name, None)
+
+    def _content_hash(self, path: Path) -> str:
+        """SHA-256 (truncado) del contenido, usado como ETag fuerte"""
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()[:32]
+
+    # ========================================================================
+    # RETENCIÓN (REAPER)
+    # ========================================================================
+
+    def reap(self) -> Dict[str, Any]:
+        """
+        Aplica la política de retención y la cuota de disco
+
+        1. Elimina archivos con mtime anterior a `retention_days`.
+        2. Si el total supera la cuota, elimina los más antiguos hasta quedar
+           en el 90% de la cuota.
+
+        Returns:
+            Diccionario con métricas de la ejecución
+        """
+        started = time.perf_counter()
+        cutoff = time.time() - self.retention_days * 86400
+
+        files = []
+        for root, _dirs, names in os.walk(self.base_dir):
+            for name in names:
+                if not name.lower().endswith(MANAGED_SUFFIXES):
+                    continue
+                path = Path(root) / name
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+
+        files.sort(key=lambda f: f[0])  # Más antiguos primero
+
+        deleted_expired = 0
+        deleted_quota = 0
+        freed_bytes = 0
+        kept = []
+
+        for mtime, size, path in files:
+            if mtime < cutoff and self._delete(path):
+                deleted_expired += 1
+                freed_bytes += size
+            else:
+                kept.append((mtime, size, path))
+
+        total_bytes = sum(f[1] for f in kept)
+        if total_bytes > self.quota_bytes:
+            target = self.quota_bytes * 0.9
+            remaining = []
+            for mtime, size, path in kept:
+                if total_bytes > target and self._delete(path):
+                    deleted_quota += 1
+                    freed_bytes += size
+                    total_bytes -= size
+                else:
+                    remaining.append((mtime, size, path))
+            kept = remaining
+
+        self._last_reap = {
+            "deleted_expired": deleted_expired,
+            "deleted_quota": deleted_quota,
+            "freed_mb": round(freed_bytes / (1024 * 1024), 2),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "executed_at": time.time(),
+        }
+        logger.info(
+            f"Reaper documentos_generados: {deleted_expired} expirados, "
+            f"{deleted_quota} por cuota, {len(kept)} archivos restantes"
+        )
+        return self.get_stats(file_count=len(kept), total_bytes=total_bytes)
+
+    def _delete(self, path: Path) -> bool:
+        try:
+            path.unlink()
+        except OSError:
+            return False
+        self.forget(path.name)
+        return True
+
+    def start_reaper(self, interval_seconds: int = 3600) -> None:
+        """Inicia el reaper periódico en un thread daemon (idempotente)"""
+        if self._reaper_thread is not None and self._reaper_thread.is_alive():
+            return
+
+        def reaper_loop():
+            while True:
+                try:
+                    self.reap()
+                except Exception as e:
+                    logger.error(f"Error en reaper de documentos generados: {e}")
+                time.sleep(interval_seconds)
+
+        self._reaper_thread = threading.Thread(
+            target=reaper_loop, daemon=True, name="GeneratedFilesReaper"
+        )
+        self._reaper_thread.start()
+
+    # ========================================================================
+    # MÉTRICAS
+    # ========================================================================
+
+    def get_stats(
+        self, file_count: Optional[int] = None, total_bytes: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Retorna métricas del almacén
+
+        Args:
+            file_count: Conteo ya calculado (evita recorrer el directorio)
+            total_bytes: Bytes ya calculados
+
+        Returns:
+            Diccionario con conteo, tamaño, cuota y hit rates
+        """
+        if file_count is None or total_bytes is None:
+            file_count, total_bytes = 0, 0
+            for root, _dirs, names in os.walk(self.base_dir):
+                for name in names:
+                    if name.lower().endswith(MANAGED_SUFFIXES):
+                        try:
+                            total_bytes += (Path(root) / name).stat().st_size
+                            file_count += 1
+                        except OSError:
+                            pass
+
+        with self._lock:
+            lookups = self._lookups
+            return {
+                "file_count": file_count,
+                "total_mb": round(total_bytes / (1024 * 1024), 2),
+                "quota_mb": self.quota_bytes / (1024 * 1024),
+                "usage_percent": (total_bytes / self.quota_bytes * 100) if self.quota_bytes else 0,
+                "lookups": lookups,
+                "metadata_hit_rate": (self._cache_hits / lookups * 100) if lookups else 0,
+                "not_modified": self._not_modified,
+                "not_modified_rate": (self._not_modified / lookups * 100) if lookups else 0,
+                "retention_days": self.retention_days,
+                "last_reap": dict(self._last_reap),
+            }
+
+
+# Instancia global singleton
+_store_instance: Optional[GeneratedFileStore] = None
+
+
+def get_output_store() -> GeneratedFileStore:
+    """Obtiene instancia singleton del almacén de documentos generados"""
+    global _store_instance
+    if _store_instance is None:
+        from src.infraestructura.servicios.pdf_elite.core.config import config
+
+        _store_instance = GeneratedFileStore(
+            base_dir=config.output_dir,
+            retention_days=config.output_retention_days,
+            quota_mb=config.output_quota_mb,
+        )
+    return _store_instance
+
+
+__all__ = [
+    "GeneratedFileInfo",
+    "GeneratedFileStore",
+    "get_output_store",
+    "shard_for",
+    "sharded_path",
+]
@@ -12,6 +12,8 @@ from typing import Any, Dict, List
 
 from fpdf import FPDF
 
+from src.infraestructura.servicios.pdf_elite.utils.output_store import sharded_path
+
 
 class PDFGenerator(FPDF):
     """Clase base personalizada para PDFs de la inmobiliaria"""
@@ -235,7 +237,7 @@ class ServicioDocumentosPDF:
 
         # Guardar
         filename = f"recaudo_{datos['id_recaudo']}_{datetime.now().strftime('%Y%m%d%H%M%S')}.pdf"
-        output_path = self.output_dir / filename
+        output_path = sharded_path(self.output_dir, filename)
         pdf.output(str(output_path))
 
         return str(output_path.absolute())
@@ -509,7 +511,7 @@ class ServicioDocumentosPDF:
 
         # Guardar
         filename = f"liquidacion_{datos['id']}_{datetime.now().strftime('%Y%m%d%H%M%S')}.pdf"
-        output_path = self.output_dir / filename
+        output_path = sharded_path(self.output_dir, filename)
         pdf.output(str(output_path))
 
         return str(output_path.absolute())
@@ -717,7 +719,7 @@ class ServicioDocumentosPDF:
         filename = (
             f"cuenta_cobro_{datos['id_liquidacion']}_{datetime.now().strftime('%Y%m%d%H%M%S')}.pdf"
         )
-        output_path = self.output_dir / filename
+        output_path = sharded_path(self.output_dir, filename)
         pdf.output(str(output_path))
 
         return str(output_path.absolute())
@@ -848,7 +850,7 @@ class ServicioDocumentosPDF:
 
         # Guardar
         filename = f"checklist_desocupacion_{datos['id_desocupacion']}_{datetime.now().strftime('%Y%m%d%H%M%S')}.pdf"
-        output_path = self.output_dir / filename
+        output_path = sharded_path(self.output_dir, filename)
         pdf.output(str(output_path))
 
         return str(output_path.absolute())
@@ -871,7 +873,7 @@ class ServicioDocumentosPDF:
         from concurrent.futures import ThreadPoolExecutor, as_completed
 
         zip_filename = f"{filename_prefix}_{datetime.now().strftime('%Y%m%d%H%M%S')}.zip"
-        zip_path = self.output_dir / zip_filename
+        zip_path = sharded_path(self.output_dir, zip_filename)
 
         generated_files = []
 
@@ -34,6 +34,7 @@ from src.presentacion.views.seguro_form_view import crear_seguro_form_view
 from src.presentacion.views.poliza_form_view import crear_poliza_form_view
 from src.presentacion.views.recibos_publicos_list_view import crear_recibos_publicos_list_view
 from src.presentacion.views.recibo_publico_form_view import crear_recibo_publico_form_view
+from src.aplicacion.contenedor import obtener_contenedor
 
 class NavigationHub:
     """
@@ -251,7 +252,7 @@ class NavigationHub:
     def _build_recibos_publicos_list(self):
         self.navbar.set_title("Gestión de Recibos Públicos")
         return crear_recibos_publicos_list_view(
-            self.page, self.servicios["recibos_publicos"], self.servicios["propiedades"], self.servicios["notificaciones"],
+            self.page, self.servicios["recibos_publicos"], self.servicios["propiedades"], obtener_contenedor().servicio_notificaciones,
             lambda: self.router.navegar_a("recibo_publico_form"), lambda id: self.router.navegar_a("recibo_publico_form", recibo_id=id),
             self._handle_marcar_pagado_recibo, self._handle_eliminar_recibo, on_ver_detalle=self._handle_ver_detalle_recibo
         )
@@ -701,7 +702,7 @@ class NavigationHub:
         if liq: self.router.navegar_a("liquidacion_form", liquidacion_id=liq[0].id_liquidacion)
 
     def _handle_ver_detalle_liq_asesor(self, id_l):
-        modal = crear_modal_detalle_liquidacion(self.page, self.servicios["liquidacion_asesores"], self.servicios["notificaciones"], id_l, lambda: self.page.close(modal))
+        modal = crear_modal_detalle_liquidacion(self.page, self.servicios["liquidacion_asesores"], obtener_contenedor().servicio_notificaciones, id_l, lambda: self.page.close(modal))
         self.page.open(modal)
 
     def _handle_aprobar_liq_asesor(self, id_l):
@@ -6,85 +6,101 @@ que el navegador use el nombre de archivo correcto en lugar de UUIDs.
 """
 
 from pathlib import Path
+from typing import Optional
 
-from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, Header, HTTPException, Response
 from fastapi.responses import FileResponse
 
+from src.infraestructura.servicios.pdf_elite.utils.output_store import (
+    GeneratedFileInfo,
+    get_output_store,
+)
+
 # Router para PDF downloads - SIN prefijo porque se montará en /api/pdf
 pdf_router = APIRouter(tags=["PDF Downloads"])
 
-# Directorio base donde se guardan los PDFs generados
-PDF_OUTPUT_DIR = Path("documentos_generados")
-
-
-@pdf_router.get("/download/{filename}")
-async def download_pdf(filename: str):
-    """
-    Endpoint para descargar PDFs con nombre correcto.
-
-    El header Content-Disposition fuerza al navegador a usar el nombre
-    especificado en lugar de generar un UUID.
+# Los documentos generados son inmutables (nombre con timestamp): el navegador puede
+# reutilizarlos sin revalidar. "private" porque contienen datos personales.
+CACHE_CONTROL_INMUTABLE = "private, max-age=31536000, immutable"
 
-    Args:
-        filename: Nombre del archivo PDF a descargar
 
-    Returns:
-        FileResponse con headers correctos para descarga
-    """
+def _resolver_pdf(filename: str) -> GeneratedFileInfo:
+    """Sanitiza el nombre y resuelve la metadata cacheada del PDF (404/400 si no aplica)."""
     # Sanitizar filename para prevenir path traversal
     safe_filename = Path(filename).name
 
-    # Construir path completo
-    pdf_path = PDF_OUTPUT_DIR / safe_filename
+    if not safe_filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="Solo se permiten archivos PDF")
 
-    # Validar que existe
-    if not pdf_path.exists():
+    info = get_output_store().resolve(safe_filename)
+    if info is None:
         raise HTTPException(status_code=404, detail=f"PDF no encontrado: {safe_filename}")
+    return info
 
-    if not pdf_path.suffix.lower() == ".pdf":
-        raise HTTPException(status_code=400, detail="Solo se permiten archivos PDF")
 
-    # Obtener tamaño del archivo para Content-Length
-    file_size = pdf_path.stat().st_size
+def _respuesta_pdf(
+    info: GeneratedFileInfo, disposition: str, if_none_match: Optional[str]
+) -> Response:
+    """
+    Construye la respuesta con ETag fuerte y cache inmutable.
 
-    # Retornar archivo permitiendo que FileResponse maneje el Content-Disposition
-    # Starlette/FastAPI generará automáticamente: content-disposition: attachment; filename="..."
+    - If-None-Match coincidente: 304 sin cuerpo.
+    - Range / If-Range: los resuelve FileResponse (206 parcial).
+    """
+    headers = {"ETag": info.etag, "Cache-Control": CACHE_CONTROL_INMUTABLE}
+
+    if get_output_store().matches_etag(info, if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = f'{disposition}; filename="{info.path.name}"'
+    # Sin Content-Length manual: FileResponse lo calcula (también para respuestas 206)
     return FileResponse(
-        path=str(pdf_path),
+        path=str(info.path),
         media_type="application/pdf",
-        filename=safe_filename,
-        headers={
-            "Content-Disposition": f'attachment; filename="{safe_filename}"',
-            "Content-Length": str(file_size),
-            "Cache-Control": "no-cache, no-store, must-revalidate",
-        },
+        headers=headers,
+        stat_result=info.stat_result,
     )
 
 
+@pdf_router.get("/download/{filename}")
+async def download_pdf(filename: str, if_none_match: Optional[str] = Header(default=None)):
+    """
+    Endpoint para descargar PDFs con nombre correcto.
+
+    El header Content-Disposition fuerza al navegador a usar el nombre
+    especificado en lugar de generar un UUID. Soporta ETag/If-None-Match y Range.
+
+    Args:
+        filename: Nombre del archivo PDF a descargar
+        if_none_match: Header If-None-Match enviado por el navegador
+
+    Returns:
+        FileResponse con headers correctos para descarga (o 304)
+    """
+    info = _resolver_pdf(filename)
+    return _respuesta_pdf(info, "attachment", if_none_match)
+
+
 @pdf_router.get("/view/{filename}")
-async def view_pdf(filename: str):
+async def view_pdf(filename: str, if_none_match: Optional[str] = Header(default=None)):
     """
     Endpoint para ver PDFs inline en el navegador.
 
     Args:
         filename: Nombre del archivo PDF a visualizar
+        if_none_match: Header If-None-Match enviado por el navegador
 
     Returns:
-        FileResponse para visualización inline
+        FileResponse para visualización inline (o 304)
     """
-    safe_filename = Path(filename).name
-    pdf_path = PDF_OUTPUT_DIR / safe_filename
+    info = _resolver_pdf(filename)
+    return _respuesta_pdf(info, "inline", if_none_match)
 
-    if not pdf_path.exists():
-        raise HTTPException(status_code=404, detail=f"PDF no encontrado: {safe_filename}")
 
-    return FileResponse(
-        path=str(pdf_path),
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'inline; filename="{safe_filename}"',
-        },
-    )
+@pdf_router.get("/stats")
+async def pdf_storage_stats():
+    """Métricas del almacén de documentos generados (conteo, bytes, hit rate)."""
+    return get_output_store().get_stats()
 
 
 def register_pdf_routes(app):
@@ -116,6 +132,9 @@ def register_pdf_routes(app):
 
         pdf_api.include_router(pdf_router)
 
+        # Reaper de retención/cuota para documentos_generados
+        get_output_store().start_reaper()
+
         # Montamos la sub-app en /api/pdf
         try:
             if hasattr(fastapi_app, "mount"):
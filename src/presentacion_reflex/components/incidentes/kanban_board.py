@@ -30,7 +30,9 @@ def _empty_state(title: str) -> rx.Component:
     )
 
 
-def _kanban_column(title: str, items: List[Dict[str, Any]], color_scheme: str) -> rx.Component:
+def _kanban_column(
+    title: str, items: List[Dict[str, Any]], total: int, color_scheme: str
+) -> rx.Component:
     return rx.vstack(
         # --- Header ---
         rx.hstack(
@@ -41,7 +43,7 @@ def _kanban_column(title: str, items: List[Dict[str, Any]], color_scheme: str) -
                 align_items="center",
             ),
             rx.badge(
-                items.length(),
+                total,
                 color_scheme=color_scheme,
                 variant="soft",
                 radius="full",
@@ -86,11 +88,36 @@ def kanban_board() -> rx.Component:
     """Tablero Kanban principal rediseñado."""
     return rx.scroll_area(
         rx.hstack(
-            _kanban_column("Reportado", IncidentesState.incidentes_reportado, "red"),
-            _kanban_column("Cotizado", IncidentesState.incidentes_cotizado, "orange"),
-            _kanban_column("Aprobado", IncidentesState.incidentes_aprobado, "green"),
-            _kanban_column("En Reparación", IncidentesState.incidentes_en_reparacion, "blue"),
-            _kanban_column("Finalizado", IncidentesState.incidentes_finalizado, "gray"),
+            _kanban_column(
+                "Reportado",
+                IncidentesState.incidentes_reportado,
+                IncidentesState.total_reportado,
+                "red",
+            ),
+            _kanban_column(
+                "Cotizado",
+                IncidentesState.incidentes_cotizado,
+                IncidentesState.total_cotizado,
+                "orange",
+            ),
+            _kanban_column(
+                "Aprobado",
+                IncidentesState.incidentes_aprobado,
+                IncidentesState.total_aprobado,
+                "green",
+            ),
+            _kanban_column(
+                "En Reparación",
+                IncidentesState.incidentes_en_reparacion,
+                IncidentesState.total_en_reparacion,
+                "blue",
+            ),
+            _kanban_column(
+                "Finalizado",
+                IncidentesState.incidentes_finalizado,
+                IncidentesState.total_finalizado,
+                "gray",
+            ),
             spacing="4",
             width="100%",  # Scroll content width
             height="100%",
@@ -10,7 +10,7 @@ import reflex as rx
 
 def bulk_liquidacion_form(
     form_data: rx.Var,
-    propietarios_options: rx.Var,  # Lista de strings "Nombre - Documento"
+    propietario_selector: rx.Component,
     on_submit: Callable,
     on_cancel: Callable,
     is_loading: rx.Var,
@@ -20,7 +20,7 @@ def bulk_liquidacion_form(
 
     Args:
         form_data: Dict con id_propietario y periodo
-        propietarios_options: Lista de propietarios como "Nombre - Documento"
+        propietario_selector: Picker (typeahead) que deja el ID en form_data["id_propietario"]
         on_submit: Callback al enviar
         on_cancel: Callback al cancelar
         is_loading: Estado de carga
@@ -44,13 +44,11 @@ def bulk_liquidacion_form(
                 rx.vstack(
                     # Selector de propietario
                     rx.box(
-                        rx.text("Propietario", font_weight="600", margin_bottom="0.5rem"),
-                        rx.select(
-                            propietarios_options,
-                            placeholder="Seleccione un propietario...",
+                        propietario_selector,
+                        rx.input(
+                            type="hidden",
                             name="id_propietario",
-                            required=True,
-                            width="100%",
+                            value=form_data["id_propietario"],
                         ),
                         width="100%",
                     ),
@@ -6,6 +6,7 @@ from typing import Any
 
 import reflex as rx
 
+from src.presentacion_reflex.components.shared.searchable_select import searchable_select
 from src.presentacion_reflex.state.liquidaciones_state import LiquidacionesState
 
 
@@ -65,17 +66,16 @@ def liquidacion_create_form() -> rx.Component:
                     # Selección de Contrato y Período
                     section_title("Configuración Básica"),
                     rx.grid(
-                        rx.vstack(
-                            rx.text("Contrato de Mandato/Propiedad", size="2", weight="medium"),
-                            rx.select(
-                                LiquidacionesState.propiedades_select_options,
-                                name="id_propiedad",
-                                placeholder="Seleccione propiedad...",
-                                on_change=LiquidacionesState.handle_propiedad_change,
-                                required=True,
-                                width="100%",
-                            ),
-                            spacing="1",
+                        searchable_select(
+                            "Contrato de Mandato/Propiedad",
+                            "Seleccione propiedad...",
+                            LiquidacionesState.propiedad_selected_label,
+                            LiquidacionesState.propiedad_search,
+                            LiquidacionesState.propiedad_menu_open,
+                            LiquidacionesState.filtered_propiedades_options,
+                            LiquidacionesState.set_propiedad_search,
+                            LiquidacionesState.toggle_propiedad_menu,
+                            LiquidacionesState.select_propiedad,
                         ),
                         rx.grid(
                             form_field(
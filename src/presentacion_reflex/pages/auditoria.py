@@ -33,6 +33,34 @@ def filters_bar() -> rx.Component:
                 AuditoriaState.load_logs(),
             ],
         ),
+        rx.select.root(
+            rx.select.trigger(placeholder="Acción"),
+            rx.select.content(
+                rx.select.group(
+                    rx.select.item("Todas", value="Todas"),
+                    rx.select.item("INSERT", value="INSERT"),
+                    rx.select.item("UPDATE", value="UPDATE"),
+                    rx.select.item("DELETE", value="DELETE"),
+                )
+            ),
+            value=AuditoriaState.filter_accion,
+            on_change=lambda val: [
+                AuditoriaState.set_filter_accion(val),
+                AuditoriaState.load_logs(),
+            ],
+        ),
+        rx.input(
+            type="date",
+            value=AuditoriaState.fecha_desde,
+            on_change=lambda val: [AuditoriaState.set_fecha_desde(val), AuditoriaState.load_logs()],
+            title="Desde",
+        ),
+        rx.input(
+            type="date",
+            value=AuditoriaState.fecha_hasta,
+            on_change=lambda val: [AuditoriaState.set_fecha_hasta(val), AuditoriaState.load_logs()],
+            title="Hasta",
+        ),
         rx.spacer(),
         rx.tooltip(
             rx.button(
@@ -98,6 +126,18 @@ def auditoria_content() -> rx.Component:
         rx.divider(),
         filters_bar(),
         rx.cond(AuditoriaState.is_loading, rx.center(rx.spinner()), audit_table()),
+        rx.cond(
+            AuditoriaState.hay_mas,
+            rx.center(
+                rx.button(
+                    "Cargar más",
+                    variant="soft",
+                    loading=AuditoriaState.is_loading_more,
+                    on_click=AuditoriaState.load_more,
+                ),
+                width="100%",
+            ),
+        ),
         spacing="5",
         padding="6",
         width="100%",
@@ -554,6 +554,90 @@ def system_tab_content() -> rx.Component:
     )
 
 
+# --- TELEMETRÍA PDF ---
+
+
+def telemetry_tab_content() -> rx.Component:
+    return rx.box(
+        rx.vstack(
+            rx.hstack(
+                rx.icon("activity", size=24, color="#6366f1"),
+                rx.text("Telemetría de Generación PDF", style=SECTION_TITLE_STYLE),
+                rx.spacer(),
+                rx.select(
+                    ["7", "30", "90", "365"],
+                    value=ConfiguracionState.pdf_telemetria_dias.to_string(),
+                    on_change=ConfiguracionState.set_pdf_telemetria_dias,
+                    size="2",
+                ),
+                rx.icon_button(
+                    rx.icon("refresh-cw", size=16),
+                    on_click=ConfiguracionState.cargar_telemetria_pdf,
+                    variant="soft",
+                    size="2",
+                    cursor="pointer",
+                ),
+                width="100%",
+                margin_bottom="4",
+            ),
+            rx.text(
+                "Agregados por plantilla: volumen, latencias (p50/p95/p99), páginas y tamaño promedio.",
+                color="gray",
+                margin_bottom="4",
+            ),
+            rx.table.root(
+                rx.table.header(
+                    rx.table.row(
+                        rx.table.column_header_cell("Plantilla", padding_left="4"),
+                        rx.table.column_header_cell("Generados"),
+                        rx.table.column_header_cell("Errores"),
+                        rx.table.column_header_cell("p50 (ms)"),
+                        rx.table.column_header_cell("p95 (ms)"),
+                        rx.table.column_header_cell("p99 (ms)"),
+                        rx.table.column_header_cell("Páginas prom."),
+                        rx.table.column_header_cell("KB prom."),
+                    )
+                ),
+                rx.table.body(
+                    rx.foreach(
+                        ConfiguracionState.pdf_telemetria,
+                        lambda row: rx.table.row(
+                            rx.table.cell(
+                                rx.text(row["doc_type"], weight="bold", color="#334155"),
+                                padding_y="3",
+                                padding_left="4",
+                            ),
+                            rx.table.cell(row["count"]),
+                            rx.table.cell(
+                                rx.text(
+                                    row["error_count"],
+                                    color=rx.cond(row["error_count"].to(int) > 0, "#ef4444", "#94a3b8"),
+                                )
+                            ),
+                            rx.table.cell(rx.text(row["p50_ms"], font_family="monospace")),
+                            rx.table.cell(rx.text(row["p95_ms"], font_family="monospace")),
+                            rx.table.cell(rx.text(row["p99_ms"], font_family="monospace")),
+                            rx.table.cell(row["avg_pages"]),
+                            rx.table.cell(row["avg_kb"]),
+                            _hover={"background": "#f8fafc"},
+                        ),
+                    )
+                ),
+                variant="surface",
+                size="2",
+                width="100%",
+                style={"border_radius": "12px", "overflow": "hidden"},
+            ),
+            style=CARD_STYLE,
+            width="100%",
+        ),
+        width="100%",
+        max_width="1200px",
+        margin="0 auto",
+        on_mount=ConfiguracionState.cargar_telemetria_pdf,
+    )
+
+
 def configuracion_content() -> rx.Component:
     return rx.vstack(
         rx.box(
@@ -584,10 +668,16 @@ def configuracion_content() -> rx.Component:
                 rx.tabs.trigger(
                     "Sistema", value="sistema", style={"font_size": "1rem", "padding_y": "12px"}
                 ),
+                rx.tabs.trigger(
+                    "Telemetría PDF",
+                    value="telemetria",
+                    style={"font_size": "1rem", "padding_y": "12px"},
+                ),
                 size="2",
             ),
             rx.tabs.content(company_tab_content(), value="empresa", padding_top="6"),
             rx.tabs.content(system_tab_content(), value="sistema", padding_top="6"),
+            rx.tabs.content(telemetry_tab_content(), value="telemetria", padding_top="6"),
             default_value="empresa",
             width="100%",
             max_width="1200px",
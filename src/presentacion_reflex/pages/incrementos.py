@@ -100,6 +100,133 @@ def ipc_table() -> rx.Component:
     )
 
 
+def _fila_incremento(c: dict) -> rx.Component:
+    return rx.table.row(
+        rx.table.cell(
+            rx.checkbox(
+                checked=~IPCState.masivo_excluidos.contains(c["id_contrato"]),
+                on_change=lambda _: IPCState.toggle_contrato_masivo(c["id_contrato"]),
+            )
+        ),
+        rx.table.cell(c["id_contrato"]),
+        rx.table.cell(c["direccion"]),
+        rx.table.cell(c["inquilino"]),
+        rx.table.cell(f"${c['canon_anterior']:,}"),
+        rx.table.cell(rx.text(f"${c['canon_nuevo']:,}", weight="bold")),
+        rx.table.cell(rx.text(f"+${c['diferencia']:,}", color="green")),
+        rx.table.cell(
+            rx.cond(c["tiene_mandato"], rx.badge("Sí"), rx.badge("No", color_scheme="gray"))
+        ),
+    )
+
+
+def incremento_masivo() -> rx.Component:
+    """Corrida anual: diff de cánones de los contratos elegibles y aplicación atómica."""
+    return rx.card(
+        rx.vstack(
+            rx.heading("Incremento masivo", size="4"),
+            rx.text(
+                "Contratos activos que cumplen aniversario a más tardar en el mes de aplicación.",
+                size="2",
+                color="gray",
+            ),
+            rx.hstack(
+                rx.input(
+                    type="date",
+                    value=IPCState.masivo_fecha,
+                    on_change=IPCState.set_masivo_fecha,
+                ),
+                rx.input(
+                    type="number",
+                    placeholder="IPC % (por defecto el del año anterior)",
+                    value=IPCState.masivo_porcentaje,
+                    on_change=IPCState.set_masivo_porcentaje,
+                    width="18em",
+                ),
+                rx.button(
+                    rx.icon("eye", size=16),
+                    "Previsualizar",
+                    variant="soft",
+                    on_click=IPCState.previsualizar_masivo,
+                    loading=IPCState.masivo_cargando,
+                ),
+                spacing="3",
+                align="center",
+            ),
+            rx.cond(
+                IPCState.masivo_resultado != "",
+                rx.callout(IPCState.masivo_resultado, icon="circle_check", color_scheme="green"),
+            ),
+            rx.cond(
+                IPCState.masivo_contratos.length() > 0,
+                rx.vstack(
+                    rx.hstack(
+                        rx.badge(f"{IPCState.masivo_seleccionados} contratos"),
+                        rx.text(
+                            f"Total actual: ${IPCState.masivo_totales['anterior']:,}", size="2"
+                        ),
+                        rx.text(
+                            f"Total nuevo: ${IPCState.masivo_totales['nuevo']:,}", size="2"
+                        ),
+                        rx.text(
+                            f"Diferencia: +${IPCState.masivo_totales['diferencia']:,}",
+                            size="2",
+                            color="green",
+                        ),
+                        spacing="4",
+                        align="center",
+                    ),
+                    rx.scroll_area(
+                        rx.table.root(
+                            rx.table.header(
+                                rx.table.row(
+                                    rx.table.column_header_cell(""),
+                                    rx.table.column_header_cell("Contrato"),
+                                    rx.table.column_header_cell("Propiedad"),
+                                    rx.table.column_header_cell("Inquilino"),
+                                    rx.table.column_header_cell("Canon actual"),
+                                    rx.table.column_header_cell("Canon nuevo"),
+                                    rx.table.column_header_cell("Diferencia"),
+                                    rx.table.column_header_cell("Mandato"),
+                                )
+                            ),
+                            rx.table.body(rx.foreach(IPCState.masivo_contratos, _fila_incremento)),
+                            variant="surface",
+                            size="1",
+                        ),
+                        max_height="420px",
+                    ),
+                    rx.hstack(
+                        rx.input(
+                            placeholder="Observaciones",
+                            value=IPCState.masivo_observaciones,
+                            on_change=IPCState.set_masivo_observaciones,
+                            width="100%",
+                        ),
+                        rx.cond(
+                            AuthState.check_action("Incrementos", "EDITAR"),
+                            rx.button(
+                                rx.icon("trending_up", size=16),
+                                "Aplicar incremento",
+                                on_click=IPCState.aplicar_masivo,
+                                loading=IPCState.masivo_cargando,
+                                disabled=IPCState.masivo_seleccionados == 0,
+                            ),
+                        ),
+                        width="100%",
+                        spacing="3",
+                    ),
+                    width="100%",
+                    spacing="3",
+                ),
+            ),
+            width="100%",
+            spacing="3",
+        ),
+        width="100%",
+    )
+
+
 def incrementos_content() -> rx.Component:
     return rx.vstack(
         rx.hstack(
@@ -125,6 +252,7 @@ def incrementos_content() -> rx.Component:
             rx.center(rx.spinner()),
             ipc_table(),
         ),
+        incremento_masivo(),
         ipc_modal(),
         spacing="5",
         padding="6",
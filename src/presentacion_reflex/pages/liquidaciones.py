@@ -15,6 +15,7 @@ from src.presentacion_reflex.components.liquidaciones import (
     payment_form,
     reverse_confirm_dialog,
 )
+from src.presentacion_reflex.components.shared.searchable_select import searchable_select
 from src.presentacion_reflex.state.auth_state import AuthState
 from src.presentacion_reflex.state.liquidaciones_state import LiquidacionesState
 from src.presentacion_reflex.state.pdf_state import PDFState
@@ -503,7 +504,17 @@ def liquidaciones_page() -> rx.Component:
             LiquidacionesState.show_bulk_create_modal,
             bulk_liquidacion_form(
                 form_data=LiquidacionesState.form_data,
-                propietarios_options=LiquidacionesState.propietarios_select_options,
+                propietario_selector=searchable_select(
+                    "Propietario",
+                    "Seleccione un propietario...",
+                    LiquidacionesState.propietario_selected_label,
+                    LiquidacionesState.propietario_search,
+                    LiquidacionesState.propietario_menu_open,
+                    LiquidacionesState.filtered_propietarios_options,
+                    LiquidacionesState.set_propietario_search,
+                    LiquidacionesState.toggle_propietario_menu,
+                    LiquidacionesState.select_propietario,
+                ),
                 on_submit=LiquidacionesState.generar_liquidacion_masiva,
                 on_cancel=LiquidacionesState.close_modal,
                 is_loading=LiquidacionesState.is_loading,
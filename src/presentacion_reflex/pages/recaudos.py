@@ -78,10 +78,12 @@ def recaudos_toolbar() -> rx.Component:
                     rx.icon("copy-plus"),
                     "Generar Masivos",
                     on_click=RecaudosState.generar_pagos_masivos,
+                    loading=RecaudosState.masivo_en_curso,
+                    disabled=RecaudosState.masivo_en_curso,
                     color_scheme="blue",
                     variant="soft",
                 ),
-                content="Genera pagos para todos los contratos activos con fecha de hoy, valor del canon y método Efectivo",
+                content="Genera pagos para todos los contratos activos con fecha de hoy, valor del canon y método Efectivo (no duplica los ya generados del mes)",
             ),
         ),
         # Botón Refresh
@@ -340,6 +342,17 @@ def recaudos_page() -> rx.Component:
         ),
         # Toolbar
         recaudos_toolbar(),
+        # Avance de la generación masiva
+        rx.cond(
+            RecaudosState.masivo_en_curso,
+            rx.vstack(
+                rx.text(RecaudosState.masivo_etapa, size="2", color=styles.TEXT_SECONDARY),
+                rx.progress(value=RecaudosState.masivo_progreso, width="100%"),
+                width="100%",
+                spacing="1",
+            ),
+            rx.box(),
+        ),
         # Error message
         rx.cond(
             RecaudosState.error_message != "",
@@ -2,8 +2,7 @@ from typing import Any, Dict, List
 
 import reflex as rx
 
-from src.aplicacion.servicios.servicio_alertas import ServicioAlertas
-from src.infraestructura.persistencia.database import db_manager
+from src.aplicacion.contenedor import obtener_contenedor
 
 
 class AlertasState(rx.State):
@@ -19,7 +18,7 @@ class AlertasState(rx.State):
     async def check_alerts(self):
         """Consulta nuevas alertas."""
         try:
-            servicio = ServicioAlertas(db_manager)
+            servicio = obtener_contenedor().servicio_alertas
             items = servicio.obtener_alertas()
 
             async with self:
@@ -1,10 +1,20 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 
 import reflex as rx
 from pydantic import BaseModel
 
-from src.aplicacion.servicios.servicio_configuracion import ServicioConfiguracion
-from src.infraestructura.persistencia.database import db_manager
+from src.aplicacion.contenedor import obtener_contenedor
+
+# Opciones del filtro de tabla -> tablas auditadas que agrupa
+TABLAS_POR_FILTRO = {
+    "PROPIEDADES": ["PROPIEDADES"],
+    "CONTRATOS": ["CONTRATOS_ARRENDAMIENTOS", "CONTRATOS_MANDATOS"],
+    "PERSONAS": ["PERSONAS"],
+    "USUARIOS": ["USUARIOS"],
+    "PAGOS": ["PAGOS_ASESORES", "PAGOS_PROPIETARIOS"],
+}
+
+TAMANO_PAGINA = 50
 
 
 class AuditLogModel(BaseModel):
@@ -19,6 +29,42 @@ class AuditLogModel(BaseModel):
     color_scheme: str
 
 
+def _a_modelo(ent) -> AuditLogModel:
+    """Mapeo de la entidad al modelo Reflex."""
+    # Construir detalle legible
+    detalle_str = f"Reg: {ent.id_registro}"
+    if ent.campo:
+        detalle_str += f" | {ent.campo}: {ent.valor_anterior or 'None'} -> {ent.valor_nuevo or 'None'}"
+    elif ent.motivo_cambio:
+        detalle_str += f" | Motivo: {ent.motivo_cambio}"
+
+    # Determinar color
+    color = "blue"
+    if ent.accion == "INSERT":
+        color = "green"
+    elif ent.accion == "UPDATE":
+        color = "orange"
+    elif ent.accion == "DELETE":
+        color = "red"
+
+    return AuditLogModel(
+        id_auditoria=ent.id_auditoria,
+        fecha_cambio=ent.fecha_cambio or "",
+        usuario=ent.usuario or "Sistema",
+        tabla=ent.tabla or "Desconocida",
+        accion=ent.accion or "UNKNOWN",
+        detalle=detalle_str,
+        color_scheme=color,
+    )
+
+
+def _buscar(filtros: Dict[str, Any], despues_de: Optional[int]) -> List[AuditLogModel]:
+    """Página de auditoría (TAMANO_PAGINA + 1 filas para saber si hay más)."""
+    servicio = obtener_contenedor().servicio_configuracion
+    entidades = servicio.buscar_auditoria(**filtros, limit=TAMANO_PAGINA + 1, despues_de=despues_de)
+    return [_a_modelo(ent) for ent in entidades]
+
+
 class AuditoriaState(rx.State):
     """Estado para la gestión de Auditoría."""
 
@@ -28,68 +74,41 @@ class AuditoriaState(rx.State):
 
     # Filtros
     filter_tabla: str = "Todas"
+    filter_accion: str = "Todas"
+    fecha_desde: str = ""
+    fecha_hasta: str = ""
     search_query: str = ""
 
+    # Paginación keyset: ID_AUDITORIA de la última fila mostrada
+    ultimo_id: int = 0
+    hay_mas: bool = False
+    is_loading_more: bool = False
+
+    def _filtros(self) -> Dict[str, Any]:
+        """Filtros actuales en los términos de ServicioConfiguracion.buscar_auditoria."""
+        return {
+            "tablas": TABLAS_POR_FILTRO.get(self.filter_tabla),
+            "accion": self.filter_accion if self.filter_accion != "Todas" else None,
+            "fecha_desde": self.fecha_desde or None,
+            "fecha_hasta": self.fecha_hasta or None,
+            "texto": self.search_query.strip() or None,
+        }
+
     @rx.event(background=True)
     async def load_logs(self):
-        """Carga los registros de auditoría."""
+        """Carga la primera página de auditoría con los filtros actuales."""
         async with self:
             self.is_loading = True
             self.error_message = ""
+            filtros = self._filtros()
 
         try:
-            servicio = ServicioConfiguracion(db_manager)
-
-            # Obtener datos del backend
-            if self.filter_tabla != "Todas":
-                entidades = servicio.buscar_auditoria_por_tabla(self.filter_tabla, limit=100)
-            else:
-                entidades = servicio.listar_auditoria(limit=100)
-
-            # Filtrado en memoria por búsqueda de texto (detalle/usuario)
-            if self.search_query:
-                q = self.search_query.lower()
-                entidades = [
-                    e
-                    for e in entidades
-                    if (e.usuario and q in e.usuario.lower())
-                    or (e.campo and q in e.campo.lower())
-                    or (e.motivo_cambio and q in e.motivo_cambio.lower())
-                ]
-
-            # Mapeo a modelo Reflex
-            modelos = []
-            for ent in entidades:
-                # Construir detalle legible
-                detalle_str = f"Reg: {ent.id_registro}"
-                if ent.campo:
-                    detalle_str += f" | {ent.campo}: {ent.valor_anterior or 'None'} -> {ent.valor_nuevo or 'None'}"
-                elif ent.motivo_cambio:
-                    detalle_str += f" | Motivo: {ent.motivo_cambio}"
-
-                # Determinar color
-                color = "blue"
-                if ent.accion == "INSERT":
-                    color = "green"
-                elif ent.accion == "UPDATE":
-                    color = "orange"
-                elif ent.accion == "DELETE":
-                    color = "red"
-
-                modelos.append(
-                    AuditLogModel(
-                        id_auditoria=ent.id_auditoria,
-                        fecha_cambio=ent.fecha_cambio or "",
-                        usuario=ent.usuario or "Sistema",
-                        tabla=ent.tabla or "Desconocida",
-                        accion=ent.accion or "UNKNOWN",
-                        detalle=detalle_str,
-                        color_scheme=color,
-                    )
-                )
+            modelos = _buscar(filtros, None)
 
             async with self:
-                self.logs = modelos
+                self.hay_mas = len(modelos) > TAMANO_PAGINA
+                self.logs = modelos[:TAMANO_PAGINA]
+                self.ultimo_id = self.logs[-1].id_auditoria if self.logs else 0
                 self.is_loading = False
 
         except Exception as e:
@@ -97,8 +116,42 @@ class AuditoriaState(rx.State):
                 self.error_message = str(e)
                 self.is_loading = False
 
+    @rx.event(background=True)
+    async def load_more(self):
+        """Agrega la página siguiente (keyset desde la última fila mostrada)."""
+        async with self:
+            if self.is_loading_more or not self.hay_mas:
+                return
+            self.is_loading_more = True
+            filtros = self._filtros()
+            despues_de = self.ultimo_id
+
+        try:
+            modelos = _buscar(filtros, despues_de)
+
+            async with self:
+                self.hay_mas = len(modelos) > TAMANO_PAGINA
+                self.logs = self.logs + modelos[:TAMANO_PAGINA]
+                if modelos:
+                    self.ultimo_id = self.logs[-1].id_auditoria
+                self.is_loading_more = False
+
+        except Exception as e:
+            async with self:
+                self.error_message = str(e)
+                self.is_loading_more = False
+
     def set_filter_tabla(self, value: str):
         self.filter_tabla = value
 
     def set_search(self, value: str):
         self.search_query = value
+
+    def set_filter_accion(self, value: str):
+        self.filter_accion = value
+
+    def set_fecha_desde(self, value: str):
+        self.fecha_desde = value
+
+    def set_fecha_hasta(self, value: str):
+        self.fecha_hasta = value
@@ -38,6 +38,10 @@ class ConfiguracionState(rx.State):
     # Control de edición de parámetros (por ID)
     parametros_desbloqueados: List[int] = []
 
+    # Telemetría de generación PDF (agregados por plantilla)
+    pdf_telemetria: List[Dict[str, Any]] = []
+    pdf_telemetria_dias: int = 30
+
     def on_load(self):
         """Carga los datos al iniciar la página."""
         self.cargar_datos_empresa()
@@ -168,6 +172,23 @@ class ConfiguracionState(rx.State):
         except Exception as e:
             return rx.toast.error(f"Error al actualizar parámetro: {str(e)}")
 
+    def cargar_telemetria_pdf(self):
+        """Carga los agregados de telemetría PDF del período seleccionado."""
+        from src.infraestructura.servicios.pdf_elite.utils.analytics import get_pdf_analytics
+
+        try:
+            self.pdf_telemetria = get_pdf_analytics().get_template_rollups(
+                days=self.pdf_telemetria_dias
+            )
+        except Exception as e:
+            self.pdf_telemetria = []
+            return rx.toast.error(f"Error cargando telemetría PDF: {str(e)}")
+
+    def set_pdf_telemetria_dias(self, value: str):
+        """Cambia el período (días) de la telemetría PDF y recarga."""
+        self.pdf_telemetria_dias = int(value)
+        return self.cargar_telemetria_pdf()
+
     def toggle_lock(self, id_parametro: int):
         """Alterna el bloqueo de un parámetro."""
         if id_parametro in self.parametros_desbloqueados:
@@ -1,12 +1,26 @@
+import asyncio
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 import reflex as rx
 
+from src.aplicacion.servicios.servicio_autocompletado import ServicioAutocompletado
 from src.aplicacion.servicios.servicio_contratos import ServicioContratos
 from src.infraestructura.persistencia.database import db_manager
 from src.presentacion_reflex.state.documentos_mixin import DocumentosStateMixin
 
+# Resultados por búsqueda en los pickers del formulario
+LIMITE_TYPEAHEAD = 15
+
+# Campo del formulario -> catálogo de autocompletado (etiquetas en edición)
+CATALOGOS_FORMULARIO = {
+    "id_propiedad": "propiedades",
+    "id_propietario": "propietarios",
+    "id_asesor": "asesores",
+    "id_arrendatario": "arrendatarios",
+    "id_codeudor": "codeudores",
+}
+
 
 class ContratosState(DocumentosStateMixin):
     """Estado para gestión de contratos (Mandatos y Arrendamientos).
@@ -17,6 +31,9 @@ class ContratosState(DocumentosStateMixin):
     current_page: int = 1
     page_size: int = 25
     total_items: int = 0
+    # Keyset: cursor con el que se cargó cada página visitada
+    page_cursors: List[str] = [""]
+    next_cursor: str = ""
 
     # Datos
     contratos: List[Dict[str, Any]] = []
@@ -38,27 +55,8 @@ class ContratosState(DocumentosStateMixin):
     # Opciones de filtros (para dropdowns)
     tipo_options: List[str] = ["Todos", "Mandato", "Arrendamiento"]
     estado_options: List[str] = ["Todos", "Activo", "Cancelado"]
-    propiedades_options: List[Dict[str, Any]] = []
-    personas_options: List[Dict[str, Any]] = []
-
-    # Opciones para selects (listas simples de strings)
-    # Opciones para selects (listas de listas ["label", "value"])
-    propiedades_select_options: List[List[str]] = []
-    propietarios_select_options: List[List[str]] = []
+    # Filtro de asesor (catálogo pequeño; los pickers del formulario usan typeahead)
     asesores_select_options: List[List[str]] = []
-    propiedades_select_options: List[List[str]] = []
-    propietarios_select_options: List[List[str]] = []
-    asesores_select_options: List[List[str]] = []
-    asesores_select_options: List[List[str]] = []
-    personas_select_options: List[List[str]] = []
-    # Nuevas opciones para Arrendamiento y Mandato
-    propiedades_arriendo_select_options: List[List[str]] = []
-    propiedades_mandato_libre_select_options: List[List[str]] = []
-    arrendatarios_select_options: List[List[str]] = []
-    codeudores_select_options: List[List[str]] = []
-
-    # Mapas de datos adicionales
-    propiedades_canon_map: Dict[str, float] = {}
 
     # Modal CRUD
     modal_open: bool = False
@@ -84,11 +82,20 @@ class ContratosState(DocumentosStateMixin):
         """Alterna entre vista de tabla y grid."""
         self.is_grid_view = not self.is_grid_view
 
+    def _canon_propiedad(self, id_propiedad: str) -> Optional[float]:
+        """Canon estimado de la propiedad (dato auxiliar del índice de autocompletado)."""
+        if not id_propiedad:
+            return None
+        opcion = ServicioAutocompletado(db_manager).obtener("propiedades", id_propiedad)
+        if not opcion or opcion["extra"] is None:
+            return None
+        return float(opcion["extra"])
+
     def on_change_propiedad(self, id_propiedad: str):
         """Maneja cambio propiedad Mandato."""
         self.form_data["id_propiedad"] = id_propiedad
-        if id_propiedad and id_propiedad in self.propiedades_canon_map:
-            canon = self.propiedades_canon_map[id_propiedad]
+        canon = self._canon_propiedad(id_propiedad)
+        if canon is not None:
             self.form_data["canon"] = str(int(canon))
         else:
             self.form_data["canon"] = ""
@@ -100,8 +107,8 @@ class ContratosState(DocumentosStateMixin):
         2. Calcula deposito (50% canon).
         """
         self.form_data["id_propiedad"] = id_propiedad
-        if id_propiedad and id_propiedad in self.propiedades_canon_map:
-            canon = self.propiedades_canon_map[id_propiedad]
+        canon = self._canon_propiedad(id_propiedad)
+        if canon is not None:
             self.form_data["canon"] = str(int(canon))
             # Calcular deposito
             self.form_data["deposito"] = str(int(canon * 0.5))
@@ -172,253 +179,14 @@ class ContratosState(DocumentosStateMixin):
 
     @rx.event(background=True)
     async def load_filter_options(self):
-        """Carga opciones para dropdowns de filtros."""
-        # Instanciar repositorios y servicio
-        from src.infraestructura.persistencia.repositorio_propiedad_sqlite import RepositorioPropiedadSQLite
-        from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-            RepositorioContratoMandatoSQLite,
-        )
-        from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-            RepositorioContratoArrendamientoSQLite,
-        )
-        from src.infraestructura.persistencia.repositorio_renovacion_sqlite import (
-            RepositorioRenovacionSQLite,
-        )
-        from src.infraestructura.persistencia.repositorio_ipc_sqlite import RepositorioIPCSQLite
-        from src.infraestructura.persistencia.repositorio_arrendatario_sqlite import (
-            RepositorioArrendatarioSQLite,
-        )
-        from src.infraestructura.persistencia.repositorio_codeudor_sqlite import (
-            RepositorioCodeudorSQLite,
+        """Carga opciones para el filtro de asesor (los pickers consultan bajo demanda)."""
+        asesores = await asyncio.to_thread(
+            ServicioAutocompletado(db_manager).listar, "asesores"
         )
-
-        repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-        repo_mandato = RepositorioContratoMandatoSQLite(db_manager)
-        repo_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-        repo_renovacion = RepositorioRenovacionSQLite(db_manager)
-        repo_ipc = RepositorioIPCSQLite(db_manager)
-        repo_arrendatario = RepositorioArrendatarioSQLite(db_manager)
-        repo_codeudor = RepositorioCodeudorSQLite(db_manager)
-
-        # Como solo cargamos opciones SQL directas aqui, no necesitamos el servicio completo, 
-        # pero mantenemos la estructura por si acaso se usa logica de negocio luego.
-        # De hecho, el código original INSTANCIABA el servicio pero NO LO USABA en load_filter_options
-        # porque hacía queries directos con db_manager.
-        # Mantendremos la instanciación correcta si se quiere usar, pero el bloque de abajo usa db_manager directo.
-
-        # 1. Cargar TODAS las Propiedades activas
-        # NOTE: Load ALL properties (not just those without contracts) to support edit mode
-        query_propiedades = """
-        SELECT P.ID_PROPIEDAD, P.MATRICULA_INMOBILIARIA, P.DIRECCION_PROPIEDAD, P.CANON_ARRENDAMIENTO_ESTIMADO
-        FROM PROPIEDADES P
-        WHERE P.ESTADO_REGISTRO = TRUE
-        ORDER BY P.DIRECCION_PROPIEDAD
-        """
-
-        # 2. Cargar Propietarios: Unir PERSONAS con PROPIETARIOS
-        query_propietarios = """
-        SELECT PR.ID_PROPIETARIO, P.NOMBRE_COMPLETO, P.NUMERO_DOCUMENTO
-        FROM PERSONAS P
-        INNER JOIN PROPIETARIOS PR ON P.ID_PERSONA = PR.ID_PERSONA
-        WHERE P.ESTADO_REGISTRO = TRUE AND PR.ESTADO_PROPIETARIO = TRUE
-        ORDER BY P.NOMBRE_COMPLETO
-        """
-
-        # 3. Cargar Asesores: Unir PERSONAS con ASESORES
-        query_asesores = """
-        SELECT A.ID_ASESOR, P.NOMBRE_COMPLETO, P.NUMERO_DOCUMENTO
-        FROM PERSONAS P
-        INNER JOIN ASESORES A ON P.ID_PERSONA = A.ID_PERSONA
-        WHERE P.ESTADO_REGISTRO = TRUE AND A.ESTADO = TRUE
-        ORDER BY P.NOMBRE_COMPLETO
-        """
-
-        # 4. Cargar Personas (Generico para Arrendatarios/Codeudores) - MANTENER ID_PERSONA?
-        # Para arrendamiento usamos las especificas abajo. Esta es select generico tal vez para otros usos?
-        # Si se usa para algo que requiera ID_PERSONA, dejarlo.
-        query_personas = """
-        SELECT ID_PERSONA, NOMBRE_COMPLETO, NUMERO_DOCUMENTO
-        FROM PERSONAS
-        WHERE ESTADO_REGISTRO = TRUE
-        ORDER BY NOMBRE_COMPLETO
-        """
-
-        # Helper local para acceso seguro a diccionarios (Case Insensitive)
-        def get_val(row: dict, field: str) -> str:
-            """Intenta obtener valor con clave en mayúscula o minúscula."""
-            val = row.get(field.upper())
-            if val is None:
-                val = row.get(field.lower())
-            if val is None:
-                # Fallback para claves mixtas si fuera necesario
-                return ""
-            return str(val)
-
-        with db_manager.obtener_conexion() as conn:
-            cursor = db_manager.get_dict_cursor(conn)
-
-            # Propiedades
-            cursor.execute(query_propiedades)
-            rows_propiedades = cursor.fetchall()
-            # Formato para Reflex Select: [Label, Value]
-            propiedades_select = [
-                [
-                    get_val(row, "DIRECCION_PROPIEDAD"),
-                    get_val(row, "ID_PROPIEDAD"),
-                ]
-                for row in rows_propiedades
-            ]
-
-            # Crear mapa de canones: ID -> Canon (float/int)
-            canon_map = {}
-            for row in rows_propiedades:
-                # Intentar obtener el canon con manejo de mayusculas/minusculas
-                canon_str = get_val(row, "CANON_ARRENDAMIENTO_ESTIMADO")
-                id_prop = get_val(row, "ID_PROPIEDAD")
-                canon_map[id_prop] = float(canon_str) if canon_str else 0.0
-
-            # Propietarios
-            cursor.execute(query_propietarios)
-            rows_propietarios = cursor.fetchall()
-            propietarios_select = [
-                [
-                    get_val(row, "NOMBRE_COMPLETO"),
-                    get_val(row, "ID_PROPIETARIO"),
-                ]
-                for row in rows_propietarios
-            ]
-
-            # Asesores
-            cursor.execute(query_asesores)
-            rows_asesores = cursor.fetchall()
-            asesores_select = [
-                [
-                    get_val(row, "NOMBRE_COMPLETO"),
-                    get_val(row, "ID_ASESOR"),
-                ]
-                for row in rows_asesores
-            ]
-
-            # Personas (Generico)
-            cursor.execute(query_personas)
-            rows_personas = cursor.fetchall()
-            personas_select = [
-                [
-                    get_val(row, "NOMBRE_COMPLETO"),
-                    get_val(row, "ID_PERSONA"),
-                ]
-                for row in rows_personas
-            ]
-
-            # 4.1. Propiedades para NUEVO MANDATO (Sin mandato activo)
-            # NOTE: Load properties without active Mandate
-            query_propiedades_libre_mandato = """
-            SELECT P.ID_PROPIEDAD, P.MATRICULA_INMOBILIARIA, P.DIRECCION_PROPIEDAD
-            FROM PROPIEDADES P
-            WHERE P.ESTADO_REGISTRO = TRUE
-            AND NOT EXISTS (
-                SELECT 1 FROM CONTRATOS_MANDATOS CM 
-                WHERE CM.ID_PROPIEDAD = P.ID_PROPIEDAD
-                AND CM.ESTADO_CONTRATO_M = 'Activo'
-            )
-            ORDER BY P.DIRECCION_PROPIEDAD
-            """
-            cursor.execute(query_propiedades_libre_mandato)
-            rows_prop_libre = cursor.fetchall()
-            propiedades_libre_select = [
-                [
-                    get_val(row, "DIRECCION_PROPIEDAD"),
-                    get_val(row, "ID_PROPIEDAD"),
-                ]
-                for row in rows_prop_libre
-            ]
-
-            # ---------------------------------------------------------
-            # CARGADORES ESPECIFICOS PAR ARRENDAMIENTO
-            # ---------------------------------------------------------
-
-            # 5. Propiedades para Arrendamiento (Con Mandato Activo Y SIN Arrendamiento Activo)
-            # NOTE: Load properties with active Mandate AND NO active Lease
-            query_propiedades_arriendo = """
-            SELECT P.ID_PROPIEDAD, P.MATRICULA_INMOBILIARIA, P.DIRECCION_PROPIEDAD, P.CANON_ARRENDAMIENTO_ESTIMADO
-            FROM PROPIEDADES P
-            JOIN CONTRATOS_MANDATOS CM ON P.ID_PROPIEDAD = CM.ID_PROPIEDAD
-            WHERE P.ESTADO_REGISTRO = TRUE
-            AND CM.ESTADO_CONTRATO_M = 'Activo'
-            AND NOT EXISTS (
-                SELECT 1 FROM CONTRATOS_ARRENDAMIENTOS CA 
-                WHERE CA.ID_PROPIEDAD = P.ID_PROPIEDAD 
-                AND CA.ESTADO_CONTRATO_A = 'Activo'
-            )
-            ORDER BY P.DIRECCION_PROPIEDAD
-            """
-            cursor.execute(query_propiedades_arriendo)
-            rows_prop_arriendo = cursor.fetchall()
-            propiedades_arriendo_select = [
-                [
-                    get_val(row, "DIRECCION_PROPIEDAD"),
-                    get_val(row, "ID_PROPIEDAD"),
-                ]
-                for row in rows_prop_arriendo
-            ]
-
-            # Actualizar mapa de canones con estas propiedades tambien
-            for row in rows_prop_arriendo:
-                canon_str = get_val(row, "CANON_ARRENDAMIENTO_ESTIMADO")
-                id_prop = get_val(row, "ID_PROPIEDAD")
-                if id_prop:
-                    canon_map[id_prop] = float(canon_str) if canon_str else 0.0
-
-            # 6. Arrendatarios (Personas con rol Arrendatario)
-            query_arrendatarios = """
-            SELECT A.ID_ARRENDATARIO, P.NOMBRE_COMPLETO, P.NUMERO_DOCUMENTO
-            FROM PERSONAS P
-            INNER JOIN ARRENDATARIOS A ON P.ID_PERSONA = A.ID_PERSONA
-            WHERE P.ESTADO_REGISTRO = TRUE AND A.ESTADO_ARRENDATARIO = TRUE
-            ORDER BY P.NOMBRE_COMPLETO
-            """
-            cursor.execute(query_arrendatarios)
-            rows_arrendatarios = cursor.fetchall()
-            arrendatarios_select = [
-                [
-                    get_val(row, "NOMBRE_COMPLETO"),
-                    get_val(row, "ID_ARRENDATARIO"),
-                ]
-                for row in rows_arrendatarios
-            ]
-
-            # 7. Codeudores (Personas con rol Codeudor)
-            query_codeudores = """
-            SELECT C.ID_CODEUDOR, P.NOMBRE_COMPLETO, P.NUMERO_DOCUMENTO
-            FROM PERSONAS P
-            INNER JOIN CODEUDORES C ON P.ID_PERSONA = C.ID_PERSONA
-            WHERE P.ESTADO_REGISTRO = TRUE AND C.ESTADO_REGISTRO = TRUE
-            ORDER BY P.NOMBRE_COMPLETO
-            """
-            cursor.execute(query_codeudores)
-            rows_codeudores = cursor.fetchall()
-            codeudores_select = [
-                [
-                    get_val(row, "NOMBRE_COMPLETO"),
-                    get_val(row, "ID_CODEUDOR"),
-                ]
-                for row in rows_codeudores
-            ]
-
         async with self:
-            # self.propiedades_options = ... # Ya no usamos listas de dicts viejas si no se necesitan
-            self.propiedades_select_options = propiedades_select
-            self.propiedades_mandato_libre_select_options = propiedades_libre_select
-            self.propietarios_select_options = propietarios_select
-            self.asesores_select_options = asesores_select
-            self.personas_select_options = personas_select
-            self.propiedades_arriendo_select_options = propiedades_arriendo_select
-            self.arrendatarios_select_options = arrendatarios_select
-            self.codeudores_select_options = codeudores_select
-            self.propiedades_canon_map = canon_map
-            self.propiedades_canon_map = canon_map
-
-    # --- Custom Searchable Select Logic ---
+            self.asesores_select_options = [[a["texto"], a["id"]] for a in asesores]
+
+    # --- Custom Searchable Select Logic (typeahead) ---
 
     # Search Texts
     propiedad_search: str = ""
@@ -434,118 +202,66 @@ class ContratosState(DocumentosStateMixin):
     arrendatario_menu_open: bool = False
     codeudor_menu_open: bool = False
 
-    @rx.var
-    def filtered_propiedades_options(self) -> List[List[str]]:
-        """Filtra opciones de propiedad según el texto de búsqueda."""
-        if self.modal_mode == "crear_mandato":
-            options = self.propiedades_mandato_libre_select_options
-        elif self.modal_mode in ["crear_arrendamiento", "editar_arrendamiento"]:
-            options = self.propiedades_arriendo_select_options
-        else:
-            options = self.propiedades_select_options
-            
-        if not self.propiedad_search:
-            return options
-        return [
-            opt for opt in options 
-            if self.propiedad_search.lower() in opt[0].lower()
-        ]
+    # Top-K de cada picker: [texto, id, detalle]
+    filtered_propiedades_options: List[List[str]] = []
+    filtered_propietarios_options: List[List[str]] = []
+    filtered_asesores_options: List[List[str]] = []
+    filtered_arrendatarios_options: List[List[str]] = []
+    filtered_codeudores_options: List[List[str]] = []
 
-    @rx.var
-    def filtered_propietarios_options(self) -> List[List[str]]:
-        """Filtra opciones de propietario según el texto de búsqueda."""
-        if not self.propietario_search:
-            return self.propietarios_select_options
-        return [
-            opt for opt in self.propietarios_select_options 
-            if self.propietario_search.lower() in opt[0].lower()
-        ]
+    # Etiquetas de los valores seleccionados (campo del formulario -> texto)
+    selected_labels: Dict[str, str] = {}
 
-    @rx.var
-    def filtered_asesores_options(self) -> List[List[str]]:
-        """Filtra opciones de asesor según el texto de búsqueda."""
-        if not self.asesor_search:
-            return self.asesores_select_options
-        return [
-            opt for opt in self.asesores_select_options 
-            if self.asesor_search.lower() in opt[0].lower()
-        ]
+    def _catalogo_propiedades(self) -> str:
+        if self.modal_mode == "crear_mandato":
+            return "propiedades_sin_mandato"
+        if self.modal_mode in ["crear_arrendamiento", "editar_arrendamiento"]:
+            return "propiedades_para_arriendo"
+        return "propiedades"
 
-    @rx.var
-    def filtered_arrendatarios_options(self) -> List[List[str]]:
-        """Filtra opciones de arrendatario según el texto de búsqueda."""
-        if not self.arrendatario_search:
-            return self.arrendatarios_select_options
-        return [
-            opt for opt in self.arrendatarios_select_options 
-            if self.arrendatario_search.lower() in opt[0].lower()
-        ]
+    async def _typeahead(self, campo: str, catalogo: str, resultados: str, termino: str):
+        """Consulta el índice fuera del event loop y descarta respuestas obsoletas."""
+        async with self:
+            setattr(self, f"{campo}_search", termino)
+        opciones = await asyncio.to_thread(
+            ServicioAutocompletado(db_manager).buscar, catalogo, termino, LIMITE_TYPEAHEAD
+        )
+        async with self:
+            if getattr(self, f"{campo}_search") == termino:
+                setattr(
+                    self, resultados, [[o["texto"], o["id"], o["detalle"]] for o in opciones]
+                )
 
-    @rx.var
-    def filtered_codeudores_options(self) -> List[List[str]]:
-        """Filtra opciones de codeudor según el texto de búsqueda."""
-        if not self.codeudor_search:
-            return self.codeudores_select_options
-        return [
-            opt for opt in self.codeudores_select_options 
-            if self.codeudor_search.lower() in opt[0].lower()
-        ]
+    def _etiquetas_formulario(self, form_data: Dict[str, Any]) -> Dict[str, str]:
+        """Etiquetas de los IDs ya cargados en el formulario (modo edición)."""
+        servicio = ServicioAutocompletado(db_manager)
+        etiquetas = {}
+        for campo, catalogo in CATALOGOS_FORMULARIO.items():
+            valor = form_data.get(campo)
+            opcion = servicio.obtener(catalogo, valor) if valor else None
+            if opcion:
+                etiquetas[campo] = opcion["texto"]
+        return etiquetas
 
     @rx.var
     def propiedad_selected_label(self) -> str:
-        """Obtiene el label de la propiedad seleccionada."""
-        id_p = self.form_data.get("id_propiedad")
-        if not id_p: return ""
-        # Buscamos en todas las listas para asegurar que se muestre
-        all_options = (
-            self.propiedades_select_options + 
-            self.propiedades_mandato_libre_select_options +
-            self.propiedades_arriendo_select_options
-        )
-        for opt in all_options:
-            if str(opt[1]) == str(id_p):
-                return opt[0]
-        return ""
+        return self.selected_labels.get("id_propiedad", "")
 
     @rx.var
     def propietario_selected_label(self) -> str:
-        """Obtiene el label del propietario seleccionado."""
-        id_p = self.form_data.get("id_propietario")
-        if not id_p: return ""
-        for opt in self.propietarios_select_options:
-            if str(opt[1]) == str(id_p):
-                return opt[0]
-        return ""
+        return self.selected_labels.get("id_propietario", "")
 
     @rx.var
     def asesor_selected_label(self) -> str:
-        """Obtiene el label del asesor seleccionado."""
-        id_a = self.form_data.get("id_asesor")
-        if not id_a: return ""
-        for opt in self.asesores_select_options:
-            if str(opt[1]) == str(id_a):
-                return opt[0]
-        return ""
+        return self.selected_labels.get("id_asesor", "")
 
     @rx.var
     def arrendatario_selected_label(self) -> str:
-        """Obtiene el label del arrendatario seleccionado."""
-        id_arr = self.form_data.get("id_arrendatario")
-        if not id_arr: return ""
-        for opt in self.arrendatarios_select_options:
-            if str(opt[1]) == str(id_arr):
-                return opt[0]
-        return ""
+        return self.selected_labels.get("id_arrendatario", "")
 
     @rx.var
     def codeudor_selected_label(self) -> str:
-        """Obtiene el label del codeudor seleccionado."""
-        id_cod = self.form_data.get("id_codeudor")
-        if not id_cod: return ""
-        for opt in self.codeudores_select_options:
-            if str(opt[1]) == str(id_cod):
-                return opt[0]
-        return ""
+        return self.selected_labels.get("id_codeudor", "")
 
     def select_propiedad(self, id_propiedad: str, label: str):
         """Selecciona una propiedad y cierra el menú."""
@@ -553,30 +269,35 @@ class ContratosState(DocumentosStateMixin):
             self.on_change_propiedad_arriendo(id_propiedad)
         else:
             self.on_change_propiedad(id_propiedad)
+        self.selected_labels = {**self.selected_labels, "id_propiedad": label}
         self.propiedad_search = ""
         self.propiedad_menu_open = False
 
     def select_propietario(self, id_propietario: str, label: str):
         """Selecciona un propietario y cierra el menú."""
         self.set_form_field("id_propietario", id_propietario)
+        self.selected_labels = {**self.selected_labels, "id_propietario": label}
         self.propietario_search = ""
         self.propietario_menu_open = False
 
     def select_asesor(self, id_asesor: str, label: str):
         """Selecciona un asesor y cierra el menú."""
         self.set_form_field("id_asesor", id_asesor)
+        self.selected_labels = {**self.selected_labels, "id_asesor": label}
         self.asesor_search = ""
         self.asesor_menu_open = False
 
     def select_arrendatario(self, id_arrendatario: str, label: str):
         """Selecciona un arrendatario y cierra el menú."""
         self.set_form_field("id_arrendatario", id_arrendatario)
+        self.selected_labels = {**self.selected_labels, "id_arrendatario": label}
         self.arrendatario_search = ""
         self.arrendatario_menu_open = False
 
     def select_codeudor(self, id_codeudor: str, label: str):
         """Selecciona un codeudor y cierra el menú."""
         self.set_form_field("id_codeudor", id_codeudor)
+        self.selected_labels = {**self.selected_labels, "id_codeudor": label}
         self.codeudor_search = ""
         self.codeudor_menu_open = False
 
@@ -584,41 +305,53 @@ class ContratosState(DocumentosStateMixin):
         self.propiedad_menu_open = not self.propiedad_menu_open
         if self.propiedad_menu_open:
             self.propiedad_search = ""
+            return ContratosState.set_propiedad_search("")
 
     def toggle_propietario_menu(self):
         self.propietario_menu_open = not self.propietario_menu_open
         if self.propietario_menu_open:
             self.propietario_search = ""
+            return ContratosState.set_propietario_search("")
 
     def toggle_asesor_menu(self):
         self.asesor_menu_open = not self.asesor_menu_open
         if self.asesor_menu_open:
             self.asesor_search = ""
+            return ContratosState.set_asesor_search("")
 
     def toggle_arrendatario_menu(self):
         self.arrendatario_menu_open = not self.arrendatario_menu_open
         if self.arrendatario_menu_open:
             self.arrendatario_search = ""
+            return ContratosState.set_arrendatario_search("")
 
     def toggle_codeudor_menu(self):
         self.codeudor_menu_open = not self.codeudor_menu_open
         if self.codeudor_menu_open:
             self.codeudor_search = ""
+            return ContratosState.set_codeudor_search("")
 
-    def set_propiedad_search(self, val: str):
-        self.propiedad_search = val
+    @rx.event(background=True)
+    async def set_propiedad_search(self, val: str):
+        await self._typeahead(
+            "propiedad", self._catalogo_propiedades(), "filtered_propiedades_options", val
+        )
 
-    def set_propietario_search(self, val: str):
-        self.propietario_search = val
+    @rx.event(background=True)
+    async def set_propietario_search(self, val: str):
+        await self._typeahead("propietario", "propietarios", "filtered_propietarios_options", val)
 
-    def set_asesor_search(self, val: str):
-        self.asesor_search = val
+    @rx.event(background=True)
+    async def set_asesor_search(self, val: str):
+        await self._typeahead("asesor", "asesores", "filtered_asesores_options", val)
 
-    def set_arrendatario_search(self, val: str):
-        self.arrendatario_search = val
+    @rx.event(background=True)
+    async def set_arrendatario_search(self, val: str):
+        await self._typeahead("arrendatario", "arrendatarios", "filtered_arrendatarios_options", val)
 
-    def set_codeudor_search(self, val: str):
-        self.codeudor_search = val
+    @rx.event(background=True)
+    async def set_codeudor_search(self, val: str):
+        await self._typeahead("codeudor", "codeudores", "filtered_codeudores_options", val)
 
     @rx.event(background=True)
     async def load_contratos(self):
@@ -674,62 +407,28 @@ class ContratosState(DocumentosStateMixin):
                 else None
             )
 
-            # Determinar qué tipo de contratos cargar
-            if self.filter_tipo == "Mandato":
-                # Solo mandatos
-                resultado = servicio.listar_mandatos_paginado(
-                    page=self.current_page,
-                    page_size=self.page_size,
-                    estado=self.filter_estado if self.filter_estado != "Todos" else None,
-                    busqueda=self.search_text if self.search_text else None,
-                    id_asesor=asesor_filter,
-                )
-                # Agregar campo 'tipo' para distinguir en la UI
-                items = [{"tipo": "Mandato", **item} for item in resultado.items]
-
-            elif self.filter_tipo == "Arrendamiento":
-                # Solo arrendamientos
-                resultado = servicio.listar_arrendamientos_paginado(
-                    page=self.current_page,
-                    page_size=self.page_size,
-                    estado=self.filter_estado if self.filter_estado != "Todos" else None,
-                    busqueda=self.search_text if self.search_text else None,
-                    id_asesor=asesor_filter,
-                )
-                items = [{"tipo": "Arrendamiento", **item} for item in resultado.items]
-
-            else:
-                # Todos: combinar mandatos y arrendamientos
-                resultado_mandatos = servicio.listar_mandatos_paginado(
-                    page=self.current_page,
-                    page_size=self.page_size,
-                    estado=self.filter_estado if self.filter_estado != "Todos" else None,
-                    busqueda=self.search_text if self.search_text else None,
-                    id_asesor=asesor_filter,
-                )
-
-                resultado_arrendamientos = servicio.listar_arrendamientos_paginado(
-                    page=self.current_page,
-                    page_size=self.page_size,
-                    estado=self.filter_estado if self.filter_estado != "Todos" else None,
-                    busqueda=self.search_text if self.search_text else None,
-                    id_asesor=asesor_filter,
-                )
+            # Keyset: reutilizar el cursor con el que se llegó a esta página
+            page_cursor = ""
+            if 1 < self.current_page <= len(self.page_cursors):
+                page_cursor = self.page_cursors[self.current_page - 1]
 
-                mandatos = [{"tipo": "Mandato", **item} for item in resultado_mandatos.items]
-                arrendamientos = [
-                    {"tipo": "Arrendamiento", **item} for item in resultado_arrendamientos.items
-                ]
-
-                items = mandatos + arrendamientos
-                # Total combinado
-                resultado = resultado_mandatos  # Para paginación usamos uno como base
-                resultado.items = items
-                resultado.total = resultado_mandatos.total + resultado_arrendamientos.total
+            # Un solo listado (UNION ALL) para cualquier tipo: orden global y un conteo
+            resultado = servicio.listar_contratos_paginado(
+                page=self.current_page,
+                page_size=self.page_size,
+                tipo=self.filter_tipo,
+                estado=self.filter_estado if self.filter_estado != "Todos" else None,
+                busqueda=self.search_text if self.search_text else None,
+                id_asesor=asesor_filter,
+                cursor=page_cursor or None,
+            )
 
             async with self:
-                self.contratos = items
+                self.contratos = resultado.items
                 self.total_items = resultado.total
+                self.next_cursor = resultado.next_cursor or ""
+                if self.current_page == 1:
+                    self.page_cursors = [""]
                 self.is_loading = False
 
         except Exception as e:
@@ -743,6 +442,9 @@ class ContratosState(DocumentosStateMixin):
     def next_page(self):
         """Avanza a la siguiente página."""
         if self.current_page * self.page_size < self.total_items:
+            if self.next_cursor and len(self.page_cursors) >= self.current_page:
+                # Guardar el cursor de la página siguiente (evita OFFSET profundo)
+                self.page_cursors = self.page_cursors[: self.current_page] + [self.next_cursor]
             self.current_page += 1
             return ContratosState.load_contratos
 
@@ -811,6 +513,7 @@ class ContratosState(DocumentosStateMixin):
         """Abre modal para crear nuevo mandato."""
         self.modal_mode = "crear_mandato"
         self.editing_id = None
+        self.selected_labels = {}
         self.form_data = {
             "id_propiedad": "",
             "id_propietario": "",
@@ -831,6 +534,7 @@ class ContratosState(DocumentosStateMixin):
         """Abre modal para crear nuevo arrendamiento."""
         self.modal_mode = "crear_arrendamiento"
         self.editing_id = None
+        self.selected_labels = {}
         self.form_data = {
             "id_propiedad": "",
             "id_arrendatario": "",
@@ -896,7 +600,16 @@ class ContratosState(DocumentosStateMixin):
             if tipo == "Mandato":
                 contrato = servicio.obtener_mandato_por_id(id_contrato)
                 if contrato:
+                    etiquetas = await asyncio.to_thread(
+                        self._etiquetas_formulario,
+                        {
+                            "id_propiedad": contrato.id_propiedad,
+                            "id_propietario": contrato.id_propietario,
+                            "id_asesor": contrato.id_asesor,
+                        },
+                    )
                     async with self:
+                        self.selected_labels = etiquetas
                         self.modal_mode = "editar_mandato"
                         self.editing_id = id_contrato
                         self.form_data = {
@@ -922,7 +635,16 @@ class ContratosState(DocumentosStateMixin):
             else:
                 contrato = servicio.obtener_arrendamiento_por_id(id_contrato)
                 if contrato:
+                    etiquetas = await asyncio.to_thread(
+                        self._etiquetas_formulario,
+                        {
+                            "id_propiedad": contrato.id_propiedad,
+                            "id_arrendatario": contrato.id_arrendatario,
+                            "id_codeudor": contrato.id_codeudor,
+                        },
+                    )
                     async with self:
+                        self.selected_labels = etiquetas
                         self.modal_mode = "editar_arrendamiento"
                         self.editing_id = id_contrato
                         self.form_data = {
@@ -958,6 +680,7 @@ class ContratosState(DocumentosStateMixin):
         self.modal_open = False
         self.editing_id = None
         self.form_data = {}
+        self.selected_labels = {}
         self.error_message = ""
 
     @rx.event(background=True)
@@ -1268,6 +991,7 @@ class ContratosState(DocumentosStateMixin):
             repo_codeudor = RepositorioCodeudorSQLite(db_manager)
 
             servicio = ServicioContratos(
+                db_manager,
                 repo_mandato=repo_mandato,
                 repo_arriendo=repo_arriendo,
                 repo_propiedad=repo_propiedad,
@@ -1278,11 +1002,13 @@ class ContratosState(DocumentosStateMixin):
             )
 
             # Obtener datos CSV usando los filtros actuales
-            csv_data = servicio.exportar_contratos_csv(
-                filtro_tipo=self.filter_tipo,
-                estado=self.filter_estado if self.filter_estado != "Todos" else None,
-                busqueda=self.search_text if self.search_text else None,
-            )
+            # Exportación: acepta el retraso de reportes (puede leer de la réplica)
+            with db_manager.lectura(db_manager.tolerancia_reportes_segundos):
+                csv_data = servicio.exportar_contratos_csv(
+                    filtro_tipo=self.filter_tipo,
+                    estado=self.filter_estado if self.filter_estado != "Todos" else None,
+                    busqueda=self.search_text if self.search_text else None,
+                )
 
             # Preparar descarga
             import time
@@ -1415,31 +1141,35 @@ class ContratosState(DocumentosStateMixin):
             fecha = form_data.get("fecha_aplicacion", "")
             observaciones = form_data.get("observaciones", "")
 
-            from src.aplicacion.servicios.servicio_contratos import ServicioContratos
+            from src.aplicacion.servicios.servicio_ipc import ServicioIPC
             from src.infraestructura.persistencia.database import db_manager
 
-            servicio = ServicioContratos(db_manager)
-            resultado = servicio.aplicar_incremento_ipc(
-                id_contrato=self.ipc_target_contrato_id,
-                porcentaje_ipc=porcentaje,
-                fecha_aplicacion=fecha,
-                observaciones=observaciones,
-                usuario="admin",
-            )
-
-            if resultado["success"]:
+            try:
+                resultado = ServicioIPC(db_manager).aplicar_incremento_contrato(
+                    id_contrato=self.ipc_target_contrato_id,
+                    porcentaje_ipc=porcentaje,
+                    fecha_aplicacion=fecha,
+                    observaciones=observaciones,
+                    usuario="admin",
+                )
+            except ValueError as e:
                 async with self:
-                    self.show_ipc_modal = False
-                    self.ipc_target_contrato_id = 0
-                    self.form_data = {}
+                    self.error_message = str(e)
+                yield rx.toast.error(str(e), position="bottom-right")
+                return
 
-                # Recargar contratos
-                yield ContratosState.load_contratos()
-                yield rx.toast.success(resultado["message"], position="bottom-right")
-            else:
-                async with self:
-                    self.error_message = resultado["message"]
-                yield rx.toast.error(resultado["message"], position="bottom-right")
+            async with self:
+                self.show_ipc_modal = False
+                self.ipc_target_contrato_id = 0
+                self.form_data = {}
+
+            # Recargar contratos
+            yield ContratosState.load_contratos()
+            yield rx.toast.success(
+                f"IPC aplicado correctamente. Canon: ${resultado['canon_anterior']:,} "
+                f"→ ${resultado['canon_nuevo']:,}",
+                position="bottom-right",
+            )
 
         except Exception as e:
             async with self:
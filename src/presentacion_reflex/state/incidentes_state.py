@@ -23,6 +23,8 @@ class IncidentesState(DocumentosStateMixin):
         "En Reparacion": [],
         "Finalizado": [],
     }
+    # Total por columna en BD (la vista solo trae la página actual)
+    kanban_totales: Dict[str, int] = {}
 
     # UI State
     is_loading: bool = False
@@ -130,6 +132,26 @@ class IncidentesState(DocumentosStateMixin):
     def incidentes_finalizado(self) -> List[Dict[str, Any]]:
         return self.incidentes_kanban.get("Finalizado", [])
 
+    @rx.var
+    def total_reportado(self) -> int:
+        return self.kanban_totales.get("Reportado", 0)
+
+    @rx.var
+    def total_cotizado(self) -> int:
+        return self.kanban_totales.get("Cotizado", 0)
+
+    @rx.var
+    def total_aprobado(self) -> int:
+        return self.kanban_totales.get("Aprobado", 0)
+
+    @rx.var
+    def total_en_reparacion(self) -> int:
+        return self.kanban_totales.get("En Reparacion", 0)
+
+    @rx.var
+    def total_finalizado(self) -> int:
+        return self.kanban_totales.get("Finalizado", 0)
+
     @rx.event(background=True)
     async def on_load(self):
         """Carga inicial."""
@@ -182,27 +204,26 @@ class IncidentesState(DocumentosStateMixin):
             prioridad = self.filter_prioridad if self.filter_prioridad != "Todas" else None
             estado = self.filter_estado if self.filter_estado != "Todos" else None
 
-            # TODO: El servicio tiene `listar_con_filtros` pero no soporta todos en `listar_incidentes`.
-            # Usaremos `listar_con_filtros` que es más completo.
             resultado = servicio.listar_con_filtros(
                 busqueda=self.search_text if self.search_text else None,
                 prioridad=prioridad,
+                estado=estado,
                 page=self.page,
                 page_size=self.items_per_page,
-                # estado=estado # listar_con_filtros no tiene filtro directo de estado, filtramos en memoria por ahora o actualizamos servicio
             )
 
             resultado_objs = resultado["items"]
             total_items = resultado["total"]
 
-            # Filtrado manual de estado si el servicio no lo soporta directamente en `listar_con_filtros`
-            if estado:
-                # NOTA: Al filtrar en memoria DESPUÉS de paginar, la página podría quedar vacía.
-                # Lo ideal es mover el filtro de estado al servicio.
-                # Por ahora, para mantener la consistencia con el plan, aceptamos esta limitación
-                # o el servicio debería tener el filtro de estado.
-                # REVISIÓN: listar_con_filtros NO tiene 'estado'. Se añadio en memoria.
-                resultado_objs = [i for i in resultado_objs if i.estado == estado]
+            # Totales por columna (todas las páginas) para los encabezados del Kanban
+            conteo_estados = servicio.contar_por_estado(
+                busqueda=self.search_text if self.search_text else None,
+                prioridad=prioridad,
+            )
+            kanban_totales = {
+                col_name: sum(conteo_estados.get(e, 0) for e in status_list)
+                for col_name, status_list in self.kanban_columns.items()
+            }
 
             # Cargar propiedades para mapeo de direcciones
             from src.aplicacion.servicios.servicio_propiedades import ServicioPropiedades
@@ -252,6 +273,7 @@ class IncidentesState(DocumentosStateMixin):
             async with self:
                 self.incidentes = items
                 self.incidentes_kanban = kanban_grouped
+                self.kanban_totales = kanban_totales
                 import math
 
                 self.total_pages = math.ceil(total_items / self.items_per_page)
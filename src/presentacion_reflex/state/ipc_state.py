@@ -1,4 +1,5 @@
-from typing import List
+from datetime import date
+from typing import Any, Dict, List
 
 import reflex as rx
 
@@ -24,6 +25,16 @@ class IPCState(rx.State):
     form_anio: int = 2025
     form_valor: float = 0.0
 
+    # Corrida masiva de incremento
+    masivo_fecha: str = date.today().isoformat()
+    masivo_porcentaje: str = ""
+    masivo_observaciones: str = ""
+    masivo_contratos: List[Dict[str, Any]] = []
+    masivo_excluidos: List[int] = []
+    masivo_totales: Dict[str, int] = {}
+    masivo_resultado: str = ""
+    masivo_cargando: bool = False
+
     def set_anio(self, value: str):
         """Setter personalizado para manejar conversión str -> int del input."""
         if value == "" or value is None:
@@ -111,3 +122,95 @@ class IPCState(rx.State):
             async with self:
                 self.error_message = str(e)
                 self.is_loading = False
+
+    # =========================================================================
+    # CORRIDA MASIVA
+    # =========================================================================
+
+    def set_masivo_fecha(self, value: str):
+        self.masivo_fecha = value
+        self.masivo_contratos = []
+
+    def set_masivo_porcentaje(self, value: str):
+        self.masivo_porcentaje = value
+        self.masivo_contratos = []
+
+    def set_masivo_observaciones(self, value: str):
+        self.masivo_observaciones = value
+
+    def toggle_contrato_masivo(self, id_contrato: int):
+        """Incluye o excluye un contrato del diff antes de aplicar."""
+        if id_contrato in self.masivo_excluidos:
+            self.masivo_excluidos = [i for i in self.masivo_excluidos if i != id_contrato]
+        else:
+            self.masivo_excluidos = self.masivo_excluidos + [id_contrato]
+
+    @rx.var
+    def masivo_seleccionados(self) -> int:
+        return len(self.masivo_contratos) - len(self.masivo_excluidos)
+
+    @rx.event(background=True)
+    async def previsualizar_masivo(self):
+        """Calcula el diff de cánones de todos los contratos elegibles."""
+        async with self:
+            self.masivo_cargando = True
+            self.error_message = ""
+            self.masivo_resultado = ""
+            fecha, porcentaje = self.masivo_fecha, self.masivo_porcentaje
+
+        try:
+            preview = ServicioIPC(db_manager).previsualizar_incremento_masivo(
+                fecha, float(porcentaje) if porcentaje else None
+            )
+            async with self:
+                self.masivo_contratos = preview["contratos"]
+                self.masivo_excluidos = []
+                self.masivo_porcentaje = str(preview["porcentaje_ipc"])
+                self.masivo_totales = {
+                    "anterior": preview["total_anterior"],
+                    "nuevo": preview["total_nuevo"],
+                    "diferencia": preview["diferencia_total"],
+                }
+                self.masivo_cargando = False
+        except Exception as e:
+            async with self:
+                self.error_message = str(e)
+                self.masivo_contratos = []
+                self.masivo_cargando = False
+
+    @rx.event(background=True)
+    async def aplicar_masivo(self):
+        """Aplica el diff seleccionado en una sola transacción."""
+        async with self:
+            self.masivo_cargando = True
+            self.error_message = ""
+            current_user = await self.get_state(AuthState)
+            usuario = current_user.user["nombre_usuario"] if current_user.user else "sistema"
+            contratos = [
+                (c["id_contrato"], c["canon_anterior"], c["canon_nuevo"])
+                for c in self.masivo_contratos
+                if c["id_contrato"] not in self.masivo_excluidos
+            ]
+            fecha, porcentaje = self.masivo_fecha, float(self.masivo_porcentaje or 0)
+            observaciones = self.masivo_observaciones
+
+        try:
+            resultado = ServicioIPC(db_manager).aplicar_incremento_masivo(
+                fecha, porcentaje, contratos, observaciones or f"IPC {porcentaje}% masivo", usuario
+            )
+            mensaje = (
+                f"{resultado['aplicados']} contratos incrementados en "
+                f"{resultado['segundos']} s ({resultado['contratos_por_segundo']} contratos/s)"
+            )
+            async with self:
+                self.masivo_contratos = []
+                self.masivo_excluidos = []
+                self.masivo_totales = {}
+                self.masivo_resultado = mensaje
+                self.masivo_cargando = False
+            yield rx.toast.success(mensaje, position="bottom-right")
+        except Exception as e:
+            async with self:
+                self.error_message = str(e)
+                self.masivo_cargando = False
+            yield rx.toast.error(str(e), position="bottom-right")
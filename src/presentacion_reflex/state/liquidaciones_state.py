@@ -1,12 +1,16 @@
+import asyncio
 from typing import Any, Dict, List, Optional
 
 import reflex as rx
 
-from src.aplicacion.servicios.servicio_financiero import ServicioFinanciero
+from src.aplicacion.contenedor import obtener_contenedor
 from src.infraestructura.persistencia.database import db_manager
 from src.presentacion_reflex.state.documentos_mixin import DocumentosStateMixin
 from src.presentacion_reflex.utils.formatters import format_currency, format_number
 
+# Resultados por búsqueda en los pickers de propiedad/propietario
+LIMITE_TYPEAHEAD = 15
+
 
 class LiquidacionesState(DocumentosStateMixin):
     """Estado para gestión de liquidaciones de propietarios.
@@ -17,6 +21,9 @@ class LiquidacionesState(DocumentosStateMixin):
     current_page: int = 1
     page_size: int = 25
     total_items: int = 0
+    # Keyset (vista individual): cursor con el que se cargó cada página visitada
+    page_cursors: List[str] = [""]
+    next_cursor: str = ""
 
     # Datos
     liquidaciones: List[Dict[str, Any]] = []
@@ -34,13 +41,19 @@ class LiquidacionesState(DocumentosStateMixin):
     # Opciones de filtros (para dropdowns)
     estado_options: List[str] = ["Todos", "En Proceso", "Aprobada", "Pagada", "Cancelada"]
     periodos_options: List[str] = []  # Se llenarán dinámicamente
-    propiedades_options: List[Dict[str, Any]] = []
-    propietarios_options: List[Dict[str, Any]] = []
 
     # Select options (listas simples para rx.select - evitar VarTypeError)
     periodos_select_options: List[str] = []
-    propiedades_select_options: List[str] = []
-    propietarios_select_options: List[str] = []  # Strings "Nombre - Documento"
+
+    # Pickers con typeahead (propiedad del formulario, propietario de la masiva)
+    propiedad_search: str = ""
+    propietario_search: str = ""
+    propiedad_menu_open: bool = False
+    propietario_menu_open: bool = False
+    filtered_propiedades_options: List[List[str]] = []  # [texto, id, detalle]
+    filtered_propietarios_options: List[List[str]] = []
+    propiedad_selected_label: str = ""
+    propietario_selected_label: str = ""
 
     # Vista agrupada/consolidada
     vista_agrupada: bool = False  # False = Individual, True = Por propietario
@@ -101,65 +114,60 @@ class LiquidacionesState(DocumentosStateMixin):
             periodo = (today - relativedelta(months=i)).strftime("%Y-%m")
             periodos.append(periodo)
 
-        # Cargar propiedades (solo con contratos de mandato activos)
-        query_propiedades = """
-        SELECT DISTINCT p.ID_PROPIEDAD, p.MATRICULA_INMOBILIARIA, p.DIRECCION_PROPIEDAD
-        FROM PROPIEDADES p
-        INNER JOIN CONTRATOS_MANDATOS cm ON p.ID_PROPIEDAD = cm.ID_PROPIEDAD
-        WHERE cm.ESTADO_CONTRATO_M = 'Activo'
-        ORDER BY p.DIRECCION_PROPIEDAD
-        """
-
-        # Cargar propietarios (con contratos activos)
-        query_propietarios = """
-        SELECT DISTINCT prop.ID_PROPIETARIO, per.ID_PERSONA, per.NOMBRE_COMPLETO, per.NUMERO_DOCUMENTO
-        FROM PERSONAS per
-        INNER JOIN PROPIETARIOS prop ON per.ID_PERSONA = prop.ID_PERSONA
-        INNER JOIN CONTRATOS_MANDATOS cm ON prop.ID_PROPIETARIO = cm.ID_PROPIETARIO
-        WHERE cm.ESTADO_CONTRATO_M = 'Activo'
-        ORDER BY per.NOMBRE_COMPLETO
-        """
-
-        with db_manager.obtener_conexion() as conn:
-            cursor = db_manager.get_dict_cursor(conn)
-
-            # Propiedades
-            cursor.execute(query_propiedades)
-            rows_propiedades = cursor.fetchall()
-            propiedades = [
-                {
-                    "id": str(row["ID_PROPIEDAD"]),
-                    "texto": f"{row['DIRECCION_PROPIEDAD']}",
-                }
-                for row in rows_propiedades
-            ]
-            propiedades_select = [
-                f"{row['DIRECCION_PROPIEDAD']}"
-                for row in rows_propiedades
-            ]
-
-            # Propietarios
-            cursor.execute(query_propietarios)
-            rows_propietarios = cursor.fetchall()
-            propietarios = [
-                {
-                    "id": str(row["ID_PROPIETARIO"]),
-                    "texto": f"{row['NOMBRE_COMPLETO']}",
-                }
-                for row in rows_propietarios
-            ]
-            # Para rx.select: solo strings formateados (se parseará en backend)
-            propietarios_select = [
-                f"{row['NOMBRE_COMPLETO']}" for row in rows_propietarios
-            ]
-
         async with self:
             self.periodos_options = ["Todos"] + periodos
             self.periodos_select_options = ["Todos"] + periodos
-            self.propiedades_options = propiedades
-            self.propiedades_select_options = propiedades_select
-            self.propietarios_options = propietarios
-            self.propietarios_select_options = propietarios_select
+
+    # --- Pickers (typeahead) ---
+
+    async def _typeahead(self, campo: str, catalogo: str, resultados: str, termino: str):
+        """Consulta el índice fuera del event loop y descarta respuestas obsoletas."""
+        async with self:
+            setattr(self, f"{campo}_search", termino)
+        servicio = obtener_contenedor().servicio_autocompletado
+        opciones = await asyncio.to_thread(servicio.buscar, catalogo, termino, LIMITE_TYPEAHEAD)
+        async with self:
+            if getattr(self, f"{campo}_search") == termino:
+                setattr(
+                    self, resultados, [[o["texto"], o["id"], o["detalle"]] for o in opciones]
+                )
+
+    @rx.event(background=True)
+    async def set_propiedad_search(self, val: str):
+        await self._typeahead(
+            "propiedad", "propiedades_con_mandato", "filtered_propiedades_options", val
+        )
+
+    @rx.event(background=True)
+    async def set_propietario_search(self, val: str):
+        await self._typeahead(
+            "propietario", "propietarios_con_mandato", "filtered_propietarios_options", val
+        )
+
+    def toggle_propiedad_menu(self):
+        self.propiedad_menu_open = not self.propiedad_menu_open
+        if self.propiedad_menu_open:
+            self.propiedad_search = ""
+            return LiquidacionesState.set_propiedad_search("")
+
+    def toggle_propietario_menu(self):
+        self.propietario_menu_open = not self.propietario_menu_open
+        if self.propietario_menu_open:
+            self.propietario_search = ""
+            return LiquidacionesState.set_propietario_search("")
+
+    def select_propiedad(self, id_propiedad: str, label: str):
+        """Selecciona la propiedad del formulario y carga su mandato activo."""
+        self.propiedad_selected_label = label
+        self.propiedad_menu_open = False
+        return LiquidacionesState.handle_propiedad_change(id_propiedad)
+
+    def select_propietario(self, id_propietario: str, label: str):
+        """Selecciona el propietario de la liquidación masiva."""
+        self.form_data["id_propietario"] = id_propietario
+        self.form_data = self.form_data.copy()
+        self.propietario_selected_label = label
+        self.propietario_menu_open = False
 
     async def load_liquidaciones(self):
         """Carga liquidaciones con filtros y paginación (modo individual o agrupado)."""
@@ -168,38 +176,7 @@ class LiquidacionesState(DocumentosStateMixin):
             self.error_message = ""
 
         try:
-            from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
-                RepositorioRecaudoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                RepositorioLiquidacionSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
-                RepositorioPropiedadSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-                RepositorioContratoArrendamientoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-                RepositorioContratoMandatoSQLite,
-            )
-            from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
-
-            repo_recaudo = RepositorioRecaudoSQLite(db_manager)
-            repo_liquidacion = RepositorioLiquidacionSQLite(db_manager)
-            repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-            repo_contrato_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-            repo_contrato_mandato = RepositorioContratoMandatoSQLite(db_manager)
-            pdf_service = ServicioDocumentosPDF()
-
-            servicio = ServicioFinanciero(
-                repo_recaudo=repo_recaudo,
-                repo_liquidacion=repo_liquidacion,
-                repo_propiedad=repo_propiedad,
-                repo_arriendo=repo_contrato_arriendo,
-                repo_mandato=repo_contrato_mandato,
-                pdf_service=pdf_service,
-            )
+            servicio = obtener_contenedor().servicio_financiero
 
             # Preparar filtros
             periodo = (
@@ -221,13 +198,18 @@ class LiquidacionesState(DocumentosStateMixin):
                     busqueda=busqueda,
                 )
             else:
-                # Vista individual por propiedad
+                # Vista individual por propiedad: keyset + conteo cacheado
+                page_cursor = ""
+                if 1 < self.current_page <= len(self.page_cursors):
+                    page_cursor = self.page_cursors[self.current_page - 1]
                 resultado = servicio.listar_liquidaciones_paginado(
                     page=self.current_page,
                     page_size=self.page_size,
                     periodo=periodo,
                     estado=estado,
                     busqueda=busqueda,
+                    cursor=page_cursor or None,
+                    count_strategy="cached",
                 )
 
             async with self:
@@ -242,6 +224,9 @@ class LiquidacionesState(DocumentosStateMixin):
                 
                 self.liquidaciones = formatted_items
                 self.total_items = resultado.total
+                self.next_cursor = resultado.next_cursor or ""
+                if self.current_page == 1:
+                    self.page_cursors = [""]
                 self.is_loading = False
 
         except Exception as e:
@@ -255,6 +240,13 @@ class LiquidacionesState(DocumentosStateMixin):
     def next_page(self):
         """Avanza a la siguiente página."""
         if self.current_page * self.page_size < self.total_items:
+            if (
+                not self.vista_agrupada
+                and self.next_cursor
+                and len(self.page_cursors) >= self.current_page
+            ):
+                # Guardar el cursor de la página siguiente (evita OFFSET profundo)
+                self.page_cursors = self.page_cursors[: self.current_page] + [self.next_cursor]
             self.current_page += 1
             return LiquidacionesState.load_liquidaciones
 
@@ -274,12 +266,9 @@ class LiquidacionesState(DocumentosStateMixin):
         """Abre modal para generar liquidación masiva por propietario."""
         from datetime import datetime
 
-        # Asegurar que las opciones estén cargadas
-        if not self.propietarios_select_options:
-            return self.load_filter_options()
-
         # Prellenar con periodo actual
         self.form_data = {"id_propietario": "", "periodo": datetime.now().strftime("%Y-%m")}
+        self.propietario_selected_label = ""
         self.show_bulk_create_modal = True
         self.show_create_modal = False
         self.show_edit_modal = False
@@ -346,6 +335,7 @@ class LiquidacionesState(DocumentosStateMixin):
             "otros_egresos": 0,
             "observaciones": "",
         }
+        self.propiedad_selected_label = ""
         self.error_message = ""
 
     def set_form_field(self, field: str, value: str):
@@ -353,32 +343,19 @@ class LiquidacionesState(DocumentosStateMixin):
         self.form_data[field] = value
 
     @rx.event(background=True)
-    async def handle_propiedad_change(self, valor_seleccionado: str):
+    async def handle_propiedad_change(self, id_propiedad: str):
         """
         Maneja el cambio de propiedad en el formulario de creación.
         Busca el contrato de mandato activo y el valor de administración.
 
         Args:
-            valor_seleccionado: El TEXTO de la opción seleccionada (debido a cómo funciona rx.select con listas simples)
+            id_propiedad: ID de la propiedad elegida en el picker
         """
-        if not valor_seleccionado:
-            return
-
-        # Buscar el ID real de la propiedad basado en el texto seleccionado
-        id_propiedad = None
-        for prop in self.propiedades_options:
-            if prop["texto"] == valor_seleccionado:
-                id_propiedad = prop["id"]
-                break
-
         if not id_propiedad:
-            # Si no se encuentra (no debería pasar), abortar o loguear
             return
 
         async with self:
-            self.form_data["id_propiedad"] = (
-                valor_seleccionado  # Guardamos el texto para que el select lo muestre
-            )
+            self.form_data["id_propiedad"] = id_propiedad
             # Reset values
             self.form_data["id_contrato_m"] = ""
             self.form_data["gastos_administracion"] = 0
@@ -449,38 +426,7 @@ class LiquidacionesState(DocumentosStateMixin):
             self.error_message = ""
 
         try:
-            from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
-                RepositorioRecaudoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                RepositorioLiquidacionSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
-                RepositorioPropiedadSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-                RepositorioContratoArrendamientoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-                RepositorioContratoMandatoSQLite,
-            )
-            from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
-
-            repo_recaudo = RepositorioRecaudoSQLite(db_manager)
-            repo_liquidacion = RepositorioLiquidacionSQLite(db_manager)
-            repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-            repo_contrato_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-            repo_contrato_mandato = RepositorioContratoMandatoSQLite(db_manager)
-            pdf_service = ServicioDocumentosPDF()
-
-            servicio = ServicioFinanciero(
-                repo_recaudo=repo_recaudo,
-                repo_liquidacion=repo_liquidacion,
-                repo_propiedad=repo_propiedad,
-                repo_arriendo=repo_contrato_arriendo,
-                repo_mandato=repo_contrato_mandato,
-                pdf_service=pdf_service,
-            )
+            servicio = obtener_contenedor().servicio_financiero
             liquidacion = servicio.obtener_detalle_liquidacion_ui(id_liquidacion)
 
             if liquidacion:
@@ -539,38 +485,7 @@ class LiquidacionesState(DocumentosStateMixin):
             self.cargar_documentos()
 
         try:
-            from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
-                RepositorioRecaudoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                RepositorioLiquidacionSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
-                RepositorioPropiedadSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-                RepositorioContratoArrendamientoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-                RepositorioContratoMandatoSQLite,
-            )
-            from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
-
-            repo_recaudo = RepositorioRecaudoSQLite(db_manager)
-            repo_liquidacion = RepositorioLiquidacionSQLite(db_manager)
-            repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-            repo_contrato_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-            repo_contrato_mandato = RepositorioContratoMandatoSQLite(db_manager)
-            pdf_service = ServicioDocumentosPDF()
-
-            servicio = ServicioFinanciero(
-                repo_recaudo=repo_recaudo,
-                repo_liquidacion=repo_liquidacion,
-                repo_propiedad=repo_propiedad,
-                repo_arriendo=repo_contrato_arriendo,
-                repo_mandato=repo_contrato_mandato,
-                pdf_service=pdf_service,
-            )
+            servicio = obtener_contenedor().servicio_financiero
             liquidacion = servicio.obtener_detalle_liquidacion_ui(id_liquidacion)
 
             if liquidacion:
@@ -619,48 +534,14 @@ class LiquidacionesState(DocumentosStateMixin):
 
         try:
             # Usar repositorio directamente
-            from src.infraestructura.persistencia.database import db_manager as dm
-            from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                RepositorioLiquidacionSQLite,
+            repo = obtener_contenedor().repo_liquidacion
+            liquidaciones = repo.listar_por_propietario_y_periodo(
+                id_propietario, periodo, solo_lectura=True
             )
 
-            repo = RepositorioLiquidacionSQLite(dm)
-            liquidaciones = repo.listar_por_propietario_y_periodo(id_propietario, periodo)
-
             if liquidaciones and len(liquidaciones) > 0:
                 # Obtener detalles de TODAS las liquidaciones y consolidar
-                from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
-                    RepositorioRecaudoSQLite,
-                )
-                from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                    RepositorioLiquidacionSQLite,
-                )
-                from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
-                    RepositorioPropiedadSQLite,
-                )
-                from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-                    RepositorioContratoArrendamientoSQLite,
-                )
-                from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-                    RepositorioContratoMandatoSQLite,
-                )
-                from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
-
-                repo_recaudo = RepositorioRecaudoSQLite(db_manager)
-                repo_liquidacion = RepositorioLiquidacionSQLite(db_manager)
-                repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-                repo_contrato_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-                repo_contrato_mandato = RepositorioContratoMandatoSQLite(db_manager)
-                pdf_service = ServicioDocumentosPDF()
-
-                servicio = ServicioFinanciero(
-                    repo_recaudo=repo_recaudo,
-                    repo_liquidacion=repo_liquidacion,
-                    repo_propiedad=repo_propiedad,
-                    repo_arriendo=repo_contrato_arriendo,
-                    repo_mandato=repo_contrato_mandato,
-                    pdf_service=pdf_service,
-                )
+                servicio = obtener_contenedor().servicio_financiero
                 detalles_lista = []
 
                 for liq in liquidaciones:
@@ -816,6 +697,7 @@ class LiquidacionesState(DocumentosStateMixin):
             "periodo": periodo_actual,
             "propiedades_preview": [],  # Se llenará al seleccionar propietario
         }
+        self.propietario_selected_label = ""
         self.error_message = ""
 
     @rx.event(background=True)
@@ -826,72 +708,21 @@ class LiquidacionesState(DocumentosStateMixin):
             self.error_message = ""
 
         try:
-            from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
-                RepositorioRecaudoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                RepositorioLiquidacionSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
-                RepositorioPropiedadSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-                RepositorioContratoArrendamientoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-                RepositorioContratoMandatoSQLite,
-            )
-            from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
-
-            repo_recaudo = RepositorioRecaudoSQLite(db_manager)
-            repo_liquidacion = RepositorioLiquidacionSQLite(db_manager)
-            repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-            repo_contrato_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-            repo_contrato_mandato = RepositorioContratoMandatoSQLite(db_manager)
-            pdf_service = ServicioDocumentosPDF()
-
-            servicio = ServicioFinanciero(
-                repo_recaudo=repo_recaudo,
-                repo_liquidacion=repo_liquidacion,
-                repo_propiedad=repo_propiedad,
-                repo_arriendo=repo_contrato_arriendo,
-                repo_mandato=repo_contrato_mandato,
-                pdf_service=pdf_service,
-            )
+            servicio = obtener_contenedor().servicio_financiero
             usuario_sistema = "admin"  # TODO: Obtener de AuthState
 
-            # Parsear id_propietario que viene como "NOMBRE - DOCUMENTO"
-            propietario_texto = form_data.get("id_propietario", "")
+            # El picker envía el ID_PROPIETARIO (campo oculto del formulario)
+            id_propietario = form_data.get("id_propietario", "")
             periodo = form_data.get("periodo", "")
 
-            if not propietario_texto or not periodo:
+            if not id_propietario or not periodo:
                 raise ValueError("Debe seleccionar un propietario y un período")
 
-            # Extraer el número de documento del string "Nombre - Documento"
             try:
-                documento = propietario_texto.split(" - ")[-1].strip()
-            except:
+                id_propietario = int(id_propietario)
+            except (TypeError, ValueError):
                 raise ValueError("Error al procesar el propietario seleccionado")
 
-            # Buscar ID_PROPIETARIO en la base de datos usando el documento
-            id_propietario = None
-            with db_manager.obtener_conexion() as conn:
-                cursor = db_manager.get_dict_cursor(conn)
-                query = """
-                SELECT prop.ID_PROPIETARIO
-                FROM PERSONAS per
-                INNER JOIN PROPIETARIOS prop ON per.ID_PERSONA = prop.ID_PERSONA
-                WHERE per.NUMERO_DOCUMENTO = %s
-                LIMIT 1
-                """
-                cursor.execute(query, (documento,))
-                row = cursor.fetchone()
-                if row:
-                    id_propietario = row["ID_PROPIETARIO"]
-
-            if not id_propietario:
-                raise ValueError(f"No se encontró propietario con documento {documento}")
-
             # Generar liquidación consolidada (crea N liquidaciones individuales)
             servicio.generar_liquidacion_propietario(
                 id_propietario=id_propietario,
@@ -933,38 +764,7 @@ class LiquidacionesState(DocumentosStateMixin):
             self.error_message = ""
 
         try:
-            from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
-                RepositorioRecaudoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                RepositorioLiquidacionSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
-                RepositorioPropiedadSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-                RepositorioContratoArrendamientoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-                RepositorioContratoMandatoSQLite,
-            )
-            from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
-
-            repo_recaudo = RepositorioRecaudoSQLite(db_manager)
-            repo_liquidacion = RepositorioLiquidacionSQLite(db_manager)
-            repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-            repo_contrato_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-            repo_contrato_mandato = RepositorioContratoMandatoSQLite(db_manager)
-            pdf_service = ServicioDocumentosPDF()
-
-            servicio = ServicioFinanciero(
-                repo_recaudo=repo_recaudo,
-                repo_liquidacion=repo_liquidacion,
-                repo_propiedad=repo_propiedad,
-                repo_arriendo=repo_contrato_arriendo,
-                repo_mandato=repo_contrato_mandato,
-                pdf_service=pdf_service,
-            )
+            servicio = obtener_contenedor().servicio_financiero
             usuario_sistema = "admin"  # TODO: Obtener de AuthState
 
             affected = servicio.aprobar_liquidacion_propietario(
@@ -995,38 +795,7 @@ class LiquidacionesState(DocumentosStateMixin):
             self.error_message = ""
 
         try:
-            from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
-                RepositorioRecaudoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                RepositorioLiquidacionSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
-                RepositorioPropiedadSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-                RepositorioContratoArrendamientoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-                RepositorioContratoMandatoSQLite,
-            )
-            from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
-
-            repo_recaudo = RepositorioRecaudoSQLite(db_manager)
-            repo_liquidacion = RepositorioLiquidacionSQLite(db_manager)
-            repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-            repo_contrato_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-            repo_contrato_mandato = RepositorioContratoMandatoSQLite(db_manager)
-            pdf_service = ServicioDocumentosPDF()
-
-            servicio = ServicioFinanciero(
-                repo_recaudo=repo_recaudo,
-                repo_liquidacion=repo_liquidacion,
-                repo_propiedad=repo_propiedad,
-                repo_arriendo=repo_contrato_arriendo,
-                repo_mandato=repo_contrato_mandato,
-                pdf_service=pdf_service,
-            )
+            servicio = obtener_contenedor().servicio_financiero
             usuario_sistema = "admin"  # TODO: Obtener de AuthState
 
             affected = servicio.marcar_liquidacion_propietario_pagada(
@@ -1065,38 +834,7 @@ class LiquidacionesState(DocumentosStateMixin):
             self.error_message = ""
 
         try:
-            from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
-                RepositorioRecaudoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                RepositorioLiquidacionSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
-                RepositorioPropiedadSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-                RepositorioContratoArrendamientoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-                RepositorioContratoMandatoSQLite,
-            )
-            from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
-
-            repo_recaudo = RepositorioRecaudoSQLite(db_manager)
-            repo_liquidacion = RepositorioLiquidacionSQLite(db_manager)
-            repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-            repo_contrato_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-            repo_contrato_mandato = RepositorioContratoMandatoSQLite(db_manager)
-            pdf_service = ServicioDocumentosPDF()
-
-            servicio = ServicioFinanciero(
-                repo_recaudo=repo_recaudo,
-                repo_liquidacion=repo_liquidacion,
-                repo_propiedad=repo_propiedad,
-                repo_arriendo=repo_contrato_arriendo,
-                repo_mandato=repo_contrato_mandato,
-                pdf_service=pdf_service,
-            )
+            servicio = obtener_contenedor().servicio_financiero
             usuario_sistema = "admin"  # TODO: Obtener de AuthState
 
             # Procesar datos del formulario
@@ -1161,38 +899,7 @@ class LiquidacionesState(DocumentosStateMixin):
             self.error_message = ""
 
         try:
-            from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
-                RepositorioRecaudoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                RepositorioLiquidacionSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
-                RepositorioPropiedadSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-                RepositorioContratoArrendamientoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-                RepositorioContratoMandatoSQLite,
-            )
-            from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
-
-            repo_recaudo = RepositorioRecaudoSQLite(db_manager)
-            repo_liquidacion = RepositorioLiquidacionSQLite(db_manager)
-            repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-            repo_contrato_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-            repo_contrato_mandato = RepositorioContratoMandatoSQLite(db_manager)
-            pdf_service = ServicioDocumentosPDF()
-
-            servicio = ServicioFinanciero(
-                repo_recaudo=repo_recaudo,
-                repo_liquidacion=repo_liquidacion,
-                repo_propiedad=repo_propiedad,
-                repo_arriendo=repo_contrato_arriendo,
-                repo_mandato=repo_contrato_mandato,
-                pdf_service=pdf_service,
-            )
+            servicio = obtener_contenedor().servicio_financiero
             usuario_sistema = "admin"  # TODO: Obtener de AuthState
 
             servicio.aprobar_liquidacion(id_liquidacion, usuario_sistema)
@@ -1221,38 +928,7 @@ class LiquidacionesState(DocumentosStateMixin):
             self.error_message = ""
 
         try:
-            from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
-                RepositorioRecaudoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                RepositorioLiquidacionSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
-                RepositorioPropiedadSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-                RepositorioContratoArrendamientoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-                RepositorioContratoMandatoSQLite,
-            )
-            from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
-
-            repo_recaudo = RepositorioRecaudoSQLite(db_manager)
-            repo_liquidacion = RepositorioLiquidacionSQLite(db_manager)
-            repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-            repo_contrato_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-            repo_contrato_mandato = RepositorioContratoMandatoSQLite(db_manager)
-            pdf_service = ServicioDocumentosPDF()
-
-            servicio = ServicioFinanciero(
-                repo_recaudo=repo_recaudo,
-                repo_liquidacion=repo_liquidacion,
-                repo_propiedad=repo_propiedad,
-                repo_arriendo=repo_contrato_arriendo,
-                repo_mandato=repo_contrato_mandato,
-                pdf_service=pdf_service,
-            )
+            servicio = obtener_contenedor().servicio_financiero
             usuario_sistema = "admin"  # TODO: Obtener de AuthState
 
             servicio.marcar_liquidacion_pagada(
@@ -1288,38 +964,7 @@ class LiquidacionesState(DocumentosStateMixin):
             self.error_message = ""
 
         try:
-            from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
-                RepositorioRecaudoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                RepositorioLiquidacionSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
-                RepositorioPropiedadSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-                RepositorioContratoArrendamientoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-                RepositorioContratoMandatoSQLite,
-            )
-            from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
-
-            repo_recaudo = RepositorioRecaudoSQLite(db_manager)
-            repo_liquidacion = RepositorioLiquidacionSQLite(db_manager)
-            repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-            repo_contrato_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-            repo_contrato_mandato = RepositorioContratoMandatoSQLite(db_manager)
-            pdf_service = ServicioDocumentosPDF()
-
-            servicio = ServicioFinanciero(
-                repo_recaudo=repo_recaudo,
-                repo_liquidacion=repo_liquidacion,
-                repo_propiedad=repo_propiedad,
-                repo_arriendo=repo_contrato_arriendo,
-                repo_mandato=repo_contrato_mandato,
-                pdf_service=pdf_service,
-            )
+            servicio = obtener_contenedor().servicio_financiero
             usuario_sistema = "admin"  # TODO: Obtener de AuthState
 
             if not motivo or len(motivo.strip()) < 10:
@@ -1363,38 +1008,7 @@ class LiquidacionesState(DocumentosStateMixin):
             self.error_message = ""
 
         try:
-            from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
-                RepositorioRecaudoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                RepositorioLiquidacionSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
-                RepositorioPropiedadSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-                RepositorioContratoArrendamientoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-                RepositorioContratoMandatoSQLite,
-            )
-            from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
-
-            repo_recaudo = RepositorioRecaudoSQLite(db_manager)
-            repo_liquidacion = RepositorioLiquidacionSQLite(db_manager)
-            repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-            repo_contrato_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-            repo_contrato_mandato = RepositorioContratoMandatoSQLite(db_manager)
-            pdf_service = ServicioDocumentosPDF()
-
-            servicio = ServicioFinanciero(
-                repo_recaudo=repo_recaudo,
-                repo_liquidacion=repo_liquidacion,
-                repo_propiedad=repo_propiedad,
-                repo_arriendo=repo_contrato_arriendo,
-                repo_mandato=repo_contrato_mandato,
-                pdf_service=pdf_service,
-            )
+            servicio = obtener_contenedor().servicio_financiero
             servicio.reversar_liquidacion(self.liquidacion_id_for_action, "admin")
 
             async with self:
@@ -1445,38 +1059,7 @@ class LiquidacionesState(DocumentosStateMixin):
                 yield rx.toast.warning("El motivo es muy corto", position="bottom-right")
                 return
 
-            from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
-                RepositorioRecaudoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
-                RepositorioLiquidacionSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
-                RepositorioPropiedadSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
-                RepositorioContratoArrendamientoSQLite,
-            )
-            from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
-                RepositorioContratoMandatoSQLite,
-            )
-            from src.infraestructura.servicios.servicio_documentos_pdf import ServicioDocumentosPDF
-
-            repo_recaudo = RepositorioRecaudoSQLite(db_manager)
-            repo_liquidacion = RepositorioLiquidacionSQLite(db_manager)
-            repo_propiedad = RepositorioPropiedadSQLite(db_manager)
-            repo_contrato_arriendo = RepositorioContratoArrendamientoSQLite(db_manager)
-            repo_contrato_mandato = RepositorioContratoMandatoSQLite(db_manager)
-            pdf_service = ServicioDocumentosPDF()
-
-            servicio = ServicioFinanciero(
-                repo_recaudo=repo_recaudo,
-                repo_liquidacion=repo_liquidacion,
-                repo_propiedad=repo_propiedad,
-                repo_arriendo=repo_contrato_arriendo,
-                repo_mandato=repo_contrato_mandato,
-                pdf_service=pdf_service,
-            )
+            servicio = obtener_contenedor().servicio_financiero
             servicio.cancelar_liquidacion(
                 self.liquidacion_id_for_action, self.cancel_motivo, "admin"
             )
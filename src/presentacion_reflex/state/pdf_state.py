@@ -808,7 +808,9 @@ class PDFState(rx.State):
             pdf_service=servicio_pdf
         )
         
-        datos = servicio.obtener_datos_consolidados_para_pdf(propietario_id, periodo)
+        # Período ya liquidado: acepta el retraso de reportes (puede leer de la réplica)
+        with db_manager.lectura(db_manager.tolerancia_reportes_segundos):
+            datos = servicio.obtener_datos_consolidados_para_pdf(propietario_id, periodo)
         
         if not datos:
             raise ValueError("No se encontraron datos para generar el estado de cuenta")
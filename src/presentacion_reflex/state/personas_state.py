@@ -214,12 +214,14 @@ class PersonasState(rx.State):
             pass  # print(f"[DEBUG_EXPORT] Filtros - Rol: {rol_filter}, Busqueda: {self.search_query}") [OpSec Removed]
 
             # Obtener datos CSV
-            csv_data = servicio.exportar_personas_csv(
-                filtro_rol=rol_filter,
-                busqueda=self.search_query if self.search_query else None,
-                fecha_inicio=self.fecha_inicio if self.fecha_inicio else None,
-                fecha_fin=self.fecha_fin if self.fecha_fin else None,
-            )
+            # Exportación: acepta el retraso de reportes (puede leer de la réplica)
+            with db_manager.lectura(db_manager.tolerancia_reportes_segundos):
+                csv_data = servicio.exportar_personas_csv(
+                    filtro_rol=rol_filter,
+                    busqueda=self.search_query if self.search_query else None,
+                    fecha_inicio=self.fecha_inicio if self.fecha_inicio else None,
+                    fecha_fin=self.fecha_fin if self.fecha_fin else None,
+                )
 
             data_len = len(csv_data)
             pass  # print(f"[DEBUG_EXPORT] Datos CSV generados. Longitud: {data_len} bytes") [OpSec Removed]
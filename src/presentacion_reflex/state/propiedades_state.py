@@ -558,13 +558,15 @@ class PropiedadesState(DocumentosStateMixin):
             if self.filter_municipio and self.filter_municipio != "0":
                 filtro_mun = int(self.filter_municipio)
 
-            csv_data = servicio.exportar_propiedades_csv(
-                filtro_tipo=self.filter_tipo,
-                filtro_disponibilidad=filtro_disp,
-                filtro_municipio=filtro_mun,
-                solo_activas=self.solo_activas,
-                busqueda=self.search_text if self.search_text else None,
-            )
+            # Exportación: acepta el retraso de reportes (puede leer de la réplica)
+            with db_manager.lectura(db_manager.tolerancia_reportes_segundos):
+                csv_data = servicio.exportar_propiedades_csv(
+                    filtro_tipo=self.filter_tipo,
+                    filtro_disponibilidad=filtro_disp,
+                    filtro_municipio=filtro_mun,
+                    solo_activas=self.solo_activas,
+                    busqueda=self.search_text if self.search_text else None,
+                )
 
             # Encode to bytes with BOM for Excel compatibility
             if isinstance(csv_data, str):
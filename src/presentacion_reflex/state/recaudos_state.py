@@ -1,12 +1,15 @@
+import asyncio
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 import reflex as rx
 
+from src.aplicacion.contenedor import obtener_contenedor
 from src.dominio.entidades.recaudo import Recaudo
 from src.dominio.entidades.recaudo_concepto import RecaudoConcepto
 from src.infraestructura.persistencia.database import db_manager
 from src.infraestructura.persistencia.repositorio_recaudo_sqlite import RepositorioRecaudoSQLite
+from src.presentacion_reflex.state.auth_state import AuthState
 from src.presentacion_reflex.state.documentos_mixin import DocumentosStateMixin
 from src.presentacion_reflex.utils.formatters import format_currency, format_number
 
@@ -46,6 +49,11 @@ class RecaudosState(DocumentosStateMixin):
     # Form data
     form_data: Dict[str, Any] = {}
 
+    # Generación masiva de cargos del mes
+    masivo_en_curso: bool = False
+    masivo_progreso: int = 0
+    masivo_etapa: str = ""
+
     @rx.event(background=True)
     async def on_load(self):
         """Carga inicial al montar la página."""
@@ -659,161 +667,57 @@ class RecaudosState(DocumentosStateMixin):
 
     @rx.event(background=True)
     async def generar_pagos_masivos(self):
-        """Genera pagos masivos para todos los contratos de arrendamiento activos.
+        """Genera el recaudo de canon del mes actual para todos los contratos activos.
         - Fecha de pago = fecha del sistema (hoy)
         - Valor total = canon de arrendamiento del contrato
-        - Método de pago = Masivo
-        - Tipo de concepto = Canon
-        - Período = mes actual en español
+        - Método de pago = Efectivo, estado Pendiente
+        - Tipo de concepto = Canon del período actual
+        Corre en un hilo aparte publicando el avance. Repetirlo (doble clic,
+        otra sesión) solo crea los cargos que falten.
         """
-        pass  # print("=" * 60) [OpSec Removed]
-        pass  # print("[DEBUG] === INICIO generar_pagos_masivos ===") [OpSec Removed]
-        pass  # print("=" * 60) [OpSec Removed]
-
         async with self:
-            self.is_loading = True
+            if self.masivo_en_curso:
+                return
+            self.masivo_en_curso = True
+            self.masivo_progreso = 0
+            self.masivo_etapa = "Iniciando"
             self.error_message = ""
+            current_user = await self.get_state(AuthState)
+            usuario = current_user.user["nombre_usuario"] if current_user.user else "sistema"
 
-        try:
-            pass  # print("[DEBUG] Creando repositorio...") [OpSec Removed]
-            repo = RepositorioRecaudoSQLite(db_manager)
-            usuario_sistema = "admin"
-            fecha_hoy = datetime.now().date().isoformat()
-            pass  # print(f"[DEBUG] Fecha hoy: {fecha_hoy}") [OpSec Removed]
-
-            # Calcular período: YYYY-MM para BD, español para observaciones
-            mes_actual = datetime.now().month
-            anio_actual = datetime.now().year
-            periodo_bd = f"{anio_actual}-{mes_actual:02d}"  # Formato YYYY-MM para BD
-            meses_espanol = [
-                "enero",
-                "febrero",
-                "marzo",
-                "abril",
-                "mayo",
-                "junio",
-                "julio",
-                "agosto",
-                "septiembre",
-                "octubre",
-                "noviembre",
-                "diciembre",
-            ]
-            periodo_display = (
-                f"{meses_espanol[mes_actual - 1]} de {anio_actual}"  # Para observaciones
-            )
-            pass  # print(f"[DEBUG] Periodo BD: {periodo_bd}, Display: {periodo_display}") [OpSec Removed]
-
-            # Obtener todos los contratos activos con su canon
-            query = """
-                SELECT 
-                    ca.ID_CONTRATO_A,
-                    ca.CANON_ARRENDAMIENTO,
-                    p.DIRECCION_PROPIEDAD
-                FROM CONTRATOS_ARRENDAMIENTOS ca
-                INNER JOIN PROPIEDADES p ON ca.ID_PROPIEDAD = p.ID_PROPIEDAD
-                WHERE ca.ESTADO_CONTRATO_A = 'Activo'
-            """
-
-            pass  # print("[DEBUG] Ejecutando query para obtener contratos activos...") [OpSec Removed]
-            with db_manager.obtener_conexion() as conn:
-                cursor = db_manager.get_dict_cursor(conn)
-                cursor.execute(query)
-                contratos_activos = cursor.fetchall()
+        avance = {"porcentaje": 0, "etapa": "Iniciando"}
 
-            pass  # print(f"[DEBUG] Contratos activos encontrados: {len(contratos_activos)}") [OpSec Removed]
+        def progreso(porcentaje: int, etapa: str):
+            avance["porcentaje"], avance["etapa"] = porcentaje, etapa
 
-            if not contratos_activos:
-                pass  # print("[DEBUG] No hay contratos activos - SALIENDO") [OpSec Removed]
+        servicio = obtener_contenedor().servicio_financiero
+        tarea = asyncio.ensure_future(
+            asyncio.to_thread(servicio.generar_cargos_mensuales, usuario, None, progreso)
+        )
+        try:
+            while not tarea.done():
+                await asyncio.wait({tarea}, timeout=0.25)
                 async with self:
-                    self.error_message = "No hay contratos activos para generar pagos"
-                    self.is_loading = False
-                return
-
-            # Mostrar detalle de contratos
-            for i, c in enumerate(contratos_activos):
-                pass  # print(f"[DEBUG] Contrato {i+1}: ID={c.get('ID_CONTRATO_A')}, Canon={c.get('CANON_ARRENDAMIENTO')}") [OpSec Removed]
-
-            pagos_generados = 0
-            errores = []
-
-            for contrato in contratos_activos:
-                try:
-                    id_contrato = contrato["ID_CONTRATO_A"]
-                    canon = contrato["CANON_ARRENDAMIENTO"]
-                    pass  # print(f"[DEBUG] Procesando contrato {id_contrato} con canon {canon}") [OpSec Removed]
-
-                    if not canon or canon <= 0:
-                        pass  # print(f"[DEBUG] Contrato {id_contrato}: Canon inválido ({canon})") [OpSec Removed]
-                        errores.append(f"Contrato {id_contrato}: Canon inválido")
-                        continue
-
-                    # Crear entidad Recaudo
-                    pass  # print(f"[DEBUG] Creando entidad Recaudo para contrato {id_contrato}...") [OpSec Removed]
-                    recaudo = Recaudo(
-                        id_recaudo=None,
-                        id_contrato_a=id_contrato,
-                        fecha_pago=fecha_hoy,
-                        valor_total=canon,
-                        metodo_pago="Efectivo",
-                        referencia_bancaria=None,
-                        estado_recaudo="Pendiente",
-                        observaciones=f"Pago masivo generado - {periodo_display}",
-                        created_by=usuario_sistema,
-                    )
-                    pass  # print(f"[DEBUG] Recaudo creado: {recaudo.__dict__}") [OpSec Removed]
-
-                    # Crear concepto (Canon completo)
-                    pass  # print(f"[DEBUG] Creando concepto para contrato {id_contrato}...") [OpSec Removed]
-                    concepto = RecaudoConcepto(
-                        id_recaudo=None,
-                        tipo_concepto="Canon",
-                        periodo=periodo_bd,  # Usar formato YYYY-MM
-                        valor=canon,
-                    )
-                    pass  # print(f"[DEBUG] Concepto creado: {concepto.__dict__}") [OpSec Removed]
-
-                    pass  # print(f"[DEBUG] Guardando en BD contrato {id_contrato}...") [OpSec Removed]
-                    repo.crear(recaudo, [concepto], usuario_sistema)
-                    pass  # print(f"[DEBUG] Contrato {id_contrato} guardado exitosamente!") [OpSec Removed]
-                    pagos_generados += 1
-
-                except Exception as e:
-                    pass  # print(f"[DEBUG] ERROR en contrato {id_contrato}: {str(e)}") [OpSec Removed]
-                    import traceback
-
-                    traceback.print_exc()
-                    errores.append(f"Contrato {id_contrato}: {str(e)}")
-
-            pass  # print(f"[DEBUG] Pagos generados: {pagos_generados}, Errores: {len(errores)}") [OpSec Removed]
-
-            async with self:
-                self.is_loading = False
-                if errores:
-                    self.error_message = (
-                        f"Generados {pagos_generados} pagos. Errores: {len(errores)}"
-                    )
-                    pass  # print(f"[DEBUG] Errores: {errores}") [OpSec Removed]
-                else:
-                    self.error_message = ""
-
-            # Mostrar toast de éxito
-            pass  # print(f"[DEBUG] Mostrando toast de éxito...") [OpSec Removed]
-            yield rx.toast.success(f"Se generaron {pagos_generados} pagos masivos exitosamente")
-
-            # Recargar lista
-            pass  # print("[DEBUG] Recargando lista de recaudos...") [OpSec Removed]
-            yield RecaudosState.load_recaudos()
-
-            pass  # print("=" * 60) [OpSec Removed]
-            pass  # print("[DEBUG] === FIN generar_pagos_masivos ===") [OpSec Removed]
-            pass  # print("=" * 60) [OpSec Removed]
-
+                    self.masivo_progreso = avance["porcentaje"]
+                    self.masivo_etapa = avance["etapa"]
+            resultado = tarea.result()
         except Exception as e:
-            pass  # print(f"[DEBUG] ERROR GENERAL: {str(e)}") [OpSec Removed]
-            import traceback
-
-            traceback.print_exc()
             async with self:
+                self.masivo_en_curso = False
                 self.error_message = f"Error al generar pagos masivos: {str(e)}"
-                self.is_loading = False
+            yield rx.toast.error(f"Error al generar pagos masivos: {str(e)}")
+            return
+
+        mensaje = f"Se generaron {resultado['creados']} pagos masivos"
+        if resultado["omitidos"]:
+            mensaje += f" ({resultado['omitidos']} ya existían para el período)"
+        async with self:
+            self.masivo_en_curso = False
+            self.masivo_progreso = 100
+            self.masivo_etapa = mensaje
+            if resultado["invalidos"]:
+                self.error_message = (
+                    f"{resultado['invalidos']} contratos activos sin canon válido no se generaron"
+                )
+        yield rx.toast.success(mensaje)
+        yield RecaudosState.load_recaudos()
@@ -279,11 +279,12 @@ class ReportesState(rx.State):
             # ServicioPersonas ya lo instanciamos? No, directo al repo para raw data si es mas rapido?
             # Mejor usar servicio si tiene logica.
             
-            personas = repo.obtener_todos(
-                busqueda=self.filter_busqueda_tabla if self.filter_busqueda_tabla else None,
-                solo_activos=False if self.filter_estado == "Todos" else (True if self.filter_estado == "Activo" else False),
-                filtro_rol=self.filter_rol if self.filter_rol != "Todos" else None
-            )
+            with db_manager.lectura(db_manager.tolerancia_reportes_segundos):
+                personas = repo.obtener_todos(
+                    busqueda=self.filter_busqueda_tabla if self.filter_busqueda_tabla else None,
+                    solo_activos=False if self.filter_estado == "Todos" else (True if self.filter_estado == "Activo" else False),
+                    filtro_rol=self.filter_rol if self.filter_rol != "Todos" else None
+                )
             
             # Filtrado en memoria si el repo no filtra todo (ej. fechas, o si queremos 'Inactivo' especifico)
             if self.filter_estado == "Inactivo":
@@ -316,10 +317,11 @@ class ReportesState(rx.State):
             repo = RepositorioPropiedadSQLite(db_manager)
             
             # Use listar_con_filtros instead of listar_todos
-            props = repo.listar_con_filtros(
-                busqueda=self.filter_busqueda_tabla if self.filter_busqueda_tabla else None,
-                solo_activas=False if self.filter_estado == "Todos" else (True if self.filter_estado == "Activo" else False)
-            )
+            with db_manager.lectura(db_manager.tolerancia_reportes_segundos):
+                props = repo.listar_con_filtros(
+                    busqueda=self.filter_busqueda_tabla if self.filter_busqueda_tabla else None,
+                    solo_activas=False if self.filter_estado == "Todos" else (True if self.filter_estado == "Activo" else False)
+                )
             
             total = len(props)
             paginated = props[offset : offset + limit]
@@ -384,16 +386,10 @@ class ReportesState(rx.State):
                 query += " WHERE " + " AND ".join(conditions)
                 
             # Ejecucion
-            with db_manager.obtener_conexion() as conn:
+            with db_manager.lectura(db_manager.tolerancia_reportes_segundos) as conn:
                 cursor = db_manager.get_dict_cursor(conn) # Importante: devuelve dict
-                # SQLite placeholder es ?
-                # Adapt params to generic placeholder of db_manager if needed, usually its ? for sqlite
-                # Pero db_manager.get_placeholder() devuelve ? o %s.
-                placeholder = db_manager.get_placeholder()
-                
-                # Reconstruir query con placeholders correctos (hack simple replace ?)
-                query = query.replace("?", placeholder)
-                
+                # Placeholders '?': en PostgreSQL los traduce el compilador SQL del cursor
+
                 try:
                     cursor.execute(query, tuple(params))
                     rows = cursor.fetchall()
@@ -462,7 +458,7 @@ class ReportesState(rx.State):
             table_name = table_map[report_id]
             query = f"SELECT * FROM {table_name}"
             
-            with db_manager.obtener_conexion() as conn:
+            with db_manager.lectura(db_manager.tolerancia_reportes_segundos) as conn:
                 cursor = db_manager.get_dict_cursor(conn)
                 try:
                     cursor.execute(query)
@@ -0,0 +1,17 @@
+"""
+Middleware de Reflex que abre un resumen de consultas SQL por evento.
+"""
+
+import reflex as rx
+
+from src.infraestructura.persistencia.instrumentacion_consultas import (
+    instrumentacion_consultas,
+)
+
+
+class MiddlewareInstrumentacionConsultas(rx.Middleware):
+    """Asocia las consultas de cada evento a su nombre (p.ej. state.liquidaciones_state.cargar)."""
+
+    async def preprocess(self, app, state, event):
+        instrumentacion_consultas.medir_tarea_actual(event.name)
+        return None
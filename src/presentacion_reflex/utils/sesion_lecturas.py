@@ -0,0 +1,19 @@
+"""
+Middleware de Reflex que atribuye las consultas de cada evento a su cliente.
+
+Con una réplica de lectura, quien acaba de escribir lee lo propio de la
+primaria: las escrituras y lecturas del evento se asocian al token del
+cliente, no al hilo que las ejecuta.
+"""
+
+import reflex as rx
+
+from src.infraestructura.persistencia.enrutador_lecturas import fijar_sesion
+
+
+class MiddlewareSesionLecturas(rx.Middleware):
+    """Fija la sesión del enrutador de lecturas con el token del cliente del evento."""
+
+    async def preprocess(self, app, state, event):
+        fijar_sesion(state.router.session.client_token)
+        return None
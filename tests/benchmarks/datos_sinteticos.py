@@ -0,0 +1,428 @@
+"""
+Generador determinista de datos sintéticos para benchmarks.
+
+Crea el esquema real (migraciones/schema_extracted.json) y lo puebla con
+personas, propiedades, contratos, recaudos y liquidaciones a tres escalas.
+La misma escala, semilla y fecha de referencia producen exactamente los
+mismos datos. Las fechas se anclan a la fecha de referencia (por defecto el
+mes actual) para que los KPIs "del mes" y las vistas de mora tengan datos.
+
+Uso:
+    python -m tests.benchmarks.datos_sinteticos --escala M --salida /tmp/bench_M.db
+"""
+
+import argparse
+import calendar
+import json
+import random
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+RAIZ = Path(__file__).resolve().parents[2]
+RUTA_ESQUEMA = RAIZ / "migraciones" / "schema_extracted.json"
+
+SEMILLA_DEFAULT = 42
+LOTE_INSERCION = 5000
+
+
+@dataclass(frozen=True)
+class Escala:
+    """Volúmenes de una escala de benchmark."""
+
+    nombre: str
+    propiedades: int
+    personas: int
+    recaudos: int
+    anios_liquidaciones: int
+    asesores: int
+    ocupacion: float = 0.7
+
+
+ESCALAS: Dict[str, Escala] = {
+    "S": Escala("S", propiedades=500, personas=1_500, recaudos=8_000, anios_liquidaciones=2, asesores=10),
+    "M": Escala("M", propiedades=5_000, personas=12_000, recaudos=100_000, anios_liquidaciones=3, asesores=25),
+    "L": Escala("L", propiedades=20_000, personas=50_000, recaudos=500_000, anios_liquidaciones=5, asesores=50),
+}
+
+NOMBRES = ["José", "María", "Ángela", "Andrés", "Sofía", "Camilo", "Lucía", "Martín", "Inés", "Julián"]
+APELLIDOS = ["Pérez", "Gómez", "Rodríguez", "Núñez", "Martínez", "Sánchez", "Ramírez", "Castaño", "Ríos", "Zuluaga"]
+VIAS = ["Calle", "Carrera", "Avenida", "Transversal", "Diagonal"]
+TIPOS_PROPIEDAD = ["Apartamento", "Casa", "Local Comercial", "Oficina", "Bodega"]
+MUNICIPIOS = [
+    ("Armenia", "Quindío"), ("Calarcá", "Quindío"), ("Montenegro", "Quindío"),
+    ("Quimbaya", "Quindío"), ("Circasia", "Quindío"), ("La Tebaida", "Quindío"),
+    ("Pereira", "Risaralda"), ("Dosquebradas", "Risaralda"), ("Manizales", "Caldas"),
+    ("Bogotá D.C.", "Bogotá D.C."),
+]
+SEGUROS = [("Seguros Bolívar", 200), ("Sura Arrendamientos", 250), ("El Libertador", 300)]
+METODOS_PAGO = ["Efectivo", "Transferencia", "PSE", "Consignación"]
+
+
+def _sumar_meses(fecha: date, meses: int) -> date:
+    anio, mes = divmod(fecha.month - 1 + meses, 12)
+    anio += fecha.year
+    dia = min(fecha.day, calendar.monthrange(anio, mes + 1)[1])
+    return date(anio, mes + 1, dia)
+
+
+class DatosSinteticos:
+    """
+    Produce las filas de cada tabla para una escala.
+
+    Las tablas se generan en orden de dependencias; `tablas()` devuelve
+    (tabla, columnas, filas) listas para cargar en SQLite o PostgreSQL.
+    """
+
+    def __init__(
+        self,
+        escala: Escala,
+        semilla: int = SEMILLA_DEFAULT,
+        fecha_referencia: Optional[date] = None,
+    ):
+        self.escala = escala
+        self.semilla = semilla
+        self.fecha_referencia = (fecha_referencia or date.today()).replace(day=1)
+        self.rnd = random.Random(f"{escala.nombre}:{semilla}")
+
+        self.meses = escala.anios_liquidaciones * 12
+        self.inicio = _sumar_meses(self.fecha_referencia, -self.meses)
+
+        self.n_asesores = escala.asesores
+        self.n_contratos = int(escala.propiedades * escala.ocupacion)
+        self.n_propietarios = max(1, min(escala.propiedades * 2 // 3, escala.personas // 3))
+        self.n_arrendatarios = min(self.n_contratos, escala.personas - self.n_propietarios - self.n_asesores)
+        if self.n_arrendatarios < self.n_contratos:
+            raise ValueError(f"La escala {escala.nombre} no tiene personas suficientes para los contratos")
+
+        self._canones: List[int] = []
+        self._inicios: List[date] = []
+        self._mandatos: List[Tuple[int, int, int, int]] = []  # id, propietario, canon, comision
+
+    # --- Catálogos y personas ---
+
+    def _municipios(self) -> Iterator[tuple]:
+        for i, (nombre, depto) in enumerate(MUNICIPIOS, 1):
+            yield (i, nombre, depto)
+
+    def _seguros(self) -> Iterator[tuple]:
+        for i, (nombre, porcentaje) in enumerate(SEGUROS, 1):
+            yield (i, nombre, self.inicio.isoformat(), porcentaje)
+
+    def _personas(self) -> Iterator[tuple]:
+        rnd = self.rnd
+        for i in range(1, self.escala.personas + 1):
+            nombre = (
+                f"{rnd.choice(NOMBRES)} {rnd.choice(NOMBRES)} "
+                f"{rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}"
+            )
+            yield (
+                i, "CC", str(1_000_000 + i), nombre, f"3{rnd.randint(100000000, 199999999)}",
+                f"persona{i}@correo.test",
+                f"{rnd.choice(VIAS)} {rnd.randint(1, 150)} # {rnd.randint(1, 99)}-{rnd.randint(1, 99)}",
+                1 if rnd.random() > 0.03 else 0,
+            )
+
+    def _asesores(self) -> Iterator[tuple]:
+        for i in range(1, self.n_asesores + 1):
+            yield (i, i, self.rnd.choice([800, 1000, 1200]), 300, self.inicio.isoformat(), 1)
+
+    def _propietarios(self) -> Iterator[tuple]:
+        base = self.n_asesores
+        for i in range(1, self.n_propietarios + 1):
+            yield (
+                i, base + i, "Bancolombia", f"{i:011d}", self.rnd.choice(["Ahorros", "Corriente"]), 1,
+                self.inicio.isoformat(),
+            )
+
+    def _arrendatarios(self) -> Iterator[tuple]:
+        base = self.n_asesores + self.n_propietarios
+        for i in range(1, self.n_arrendatarios + 1):
+            yield (i, base + i, self.rnd.randint(1, len(SEGUROS)), 1, self.inicio.isoformat())
+
+    # --- Inmuebles y contratos ---
+
+    def _propiedades(self) -> Iterator[tuple]:
+        rnd = self.rnd
+        for i in range(1, self.escala.propiedades + 1):
+            canon = rnd.randrange(800_000, 6_000_000, 50_000)
+            self._canones.append(canon)
+            yield (
+                i, f"MAT-{i:07d}", rnd.randint(1, len(MUNICIPIOS)),
+                f"{rnd.choice(VIAS)} {rnd.randint(1, 150)} # {rnd.randint(1, 99)}-{rnd.randint(1, 99)}",
+                rnd.choice(TIPOS_PROPIEDAD), 0 if i <= self.n_contratos else 1,
+                round(rnd.uniform(35, 300), 1), rnd.randint(1, 5), rnd.randint(1, 3),
+                rnd.randint(0, 2), rnd.randint(1, 6), rnd.randrange(0, 400_000, 10_000), canon, 1,
+                self.inicio.isoformat(),
+            )
+
+    def _contratos_mandatos(self) -> Iterator[tuple]:
+        rnd = self.rnd
+        inicio = _sumar_meses(self.inicio, -1)
+        fin = _sumar_meses(self.fecha_referencia, 24)
+        duracion = (fin.year - inicio.year) * 12 + fin.month - inicio.month
+        for i in range(1, self.escala.propiedades + 1):
+            propietario = (i - 1) % self.n_propietarios + 1
+            comision = rnd.choice([800, 1000, 1200])
+            canon = self._canones[i - 1]
+            self._mandatos.append((i, propietario, canon, comision))
+            yield (
+                i, i, propietario, (i - 1) % self.n_asesores + 1, inicio.isoformat(), fin.isoformat(),
+                duracion, canon, comision, 1900, "Activo",
+            )
+
+    def _meses_contrato(self, id_contrato: int) -> int:
+        """Meses transcurridos del contrato; reparte los recaudos pedidos entre contratos."""
+        promedio, resto = divmod(self.escala.recaudos, self.n_contratos)
+        meses = promedio + (1 if id_contrato <= resto else 0)
+        return max(1, min(meses, self.meses + 1))
+
+    def _contratos_arrendamientos(self) -> Iterator[tuple]:
+        rnd = self.rnd
+        for i in range(1, self.n_contratos + 1):
+            inicio = _sumar_meses(self.fecha_referencia, 1 - self._meses_contrato(i))
+            inicio += timedelta(days=rnd.randint(0, 27))
+            # Un tercio vence en los próximos 90 días para poblar alertas y túnel de vencimientos
+            if i % 3 == 0:
+                fin = self.fecha_referencia + timedelta(days=rnd.randint(1, 90))
+            else:
+                fin = _sumar_meses(self.fecha_referencia, rnd.randint(4, 24))
+            duracion = max(1, (fin.year - inicio.year) * 12 + fin.month - inicio.month)
+            canon = self._canones[i - 1]
+            self._inicios.append(inicio)
+            yield (
+                i, i, i, inicio.isoformat(), fin.isoformat(), duracion, canon, canon, "Activo",
+                _sumar_meses(inicio, 12).isoformat(),
+            )
+
+    def _polizas(self) -> Iterator[tuple]:
+        for i in range(1, self.n_contratos + 1):
+            if i % 2 == 0:
+                yield (
+                    i, i, (i - 1) % len(SEGUROS) + 1, self.inicio.isoformat(),
+                    _sumar_meses(self.fecha_referencia, 12).isoformat(), f"POL-{i:07d}", "Activa",
+                )
+
+    # --- Movimientos ---
+
+    def _recaudos_y_conceptos(self) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Un recaudo de canon por contrato y mes desde su inicio hasta el mes actual.
+
+        Uno de cada doce contratos deja de pagar sus últimos 1 a 3 meses, para
+        que la cartera en mora tenga el tamaño habitual.
+        """
+        rnd = self.rnd
+        hoy = date.today()
+        recaudos, conceptos = [], []
+        for id_contrato in range(1, self.n_contratos + 1):
+            meses = self._meses_contrato(id_contrato)
+            if id_contrato % 12 == 0:
+                meses = max(0, meses - (id_contrato // 12) % 3 - 1)
+            inicio = self._inicios[id_contrato - 1]
+            canon = self._canones[id_contrato - 1]
+            for mes in range(meses):
+                vencimiento = _sumar_meses(inicio, mes)
+                fecha = min(vencimiento + timedelta(days=rnd.randint(-3, 9)), hoy)
+                id_recaudo = len(recaudos) + 1
+                estado = "Reversado" if rnd.random() < 0.01 else "Aplicado"
+                recaudos.append((
+                    id_recaudo, id_contrato, fecha.isoformat(), canon, rnd.choice(METODOS_PAGO),
+                    f"REF-{id_recaudo:08d}", estado, fecha.isoformat(),
+                ))
+                conceptos.append((id_recaudo, id_recaudo, "Canon", vencimiento.strftime("%Y-%m"), canon))
+        return recaudos, conceptos
+
+    def _liquidaciones(self) -> Iterator[tuple]:
+        """Una liquidación por mandato y mes; la del último mes queda En Proceso."""
+        id_liquidacion = 0
+        for mes in range(self.meses):
+            primer_dia = _sumar_meses(self.inicio, mes)
+            periodo = primer_dia.strftime("%Y-%m")
+            ultimo = mes == self.meses - 1
+            generacion = (primer_dia + timedelta(days=27)).isoformat()
+            pago = _sumar_meses(primer_dia, 1).replace(day=5).isoformat()
+            for id_mandato, _propietario, canon, comision_pct in self._mandatos:
+                id_liquidacion += 1
+                comision = canon * comision_pct // 10000
+                iva = int(comision * 0.19)
+                impuesto = int(canon * 0.004)
+                egresos = comision + iva + impuesto
+                yield (
+                    id_liquidacion, id_mandato, periodo, generacion, canon, 0, canon, comision_pct,
+                    comision, iva, impuesto, egresos, canon - egresos,
+                    "En Proceso" if ultimo else "Pagada",
+                    None if ultimo else pago, None if ultimo else "Transferencia", generacion,
+                )
+
+    def tablas(self) -> Iterator[Tuple[str, Sequence[str], Any]]:
+        """(tabla, columnas, filas) en orden de dependencias."""
+        yield "MUNICIPIOS", ("ID_MUNICIPIO", "NOMBRE_MUNICIPIO", "DEPARTAMENTO"), self._municipios()
+        yield "SEGUROS", ("ID_SEGURO", "NOMBRE_SEGURO", "FECHA_INICIO_SEGURO", "PORCENTAJE_SEGURO"), self._seguros()
+        yield "PERSONAS", (
+            "ID_PERSONA", "TIPO_DOCUMENTO", "NUMERO_DOCUMENTO", "NOMBRE_COMPLETO", "TELEFONO_PRINCIPAL",
+            "CORREO_ELECTRONICO", "DIRECCION_PRINCIPAL", "ESTADO_REGISTRO",
+        ), self._personas()
+        yield "ASESORES", (
+            "ID_ASESOR", "ID_PERSONA", "COMISION_PORCENTAJE_ARRIENDO", "COMISION_PORCENTAJE_VENTA",
+            "FECHA_INGRESO", "ESTADO",
+        ), self._asesores()
+        yield "PROPIETARIOS", (
+            "ID_PROPIETARIO", "ID_PERSONA", "BANCO_PROPIETARIO", "NUMERO_CUENTA_PROPIETARIO", "TIPO_CUENTA",
+            "ESTADO_PROPIETARIO", "FECHA_INGRESO_PROPIETARIO",
+        ), self._propietarios()
+        yield "ARRENDATARIOS", (
+            "ID_ARRENDATARIO", "ID_PERSONA", "ID_SEGURO", "ESTADO_ARRENDATARIO", "FECHA_INGRESO_ARRENDATARIO",
+        ), self._arrendatarios()
+        yield "PROPIEDADES", (
+            "ID_PROPIEDAD", "MATRICULA_INMOBILIARIA", "ID_MUNICIPIO", "DIRECCION_PROPIEDAD", "TIPO_PROPIEDAD",
+            "DISPONIBILIDAD_PROPIEDAD", "AREA_M2", "HABITACIONES", "BANO", "PARQUEADERO", "ESTRATO",
+            "VALOR_ADMINISTRACION", "CANON_ARRENDAMIENTO_ESTIMADO", "ESTADO_REGISTRO", "FECHA_INGRESO_PROPIEDAD",
+        ), self._propiedades()
+        yield "CONTRATOS_MANDATOS", (
+            "ID_CONTRATO_M", "ID_PROPIEDAD", "ID_PROPIETARIO", "ID_ASESOR", "FECHA_INICIO_CONTRATO_M",
+            "FECHA_FIN_CONTRATO_M", "DURACION_CONTRATO_M", "CANON_MANDATO", "COMISION_PORCENTAJE_CONTRATO_M",
+            "IVA_CONTRATO_M", "ESTADO_CONTRATO_M",
+        ), self._contratos_mandatos()
+        yield "CONTRATOS_ARRENDAMIENTOS", (
+            "ID_CONTRATO_A", "ID_PROPIEDAD", "ID_ARRENDATARIO", "FECHA_INICIO_CONTRATO_A",
+            "FECHA_FIN_CONTRATO_A", "DURACION_CONTRATO_A", "CANON_ARRENDAMIENTO", "DEPOSITO",
+            "ESTADO_CONTRATO_A", "FECHA_INCREMENTO_IPC",
+        ), self._contratos_arrendamientos()
+        yield "POLIZAS", (
+            "ID_POLIZA", "ID_CONTRATO", "ID_SEGURO", "FECHA_INICIO", "FECHA_FIN", "NUMERO_POLIZA", "ESTADO",
+        ), self._polizas()
+        recaudos, conceptos = self._recaudos_y_conceptos()
+        yield "RECAUDOS", (
+            "ID_RECAUDO", "ID_CONTRATO_A", "FECHA_PAGO", "VALOR_TOTAL", "METODO_PAGO", "REFERENCIA_BANCARIA",
+            "ESTADO_RECAUDO", "CREATED_AT",
+        ), recaudos
+        yield "RECAUDO_CONCEPTOS", (
+            "ID_RECAUDO_CONCEPTO", "ID_RECAUDO", "TIPO_CONCEPTO", "PERIODO", "VALOR",
+        ), conceptos
+        yield "LIQUIDACIONES", (
+            "ID_LIQUIDACION", "ID_CONTRATO_M", "PERIODO", "FECHA_GENERACION", "CANON_BRUTO", "OTROS_INGRESOS",
+            "TOTAL_INGRESOS", "COMISION_PORCENTAJE", "COMISION_MONTO", "IVA_COMISION", "IMPUESTO_4X1000",
+            "TOTAL_EGRESOS", "NETO_A_PAGAR", "ESTADO_LIQUIDACION", "FECHA_PAGO", "METODO_PAGO", "CREATED_AT",
+        ), self._liquidaciones()
+
+
+def _lotes(filas, tamano: int = LOTE_INSERCION) -> Iterator[list]:
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) >= tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _esquema() -> Dict[str, Any]:
+    with open(RUTA_ESQUEMA, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _escala(escala: Union[str, Escala]) -> Escala:
+    return escala if isinstance(escala, Escala) else ESCALAS[escala]
+
+
+def crear_base_sqlite(
+    ruta: Path,
+    escala: Union[str, Escala] = "S",
+    semilla: int = SEMILLA_DEFAULT,
+    fecha_referencia: Optional[date] = None,
+) -> Dict[str, int]:
+    """
+    Crea (o reemplaza) una base SQLite con el esquema real y datos sintéticos.
+
+    Los índices y triggers se crean después de la carga, como en una
+    restauración, para que la carga a escala L tome segundos y no minutos.
+
+    Returns:
+        Filas insertadas por tabla.
+    """
+    ruta = Path(ruta)
+    if ruta.exists():
+        ruta.unlink()
+    esquema = _esquema()
+    datos = DatosSinteticos(_escala(escala), semilla, fecha_referencia)
+
+    conn = sqlite3.connect(str(ruta))
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = OFF")
+        for tabla in esquema["tables"].values():
+            conn.execute(tabla["create_sql"])
+
+        conteos = {}
+        for tabla, columnas, filas in datos.tablas():
+            sql = (
+                f"INSERT INTO {tabla} ({', '.join(columnas)}) "
+                f"VALUES ({', '.join('?' for _ in columnas)})"
+            )
+            conteos[tabla] = 0
+            for lote in _lotes(filas):
+                conn.executemany(sql, lote)
+                conteos[tabla] += len(lote)
+        conn.commit()
+
+        for objeto in esquema["indices"] + esquema["views"] + esquema["triggers"]:
+            conn.execute(objeto["sql"])
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    return conteos
+
+
+def cargar_postgresql(
+    conexion,
+    escala: Union[str, Escala] = "S",
+    semilla: int = SEMILLA_DEFAULT,
+    fecha_referencia: Optional[date] = None,
+) -> Dict[str, int]:
+    """
+    Carga los mismos datos en un PostgreSQL con el esquema ya migrado.
+
+    Las tablas destino deben estar vacías; al final se sincronizan las
+    secuencias de las PK para que los INSERT de la aplicación no choquen.
+    """
+    from psycopg2.extras import execute_values
+
+    datos = DatosSinteticos(_escala(escala), semilla, fecha_referencia)
+    conteos = {}
+    with conexion.cursor() as cursor:
+        for tabla, columnas, filas in datos.tablas():
+            conteos[tabla] = 0
+            for lote in _lotes(filas):
+                execute_values(
+                    cursor, f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES %s", lote
+                )
+                conteos[tabla] += len(lote)
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence(%s, %s), "
+                f"COALESCE((SELECT MAX({columnas[0]}) FROM {tabla}), 1))",
+                (tabla.lower(), columnas[0].lower()),
+            )
+        cursor.execute("ANALYZE")
+    conexion.commit()
+    return conteos
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Genera una BD SQLite con datos sintéticos")
+    parser.add_argument("--escala", choices=sorted(ESCALAS), default="S")
+    parser.add_argument("--semilla", type=int, default=SEMILLA_DEFAULT)
+    parser.add_argument("--salida", type=Path, required=True)
+    args = parser.parse_args(argv)
+
+    conteos = crear_base_sqlite(args.salida, args.escala, args.semilla)
+    for tabla, n in conteos.items():
+        print(f"{tabla:<28} {n:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Ejecuta los escenarios de benchmark y los compara con una línea base.
+
+Genera (o reutiliza) la base sintética de la escala pedida, mide cada
+escenario y escribe los resultados en JSON. Con --comparar, termina con
+código 1 si algún escenario es más lento que la línea base por encima de
+la tolerancia.
+
+Uso:
+    python -m tests.benchmarks.ejecutar --escala S --salida resultados_S.json
+    python -m tests.benchmarks.ejecutar --escala S --comparar tests/benchmarks/baseline_S.json
+    python -m tests.benchmarks.ejecutar --escala M --guardar-baseline tests/benchmarks/baseline_M.json
+    python -m tests.benchmarks.ejecutar --escala S --postgresql   # usa DATABASE_URL/DB_* del .env
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from tests.benchmarks.datos_sinteticos import ESCALAS, SEMILLA_DEFAULT, crear_base_sqlite
+from tests.benchmarks.escenarios import ESCENARIOS, BaseDatosBenchmark, ContextoBenchmark, Escenario
+
+TOLERANCIA_DEFAULT = 0.25
+# Diferencias menores a esto son ruido de medición aunque superen la tolerancia relativa
+UMBRAL_ABSOLUTO_MS = 5.0
+
+
+def medir(escenario: Escenario, contexto: ContextoBenchmark, repeticiones: Optional[int] = None) -> Dict[str, Any]:
+    """Una ejecución de calentamiento y luego `repeticiones` mediciones."""
+    funcion = escenario.crear(contexto)
+    n = repeticiones or escenario.repeticiones
+    tiempos = []
+    for i in range(n + 1):
+        inicio = time.perf_counter()
+        funcion()
+        duracion = (time.perf_counter() - inicio) * 1000
+        if escenario.limpiar:
+            escenario.limpiar(contexto)
+        if i > 0:
+            tiempos.append(duracion)
+    tiempos.sort()
+    return {
+        "descripcion": escenario.descripcion,
+        "repeticiones": n,
+        "mediana_ms": round(statistics.median(tiempos), 3),
+        "p95_ms": round(tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))], 3),
+        "min_ms": round(tiempos[0], 3),
+    }
+
+
+def comparar(
+    resultados: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerancia: float = TOLERANCIA_DEFAULT,
+    umbral_absoluto_ms: float = UMBRAL_ABSOLUTO_MS,
+) -> List[Dict[str, Any]]:
+    """Escenarios cuya mediana empeoró más que la tolerancia respecto a la línea base."""
+    regresiones = []
+    for nombre, actual in resultados["escenarios"].items():
+        base = baseline.get("escenarios", {}).get(nombre)
+        if not base:
+            continue
+        diferencia = actual["mediana_ms"] - base["mediana_ms"]
+        if diferencia > umbral_absoluto_ms and actual["mediana_ms"] > base["mediana_ms"] * (1 + tolerancia):
+            regresiones.append({
+                "escenario": nombre,
+                "baseline_ms": base["mediana_ms"],
+                "actual_ms": actual["mediana_ms"],
+                "cambio": round(actual["mediana_ms"] / base["mediana_ms"] - 1, 3),
+            })
+    return regresiones
+
+
+def _commit_actual() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def ejecutar(
+    escala: str,
+    db_manager: Any,
+    motor: str,
+    filtro: Optional[List[str]] = None,
+    repeticiones: Optional[int] = None,
+) -> Dict[str, Any]:
+    contexto = ContextoBenchmark(db_manager)
+    inicio = time.perf_counter()
+    contexto.preparar()
+    resultados = {
+        "escala": escala,
+        "motor": motor,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "preparacion_ms": round((time.perf_counter() - inicio) * 1000, 1),
+        "escenarios": {},
+    }
+    for escenario in ESCENARIOS:
+        if filtro and escenario.nombre not in filtro:
+            continue
+        resultados["escenarios"][escenario.nombre] = medir(escenario, contexto, repeticiones)
+        r = resultados["escenarios"][escenario.nombre]
+        print(f"{escenario.nombre:<34} mediana {r['mediana_ms']:>10.2f} ms   p95 {r['p95_ms']:>10.2f} ms")
+    return resultados
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de repositorios y servicios")
+    parser.add_argument("--escala", choices=sorted(ESCALAS), default="S")
+    parser.add_argument("--semilla", type=int, default=SEMILLA_DEFAULT)
+    parser.add_argument("--base", type=Path, help="BD sintética a reutilizar (se crea si no existe)")
+    parser.add_argument("--postgresql", action="store_true", help="Medir contra el PostgreSQL configurado")
+    parser.add_argument("--escenario", action="append", help="Ejecutar solo estos escenarios")
+    parser.add_argument("--repeticiones", type=int, help="Sobrescribe las repeticiones de cada escenario")
+    parser.add_argument("--salida", type=Path, help="Archivo JSON de resultados")
+    parser.add_argument("--comparar", type=Path, help="Línea base contra la cual comparar")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_DEFAULT)
+    parser.add_argument("--guardar-baseline", type=Path, help="Guardar los resultados como línea base")
+    args = parser.parse_args(argv)
+    # Los logs de depuración de los servicios (p.ej. PDF élite) distorsionan los tiempos
+    logging.disable(logging.INFO)
+
+    if args.postgresql:
+        from src.infraestructura.persistencia.database import db_manager
+
+        if not db_manager.use_postgresql:
+            parser.error("--postgresql requiere DB_MODE=postgresql o DATABASE_URL")
+        motor = "postgresql"
+    else:
+        # La base se ancla al mes actual: se regenera al cambiar de mes
+        nombre = f"inmo_velar_bench_{args.escala}_{args.semilla}_{datetime.now():%Y%m}.db"
+        ruta = args.base or Path(tempfile.gettempdir()) / nombre
+        if not ruta.exists():
+            print(f"Generando base sintética {args.escala} en {ruta}...")
+            crear_base_sqlite(ruta, args.escala, args.semilla)
+        db_manager = BaseDatosBenchmark(ruta)
+        motor = "sqlite"
+
+    resultados = ejecutar(args.escala, db_manager, motor, args.escenario, args.repeticiones)
+
+    regresiones = []
+    if args.comparar:
+        baseline = json.loads(args.comparar.read_text(encoding="utf-8"))
+        if baseline.get("escala") != args.escala:
+            parser.error(f"La línea base es de la escala {baseline.get('escala')}, no {args.escala}")
+        regresiones = comparar(resultados, baseline, args.tolerancia)
+        resultados["regresiones"] = regresiones
+        for r in regresiones:
+            print(
+                f"REGRESIÓN {r['escenario']}: {r['baseline_ms']:.2f} ms -> {r['actual_ms']:.2f} ms "
+                f"(+{r['cambio']:.0%})"
+            )
+        if not regresiones:
+            print("Sin regresiones respecto a la línea base.")
+
+    contenido = json.dumps(resultados, indent=2, ensure_ascii=False)
+    if args.salida:
+        args.salida.write_text(contenido, encoding="utf-8")
+    if args.guardar_baseline:
+        args.guardar_baseline.write_text(contenido, encoding="utf-8")
+    if regresiones:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
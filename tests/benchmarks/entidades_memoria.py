@@ -0,0 +1,140 @@
+"""
+Benchmark de memoria y throughput al cargar entidades en bloque.
+
+Carga N liquidaciones desde SQLite en memoria de tres formas y mide el mejor
+tiempo de `repeticiones` cargas y la memoria que retiene la lista resultante
+(tracemalloc, en una carga aparte):
+
+- dataclass_dict: `_row_to_entity` del repositorio (dict por fila)
+- dataclass_mapeador: MapeadorEntidad(Liquidacion)
+- registro: MapeadorEntidad(LiquidacionRegistro), la ruta de solo lectura
+
+Uso:
+    python -m tests.benchmarks.entidades_memoria --filas 100000
+"""
+
+import argparse
+import dataclasses
+import gc
+import json
+import sqlite3
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.dominio.entidades.liquidacion import Liquidacion
+from src.infraestructura.persistencia.filas import MapeadorEntidad
+from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
+    MAPEADOR_LIQUIDACION_REGISTRO,
+    RepositorioLiquidacionSQLite,
+)
+
+CONSULTA = "SELECT * FROM LIQUIDACIONES ORDER BY ID_LIQUIDACION"
+
+
+def crear_base(filas: int) -> sqlite3.Connection:
+    """LIQUIDACIONES en memoria con una columna por campo de la entidad."""
+    columnas = [campo.name.upper() for campo in dataclasses.fields(Liquidacion)]
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"CREATE TABLE LIQUIDACIONES ({', '.join(columnas)})")
+    estados = ("En Proceso", "Aprobada", "Pagada", "Cancelada")
+
+    def fila(i: int) -> Dict[str, Any]:
+        canon = 1_000_000 + (i % 97) * 10_000
+        return {
+            "ID_LIQUIDACION": i,
+            "ID_CONTRATO_M": i % 5_000 + 1,
+            "PERIODO": f"{2020 + i % 6}-{i % 12 + 1:02d}",
+            "FECHA_GENERACION": "2026-01-05",
+            "CANON_BRUTO": canon,
+            "TOTAL_INGRESOS": canon,
+            "COMISION_PORCENTAJE": 800,
+            "COMISION_MONTO": canon * 8 // 100,
+            "TOTAL_EGRESOS": canon * 8 // 100,
+            "NETO_A_PAGAR": canon - canon * 8 // 100,
+            "ESTADO_LIQUIDACION": estados[i % 4],
+            "OBSERVACIONES": f"Liquidación {i}",
+            "CREATED_AT": "2026-01-05T08:00:00",
+            "CREATED_BY": "benchmark",
+        }
+
+    # Montos no informados en 0, como los deja la generación de liquidaciones
+    vacias = {c: 0 if c.startswith(("GASTOS", "OTROS", "IVA", "IMPUESTO")) else None for c in columnas}
+    marcadores = ", ".join("?" for _ in columnas)
+    conn.executemany(
+        f"INSERT INTO LIQUIDACIONES VALUES ({marcadores})",
+        ([{**vacias, **fila(i)}[c] for c in columnas] for i in range(1, filas + 1)),
+    )
+    conn.commit()
+    return conn
+
+
+def cargadores(conn: sqlite3.Connection) -> Dict[str, Callable[[], List[Any]]]:
+    repo = RepositorioLiquidacionSQLite.__new__(RepositorioLiquidacionSQLite)
+    mapeador = MapeadorEntidad(Liquidacion)
+    return {
+        "dataclass_dict": lambda: [repo._row_to_entity(r) for r in conn.execute(CONSULTA).fetchall()],
+        "dataclass_mapeador": lambda: mapeador.mapear(conn.execute(CONSULTA)),
+        "registro": lambda: MAPEADOR_LIQUIDACION_REGISTRO.mapear(conn.execute(CONSULTA)),
+    }
+
+
+def _memoria_retenida(cargar: Callable[[], List[Any]]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        resultado = cargar()  # noqa: F841 - se mide mientras la lista sigue viva
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - antes
+    finally:
+        tracemalloc.stop()
+
+
+def medir_carga(filas: int = 100_000, repeticiones: int = 3) -> Dict[str, Any]:
+    conn = crear_base(filas)
+    try:
+        resultados: Dict[str, Any] = {"filas": filas, "variantes": {}}
+        for nombre, cargar in cargadores(conn).items():
+            cargar()  # calentamiento (compilación del mapeador, caché de páginas)
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                cargar()
+                tiempos.append(time.perf_counter() - inicio)
+            memoria = _memoria_retenida(cargar)
+            mejor = min(tiempos)
+            resultados["variantes"][nombre] = {
+                "mejor_ms": round(mejor * 1000, 1),
+                "filas_por_segundo": round(filas / mejor),
+                "memoria_mb": round(memoria / 1024 / 1024, 1),
+                "bytes_por_entidad": round(memoria / filas),
+            }
+        return resultados
+    finally:
+        conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Memoria y throughput de carga de entidades")
+    parser.add_argument("--filas", type=int, default=100_000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--salida", type=Path, help="Archivo JSON de resultados")
+    args = parser.parse_args(argv)
+
+    resultados = medir_carga(args.filas, args.repeticiones)
+    for nombre, r in resultados["variantes"].items():
+        print(
+            f"{nombre:<20} {r['mejor_ms']:>9.1f} ms  {r['filas_por_segundo']:>9} filas/s  "
+            f"{r['memoria_mb']:>7.1f} MB  {r['bytes_por_entidad']:>5} B/entidad"
+        )
+    if args.salida:
+        args.salida.write_text(json.dumps(resultados, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,351 @@
+"""
+Escenarios de benchmark: las rutas calientes de la aplicación.
+
+Cada escenario recibe el ContextoBenchmark y devuelve la función que se mide;
+los que escriben definen además una limpieza (no medida) que deja la base
+como estaba para la siguiente repetición.
+"""
+
+import sqlite3
+import tempfile
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import date
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.infraestructura.cache.cache_manager import cache_manager
+
+
+class _Fila(sqlite3.Row):
+    """sqlite3.Row con .get(), como las filas dict de PostgreSQL que algunos repositorios asumen."""
+
+    def get(self, clave, default=None):
+        return self[clave] if clave in self.keys() else default
+
+
+class BaseDatosBenchmark:
+    """DatabaseManager mínimo sobre un archivo SQLite (misma API que usan los repositorios)."""
+
+    use_postgresql = False
+    tolerancia_reportes_segundos = 0.0
+
+    def __init__(self, ruta: Path):
+        self.database_path = Path(ruta)
+        self._conn = sqlite3.connect(str(ruta), check_same_thread=False)
+        self._conn.row_factory = _Fila
+        self._conn.execute("PRAGMA foreign_keys = ON")
+
+    def obtener_conexion(self):
+        return self._conn
+
+    def lectura(self, tolerancia_segundos: float = 0.0):
+        return nullcontext(self._conn)
+
+    def get_dict_cursor(self, conexion=None):
+        return (conexion or self._conn).cursor()
+
+    def get_placeholder(self) -> str:
+        return "?"
+
+    def get_last_insert_id(self, cursor, table_name=None, id_column=None) -> int:
+        return cursor.lastrowid
+
+    def execute_query_one(self, query: str, params: tuple = ()):
+        return self._conn.execute(query, params).fetchone()
+
+    def execute_write(self, query: str, params: tuple = ()) -> int:
+        with self.transaccion() as conn:
+            return conn.execute(query, params).rowcount
+
+    def transaccion(self):
+        from contextlib import contextmanager
+
+        @contextmanager
+        def _transaccion():
+            try:
+                yield self._conn
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+        return _transaccion()
+
+    def cerrar_todas_conexiones(self) -> None:
+        self._conn.close()
+
+
+class ContextoBenchmark:
+    """Repositorios y servicios construidos una sola vez sobre la base de benchmark."""
+
+    def __init__(self, db_manager: Any):
+        self.db = db_manager
+        self.hoy = date.today()
+        self.periodo_actual = self.hoy.strftime("%Y-%m")
+        self.salida_pdf = Path(tempfile.mkdtemp(prefix="bench_pdf_"))
+
+    @cached_property
+    def repo_recaudo(self):
+        from src.infraestructura.persistencia.repositorio_recaudo_sqlite import RepositorioRecaudoSQLite
+
+        return RepositorioRecaudoSQLite(self.db)
+
+    @cached_property
+    def repo_liquidacion(self):
+        from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
+            RepositorioLiquidacionSQLite,
+        )
+
+        return RepositorioLiquidacionSQLite(self.db)
+
+    @cached_property
+    def repo_arriendo(self):
+        from src.infraestructura.persistencia.repositorio_contrato_arrendamiento_sqlite import (
+            RepositorioContratoArrendamientoSQLite,
+        )
+
+        return RepositorioContratoArrendamientoSQLite(self.db)
+
+    @cached_property
+    def repo_mandato(self):
+        from src.infraestructura.persistencia.repositorio_contrato_mandato_sqlite import (
+            RepositorioContratoMandatoSQLite,
+        )
+
+        return RepositorioContratoMandatoSQLite(self.db)
+
+    @cached_property
+    def repo_propiedad(self):
+        from src.infraestructura.persistencia.repositorio_propiedad_sqlite import RepositorioPropiedadSQLite
+
+        return RepositorioPropiedadSQLite(self.db)
+
+    @cached_property
+    def repo_persona(self):
+        from src.infraestructura.persistencia.repositorio_persona_sqlite import RepositorioPersonaSQLite
+
+        return RepositorioPersonaSQLite(self.db)
+
+    @cached_property
+    def servicio_dashboard(self):
+        from src.aplicacion.servicios.servicio_dashboard import ServicioDashboard
+        from src.infraestructura.persistencia.repositorio_dashboard_sqlite import (
+            RepositorioDashboardSQLite,
+        )
+
+        return ServicioDashboard(repo_dashboard=RepositorioDashboardSQLite(self.db))
+
+    @cached_property
+    def pdf_service(self):
+        from src.infraestructura.servicios.servicio_pdf_facade import ServicioPDFFacade
+
+        return ServicioPDFFacade(output_dir=str(self.salida_pdf))
+
+    @cached_property
+    def servicio_financiero(self):
+        from src.aplicacion.servicios.servicio_financiero import ServicioFinanciero
+
+        return ServicioFinanciero(
+            repo_recaudo=self.repo_recaudo,
+            repo_liquidacion=self.repo_liquidacion,
+            repo_propiedad=self.repo_propiedad,
+            repo_arriendo=self.repo_arriendo,
+            repo_mandato=self.repo_mandato,
+            pdf_service=self.pdf_service,
+        )
+
+    @cached_property
+    def propietario_muestra(self) -> Dict[str, Any]:
+        """Propietario con más inmuebles y su último período liquidado."""
+        fila = self.db.obtener_conexion().execute(
+            """
+            SELECT cm.ID_PROPIETARIO, MAX(l.PERIODO) AS PERIODO
+            FROM CONTRATOS_MANDATOS cm
+            JOIN LIQUIDACIONES l ON l.ID_CONTRATO_M = cm.ID_CONTRATO_M
+            GROUP BY cm.ID_PROPIETARIO
+            ORDER BY COUNT(DISTINCT cm.ID_CONTRATO_M) DESC, cm.ID_PROPIETARIO
+            LIMIT 1
+            """
+        ).fetchone()
+        return {"id_propietario": fila[0], "periodo": fila[1]}
+
+    @cached_property
+    def mandatos_cierre(self) -> List[int]:
+        """Mandatos activos que se liquidan en el cierre (muestra fija de 200)."""
+        filas = self.db.obtener_conexion().execute(
+            "SELECT ID_CONTRATO_M FROM CONTRATOS_MANDATOS WHERE ESTADO_CONTRATO_M = 'Activo' "
+            "ORDER BY ID_CONTRATO_M LIMIT 200"
+        ).fetchall()
+        return [f[0] for f in filas]
+
+    def preparar(self) -> None:
+        """
+        Construye repositorios y libros derivados fuera de la medición.
+
+        La cuenta del propietario se carga sola al crearse; la cartera en mora
+        se reconstruye una vez, igual que tras migrar una base existente.
+        """
+        self.repo_liquidacion, self.servicio_dashboard, self.servicio_financiero
+        cartera = self.repo_recaudo.cartera_mora
+        if not self.db.obtener_conexion().execute("SELECT 1 FROM CARTERA_MORA LIMIT 1").fetchone():
+            cartera.reconstruir()
+        self.propietario_muestra, self.mandatos_cierre
+
+
+@dataclass
+class Escenario:
+    nombre: str
+    descripcion: str
+    crear: Callable[[ContextoBenchmark], Callable[[], Any]]
+    limpiar: Optional[Callable[[ContextoBenchmark], None]] = None
+    repeticiones: int = 15
+
+
+def _listado_recaudos(ctx):
+    return lambda: ctx.repo_recaudo.listar_paginado(25, 0)
+
+
+def _listado_recaudos_filtrado(ctx):
+    desde = date(ctx.hoy.year - 1, 1, 1).isoformat()
+    return lambda: ctx.repo_recaudo.listar_paginado(
+        25, 0, estado="Aplicado", fecha_desde=desde, busqueda="Calle 1"
+    )
+
+
+def _listado_liquidaciones(ctx):
+    return lambda: ctx.repo_liquidacion.listar_paginado(25, 0)
+
+
+def _listado_contratos_arrendamiento(ctx):
+    return lambda: ctx.repo_arriendo.listar_paginado(page=1, page_size=25, estado="Activo")
+
+
+def _dashboard_kpis(ctx):
+    """Las mismas llamadas que DashboardState.load_data, sin caché."""
+    servicio = ctx.servicio_dashboard
+    mes, anio = ctx.hoy.month, ctx.hoy.year
+
+    def cargar():
+        cache_manager.clear_all()
+        servicio.obtener_flujo_caja_mes(mes=mes, anio=anio)
+        servicio.obtener_tasa_ocupacion()
+        servicio.obtener_total_contratos_activos()
+        servicio.obtener_comisiones_pendientes()
+        servicio.obtener_cartera_mora()
+        servicio.obtener_contratos_por_vencer()
+        servicio.obtener_metricas_incidentes()
+        servicio.obtener_evolucion_recaudo(mes_fin=mes, anio_fin=anio)
+        servicio.obtener_recibos_vencidos_resumen()
+        servicio.obtener_propiedades_por_tipo()
+        servicio.obtener_metricas_expertas()
+        servicio.obtener_top_asesores_revenue()
+        servicio.obtener_tunel_vencimientos()
+
+    return cargar
+
+
+PERIODO_CIERRE = "2999-12"
+
+
+def _cierre_periodo(ctx):
+    """Genera la liquidación mensual de la muestra de mandatos, una a una como la UI."""
+    servicio = ctx.servicio_financiero
+
+    def cerrar():
+        for id_contrato_m in ctx.mandatos_cierre:
+            servicio.generar_liquidacion_mensual(id_contrato_m, PERIODO_CIERRE, {}, "benchmark")
+
+    return cerrar
+
+
+def _limpiar_cierre(ctx):
+    with ctx.db.transaccion() as conn:
+        conn.execute("DELETE FROM MOVIMIENTOS_CUENTA_PROPIETARIO WHERE PERIODO = ?", (PERIODO_CIERRE,))
+        conn.execute("DELETE FROM LIQUIDACIONES WHERE PERIODO = ?", (PERIODO_CIERRE,))
+
+
+def _estado_cuenta_pdf(ctx):
+    """Estado de cuenta consolidado: datos del período, transformación y PDF élite (como PDFState)."""
+    from src.presentacion_reflex.state.pdf_state import PDFState
+
+    muestra = ctx.propietario_muestra
+    transformar = PDFState._transform_consolidated_to_pdf_format
+
+    def generar():
+        datos = ctx.servicio_financiero.obtener_datos_consolidados_para_pdf(
+            muestra["id_propietario"], muestra["periodo"]
+        )
+        return ctx.pdf_service.generar_estado_cuenta_elite(transformar(None, datos))
+
+    return generar
+
+
+def _historial_propietario(ctx):
+    muestra = ctx.propietario_muestra
+    return lambda: ctx.servicio_financiero.obtener_resumen_periodos_propietario(
+        muestra["id_propietario"], "2000-01", muestra["periodo"]
+    )
+
+
+def _construccion_por_evento(ctx):
+    """Cableado completo de ServicioFinanciero y ServicioAlertas: lo que cada evento pagaba sin contenedor."""
+    from src.aplicacion.contenedor import ContenedorAplicacion
+
+    def construir():
+        contenedor = ContenedorAplicacion(ctx.db)
+        return contenedor.servicio_financiero, contenedor.servicio_alertas
+
+    return construir
+
+
+def _reporte_propiedades(ctx):
+    return lambda: ctx.repo_propiedad.listar_con_filtros(solo_activas=True)
+
+
+def _reporte_personas(ctx):
+    return lambda: ctx.repo_persona.obtener_todos(solo_activos=True)
+
+
+ESCENARIOS: List[Escenario] = [
+    Escenario("listado_recaudos", "Primera página de recaudos", _listado_recaudos),
+    Escenario(
+        "listado_recaudos_filtrado",
+        "Recaudos aplicados desde el año pasado filtrados por dirección",
+        _listado_recaudos_filtrado,
+    ),
+    Escenario("listado_liquidaciones", "Primera página de liquidaciones", _listado_liquidaciones),
+    Escenario(
+        "listado_contratos_arrendamiento",
+        "Primera página de contratos de arrendamiento activos",
+        _listado_contratos_arrendamiento,
+    ),
+    Escenario("dashboard_kpis", "Carga completa del dashboard sin caché", _dashboard_kpis, repeticiones=5),
+    Escenario(
+        "cierre_periodo",
+        "Liquidación mensual de 200 mandatos",
+        _cierre_periodo,
+        limpiar=_limpiar_cierre,
+        repeticiones=3,
+    ),
+    Escenario(
+        "estado_cuenta_pdf",
+        "Estado de cuenta consolidado del propietario con más inmuebles (datos + PDF)",
+        _estado_cuenta_pdf,
+        repeticiones=5,
+    ),
+    Escenario(
+        "historial_propietario",
+        "Resumen por período de toda la historia de un propietario",
+        _historial_propietario,
+    ),
+    Escenario(
+        "construccion_por_evento",
+        "Construcción de la cadena de repositorios y servicios de un handler",
+        _construccion_por_evento,
+        repeticiones=50,
+    ),
+    Escenario("reporte_propiedades", "Reporte de propiedades activas", _reporte_propiedades, repeticiones=5),
+    Escenario("reporte_personas", "Reporte de personas activas", _reporte_personas, repeticiones=5),
+]
@@ -0,0 +1,235 @@
+"""
+Benchmark de lecturas y escrituras concurrentes sobre SQLite.
+
+Lectores y escritores en hilos contra el mismo archivo durante `segundos`,
+de dos formas:
+
+- por_hilo: una conexión por hilo sin perfil (journal DELETE, timeout por
+  defecto de sqlite3), como DatabaseManager sin sqlite_produccion
+- produccion: PerfilSQLite (WAL y pragmas), lecturas desde PoolLecturas y
+  escrituras por turno de ColaEscritura
+
+Cada lector suma los montos de un contrato al azar (índice por contrato);
+cada escritor inserta un movimiento y actualiza el saldo del contrato en una
+transacción. Se reportan operaciones por segundo, p95 y errores
+("database is locked").
+
+Uso:
+    python -m tests.benchmarks.sqlite_concurrencia --lectores 24 --escritores 4 --segundos 5
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.infraestructura.persistencia.sqlite_produccion import (
+    ColaEscritura,
+    PerfilSQLite,
+    PoolLecturas,
+)
+
+CONTRATOS = 500
+
+
+def crear_base(ruta: Path, filas: int) -> None:
+    conn = sqlite3.connect(str(ruta))
+    conn.executescript(
+        """
+        CREATE TABLE SALDOS (ID_CONTRATO INTEGER PRIMARY KEY, SALDO INTEGER NOT NULL);
+        CREATE TABLE MOVIMIENTOS (
+            ID_MOVIMIENTO INTEGER PRIMARY KEY, ID_CONTRATO INTEGER NOT NULL,
+            MONTO INTEGER NOT NULL, CREATED_AT TEXT
+        );
+        CREATE INDEX IDX_MOVIMIENTOS_CONTRATO ON MOVIMIENTOS (ID_CONTRATO);
+        """
+    )
+    conn.executemany("INSERT INTO SALDOS VALUES (?, 0)", ((i,) for i in range(1, CONTRATOS + 1)))
+    conn.executemany(
+        "INSERT INTO MOVIMIENTOS (ID_CONTRATO, MONTO, CREATED_AT) VALUES (?, ?, '2026-01-01')",
+        ((i % CONTRATOS + 1, 1000 + i % 97) for i in range(filas)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _leer(conn: Any, aleatorio: random.Random) -> None:
+    conn.execute(
+        "SELECT COUNT(*), SUM(MONTO) FROM MOVIMIENTOS WHERE ID_CONTRATO = ?",
+        (aleatorio.randint(1, CONTRATOS),),
+    ).fetchone()
+
+
+def _escribir(conn: Any, aleatorio: random.Random) -> None:
+    contrato = aleatorio.randint(1, CONTRATOS)
+    try:
+        conn.execute(
+            "INSERT INTO MOVIMIENTOS (ID_CONTRATO, MONTO, CREATED_AT) VALUES (?, 1000, datetime('now'))",
+            (contrato,),
+        )
+        conn.execute("UPDATE SALDOS SET SALDO = SALDO + 1000 WHERE ID_CONTRATO = ?", (contrato,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+class _Variante:
+    """Cómo obtiene cada hilo su conexión de lectura y su turno de escritura."""
+
+    def __init__(self, nombre: str, ruta: Path, lectores: int):
+        self.nombre = nombre
+        self._locales = threading.local()
+        self._abiertas: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        if nombre == "produccion":
+            self.perfil = PerfilSQLite(ruta)
+            self.perfil.preparar("ninguna")
+            self.pool = PoolLecturas(lambda: self.perfil.conectar(solo_lectura=True), tamano=min(lectores, 8))
+            self.cola = ColaEscritura()
+        else:
+            self.ruta = ruta
+
+    def _conexion_hilo(self) -> sqlite3.Connection:
+        conn = getattr(self._locales, "conn", None)
+        if conn is None:
+            if self.nombre == "produccion":
+                conn = self.perfil.conectar()
+            else:
+                conn = sqlite3.connect(str(self.ruta), check_same_thread=False)
+            self._locales.conn = conn
+            with self._lock:
+                self._abiertas.append(conn)
+        return conn
+
+    @contextmanager
+    def lectura(self):
+        if self.nombre == "produccion":
+            with self.pool.conexion() as conn:
+                yield conn
+        else:
+            yield self._conexion_hilo()
+
+    @contextmanager
+    def escritura(self):
+        if self.nombre == "produccion":
+            with self.cola.turno():
+                yield self._conexion_hilo()
+        else:
+            yield self._conexion_hilo()
+
+    def cerrar(self) -> None:
+        for conn in self._abiertas:
+            conn.close()
+        if self.nombre == "produccion":
+            self.pool.cerrar()
+
+
+def _percentil(valores: List[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method="inclusive")[int(p) - 1]
+
+
+def _trabajador(
+    fin: float, operacion: Callable[[random.Random], None], semilla: int, tiempos: List[float], errores: List[str]
+) -> None:
+    aleatorio = random.Random(semilla)
+    while time.perf_counter() < fin:
+        inicio = time.perf_counter()
+        try:
+            operacion(aleatorio)
+        except (sqlite3.OperationalError, TimeoutError) as e:
+            errores.append(str(e))
+            continue
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+
+
+def medir_variante(nombre: str, filas: int, lectores: int, escritores: int, segundos: float) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = Path(directorio) / "concurrencia.db"
+        crear_base(ruta, filas)
+        variante = _Variante(nombre, ruta, lectores)
+
+        def leer(aleatorio):
+            with variante.lectura() as conn:
+                _leer(conn, aleatorio)
+
+        def escribir(aleatorio):
+            with variante.escritura() as conn:
+                _escribir(conn, aleatorio)
+
+        lecturas: List[float] = []
+        escrituras: List[float] = []
+        errores: List[str] = []
+        fin = time.perf_counter() + segundos
+        hilos = [
+            threading.Thread(target=_trabajador, args=(fin, leer, i, lecturas, errores)) for i in range(lectores)
+        ] + [
+            threading.Thread(target=_trabajador, args=(fin, escribir, 1000 + i, escrituras, errores))
+            for i in range(escritores)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        variante.cerrar()
+
+        return {
+            "lecturas_por_segundo": round(len(lecturas) / segundos),
+            "escrituras_por_segundo": round(len(escrituras) / segundos),
+            "lectura_p95_ms": round(_percentil(lecturas, 95), 2),
+            "escritura_p95_ms": round(_percentil(escrituras, 95), 2),
+            "errores": len(errores),
+            "bloqueos": sum("locked" in e for e in errores),
+        }
+
+
+def medir_concurrencia(
+    filas: int = 50_000, lectores: int = 24, escritores: int = 4, segundos: float = 5.0
+) -> Dict[str, Any]:
+    return {
+        "filas": filas,
+        "lectores": lectores,
+        "escritores": escritores,
+        "segundos": segundos,
+        "variantes": {
+            nombre: medir_variante(nombre, filas, lectores, escritores, segundos)
+            for nombre in ("por_hilo", "produccion")
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Lecturas y escrituras concurrentes en SQLite")
+    parser.add_argument("--filas", type=int, default=50_000)
+    parser.add_argument("--lectores", type=int, default=24)
+    parser.add_argument("--escritores", type=int, default=4)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--salida", type=Path, help="Archivo JSON de resultados")
+    args = parser.parse_args(argv)
+
+    resultados = medir_concurrencia(args.filas, args.lectores, args.escritores, args.segundos)
+    for nombre, r in resultados["variantes"].items():
+        print(
+            f"{nombre:<12} {r['lecturas_por_segundo']:>8} lect/s  {r['escrituras_por_segundo']:>6} escr/s  "
+            f"p95 lectura {r['lectura_p95_ms']:>8.2f} ms  p95 escritura {r['escritura_p95_ms']:>8.2f} ms  "
+            f"errores {r['errores']} (bloqueos {r['bloqueos']})"
+        )
+    if args.salida:
+        args.salida.write_text(json.dumps(resultados, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
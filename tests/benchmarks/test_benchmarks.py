@@ -0,0 +1,88 @@
+"""
+Tests del arnés de benchmarks.
+
+Verifican que el generador es determinista y que todos los escenarios corren
+sobre una base mínima (no miden tiempos).
+"""
+
+import sqlite3
+from datetime import date
+
+from tests.benchmarks.datos_sinteticos import Escala, crear_base_sqlite
+from tests.benchmarks.ejecutar import comparar, ejecutar
+from tests.benchmarks.escenarios import ESCENARIOS, BaseDatosBenchmark
+
+MINIMA = Escala("XS", propiedades=30, personas=90, recaudos=300, anios_liquidaciones=1, asesores=3)
+
+
+def _volcar(ruta, tabla):
+    """Filas de la tabla sin las columnas que llena el reloj (DEFAULT CURRENT_TIMESTAMP)."""
+    conn = sqlite3.connect(str(ruta))
+    try:
+        columnas = [
+            c[1]
+            for c in conn.execute(f"PRAGMA table_info({tabla})")
+            if "CURRENT_TIMESTAMP" not in str(c[4] or "").upper()
+        ]
+        return conn.execute(f"SELECT {', '.join(columnas)} FROM {tabla} ORDER BY 1").fetchall()
+    finally:
+        conn.close()
+
+
+def test_generador_determinista(tmp_path):
+    """Test: Misma escala, semilla y fecha de referencia producen los mismos datos."""
+    referencia = date(2025, 6, 1)
+    conteos = crear_base_sqlite(tmp_path / "a.db", MINIMA, 7, referencia)
+    crear_base_sqlite(tmp_path / "b.db", MINIMA, 7, referencia)
+
+    assert conteos["PROPIEDADES"] == 30
+    assert conteos["LIQUIDACIONES"] == 30 * 12
+    for tabla in ("PERSONAS", "CONTRATOS_ARRENDAMIENTOS", "RECAUDOS", "LIQUIDACIONES"):
+        assert _volcar(tmp_path / "a.db", tabla) == _volcar(tmp_path / "b.db", tabla)
+
+
+def test_todos_los_escenarios_corren(tmp_path):
+    """Test: Cada escenario se ejecuta sin errores y el cierre deja la base como estaba."""
+    ruta = tmp_path / "bench.db"
+    crear_base_sqlite(ruta, MINIMA)
+    db = BaseDatosBenchmark(ruta)
+
+    resultados = ejecutar("XS", db, "sqlite", repeticiones=1)
+
+    assert set(resultados["escenarios"]) == {e.nombre for e in ESCENARIOS}
+    assert db.obtener_conexion().execute(
+        "SELECT COUNT(*) FROM LIQUIDACIONES WHERE PERIODO = '2999-12'"
+    ).fetchone()[0] == 0
+    db.cerrar_todas_conexiones()
+
+
+def test_comparar_detecta_regresiones():
+    """Test: Solo cuenta como regresión lo que supera tolerancia y umbral absoluto."""
+    baseline = {"escenarios": {"a": {"mediana_ms": 100.0}, "b": {"mediana_ms": 1.0}}}
+    resultados = {"escenarios": {"a": {"mediana_ms": 140.0}, "b": {"mediana_ms": 3.0}, "c": {"mediana_ms": 9.0}}}
+
+    (regresion,) = comparar(resultados, baseline, tolerancia=0.25)
+
+    assert regresion["escenario"] == "a"
+    assert regresion["cambio"] == 0.4
+
+
+def test_benchmark_entidades_memoria():
+    """Test: Las tres cargas corren y el registro retiene menos memoria que el dataclass."""
+    from tests.benchmarks.entidades_memoria import medir_carga
+
+    variantes = medir_carga(filas=500, repeticiones=1)["variantes"]
+
+    assert set(variantes) == {"dataclass_dict", "dataclass_mapeador", "registro"}
+    assert variantes["registro"]["bytes_por_entidad"] < variantes["dataclass_mapeador"]["bytes_por_entidad"]
+
+
+def test_benchmark_sqlite_concurrencia():
+    """Test: Ambas variantes corren con lectores y escritores concurrentes sin errores."""
+    from tests.benchmarks.sqlite_concurrencia import medir_concurrencia
+
+    variantes = medir_concurrencia(filas=500, lectores=4, escritores=2, segundos=0.3)["variantes"]
+
+    assert set(variantes) == {"por_hilo", "produccion"}
+    assert variantes["produccion"]["errores"] == 0
+    assert variantes["produccion"]["escrituras_por_segundo"] > 0
@@ -0,0 +1,105 @@
+"""
+Tests de integración para la generación masiva de cargos mensuales.
+
+Verifican que la generación por lotes es idempotente por (contrato, período,
+concepto), que omite contratos sin canon y que deja conceptos y cartera en
+mora igual que el registro individual de recaudos.
+"""
+import pytest
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.infraestructura.persistencia.repositorio_recaudo_sqlite import (
+    PREFIJO_CARGO_MASIVO,
+    RepositorioRecaudoSQLite,
+)
+
+PERIODO = "2026-03"
+
+
+@pytest.fixture
+def db(tmp_path):
+    db_manager = TestDatabaseManager(str(tmp_path / "test_cargos_mensuales.db"))
+    db_manager.obtener_conexion().executescript(
+        """
+        CREATE TABLE CONTRATOS_ARRENDAMIENTOS (
+            ID_CONTRATO_A INTEGER PRIMARY KEY, ID_PROPIEDAD INTEGER, ID_ARRENDATARIO INTEGER,
+            CANON_ARRENDAMIENTO INTEGER, FECHA_INICIO_CONTRATO_A TEXT,
+            FECHA_FIN_CONTRATO_A TEXT, ESTADO_CONTRATO_A TEXT
+        );
+        INSERT INTO CONTRATOS_ARRENDAMIENTOS VALUES
+            (1, 1, 1, 1000000, '2026-01-10', NULL, 'Activo'),
+            (2, 2, 1, 1500000, '2026-01-05', NULL, 'Activo'),
+            (3, 3, 1, 0, '2026-01-05', NULL, 'Activo'),
+            (4, 4, 1, 900000, '2026-01-05', NULL, 'Finalizado');
+        """
+    )
+    yield db_manager
+    db_manager.cerrar_todas_conexiones()
+
+
+def _generar(repo, progreso=None):
+    return repo.generar_cargos_mensuales(
+        PERIODO, "2026-03-01", f"{PREFIJO_CARGO_MASIVO}Marzo de 2026", "tester", progreso
+    )
+
+
+def _recaudos(db):
+    return db.obtener_conexion().execute(
+        "SELECT r.ID_RECAUDO, r.ID_CONTRATO_A, r.VALOR_TOTAL, rc.PERIODO, rc.VALOR "
+        "FROM RECAUDOS r JOIN RECAUDO_CONCEPTOS rc ON rc.ID_RECAUDO = r.ID_RECAUDO "
+        "ORDER BY r.ID_CONTRATO_A"
+    ).fetchall()
+
+
+def test_generar_es_idempotente_y_omite_contratos_sin_canon(db):
+    """Test: Repetir la generación del período no duplica cargos."""
+    repo = RepositorioRecaudoSQLite(db)
+
+    primero = _generar(repo)
+    segundo = _generar(repo)
+
+    assert primero == {"activos": 3, "creados": 2, "omitidos": 0, "invalidos": 1}
+    assert segundo == {"activos": 3, "creados": 0, "omitidos": 2, "invalidos": 1}
+    assert [tuple(f)[1:] for f in _recaudos(db)] == [
+        (1, 1_000_000, PERIODO, 1_000_000),
+        (2, 1_500_000, PERIODO, 1_500_000),
+    ]
+    enlazados = db.obtener_conexion().execute(
+        "SELECT ID_CONTRATO_A, ID_RECAUDO FROM CARGOS_MENSUALES ORDER BY ID_CONTRATO_A"
+    ).fetchall()
+    assert [tuple(f) for f in enlazados] == [
+        (f["ID_CONTRATO_A"], f["ID_RECAUDO"]) for f in _recaudos(db)
+    ]
+
+
+def test_generar_aplica_pagos_en_cartera_mora(db):
+    """Test: Los cargos generados quedan abonados en el libro de cartera."""
+    repo = RepositorioRecaudoSQLite(db)
+    repo.cartera_mora.reconstruir("2026-03-20")
+
+    _generar(repo)
+
+    filas = db.obtener_conexion().execute(
+        "SELECT ID_CONTRATO_A, VALOR_PAGADO, SALDO FROM CARTERA_MORA WHERE PERIODO = ? "
+        "ORDER BY ID_CONTRATO_A",
+        (PERIODO,),
+    ).fetchall()
+    assert [tuple(f) for f in filas if f["ID_CONTRATO_A"] in (1, 2)] == [
+        (1, 1_000_000, 0),
+        (2, 1_500_000, 0),
+    ]
+
+
+def test_eliminar_recaudo_generado_permite_regenerarlo(db):
+    """Test: Un cargo masivo eliminado se vuelve a generar; los demás se omiten."""
+    repo = RepositorioRecaudoSQLite(db)
+    _generar(repo)
+    id_recaudo = _recaudos(db)[0]["ID_RECAUDO"]
+
+    repo.eliminar(id_recaudo, "tester")
+    avances = []
+    resultado = _generar(repo, lambda porcentaje, etapa: avances.append(porcentaje))
+
+    assert (resultado["creados"], resultado["omitidos"]) == (1, 1)
+    assert [f["ID_CONTRATO_A"] for f in _recaudos(db)] == [1, 2]
+    assert avances[-1] == 100 and avances == sorted(avances)
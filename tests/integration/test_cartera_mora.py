@@ -0,0 +1,214 @@
+"""
+Tests de integración para el libro de cartera en mora (CARTERA_MORA).
+
+Verifican la causación de cargos y mora, la actualización incremental al
+registrar, reversar o eliminar recaudos y el verificador contra la vista
+VW_ALERTA_MORA_DIARIA.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.dominio.entidades.recaudo import Recaudo
+from src.dominio.entidades.recaudo_concepto import RecaudoConcepto
+from src.dominio.servicios.calculadora_mora import interes_mora
+from src.infraestructura.persistencia.repositorio_recaudo_sqlite import RepositorioRecaudoSQLite
+
+CANON = 1_000_000
+
+
+@pytest.fixture
+def db(tmp_path):
+    db_manager = TestDatabaseManager(str(tmp_path / "test_cartera_mora.db"))
+    conn = db_manager.obtener_conexion()
+    conn.executescript(
+        """
+        CREATE TABLE MUNICIPIOS (ID_MUNICIPIO INTEGER PRIMARY KEY, NOMBRE_MUNICIPIO TEXT);
+        CREATE TABLE PERSONAS (
+            ID_PERSONA INTEGER PRIMARY KEY, NOMBRE_COMPLETO TEXT, TELEFONO_PRINCIPAL TEXT
+        );
+        CREATE TABLE ARRENDATARIOS (ID_ARRENDATARIO INTEGER PRIMARY KEY, ID_PERSONA INTEGER);
+        CREATE TABLE PROPIEDADES (
+            ID_PROPIEDAD INTEGER PRIMARY KEY, DIRECCION_PROPIEDAD TEXT, ID_MUNICIPIO INTEGER
+        );
+        CREATE TABLE CONTRATOS_ARRENDAMIENTOS (
+            ID_CONTRATO_A INTEGER PRIMARY KEY, ID_PROPIEDAD INTEGER, ID_ARRENDATARIO INTEGER,
+            CANON_ARRENDAMIENTO INTEGER, FECHA_INICIO_CONTRATO_A TEXT,
+            FECHA_FIN_CONTRATO_A TEXT, ESTADO_CONTRATO_A TEXT
+        );
+        INSERT INTO MUNICIPIOS VALUES (1, 'Medellín');
+        INSERT INTO PERSONAS VALUES (1, 'Ana Pérez', '3000000000');
+        INSERT INTO ARRENDATARIOS VALUES (1, 1);
+        INSERT INTO PROPIEDADES VALUES (1, 'Calle 10 # 20-30', 1);
+        """
+    )
+    yield db_manager
+    db_manager.cerrar_todas_conexiones()
+
+
+def _contrato(db, id_contrato, inicio, estado="Activo"):
+    db.obtener_conexion().execute(
+        "INSERT INTO CONTRATOS_ARRENDAMIENTOS VALUES (?, 1, 1, ?, ?, NULL, ?)",
+        (id_contrato, CANON, inicio, estado),
+    )
+
+
+def _pagar(repo, id_contrato, *periodos):
+    recaudo = Recaudo(
+        id_contrato_a=id_contrato,
+        fecha_pago="2026-03-20",
+        valor_total=CANON * len(periodos),
+        metodo_pago="Efectivo",
+    )
+    conceptos = [RecaudoConcepto(tipo_concepto="Canon", periodo=p, valor=CANON) for p in periodos]
+    return repo.crear(recaudo, conceptos, "tester").id_recaudo
+
+
+def _fila(db, id_contrato, periodo):
+    return db.obtener_conexion().execute(
+        "SELECT SALDO, DIAS_MORA, INTERES_MORA, CAUSADO FROM CARTERA_MORA "
+        "WHERE ID_CONTRATO_A = ? AND PERIODO = ?",
+        (id_contrato, periodo),
+    ).fetchone()
+
+
+def test_reconstruir_causa_periodos_vencidos_con_interes(db):
+    """Test: La carga inicial crea un cargo por período vencido con días e interés."""
+    repo = RepositorioRecaudoSQLite(db)
+    _contrato(db, 1, "2026-01-10")
+    _contrato(db, 2, "2026-01-10", estado="Finalizado")
+
+    assert repo.cartera_mora.reconstruir("2026-03-20") == 3
+
+    enero = _fila(db, 1, "2026-01")
+    assert (enero["SALDO"], enero["DIAS_MORA"]) == (CANON, 69)
+    assert enero["INTERES_MORA"] == interes_mora(CANON, 69)
+    assert repo.cartera_mora.obtener_resumen()["monto_total"] == 3 * CANON
+    (moroso,) = repo.cartera_mora.listar_contratos_en_mora()
+    assert (moroso["nombre"], moroso["dias_retraso"]) == ("Ana Pérez", 69)
+    (zona,) = repo.cartera_mora.obtener_morosidad_por_zona()
+    assert zona == {"zona": "Medellín", "contratos": 1, "monto": 3 * CANON}
+
+
+def test_recaudo_pagar_reversar_y_eliminar_actualiza_saldos(db):
+    """Test: Crear, reversar y eliminar recaudos ajustan solo las filas de sus períodos."""
+    repo = RepositorioRecaudoSQLite(db)
+    _contrato(db, 1, "2026-01-10")
+    repo.cartera_mora.reconstruir("2026-03-20")
+
+    id_recaudo = _pagar(repo, 1, "2026-02")
+    assert tuple(_fila(db, 1, "2026-02"))[:3] == (0, 0, 0)
+    assert _fila(db, 1, "2026-01")["SALDO"] == CANON
+
+    # La reversa devuelve la mora a la fecha de la última causación
+    repo.cambiar_estado(id_recaudo, "Reversado", "tester")
+    assert tuple(_fila(db, 1, "2026-02"))[:3] == (CANON, 38, interes_mora(CANON, 38))
+
+    # Eliminar un recaudo ya reversado no descuenta dos veces
+    repo.eliminar(id_recaudo, "tester")
+    assert _fila(db, 1, "2026-02")["SALDO"] == CANON
+
+    id_recaudo = _pagar(repo, 1, "2026-01")
+    repo.eliminar(id_recaudo, "tester")
+    assert _fila(db, 1, "2026-01")["SALDO"] == CANON
+
+
+def test_causacion_diaria_es_idempotente_y_respeta_pagos_anticipados(db):
+    """Test: Cada período se causa una vez y un pago anticipado no se pierde."""
+    repo = RepositorioRecaudoSQLite(db)
+    _contrato(db, 1, "2026-01-10")
+    repo.cartera_mora.reconstruir("2026-03-20")
+
+    assert repo.cartera_mora.causar("2026-04-10")["cargos_creados"] == 1
+    assert repo.cartera_mora.causar("2026-04-11")["cargos_creados"] == 0
+    assert _fila(db, 1, "2026-01")["DIAS_MORA"] == 91
+
+    _pagar(repo, 1, "2026-05")
+    assert _fila(db, 1, "2026-05")["CAUSADO"] == 0
+
+    assert repo.cartera_mora.causar("2026-05-10")["cargos_creados"] == 1
+    assert tuple(_fila(db, 1, "2026-05")) == (0, 0, 0, 1)
+    assert repo.cartera_mora.obtener_resumen()["cantidad_contratos"] == 1
+
+
+def test_primera_causacion_carga_la_mora_existente(db):
+    """Test: Con el libro vacío, la primera causación incluye cánones impagos anteriores."""
+    repo = RepositorioRecaudoSQLite(db)
+    _contrato(db, 1, "2026-01-10")
+    _pagar(repo, 1, "2026-02")
+
+    assert repo.cartera_mora.causar("2026-03-20")["cargos_creados"] == 3
+
+    enero = _fila(db, 1, "2026-01")
+    assert (enero["SALDO"], enero["DIAS_MORA"], enero["CAUSADO"]) == (CANON, 69, 1)
+    assert tuple(_fila(db, 1, "2026-02")) == (0, 0, 0, 1)
+    assert repo.cartera_mora.obtener_resumen()["monto_total"] == 2 * CANON
+    assert repo.cartera_mora.causar("2026-03-21")["cargos_creados"] == 0
+
+
+def test_verificar_consistencia_contra_vista(db):
+    """Test: El verificador reporta los contratos cuyo saldo difiere de la vista."""
+    hoy = date.today()
+    inicio = (hoy - timedelta(days=40)).isoformat()
+    _contrato(db, 1, inicio)
+    _contrato(db, 2, inicio)
+    conn = db.obtener_conexion()
+    conn.executescript(
+        """
+        CREATE TABLE RECAUDO_ARRENDAMIENTO (
+            ID_RECAUDO INTEGER PRIMARY KEY, ID_CONTRATO_A INTEGER, VALOR_RECAUDO INTEGER,
+            FECHA_VENCIMIENTO_RECAUDO TEXT, ESTADO_RECAUDO TEXT
+        );
+        CREATE VIEW VW_ALERTA_MORA_DIARIA AS
+        SELECT r.ID_RECAUDO, ca.ID_CONTRATO_A, p.DIRECCION_PROPIEDAD,
+               arr_p.NOMBRE_COMPLETO AS ARRENDATARIO, arr_p.TELEFONO_PRINCIPAL,
+               r.VALOR_RECAUDO, r.FECHA_VENCIMIENTO_RECAUDO,
+               CAST((julianday('now') - julianday(r.FECHA_VENCIMIENTO_RECAUDO)) AS INTEGER)
+                   AS DIAS_RETRASO
+        FROM RECAUDO_ARRENDAMIENTO r
+        JOIN CONTRATOS_ARRENDAMIENTOS ca ON r.ID_CONTRATO_A = ca.ID_CONTRATO_A
+        JOIN PROPIEDADES p ON ca.ID_PROPIEDAD = p.ID_PROPIEDAD
+        JOIN ARRENDATARIOS arr ON ca.ID_ARRENDATARIO = arr.ID_ARRENDATARIO
+        JOIN PERSONAS arr_p ON arr.ID_PERSONA = arr_p.ID_PERSONA
+        WHERE r.ESTADO_RECAUDO IN ('Pendiente', 'Mora')
+        AND r.FECHA_VENCIMIENTO_RECAUDO < date('now');
+        """
+    )
+    repo = RepositorioRecaudoSQLite(db)
+    repo.cartera_mora.reconstruir(hoy.isoformat())
+    saldo_contrato_1 = conn.execute(
+        "SELECT SUM(SALDO) FROM CARTERA_MORA WHERE ID_CONTRATO_A = 1 AND DIAS_MORA > 0"
+    ).fetchone()[0]
+    conn.execute(
+        "INSERT INTO RECAUDO_ARRENDAMIENTO VALUES (1, 1, ?, ?, 'Pendiente')",
+        (saldo_contrato_1, inicio),
+    )
+
+    resultado = repo.cartera_mora.verificar_consistencia()
+
+    assert not resultado["consistente"]
+    assert resultado["contratos_revisados"] == 2
+    assert [d["id_contrato"] for d in resultado["diferencias"]] == [2]
+
+
+def test_pagos_canon_lee_filas_dict_de_postgresql(db):
+    """Test: Los pagos de canon se leen por columna (filas dict de PostgreSQL)."""
+
+    class _CursorPostgreSQL:
+        def execute(self, sql, params=None):
+            pass
+
+        def fetchall(self):
+            return [
+                {"ID_CONTRATO_A": 1, "ESTADO_RECAUDO": "Aplicado", "PERIODO": "2026-01", "VALOR": CANON},
+                {"ID_CONTRATO_A": 1, "ESTADO_RECAUDO": "Aplicado", "PERIODO": "2026-02", "VALOR": 500},
+            ]
+
+    repo = RepositorioRecaudoSQLite(db)
+
+    assert repo._pagos_canon(_CursorPostgreSQL(), 7) == (
+        1,
+        "Aplicado",
+        [("2026-01", CANON), ("2026-02", 500)],
+    )
@@ -0,0 +1,139 @@
+"""
+Tests de integración para el contenedor de la aplicación y la verificación de esquema.
+
+Verifican que los servicios se cablean una sola vez y que el DDL de los
+repositorios corre en el paso de arranque y no en cada instanciación.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from reflex.app_mixins.lifespan import LifespanMixin
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.aplicacion.contenedor import ContenedorAplicacion
+from src.infraestructura.persistencia import database
+from src.infraestructura.persistencia.esquema import (
+    asegurar_esquema,
+    olvidar_esquema,
+    verificar_esquema,
+    verificar_esquema_al_iniciar,
+)
+from src.infraestructura.persistencia.repositorio_desocupacion_sqlite import (
+    RepositorioDesocupacionSQLite,
+)
+from src.infraestructura.persistencia.repositorio_poliza_sqlite import RepositorioPolizaSQLite
+from src.infraestructura.persistencia.repositorio_recaudo_sqlite import RepositorioRecaudoSQLite
+
+
+@pytest.fixture
+def db(tmp_path):
+    db_manager = TestDatabaseManager(str(tmp_path / "test_contenedor.db"))
+    yield db_manager
+    db_manager.cerrar_todas_conexiones()
+
+
+def _tablas(db):
+    filas = db.obtener_conexion().execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'"
+    ).fetchall()
+    return {f[0] for f in filas}
+
+
+def _sentencias(db, accion):
+    """SQL que ejecuta `accion` sobre la conexión del manager."""
+    sentencias = []
+    conexion = db.obtener_conexion()
+    conexion.set_trace_callback(sentencias.append)
+    try:
+        accion()
+    finally:
+        conexion.set_trace_callback(None)
+    return sentencias
+
+
+def test_verificar_esquema_crea_tablas_y_los_repositorios_no_repiten_ddl(db):
+    """Test: Tras el paso de arranque, construir repositorios no ejecuta SQL."""
+    claves = verificar_esquema(db)
+
+    assert {"RECAUDOS", "LIQUIDACIONES", "DESOCUPACIONES", "POLIZAS", "CARTERA_MORA"} <= set(claves)
+    assert {"RECAUDOS", "RECAUDO_CONCEPTOS", "DESOCUPACIONES", "POLIZAS"} <= _tablas(db)
+    assert _sentencias(
+        db,
+        lambda: (
+            RepositorioRecaudoSQLite(db),
+            RepositorioDesocupacionSQLite(db),
+            RepositorioPolizaSQLite(db),
+        ),
+    ) == []
+
+
+def test_asegurar_esquema_corre_una_vez_por_base(db, tmp_path):
+    """Test: El DDL se repite solo para otra base o tras olvidar lo verificado."""
+    llamadas = []
+    asegurar_esquema(db, "X", lambda: llamadas.append(1))
+    asegurar_esquema(db, "X", lambda: llamadas.append(2))
+    assert llamadas == [1]
+
+    otra = TestDatabaseManager(str(tmp_path / "otra.db"))
+    asegurar_esquema(otra, "X", lambda: llamadas.append(3))
+    olvidar_esquema(db)
+    asegurar_esquema(db, "X", lambda: llamadas.append(4))
+    assert llamadas == [1, 3, 4]
+
+
+def test_asegurar_esquema_reintenta_si_falla(db):
+    """Test: Un DDL fallido no queda marcado como verificado."""
+
+    def fallar():
+        raise RuntimeError("base bloqueada")
+
+    with pytest.raises(RuntimeError):
+        asegurar_esquema(db, "Y", fallar)
+    llamadas = []
+    asegurar_esquema(db, "Y", lambda: llamadas.append(1))
+    assert llamadas == [1]
+
+
+def test_contenedor_comparte_instancias(db):
+    """Test: Los servicios se construyen una vez y comparten sus repositorios."""
+    contenedor = ContenedorAplicacion(db)
+
+    financiero = contenedor.servicio_financiero
+    alertas = contenedor.servicio_alertas
+
+    assert contenedor.servicio_financiero is financiero
+    assert financiero.repo_propiedad is contenedor.repo_propiedad
+    assert alertas.servicio_contratos is contenedor.servicio_contratos
+    assert alertas.servicio_recibos.repo_propiedad is contenedor.repo_propiedad
+    assert alertas.repo_cartera_mora is contenedor.repo_recaudo.cartera_mora
+
+    contenedor.reiniciar()
+    assert contenedor.servicio_financiero is not financiero
+
+
+def test_verificar_esquema_al_iniciar_es_lifespan_task_valida(db, monkeypatch):
+    """Test: Reflex acepta la tarea de arranque y al entrar verifica el esquema."""
+    app = LifespanMixin()
+    app.register_lifespan_task(verificar_esquema_al_iniciar)
+    monkeypatch.setattr(database, "db_manager", db)
+
+    async def arrancar():
+        async with verificar_esquema_al_iniciar():
+            return _tablas(db)
+
+    assert {"RECAUDOS", "DESOCUPACIONES", "POLIZAS"} <= asyncio.run(arrancar())
+
+
+def test_contenedor_notifica_por_el_outbox(db):
+    """Test: El servicio de notificaciones del contenedor encola en el outbox que drena el despachador."""
+    contenedor = ContenedorAplicacion(db)
+    servicio = contenedor.servicio_notificaciones
+    recibo = SimpleNamespace(
+        id_recibo_publico=7, tipo_servicio="Energía", valor_recibo=150000, fecha_vencimiento="2026-01-15"
+    )
+
+    assert servicio.outbox is contenedor.repo_notificaciones_outbox
+    assert servicio.notificar_recibo_vencido_whatsapp(recibo, "573001234567", "Luis")
+    (pendiente,) = contenedor.repo_notificaciones_outbox.reclamar_lote("whatsapp", 10)
+    assert pendiente.referencia == "RECIBO_PUBLICO:7"
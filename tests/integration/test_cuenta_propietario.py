@@ -0,0 +1,196 @@
+"""
+Tests de integración para la cuenta corriente del propietario.
+
+Verifican que liquidaciones, pagos y saldos a favor registran movimientos con
+saldo acumulado y que el estado de cuenta del período se lee del libro.
+"""
+import threading
+import time
+
+import pytest
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.aplicacion.servicios.servicio_saldos_favor import ServicioSaldosFavor
+from src.dominio.entidades.liquidacion import Liquidacion
+from src.infraestructura.persistencia.esquema import olvidar_esquema
+from src.infraestructura.persistencia.repositorio_cuenta_propietario_sqlite import (
+    RepositorioCuentaPropietarioSQLite,
+)
+from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
+    RepositorioLiquidacionSQLite,
+)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db_manager = TestDatabaseManager(str(tmp_path / "test_cuenta_propietario.db"))
+    db_manager.obtener_conexion().executescript(
+        """
+        CREATE TABLE PERSONAS (
+            ID_PERSONA INTEGER PRIMARY KEY, NOMBRE_COMPLETO TEXT, NUMERO_DOCUMENTO TEXT,
+            TELEFONO_PRINCIPAL TEXT, CORREO_ELECTRONICO TEXT
+        );
+        CREATE TABLE PROPIETARIOS (
+            ID_PROPIETARIO INTEGER PRIMARY KEY, ID_PERSONA INTEGER, BANCO_PROPIETARIO TEXT,
+            NUMERO_CUENTA_PROPIETARIO TEXT, TIPO_CUENTA TEXT
+        );
+        CREATE TABLE PROPIEDADES (ID_PROPIEDAD INTEGER PRIMARY KEY, DIRECCION_PROPIEDAD TEXT);
+        CREATE TABLE CONTRATOS_MANDATOS (
+            ID_CONTRATO_M INTEGER PRIMARY KEY, ID_PROPIEDAD INTEGER, ID_PROPIETARIO INTEGER
+        );
+        CREATE TABLE SEGUROS (ID_SEGURO INTEGER PRIMARY KEY, PORCENTAJE_SEGURO INTEGER);
+        CREATE TABLE ARRENDATARIOS (ID_ARRENDATARIO INTEGER PRIMARY KEY, ID_SEGURO INTEGER);
+        CREATE TABLE CONTRATOS_ARRENDAMIENTOS (
+            ID_CONTRATO_A INTEGER PRIMARY KEY, ID_PROPIEDAD INTEGER, ID_ARRENDATARIO INTEGER,
+            ESTADO_CONTRATO_A TEXT
+        );
+        CREATE TABLE POLIZAS (ID_CONTRATO INTEGER, ID_SEGURO INTEGER, ESTADO TEXT);
+        CREATE TABLE SALDOS_FAVOR (
+            ID_SALDO_FAVOR INTEGER PRIMARY KEY AUTOINCREMENT, ID_PROPIETARIO INTEGER,
+            ID_ASESOR INTEGER, TIPO_BENEFICIARIO TEXT, VALOR_SALDO INTEGER, MOTIVO TEXT,
+            FECHA_GENERACION TEXT, ESTADO TEXT, FECHA_RESOLUCION TEXT, OBSERVACIONES TEXT,
+            CREATED_AT TEXT, CREATED_BY TEXT, UPDATED_AT TEXT, UPDATED_BY TEXT
+        );
+        INSERT INTO PERSONAS VALUES (1, 'Carlos Ruiz', '123', '300', 'c@velar.test');
+        INSERT INTO PROPIETARIOS VALUES (1, 1, 'Banco', '001', 'Ahorros');
+        INSERT INTO PROPIEDADES VALUES (1, 'Calle 1'), (2, 'Calle 2');
+        INSERT INTO CONTRATOS_MANDATOS VALUES (1, 1, 1), (2, 2, 1);
+        INSERT INTO SEGUROS VALUES (1, 200);
+        INSERT INTO ARRENDATARIOS VALUES (1, 1);
+        INSERT INTO CONTRATOS_ARRENDAMIENTOS VALUES (1, 1, 1, 'Activo');
+        """
+    )
+    yield db_manager
+    db_manager.cerrar_todas_conexiones()
+
+
+def _liquidar(repo, id_contrato_m, periodo, canon=1_000_000, comision=100_000):
+    liquidacion = Liquidacion(
+        id_contrato_m=id_contrato_m,
+        periodo=periodo,
+        fecha_generacion=f"{periodo}-28",
+        canon_bruto=canon,
+        comision_porcentaje=1000,
+        comision_monto=comision,
+    )
+    return repo.crear(liquidacion, "tester").id_liquidacion
+
+
+def test_liquidaciones_y_pagos_mueven_el_saldo(db):
+    """Test: Crear acredita el neto, pagar lo debita y el saldo queda acumulado."""
+    repo = RepositorioLiquidacionSQLite(db)
+    cuenta = repo.cuenta_propietario
+    id_1 = _liquidar(repo, 1, "2026-01")
+    _liquidar(repo, 2, "2026-01")
+    assert cuenta.obtener_saldo(1) == 1_800_000
+
+    repo.aprobar(id_1, "tester")
+    repo.marcar_como_pagada(id_1, "2026-02-05", "Transferencia", "REF1", "tester")
+    assert cuenta.obtener_saldo(1) == 900_000
+
+    historial = cuenta.listar_movimientos(1, "2000-01-01", "2999-12-31")
+    assert historial["saldo_inicial"] == 0
+    assert [m["tipo"] for m in historial["movimientos"]] == ["Liquidacion", "Liquidacion", "Pago"]
+    assert [m["saldo"] for m in historial["movimientos"]] == [900_000, 1_800_000, 900_000]
+
+
+def test_estado_de_cuenta_se_lee_del_libro(db):
+    """Test: El consolidado del período refleja ediciones y cancelaciones."""
+    repo = RepositorioLiquidacionSQLite(db)
+    id_1 = _liquidar(repo, 1, "2026-01")
+    id_2 = _liquidar(repo, 2, "2026-01")
+
+    liquidacion = repo.obtener_por_id(id_1)
+    liquidacion.gastos_reparaciones = 50_000
+    repo.actualizar(liquidacion, "tester")
+    repo.cancelar(id_2, "Duplicada", "tester")
+
+    datos = repo.obtener_consolidado_propietario(1, "2026-01")
+
+    assert datos["cantidad_propiedades"] == 1
+    (propiedad,) = datos["propiedades"]
+    assert propiedad["direccion"] == "Calle 1"
+    assert propiedad["gastos_rep"] == 50_000
+    assert propiedad["porcentaje_seguro"] == 200
+    assert datos["neto_pagar"] == 850_000
+    assert datos["total_egresos"] == 150_000
+    assert datos["saldo_cuenta"] == 850_000
+    assert repo.cuenta_propietario.resumir_periodos(1, "2026-01", "2026-12")[0]["neto_pagar"] == (
+        850_000
+    )
+
+
+def test_pago_masivo_por_propietario_debita_cada_liquidacion(db):
+    """Test: Marcar pagadas por propietario y período registra un pago por liquidación."""
+    repo = RepositorioLiquidacionSQLite(db)
+    _liquidar(repo, 1, "2026-01")
+    _liquidar(repo, 2, "2026-01")
+    repo.aprobar_por_propietario_y_periodo(1, "2026-01", "tester")
+
+    assert repo.marcar_como_pagadas_por_propietario(
+        1, "2026-01", "2026-02-05", "Transferencia", "REF", "tester"
+    ) == 2
+    assert repo.cuenta_propietario.obtener_saldo(1) == 0
+
+
+def test_saldos_a_favor_en_la_cuenta(db):
+    """Test: Registrar acredita; devolver y eliminar debitan."""
+    repo = RepositorioLiquidacionSQLite(db)
+    servicio = ServicioSaldosFavor(db)
+    saldo = servicio.registrar_saldo("Propietario", 1, 300_000, "Mayor valor cobrado")
+    otro = servicio.registrar_saldo("Propietario", 1, 100_000, "Ajuste")
+    assert repo.cuenta_propietario.obtener_saldo(1) == 400_000
+
+    servicio.devolver_saldo(saldo.id_saldo_favor, "Transferido")
+    servicio.eliminar_saldo(otro.id_saldo_favor)
+
+    resumen = servicio.obtener_resumen_propietario(1)
+    assert resumen["saldo_cuenta"] == 0
+    assert resumen["total_pendiente"] == 0
+
+
+def test_tabla_nueva_se_carga_desde_liquidaciones_existentes(db):
+    """Test: Al crear el libro en SQLite se reconstruye con la historia existente."""
+    repo = RepositorioLiquidacionSQLite(db)
+    id_1 = _liquidar(repo, 1, "2026-01")
+    _liquidar(repo, 2, "2026-02")
+    repo.aprobar(id_1, "tester")
+    repo.marcar_como_pagada(id_1, "2026-02-05", "Transferencia", "REF1", "tester")
+    db.obtener_conexion().execute("DROP TABLE MOVIMIENTOS_CUENTA_PROPIETARIO")
+    # El esquema se verifica una vez por proceso: simular una base sin el libro
+    olvidar_esquema(db)
+
+    cuenta = RepositorioCuentaPropietarioSQLite(db)
+
+    historial = cuenta.listar_movimientos(1, "2026-01-01", "2026-12-31")
+    assert [(m["fecha"], m["tipo"]) for m in historial["movimientos"]] == [
+        ("2026-01-28", "Liquidacion"),
+        ("2026-02-05", "Pago"),
+        ("2026-02-28", "Liquidacion"),
+    ]
+    assert historial["saldo_final"] == 900_000
+
+
+def test_movimientos_concurrentes_del_mismo_propietario_no_pierden_saldo(db):
+    """Test: Con dos conexiones, la segunda espera al propietario y parte del saldo confirmado."""
+    cuenta = RepositorioCuentaPropietarioSQLite(db)
+    otra_db = TestDatabaseManager(str(db.database_path))
+    otra_cuenta = RepositorioCuentaPropietarioSQLite(otra_db)
+
+    conn = db.obtener_conexion()
+    cuenta.registrar_saldo_favor(conn, 1, 1, 100_000, "Pendiente", "Primero", "tester")
+
+    def registrar_en_otra_conexion():
+        with otra_db.transaccion() as otra_conn:
+            otra_cuenta.registrar_saldo_favor(otra_conn, 1, 2, 50_000, "Pendiente", "Segundo", "tester")
+
+    hilo = threading.Thread(target=registrar_en_otra_conexion)
+    hilo.start()
+    time.sleep(0.2)  # la otra conexión queda esperando el bloqueo
+    conn.commit()
+    hilo.join(5)
+    otra_db.cerrar_todas_conexiones()
+
+    historial = cuenta.listar_movimientos(1, "2000-01-01", "2999-12-31")
+    assert [m["saldo"] for m in historial["movimientos"]] == [100_000, 150_000]
+    assert cuenta.obtener_saldo(1) == 150_000
@@ -53,6 +53,21 @@ class TestDatabaseManager:
             conexion.rollback()
             raise e
     
+    # API de cursores de DatabaseManager en modo SQLite (la usan los repositorios)
+    use_postgresql = False
+
+    def get_placeholder(self) -> str:
+        return "?"
+
+    def get_dict_cursor(self, conn):
+        return conn.cursor()
+
+    def get_last_insert_id(self, cursor, table_name=None, id_column=None) -> int:
+        return cursor.lastrowid
+
+    def execute_query_one(self, query, params=()):
+        return self.obtener_conexion().execute(query, params).fetchone()
+
     def cerrar_todas_conexiones(self) -> None:
         """Cierra la conexión."""
         if self._connection:
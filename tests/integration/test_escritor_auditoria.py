@@ -0,0 +1,160 @@
+"""
+Tests de integración para el escritor de auditoría por lotes.
+
+Verifican que las filas se insertan por lotes fuera de la operación, que el
+buffer no crece más allá de su límite y que un lote fallido no se pierde.
+"""
+from contextlib import contextmanager
+
+import pytest
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.infraestructura.persistencia.escritor_auditoria import EscritorAuditoria
+from src.infraestructura.persistencia.repositorio_liquidacion_sqlite import (
+    RepositorioLiquidacionSQLite,
+)
+from src.infraestructura.persistencia.triggers_auditoria import (
+    ejecutar_triggers_postgresql,
+    sql_triggers_postgresql,
+)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db_manager = TestDatabaseManager(str(tmp_path / "test_escritor_auditoria.db"))
+    db_manager.obtener_conexion().executescript(
+        """
+        CREATE TABLE AUDITORIA_CAMBIOS (
+            ID_AUDITORIA INTEGER PRIMARY KEY AUTOINCREMENT,
+            TABLA TEXT NOT NULL, ID_REGISTRO INTEGER NOT NULL, TIPO_OPERACION TEXT NOT NULL,
+            CAMPO_MODIFICADO TEXT, VALOR_ANTERIOR TEXT, VALOR_NUEVO TEXT,
+            USUARIO TEXT NOT NULL, FECHA_CAMBIO TEXT, MOTIVO_CAMBIO TEXT, IP_ORIGEN TEXT
+        );
+        CREATE TABLE CONTRATOS_MANDATOS (ID_CONTRATO_M INTEGER PRIMARY KEY, ID_PROPIETARIO INTEGER);
+        INSERT INTO CONTRATOS_MANDATOS VALUES (1, 10), (2, 10), (3, 20);
+        """
+    )
+    yield db_manager
+    db_manager.cerrar_todas_conexiones()
+
+
+def _auditoria(db):
+    return [
+        tuple(f)
+        for f in db.obtener_conexion().execute(
+            "SELECT ID_REGISTRO, CAMPO_MODIFICADO, VALOR_ANTERIOR, VALOR_NUEVO, USUARIO "
+            "FROM AUDITORIA_CAMBIOS ORDER BY ID_AUDITORIA"
+        )
+    ]
+
+
+def test_escritor_inserta_por_lotes_y_diff_de_varios_campos(db):
+    """Test: Nada se escribe al registrar; vaciar inserta en lotes de `lote` filas."""
+    escritor = EscritorAuditoria(db, lote=4, max_pendientes=100)
+
+    escritor.registrar_lote("PROPIEDADES", range(1, 11), "UPDATE", "admin", {"ESTADO": (0, 1)})
+    escritor.registrar(
+        "PROPIEDADES", 11, "UPDATE", "admin", {"CANON": (100, 200), "ESTADO": (1, 0)}
+    )
+    assert _auditoria(db) == []
+
+    assert escritor.vaciar() == 11
+    filas = _auditoria(db)
+    assert filas[0] == (1, "ESTADO", "0", "1", "admin")
+    assert filas[-1] == (
+        11,
+        "CANON, ESTADO",
+        '{"CANON": 100, "ESTADO": 1}',
+        '{"CANON": 200, "ESTADO": 0}',
+        "admin",
+    )
+    resumen = escritor.estadisticas()
+    assert (resumen["escritas"], resumen["lotes"], resumen["pendientes"]) == (11, 3, 0)
+
+
+def test_buffer_lleno_vacia_y_lote_fallido_vuelve_al_buffer(db):
+    """Test: Contrapresión al llegar a max_pendientes; un fallo no pierde filas hasta el límite."""
+    escritor = EscritorAuditoria(db, lote=5, max_pendientes=10)
+
+    escritor.registrar_lote("USUARIOS", range(10), "UPDATE", "admin")
+    assert len(_auditoria(db)) == 10
+
+    db.obtener_conexion().execute("ALTER TABLE AUDITORIA_CAMBIOS RENAME TO AUDITORIA_TMP")
+    escritor.registrar_lote("USUARIOS", range(8), "UPDATE", "admin")
+    assert escritor.vaciar() == 0
+    assert escritor.estadisticas()["pendientes"] == 8
+    escritor.registrar_lote("USUARIOS", range(8, 12), "UPDATE", "admin")
+    assert escritor.estadisticas()["descartadas"] == 2
+
+    db.obtener_conexion().execute("ALTER TABLE AUDITORIA_TMP RENAME TO AUDITORIA_CAMBIOS")
+    assert escritor.vaciar() == 10
+    assert [f[0] for f in _auditoria(db)[10:]] == list(range(10))
+
+
+def test_aprobacion_masiva_registra_una_fila_por_liquidacion(db):
+    """Test: Aprobar y pagar por propietario audita cada liquidación afectada."""
+    repo = RepositorioLiquidacionSQLite(db)
+    conn = db.obtener_conexion()
+    conn.executemany(
+        "INSERT INTO LIQUIDACIONES (ID_CONTRATO_M, PERIODO, FECHA_GENERACION, CANON_BRUTO, "
+        "TOTAL_INGRESOS, COMISION_PORCENTAJE, COMISION_MONTO, IVA_COMISION, IMPUESTO_4X1000, "
+        "TOTAL_EGRESOS, NETO_A_PAGAR) VALUES (?, '2026-03', '2026-03-31', 1, 1, 0, 0, 0, 0, 0, 1)",
+        [(1,), (2,), (3,)],
+    )
+    conn.commit()
+
+    assert repo.aprobar_por_propietario_y_periodo(10, "2026-03", "tester") == 2
+    assert repo.marcar_como_pagadas_por_propietario(
+        10, "2026-03", "2026-04-01", "Transferencia", "REF1", "tester"
+    ) == 2
+    repo.auditoria.vaciar()
+
+    filas = db.obtener_conexion().execute(
+        "SELECT TABLA, ID_REGISTRO, VALOR_NUEVO, MOTIVO_CAMBIO FROM AUDITORIA_CAMBIOS "
+        "ORDER BY ID_AUDITORIA"
+    ).fetchall()
+    assert sorted(tuple(f) for f in filas) == [
+        ("LIQUIDACIONES", 1, "Aprobada", None),
+        ("LIQUIDACIONES", 1, "Pagada", "Pago Transferencia REF1"),
+        ("LIQUIDACIONES", 2, "Aprobada", None),
+        ("LIQUIDACIONES", 2, "Pagada", "Pago Transferencia REF1"),
+    ]
+
+
+def test_triggers_postgresql_son_por_sentencia():
+    """Test: En PostgreSQL cada operación tiene un trigger por sentencia con tabla de transición."""
+    sentencias = sql_triggers_postgresql("liquidaciones", "id_liquidacion")
+    creados = [s for s in sentencias if s.startswith("CREATE TRIGGER")]
+
+    assert "DROP TRIGGER IF EXISTS trg_audit_liquidaciones ON liquidaciones" in sentencias
+    assert len(creados) == 3
+    assert all("FOR EACH STATEMENT" in s and "REFERENCING" in s for s in creados)
+
+
+class _CursorPostgreSQL:
+    """Cursor con filas dict de claves en mayúsculas, como UpperCaseCursorWrapper."""
+
+    def __init__(self, filas):
+        self.filas = filas
+        self.sentencias = []
+
+    def execute(self, sql, params=None):
+        self.sentencias.append(sql)
+
+    def fetchall(self):
+        return self.filas
+
+
+def test_triggers_postgresql_leen_las_pk_de_filas_dict():
+    """Test: Las PK del catálogo se leen por nombre y cada tabla recibe sus triggers."""
+    cursor = _CursorPostgreSQL([{"RELNAME": "liquidaciones", "PK": "id_liquidacion"}])
+
+    class _Manager:
+        @contextmanager
+        def transaccion(self):
+            yield type("Conexion", (), {"cursor": lambda _: cursor})()
+
+    assert ejecutar_triggers_postgresql(_Manager(), ["liquidaciones", "sin_pk"]) == 1
+    creados = [s for s in cursor.sentencias if s.startswith("CREATE TRIGGER")]
+    assert len(creados) == 3 and all("ON liquidaciones" in s for s in creados)
+    assert "DROP TRIGGER IF EXISTS trg_audit_liquidaciones ON liquidaciones" in cursor.sentencias
@@ -0,0 +1,224 @@
+"""
+Tests de integración para el outbox de notificaciones.
+
+Usa un servidor SMTP local mínimo (sin TLS) para verificar que el despachador
+envía el lote completo por una sola sesión, que los rechazos se reprograman
+con espera exponencial y que el límite de tasa deja el resto en el outbox.
+"""
+import socketserver
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.dominio.entidades.notificacion_outbox import FORMATO_FECHA_HORA, NotificacionOutbox
+from src.infraestructura.notificaciones.cliente_email_office365 import ClienteEmailOffice365
+from src.infraestructura.notificaciones.despachador_outbox import (
+    DespachadorNotificaciones,
+    LimitadorTasa,
+)
+from src.infraestructura.persistencia.repositorio_notificaciones_outbox_sqlite import (
+    RepositorioNotificacionesOutboxSQLite,
+)
+
+
+class _SMTPLocal(socketserver.ThreadingTCPServer):
+    """SMTP de pruebas: acepta todo salvo destinatarios con 'rechazado'."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SesionSMTP)
+        self.conexiones = 0
+        self.entregados = []
+
+
+class _SesionSMTP(socketserver.StreamRequestHandler):
+    def _responder(self, linea: str):
+        self.wfile.write((linea + "\r\n").encode())
+
+    def handle(self):
+        self.server.conexiones += 1
+        destinatario = None
+        self._responder("220 localhost SMTP de pruebas")
+        while True:
+            linea = self.rfile.readline().decode().strip()
+            comando = linea.upper()
+            if not linea or comando == "QUIT":
+                self._responder("221 Bye")
+                return
+            if comando.startswith("EHLO"):
+                self._responder("250-localhost")
+                self._responder("250 AUTH PLAIN LOGIN")
+            elif comando.startswith("AUTH"):
+                self._responder("235 Authentication successful")
+            elif comando.startswith("MAIL FROM"):
+                self._responder("250 OK")
+            elif comando.startswith("RCPT TO"):
+                destinatario = linea.split(":", 1)[1].strip(" <>")
+                if "rechazado" in destinatario:
+                    self._responder("550 Mailbox unavailable")
+                else:
+                    self._responder("250 OK")
+            elif comando == "DATA":
+                self._responder("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.server.entregados.append(destinatario)
+                self._responder("250 OK")
+            else:
+                self._responder("250 OK")
+
+
+@pytest.fixture
+def smtp_local():
+    servidor = _SMTPLocal()
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+@pytest.fixture
+def repositorio(tmp_path):
+    db_manager = TestDatabaseManager(str(tmp_path / "test_outbox.db"))
+    yield RepositorioNotificacionesOutboxSQLite(db_manager)
+    db_manager.cerrar_todas_conexiones()
+
+
+def _cliente(smtp_local) -> ClienteEmailOffice365:
+    cliente = ClienteEmailOffice365(
+        smtp_server="127.0.0.1", smtp_port=smtp_local.server_address[1], usar_tls=False
+    )
+    cliente.email, cliente.password = "notificaciones@velar.test", "secreto"
+    return cliente
+
+
+def _encolar_correos(repositorio, destinatarios):
+    return [
+        repositorio.encolar(
+            NotificacionOutbox(
+                canal="email", destinatario=d, asunto="Liquidación", cuerpo="<p>Hola</p>"
+            )
+        )
+        for d in destinatarios
+    ]
+
+
+def test_lote_por_una_sola_sesion_smtp(repositorio, smtp_local):
+    """Test: Todo el lote sale por una conexión y queda 'Enviada'."""
+    ids = _encolar_correos(repositorio, [f"asesor{i}@velar.test" for i in range(5)])
+    despachador = DespachadorNotificaciones(
+        repositorio, email_client=_cliente(smtp_local), lote=10, email_por_minuto=60
+    )
+
+    resumen = despachador.procesar_lote()
+
+    assert resumen == {"enviadas": 5, "fallidas": 0}
+    assert smtp_local.conexiones == 1
+    assert len(smtp_local.entregados) == 5
+    assert all(repositorio.obtener_por_id(i).estado == "Enviada" for i in ids)
+
+
+def test_rechazo_se_reprograma_con_backoff(repositorio, smtp_local):
+    """Test: Un destinatario rechazado no corta el lote y se reintenta más tarde."""
+    ok, rechazado = _encolar_correos(repositorio, ["ok@velar.test", "rechazado@velar.test"])
+    despachador = DespachadorNotificaciones(
+        repositorio, email_client=_cliente(smtp_local), email_por_minuto=60, backoff_segundos=60
+    )
+
+    antes = datetime.now()
+    assert despachador.procesar_lote() == {"enviadas": 1, "fallidas": 1}
+
+    fallida = repositorio.obtener_por_id(rechazado)
+    assert fallida.estado == "Pendiente"
+    assert fallida.intentos == 1
+    assert "550" in fallida.ultimo_error
+    proximo = datetime.strptime(fallida.proximo_intento, FORMATO_FECHA_HORA)
+    assert proximo >= antes + timedelta(seconds=59)
+    assert repositorio.obtener_por_id(ok).estado == "Enviada"
+
+    # Hasta que venza la espera no vuelve a reclamarse
+    assert repositorio.reclamar_lote("email", 10) == []
+
+
+def test_agotar_intentos_marca_fallida(repositorio, smtp_local):
+    """Test: Tras max_intentos la notificación queda 'Fallida'."""
+    id_notificacion = repositorio.encolar(
+        NotificacionOutbox(
+            canal="email", destinatario="rechazado@velar.test", cuerpo="x", max_intentos=2
+        )
+    )
+    despachador = DespachadorNotificaciones(
+        repositorio, email_client=_cliente(smtp_local), email_por_minuto=60, backoff_segundos=0
+    )
+
+    despachador.procesar_lote()
+    despachador.procesar_lote()
+
+    notificacion = repositorio.obtener_por_id(id_notificacion)
+    assert notificacion.estado == "Fallida"
+    assert notificacion.intentos == 2
+    assert repositorio.contar_por_estado()["Fallida"] == 1
+
+
+def test_limite_de_tasa_deja_el_resto_pendiente(repositorio, smtp_local):
+    """Test: Con cupo de 2 por minuto solo salen 2 correos; el resto sigue pendiente."""
+    _encolar_correos(repositorio, [f"p{i}@velar.test" for i in range(4)])
+    despachador = DespachadorNotificaciones(
+        repositorio, email_client=_cliente(smtp_local), email_por_minuto=2
+    )
+
+    assert despachador.procesar_lote() == {"enviadas": 2, "fallidas": 0}
+    assert despachador.procesar_lote() == {"enviadas": 0, "fallidas": 0}
+    assert repositorio.contar_por_estado("email") == {
+        "Pendiente": 2,
+        "Enviando": 0,
+        "Enviada": 2,
+        "Fallida": 0,
+    }
+
+
+def test_bloqueo_vencido_vuelve_a_ser_reclamable(repositorio):
+    """Test: Una fila 'Enviando' de un despachador caído se reclama al vencer su bloqueo."""
+    (id_notificacion,) = _encolar_correos(repositorio, ["a@velar.test"])
+    assert len(repositorio.reclamar_lote("email", 10, bloqueo_segundos=60)) == 1
+    assert repositorio.reclamar_lote("email", 10) == []
+
+    despues = datetime.now() + timedelta(seconds=61)
+    reclamadas = repositorio.reclamar_lote("email", 10, ahora=despues)
+    assert [n.id_notificacion for n in reclamadas] == [id_notificacion]
+
+
+def test_limitador_tasa_recarga_en_el_tiempo():
+    """Test: El token bucket recupera cupo proporcional al tiempo transcurrido."""
+    reloj = [0.0]
+    limitador = LimitadorTasa(60, reloj=lambda: reloj[0])
+    assert limitador.cupo() == 60
+    for _ in range(60):
+        assert limitador.consumir()
+    assert not limitador.consumir()
+    reloj[0] += 2.0
+    assert limitador.cupo() == 2
+
+
+def test_servicio_notificaciones_encola_sin_enviar(repositorio, smtp_local):
+    """Test: Con outbox, notificar solo inserta la fila (no abre conexión SMTP)."""
+    from types import SimpleNamespace
+
+    from src.aplicacion.servicios.servicio_notificaciones import ServicioNotificaciones
+
+    liquidacion = SimpleNamespace(
+        id_liquidacion_asesor=15, periodo_liquidacion="2026-01", valor_neto_asesor=1500000
+    )
+    servicio = ServicioNotificaciones(outbox=repositorio)
+
+    assert servicio.notificar_liquidacion_asesor(liquidacion, "asesor@velar.test", "Ana")
+
+    (pendiente,) = repositorio.reclamar_lote("email", 10)
+    assert pendiente.referencia == "LIQUIDACION_ASESOR:15"
+    assert pendiente.asunto == "Comprobante de Liquidación - Período 2026-01"
+    assert smtp_local.conexiones == 0
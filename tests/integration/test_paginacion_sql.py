@@ -0,0 +1,132 @@
+"""
+Tests de integración para las utilidades SQL de paginación.
+
+Verifica el predicado keyset y las estrategias de conteo sobre SQLite.
+"""
+import pytest
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.infraestructura.persistencia.paginacion_sql import (
+    condicion_keyset,
+    contar_total,
+    invalidar_conteos,
+)
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """BD temporal con 50 recaudos (5 por fecha)."""
+    db_manager = TestDatabaseManager(str(tmp_path / "test_paginacion.db"))
+    conn = db_manager.obtener_conexion()
+    conn.execute("CREATE TABLE RECAUDOS (ID_RECAUDO INTEGER PRIMARY KEY, FECHA_PAGO TEXT)")
+    conn.executemany(
+        "INSERT INTO RECAUDOS VALUES (?, ?)",
+        [(i, f"2025-01-{(i % 10) + 1:02d}") for i in range(1, 51)],
+    )
+    conn.commit()
+    invalidar_conteos()
+
+    yield db_manager
+
+    db_manager.cerrar_todas_conexiones()
+
+
+def test_keyset_recorre_todas_las_filas_sin_repetir(db_manager):
+    """Test: Paginar por keyset entrega cada fila una sola vez y en orden."""
+    conn = db_manager.obtener_conexion()
+    vistos, despues_de = [], None
+
+    while True:
+        where, params = "", []
+        if despues_de:
+            seek, params = condicion_keyset(["FECHA_PAGO", "ID_RECAUDO"], despues_de, "?")
+            where = f"WHERE {seek}"
+        rows = conn.execute(
+            f"SELECT FECHA_PAGO, ID_RECAUDO FROM RECAUDOS {where} "
+            "ORDER BY FECHA_PAGO DESC, ID_RECAUDO DESC LIMIT 7",
+            params,
+        ).fetchall()
+        if not rows:
+            break
+        vistos.extend(row[1] for row in rows)
+        despues_de = [rows[-1][0], rows[-1][1]]
+
+    esperado = [
+        row[0]
+        for row in conn.execute(
+            "SELECT ID_RECAUDO FROM RECAUDOS ORDER BY FECHA_PAGO DESC, ID_RECAUDO DESC"
+        ).fetchall()
+    ]
+    assert vistos == esperado
+
+
+def test_conteo_cacheado_y_estimado(db_manager):
+    """Test: 'cached' reutiliza el conteo y 'estimate' usa sqlite_stat1."""
+    conn = db_manager.obtener_conexion()
+
+    assert contar_total(db_manager, "FROM RECAUDOS", [], "cached", ttl=60) == (50, False)
+    conn.execute("DELETE FROM RECAUDOS WHERE ID_RECAUDO > 40")
+    conn.commit()
+    assert contar_total(db_manager, "FROM RECAUDOS", [], "cached", ttl=60) == (50, False)
+    assert contar_total(db_manager, "FROM RECAUDOS", [], "exact") == (40, False)
+
+    # Sin ANALYZE no hay estimación: se degrada a conteo (cacheado)
+    invalidar_conteos()
+    assert contar_total(db_manager, "FROM RECAUDOS", [], "estimate", tabla_base="RECAUDOS") == (40, False)
+
+    conn.execute("ANALYZE")
+    conn.commit()
+    assert contar_total(db_manager, "FROM RECAUDOS", [], "estimate", tabla_base="RECAUDOS") == (40, True)
+
+
+class _CursorPostgreSQL:
+    """Cursor falso de PostgreSQL: registra lo ejecutado; EXPLAIN falla, COUNT responde."""
+
+    def __init__(self):
+        self.ejecutadas = []
+
+    def execute(self, sql, params=None):
+        self.ejecutadas.append(sql.split(" (")[0])
+        if sql.startswith("EXPLAIN"):
+            raise RuntimeError("permission denied for table recaudos")
+
+    def fetchone(self):
+        return {"TOTAL": 12}
+
+
+class _ConexionPostgreSQL:
+    def __init__(self):
+        self.cursor_falso = _CursorPostgreSQL()
+        self.rollbacks = 0
+
+    def cursor(self):
+        return self.cursor_falso
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class _ManagerPostgreSQL:
+    use_postgresql = True
+
+    def __init__(self):
+        self.conexion = _ConexionPostgreSQL()
+
+    def obtener_conexion(self):
+        return self.conexion
+
+
+def test_estimacion_fallida_en_postgresql_no_deshace_la_transaccion():
+    """Test: Si EXPLAIN falla se vuelve al savepoint (sin ROLLBACK) y se cuenta exacto."""
+    db = _ManagerPostgreSQL()
+
+    assert contar_total(db, "FROM RECAUDOS WHERE ESTADO = %s", ["Pagado"], "estimate") == (12, False)
+
+    assert db.conexion.rollbacks == 0
+    assert db.conexion.cursor_falso.ejecutadas == [
+        "SAVEPOINT estimar_conteo",
+        "EXPLAIN",
+        "ROLLBACK TO SAVEPOINT estimar_conteo",
+        "RELEASE SAVEPOINT estimar_conteo",
+        "SELECT COUNT(*) AS TOTAL FROM RECAUDOS WHERE ESTADO = %s",
+    ]
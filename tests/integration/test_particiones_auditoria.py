@@ -0,0 +1,212 @@
+"""
+Tests de integración para las particiones mensuales de auditoría.
+
+Verifican que la rotación mueve los meses antiguos a su tabla sin cambiar lo
+que devuelven las consultas, que las consultas leen solo las tablas que
+pueden aportar filas y que la retención archiva en CSV comprimido. La rama
+de PostgreSQL se verifica con un cursor de filas dict (UpperCaseCursorWrapper).
+"""
+import csv
+import gzip
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.infraestructura.persistencia.particiones_auditoria import GestorParticionesAuditoria
+from src.infraestructura.persistencia.repositorio_auditoria_sqlite import (
+    RepositorioAuditoriaSQLite,
+)
+
+HOY = date(2026, 6, 10)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db_manager = TestDatabaseManager(str(tmp_path / "test_particiones.db"))
+    conn = db_manager.obtener_conexion()
+    conn.executescript(
+        """
+        CREATE TABLE AUDITORIA_CAMBIOS (
+            ID_AUDITORIA INTEGER PRIMARY KEY AUTOINCREMENT,
+            TABLA TEXT NOT NULL, ID_REGISTRO INTEGER NOT NULL, TIPO_OPERACION TEXT NOT NULL,
+            CAMPO_MODIFICADO TEXT, VALOR_ANTERIOR TEXT, VALOR_NUEVO TEXT,
+            USUARIO TEXT NOT NULL, FECHA_CAMBIO TEXT, MOTIVO_CAMBIO TEXT, IP_ORIGEN TEXT
+        );
+        CREATE INDEX idx_auditoria_tabla ON AUDITORIA_CAMBIOS(TABLA, ID_REGISTRO);
+        """
+    )
+    # 12 meses (2025-07 .. 2026-06), 10 filas por mes en orden cronológico
+    conn.executemany(
+        "INSERT INTO AUDITORIA_CAMBIOS (TABLA, ID_REGISTRO, TIPO_OPERACION, USUARIO, FECHA_CAMBIO) "
+        "VALUES (?, ?, 'UPDATE', ?, ?)",
+        [
+            (
+                "PROPIEDADES" if i % 2 else "PERSONAS",
+                i % 5,
+                "admin" if i % 3 else "Asesor",
+                f"{2025 + (6 + i // 10) // 12}-{(6 + i // 10) % 12 + 1:02d}-{i % 10 + 1:02d} 09:00:00",
+            )
+            for i in range(120)
+        ],
+    )
+    conn.commit()
+    yield db_manager
+    db_manager.cerrar_todas_conexiones()
+
+
+def _gestor(db, tmp_path, meses_retencion=24):
+    return GestorParticionesAuditoria(
+        db, meses_activos=3, meses_retencion=meses_retencion, directorio=str(tmp_path / "archivo")
+    )
+
+
+def _ids(filas):
+    return [c.id_auditoria for c in filas]
+
+
+def test_rotar_mueve_meses_y_las_consultas_no_cambian(db, tmp_path):
+    """Test: Tras rotar, listados y búsquedas por keyset devuelven lo mismo que antes."""
+    repo = RepositorioAuditoriaSQLite(db)
+    antes = {
+        "todos": _ids(repo.listar_todos(limit=25, offset=30)),
+        "tabla": _ids(repo.buscar(tablas=["PROPIEDADES"], limit=200)),
+        "rango": _ids(repo.buscar(fecha_desde="2025-09-05", fecha_hasta="2025-10-03", limit=200)),
+        "pagina": _ids(repo.buscar(usuario="admin", limit=15, despues_de=70)),
+    }
+
+    resultado = _gestor(db, tmp_path).rotar(HOY)
+
+    assert (resultado["meses_movidos"], resultado["filas_movidas"]) == (9, 90)
+    conn = db.obtener_conexion()
+    assert conn.execute("SELECT COUNT(*) FROM AUDITORIA_CAMBIOS").fetchone()[0] == 30
+    assert conn.execute("SELECT COUNT(*) FROM AUDITORIA_CAMBIOS_202509").fetchone()[0] == 10
+    assert {
+        "todos": _ids(repo.listar_todos(limit=25, offset=30)),
+        "tabla": _ids(repo.buscar(tablas=["PROPIEDADES"], limit=200)),
+        "rango": _ids(repo.buscar(fecha_desde="2025-09-05", fecha_hasta="2025-10-03", limit=200)),
+        "pagina": _ids(repo.buscar(usuario="admin", limit=15, despues_de=70)),
+    } == antes
+    # Volver a rotar no mueve nada
+    assert _gestor(db, tmp_path).rotar(HOY)["meses_movidos"] == 0
+
+
+def test_consultas_leen_solo_las_tablas_mensuales_necesarias(db, tmp_path):
+    """Test: El catálogo poda por fechas y cursor; una página reciente no toca meses viejos."""
+    gestor = _gestor(db, tmp_path)
+    gestor.rotar(HOY)
+
+    assert [p["periodo"] for p in gestor.particiones("2025-09-05", "2025-10-03")] == [
+        "2025-10",
+        "2025-09",
+    ]
+    assert [p["periodo"] for p in gestor.particiones(antes_de_id=21)] == ["2025-08", "2025-07"]
+
+    repo = RepositorioAuditoriaSQLite(db)
+    consultas = []
+    db.obtener_conexion().set_trace_callback(consultas.append)
+    repo.buscar(limit=20)
+    tablas_leidas = [q for q in consultas if "FROM AUDITORIA_CAMBIOS_2" in q]
+    db.obtener_conexion().set_trace_callback(None)
+
+    assert tablas_leidas == []
+
+
+def test_retencion_archiva_en_csv_comprimido_y_agrega_filas_tardias(db, tmp_path):
+    """Test: Los meses vencidos pasan a auditoria_AAAAMM.csv.gz y su tabla se elimina."""
+    gestor = _gestor(db, tmp_path, meses_retencion=10)
+
+    resultado = gestor.rotar(HOY)
+
+    assert (resultado["meses_archivados"], resultado["filas_archivadas"]) == (1, 10)
+    conn = db.obtener_conexion()
+    tablas = {
+        f[0] for f in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    assert "AUDITORIA_CAMBIOS_202507" not in tablas and "AUDITORIA_CAMBIOS_202508" in tablas
+    with gzip.open(gestor.ruta_archivo("2025-07"), "rt", encoding="utf-8") as archivo:
+        filas = list(csv.reader(archivo))
+    assert filas[0][0] == "ID_AUDITORIA" and [int(f[0]) for f in filas[1:]] == list(range(1, 11))
+
+    # Una fila tardía del mes archivado se agrega al mismo archivo
+    conn.execute(
+        "INSERT INTO AUDITORIA_CAMBIOS (TABLA, ID_REGISTRO, TIPO_OPERACION, USUARIO, FECHA_CAMBIO) "
+        "VALUES ('PERSONAS', 1, 'DELETE', 'admin', '2025-07-20 08:00:00')"
+    )
+    conn.commit()
+    gestor.rotar(HOY)
+
+    with gzip.open(gestor.ruta_archivo("2025-07"), "rt", encoding="utf-8") as archivo:
+        filas = list(csv.reader(archivo))
+    assert len(filas) == 12 and filas[-1][3] == "DELETE"
+    catalogo = conn.execute(
+        "SELECT FILAS, FILAS_ARCHIVADAS FROM AUDITORIA_PARTICIONES WHERE PERIODO = '2025-07'"
+    ).fetchone()
+    assert tuple(catalogo) == (0, 11)
+
+
+class _CursorPostgreSQL:
+    """Responde las consultas de catálogo con filas dict de claves en mayúsculas."""
+
+    def __init__(self, particiones):
+        self.particiones = particiones
+        self.sentencias = []
+        self._resultado = None
+
+    def execute(self, sql, params=None):
+        self.sentencias.append(sql)
+        if "to_regclass" in sql:
+            self._resultado = {"PARTICION": params[0] if params[0] in self.particiones else None}
+        elif "pg_inherits" in sql:
+            self._resultado = [{"RELNAME": n} for n in self.particiones]
+        elif "COUNT(*)" in sql:
+            self._resultado = {"FILAS": 3}
+
+    def fetchone(self):
+        return self._resultado
+
+    def fetchall(self):
+        return self._resultado
+
+    def copy_expert(self, sql, archivo):
+        archivo.write("1,PERSONAS,1,UPDATE,,,,admin,2025-07-01,,\n")
+
+
+class _ManagerPostgreSQL:
+    use_postgresql = True
+
+    def __init__(self, particiones):
+        self.cursor = _CursorPostgreSQL(particiones)
+        self.conexion = type("Conexion", (), {"cursor": lambda _: self.cursor})()
+
+    def get_placeholder(self) -> str:
+        return "%s"
+
+    def obtener_conexion(self):
+        return self.conexion
+
+    @contextmanager
+    def transaccion(self):
+        yield self.conexion
+
+
+def test_rotar_en_postgresql_crea_particiones_y_archiva_las_vencidas(tmp_path):
+    """Test: Con filas dict se crean las particiones faltantes y se archiva la vencida."""
+    db = _ManagerPostgreSQL(
+        ["auditoria_cambios_202507", "auditoria_cambios_202508", "auditoria_cambios_202606"]
+    )
+    gestor = GestorParticionesAuditoria(
+        db, meses_retencion=10, directorio=str(tmp_path / "archivo")
+    )
+
+    resultado = gestor.rotar(HOY)
+
+    assert resultado["particiones_creadas"] == 2
+    assert (resultado["meses_archivados"], resultado["filas_archivadas"]) == (1, 3)
+    sentencias = db.cursor.sentencias
+    assert any("PARTITION OF auditoria_cambios" in s and "2026-07-01" in s for s in sentencias)
+    assert "DROP TABLE auditoria_cambios_202507" in sentencias
+    assert not any("DROP TABLE auditoria_cambios_202508" in s for s in sentencias)
+    with gzip.open(gestor.ruta_archivo("2025-07"), "rt", encoding="utf-8") as archivo:
+        assert archivo.read().startswith("1,PERSONAS")
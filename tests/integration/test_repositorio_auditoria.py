@@ -0,0 +1,121 @@
+"""
+Tests de integración para la búsqueda de auditoría (RepositorioAuditoriaSQLite.buscar).
+
+Verifican los filtros en SQL, el recorrido por keyset y que las consultas
+usan los índices compuestos en lugar de ordenar toda la tabla.
+"""
+import pytest
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.infraestructura.persistencia.repositorio_auditoria_sqlite import (
+    RepositorioAuditoriaSQLite,
+)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db_manager = TestDatabaseManager(str(tmp_path / "test_auditoria.db"))
+    conn = db_manager.obtener_conexion()
+    conn.executescript(
+        """
+        CREATE TABLE AUDITORIA_CAMBIOS (
+            ID_AUDITORIA INTEGER PRIMARY KEY AUTOINCREMENT,
+            TABLA TEXT NOT NULL, ID_REGISTRO INTEGER NOT NULL, TIPO_OPERACION TEXT NOT NULL,
+            CAMPO_MODIFICADO TEXT, VALOR_ANTERIOR TEXT, VALOR_NUEVO TEXT,
+            USUARIO TEXT NOT NULL, FECHA_CAMBIO TEXT, MOTIVO_CAMBIO TEXT, IP_ORIGEN TEXT
+        );
+        CREATE INDEX idx_auditoria_tabla ON AUDITORIA_CAMBIOS(TABLA, ID_REGISTRO);
+        """
+    )
+    tablas = ["PROPIEDADES", "CONTRATOS_ARRENDAMIENTOS", "CONTRATOS_MANDATOS", "USUARIOS"]
+    conn.executemany(
+        "INSERT INTO AUDITORIA_CAMBIOS (TABLA, ID_REGISTRO, TIPO_OPERACION, CAMPO_MODIFICADO, "
+        "VALOR_ANTERIOR, VALOR_NUEVO, USUARIO, FECHA_CAMBIO) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                tablas[i % 4],
+                i % 7,
+                "INSERT" if i % 5 == 0 else "UPDATE",
+                "CANON_ARRENDAMIENTO" if i % 3 == 0 else "ESTADO",
+                str(i),
+                str(i + 1),
+                "admin" if i % 2 else "Asesor",
+                f"2025-{(i % 12) + 1:02d}-15 10:00:00",
+            )
+            for i in range(1, 201)
+        ],
+    )
+    conn.commit()
+    yield db_manager
+    db_manager.cerrar_todas_conexiones()
+
+
+def _recorrer(repo, limit=7, **filtros):
+    """Todas las páginas de una búsqueda por keyset."""
+    ids, despues_de = [], None
+    while True:
+        pagina = repo.buscar(limit=limit, despues_de=despues_de, **filtros)
+        ids.extend(c.id_auditoria for c in pagina)
+        if len(pagina) < limit:
+            return ids
+        despues_de = pagina[-1].id_auditoria
+
+
+def _esperados(db, where, params=()):
+    filas = db.obtener_conexion().execute(
+        f"SELECT ID_AUDITORIA FROM AUDITORIA_CAMBIOS WHERE {where} ORDER BY ID_AUDITORIA DESC",
+        params,
+    )
+    return [f[0] for f in filas]
+
+
+def test_buscar_filtra_en_sql_y_recorre_por_keyset(db):
+    """Test: Las páginas cubren toda la historia filtrada, sin repetir y en orden."""
+    repo = RepositorioAuditoriaSQLite(db)
+
+    contratos = _recorrer(repo, tablas=["CONTRATOS_ARRENDAMIENTOS", "CONTRATOS_MANDATOS"])
+    assert contratos == _esperados(db, "TABLA LIKE 'CONTRATOS%'")
+
+    assert _recorrer(repo, usuario="admin", accion="INSERT") == _esperados(
+        db, "USUARIO = 'admin' AND TIPO_OPERACION = 'INSERT'"
+    )
+    # Texto sin distinguir mayúsculas; fecha_hasta incluye el día completo
+    assert _recorrer(repo, texto="canon", fecha_desde="2025-03-01", fecha_hasta="2025-04-15") == (
+        _esperados(
+            db,
+            "CAMPO_MODIFICADO = 'CANON_ARRENDAMIENTO' "
+            "AND FECHA_CAMBIO BETWEEN '2025-03-01' AND '2025-04-15 23:59:59'",
+        )
+    )
+    assert _recorrer(repo, tablas=["PROPIEDADES"], id_registro=3) == _esperados(
+        db, "TABLA = 'PROPIEDADES' AND ID_REGISTRO = 3"
+    )
+
+
+def test_buscar_usa_indices_sin_ordenar_la_tabla(db):
+    """Test: Filtrar por tabla, registro o usuario recorre el índice ya ordenado por ID_AUDITORIA."""
+    RepositorioAuditoriaSQLite(db)
+    conn = db.obtener_conexion()
+
+    indices = {
+        f[0]
+        for f in conn.execute(
+            "SELECT name FROM sqlite_master WHERE tbl_name = 'AUDITORIA_CAMBIOS' AND type = 'index'"
+        )
+    }
+    assert {"idx_auditoria_tabla_registro_fecha", "idx_auditoria_tabla_id"} <= indices
+
+    for where, params in (
+        ("TABLA = ?", ("USUARIOS",)),
+        ("USUARIO = ?", ("admin",)),
+        ("TABLA = ? AND ID_REGISTRO = ?", ("PROPIEDADES", 3)),
+    ):
+        plan = " ".join(
+            str(f[3])
+            for f in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM AUDITORIA_CAMBIOS WHERE {where} "
+                "AND ID_AUDITORIA < ? ORDER BY ID_AUDITORIA DESC LIMIT 50",
+                params + (100,),
+            )
+        )
+        assert "USING INDEX" in plan and "TEMP B-TREE" not in plan
@@ -0,0 +1,133 @@
+"""
+Tests de integración para RepositorioBusquedaSQLite.
+
+Verifica el índice FTS5 (creación, sincronización por triggers) y la
+búsqueda global insensible a tildes.
+"""
+import pytest
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.infraestructura.persistencia.repositorio_busqueda_sqlite import RepositorioBusquedaSQLite
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """Crea un TestDatabaseManager con el esquema mínimo de búsqueda."""
+    db_file = tmp_path / "test_busqueda.db"
+    db_manager = TestDatabaseManager(str(db_file))
+
+    with db_manager.obtener_conexion() as conn:
+        conn.executescript("""
+            CREATE TABLE PERSONAS (
+                ID_PERSONA INTEGER PRIMARY KEY AUTOINCREMENT,
+                NUMERO_DOCUMENTO TEXT NOT NULL,
+                NOMBRE_COMPLETO TEXT NOT NULL
+            );
+            CREATE TABLE PROPIEDADES (
+                ID_PROPIEDAD INTEGER PRIMARY KEY AUTOINCREMENT,
+                MATRICULA_INMOBILIARIA TEXT NOT NULL,
+                DIRECCION_PROPIEDAD TEXT NOT NULL
+            );
+            CREATE TABLE ARRENDATARIOS (ID_ARRENDATARIO INTEGER PRIMARY KEY, ID_PERSONA INTEGER);
+            CREATE TABLE PROPIETARIOS (ID_PROPIETARIO INTEGER PRIMARY KEY, ID_PERSONA INTEGER);
+            CREATE TABLE CONTRATOS_ARRENDAMIENTOS (
+                ID_CONTRATO_A INTEGER PRIMARY KEY, ID_PROPIEDAD INTEGER, ID_ARRENDATARIO INTEGER
+            );
+            CREATE TABLE CONTRATOS_MANDATOS (
+                ID_CONTRATO_M INTEGER PRIMARY KEY, ID_PROPIEDAD INTEGER, ID_PROPIETARIO INTEGER
+            );
+
+            -- Datos previos a la creación del índice (deben indexarse con 'rebuild')
+            INSERT INTO PERSONAS (NUMERO_DOCUMENTO, NOMBRE_COMPLETO) VALUES ('1012345', 'José Pérez Gómez');
+            INSERT INTO PERSONAS (NUMERO_DOCUMENTO, NOMBRE_COMPLETO) VALUES ('2023456', 'María Ruiz');
+            INSERT INTO PROPIEDADES (MATRICULA_INMOBILIARIA, DIRECCION_PROPIEDAD) VALUES ('MAT-001', 'Calle Pérez 10-20');
+            INSERT INTO PROPIEDADES (MATRICULA_INMOBILIARIA, DIRECCION_PROPIEDAD) VALUES ('MAT-002', 'Carrera 7 # 45');
+            INSERT INTO ARRENDATARIOS VALUES (1, 2);
+            INSERT INTO PROPIETARIOS VALUES (1, 1);
+            INSERT INTO CONTRATOS_ARRENDAMIENTOS VALUES (1, 2, 1);
+            INSERT INTO CONTRATOS_MANDATOS VALUES (1, 2, 1);
+        """)
+        conn.commit()
+
+    yield db_manager
+
+    db_manager.cerrar_todas_conexiones()
+
+
+@pytest.fixture
+def repositorio(db_manager):
+    """Crea el repositorio y limpia el estado del índice al terminar."""
+    repo = RepositorioBusquedaSQLite(db_manager)
+    yield repo
+    repo.invalidar_estado_indice()
+
+
+class TestRepositorioBusqueda:
+    """Tests de integración para la búsqueda global."""
+
+    def test_buscar_global_insensible_a_tildes(self, repositorio):
+        """Test: 'perez' encuentra 'Pérez' en personas, propiedades y contratos."""
+        resultados = repositorio.buscar_global("perez")
+
+        tipos = {(r["tipo"], r["id"]) for r in resultados}
+        assert ("PERSONA", 1) in tipos
+        assert ("PROPIEDAD", 1) in tipos
+        # El mandato coincide por su propietario (José Pérez)
+        assert ("CONTRATO_MANDATO", 1) in tipos
+        # El arrendamiento (María Ruiz, Carrera 7) no coincide
+        assert ("CONTRATO_ARRENDAMIENTO", 1) not in tipos
+        # Ordenados por relevancia
+        rangos = [r["rango"] for r in resultados]
+        assert rangos == sorted(rangos)
+
+    def test_buscar_por_prefijo_y_documento(self, repositorio):
+        """Test: Búsqueda por prefijo de palabra y por número de documento."""
+        assert [r["id"] for r in repositorio.buscar_global("Marí") if r["tipo"] == "PERSONA"] == [2]
+        assert [r["id"] for r in repositorio.buscar_global("2023456") if r["tipo"] == "PERSONA"] == [2]
+        assert repositorio.buscar_global("   ") == []
+
+    def test_triggers_sincronizan_indice(self, repositorio, db_manager):
+        """Test: Insert, update y delete se reflejan en el índice FTS5."""
+        repositorio.asegurar_indice()
+        conn = db_manager.obtener_conexion()
+
+        conn.execute(
+            "INSERT INTO PERSONAS (NUMERO_DOCUMENTO, NOMBRE_COMPLETO) VALUES ('999', 'Ángela Núñez')"
+        )
+        conn.commit()
+        assert any(r["titulo"] == "Ángela Núñez" for r in repositorio.buscar_global("nunez"))
+
+        conn.execute("UPDATE PERSONAS SET NOMBRE_COMPLETO = 'Ángela Castro' WHERE NUMERO_DOCUMENTO = '999'")
+        conn.commit()
+        assert repositorio.buscar_global("nunez") == []
+        assert any(r["titulo"] == "Ángela Castro" for r in repositorio.buscar_global("castro"))
+
+        conn.execute("DELETE FROM PERSONAS WHERE NUMERO_DOCUMENTO = '999'")
+        conn.commit()
+        assert repositorio.buscar_global("castro") == []
+
+    def test_condicion_filtra_consulta(self, repositorio, db_manager):
+        """Test: La condición se integra en el WHERE de otra consulta."""
+        condicion, params = repositorio.condicion("PROPIEDAD", "p.ID_PROPIEDAD", "carrera")
+        rows = db_manager.obtener_conexion().execute(
+            f"SELECT p.ID_PROPIEDAD FROM PROPIEDADES p WHERE {condicion}", params
+        ).fetchall()
+
+        assert [row[0] for row in rows] == [2]
+
+    def test_indice_se_crea_con_el_esquema_sin_cerrar_transacciones(self, repositorio, db_manager):
+        """Test: Las tablas FTS5 existen al construir el repositorio; buscar no confirma lo pendiente."""
+        conn = db_manager.obtener_conexion()
+        tablas = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE name LIKE '%_FTS'").fetchall()
+        }
+        assert {"PERSONAS_FTS", "PROPIEDADES_FTS"} <= tablas
+
+        conn.execute("INSERT INTO PERSONAS (NUMERO_DOCUMENTO, NOMBRE_COMPLETO) VALUES ('777', 'Pedro Páez')")
+        assert conn.in_transaction
+        assert any(r["titulo"] == "Pedro Páez" for r in repositorio.buscar_global("paez"))
+        assert conn.in_transaction
+        conn.rollback()
+
+        assert repositorio.buscar_global("paez") == []
@@ -0,0 +1,108 @@
+"""
+Tests de integración para RepositorioContratosUnificadoSQLite.
+
+Verifica el listado UNION ALL de mandatos y arrendamientos: orden global,
+paginación keyset sin duplicados, un solo conteo y filtros compartidos.
+"""
+import pytest
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.infraestructura.persistencia.repositorio_contratos_unificado_sqlite import (
+    RepositorioContratosUnificadoSQLite,
+)
+
+
+@pytest.fixture
+def repositorio(tmp_path):
+    """4 mandatos y 5 arrendamientos con fechas de inicio intercaladas."""
+    db_manager = TestDatabaseManager(str(tmp_path / "test_contratos.db"))
+    conn = db_manager.obtener_conexion()
+    conn.executescript("""
+        CREATE TABLE PERSONAS (
+            ID_PERSONA INTEGER PRIMARY KEY, NUMERO_DOCUMENTO TEXT, NOMBRE_COMPLETO TEXT
+        );
+        CREATE TABLE PROPIEDADES (
+            ID_PROPIEDAD INTEGER PRIMARY KEY, MATRICULA_INMOBILIARIA TEXT,
+            DIRECCION_PROPIEDAD TEXT, TIPO_PROPIEDAD TEXT
+        );
+        CREATE TABLE PROPIETARIOS (ID_PROPIETARIO INTEGER PRIMARY KEY, ID_PERSONA INTEGER);
+        CREATE TABLE ARRENDATARIOS (ID_ARRENDATARIO INTEGER PRIMARY KEY, ID_PERSONA INTEGER);
+        CREATE TABLE CONTRATOS_MANDATOS (
+            ID_CONTRATO_M INTEGER PRIMARY KEY, ID_PROPIEDAD INTEGER, ID_PROPIETARIO INTEGER,
+            ID_ASESOR INTEGER, ESTADO_CONTRATO_M TEXT, CANON_MANDATO INTEGER,
+            FECHA_INICIO_CONTRATO_M TEXT, FECHA_FIN_CONTRATO_M TEXT
+        );
+        CREATE TABLE CONTRATOS_ARRENDAMIENTOS (
+            ID_CONTRATO_A INTEGER PRIMARY KEY, ID_PROPIEDAD INTEGER, ID_ARRENDATARIO INTEGER,
+            ESTADO_CONTRATO_A TEXT, CANON_ARRENDAMIENTO INTEGER,
+            FECHA_INICIO_CONTRATO_A TEXT, FECHA_FIN_CONTRATO_A TEXT
+        );
+        INSERT INTO PERSONAS VALUES (1, '100', 'Ana Propietaria'), (2, '200', 'Luis Inquilino');
+        INSERT INTO PROPIEDADES VALUES (1, 'MAT-1', 'Calle 1', 'Casa');
+        INSERT INTO PROPIETARIOS VALUES (1, 1);
+        INSERT INTO ARRENDATARIOS VALUES (1, 2);
+    """)
+    # Mandatos en meses impares y arrendamientos en pares (mismas IDs 1..4)
+    conn.executemany(
+        "INSERT INTO CONTRATOS_MANDATOS VALUES (?, 1, 1, 1, ?, 1000, ?, '2030-01-01')",
+        [(i, "Activo" if i != 4 else "Cancelado", f"2024-{2 * i - 1:02d}-01") for i in range(1, 5)],
+    )
+    conn.executemany(
+        "INSERT INTO CONTRATOS_ARRENDAMIENTOS VALUES (?, 1, 1, 'Activo', 2000, ?, '2030-01-01')",
+        [(i, f"2024-{2 * i:02d}-01") for i in range(1, 6)],
+    )
+    conn.commit()
+
+    repo = RepositorioContratosUnificadoSQLite(db_manager)
+    yield repo
+
+    repo.busqueda.invalidar_estado_indice()
+    db_manager.cerrar_todas_conexiones()
+
+
+def test_keyset_recorre_la_union_en_orden_global(repositorio):
+    """Test: Cada página trae page_size filas, sin repetir y en orden global."""
+    vistos, cursor, page = [], None, 1
+    while True:
+        resultado = repositorio.listar_paginado(page=page, page_size=4, cursor=cursor)
+        assert len(resultado.items) <= 4
+        assert resultado.total == 9
+        vistos.extend((c["fecha_inicio"], c["tipo"], c["id"]) for c in resultado.items)
+        if not resultado.next_cursor:
+            break
+        cursor, page = resultado.next_cursor, page + 1
+
+    assert len(vistos) == 9 and len(set(vistos)) == 9
+    assert vistos == sorted(vistos, reverse=True)
+    assert [t for _, t, _ in vistos[:3]] == ["Arrendamiento", "Arrendamiento", "Mandato"]
+
+
+def test_filtros_compartidos_y_claves_por_tipo(repositorio):
+    """Test: Estado/tipo filtran ambas ramas y cada fila conserva sus claves de UI."""
+    activos = repositorio.listar_paginado(page_size=20, estado="Activo")
+    mandatos = repositorio.listar_todos(tipo="Mandato")
+
+    assert activos.total == 8
+    assert len(mandatos) == 4 and {c["tipo"] for c in mandatos} == {"Mandato"}
+    assert mandatos[0]["propietario"] == "Ana Propietaria"
+    assert "arrendatario" in repositorio.listar_todos(tipo="Arrendamiento")[0]
+    assert repositorio.listar_paginado(busqueda="inquilino").total == 5
+
+
+def test_filtro_por_asesor_usa_el_mandato_de_la_propiedad(repositorio):
+    """Test: Los arrendamientos se filtran por el asesor del mandato de su propiedad."""
+    conn = repositorio.db.obtener_conexion()
+    conn.execute("INSERT INTO PROPIEDADES VALUES (2, 'MAT-2', 'Calle 2', 'Apartamento')")
+    conn.execute(
+        "INSERT INTO CONTRATOS_MANDATOS VALUES (5, 2, 1, 2, 'Activo', 1000, '2025-01-01', '2030-01-01')"
+    )
+    conn.execute(
+        "INSERT INTO CONTRATOS_ARRENDAMIENTOS VALUES (6, 2, 1, 'Activo', 2000, '2025-02-01', '2030-01-01')"
+    )
+    conn.commit()
+
+    del_asesor_2 = repositorio.listar_paginado(page_size=20, id_asesor="2")
+
+    assert [(c["tipo"], c["id"]) for c in del_asesor_2.items] == [("Arrendamiento", 6), ("Mandato", 5)]
+    assert repositorio.listar_paginado(page_size=20, id_asesor="1").total == 9
+    assert repositorio.listar_paginado(tipo="Arrendamiento", id_asesor="3").total == 0
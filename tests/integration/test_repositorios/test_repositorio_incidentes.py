@@ -0,0 +1,111 @@
+"""
+Tests de integración para RepositorioIncidentesSQLite.
+
+Verifica el listado filtrado/paginado en SQL, el cálculo de días sin
+resolver y el conteo por estado del tablero Kanban.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.infraestructura.persistencia.repositorio_incidentes_sqlite import (
+    RepositorioIncidentesSQLite,
+)
+
+
+@pytest.fixture
+def repositorio(tmp_path):
+    """Repositorio sobre una BD con 30 incidentes (10 abiertos hace 10+ días)."""
+    db_manager = TestDatabaseManager(str(tmp_path / "test_incidentes.db"))
+    conn = db_manager.obtener_conexion()
+    conn.execute("""
+        CREATE TABLE INCIDENTES (
+            ID_INCIDENTE INTEGER PRIMARY KEY AUTOINCREMENT,
+            ID_PROPIEDAD INTEGER NOT NULL,
+            ID_CONTRATO_M INTEGER,
+            DESCRIPCION_INCIDENTE TEXT NOT NULL,
+            COSTO_INCIDENTE INTEGER DEFAULT 0,
+            FECHA_INCIDENTE TEXT NOT NULL,
+            PRIORIDAD TEXT DEFAULT 'Media',
+            ORIGEN_REPORTE TEXT DEFAULT 'Inquilino',
+            RESPONSABLE_PAGO TEXT,
+            ID_PROVEEDOR_ASIGNADO INTEGER,
+            ID_COTIZACION_APROBADA INTEGER,
+            QUIEN_ARREGLA TEXT,
+            APROBADO_POR TEXT,
+            FECHA_ARREGLO TEXT,
+            ESTADO TEXT DEFAULT 'Reportado',
+            DIAS_SIN_RESOLVER INTEGER DEFAULT 0,
+            MOTIVO_CANCELACION TEXT,
+            CREATED_AT TEXT,
+            CREATED_BY TEXT,
+            UPDATED_AT TEXT,
+            UPDATED_BY TEXT
+        )
+    """)
+    hoy = date.today()
+    filas = []
+    for i in range(30):
+        estado = ["Reportado", "Cotizado", "Finalizado"][i % 3]
+        fecha = (hoy - timedelta(days=i)).isoformat()
+        arreglo = None
+        if estado == "Finalizado":
+            arreglo = (hoy - timedelta(days=i - 2)).isoformat()
+        prioridad = "Alta" if i % 2 else "Baja"
+        filas.append((i % 4 + 1, f"Gotera {i}", fecha, prioridad, estado, arreglo))
+    conn.executemany(
+        "INSERT INTO INCIDENTES (ID_PROPIEDAD, DESCRIPCION_INCIDENTE, FECHA_INCIDENTE, "
+        "PRIORIDAD, ESTADO, FECHA_ARREGLO) VALUES (?, ?, ?, ?, ?, ?)",
+        filas,
+    )
+    conn.commit()
+
+    yield RepositorioIncidentesSQLite(db_manager)
+
+    db_manager.cerrar_todas_conexiones()
+
+
+def test_listar_con_filtros_pagina_en_sql(repositorio):
+    """Test: Los filtros se combinan con LIMIT/OFFSET y el conteo coincide."""
+    total = repositorio.contar_con_filtros(estado="Reportado", prioridad="Baja")
+    pagina_1 = repositorio.listar_con_filtros(estado="Reportado", prioridad="Baja", limit=3)
+    pagina_2 = repositorio.listar_con_filtros(
+        estado="Reportado", prioridad="Baja", limit=3, offset=3
+    )
+
+    assert total == 5
+    assert len(pagina_1) == 3 and len(pagina_2) == 2
+    assert all(i.estado == "Reportado" and i.prioridad == "Baja" for i in pagina_1 + pagina_2)
+    # Más recientes primero
+    fechas = [i.fecha_incidente for i in pagina_1 + pagina_2]
+    assert fechas == sorted(fechas, reverse=True)
+
+
+def test_dias_sin_resolver_calculados(repositorio):
+    """Test: Abiertos cuentan hasta hoy; finalizados hasta FECHA_ARREGLO."""
+    abiertos = repositorio.listar_con_filtros(estado="Cotizado")
+    finalizados = repositorio.listar_con_filtros(estado="Finalizado")
+
+    assert {i.dias_sin_resolver for i in finalizados} == {2}
+    assert max(i.dias_sin_resolver for i in abiertos) == 28
+
+    viejos = repositorio.listar_con_filtros(dias_min=20)
+    assert {i.estado for i in viejos} == {"Reportado", "Cotizado"}
+    assert repositorio.contar_con_filtros(dias_min=20) == len(viejos) == 6
+
+
+def test_busqueda_por_descripcion_o_id(repositorio):
+    """Test: La búsqueda acepta texto parcial o el ID exacto."""
+    assert repositorio.contar_con_filtros(busqueda="GOTERA 1") == 11
+    assert [i.id_incidente for i in repositorio.listar_con_filtros(busqueda="30")] == [30]
+
+
+def test_contar_por_estado_ignora_filtro_de_estado(repositorio):
+    """Test: El conteo por estado alimenta los encabezados del Kanban."""
+    assert repositorio.contar_por_estado() == {"Reportado": 10, "Cotizado": 10, "Finalizado": 10}
+    assert repositorio.contar_por_estado(prioridad="Alta") == {
+        "Reportado": 5,
+        "Cotizado": 5,
+        "Finalizado": 5,
+    }
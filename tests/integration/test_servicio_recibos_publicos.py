@@ -169,6 +169,35 @@ class TestServicioRecibosPublicos:
         actualizado = repo.obtener_por_id(recibo.id_recibo_publico)
         assert actualizado.estado == "Vencido"
 
+    def test_vencer_recibos_pendientes_en_bloque(self, servicio_recibos):
+        # Pendiente vencido, pagado vencido y pendiente sin fecha
+        vencido = servicio_recibos.registrar_recibo({
+            'id_propiedad': 1, 'periodo_recibo': '2024-01', 'tipo_servicio': 'Agua',
+            'valor_recibo': 100, 'fecha_vencimiento': '2024-01-15'
+        }, "admin")
+        pagado = servicio_recibos.registrar_recibo({
+            'id_propiedad': 1, 'periodo_recibo': '2024-02', 'tipo_servicio': 'Agua',
+            'valor_recibo': 100, 'fecha_vencimiento': '2024-02-15'
+        }, "admin")
+        servicio_recibos.marcar_como_pagado(pagado.id_recibo_publico, "2024-02-10", "C-1", "admin")
+        sin_fecha = servicio_recibos.registrar_recibo({
+            'id_propiedad': 1, 'periodo_recibo': '2024-03', 'tipo_servicio': 'Agua',
+            'valor_recibo': 100
+        }, "admin")
+
+        ids = servicio_recibos.vencer_recibos_pendientes("job")
+
+        assert ids == [vencido.id_recibo_publico]
+        repo = servicio_recibos.repo_recibo
+        actualizado = repo.obtener_por_id(vencido.id_recibo_publico)
+        assert actualizado.estado == "Vencido"
+        assert actualizado.updated_by == "job"
+        assert repo.obtener_por_id(pagado.id_recibo_publico).estado == "Pagado"
+        assert repo.obtener_por_id(sin_fecha.id_recibo_publico).estado == "Pendiente"
+
+        # Idempotente: una segunda corrida no encuentra nada
+        assert servicio_recibos.vencer_recibos_pendientes("job") == []
+
     def test_obtener_resumen(self, servicio_recibos):
         # Crear 2 recibos mismo periodo
         servicio_recibos.registrar_recibo({
@@ -0,0 +1,76 @@
+"""
+Tests de integración para ServicioAutocompletado.
+
+Verifica la búsqueda top-K sobre un catálogo real y que el índice en memoria
+se descarta cuando el CacheManager invalida un namespace del que depende.
+"""
+import pytest
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.aplicacion.servicios.servicio_autocompletado import ServicioAutocompletado
+from src.infraestructura.cache.cache_manager import cache_manager
+
+
+@pytest.fixture
+def db(tmp_path):
+    db_manager = TestDatabaseManager(str(tmp_path / "test_autocompletado.db"))
+    conn = db_manager.obtener_conexion()
+    conn.executescript("""
+        CREATE TABLE PERSONAS (
+            ID_PERSONA INTEGER PRIMARY KEY, NUMERO_DOCUMENTO TEXT, NOMBRE_COMPLETO TEXT,
+            ESTADO_REGISTRO INTEGER
+        );
+        CREATE TABLE ARRENDATARIOS (
+            ID_ARRENDATARIO INTEGER PRIMARY KEY, ID_PERSONA INTEGER, ESTADO_ARRENDATARIO INTEGER
+        );
+    """)
+    conn.executemany(
+        "INSERT INTO PERSONAS VALUES (?, ?, ?, 1)",
+        [(i, str(1000 + i), f"Arrendatario {i:03d}") for i in range(1, 51)],
+    )
+    conn.executemany("INSERT INTO ARRENDATARIOS VALUES (?, ?, 1)", [(i, i) for i in range(1, 51)])
+    conn.commit()
+
+    yield db_manager
+
+    ServicioAutocompletado(db_manager).invalidar()
+    db_manager.cerrar_todas_conexiones()
+
+
+def test_buscar_retorna_solo_top_k(db):
+    """Test: El picker recibe a lo sumo `limite` opciones con id, texto y detalle."""
+    servicio = ServicioAutocompletado(db)
+
+    resultados = servicio.buscar("arrendatarios", "arrend", limite=5)
+
+    assert len(resultados) == 5
+    assert resultados[0] == {
+        "id": "1",
+        "texto": "Arrendatario 001",
+        "detalle": "1001",
+        "extra": None,
+    }
+    assert servicio.obtener("arrendatarios", 42)["texto"] == "Arrendatario 042"
+
+
+def test_invalidacion_de_cache_refresca_el_indice(db):
+    """Test: Invalidar 'personas' descarta el índice y la búsqueda ve el cambio."""
+    servicio = ServicioAutocompletado(db)
+    assert servicio.buscar("arrendatarios", "zuluaga") == []
+
+    conn = db.obtener_conexion()
+    conn.execute("INSERT INTO PERSONAS VALUES (51, '9999', 'Zuluaga Ríos', 1)")
+    conn.execute("INSERT INTO ARRENDATARIOS VALUES (51, 51, 1)")
+    conn.commit()
+
+    # Sin invalidación el índice sigue vigente (TTL)
+    assert servicio.buscar("arrendatarios", "zuluaga") == []
+
+    cache_manager.invalidate("personas")
+    assert [r["id"] for r in servicio.buscar("arrendatarios", "zuluaga")] == ["51"]
+
+
+def test_catalogo_desconocido(db):
+    """Test: Un catálogo no registrado es un error de programación."""
+    with pytest.raises(ValueError):
+        ServicioAutocompletado(db).buscar("inexistente", "x")
@@ -0,0 +1,194 @@
+"""
+Tests de integración para la corrida masiva de incremento IPC.
+
+Verifica el diff de contratos elegibles, la aplicación set-based de contrato,
+propiedad, mandato e historial, y que un diff desactualizado no aplica nada.
+"""
+import pytest
+
+from tests.integration.test_database_manager import TestDatabaseManager
+from src.aplicacion.servicios.servicio_ipc import ServicioIPC
+from src.dominio.servicios.calculadora_incremento_ipc import construir_incrementos
+from src.infraestructura.persistencia.repositorio_incremento_ipc_sqlite import (
+    PrevisualizacionDesactualizada,
+)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Contratos 1-3 con aniversario hasta marzo (elegibles en 2026-03), 4 con
+    aniversario en junio, 5 ya incrementado en 2025-11 y 6 terminado.
+    """
+    db_manager = TestDatabaseManager(str(tmp_path / "test_ipc_masivo.db"))
+    conn = db_manager.obtener_conexion()
+    conn.executescript("""
+        CREATE TABLE IPC (
+            ID_IPC INTEGER PRIMARY KEY, ANIO INTEGER, VALOR_IPC REAL, FECHA_PUBLICACION TEXT,
+            ESTADO_REGISTRO INTEGER, CREATED_AT TEXT, CREATED_BY TEXT
+        );
+        CREATE TABLE PERSONAS (ID_PERSONA INTEGER PRIMARY KEY, NOMBRE_COMPLETO TEXT);
+        CREATE TABLE ARRENDATARIOS (ID_ARRENDATARIO INTEGER PRIMARY KEY, ID_PERSONA INTEGER);
+        CREATE TABLE PROPIEDADES (
+            ID_PROPIEDAD INTEGER PRIMARY KEY, DIRECCION_PROPIEDAD TEXT,
+            CANON_ARRENDAMIENTO_ESTIMADO INTEGER, UPDATED_AT TEXT, UPDATED_BY TEXT
+        );
+        CREATE TABLE CONTRATOS_MANDATOS (
+            ID_CONTRATO_M INTEGER PRIMARY KEY, ID_PROPIEDAD INTEGER, ESTADO_CONTRATO_M TEXT,
+            CANON_MANDATO INTEGER, UPDATED_AT TEXT, UPDATED_BY TEXT
+        );
+        CREATE TABLE CONTRATOS_ARRENDAMIENTOS (
+            ID_CONTRATO_A INTEGER PRIMARY KEY, ID_PROPIEDAD INTEGER, ID_ARRENDATARIO INTEGER,
+            ESTADO_CONTRATO_A TEXT, CANON_ARRENDAMIENTO INTEGER, FECHA_INICIO_CONTRATO_A TEXT,
+            FECHA_ULTIMO_INCREMENTO_IPC TEXT, ALERTA_IPC INTEGER DEFAULT 1,
+            UPDATED_AT TEXT, UPDATED_BY TEXT
+        );
+        INSERT INTO IPC VALUES (1, 2025, 5.1, '2026-01-10', 1, NULL, 'admin');
+        INSERT INTO PERSONAS VALUES (1, 'Luis Inquilino');
+        INSERT INTO ARRENDATARIOS VALUES (1, 1);
+    """)
+    conn.executemany(
+        "INSERT INTO PROPIEDADES VALUES (?, ?, ?, NULL, NULL)",
+        [(i, f"Calle {i}", 1000000 * i) for i in range(1, 7)],
+    )
+    conn.executemany(
+        "INSERT INTO CONTRATOS_MANDATOS VALUES (?, ?, ?, ?, NULL, NULL)",
+        [(1, 1, "Activo", 1000000), (2, 2, "Terminado", 2000000)],
+    )
+    conn.executemany(
+        "INSERT INTO CONTRATOS_ARRENDAMIENTOS VALUES (?, ?, 1, ?, ?, ?, ?, 1, NULL, NULL)",
+        [
+            (1, 1, "Activo", 1000000, "2023-03-20", "2025-03-20"),
+            (2, 2, "Activo", 2000000, "2025-03-31", None),
+            (3, 3, "Activo", 3000000, "2024-01-15", None),
+            (4, 4, "Activo", 4000000, "2025-06-01", None),
+            (5, 5, "Activo", 5000000, "2023-11-01", "2025-11-01"),
+            (6, 6, "Terminado", 6000000, "2020-01-01", None),
+        ],
+    )
+    conn.commit()
+
+    yield db_manager
+
+    db_manager.cerrar_todas_conexiones()
+
+
+def _fila(db, sql, *params):
+    return tuple(db.obtener_conexion().execute(sql, params).fetchone())
+
+
+def _canon(db, id_contrato):
+    return _fila(
+        db,
+        "SELECT CANON_ARRENDAMIENTO FROM CONTRATOS_ARRENDAMIENTOS WHERE ID_CONTRATO_A = ?",
+        id_contrato,
+    )[0]
+
+
+def _seleccion(preview):
+    """Filas del diff como las envía la pantalla: (id_contrato, canon_anterior, canon_nuevo)."""
+    return [(c["id_contrato"], c["canon_anterior"], c["canon_nuevo"]) for c in preview["contratos"]]
+
+
+def test_previsualizar_usa_ipc_del_anio_anterior(db):
+    """Test: El diff incluye solo los elegibles del mes y no modifica nada."""
+    preview = ServicioIPC(db).previsualizar_incremento_masivo("2026-03-01")
+
+    assert preview["porcentaje_ipc"] == 5.1
+    assert [c["id_contrato"] for c in preview["contratos"]] == [1, 2, 3]
+    assert preview["contratos"][0]["canon_nuevo"] == 1051000
+    assert preview["contratos"][0]["tiene_mandato"] is True
+    assert preview["diferencia_total"] == 306000
+    assert _canon(db, 1) == 1000000
+
+
+def test_aplicar_masivo_actualiza_todo_en_bloque(db):
+    """Test: Contrato, propiedad, mandato activo e historial quedan con el canon nuevo."""
+    servicio = ServicioIPC(db)
+    preview = servicio.previsualizar_incremento_masivo("2026-03-01")
+
+    resultado = servicio.aplicar_incremento_masivo(
+        "2026-03-01", 5.1, _seleccion(preview), "IPC 2025", "ana"
+    )
+
+    assert resultado["aplicados"] == 3
+    assert resultado["contratos_por_segundo"] > 0
+    assert _fila(
+        db,
+        "SELECT CANON_ARRENDAMIENTO, FECHA_ULTIMO_INCREMENTO_IPC, ALERTA_IPC, UPDATED_BY "
+        "FROM CONTRATOS_ARRENDAMIENTOS WHERE ID_CONTRATO_A = 2",
+    ) == (2102000, "2026-03-01", 0, "ana")
+    assert _fila(
+        db, "SELECT CANON_ARRENDAMIENTO_ESTIMADO FROM PROPIEDADES WHERE ID_PROPIEDAD = 3"
+    ) == (3153000,)
+    mandatos = db.obtener_conexion().execute(
+        "SELECT CANON_MANDATO FROM CONTRATOS_MANDATOS ORDER BY ID_CONTRATO_M"
+    ).fetchall()
+    # El mandato terminado no se toca
+    assert [m[0] for m in mandatos] == [1051000, 2000000]
+    historial = db.obtener_conexion().execute(
+        "SELECT ID_CONTRATO_A, CANON_ANTERIOR, CANON_NUEVO, PORCENTAJE_IPC, CREATED_BY "
+        "FROM IPC_INCREMENT_HISTORY ORDER BY ID_CONTRATO_A"
+    ).fetchall()
+    assert [tuple(h) for h in historial] == [
+        (1, 1000000, 1051000, 5.1, "ana"),
+        (2, 2000000, 2102000, 5.1, "ana"),
+        (3, 3000000, 3153000, 5.1, "ana"),
+    ]
+
+    # Ya incrementados: dejan de ser elegibles para el mismo mes
+    assert servicio.previsualizar_incremento_masivo("2026-03-01")["contratos"] == []
+
+
+def test_diff_desactualizado_no_aplica_nada(db):
+    """Test: Si un canon cambió después del diff, la transacción completa se revierte."""
+    servicio = ServicioIPC(db)
+    candidatos = servicio.repo_incrementos.obtener_candidatos(ids_contrato=[1, 2])
+    incrementos = construir_incrementos(candidatos, 5.1)
+
+    conn = db.obtener_conexion()
+    conn.execute(
+        "UPDATE CONTRATOS_ARRENDAMIENTOS SET CANON_ARRENDAMIENTO = 1200000 WHERE ID_CONTRATO_A = 1"
+    )
+    conn.commit()
+
+    with pytest.raises(PrevisualizacionDesactualizada):
+        servicio.repo_incrementos.aplicar_lote(incrementos, "2026-03-01", 5.1, "", "ana")
+
+    assert _canon(db, 2) == 2000000
+    assert _fila(db, "SELECT COUNT(*) FROM IPC_INCREMENT_HISTORY")[0] == 0
+
+
+def test_servicio_aplica_lo_previsualizado_o_nada(db):
+    """Test: Un canon editado después del diff no se incrementa desde su valor nuevo."""
+    servicio = ServicioIPC(db)
+    seleccion = _seleccion(servicio.previsualizar_incremento_masivo("2026-03-01"))
+
+    conn = db.obtener_conexion()
+    conn.execute(
+        "UPDATE CONTRATOS_ARRENDAMIENTOS SET CANON_ARRENDAMIENTO = 1200000 WHERE ID_CONTRATO_A = 1"
+    )
+    conn.commit()
+
+    with pytest.raises(PrevisualizacionDesactualizada):
+        servicio.aplicar_incremento_masivo("2026-03-01", 5.1, seleccion, "", "ana")
+    assert (_canon(db, 1), _canon(db, 2)) == (1200000, 2000000)
+    assert _fila(db, "SELECT COUNT(*) FROM IPC_INCREMENT_HISTORY")[0] == 0
+
+    # Un canon propuesto que no corresponde al porcentaje tampoco se aplica
+    with pytest.raises(ValueError, match="no corresponde"):
+        servicio.aplicar_incremento_masivo("2026-03-01", 5.1, [(2, 2000000, 2500000)], "", "ana")
+    assert _canon(db, 2) == 2000000
+
+
+def test_incremento_de_un_contrato(db):
+    """Test: El camino individual valida el mes y usa la misma transacción."""
+    servicio = ServicioIPC(db)
+
+    resultado = servicio.aplicar_incremento_contrato(4, 10, "2026-03-01")
+    assert resultado == {"canon_anterior": 4000000, "canon_nuevo": 4400000}
+
+    with pytest.raises(ValueError, match="2026-03"):
+        servicio.aplicar_incremento_contrato(4, 10, "2026-03-15")
+    with pytest.raises(ValueError, match="activos"):
+        servicio.aplicar_incremento_contrato(6, 10, "2026-03-01")
@@ -3,4 +3,32 @@ Tests for generators
 """
 import pytest
 
-# TODO: Implement tests
+
+def test_generate_safe_reports_telemetry(tmp_path, monkeypatch):
+    """Test: generate_safe reporta duración y bytes de cada plantilla automáticamente"""
+    from src.infraestructura.servicios.pdf_elite.core.base_generator import BasePDFGenerator
+    from src.infraestructura.servicios.pdf_elite.utils import analytics as analytics_module
+
+    analytics = analytics_module.PDFAnalytics(tmp_path / "telemetry.sqlite")
+    monkeypatch.setattr(analytics_module, "_analytics_instance", analytics)
+
+    class DummyGenerator(BasePDFGenerator):
+        def generate(self, data):
+            if data.get("fallar"):
+                raise RuntimeError("fallo simulado")
+            path = self._get_output_path("dummy.pdf")
+            path.write_bytes(b"%PDF" * 256)
+            return path
+
+        def validate_data(self, data):
+            return True
+
+    gen = DummyGenerator(output_dir=tmp_path / "out")
+    assert gen.generate_safe({}) is not None
+    assert gen.generate_safe({"fallar": True}) is None
+
+    rollup = analytics.get_template_rollups(days=1)[0]
+    assert rollup["doc_type"] == "DummyGenerator"
+    assert rollup["count"] == 2
+    assert rollup["error_count"] == 1
+    assert rollup["total_bytes"] == 1024
@@ -1,6 +1,142 @@
 """
 Tests for utils
 """
+import os
+import time
+
 import pytest
 
-# TODO: Implement tests
+
+# ============================================================================
+# TESTS DE ALMACÉN DE DOCUMENTOS GENERADOS
+# ============================================================================
+
+def test_output_store_sharded_path(tmp_path):
+    """Test: Los archivos nuevos se ubican en un shard determinístico"""
+    from src.infraestructura.servicios.pdf_elite.utils.output_store import shard_for, sharded_path
+
+    path = sharded_path(tmp_path, "recibo_1_20260101120000.pdf")
+
+    assert path.parent.name == shard_for("recibo_1_20260101120000.pdf")
+    assert len(path.parent.name) == 2
+    assert path.parent.parent == tmp_path
+
+
+def test_output_store_resolve_and_etag(tmp_path):
+    """Test: Resolución (shard y layout plano) con ETag fuerte cacheado"""
+    from src.infraestructura.servicios.pdf_elite.utils.output_store import GeneratedFileStore
+
+    store = GeneratedFileStore(tmp_path)
+    store.path_for("a.pdf").write_bytes(b"%PDF-a")
+    (tmp_path / "legacy.pdf").write_bytes(b"%PDF-legacy")
+
+    info = store.resolve("a.pdf")
+    assert info is not None and info.size == 6
+    assert store.resolve("legacy.pdf") is not None
+    assert store.resolve("no_existe.pdf") is None
+
+    # Segunda resolución sale de memoria
+    assert store.resolve("a.pdf") is info
+    assert store.matches_etag(info, f'W/"x", {info.etag}')
+    assert not store.matches_etag(info, '"otro"')
+
+    stats = store.get_stats()
+    assert stats["not_modified"] == 1
+    assert stats["metadata_hit_rate"] == pytest.approx(25.0)
+
+
+def test_output_store_resolve_detects_regenerated_file(tmp_path):
+    """Test: Un archivo regenerado con el mismo nombre no se sirve con metadata vieja"""
+    import os
+
+    from src.infraestructura.servicios.pdf_elite.utils.output_store import GeneratedFileStore
+
+    store = GeneratedFileStore(tmp_path)
+    path = store.path_for("a.pdf")
+    path.write_bytes(b"%PDF-a")
+    os.utime(path, ns=(1_700_000_000_000_000_000, 1_700_000_000_000_000_000))
+    info = store.resolve("a.pdf")
+
+    # Mismo tamaño, distinto contenido y mtime (mismo segundo)
+    path.write_bytes(b"%PDF-b")
+    os.utime(path, ns=(1_700_000_000_500_000_000, 1_700_000_000_500_000_000))
+    regenerated = store.resolve("a.pdf")
+    assert regenerated is not info and regenerated.etag != info.etag
+
+    # Distinto tamaño, mismo mtime
+    path.write_bytes(b"%PDF-bb")
+    os.utime(path, ns=(1_700_000_000_500_000_000, 1_700_000_000_500_000_000))
+    resized = store.resolve("a.pdf")
+    assert resized.size == 7 and resized.etag != regenerated.etag
+
+    assert store.resolve("a.pdf") is resized
+    path.unlink()
+    assert store.resolve("a.pdf") is None
+
+
+def test_output_store_reap_retention_and_quota(tmp_path):
+    """Test: El reaper elimina expirados y aplica la cuota (más antiguos primero)"""
+    from src.infraestructura.servicios.pdf_elite.utils.output_store import GeneratedFileStore
+
+    store = GeneratedFileStore(tmp_path, retention_days=30, quota_mb=1)
+    now = time.time()
+
+    viejo = store.path_for("viejo.pdf")
+    viejo.write_bytes(b"x" * 100)
+    os.utime(viejo, (now - 40 * 86400, now - 40 * 86400))
+
+    for i in range(3):
+        p = store.path_for(f"grande_{i}.pdf")
+        p.write_bytes(b"x" * 400 * 1024)
+        os.utime(p, (now - (10 - i), now - (10 - i)))
+
+    stats = store.reap()
+
+    assert not viejo.exists()
+    assert not store.path_for("grande_0.pdf").exists()
+    assert store.path_for("grande_2.pdf").exists()
+    assert stats["file_count"] == 2
+    assert stats["last_reap"]["deleted_expired"] == 1
+    assert stats["last_reap"]["deleted_quota"] == 1
+
+
+# ============================================================================
+# TESTS DE TELEMETRÍA PDF
+# ============================================================================
+
+def test_analytics_rollups_and_percentiles(tmp_path):
+    """Test: Los agregados por plantilla incluyen conteos, percentiles, páginas y bytes"""
+    from src.infraestructura.servicios.pdf_elite.utils.analytics import PDFAnalytics
+
+    analytics = PDFAnalytics(tmp_path / "telemetry.sqlite")
+    for ms in range(1, 101):
+        analytics.track_generation("contrato", ms / 1000, pages=2, size_bytes=2048)
+    analytics.track_generation("contrato", 0.5, success=False, error_message="boom")
+    analytics.track_generation("recibo", 0.01, pages=1, size_bytes=1024)
+
+    rollups = {r["doc_type"]: r for r in analytics.get_template_rollups(days=1)}
+
+    contrato = rollups["contrato"]
+    assert contrato["count"] == 101
+    assert contrato["error_count"] == 1
+    assert contrato["avg_pages"] == 2
+    assert contrato["avg_kb"] == 2
+    # Histograma con resolución del 10%
+    assert 45 <= contrato["p50_ms"] <= 56
+    assert 90 <= contrato["p95_ms"] <= 105
+    assert contrato["p95_ms"] <= contrato["p99_ms"]
+
+    stats = analytics.get_statistics(days=1)
+    assert stats["total_generations"] == 102
+    assert stats["top_documents"][0] == ("contrato", 101)
+    assert analytics.get_recent_errors()[0]["error_message"] == "boom"
+
+
+def test_analytics_events_persisted_immediately(tmp_path):
+    """Test: Cada evento queda persistido sin esperar un guardado por lotes"""
+    from src.infraestructura.servicios.pdf_elite.utils.analytics import PDFAnalytics
+
+    path = tmp_path / "telemetry.sqlite"
+    PDFAnalytics(path).track_generation("certificado", 0.2)
+
+    assert PDFAnalytics(path).get_statistics(days=1)["total_generations"] == 1
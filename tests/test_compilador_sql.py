@@ -0,0 +1,178 @@
+"""
+Tests para el compilador de sentencias SQL.
+
+Verifica la traducción SQLite -> PostgreSQL, la caché de sentencias y el
+paso a sentencias preparadas (con un cursor que registra lo ejecutado).
+"""
+
+import pytest
+
+from src.infraestructura.persistencia.compilador_sql import (
+    CompiladorSQL,
+    SentenciasPreparadas,
+    traducir,
+)
+
+
+class _ErrorPostgreSQL(Exception):
+    def __init__(self, mensaje, pgcode):
+        super().__init__(mensaje)
+        self.pgcode = pgcode
+
+
+class _CursorRegistro:
+    """Cursor falso: guarda cada (sql, parámetros) y puede fallar en PREPARE."""
+
+    def __init__(self, fallar_prepare: bool = False):
+        self.ejecutadas = []
+        self.fallar_prepare = fallar_prepare
+        self.preparadas_sesion = set()
+
+    def execute(self, sql, parametros=None):
+        self.ejecutadas.append((sql, parametros))
+        if self.fallar_prepare and sql.startswith("PREPARE"):
+            raise RuntimeError("could not determine data type of parameter $1")
+        if sql.startswith("PREPARE"):
+            nombre = sql.split()[1]
+            if nombre in self.preparadas_sesion:
+                raise _ErrorPostgreSQL(f'prepared statement "{nombre}" already exists', "42P05")
+            self.preparadas_sesion.add(nombre)
+
+
+def test_traduce_placeholders_y_porcentajes_sin_tocar_literales():
+    """Test: ? pasa a %s fuera de cadenas y los % sueltos se escapan solo con parámetros."""
+    sql = "SELECT ID FROM T WHERE A = ? AND B LIKE '%?%' AND C = 'it''s ?'"
+
+    assert traducir(sql, "sqlite") == (sql, 1)
+    assert traducir(sql, "postgresql") == (
+        "SELECT ID FROM T WHERE A = %s AND B LIKE '%%?%%' AND C = 'it''s ?'",
+        1,
+    )
+    assert traducir("SELECT 1 FROM T WHERE B LIKE 'a%'", "postgresql", con_parametros=False) == (
+        "SELECT 1 FROM T WHERE B LIKE 'a%'",
+        0,
+    )
+
+
+def test_traduce_funciones_de_fecha_e_ifnull():
+    """Test: date/strftime/IFNULL de SQLite se expresan con funciones de PostgreSQL."""
+    texto, _ = traducir(
+        "SELECT IFNULL(SUM(V), 0), strftime('%Y-%m', F) FROM T "
+        "WHERE date(F) BETWEEN date('now') AND date('now', '+12 months', 'start of month')",
+        "postgresql",
+        con_parametros=False,
+    )
+
+    assert texto == (
+        "SELECT COALESCE(SUM(V), 0), TO_CHAR(CAST(F AS DATE), 'YYYY-MM') FROM T "
+        "WHERE CAST(F AS DATE) BETWEEN CURRENT_DATE AND "
+        "CAST(DATE_TRUNC('month', CAST(CURRENT_DATE + INTERVAL '+12 months' AS DATE)) AS DATE)"
+    )
+    # Modificador desconocido: la llamada queda tal cual
+    assert traducir("SELECT date(F, 'weekday 0') FROM T", "postgresql")[0] == (
+        "SELECT date(F, 'weekday 0') FROM T"
+    )
+
+
+def test_cache_reutiliza_la_sentencia_y_reporta_aciertos():
+    """Test: El mismo texto se compila una vez; las estadísticas cuentan aciertos y fallos."""
+    compilador = CompiladorSQL("postgresql", capacidad=2)
+
+    primera = compilador.compilar("SELECT ID FROM T WHERE A = ?")
+    assert compilador.compilar("SELECT ID FROM T WHERE A = ?") is primera
+    compilador.compilar("SELECT ID FROM U")
+    compilador.compilar("SELECT ID FROM V")  # desaloja la menos usada
+
+    estadisticas = compilador.estadisticas()
+    assert (estadisticas["aciertos"], estadisticas["fallos"], estadisticas["sentencias"]) == (1, 3, 2)
+    assert estadisticas["tasa_aciertos"] == 0.25
+    assert compilador.compilar("SELECT ID FROM T WHERE A = ?") is not primera
+
+
+def test_prepara_tras_el_umbral_y_ejecuta_con_execute():
+    """Test: Pasado el umbral se prepara una vez por conexión dentro de un savepoint."""
+    compilador = CompiladorSQL("postgresql", umbral_preparar=2)
+    preparadas = SentenciasPreparadas()
+    cursor = _CursorRegistro()
+    sql = "SELECT ID FROM T WHERE A = ? AND B = ?"
+
+    for i in range(4):
+        compilador.ejecutar(cursor, sql, (i, "x"), preparadas)
+
+    nombre = preparadas.nombre(compilador.compilar(sql))
+    assert [s for s, _ in cursor.ejecutadas] == [
+        "SELECT ID FROM T WHERE A = %s AND B = %s",
+        "SELECT ID FROM T WHERE A = %s AND B = %s",
+        "SAVEPOINT compilador_sql",
+        f"PREPARE {nombre} AS SELECT ID FROM T WHERE A = $1 AND B = $2",
+        "RELEASE SAVEPOINT compilador_sql",
+        f"EXECUTE {nombre} (%s, %s)",
+        f"EXECUTE {nombre} (%s, %s)",
+    ]
+    assert cursor.ejecutadas[-1][1] == (3, "x")
+    estadisticas = compilador.estadisticas()
+    assert (estadisticas["preparaciones"], estadisticas["ejecuciones_preparadas"]) == (1, 2)
+
+
+
+def test_nombre_estable_y_preparada_existente_en_la_sesion():
+    """Test: El nombre no cambia; si la sesión ya la tiene preparada se ejecuta esa."""
+    compilador = CompiladorSQL("postgresql", umbral_preparar=1)
+    cursor = _CursorRegistro()
+    sql = "SELECT ID FROM T WHERE A = ?"
+
+    for i in range(2):
+        compilador.ejecutar(cursor, sql, (i,), SentenciasPreparadas())
+    # Otro registro sobre la misma sesión (no sabe que ya se preparó)
+    cursor.ejecutadas.clear()
+    preparadas = SentenciasPreparadas()
+    compilador.ejecutar(cursor, sql, (7,), preparadas)
+
+    nombre = compilador.compilar(sql).nombre
+    assert preparadas.nombre(compilador.compilar(sql)) == nombre
+    assert [s for s, _ in cursor.ejecutadas] == [
+        "SAVEPOINT compilador_sql",
+        f"PREPARE {nombre} AS SELECT ID FROM T WHERE A = $1",
+        "ROLLBACK TO SAVEPOINT compilador_sql",
+        "RELEASE SAVEPOINT compilador_sql",
+        f"EXECUTE {nombre} (%s)",
+    ]
+    assert nombre in preparadas.nombres
+    estadisticas = compilador.estadisticas()
+    assert (estadisticas["preparaciones"], estadisticas["preparaciones_fallidas"]) == (1, 0)
+
+
+@pytest.mark.parametrize(
+    "sql,parametros",
+    [
+        ("SELECT * FROM T WHERE A = ?", (1,)),
+        ("SELECT ID FROM T WHERE A IN ?", ((1, 2),)),
+        ("UPDATE T SET A = 1; DELETE FROM U", None),
+    ],
+)
+def test_sentencias_no_preparables_van_directas(sql, parametros):
+    """Test: SELECT *, parámetros de lista y scripts nunca se preparan."""
+    compilador = CompiladorSQL("postgresql", umbral_preparar=1)
+    cursor = _CursorRegistro()
+
+    for _ in range(3):
+        compilador.ejecutar(cursor, sql, parametros, SentenciasPreparadas())
+
+    assert not any(s.startswith(("PREPARE", "EXECUTE")) for s, _ in cursor.ejecutadas)
+
+
+def test_prepare_fallido_revierte_el_savepoint_y_no_reintenta():
+    """Test: Si PREPARE falla se vuelve al savepoint y la sentencia sigue directa."""
+    compilador = CompiladorSQL("postgresql", umbral_preparar=1)
+    preparadas = SentenciasPreparadas()
+    cursor = _CursorRegistro(fallar_prepare=True)
+    sql = "SELECT ID FROM T WHERE A = ?"
+
+    for i in range(4):
+        compilador.ejecutar(cursor, sql, (i,), preparadas)
+
+    ejecutadas = [s for s, _ in cursor.ejecutadas]
+    assert ejecutadas.count("ROLLBACK TO SAVEPOINT compilador_sql") == 1
+    assert ejecutadas[-1] == "SELECT ID FROM T WHERE A = %s"
+    assert sum(s.startswith("PREPARE") for s in ejecutadas) == 1
+    assert compilador.estadisticas()["preparaciones_fallidas"] == 1
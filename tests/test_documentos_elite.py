@@ -109,5 +109,17 @@ class TestDocumentosElite(unittest.TestCase):
         self.assertTrue(res_escritura['valido'], "Debería aceptar Escritura PDF de 15MB")
         print("✓ Escritura PDF aceptada")
 
+    def test_tamano_maximo_para_lectura_por_bloques(self):
+        """Prueba el límite usado para rechazar uploads mientras se leen."""
+        print("\n--- Test Tamaño Máximo por Extensión ---")
+
+        self.assertEqual(
+            ValidadorDocumentos.obtener_tamano_maximo("DESOCUPACION", "foto.jpg"),
+            3 * 1024 * 1024,
+        )
+        self.assertEqual(ValidadorDocumentos.obtener_tamano_maximo("DESOCUPACION", "virus.exe"), 0)
+        self.assertEqual(ValidadorDocumentos.obtener_tamano_maximo("NO_EXISTE", "foto.jpg"), 0)
+        print("✓ Límites por extensión correctos")
+
 if __name__ == '__main__':
     unittest.main()
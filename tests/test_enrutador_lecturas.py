@@ -0,0 +1,157 @@
+"""
+Tests para el enrutamiento de lecturas a una réplica.
+
+Usa dos archivos SQLite: la primaria y una copia sincronizada como réplica.
+Verifica la tolerancia de retraso, leer lo propio, la caída de la réplica y
+las métricas de carga fuera de la primaria.
+"""
+
+import sqlite3
+
+import pytest
+
+from src.infraestructura.persistencia import database
+from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.enrutador_lecturas import (
+    fijar_sesion,
+    sincronizar_replica_sqlite,
+)
+
+CONTAR = "SELECT COUNT(*) FROM PERSONAS"
+
+
+@pytest.fixture
+def rutas(tmp_path):
+    primaria = tmp_path / "primaria.db"
+    conn = sqlite3.connect(str(primaria))
+    conn.executescript(
+        """
+        CREATE TABLE PERSONAS (ID_PERSONA INTEGER PRIMARY KEY, NOMBRE TEXT);
+        INSERT INTO PERSONAS (NOMBRE) VALUES ('Ana'), ('Luis');
+        """
+    )
+    conn.close()
+    replica = tmp_path / "replica.db"
+    sincronizar_replica_sqlite(primaria, replica)
+    return primaria, replica
+
+
+def _manager(monkeypatch, primaria, replica, **extra):
+    config = database.obtener_configuracion().model_copy(
+        update={
+            "database_path": str(primaria),
+            "replica_database_path": str(replica),
+            "replica_intervalo_retraso_segundos": 0.0,
+            "sqlite_produccion": False,
+            **extra,
+        }
+    )
+    monkeypatch.setattr(database, "obtener_configuracion", lambda: config)
+    manager = object.__new__(DatabaseManager)
+    manager._initialized = False
+    manager.__init__()
+    if manager.use_postgresql:
+        pytest.skip("Réplica SQLite solo en modo SQLite")
+    return manager
+
+
+def _insertar_en_primaria(primaria, nombre):
+    conn = sqlite3.connect(str(primaria))
+    conn.execute("INSERT INTO PERSONAS (NOMBRE) VALUES (?)", (nombre,))
+    conn.commit()
+    conn.close()
+
+
+def test_lectura_con_tolerancia_va_a_la_replica_y_sin_tolerancia_a_la_primaria(rutas, monkeypatch):
+    """Test: Dentro de la tolerancia los repositorios leen la réplica (aunque esté atrasada)."""
+    primaria, replica = rutas
+    manager = _manager(monkeypatch, primaria, replica)
+    _insertar_en_primaria(primaria, "Marta")  # la réplica queda atrasada
+
+    try:
+        with manager.lectura(60) as conn:
+            assert manager.obtener_conexion() is conn
+            assert conn.execute(CONTAR).fetchone()[0] == 2
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM PERSONAS")
+        with manager.lectura() as conn:
+            assert conn.execute(CONTAR).fetchone()[0] == 3
+        # Retraso mayor que la tolerancia: primaria
+        with manager.lectura(0.000001) as conn:
+            assert conn.execute(CONTAR).fetchone()[0] == 3
+
+        estadisticas = manager.estadisticas_lecturas()
+        assert estadisticas["lecturas"] == {"replica": 1, "primaria": 2}
+        assert estadisticas["en_primaria_por_motivo"] == {"sin_tolerancia": 1, "retraso": 1}
+        assert estadisticas["fraccion_lecturas_fuera"] == pytest.approx(1 / 3, abs=1e-3)
+    finally:
+        manager.cerrar_todas_conexiones()
+
+
+def test_escrituras_y_lectura_de_lo_propio_quedan_en_la_primaria(rutas, monkeypatch):
+    """Test: transaccion escribe en la primaria aun dentro de lectura(); luego el hilo lee lo propio."""
+    primaria, replica = rutas
+    manager = _manager(monkeypatch, primaria, replica)
+
+    try:
+        with manager.lectura(60):
+            with manager.transaccion() as conn:
+                conn.execute("INSERT INTO PERSONAS (NOMBRE) VALUES ('Marta')")
+                with manager.lectura(60) as lectora:
+                    assert lectora is conn
+        with manager.lectura(60) as conn:
+            assert conn.execute(CONTAR).fetchone()[0] == 3
+
+        motivos = manager.estadisticas_lecturas()["en_primaria_por_motivo"]
+        assert motivos == {"transaccion": 1, "escritura_reciente": 1}
+    finally:
+        manager.cerrar_todas_conexiones()
+
+
+def test_escritura_con_commit_directo_marca_solo_la_sesion_que_escribio(rutas, monkeypatch):
+    """Test: Un commit fuera de transaccion() deja a su sesión en la primaria; otra sesión del mismo hilo va a la réplica."""
+    primaria, replica = rutas
+    manager = _manager(monkeypatch, primaria, replica)
+
+    try:
+        fijar_sesion("cliente-a")
+        conn = manager.obtener_conexion()
+        conn.execute("INSERT INTO PERSONAS (NOMBRE) VALUES ('Marta')")
+        conn.commit()
+        with manager.lectura(60) as lectora:
+            assert lectora.execute(CONTAR).fetchone()[0] == 3
+
+        fijar_sesion("cliente-b")
+        with manager.lectura(60) as lectora:
+            assert lectora.execute(CONTAR).fetchone()[0] == 2
+
+        # Un commit sin escrituras no cuenta como escritura reciente
+        fijar_sesion("cliente-c")
+        conn.execute(CONTAR).fetchone()
+        conn.commit()
+        with manager.lectura(60):
+            pass
+
+        estadisticas = manager.estadisticas_lecturas()
+        assert estadisticas["lecturas"] == {"replica": 2, "primaria": 1}
+        assert estadisticas["en_primaria_por_motivo"] == {"escritura_reciente": 1}
+    finally:
+        fijar_sesion(None)
+        manager.cerrar_todas_conexiones()
+
+
+def test_replica_caida_vuelve_a_la_primaria_y_se_pausa(rutas, monkeypatch, tmp_path):
+    """Test: Si la réplica no abre se lee de la primaria y no se reintenta durante la pausa."""
+    primaria, _ = rutas
+    manager = _manager(monkeypatch, primaria, tmp_path / "no_existe.db")
+
+    try:
+        for _ in range(2):
+            with manager.lectura(60) as conn:
+                assert conn.execute(CONTAR).fetchone()[0] == 2
+
+        estadisticas = manager.get_db_info()["enrutamiento_lecturas"]
+        assert estadisticas["en_primaria_por_motivo"] == {"replica_caida": 2}
+        assert estadisticas["replica"]["errores"] == 1 and not estadisticas["replica"]["disponible"]
+    finally:
+        manager.cerrar_todas_conexiones()
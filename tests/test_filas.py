@@ -0,0 +1,120 @@
+"""
+Tests para la fábrica de filas (Fila y MapeadorEntidad).
+
+Verifica el acceso por nombre sobre el índice compartido y que los mapeadores
+directos dan las mismas entidades que los mapeadores por dict.
+"""
+
+import sqlite3
+
+import pytest
+
+from src.dominio.entidades.propiedad import Propiedad
+from src.infraestructura.persistencia.filas import (
+    MapeadorEntidad,
+    clase_fila,
+    claves_mayusculas,
+    filas,
+)
+from src.infraestructura.persistencia.instrumentacion_consultas import (
+    ConexionInstrumentada,
+    InstrumentacionConsultas,
+)
+from src.infraestructura.persistencia.repositorio_propiedad_sqlite import (
+    MAPEADOR_PROPIEDAD,
+    MAPEADOR_PROPIEDAD_REGISTRO,
+    RepositorioPropiedadSQLite,
+)
+
+
+@pytest.fixture
+def conexion():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.executescript(
+        """
+        CREATE TABLE PROPIEDADES (
+            ID_PROPIEDAD INTEGER PRIMARY KEY, MATRICULA_INMOBILIARIA TEXT, ID_MUNICIPIO INTEGER,
+            DIRECCION_PROPIEDAD TEXT, TIPO_PROPIEDAD TEXT, DISPONIBILIDAD_PROPIEDAD INTEGER,
+            AREA_M2 REAL, HABITACIONES INTEGER, ESTRATO INTEGER, CREATED_AT TEXT
+        );
+        INSERT INTO PROPIEDADES VALUES
+            (1, 'M-1', 5, 'Calle 1', 'Casa', 1, 80.5, 3, 4, '2026-01-01'),
+            (2, 'M-2', 5, 'Calle 2', 'Local', 0, 0, 0, NULL, NULL);
+        """
+    )
+    yield conn
+    conn.close()
+
+
+def test_fila_accede_por_nombre_e_indice_con_indice_compartido(conexion):
+    """Test: Todas las filas de un resultado comparten la clase y su índice."""
+    cursor = conexion.execute(
+        "SELECT id_propiedad, MATRICULA_INMOBILIARIA AS matricula FROM PROPIEDADES ORDER BY 1"
+    )
+    resultado = filas(cursor)
+
+    assert claves_mayusculas(cursor.description) == ("ID_PROPIEDAD", "MATRICULA")
+    assert type(resultado[0]) is type(resultado[1]) is clase_fila(("ID_PROPIEDAD", "MATRICULA"))
+    fila = resultado[1]
+    assert (fila[0], fila["ID_PROPIEDAD"], fila["matricula"]) == (2, 2, "M-2")
+    assert fila.get("NO_EXISTE", "x") == "x"
+    assert dict(fila) == {"ID_PROPIEDAD": 2, "MATRICULA": "M-2"}
+    with pytest.raises(KeyError):
+        fila["NO_EXISTE"]
+
+
+def test_mapeador_da_las_mismas_entidades_que_row_to_entity(conexion):
+    """Test: El mapeador directo replica _row_to_entity, incluidos vacíos como None."""
+    repo = RepositorioPropiedadSQLite.__new__(RepositorioPropiedadSQLite)
+    esperadas = [
+        repo._row_to_entity(row)
+        for row in conexion.execute("SELECT * FROM PROPIEDADES ORDER BY ID_PROPIEDAD")
+    ]
+
+    obtenidas = MAPEADOR_PROPIEDAD.mapear(
+        conexion.execute("SELECT * FROM PROPIEDADES ORDER BY ID_PROPIEDAD")
+    )
+
+    assert obtenidas == esperadas
+    assert obtenidas[1].disponibilidad_propiedad is None and obtenidas[1].bano is None
+
+
+def test_mapeador_con_columnas_y_conversores_e_instrumentacion(conexion):
+    """Test: Columnas renombradas, conversores y conteo de filas en el cursor instrumentado."""
+    instrumentacion = InstrumentacionConsultas(activa=True, umbral_lenta_ms=10_000, umbral_n_mas_uno=3)
+    mapeador = MapeadorEntidad(
+        Propiedad,
+        {"id_propiedad": "ID", "direccion_propiedad": "DIRECCION", "area_m2": "AREA", "estrato": "ESTRATO"},
+        conversores={"area_m2": str},
+    )
+
+    with instrumentacion.medir("propiedades.exportar") as resumen:
+        cursor = ConexionInstrumentada(conexion, instrumentacion).cursor()
+        cursor.execute(
+            "SELECT ID_PROPIEDAD AS ID, DIRECCION_PROPIEDAD AS DIRECCION, AREA_M2 AS AREA FROM PROPIEDADES"
+        )
+        propiedades = mapeador.mapear(cursor)
+
+    # ESTRATO no viene en el resultado: None, como dict.get
+    assert [(p.id_propiedad, p.direccion_propiedad, p.area_m2, p.estrato) for p in propiedades] == [
+        (1, "Calle 1", "80.5", None),
+        (2, "Calle 2", "0.0", None),
+    ]
+    assert resumen.total_filas == 2
+    with pytest.raises(ValueError):
+        MapeadorEntidad(Propiedad, {"id; import os": "ID"})
+
+
+def test_mapeador_de_registros_da_los_mismos_valores_que_las_entidades(conexion):
+    """Test: El registro de solo lectura tiene los mismos valores que la entidad mapeada."""
+    entidades = MAPEADOR_PROPIEDAD.mapear(conexion.execute("SELECT * FROM PROPIEDADES ORDER BY 1"))
+
+    registros = MAPEADOR_PROPIEDAD_REGISTRO.mapear(
+        conexion.execute("SELECT * FROM PROPIEDADES ORDER BY 1")
+    )
+
+    assert [r.a_entidad() for r in registros] == entidades
+    assert type(registros[0]).__name__ == "PropiedadRegistro"
+    with pytest.raises(ValueError):
+        MapeadorEntidad(type(registros[0]), {"no_es_campo": "ID"})
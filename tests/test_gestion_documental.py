@@ -5,7 +5,7 @@ import sqlite3
 from datetime import datetime
 from src.dominio.entidades.documento import Documento
 from src.infraestructura.repositorios.repositorio_documento_sqlite import RepositorioDocumentoSQLite
-from src.aplicacion.servicios.servicio_documental import ServicioDocumental
+from src.aplicacion.servicios.servicio_documental import ServicioDocumental, ServicioDocumentalElite
 from src.infraestructura.persistencia.database import DatabaseManager
 
 class TestGestionDocumental(unittest.TestCase):
@@ -155,6 +155,51 @@ class TestGestionDocumental(unittest.TestCase):
             count_old = cursor.fetchone()[0]
             self.assertEqual(count_old, 1)
 
+    def test_crear_lote_versionamiento(self):
+        """Prueba que el lote resuelva versiones y vigencia en una sola transacción"""
+        self.servicio.subir_documento(
+            entidad_tipo="INCIDENTE",
+            entidad_id="7",
+            nombre_archivo="foto1.jpg",
+            contenido_bytes=b"v1",
+            usuario="user1"
+        )
+
+        lote = [
+            Documento(entidad_tipo="INCIDENTE", entidad_id="7", nombre_archivo="foto1.jpg", contenido=b"v2"),
+            Documento(entidad_tipo="INCIDENTE", entidad_id="7", nombre_archivo="foto2.jpg", contenido=b"a"),
+            Documento(entidad_tipo="INCIDENTE", entidad_id="7", nombre_archivo="foto2.jpg", contenido=b"b"),
+        ]
+        creados = self.repo.crear_lote(lote)
+
+        self.assertTrue(all(d.id for d in creados))
+        self.assertEqual([d.version for d in creados], [2, 1, 2])
+
+        vigentes = {d.nombre_archivo: d.version for d in self.repo.listar_por_entidad("INCIDENTE", "7")}
+        self.assertEqual(vigentes, {"foto1.jpg": 2, "foto2.jpg": 2})
+
+    def test_optimizacion_guarda_thumbnail(self):
+        """Prueba que la columna THUMBNAIL exista en SQLite y la optimización la llene"""
+        from io import BytesIO
+        from PIL import Image
+
+        imagen = BytesIO()
+        Image.new("RGB", (400, 300), color="blue").save(imagen, format="JPEG")
+        doc = self.servicio.subir_documento(
+            entidad_tipo="INCIDENTE",
+            entidad_id="8",
+            nombre_archivo="foto.jpg",
+            contenido_bytes=imagen.getvalue(),
+            usuario="user1"
+        )
+
+        ServicioDocumentalElite(self.repo).optimizar_documento(doc)
+
+        with sqlite3.connect(self.db_path) as conn:
+            thumbnail = conn.execute("SELECT THUMBNAIL FROM DOCUMENTOS WHERE ID=?", (doc.id,)).fetchone()[0]
+        self.assertTrue(thumbnail)
+        self.assertLessEqual(Image.open(BytesIO(thumbnail)).width, 200)
+
     def test_soft_delete(self):
         """Prueba eliminación lógica"""
         doc = self.servicio.subir_documento(
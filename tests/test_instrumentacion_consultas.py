@@ -0,0 +1,105 @@
+"""
+Tests para la instrumentación de consultas SQL.
+
+Verifica huellas, resumen por evento, detección de N+1 y consultas lentas.
+"""
+
+import asyncio
+import logging
+import sqlite3
+
+import pytest
+
+from src.infraestructura.persistencia.instrumentacion_consultas import (
+    ConexionInstrumentada,
+    InstrumentacionConsultas,
+    huella_sql,
+)
+
+
+@pytest.fixture
+def instrumentacion():
+    return InstrumentacionConsultas(activa=True, umbral_lenta_ms=10_000, umbral_n_mas_uno=3)
+
+
+@pytest.fixture
+def conexion(instrumentacion):
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
+        """
+        CREATE TABLE PERSONAS (ID_PERSONA INTEGER PRIMARY KEY, NOMBRE TEXT);
+        INSERT INTO PERSONAS (NOMBRE) VALUES ('Ana'), ('Luis'), ('Marta'), ('Pedro');
+        """
+    )
+    yield ConexionInstrumentada(conn, instrumentacion)
+    conn.close()
+
+
+def test_huella_agrupa_parametros_y_literales():
+    """Test: La misma consulta con distintos valores comparte huella."""
+    assert huella_sql("SELECT * FROM T WHERE ID = 5 AND N = 'x'") == huella_sql(
+        "SELECT *  FROM T\n WHERE ID = ? AND N = %s"
+    )
+    assert huella_sql("SELECT * FROM T WHERE ID IN (?, ?, ?)") == huella_sql(
+        "SELECT * FROM T WHERE ID IN (?,?)"
+    )
+
+
+def test_resumen_por_evento_y_n_mas_uno(instrumentacion, conexion, caplog):
+    """Test: Consultas por fila dentro de un evento se señalan como N+1."""
+    with caplog.at_level(logging.INFO), instrumentacion.medir("personas.cargar") as resumen:
+        cursor = conexion.cursor()
+        cursor.execute("SELECT ID_PERSONA FROM PERSONAS")
+        for (id_persona,) in cursor.fetchall():
+            conexion.execute(
+                "SELECT NOMBRE FROM PERSONAS WHERE ID_PERSONA = ?", (id_persona,)
+            ).fetchone()
+
+    datos = resumen.como_dict(instrumentacion.umbral_n_mas_uno)
+    assert datos["consultas"] == 5
+    assert datos["huellas"] == 2
+    assert datos["filas"] == 8
+    assert datos["n_mas_uno"][0]["ejecuciones"] == 4
+    assert "Posible N+1 en personas.cargar" in caplog.text
+    assert instrumentacion.evento_actual() is None
+
+
+def test_consulta_lenta_se_registra(conexion, caplog):
+    """Test: Una consulta sobre el umbral se registra aun fuera de un evento."""
+    lenta = InstrumentacionConsultas(activa=True, umbral_lenta_ms=0)
+    conexion_lenta = ConexionInstrumentada(conexion._conexion, lenta)
+
+    with caplog.at_level(logging.WARNING):
+        conexion_lenta.execute("SELECT COUNT(*) FROM PERSONAS").fetchone()
+
+    assert "Consulta lenta" in caplog.text
+
+
+def test_evento_de_tarea_se_cierra_al_terminar(instrumentacion, conexion):
+    """Test: medir_tarea_actual cierra el resumen cuando termina la tarea."""
+    resumenes = []
+
+    async def evento():
+        resumenes.append(instrumentacion.medir_tarea_actual("estado.evento"))
+        conexion.execute("SELECT * FROM PERSONAS").fetchall()
+
+    async def principal():
+        await asyncio.create_task(evento())
+        await asyncio.sleep(0)
+
+    asyncio.run(principal())
+
+    (resumen,) = resumenes
+    assert resumen.fin is not None
+    assert resumen.total_filas == 4
+    assert instrumentacion.evento_actual() is None
+
+
+def test_conexion_conserva_api_sqlite(conexion):
+    """Test: row_factory y el context manager de la conexión siguen funcionando."""
+    conexion.row_factory = sqlite3.Row
+    with conexion:
+        conexion.execute("INSERT INTO PERSONAS (NOMBRE) VALUES ('Sofía')")
+
+    fila = conexion.execute("SELECT NOMBRE FROM PERSONAS WHERE NOMBRE = 'Sofía'").fetchone()
+    assert fila["NOMBRE"] == "Sofía"
@@ -6,7 +6,9 @@ import pytest
 from src.dominio.modelos.pagination import (
     PaginationParams,
     PaginatedResult,
-    create_empty_result
+    create_empty_result,
+    decode_cursor,
+    encode_cursor,
 )
 
 
@@ -213,6 +215,53 @@ class TestPaginatedResult:
         assert 'total=50' in repr_str
 
 
+class TestKeysetPagination:
+    """Tests para paginación por cursor (keyset)."""
+
+    def test_cursor_roundtrip(self):
+        """Test cursor opaco ida y vuelta."""
+        cursor = encode_cursor(["2025-01", 42])
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == ["2025-01", 42]
+
+    def test_cursor_invalido(self):
+        """Test validación de cursor inválido."""
+        with pytest.raises(ValueError, match="cursor inválido"):
+            PaginationParams(cursor="no-es-un-cursor")
+
+    def test_params_con_cursor(self):
+        """Test modo keyset: offset 0 y valores del cursor."""
+        params = PaginationParams(page=5, cursor=encode_cursor([10]))
+
+        assert params.uses_cursor is True
+        assert params.offset == 0
+        assert params.cursor_values == [10]
+
+    def test_validation_count_strategy(self):
+        """Test validación de estrategia de conteo."""
+        with pytest.raises(ValueError, match="count_strategy"):
+            PaginationParams(count_strategy="magic")
+
+    def test_from_lookahead(self):
+        """Test construcción con fila extra (LIMIT page_size + 1)."""
+        params = PaginationParams(page_size=2, count_strategy="estimate")
+        result = PaginatedResult.from_lookahead(
+            [{"id": 9}, {"id": 8}, {"id": 7}], 100, params, lambda i: [i["id"]]
+        )
+
+        assert [i["id"] for i in result.items] == [9, 8]
+        assert decode_cursor(result.next_cursor) == [8]
+        assert result.total_is_estimate is True
+
+        # Última página en modo keyset: sin cursor siguiente
+        params = PaginationParams(page_size=2, cursor=result.next_cursor)
+        result = PaginatedResult.from_lookahead([{"id": 7}], 100, params, lambda i: [i["id"]])
+
+        assert result.next_cursor is None
+        assert result.has_next is False
+
+
 class TestCreateEmptyResult:
     """Tests para helper create_empty_result."""
     
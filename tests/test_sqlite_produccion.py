@@ -0,0 +1,210 @@
+"""
+Tests para el perfil de producción de SQLite.
+
+Verifica pragmas y WAL, el pool acotado de lecturas, el orden y la
+reentrada de la cola de escritura y su uso desde DatabaseManager.
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src.infraestructura.persistencia import database
+from src.infraestructura.persistencia.database import DatabaseManager
+from src.infraestructura.persistencia.sqlite_produccion import (
+    ColaEscritura,
+    PerfilSQLite,
+    PoolLecturas,
+)
+
+
+@pytest.fixture
+def perfil(tmp_path):
+    ruta = tmp_path / "produccion.db"
+    conn = sqlite3.connect(str(ruta))
+    conn.executescript(
+        """
+        CREATE TABLE PERSONAS (ID_PERSONA INTEGER PRIMARY KEY, NOMBRE TEXT);
+        INSERT INTO PERSONAS (NOMBRE) VALUES ('Ana'), ('Luis');
+        """
+    )
+    conn.close()
+    return PerfilSQLite(ruta, busy_timeout_ms=2000, cache_kib=2048, mmap_mb=16)
+
+
+def _esperar(condicion, limite=2.0):
+    fin = time.monotonic() + limite
+    while not condicion():
+        assert time.monotonic() < fin, "condición no alcanzada"
+        time.sleep(0.005)
+
+
+def test_preparar_activa_wal_y_verifica_integridad(perfil):
+    """Test: WAL queda persistente, la verificación da ok y las conexiones llevan los pragmas."""
+    resultado = perfil.preparar("quick")
+
+    assert resultado["journal_mode"] == "wal" and resultado["integridad"] == "ok"
+    escritora = perfil.conectar()
+    assert escritora.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert escritora.execute("PRAGMA busy_timeout").fetchone()[0] == 2000
+    assert escritora.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    lectora = perfil.conectar(solo_lectura=True)
+    assert lectora.execute("SELECT COUNT(*) FROM PERSONAS").fetchone()[0] == 2
+    with pytest.raises(sqlite3.OperationalError):
+        lectora.execute("DELETE FROM PERSONAS")
+    escritora.close()
+    lectora.close()
+    with pytest.raises(ValueError):
+        perfil.preparar("rapida")
+
+
+def test_pool_acota_las_conexiones_y_las_reutiliza(perfil):
+    """Test: Sin conexiones libres se espera hasta TimeoutError; al devolverlas se reutilizan."""
+    pool = PoolLecturas(lambda: perfil.conectar(solo_lectura=True), tamano=2, espera_segundos=0.05)
+
+    with pool.conexion() as primera, pool.conexion() as segunda:
+        assert primera is not segunda
+        with pytest.raises(TimeoutError):
+            with pool.conexion():
+                pass
+    with pool.conexion() as reutilizada:
+        assert reutilizada is primera  # LIFO: la última devuelta
+
+    estadisticas = pool.estadisticas()
+    assert (estadisticas["abiertas"], estadisticas["max_en_uso"], estadisticas["en_uso"]) == (2, 2, 0)
+    pool.cerrar()
+    assert pool.estadisticas()["abiertas"] == 0
+
+
+def test_cola_atiende_en_orden_de_llegada_y_es_reentrante():
+    """Test: Los turnos se conceden FIFO; el mismo hilo anida turnos sin esperar."""
+    cola = ColaEscritura(espera_segundos=2)
+    orden = []
+    liberar = threading.Event()
+
+    def escritor(nombre):
+        with cola.turno():
+            orden.append(nombre)
+
+    def duenio():
+        with cola.turno():
+            with cola.turno():
+                liberar.wait(2)
+
+    hilo_duenio = threading.Thread(target=duenio)
+    hilo_duenio.start()
+    _esperar(lambda: cola.estadisticas()["turnos"] == 1)
+    hilos = []
+    for i in range(3):
+        hilo = threading.Thread(target=escritor, args=(i,))
+        hilo.start()
+        hilos.append(hilo)
+        _esperar(lambda: cola.estadisticas()["en_cola"] == i + 1)
+    liberar.set()
+    for hilo in [hilo_duenio, *hilos]:
+        hilo.join(2)
+
+    assert orden == [0, 1, 2]
+    assert cola.estadisticas()["turnos"] == 4 and cola.estadisticas()["en_cola"] == 0
+
+
+def test_cola_vencida_cede_su_turno():
+    """Test: Quien espera de más recibe TimeoutError y no bloquea a los siguientes."""
+    cola = ColaEscritura(espera_segundos=0.05)
+    liberar = threading.Event()
+
+    def duenio():
+        with cola.turno():
+            liberar.wait(2)
+
+    hilo = threading.Thread(target=duenio)
+    hilo.start()
+    _esperar(lambda: cola.estadisticas()["turnos"] == 1)
+    with pytest.raises(TimeoutError):
+        with cola.turno():
+            pass
+    liberar.set()
+    hilo.join(2)
+
+    with cola.turno():
+        assert cola.estadisticas()["vencidos"] == 1
+
+
+def test_database_manager_con_perfil_de_produccion(perfil, monkeypatch):
+    """Test: transaccion toma el turno de escritura; lectura usa el pool fuera de la transacción."""
+    config = database.obtener_configuracion().model_copy(
+        update={"database_path": str(perfil.ruta), "sqlite_produccion": True, "sqlite_lectores": 2}
+    )
+    monkeypatch.setattr(database, "obtener_configuracion", lambda: config)
+    manager = object.__new__(DatabaseManager)
+    manager._initialized = False
+    manager.__init__()
+    if manager.use_postgresql:
+        pytest.skip("Perfil solo para SQLite")
+
+    try:
+        with manager.transaccion() as conn:
+            conn.execute("INSERT INTO PERSONAS (NOMBRE) VALUES ('Marta')")
+            # Dentro de la transacción se lee lo propio, en la conexión del hilo
+            with manager.lectura() as lectora:
+                assert lectora is conn
+                assert lectora.execute("SELECT COUNT(*) FROM PERSONAS").fetchone()[0] == 3
+        with manager.lectura() as lectora:
+            assert lectora is not conn
+            assert lectora.execute("SELECT COUNT(*) FROM PERSONAS").fetchone()[0] == 3
+
+        info = manager.get_db_info()
+        assert info["produccion"] and info["verificacion"]["integridad"] == "ok"
+        assert info["escritura"]["turnos"] == 1 and info["lecturas"]["prestamos"] == 1
+    finally:
+        manager.cerrar_todas_conexiones()
+
+
+def test_escrituras_directas_hacen_cola_con_las_transacciones(perfil, monkeypatch):
+    """Test: Un INSERT con obtener_conexion() toma el turno; el hilo que lo tiene entra a transaccion sin esperar."""
+    config = database.obtener_configuracion().model_copy(
+        update={"database_path": str(perfil.ruta), "sqlite_produccion": True, "sqlite_espera_escritura_segundos": 5}
+    )
+    monkeypatch.setattr(database, "obtener_configuracion", lambda: config)
+    manager = object.__new__(DatabaseManager)
+    manager._initialized = False
+    manager.__init__()
+    if manager.use_postgresql:
+        pytest.skip("Perfil solo para SQLite")
+
+    errores = []
+
+    def otro_escritor():
+        try:
+            with manager.transaccion() as conn:
+                conn.execute("INSERT INTO PERSONAS (NOMBRE) VALUES ('Luis')")
+        except Exception as e:
+            errores.append(e)
+
+    try:
+        conn = manager.obtener_conexion()
+        conn.execute("INSERT INTO PERSONAS (NOMBRE) VALUES ('Marta')")
+        assert manager.cola_escritura.estadisticas()["turnos"] == 1
+
+        hilo = threading.Thread(target=otro_escritor)
+        hilo.start()
+        # El otro hilo espera en la cola, no en el lock de SQLite
+        _esperar(lambda: manager.cola_escritura.estadisticas()["en_cola"] == 1)
+        with manager.transaccion() as mismo:
+            mismo.execute("INSERT INTO PERSONAS (NOMBRE) VALUES ('Rosa')")
+        hilo.join(5)
+
+        assert errores == []
+        assert conn.execute("SELECT COUNT(*) FROM PERSONAS").fetchone()[0] == 5
+        estadisticas = manager.cola_escritura.estadisticas()
+        assert estadisticas["turnos"] == 2 and estadisticas["en_cola"] == 0
+        # Lecturas y DDL sueltos no retienen el turno
+        conn.execute("SELECT 1").fetchone()
+        conn.execute("CREATE TABLE IF NOT EXISTS NOTAS (ID INTEGER PRIMARY KEY)")
+        assert manager.cola_escritura.estadisticas()["turnos"] == 3 and not conn.in_transaction
+        with manager.cola_escritura.turno():
+            pass
+    finally:
+        manager.cerrar_todas_conexiones()
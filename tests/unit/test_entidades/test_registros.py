@@ -0,0 +1,44 @@
+"""
+Tests Unitarios: Registros de solo lectura
+Verifica campos, propiedades, inmutabilidad y conversión a la entidad mutable.
+"""
+
+import dataclasses
+
+import pytest
+from src.dominio.entidades.liquidacion import Liquidacion
+from src.dominio.entidades.registros import (
+    LiquidacionRegistro,
+    PropiedadRegistro,
+    registro_solo_lectura,
+)
+from src.dominio.entidades.propiedad import Propiedad
+
+
+def test_registro_tiene_los_campos_y_propiedades_de_la_entidad():
+    """Test: Mismos campos en el mismo orden y propiedades de estado disponibles."""
+    registro = LiquidacionRegistro(
+        id_liquidacion=7, id_contrato_m=3, periodo="2026-05", estado_liquidacion="Pagada"
+    )
+
+    assert LiquidacionRegistro._fields == tuple(f.name for f in dataclasses.fields(Liquidacion))
+    assert registro.esta_pagada and not registro.esta_aprobada
+    assert registro.canon_bruto == 0 and registro.created_at is None
+    assert not hasattr(registro, "__dict__")
+    assert registro_solo_lectura(Liquidacion) is LiquidacionRegistro
+
+
+def test_registro_es_inmutable_y_a_entidad_devuelve_la_entidad_validada():
+    """Test: No se puede modificar; a_entidad construye el dataclass con sus validaciones."""
+    registro = PropiedadRegistro(
+        id_propiedad=1, matricula_inmobiliaria="M-1", id_municipio=5,
+        direccion_propiedad="Calle 1", tipo_propiedad="Casa",
+    )
+
+    with pytest.raises(AttributeError):
+        registro.direccion_propiedad = "Otra"
+    propiedad = registro.a_entidad()
+    assert isinstance(propiedad, Propiedad) and propiedad.direccion_propiedad == "Calle 1"
+
+    with pytest.raises(ValueError):
+        LiquidacionRegistro(periodo="2026-5", estado_liquidacion="Pagada").a_entidad()
@@ -0,0 +1,49 @@
+"""
+Tests unitarios para el cálculo del incremento IPC.
+"""
+import pytest
+
+from src.dominio.servicios.calculadora_incremento_ipc import (
+    calcular_canon_incrementado,
+    construir_incrementos,
+    fecha_corte_elegibilidad,
+    incrementado_en_mes,
+    validar_porcentaje_ipc,
+)
+
+
+class TestCalculadoraIncrementoIPC:
+    """Tests para las reglas de la corrida de IPC."""
+
+    def test_canon_redondeado_al_peso(self):
+        """Test: 1.250.000 con IPC 5.2% -> 1.315.000."""
+        assert calcular_canon_incrementado(1250000, 5.2) == 1315000
+        assert calcular_canon_incrementado(999999, 9.28) == 1092799
+
+    def test_porcentaje_fuera_de_rango(self):
+        """Test: El porcentaje debe estar en (0, 20]."""
+        for invalido in (0, -1, 20.01):
+            with pytest.raises(ValueError):
+                validar_porcentaje_ipc(invalido)
+        validar_porcentaje_ipc(20)
+
+    def test_fecha_corte_fin_de_mes_del_anio_anterior(self):
+        """Test: El corte es el último día del mismo mes un año antes."""
+        assert fecha_corte_elegibilidad("2026-03-01") == "2025-03-31"
+        assert fecha_corte_elegibilidad("2025-02-15") == "2024-02-29"
+
+    def test_incrementado_en_mes(self):
+        """Test: Solo cuenta el mismo año y mes."""
+        assert incrementado_en_mes("2026-03-05", "2026-03-28")
+        assert not incrementado_en_mes("2025-03-05", "2026-03-28")
+        assert not incrementado_en_mes(None, "2026-03-28")
+
+    def test_construir_incrementos(self):
+        """Test: El diff conserva los datos del contrato y calcula la diferencia."""
+        (incremento,) = construir_incrementos(
+            [{"id_contrato": 7, "id_propiedad": 3, "canon": 1000000, "direccion": "Calle 1"}],
+            10,
+        )
+        assert incremento.canon_nuevo == 1100000
+        assert incremento.to_dict()["diferencia"] == 100000
+        assert incremento.to_dict()["direccion"] == "Calle 1"
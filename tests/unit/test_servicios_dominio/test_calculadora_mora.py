@@ -0,0 +1,31 @@
+"""
+Tests unitarios para las reglas de mora de arrendamientos.
+"""
+from src.dominio.servicios.calculadora_mora import (
+    TASA_MORA_DIARIA,
+    fecha_vencimiento_periodo,
+    interes_mora,
+    periodo_de,
+    periodos_entre,
+)
+
+
+def test_interes_mora_simple_diario_truncado():
+    """Test: Interés simple diario sobre el saldo, truncado al peso."""
+    assert interes_mora(1_000_000, 10) == int(1_000_000 * TASA_MORA_DIARIA * 10)
+    assert interes_mora(1_000_000, 0) == 0
+    assert interes_mora(0, 30) == 0
+
+
+def test_vencimiento_usa_el_dia_de_inicio_del_contrato():
+    """Test: El canon vence el día de inicio, o el último día si el mes es más corto."""
+    assert fecha_vencimiento_periodo("2025-03-15", "2026-02") == "2026-02-15"
+    assert fecha_vencimiento_periodo("2025-01-31", "2026-02") == "2026-02-28"
+    assert fecha_vencimiento_periodo("2025-01-31", "2028-02") == "2028-02-29"
+
+
+def test_periodos_entre_cruza_el_anio():
+    """Test: Los períodos incluyen ambos extremos y cruzan diciembre."""
+    assert periodos_entre("2025-11", "2026-02") == ["2025-11", "2025-12", "2026-01", "2026-02"]
+    assert periodos_entre("2026-03", "2026-02") == []
+    assert periodo_de("2026-02-15") == "2026-02"
@@ -0,0 +1,61 @@
+"""
+Tests unitarios para el índice de autocompletado (typeahead).
+"""
+import pytest
+
+from src.dominio.servicios.indice_autocompletado import (
+    IndiceAutocompletado,
+    OpcionAutocompletado,
+    trigramas,
+)
+
+
+@pytest.fixture
+def indice():
+    return IndiceAutocompletado(
+        [
+            OpcionAutocompletado(id="1", texto="José Pérez", detalle="1010"),
+            OpcionAutocompletado(id="2", texto="María Peña", detalle="2020"),
+            OpcionAutocompletado(id="3", texto="Pedro Gómez", detalle="3030"),
+            OpcionAutocompletado(id="4", texto="Ana Pérez Ruiz", detalle="4040"),
+        ]
+    )
+
+
+class TestIndiceAutocompletado:
+    """Tests para IndiceAutocompletado.buscar / obtener."""
+
+    def test_prefijo_por_palabra_sin_tildes(self, indice):
+        """Test: 'pere' encuentra 'Pérez' en cualquier posición del texto."""
+        ids = [o.id for o in indice.buscar("pere")]
+        assert sorted(ids) == ["1", "4"]
+
+    def test_prefijo_del_texto_completo_primero(self, indice):
+        """Test: Las opciones que empiezan por el término van primero."""
+        assert [o.id for o in indice.buscar("pe")][0] == "3"
+
+    def test_todos_los_terminos_deben_coincidir(self, indice):
+        """Test: Con varios términos se exige el prefijo de cada uno."""
+        assert [o.id for o in indice.buscar("ana per")] == ["4"]
+
+    def test_tolera_errores_de_digitacion(self, indice):
+        """Test: Los trigramas encuentran 'Gómez' escrito como 'gomes'."""
+        assert "3" in [o.id for o in indice.buscar("pedro gomes")]
+
+    def test_busca_por_detalle(self, indice):
+        """Test: El detalle (documento, matrícula) también es buscable."""
+        assert [o.id for o in indice.buscar("2020")] == ["2"]
+
+    def test_limite_top_k(self, indice):
+        """Test: Nunca se retornan más de `limite` opciones."""
+        assert len(indice.buscar("", limite=2)) == 2
+        assert len(indice.buscar("p", limite=1)) == 1
+
+    def test_obtener_por_id(self, indice):
+        """Test: obtener acepta IDs numéricos o texto."""
+        assert indice.obtener(2).texto == "María Peña"
+        assert indice.obtener("99") is None
+
+    def test_trigramas_con_relleno(self):
+        """Test: Cada palabra se rellena como en pg_trgm."""
+        assert trigramas("Ana") == {"  a", " an", "ana", "na "}
@@ -0,0 +1,22 @@
+"""
+Tests unitarios para la normalización de texto de búsqueda.
+"""
+from src.dominio.servicios.normalizador_texto import normalizar_texto, tokenizar_busqueda
+
+
+class TestNormalizadorTexto:
+    """Tests para normalizar_texto y tokenizar_busqueda."""
+
+    def test_elimina_tildes_y_mayusculas(self):
+        """Test: La normalización es insensible a tildes, eñes y mayúsculas."""
+        assert normalizar_texto("  José  PÉREZ Ñuñez ") == "jose perez nunez"
+        assert normalizar_texto("Güémez") == "guemez"
+
+    def test_texto_vacio(self):
+        """Test: Textos vacíos o None retornan cadena vacía."""
+        assert normalizar_texto("") == ""
+        assert normalizar_texto(None) == ""
+
+    def test_tokeniza_direcciones(self):
+        """Test: Los signos de una dirección no generan términos."""
+        assert tokenizar_busqueda("Cra. 5 # 10-20 Búcaro") == ["cra", "5", "10", "20", "bucaro"]